@@ -0,0 +1,70 @@
+"""Benchmark the implementations of exact searching used by the C extensions.
+
+Each implementation supported by the CPU is compared to the others and to
+bytes.find(), searching for a needle which doesn't appear in the haystack,
+so that the entire haystack is scanned.
+
+Run with: python benchmarks/memmem.py [-n NUMBER] [-r REPETITIONS]
+"""
+import argparse
+import random
+import timeit
+
+from fuzzysearch._common import memmem_byteslike, available_implementations
+
+
+def make_haystacks(length, rng):
+    return {
+        'dna': bytes(rng.choice(b'ACGT') for _i in range(length)),
+        'text': bytes(rng.choice(b'abcdefghijklmnopqrstuvwxyz      ')
+                      for _i in range(length)),
+    }
+
+
+def make_needle(haystack, needle_len, rng):
+    # a part of the haystack with an item not in the haystack in its middle,
+    # so that it is never found, but still has many partial matches
+    while True:
+        start = rng.randrange(len(haystack) - needle_len)
+        needle = bytearray(haystack[start:start + needle_len])
+        needle[needle_len // 2] = ord('!')
+        needle = bytes(needle)
+        if haystack.find(needle) == -1:
+            return needle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=20,
+                        help='number of searches in each repetition')
+    parser.add_argument('-r', '--repetitions', type=int, default=5,
+                        help='number of times to run each benchmark')
+    parser.add_argument('-l', '--length', type=int, default=10**6,
+                        help='length of the haystacks')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    implementations = available_implementations()
+    print('throughput in GB/s')
+    print('haystack  needle' + ''.join(
+        '%12s' % name for name in implementations + ('bytes.find',)))
+    for haystack_name, haystack in sorted(
+            make_haystacks(args.length, rng).items()):
+        for needle_len in [2, 4, 8, 16, 32, 64]:
+            needle = make_needle(haystack, needle_len, rng)
+            funcs = [
+                lambda name=name: memmem_byteslike(needle, haystack, name)
+                for name in implementations
+            ] + [lambda: haystack.find(needle)]
+            timings = [
+                min(timeit.repeat(func, number=args.number,
+                                  repeat=args.repetitions)) / args.number
+                for func in funcs
+            ]
+            print('%-8s  %6d' % (haystack_name, needle_len) + ''.join(
+                '%12.2f' % (len(haystack) / timing / 1e9)
+                for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -77,12 +77,14 @@ class ve_build_ext(build_ext):
 _substitutions_only_module = Extension(
     'fuzzysearch._substitutions_only',
     sources=['src/fuzzysearch/_substitutions_only.c',
+             'src/fuzzysearch/hamming.c',
              'src/fuzzysearch/memmem.c'],
     include_dirs=['.'],
 )
 _common_module = Extension(
     'fuzzysearch._common',
     sources=['src/fuzzysearch/_common.c',
+             'src/fuzzysearch/hamming.c',
              'src/fuzzysearch/memmem.c'],
     include_dirs=['.'],
 )
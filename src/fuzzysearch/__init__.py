@@ -18,15 +18,35 @@ __version__ = '0.8.1'
 __all__ = [
     'find_near_matches',
     'find_near_matches_in_file',
+    'find_near_matches_in_regions',
+    'find_near_match_pairs',
+    'has_near_match',
+    'count_near_matches',
+    'find_best_matches',
     'Match',
+    'MatchArray',
+    'StrandedMatch',
+    'EquivalenceTable',
+    'reverse_complement',
 ]
 
 import io
-
-from fuzzysearch.common import Match, LevenshteinSearchParams
-from fuzzysearch.generic_search import GenericSearch
+from bisect import bisect_left, bisect_right
+
+from fuzzysearch.common import Match, MatchArray, StrandedMatch, \
+    EquivalenceTable, LevenshteinSearchParams, group_matches, \
+    clamp_index_range, reverse_complement
+from fuzzysearch.bit_parallel import is_expected_faster as \
+    _bit_parallel_is_expected_faster
+from fuzzysearch.generic_search import GenericSearch, BitParallelSearch, \
+    with_max_lp_candidates as _with_max_lp_candidates
 from fuzzysearch.levenshtein import LevenshteinSearch
+from fuzzysearch.no_deletions import NoDeletionsSearch
+from fuzzysearch.no_insertions import NoInsertionsSearch
 from fuzzysearch.search_exact import ExactSearch
+from fuzzysearch.seed_planner import SequenceProfile
+from fuzzysearch.single_indel_type import is_expected_faster as \
+    _single_indel_type_is_expected_faster
 from fuzzysearch.substitutions_only import SubstitutionsOnlySearch
 
 import attr
@@ -36,7 +56,18 @@ def find_near_matches(subsequence, sequence,
                       max_substitutions=None,
                       max_insertions=None,
                       max_deletions=None,
-                      max_l_dist=None):
+                      max_l_dist=None,
+                      result_format='matches',
+                      max_matches=None,
+                      start_index=0,
+                      end_index=None,
+                      anchor=None,
+                      anchor_window=1,
+                      both_strands=False,
+                      equivalences=None,
+                      circular=False,
+                      seed_profile=None,
+                      max_lp_candidates=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -47,22 +78,619 @@ def find_near_matches(subsequence, sequence,
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
       (a.k.a. the Levenshtein distance)
+
+    By default a list of Match objects is returned.  With
+    result_format='columns', a MatchArray is returned instead, which keeps
+    the starts, ends and distances of the matches in arrays.
+
+    If max_matches is given, only the first max_matches matches are
+    returned, and the search stops as soon as these are known.
+
+    If start_index and/or end_index are given, only matches within
+    sequence[start_index:end_index] are found, without copying that part of
+    the sequence.  The indexes of the matches are still relative to the start
+    of the entire sequence.
+
+    With anchor='start', only matches beginning within the first
+    anchor_window items of the searched sequence are found.  Similarly,
+    anchor='end' requires matches to end within its last anchor_window items,
+    and anchor='both' requires both.  The search is limited to the part of
+    the sequence where such matches may be found.  With the default
+    anchor_window=1, matches must be a prefix, a suffix or all of the
+    sequence, respectively.
+
+    With both_strands=True, subsequence must be a DNA sequence, and its
+    reverse complement is searched for as well.  StrandedMatch objects are
+    returned, with strand='+' for matches of the subsequence itself and
+    strand='-' for matches of its reverse complement, sorted by their start
+    indexes.
+
+    If an EquivalenceTable is given as equivalences, items are compared
+    according to it, e.g. EquivalenceTable.case_insensitive() allows
+    searching text regardless of case without converting it first.
+
+    With circular=True, the sequence is treated as circular, e.g. a plasmid,
+    so that matches may wrap around from its end to its start.  The end
+    indexes of such matches are larger than len(sequence); they end at
+    index match.end - len(sequence).  Overlapping matches are consolidated
+    around the origin just like elsewhere in the sequence.  Only a short
+    window around the origin is copied to search for them, rather than the
+    entire sequence.
+
+    The n-gram searches, used for long enough subsequences, search for parts
+    of the subsequence exactly.  By default the subsequence is split into
+    equal parts.  With seed_profile='sample', a sample of the sequence is
+    used to choose the parts expected to appear least often in it instead,
+    which helps with low-complexity subsequences and sequences.  A
+    fuzzysearch.seed_planner.SequenceProfile, e.g. of a similar sequence,
+    may also be given.
+
+    max_lp_candidates limits the number of partial matches kept at once by
+    the linear programming search, used for some limitations; see
+    choose_search_class().
+    """
+    _check_result_format(result_format)
+    _check_max_matches(max_matches)
+    seed_profile = _get_seed_profile(seed_profile, sequence)
+    if circular:
+        if result_format != 'matches':
+            raise ValueError(
+                "circular=True requires result_format='matches'")
+        if anchor is not None or start_index != 0 or end_index is not None:
+            raise ValueError('circular=True may not be combined with '
+                             'anchor, start_index or end_index')
+    if both_strands:
+        if result_format != 'matches':
+            raise ValueError(
+                "both_strands=True requires result_format='matches'")
+        return _find_near_matches_both_strands(
+            subsequence, sequence,
+            max_substitutions, max_insertions, max_deletions, max_l_dist,
+            max_matches=max_matches,
+            start_index=start_index, end_index=end_index,
+            anchor=anchor, anchor_window=anchor_window,
+            equivalences=equivalences, circular=circular,
+            seed_profile=seed_profile, max_lp_candidates=max_lp_candidates,
+        )
+    search_params = LevenshteinSearchParams(max_substitutions,
+                                            max_insertions,
+                                            max_deletions,
+                                            max_l_dist)
+    search_class = choose_search_class(search_params, equivalences,
+                                       subsequence, max_lp_candidates)
+    if circular:
+        return _find_near_matches_circular(subsequence, sequence,
+                                           search_params, search_class,
+                                           max_matches, equivalences,
+                                           seed_profile)
+    match_filter = None
+    if anchor is not None:
+        start_index, end_index, match_filter = _anchored_search_range(
+            subsequence, sequence, search_params, anchor, anchor_window,
+            start_index, end_index)
+    if max_matches is not None:
+        chunks = _search_sequence_in_chunks(subsequence, sequence,
+                                            search_params, search_class,
+                                            start_index, end_index,
+                                            equivalences, seed_profile)
+        if match_filter is not None:
+            chunks = (
+                (list(filter(match_filter, chunk_matches)), offset)
+                for chunk_matches, offset in chunks
+            )
+        matches = _consolidate_chunked_matches(search_class, chunks,
+                                               max_matches)
+        if result_format == 'columns':
+            return MatchArray.from_matches(matches)
+        return matches
+    if match_filter is not None:
+        # the matches must be filtered before they are consolidated, so
+        # that the best anchored match of each group is chosen
+        matches = search_class.consolidate_matches(filter(
+            match_filter,
+            search_class.search(subsequence, sequence, search_params,
+                                start_index, end_index, equivalences,
+                                seed_profile),
+        ))
+        if result_format == 'columns':
+            return MatchArray.from_matches(matches)
+        return matches
+    if result_format == 'columns' and seed_profile is None:
+        return search_class.search_columns(subsequence, sequence,
+                                           search_params,
+                                           start_index, end_index,
+                                           equivalences)
+    matches = search_class.consolidate_matches(
+        search_class.search(subsequence, sequence, search_params,
+                            start_index, end_index, equivalences,
+                            seed_profile)
+    )
+    if result_format == 'columns':
+        return MatchArray.from_matches(matches)
+    return matches
+
+
+def _get_seed_profile(seed_profile, sequence):
+    if seed_profile is None or isinstance(seed_profile, SequenceProfile):
+        return seed_profile
+    elif seed_profile == 'sample':
+        return SequenceProfile.from_sequence(sequence)
+    raise TypeError(
+        "seed_profile must be None, 'sample' or a SequenceProfile")
+
+
+def _find_near_matches_circular(subsequence, sequence, search_params,
+                                search_class, max_matches, equivalences,
+                                seed_profile=None):
+    """Search a circular sequence.
+
+    Matches wrapping around the origin are found by searching a window made
+    of the end of the sequence followed by its start.  They are consolidated
+    together with the matches found in the sequence itself, according to how
+    they overlap around the circle.
+
+    Sequences shorter than the longest possible match are instead searched
+    starting from each of their items in turn, since matches may not go
+    around them more than once.
+    """
+    seq_len = len(sequence)
+    if seq_len == 0:
+        return []
+
+    def search(seq):
+        return search_class.search(subsequence, seq, search_params,
+                                   0, None, equivalences, seed_profile)
+
+    # matches including at least one item from each end of the sequence are
+    # at most this long
+    max_match_len = len(subsequence) + search_params.max_insertions
+    if seq_len < max_match_len:
+        matches = [
+            _rotate_match(match, rotation, seq_len)
+            for rotation in range(seq_len)
+            for match in search(sequence[rotation:] + sequence[:rotation])
+        ]
+    else:
+        window_len = max_match_len - 1
+        wrapping_matches = []
+        if window_len > 0:
+            window = sequence[seq_len - window_len:] + sequence[:window_len]
+            wrapping_matches = [
+                _rotate_match(match, seq_len - window_len, seq_len)
+                for match in search(window)
+                # ignore matches within either end of the sequence
+                if match.start < window_len < match.end
+            ]
+
+        if not wrapping_matches:
+            # without matches going across the origin, matches overlap just
+            # as in a linear sequence
+            if max_matches is None:
+                matches = search_class.consolidate_matches(search(sequence))
+            else:
+                matches = _consolidate_chunked_matches(
+                    search_class,
+                    _search_sequence_in_chunks(
+                        subsequence, sequence, search_params, search_class,
+                        equivalences=equivalences, seed_profile=seed_profile),
+                    max_matches,
+                )
+            # an empty match at the end of the sequence is also found at
+            # its start
+            return sorted(
+                (match for match in matches if match.start < seq_len),
+                key=_match_order_key,
+            )
+
+        matches = wrapping_matches + [
+            _rotate_match(match, 0, seq_len) for match in search(sequence)
+        ]
+
+    matches = _consolidate_circular_matches(search_class, set(matches),
+                                            seq_len)
+    return matches[:max_matches] if max_matches is not None else matches
+
+
+def _rotate_match(match, offset, seq_len):
+    """Move a match by offset, so that it starts in range(seq_len)."""
+    start = (match.start + offset) % seq_len
+    if start == match.start:
+        return match
+    return attr.evolve(match, start=start,
+                       end=start + (match.end - match.start))
+
+
+def _group_circular_matches(matches, seq_len):
+    """Group matches of a circular sequence which overlap around it.
+
+    Matches overlap as in common.group_matches(), and additionally, matches
+    ending past the end of the sequence overlap those at its start.
+    """
+    # Sweeping over the matches in order of their starts, each one overlaps
+    # the current group unless it starts after the group ends.  Matches
+    # wrapping around the origin are also swept over shifted back by the
+    # length of the sequence, which joins them with the matches at its start.
+    entries = sorted(
+        [(match.start, match.end, i) for i, match in enumerate(matches)] +
+        [(match.start - seq_len, match.end - seq_len, i)
+         for i, match in enumerate(matches) if match.end > seq_len]
+    )
+    group_indexes = list(range(len(matches)))
+
+    def find_group_index(i):
+        while group_indexes[i] != i:
+            group_indexes[i] = i = group_indexes[group_indexes[i]]
+        return i
+
+    group_index = group_start = group_end = None
+    for start, end, i in entries:
+        if group_index is not None and \
+                start < group_end and end > group_start:
+            group_indexes[find_group_index(i)] = find_group_index(group_index)
+            group_end = max(group_end, end)
+        else:
+            group_index, group_start, group_end = i, start, end
+
+    groups = {}
+    for i, match in enumerate(matches):
+        groups.setdefault(find_group_index(i), []).append(match)
+    return list(groups.values())
+
+
+def _consolidate_circular_matches(search_class, matches, seq_len):
+    """Consolidate matches of a circular sequence with the search class.
+
+    Each group of matches overlapping around the circle is consolidated as
+    if they all overlapped in a linear sequence.
+    """
+    consolidated = []
+    for group in _group_circular_matches(list(matches), seq_len):
+        if len(group) == 1:
+            consolidated.extend(group)
+            continue
+        # Stand-ins for the matches which all overlap, with the same
+        # distances and lengths, and with starts in the same order.
+        group.sort(key=_match_order_key)
+        stand_ins = [
+            Match(i, i + len(group) + (match.end - match.start), match.dist,
+                  matched=i)
+            for i, match in enumerate(group)
+        ]
+        consolidated.extend(
+            group[stand_in.matched]
+            for stand_in in search_class.consolidate_matches(stand_ins)
+        )
+    return sorted(consolidated, key=_match_order_key)
+
+
+def _match_order_key(match):
+    # the same order as comparing the matches themselves, but much faster
+    return match.start, match.end, match.dist
+
+
+def _find_near_matches_both_strands(subsequence, sequence, *args, **kwargs):
+    rc_subsequence = reverse_complement(subsequence)
+    forward_matches = find_near_matches(subsequence, sequence,
+                                        *args, **kwargs)
+    if rc_subsequence == subsequence:
+        # the reverse complement of a palindromic subsequence is identical,
+        # so there is no need to search for it separately
+        reverse_matches = forward_matches
+    else:
+        reverse_matches = find_near_matches(rc_subsequence, sequence,
+                                            *args, **kwargs)
+
+    matches = [
+        StrandedMatch(match.start, match.end, match.dist, match.matched,
+                      strand)
+        for strand, strand_matches in [('+', forward_matches),
+                                       ('-', reverse_matches)]
+        for match in strand_matches
+    ]
+    matches.sort(key=lambda match: match.start)
+    max_matches = kwargs.get('max_matches')
+    return matches[:max_matches] if max_matches is not None else matches
+
+
+def find_near_matches_in_regions(subsequence, sequence, regions,
+                                 max_substitutions=None,
+                                 max_insertions=None,
+                                 max_deletions=None,
+                                 max_l_dist=None,
+                                 equivalences=None):
+    """search for near-matches of subsequence in regions of a sequence
+
+    regions is an iterable of (start_index, end_index) pairs.  Overlapping
+    and adjacent regions are merged, and only matches entirely within a
+    merged region are found.  Each region is searched without copying it,
+    and the indexes of the returned matches are relative to the start of the
+    entire sequence.  The matches are returned sorted by their start indexes.
+
+    See find_near_matches() regarding the limitations on the matches and
+    equivalences.
+    """
+    search_params = LevenshteinSearchParams(max_substitutions,
+                                            max_insertions,
+                                            max_deletions,
+                                            max_l_dist)
+    search_class = choose_search_class(search_params, equivalences,
+                                       subsequence)
+
+    matches = []
+    for start_index, end_index in _merge_regions(sequence, regions):
+        matches.extend(search_class.consolidate_matches(
+            search_class.search(subsequence, sequence, search_params,
+                                start_index, end_index, equivalences)
+        ))
+    return matches
+
+
+def find_near_match_pairs(left_subsequence, right_subsequence, sequence,
+                          min_gap, max_gap,
+                          max_substitutions=None,
+                          max_insertions=None,
+                          max_deletions=None,
+                          max_l_dist=None,
+                          equivalences=None):
+    """search for pairs of near-matches with a bounded gap between them
+
+    This finds near-matches of left_subsequence, each followed by a
+    near-match of right_subsequence starting min_gap to max_gap items after
+    it ends, e.g. the forward and reverse primers of an amplicon.  (For a
+    reverse primer, pass its reverse complement as right_subsequence.)
+
+    right_subsequence is only searched for within the gaps following the
+    matches of left_subsequence.  A list of (left_match, right_match) tuples
+    is returned, sorted by their start indexes.
+
+    See find_near_matches() regarding the limitations on the matches and
+    equivalences; they apply to both subsequences.
+    """
+    if not (isinstance(min_gap, int) and isinstance(max_gap, int)):
+        raise TypeError('min_gap and max_gap must be integers')
+    if not 0 <= min_gap <= max_gap:
+        raise ValueError('must have 0 <= min_gap <= max_gap')
+    search_params = LevenshteinSearchParams(max_substitutions,
+                                            max_insertions,
+                                            max_deletions,
+                                            max_l_dist)
+    left_search_class = choose_search_class(search_params, equivalences,
+                                            left_subsequence)
+    right_search_class = choose_search_class(search_params, equivalences,
+                                             right_subsequence)
+
+    left_matches = left_search_class.consolidate_matches(
+        left_search_class.search(left_subsequence, sequence, search_params,
+                                 0, None, equivalences)
+    )
+    if not left_matches:
+        return []
+
+    # right matches may be at most this long
+    max_right_match_len = len(right_subsequence) + search_params.max_insertions
+    right_regions = _merge_regions(sequence, [
+        (left_match.end + min_gap,
+         left_match.end + max_gap + max_right_match_len)
+        for left_match in left_matches
+    ])
+    right_matches = []
+    for start_index, end_index in right_regions:
+        right_matches.extend(right_search_class.consolidate_matches(
+            right_search_class.search(right_subsequence, sequence,
+                                      search_params, start_index, end_index,
+                                      equivalences)
+        ))
+    right_starts = [right_match.start for right_match in right_matches]
+
+    return [
+        (left_match, right_match)
+        for left_match in left_matches
+        for right_match in right_matches[
+            bisect_left(right_starts, left_match.end + min_gap):
+            bisect_right(right_starts, left_match.end + max_gap)
+        ]
+    ]
+
+
+def _merge_regions(sequence, regions):
+    """Merge overlapping and adjacent regions into sorted, disjoint regions.
+
+    Regions are clamped to the bounds of the sequence, and empty regions are
+    dropped.
+    """
+    clamped_regions = []
+    for region in regions:
+        start_index, end_index = region
+        if not (isinstance(start_index, int) and isinstance(end_index, int)):
+            raise TypeError('regions must be pairs of integers')
+        if start_index > end_index:
+            raise ValueError('region start must not be after its end: %r' %
+                             (region,))
+        start_index, end_index = clamp_index_range(sequence,
+                                                   start_index, end_index)
+        if start_index < end_index:
+            clamped_regions.append((start_index, end_index))
+    clamped_regions.sort()
+
+    merged_regions = []
+    for start_index, end_index in clamped_regions:
+        if merged_regions and start_index <= merged_regions[-1][1]:
+            if end_index > merged_regions[-1][1]:
+                merged_regions[-1][1] = end_index
+        else:
+            merged_regions.append([start_index, end_index])
+    return [tuple(region) for region in merged_regions]
+
+
+def has_near_match(subsequence, sequence,
+                   max_substitutions=None,
+                   max_insertions=None,
+                   max_deletions=None,
+                   max_l_dist=None,
+                   start_index=0,
+                   end_index=None,
+                   equivalences=None,
+                   seed_profile=None,
+                   max_lp_candidates=None):
+    """check whether there is any near-match of subsequence in sequence
+
+    This is equivalent to bool(find_near_matches(...)) with the same
+    arguments, but stops searching at the first match found.
+    """
+    seed_profile = _get_seed_profile(seed_profile, sequence)
+    search_params = LevenshteinSearchParams(max_substitutions,
+                                            max_insertions,
+                                            max_deletions,
+                                            max_l_dist)
+    search_class = choose_search_class(search_params, equivalences,
+                                       subsequence, max_lp_candidates)
+    return search_class.has_match(subsequence, sequence, search_params,
+                                  start_index, end_index, equivalences,
+                                  seed_profile)
+
+
+def count_near_matches(subsequence, sequence,
+                       max_substitutions=None,
+                       max_insertions=None,
+                       max_deletions=None,
+                       max_l_dist=None,
+                       start_index=0,
+                       end_index=None,
+                       equivalences=None,
+                       max_lp_candidates=None):
+    """count the near-matches of subsequence in sequence
+
+    This is equivalent to len(find_near_matches(...)) with the same
+    arguments.  Overlapping matches are counted without consolidating them
+    where possible, but the search itself may still collect all of the
+    matches it finds, so memory use still grows with their number.
     """
     search_params = LevenshteinSearchParams(max_substitutions,
                                             max_insertions,
                                             max_deletions,
                                             max_l_dist)
-    search_class = choose_search_class(search_params)
-    matches = search_class.search(subsequence, sequence, search_params)
-    return search_class.consolidate_matches(matches)
+    search_class = choose_search_class(search_params, equivalences,
+                                       subsequence, max_lp_candidates)
+    return search_class.count_matches(subsequence, sequence, search_params,
+                                      start_index, end_index, equivalences)
+
+
+def find_best_matches(subsequence, sequence, max_l_dist, k=1):
+    """find the k closest near-matches of subsequence in sequence
+
+    Returns a list of at most k Match objects, sorted by distance and then
+    by start index.
+
+    The search begins with exact matching and increases the allowed
+    Levenshtein distance one step at a time, up to max_l_dist, stopping as
+    soon as at least k matches have been found.  This avoids paying for a
+    search with the loosest bound when close matches exist.
+    """
+    if not isinstance(k, int) or k < 1:
+        raise TypeError('k must be a positive integer')
+    # validate max_l_dist
+    LevenshteinSearchParams(max_l_dist=max_l_dist)
+
+    for l_dist in range(max_l_dist + 1):
+        search_params = LevenshteinSearchParams(max_l_dist=l_dist)
+        search_class = choose_search_class(search_params)
+        matches = search_class.consolidate_matches(
+            search_class.search(subsequence, sequence, search_params))
+        if len(matches) >= k:
+            break
+
+    return sorted(matches, key=lambda match: (match.dist, match.start))[:k]
+
+
+_RESULT_FORMATS = ('matches', 'columns')
+
+
+def _check_result_format(result_format):
+    if result_format not in _RESULT_FORMATS:
+        raise ValueError('result_format must be one of: %s' % (
+            ', '.join(map(repr, _RESULT_FORMATS))))
+
+
+def _check_max_matches(max_matches):
+    if max_matches is not None and not (
+            isinstance(max_matches, int) and max_matches > 0
+    ):
+        raise TypeError('max_matches must be a positive integer or None.')
+
+
+_ANCHORS = ('start', 'end', 'both')
+
+
+def _anchored_search_range(subsequence, sequence, search_params,
+                           anchor, anchor_window, start_index, end_index):
+    """Get the index range to search and a filter for anchored matches.
+
+    Returns a (start_index, end_index, match_filter) tuple.
+    """
+    if anchor not in _ANCHORS:
+        raise ValueError('anchor must be one of: %s' % (
+            ', '.join(map(repr, _ANCHORS))))
+    if not (isinstance(anchor_window, int) and anchor_window > 0):
+        raise TypeError('anchor_window must be a positive integer.')
+
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    # matches may be at most this long
+    max_match_len = len(subsequence) + search_params.max_insertions
+
+    search_start, search_end = start_index, end_index
+    # matches must start before first_start and end after last_end
+    first_start, last_end = end_index + 1, start_index - 1
+    if anchor in ('start', 'both'):
+        first_start = start_index + anchor_window
+        search_end = min(search_end, first_start - 1 + max_match_len)
+    if anchor in ('end', 'both'):
+        last_end = end_index - anchor_window
+        search_start = max(search_start, last_end + 1 - max_match_len)
+    search_end = max(search_start, search_end)
+
+    def match_filter(match):
+        return match.start < first_start and match.end > last_end
+
+    return search_start, search_end, match_filter
+
+
+def choose_search_class(search_params, equivalences=None, subsequence=None,
+                        max_lp_candidates=None):
+    """choose a suitable fuzzy search implementation
+
+    If max_lp_candidates is given, the chosen class uses it instead of
+    fuzzysearch.generic_search.MAX_LP_CANDIDATES as the limit on the number
+    of candidates kept by the linear programming search, if it uses it.
+    Beyond that limit, the part of the sequence being searched is searched
+    in bounded memory instead, finding the best match of every group of
+    overlapping matches.
+    """
+    _check_max_lp_candidates(max_lp_candidates)
+    search_class = _choose_search_class(search_params, equivalences,
+                                        subsequence)
+    if max_lp_candidates is not None and \
+            hasattr(search_class, 'max_lp_candidates'):
+        search_class = _with_max_lp_candidates(search_class,
+                                               max_lp_candidates)
+    return search_class
+
+
+def _check_max_lp_candidates(max_lp_candidates):
+    if max_lp_candidates is not None and not (
+            isinstance(max_lp_candidates, int) and max_lp_candidates > 0
+    ):
+        raise TypeError(
+            'max_lp_candidates must be a positive integer or None.')
 
 
-def choose_search_class(search_params):
+def _choose_search_class(search_params, equivalences, subsequence):
     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
 
     # if the limitations are so strict that only exact matches are allowed,
-    # use search_exact()
-    if max_l_dist == 0:
+    # use search_exact(), unless an equivalence table is given, which it
+    # can't honor
+    if max_l_dist == 0 and equivalences is None:
         return ExactSearch
 
     # if only substitutions are allowed, use find_near_matches_substitutions()
@@ -78,7 +706,26 @@ def choose_search_class(search_params):
     ):
         return LevenshteinSearch
 
-    # if none of the special cases above are met, use the most generic version
+    # if either insertions or deletions aren't allowed, use the n-gram
+    # searches specialized for these cases, unless the n-grams would be too
+    # short for them to be faster
+    elif max_deletions == 0 and (
+            subsequence is None or _single_indel_type_is_expected_faster(
+                subsequence, max_substitutions, max_insertions, max_l_dist,
+                equivalences)):
+        return NoDeletionsSearch
+    elif max_insertions == 0 and (
+            subsequence is None or _single_indel_type_is_expected_faster(
+                subsequence, max_substitutions, max_deletions, max_l_dist,
+                equivalences)):
+        return NoInsertionsSearch
+
+    # if none of the special cases above are met, use the most generic
+    # version, filtering with bit-parallel Levenshtein distances when the
+    # subsequence is given and this is expected to be faster
+    elif subsequence is not None and _bit_parallel_is_expected_faster(
+            subsequence, max_l_dist, equivalences):
+        return BitParallelSearch
     else:
         return GenericSearch
 
@@ -88,6 +735,8 @@ def find_near_matches_in_file(subsequence, sequence_file,
                               max_insertions=None,
                               max_deletions=None,
                               max_l_dist=None,
+                              result_format='matches',
+                              max_matches=None,
                               _chunk_size=2**20):
     """search for near-matches of subsequence in a file
 
@@ -99,31 +748,41 @@ def find_near_matches_in_file(subsequence, sequence_file,
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
       (a.k.a. the Levenshtein distance)
+
+    See find_near_matches() regarding result_format and max_matches.  When
+    max_matches is given, reading from the file also stops as soon as the
+    first max_matches matches are known.
     """
+    _check_result_format(result_format)
+    _check_max_matches(max_matches)
     search_params = LevenshteinSearchParams(max_substitutions,
                                             max_insertions,
                                             max_deletions,
                                             max_l_dist)
-    search_class = choose_search_class(search_params)
+    search_class = choose_search_class(search_params,
+                                       subsequence=subsequence)
 
     if (
             'b' in getattr(sequence_file, 'mode', '')
             or
             isinstance(sequence_file, io.RawIOBase)
     ):
-        matches = _search_binary_file(subsequence,
+        chunks = _search_binary_file(subsequence,
+                                     sequence_file,
+                                     search_params,
+                                     search_class,
+                                     _chunk_size=_chunk_size)
+    else:
+        chunks = _search_unicode_file(subsequence,
                                       sequence_file,
                                       search_params,
                                       search_class,
                                       _chunk_size=_chunk_size)
-    else:
-        matches = _search_unicode_file(subsequence,
-                                       sequence_file,
-                                       search_params,
-                                       search_class,
-                                       _chunk_size=_chunk_size)
 
-    return search_class.consolidate_matches(matches)
+    matches = _consolidate_chunked_matches(search_class, chunks, max_matches)
+    if result_format == 'columns':
+        return MatchArray.from_matches(matches)
+    return matches
 
 
 def _search_binary_file(subsequence, sequence_file, search_params, search_class,
@@ -156,17 +815,23 @@ def _search_binary_file(subsequence, sequence_file, search_params, search_class,
     chunk_len = n_read
     while n_read:
         search_bytes = chunk_bytes if chunk_len == CHUNK_SIZE else chunk_bytes[:chunk_len]
-        for match in search_class.search(subseq_bytearray, search_bytes, search_params):
-            yield attr.evolve(match,
-                              start=match.start + offset,
-                              end=match.end + offset)
+        matches = [
+            attr.evolve(match,
+                        start=match.start + offset,
+                        end=match.end + offset)
+            for match in search_class.search(subseq_bytearray, search_bytes,
+                                             search_params)
+        ]
 
         if keep_bytes > 0:
             n_to_keep = min(keep_bytes, chunk_len)
-            chunk_memview[:n_to_keep] = chunk_memview[chunk_len - n_to_keep:chunk_len]
         else:
             n_to_keep = 0
         offset += chunk_len - n_to_keep
+        yield matches, offset
+
+        if n_to_keep > 0:
+            chunk_memview[:n_to_keep] = chunk_memview[chunk_len - n_to_keep:chunk_len]
         n_read = sequence_file.readinto(chunk_memview[n_to_keep:])
         chunk_len = n_to_keep + n_read
 
@@ -185,16 +850,106 @@ def _search_unicode_file(subsequence, sequence_file, search_params, search_class
     chunk = sequence_file.read(CHUNK_SIZE)
     offset = 0
     while chunk:
-        for match in search_class.search(subsequence, chunk, search_params):
-            yield attr.evolve(match,
-                              start=match.start + offset,
-                              end=match.end + offset)
+        matches = [
+            attr.evolve(match,
+                        start=match.start + offset,
+                        end=match.end + offset)
+            for match in search_class.search(subsequence, chunk, search_params)
+        ]
 
         n_to_keep = min(keep_chars, len(chunk))
         offset += len(chunk) - n_to_keep
+        yield matches, offset
+
         if n_to_keep:
             chunk = chunk[-n_to_keep:] + sequence_file.read(CHUNK_SIZE)
             if len(chunk) == n_to_keep:
                 break
         else:
             chunk = sequence_file.read(CHUNK_SIZE)
+
+
+def _search_sequence_in_chunks(subsequence, sequence, search_params,
+                               search_class, start_index=0, end_index=None,
+                               equivalences=None, seed_profile=None,
+                               _chunk_size=2**12):
+    """Search a sequence in overlapping chunks of increasing size.
+
+    This generates (matches, offset) pairs in the same way as the file
+    searching functions, allowing the search to be stopped once enough
+    matches have been found.
+    """
+    if not subsequence:
+        raise ValueError('subsequence must not be empty')
+
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+
+    keep_items = (
+        len(subsequence) - 1 +
+        search_class.extra_items_for_chunked_search(subsequence, search_params)
+    )
+    chunk_size = max(_chunk_size, 4 * (keep_items + 1))
+
+    offset = start_index
+    while True:
+        matches = list(search_class.search(
+            subsequence, sequence, search_params,
+            offset, min(offset + chunk_size, end_index), equivalences,
+            seed_profile,
+        ))
+        if offset + chunk_size >= end_index:
+            yield matches, end_index
+            break
+        offset += chunk_size - keep_items
+        yield matches, offset
+
+        # grow the chunks, so that searching long sequences for many
+        # matches doesn't require too many chunks
+        chunk_size *= 2
+
+
+def _consolidate_chunked_matches(search_class, chunks, max_matches=None):
+    """Consolidate the matches found by a chunked search.
+
+    chunks must generate (matches, offset) pairs, where no matches found in
+    later chunks may start before offset.  If max_matches is given, this
+    stops consuming chunks as soon as the first max_matches consolidated
+    matches are known.
+    """
+    if max_matches is None:
+        return search_class.consolidate_matches(
+            match
+            for chunk_matches, _offset in chunks
+            for match in chunk_matches
+        )
+
+    matches = []
+    pending_matches = []
+    for chunk_matches, offset in chunks:
+        pending_matches.extend(chunk_matches)
+
+        # groups of overlapping matches which end before the offset can't
+        # overlap any later matches, and therefore their consolidated
+        # matches are final
+        # (the order of the matches is kept, so that consolidation picks
+        # the same matches as when searching without chunks)
+        pending_groups = [
+            group for group in group_matches(pending_matches)
+            if max(match.end for match in group) > offset
+        ]
+        done_matches = [
+            match for match in pending_matches
+            if not any(match in group for group in pending_groups)
+        ]
+        pending_matches = [
+            match for match in pending_matches
+            if any(match in group for group in pending_groups)
+        ]
+        matches.extend(search_class.consolidate_matches(done_matches))
+
+        if len(matches) >= max_matches:
+            return matches[:max_matches]
+
+    matches.extend(search_class.consolidate_matches(pending_matches))
+    return matches[:max_matches]
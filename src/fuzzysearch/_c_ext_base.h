@@ -33,4 +33,94 @@ inline static int is_simple_buffer(Py_buffer pybuf) {
     );
 }
 
+/* Restrict the searched part of a sequence to [start_index, end_index),
+   clamping the indexes to the sequence's bounds.  end_index == -1 means the
+   end of the sequence.  Returns -1 with an exception set if either index is
+   otherwise negative. */
+inline static int restrict_to_index_range(const char **seq, Py_ssize_t *seq_len,
+                                          Py_ssize_t *start_index,
+                                          Py_ssize_t end_index) {
+    if (unlikely(*start_index < 0)) {
+        PyErr_SetString(PyExc_ValueError, "start_index must be non-negative");
+        return -1;
+    }
+    if (end_index == -1) end_index = *seq_len;
+    if (unlikely(end_index < 0)) {
+        PyErr_SetString(PyExc_ValueError, "end_index must be non-negative");
+        return -1;
+    }
+
+    if (end_index > *seq_len) end_index = *seq_len;
+    if (*start_index > end_index) *start_index = end_index;
+    *seq += *start_index;
+    *seq_len = end_index - *start_index;
+    return 0;
+}
+
+/* Equivalence tables are bytes-like objects of length 256*256, where
+   table[a * 256 + b] is non-zero if the item a in the searched sequence
+   matches the item b in the subsequence. */
+#define EQUIVALENCE_TABLE_SIZE (256 * 256)
+
+/* Whether a sequence item matches a subsequence item, according to an
+   optional equivalence table (NULL means comparing for equality). */
+#define ITEMS_MATCH(table, seq_item, subseq_item)                      \
+    ((table) == NULL ?                                                 \
+     (seq_item) == (subseq_item) :                                     \
+     (table)[((unsigned char) (seq_item) << 8) |                       \
+             (unsigned char) (subseq_item)] != 0)
+
+/* Get the equivalence table from an optional argument parsed with the "z*"
+   format, whose buffer must be zero-initialized.  Sets *table to NULL if
+   no table was given.  Returns -1 with an exception set if the table is
+   invalid. */
+inline static int get_equivalence_table(Py_buffer *table_pybuf,
+                                        const unsigned char **table) {
+    if (table_pybuf->buf == NULL) {
+        *table = NULL;
+        return 0;
+    }
+    if (unlikely(!is_simple_buffer(*table_pybuf) ||
+                 table_pybuf->len != EQUIVALENCE_TABLE_SIZE)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "an equivalence table must be of length 256*256");
+        return -1;
+    }
+    *table = (const unsigned char *) table_pybuf->buf;
+    return 0;
+}
+
+/* A growable column of 64-bit integers, used for returning many results
+   without creating a Python object for each of them. */
+typedef struct {
+    long long *data;
+    Py_ssize_t len;
+    Py_ssize_t alloc_size;
+} int64_column;
+
+inline static int int64_column_append(int64_column *column, long long value) {
+    long long *new_data;
+    Py_ssize_t new_alloc_size;
+
+    if (unlikely(column->len == column->alloc_size)) {
+        new_alloc_size = column->alloc_size ? column->alloc_size * 2 : 64;
+        new_data = (long long *) realloc(column->data,
+                                         new_alloc_size * sizeof(long long));
+        if (new_data == NULL) {
+            return -1;
+        }
+        column->data = new_data;
+        column->alloc_size = new_alloc_size;
+    }
+    column->data[column->len++] = value;
+    return 0;
+}
+
+/* Return the column's contents as a bytes object, which is suitable for
+   array.array('q').frombytes(). */
+inline static PyObject *int64_column_to_bytes(int64_column *column) {
+    return PyBytes_FromStringAndSize((const char *) column->data,
+                                     column->len * sizeof(long long));
+}
+
 #endif
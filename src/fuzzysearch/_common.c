@@ -1,5 +1,7 @@
 #include "src/fuzzysearch/_c_ext_base.h"
+#include "src/fuzzysearch/hamming.h"
 #include "src/fuzzysearch/memmem.h"
+#include <stdint.h>
 
 
 static PyObject *
@@ -7,8 +9,10 @@ search_exact_byteslike(PyObject *self, PyObject *args, PyObject *kwdict) {
     /* input params */
     Py_buffer subseq_pybuf, seq_pybuf;
     Py_ssize_t start_index=0, end_index=-1;
+    /* if not zero, stop after finding this many matches */
+    Py_ssize_t max_matches=0;
 
-    static char *kwlist[] = {"subsequence", "sequence", "start_index", "end_index", NULL};
+    static char *kwlist[] = {"subsequence", "sequence", "start_index", "end_index", "max_matches", NULL};
 
     const char *subseq, *seq;
     Py_ssize_t subseq_len, seq_len;
@@ -18,7 +22,7 @@ search_exact_byteslike(PyObject *self, PyObject *args, PyObject *kwdict) {
     int subseq_sum;
     char *next_match_ptr;
 
-    const char* argspec = "y*y*|nn:search_exact_byteslike";
+    const char* argspec = "y*y*|nnn:search_exact_byteslike";
 
     if (unlikely(!PyArg_ParseTupleAndKeywords(
         args, kwdict,
@@ -27,7 +31,8 @@ search_exact_byteslike(PyObject *self, PyObject *args, PyObject *kwdict) {
         &subseq_pybuf,
         &seq_pybuf,
         &start_index,
-        &end_index
+        &end_index,
+        &max_matches
     ))) {
         return NULL;
     }
@@ -40,6 +45,11 @@ search_exact_byteslike(PyObject *self, PyObject *args, PyObject *kwdict) {
         goto error;
     }
 
+    if (unlikely(max_matches < 0)) {
+        PyErr_SetString(PyExc_ValueError, "max_matches must be non-negative");
+        goto error;
+    }
+
     subseq = (const char*)(subseq_pybuf.buf);
     seq = (const char*)(seq_pybuf.buf);
     subseq_len = subseq_pybuf.len;
@@ -95,6 +105,10 @@ search_exact_byteslike(PyObject *self, PyObject *args, PyObject *kwdict) {
         }
         Py_DECREF(next_result);
 
+        if (PyList_GET_SIZE(results) == max_matches) {
+            break;
+        }
+
         next_match_ptr = simple_memmem_with_needle_sum(
             next_match_ptr + 1, seq_len - next_match_index - 1,
             subseq, subseq_len,
@@ -112,30 +126,66 @@ error:
 }
 
 
+/* Get an implementation of count_differences_with_maximum() by name, if it
+   is supported by the CPU.  Sets a ValueError and returns NULL otherwise. */
+static count_differences_with_maximum_func
+get_count_differences_implementation(const char *name)
+{
+    if (name == NULL) {
+        return count_differences_with_maximum;
+    }
+    if (strcmp(name, "scalar") == 0) {
+        return scalar_count_differences_with_maximum;
+    }
+#ifdef X86_SIMD
+    if (strcmp(name, "sse2") == 0) {
+        return sse2_count_differences_with_maximum;
+    }
+    if (strcmp(name, "avx2") == 0 && cpu_supports_avx2()) {
+        return avx2_count_differences_with_maximum;
+    }
+#endif
+    PyErr_Format(PyExc_ValueError,
+                 "unsupported count_differences implementation: %s", name);
+    return NULL;
+}
+
 static PyObject *
 count_differences_with_maximum_byteslike(PyObject *self, PyObject *args)
 {
     /* input params */
     Py_buffer seq1_pybuf, seq2_pybuf;
     int max_differences;
+    /* optional equivalence table; seq1 is the searched sequence */
+    Py_buffer table_pybuf = {0};
+    /* optional name of the implementation to use, for tests and benchmarks */
+    const char *implementation = NULL;
 
     const char *seq1, *seq2;
     Py_ssize_t seq1_len, seq2_len;
+    const unsigned char *table;
+    count_differences_with_maximum_func count_func;
     Py_ssize_t i;
     int n_differences;
 
-    const char* argspec = "y*y*i";
+    const char* argspec = "y*y*i|z*z";
 
     if (!PyArg_ParseTuple(
         args,
         argspec,
         &seq1_pybuf,
         &seq2_pybuf,
-        &max_differences
+        &max_differences,
+        &table_pybuf,
+        &implementation
     )) {
         return NULL;
     }
 
+    if (unlikely(get_equivalence_table(&table_pybuf, &table) == -1)) {
+        goto error;
+    }
+
     if (unlikely(!(
         is_simple_buffer(seq1_pybuf) &&
         is_simple_buffer(seq2_pybuf)
@@ -144,6 +194,11 @@ count_differences_with_maximum_byteslike(PyObject *self, PyObject *args)
         goto error;
     }
 
+    count_func = get_count_differences_implementation(implementation);
+    if (unlikely(count_func == NULL)) {
+        goto error;
+    }
+
     seq1 = (const char*)(seq1_pybuf.buf);
     seq2 = (const char*)(seq2_pybuf.buf);
     seq1_len = seq1_pybuf.len;
@@ -155,23 +210,767 @@ count_differences_with_maximum_byteslike(PyObject *self, PyObject *args)
         goto error;
     }
 
-    n_differences = max_differences;
-    for (i=seq1_len; i && n_differences; --i) {
-        if ((*seq1) != (*seq2)) --n_differences;
-        ++seq1;
-        ++seq2;
+    if (table == NULL && max_differences >= 0) {
+        n_differences = (int) count_func(seq1, seq2, (size_t) seq1_len,
+                                         (size_t) max_differences);
+    } else {
+        n_differences = max_differences;
+        for (i=seq1_len; i && n_differences; --i) {
+            if (!ITEMS_MATCH(table, *seq1, *seq2)) --n_differences;
+            ++seq1;
+            ++seq2;
+        }
+        n_differences = max_differences - n_differences;
     }
 
     PyBuffer_Release(&seq1_pybuf);
     PyBuffer_Release(&seq2_pybuf);
-    return PyLong_FromLong((long) (max_differences - n_differences));
+    PyBuffer_Release(&table_pybuf);
+    return PyLong_FromLong((long) n_differences);
 
 error:
     PyBuffer_Release(&seq1_pybuf);
     PyBuffer_Release(&seq2_pybuf);
+    PyBuffer_Release(&table_pybuf);
+    return NULL;
+}
+
+/* Get an implementation of simple_memmem_with_needle_sum() by name, if it
+   is supported by the CPU.  Sets a ValueError and returns NULL otherwise. */
+static memmem_with_needle_sum_func
+get_memmem_implementation(const char *name)
+{
+    if (name == NULL) {
+        return simple_memmem_with_needle_sum;
+    }
+    if (strcmp(name, "scalar") == 0) {
+        return scalar_memmem_with_needle_sum;
+    }
+#ifdef X86_SIMD
+    if (strcmp(name, "sse2") == 0) {
+        return sse2_memmem_with_needle_sum;
+    }
+    if (strcmp(name, "avx2") == 0 && cpu_supports_avx2()) {
+        return avx2_memmem_with_needle_sum;
+    }
+#endif
+    PyErr_Format(PyExc_ValueError,
+                 "unsupported memmem implementation: %s", name);
+    return NULL;
+}
+
+static PyObject *
+memmem_byteslike(PyObject *self, PyObject *args)
+{
+    /* input params */
+    Py_buffer subseq_pybuf, seq_pybuf;
+    const char *implementation = NULL;
+
+    memmem_with_needle_sum_func memmem_func;
+    const char *subseq, *seq, *match_ptr;
+
+    const char* argspec = "y*y*|z:memmem_byteslike";
+
+    if (unlikely(!PyArg_ParseTuple(
+        args,
+        argspec,
+        &subseq_pybuf,
+        &seq_pybuf,
+        &implementation
+    ))) {
+        return NULL;
+    }
+
+    if (unlikely(!(
+        is_simple_buffer(subseq_pybuf) &&
+        is_simple_buffer(seq_pybuf)
+    ))) {
+        PyErr_SetString(PyExc_TypeError, "only contiguous sequences of single-byte values are supported");
+        goto error;
+    }
+
+    memmem_func = get_memmem_implementation(implementation);
+    if (unlikely(memmem_func == NULL)) {
+        goto error;
+    }
+
+    subseq = (const char*)(subseq_pybuf.buf);
+    seq = (const char*)(seq_pybuf.buf);
+    match_ptr = memmem_func(seq, (size_t) seq_pybuf.len,
+                            subseq, (size_t) subseq_pybuf.len,
+                            calc_sum(subseq, (size_t) subseq_pybuf.len));
+
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    if (match_ptr == NULL) {
+        Py_RETURN_NONE;
+    }
+    return PyLong_FromSsize_t(match_ptr - seq);
+
+error:
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    return NULL;
+}
+
+/* The names of the implementations of the SIMD-accelerated functions which
+   are supported by the CPU, fastest first. */
+static PyObject *
+available_implementations(PyObject *self, PyObject *args)
+{
+#ifdef X86_SIMD
+    if (cpu_supports_avx2()) {
+        return Py_BuildValue("(sss)", "avx2", "sse2", "scalar");
+    }
+    return Py_BuildValue("(ss)", "sse2", "scalar");
+#else
+    return Py_BuildValue("(s)", "scalar");
+#endif
+}
+
+/* Append the region [region_start, region_end) to a list, as a tuple. */
+static int
+append_region(PyObject *regions, Py_ssize_t region_start, Py_ssize_t region_end)
+{
+    PyObject *region;
+    int result;
+
+    region = Py_BuildValue("(nn)", region_start, region_end);
+    if (unlikely(region == NULL)) {
+        return -1;
+    }
+    result = PyList_Append(regions, region);
+    Py_DECREF(region);
+    return result;
+}
+
+#define QGRAM_CODE(seq, index, q) \
+    ((q) == 1 ? (unsigned char) (seq)[(index)] : \
+     ((unsigned int) (unsigned char) (seq)[(index)] << 8) | \
+     (unsigned char) (seq)[(index) + 1])
+
+static PyObject *
+find_candidate_regions_byteslike(PyObject *self, PyObject *args)
+{
+    /* input params */
+    Py_buffer subseq_pybuf, seq_pybuf;
+    Py_ssize_t q, threshold, window_len, start_index, end_index;
+
+    const char *subseq, *seq;
+    Py_ssize_t subseq_len, seq_len;
+    /* counts of the subsequence's and the current window's q-grams */
+    unsigned int *subseq_counts = NULL, *window_counts = NULL;
+    /* a ring buffer of the q-grams starting in the current window */
+    unsigned int *window_qgrams = NULL;
+    Py_ssize_t max_window_qgrams, n_window_qgrams, ring_index;
+    Py_ssize_t n_shared, i, window_start;
+    Py_ssize_t region_start = -1, region_end = -1;
+    unsigned int qgram, removed;
+    PyObject *regions = NULL;
+
+    const char* argspec = "y*y*nnnnn:find_candidate_regions_byteslike";
+
+    if (unlikely(!PyArg_ParseTuple(
+        args,
+        argspec,
+        &subseq_pybuf,
+        &seq_pybuf,
+        &q,
+        &threshold,
+        &window_len,
+        &start_index,
+        &end_index
+    ))) {
+        return NULL;
+    }
+
+    if (unlikely(!(
+        is_simple_buffer(subseq_pybuf) &&
+        is_simple_buffer(seq_pybuf)
+    ))) {
+        PyErr_SetString(PyExc_TypeError, "only contiguous sequences of single-byte values are supported");
+        goto error;
+    }
+
+    if (unlikely(q != 1 && q != 2)) {
+        PyErr_SetString(PyExc_ValueError, "q must be 1 or 2");
+        goto error;
+    }
+    if (unlikely(window_len < q)) {
+        PyErr_SetString(PyExc_ValueError, "window_len must be at least q");
+        goto error;
+    }
+
+    subseq = (const char*)(subseq_pybuf.buf);
+    seq = (const char*)(seq_pybuf.buf);
+    subseq_len = subseq_pybuf.len;
+    seq_len = seq_pybuf.len;
+
+    if (unlikely(restrict_to_index_range(&seq, &seq_len,
+                                         &start_index, end_index) == -1)) {
+        goto error;
+    }
+
+    max_window_qgrams = window_len - q + 1;
+    subseq_counts = (unsigned int *) PyMem_Calloc((size_t) 1 << (8 * q),
+                                                  sizeof(unsigned int));
+    window_counts = (unsigned int *) PyMem_Calloc((size_t) 1 << (8 * q),
+                                                  sizeof(unsigned int));
+    window_qgrams = (unsigned int *) PyMem_Malloc(
+        max_window_qgrams * sizeof(unsigned int));
+    if (unlikely(!subseq_counts || !window_counts || !window_qgrams)) {
+        PyErr_NoMemory();
+        goto error;
+    }
+
+    regions = PyList_New(0);
+    if (unlikely(!regions)) {
+        goto error;
+    }
+
+    for (i = 0; i + q <= subseq_len; i++) {
+        subseq_counts[QGRAM_CODE(subseq, i, q)]++;
+    }
+
+    n_shared = 0;
+    n_window_qgrams = 0;
+    ring_index = 0;
+    for (i = 0; i + q <= seq_len; i++) {
+        if (n_window_qgrams == max_window_qgrams) {
+            removed = window_qgrams[ring_index];
+            if (--window_counts[removed] < subseq_counts[removed]) {
+                --n_shared;
+            }
+        } else {
+            ++n_window_qgrams;
+        }
+        qgram = QGRAM_CODE(seq, i, q);
+        window_qgrams[ring_index] = qgram;
+        if (++ring_index == max_window_qgrams) ring_index = 0;
+        if (window_counts[qgram]++ < subseq_counts[qgram]) {
+            ++n_shared;
+        }
+
+        if (n_shared >= threshold) {
+            window_start = i + q - window_len;
+            if (window_start < 0) window_start = 0;
+            if (region_end != -1 && window_start <= region_end) {
+                region_end = i + q;
+            } else {
+                if (region_end != -1 && unlikely(append_region(
+                        regions, region_start + start_index,
+                        region_end + start_index) == -1)) {
+                    goto error;
+                }
+                region_start = window_start;
+                region_end = i + q;
+            }
+        }
+    }
+    if (region_end != -1 && unlikely(append_region(
+            regions, region_start + start_index,
+            region_end + start_index) == -1)) {
+        goto error;
+    }
+
+    PyMem_Free(subseq_counts);
+    PyMem_Free(window_counts);
+    PyMem_Free(window_qgrams);
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    return regions;
+
+error:
+    Py_XDECREF(regions);
+    PyMem_Free(subseq_counts);
+    PyMem_Free(window_counts);
+    PyMem_Free(window_qgrams);
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    return NULL;
+}
+
+/* Find the regions around the ends of near-matches within max_l_dist, which
+   are found using Myers' bit-parallel algorithm.  See
+   fuzzysearch/bit_parallel.py. */
+static PyObject *
+find_bit_parallel_regions_byteslike(PyObject *self, PyObject *args)
+{
+    /* input params */
+    Py_buffer subseq_pybuf, seq_pybuf;
+    Py_ssize_t max_l_dist, window_len, start_index, end_index;
+    /* optional equivalence table */
+    Py_buffer table_pybuf = {0};
+
+    const char *subseq, *seq;
+    Py_ssize_t subseq_len, seq_len;
+    const unsigned char *table;
+    /* the bit-vectors of the subsequence items each byte value matches */
+    uint64_t match_masks[256];
+    uint64_t mask, last_bit, eq, xv, xh;
+    uint64_t plus_vertical, minus_vertical, plus_horizontal, minus_horizontal;
+    Py_ssize_t dist, i, window_start;
+    Py_ssize_t region_start = -1, region_end = -1;
+    unsigned int item;
+    PyObject *regions = NULL;
+
+    const char* argspec = "y*y*nnnn|z*:find_bit_parallel_regions_byteslike";
+
+    if (unlikely(!PyArg_ParseTuple(
+        args,
+        argspec,
+        &subseq_pybuf,
+        &seq_pybuf,
+        &max_l_dist,
+        &window_len,
+        &start_index,
+        &end_index,
+        &table_pybuf
+    ))) {
+        return NULL;
+    }
+
+    if (unlikely(get_equivalence_table(&table_pybuf, &table) == -1)) {
+        goto error;
+    }
+
+    if (unlikely(!(
+        is_simple_buffer(subseq_pybuf) &&
+        is_simple_buffer(seq_pybuf)
+    ))) {
+        PyErr_SetString(PyExc_TypeError, "only contiguous sequences of single-byte values are supported");
+        goto error;
+    }
+
+    subseq = (const char*)(subseq_pybuf.buf);
+    seq = (const char*)(seq_pybuf.buf);
+    subseq_len = subseq_pybuf.len;
+    seq_len = seq_pybuf.len;
+
+    if (unlikely(subseq_len < 1 || subseq_len > 64)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "the subsequence's length must be between 1 and 64");
+        goto error;
+    }
+
+    if (unlikely(restrict_to_index_range(&seq, &seq_len,
+                                         &start_index, end_index) == -1)) {
+        goto error;
+    }
+
+    regions = PyList_New(0);
+    if (unlikely(!regions)) {
+        goto error;
+    }
+
+    for (item = 0; item < 256; item++) {
+        eq = 0;
+        for (i = 0; i < subseq_len; i++) {
+            if (ITEMS_MATCH(table, (char) item, subseq[i])) {
+                eq |= (uint64_t) 1 << i;
+            }
+        }
+        match_masks[item] = eq;
+    }
+
+    mask = subseq_len == 64 ? ~(uint64_t) 0 :
+        ((uint64_t) 1 << subseq_len) - 1;
+    last_bit = (uint64_t) 1 << (subseq_len - 1);
+
+    /* the +1 and -1 vertical differences, initially all +1 */
+    plus_vertical = mask;
+    minus_vertical = 0;
+    dist = subseq_len;
+    for (i = 0; i < seq_len; i++) {
+        eq = match_masks[(unsigned char) seq[i]];
+
+        xv = eq | minus_vertical;
+        xh = ((((eq & plus_vertical) + plus_vertical) & mask)
+              ^ plus_vertical) | eq;
+        plus_horizontal = minus_vertical | (~(xh | plus_vertical) & mask);
+        minus_horizontal = plus_vertical & xh;
+        if (plus_horizontal & last_bit) {
+            ++dist;
+        } else if (minus_horizontal & last_bit) {
+            --dist;
+        }
+        plus_horizontal = (plus_horizontal << 1) & mask;
+        minus_horizontal = (minus_horizontal << 1) & mask;
+        plus_vertical = minus_horizontal | (~(xv | plus_horizontal) & mask);
+        minus_vertical = plus_horizontal & xv;
+
+        if (dist <= max_l_dist) {
+            window_start = i + 1 - window_len;
+            if (window_start < 0) window_start = 0;
+            if (region_end != -1 && window_start <= region_end) {
+                region_end = i + 1;
+            } else {
+                if (region_end != -1 && unlikely(append_region(
+                        regions, region_start + start_index,
+                        region_end + start_index) == -1)) {
+                    goto error;
+                }
+                region_start = window_start;
+                region_end = i + 1;
+            }
+        }
+    }
+    if (region_end != -1 && unlikely(append_region(
+            regions, region_start + start_index,
+            region_end + start_index) == -1)) {
+        goto error;
+    }
+
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    PyBuffer_Release(&table_pybuf);
+    return regions;
+
+error:
+    Py_XDECREF(regions);
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    PyBuffer_Release(&table_pybuf);
+    return NULL;
+}
+
+/* Items of a sequence read forwards (step 1) or backwards (step -1).  When
+   reading backwards, ptr points just past the first item to be read. */
+#define STRIDED_ITEM(ptr, i, step) \
+    ((step) > 0 ? (ptr)[(i)] : (ptr)[-1 - (i)])
+
+/* Write the (n_subs, n_indels) pairs which are within the limits to
+   results, skipping negative scores.  Returns the number of pairs. */
+static Py_ssize_t
+collect_expansions(const Py_ssize_t *scores, Py_ssize_t max_indels,
+                   Py_ssize_t max_subs, Py_ssize_t max_l_dist,
+                   Py_ssize_t *results)
+{
+    Py_ssize_t n_indels, n_results = 0;
+
+    for (n_indels = 0; n_indels <= max_indels; n_indels++) {
+        if (scores[n_indels] >= 0 &&
+            scores[n_indels] <= max_subs &&
+            scores[n_indels] + n_indels <= max_l_dist)
+        {
+            results[2 * n_results] = scores[n_indels];
+            results[2 * n_results + 1] = n_indels;
+            ++n_results;
+        }
+    }
+    return n_results;
+}
+
+/* Find the ways of matching the subsequence to a prefix of the sequence,
+   allowing substitutions and insertions, as in no_deletions._expand_all().
+
+   The results are written to results as (n_subs, n_ins) pairs, and their
+   number is returned.  scores must have room for 2 * (max_ins + 1) items. */
+static Py_ssize_t
+expand_no_deletions(const char *subseq, Py_ssize_t subseq_len,
+                    const char *seq, Py_ssize_t seq_len, int step,
+                    Py_ssize_t max_subs, Py_ssize_t max_ins,
+                    Py_ssize_t max_l_dist,
+                    Py_ssize_t *scores, Py_ssize_t *results)
+{
+    Py_ssize_t subseq_index, n_ins, score;
+    char item;
+
+    /* insertions can't take the match beyond the end of the sequence */
+    if (max_ins > seq_len - subseq_len) max_ins = seq_len - subseq_len;
+    if (max_ins < 0) return 0;
+
+    for (n_ins = 0; n_ins <= max_ins; n_ins++) scores[n_ins] = 0;
+    for (subseq_index = 0; subseq_index < subseq_len; subseq_index++) {
+        item = STRIDED_ITEM(subseq, subseq_index, step);
+        scores[0] += item != STRIDED_ITEM(seq, subseq_index, step);
+        for (n_ins = 1; n_ins <= max_ins; n_ins++) {
+            score = scores[n_ins] +
+                (item != STRIDED_ITEM(seq, subseq_index + n_ins, step));
+            scores[n_ins] = score < scores[n_ins - 1] ? score : scores[n_ins - 1];
+        }
+        /* scores[max_ins] is the smallest, and these never decrease */
+        if (scores[max_ins] > max_subs) return 0;
+    }
+
+    return collect_expansions(scores, max_ins, max_subs, max_l_dist, results);
+}
+
+/* Find the ways of matching the subsequence to a prefix of the sequence,
+   allowing substitutions and deletions, as in no_insertions._expand_all().
+
+   The results are written to results as (n_subs, n_dels) pairs, and their
+   number is returned.  scores must have room for 2 * (max_dels + 1) items. */
+static Py_ssize_t
+expand_no_insertions(const char *subseq, Py_ssize_t subseq_len,
+                     const char *seq, Py_ssize_t seq_len, int step,
+                     Py_ssize_t max_subs, Py_ssize_t max_dels,
+                     Py_ssize_t max_l_dist,
+                     Py_ssize_t *scores, Py_ssize_t *results)
+{
+    Py_ssize_t seq_index, n_dels, last_n_dels, score;
+    /* the final scores, for matching the entire subsequence */
+    Py_ssize_t *final_scores;
+    char item;
+
+    if (max_dels > subseq_len) max_dels = subseq_len;
+    final_scores = scores + max_dels + 1;
+
+    for (n_dels = 0; n_dels <= max_dels; n_dels++) {
+        scores[n_dels] = 0;
+        final_scores[n_dels] = -1;
+    }
+    if (max_dels == subseq_len) final_scores[max_dels] = 0;
+
+    if (seq_len > subseq_len) seq_len = subseq_len;
+    for (seq_index = 0; seq_index < seq_len; seq_index++) {
+        item = STRIDED_ITEM(seq, seq_index, step);
+        /* with more deletions, the subsequence would already be exhausted */
+        last_n_dels = subseq_len - seq_index - 1;
+        if (last_n_dels > max_dels) last_n_dels = max_dels;
+        scores[0] += item != STRIDED_ITEM(subseq, seq_index, step);
+        for (n_dels = 1; n_dels <= last_n_dels; n_dels++) {
+            score = scores[n_dels] +
+                (item != STRIDED_ITEM(subseq, seq_index + n_dels, step));
+            scores[n_dels] = score < scores[n_dels - 1] ? score : scores[n_dels - 1];
+        }
+        if (last_n_dels == subseq_len - seq_index - 1) {
+            final_scores[last_n_dels] = scores[last_n_dels];
+        }
+        /* scores[last_n_dels] is the smallest, and these never decrease */
+        if (scores[last_n_dels] > max_subs) break;
+    }
+
+    return collect_expansions(final_scores, max_dels, max_subs, max_l_dist,
+                              results);
+}
+
+typedef Py_ssize_t (*expand_func)(const char *, Py_ssize_t,
+                                  const char *, Py_ssize_t, int,
+                                  Py_ssize_t, Py_ssize_t, Py_ssize_t,
+                                  Py_ssize_t *, Py_ssize_t *);
+
+/* The n-gram search for near-matches allowing substitutions and either
+   insertions or deletions, as in no_deletions._find_alignments() and
+   no_insertions._find_alignments().  Returns a list of (start, end, dist)
+   tuples. */
+static PyObject *
+find_restricted_alignments(PyObject *args, int no_insertions,
+                           const char *argspec)
+{
+    /* input params */
+    Py_buffer subseq_pybuf, seq_pybuf;
+    Py_ssize_t ngram_len, max_subs, max_indels, max_l_dist;
+    Py_ssize_t start_index, end_index;
+
+    const char *subseq, *seq;
+    Py_ssize_t subseq_len, seq_len;
+    expand_func expand = no_insertions ? expand_no_insertions : expand_no_deletions;
+    /* scratch space for expand(), and the results of expanding the n-gram
+       matches to either side */
+    Py_ssize_t *scores = NULL, *results_after = NULL, *results_before = NULL;
+    Py_ssize_t n_after, n_before, i, j;
+    Py_ssize_t ngram_start, after_len, search_start, search_end;
+    Py_ssize_t index, after_seq_len, before_seq_start;
+    Py_ssize_t min_subs, min_indels, min_dist;
+    Py_ssize_t n_subs, n_indels;
+    int ngram_sum;
+    const char *match_ptr;
+    PyObject *alignments = NULL;
+    PyObject *alignment;
+
+    if (unlikely(!PyArg_ParseTuple(
+        args,
+        argspec,
+        &subseq_pybuf,
+        &seq_pybuf,
+        &ngram_len,
+        &max_subs,
+        &max_indels,
+        &max_l_dist,
+        &start_index,
+        &end_index
+    ))) {
+        return NULL;
+    }
+
+    if (unlikely(!(
+        is_simple_buffer(subseq_pybuf) &&
+        is_simple_buffer(seq_pybuf)
+    ))) {
+        PyErr_SetString(PyExc_TypeError, "only contiguous sequences of single-byte values are supported");
+        goto error;
+    }
+
+    if (unlikely(ngram_len <= 0)) {
+        PyErr_SetString(PyExc_ValueError, "ngram_len must be positive");
+        goto error;
+    }
+    if (unlikely(max_subs < 0 || max_indels < 0 || max_l_dist < 0)) {
+        PyErr_SetString(PyExc_ValueError, "the limits must be non-negative");
+        goto error;
+    }
+
+    subseq = (const char*)(subseq_pybuf.buf);
+    seq = (const char*)(seq_pybuf.buf);
+    subseq_len = subseq_pybuf.len;
+    seq_len = seq_pybuf.len;
+
+    if (unlikely(restrict_to_index_range(&seq, &seq_len,
+                                         &start_index, end_index) == -1)) {
+        goto error;
+    }
+
+    /* larger limits can't make a difference, and would waste memory */
+    if (max_subs > max_l_dist) max_subs = max_l_dist;
+    if (max_indels > max_l_dist) max_indels = max_l_dist;
+    if (max_indels > (no_insertions ? subseq_len : seq_len)) {
+        max_indels = no_insertions ? subseq_len : seq_len;
+    }
+
+    scores = (Py_ssize_t *) PyMem_Malloc(
+        2 * (max_indels + 1) * sizeof(Py_ssize_t));
+    results_after = (Py_ssize_t *) PyMem_Malloc(
+        2 * (max_indels + 1) * sizeof(Py_ssize_t));
+    results_before = (Py_ssize_t *) PyMem_Malloc(
+        2 * (max_indels + 1) * sizeof(Py_ssize_t));
+    if (unlikely(!scores || !results_after || !results_before)) {
+        PyErr_NoMemory();
+        goto error;
+    }
+
+    alignments = PyList_New(0);
+    if (unlikely(!alignments)) {
+        goto error;
+    }
+
+    for (ngram_start = 0;
+         ngram_start + ngram_len <= subseq_len;
+         ngram_start += ngram_len)
+    {
+        after_len = subseq_len - ngram_start - ngram_len;
+        if (no_insertions) {
+            /* deletions may only move the n-gram closer to the start */
+            search_start = ngram_start - max_indels;
+            if (search_start < 0) search_start = 0;
+            search_end = seq_len - after_len + max_indels;
+            if (search_end > seq_len) search_end = seq_len;
+        } else {
+            /* insertions may only move the n-gram further from the start */
+            search_start = ngram_start;
+            search_end = seq_len - after_len;
+        }
+        if (search_end - search_start < ngram_len) continue;
+
+        ngram_sum = calc_sum(subseq + ngram_start, ngram_len);
+        match_ptr = simple_memmem_with_needle_sum(
+            seq + search_start, search_end - search_start,
+            subseq + ngram_start, ngram_len, ngram_sum);
+        while (match_ptr != NULL) {
+            index = match_ptr - seq;
+
+            after_seq_len = after_len + (no_insertions ? 0 : max_indels);
+            if (after_seq_len > seq_len - index - ngram_len) {
+                after_seq_len = seq_len - index - ngram_len;
+            }
+            n_after = expand(
+                subseq + ngram_start + ngram_len, after_len,
+                seq + index + ngram_len, after_seq_len, 1,
+                max_subs, max_indels, max_l_dist,
+                scores, results_after);
+
+            if (n_after != 0) {
+                min_subs = results_after[0];
+                min_indels = results_after[1];
+                min_dist = results_after[0] + results_after[1];
+                for (i = 1; i < n_after; i++) {
+                    n_subs = results_after[2 * i];
+                    n_indels = results_after[2 * i + 1];
+                    if (n_subs < min_subs) min_subs = n_subs;
+                    if (n_indels < min_indels) min_indels = n_indels;
+                    if (n_subs + n_indels < min_dist) min_dist = n_subs + n_indels;
+                }
+
+                before_seq_start = index - ngram_start -
+                    (no_insertions ? 0 : max_indels - min_indels);
+                if (before_seq_start < 0) before_seq_start = 0;
+                n_before = expand(
+                    subseq + ngram_start, ngram_start,
+                    seq + index, index - before_seq_start, -1,
+                    max_subs - min_subs, max_indels - min_indels,
+                    max_l_dist - min_dist,
+                    scores, results_before);
+
+                for (i = 0; i < n_before; i++) {
+                    for (j = 0; j < n_after; j++) {
+                        n_subs = results_before[2 * i] + results_after[2 * j];
+                        n_indels = results_before[2 * i + 1] + results_after[2 * j + 1];
+                        if (n_subs > max_subs || n_indels > max_indels ||
+                            n_subs + n_indels > max_l_dist) {
+                            continue;
+                        }
+                        if (no_insertions) {
+                            alignment = Py_BuildValue(
+                                "(nnn)",
+                                start_index + index - ngram_start + results_before[2 * i + 1],
+                                start_index + index + ngram_len + after_len - results_after[2 * j + 1],
+                                n_subs + n_indels);
+                        } else {
+                            alignment = Py_BuildValue(
+                                "(nnn)",
+                                start_index + index - ngram_start - results_before[2 * i + 1],
+                                start_index + index + ngram_len + after_len + results_after[2 * j + 1],
+                                n_subs + n_indels);
+                        }
+                        if (unlikely(alignment == NULL)) {
+                            goto error;
+                        }
+                        if (unlikely(PyList_Append(alignments, alignment) == -1)) {
+                            Py_DECREF(alignment);
+                            goto error;
+                        }
+                        Py_DECREF(alignment);
+                    }
+                }
+            }
+
+            match_ptr = simple_memmem_with_needle_sum(
+                match_ptr + 1, search_end - index - 1,
+                subseq + ngram_start, ngram_len, ngram_sum);
+        }
+    }
+
+    PyMem_Free(scores);
+    PyMem_Free(results_after);
+    PyMem_Free(results_before);
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
+    return alignments;
+
+error:
+    Py_XDECREF(alignments);
+    PyMem_Free(scores);
+    PyMem_Free(results_after);
+    PyMem_Free(results_before);
+    PyBuffer_Release(&subseq_pybuf);
+    PyBuffer_Release(&seq_pybuf);
     return NULL;
 }
 
+static PyObject *
+find_no_deletions_alignments_byteslike(PyObject *self, PyObject *args)
+{
+    return find_restricted_alignments(
+        args, 0, "y*y*nnnnnn:find_no_deletions_alignments_byteslike");
+}
+
+static PyObject *
+find_no_insertions_alignments_byteslike(PyObject *self, PyObject *args)
+{
+    return find_restricted_alignments(
+        args, 1, "y*y*nnnnnn:find_no_insertions_alignments_byteslike");
+}
+
 static PyMethodDef _common_methods[] = {
     {"count_differences_with_maximum_byteslike",
      (PyCFunction)count_differences_with_maximum_byteslike,
@@ -179,6 +978,24 @@ static PyMethodDef _common_methods[] = {
     {"search_exact_byteslike",
      (PyCFunction)search_exact_byteslike,
      METH_VARARGS | METH_KEYWORDS, "DOCSTRING"},
+    {"memmem_byteslike",
+     (PyCFunction)memmem_byteslike,
+     METH_VARARGS, "DOCSTRING"},
+    {"available_implementations",
+     (PyCFunction)available_implementations,
+     METH_NOARGS, "DOCSTRING"},
+    {"find_candidate_regions_byteslike",
+     (PyCFunction)find_candidate_regions_byteslike,
+     METH_VARARGS, "DOCSTRING"},
+    {"find_bit_parallel_regions_byteslike",
+     (PyCFunction)find_bit_parallel_regions_byteslike,
+     METH_VARARGS, "DOCSTRING"},
+    {"find_no_deletions_alignments_byteslike",
+     (PyCFunction)find_no_deletions_alignments_byteslike,
+     METH_VARARGS, "DOCSTRING"},
+    {"find_no_insertions_alignments_byteslike",
+     (PyCFunction)find_no_insertions_alignments_byteslike,
+     METH_VARARGS, "DOCSTRING"},
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
 
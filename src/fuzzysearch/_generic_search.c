@@ -693,6 +693,8 @@ static CYTHON_INLINE float __PYX_NAN() {
 #define __PYX_HAVE__fuzzysearch___generic_search
 #define __PYX_HAVE_API__fuzzysearch___generic_search
 /* Early includes */
+#include <limits.h>
+#include <stdint.h>
 #include <string.h>
 #include <stdlib.h>
 #include "memmem.h"
@@ -912,7 +914,7 @@ static const char *__pyx_f[] = {
 struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming;
 struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate;
 
-/* "fuzzysearch/_generic_search.pyx":17
+/* "fuzzysearch/_generic_search.pyx":20
  * 
  * 
  * cdef struct GenericSearchCandidate:             # <<<<<<<<<<<<<<
@@ -928,7 +930,7 @@ struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate {
   unsigned int n_dels;
 };
 
-/* "fuzzysearch/_generic_search.pyx":61
+/* "fuzzysearch/_generic_search.pyx":209
  * # subsequence strings, which means if they contain null bytes the data after
  * # the first null byte will not be copied.
  * cdef _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
@@ -937,7 +939,9 @@ struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate {
  */
 struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming {
   PyObject_HEAD
+  size_t __pyx_v_index_offset;
   PyObject *__pyx_v_matches;
+  size_t __pyx_v_max_matches;
   char const *__pyx_v_sequence;
 };
 
@@ -1016,6 +1020,52 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStr(PyObject* obj, PyObject
 /* GetBuiltinName.proto */
 static PyObject *__Pyx_GetBuiltinName(PyObject *name);
 
+/* PyObjectCall.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw);
+#else
+#define __Pyx_PyObject_Call(func, arg, kw) PyObject_Call(func, arg, kw)
+#endif
+
+/* PyThreadStateGet.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyThreadState_declare  PyThreadState *__pyx_tstate;
+#define __Pyx_PyThreadState_assign  __pyx_tstate = __Pyx_PyThreadState_Current;
+#define __Pyx_PyErr_Occurred()  __pyx_tstate->curexc_type
+#else
+#define __Pyx_PyThreadState_declare
+#define __Pyx_PyThreadState_assign
+#define __Pyx_PyErr_Occurred()  PyErr_Occurred()
+#endif
+
+/* PyErrFetchRestore.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyErr_Clear() __Pyx_ErrRestore(NULL, NULL, NULL)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  __Pyx_ErrRestoreInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)    __Pyx_ErrFetchInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  __Pyx_ErrRestoreInState(__pyx_tstate, type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)    __Pyx_ErrFetchInState(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_PyErr_SetNone(exc) (Py_INCREF(exc), __Pyx_ErrRestore((exc), NULL, NULL))
+#else
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#endif
+#else
+#define __Pyx_PyErr_Clear() PyErr_Clear()
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestoreInState(tstate, type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchInState(tstate, type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)  PyErr_Fetch(type, value, tb)
+#endif
+
+/* RaiseException.proto */
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
+
 /* RaiseArgTupleInvalid.proto */
 static void __Pyx_RaiseArgtupleInvalid(const char* func_name, int exact,
     Py_ssize_t num_min, Py_ssize_t num_max, Py_ssize_t num_found);
@@ -1113,13 +1163,6 @@ static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args,
 #endif // CYTHON_FAST_PYCALL
 #endif
 
-/* PyObjectCall.proto */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw);
-#else
-#define __Pyx_PyObject_Call(func, arg, kw) PyObject_Call(func, arg, kw)
-#endif
-
 /* PyObjectCallMethO.proto */
 #if CYTHON_COMPILING_IN_CPYTHON
 static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg);
@@ -1128,45 +1171,6 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject
 /* PyObjectCallOneArg.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg);
 
-/* PyThreadStateGet.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_PyThreadState_declare  PyThreadState *__pyx_tstate;
-#define __Pyx_PyThreadState_assign  __pyx_tstate = __Pyx_PyThreadState_Current;
-#define __Pyx_PyErr_Occurred()  __pyx_tstate->curexc_type
-#else
-#define __Pyx_PyThreadState_declare
-#define __Pyx_PyThreadState_assign
-#define __Pyx_PyErr_Occurred()  PyErr_Occurred()
-#endif
-
-/* PyErrFetchRestore.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_PyErr_Clear() __Pyx_ErrRestore(NULL, NULL, NULL)
-#define __Pyx_ErrRestoreWithState(type, value, tb)  __Pyx_ErrRestoreInState(PyThreadState_GET(), type, value, tb)
-#define __Pyx_ErrFetchWithState(type, value, tb)    __Pyx_ErrFetchInState(PyThreadState_GET(), type, value, tb)
-#define __Pyx_ErrRestore(type, value, tb)  __Pyx_ErrRestoreInState(__pyx_tstate, type, value, tb)
-#define __Pyx_ErrFetch(type, value, tb)    __Pyx_ErrFetchInState(__pyx_tstate, type, value, tb)
-static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
-static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
-#if CYTHON_COMPILING_IN_CPYTHON
-#define __Pyx_PyErr_SetNone(exc) (Py_INCREF(exc), __Pyx_ErrRestore((exc), NULL, NULL))
-#else
-#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
-#endif
-#else
-#define __Pyx_PyErr_Clear() PyErr_Clear()
-#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
-#define __Pyx_ErrRestoreWithState(type, value, tb)  PyErr_Restore(type, value, tb)
-#define __Pyx_ErrFetchWithState(type, value, tb)  PyErr_Fetch(type, value, tb)
-#define __Pyx_ErrRestoreInState(tstate, type, value, tb)  PyErr_Restore(type, value, tb)
-#define __Pyx_ErrFetchInState(tstate, type, value, tb)  PyErr_Fetch(type, value, tb)
-#define __Pyx_ErrRestore(type, value, tb)  PyErr_Restore(type, value, tb)
-#define __Pyx_ErrFetch(type, value, tb)  PyErr_Fetch(type, value, tb)
-#endif
-
-/* RaiseException.proto */
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
-
 /* RaiseTooManyValuesToUnpack.proto */
 static CYTHON_INLINE void __Pyx_RaiseTooManyValuesError(Py_ssize_t expected);
 
@@ -1199,6 +1203,13 @@ static CYTHON_INLINE int __Pyx_PyList_Append(PyObject* list, PyObject* x) {
 /* None.proto */
 static CYTHON_INLINE void __Pyx_RaiseClosureNameError(const char *varname);
 
+/* PyObjectCallNoArg.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func);
+#else
+#define __Pyx_PyObject_CallNoArg(func) __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL)
+#endif
+
 /* FetchCommonType.proto */
 static PyTypeObject* __Pyx_FetchCommonType(PyTypeObject* type);
 
@@ -1262,6 +1273,35 @@ static PyObject *__Pyx_CyFunction_New(PyMethodDef *ml,
                                       PyObject *module, PyObject *globals,
                                       PyObject* code);
 
+/* GetTopmostException.proto */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
+#endif
+
+/* SaveResetException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_ExceptionSave(type, value, tb)  __Pyx__ExceptionSave(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#define __Pyx_ExceptionReset(type, value, tb)  __Pyx__ExceptionReset(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+#else
+#define __Pyx_ExceptionSave(type, value, tb)   PyErr_GetExcInfo(type, value, tb)
+#define __Pyx_ExceptionReset(type, value, tb)  PyErr_SetExcInfo(type, value, tb)
+#endif
+
+/* FastTypeChecks.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_TypeCheck(obj, type) __Pyx_IsSubtype(Py_TYPE(obj), (PyTypeObject *)type)
+static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject *type);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *type1, PyObject *type2);
+#else
+#define __Pyx_TypeCheck(obj, type) PyObject_TypeCheck(obj, (PyTypeObject *)type)
+#define __Pyx_PyErr_GivenExceptionMatches(err, type) PyErr_GivenExceptionMatches(err, type)
+#define __Pyx_PyErr_GivenExceptionMatches2(err, type1, type2) (PyErr_GivenExceptionMatches(err, type1) || PyErr_GivenExceptionMatches(err, type2))
+#endif
+#define __Pyx_PyException_Check(obj) __Pyx_TypeCheck(obj, PyExc_Exception)
+
 /* GetException.proto */
 #if CYTHON_FAST_THREAD_STATE
 #define __Pyx_GetException(type, value, tb)  __Pyx__GetException(__pyx_tstate, type, value, tb)
@@ -1278,21 +1318,18 @@ static CYTHON_INLINE void __Pyx__ExceptionSwap(PyThreadState *tstate, PyObject *
 static CYTHON_INLINE void __Pyx_ExceptionSwap(PyObject **type, PyObject **value, PyObject **tb);
 #endif
 
-/* GetTopmostException.proto */
-#if CYTHON_USE_EXC_INFO_STACK
-static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
-#endif
-
-/* SaveResetException.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_ExceptionSave(type, value, tb)  __Pyx__ExceptionSave(__pyx_tstate, type, value, tb)
-static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
-#define __Pyx_ExceptionReset(type, value, tb)  __Pyx__ExceptionReset(__pyx_tstate, type, value, tb)
-static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+/* ListExtend.proto */
+static CYTHON_INLINE int __Pyx_PyList_Extend(PyObject* L, PyObject* v) {
+#if CYTHON_COMPILING_IN_CPYTHON
+    PyObject* none = _PyList_Extend((PyListObject*)L, v);
+    if (unlikely(!none))
+        return -1;
+    Py_DECREF(none);
+    return 0;
 #else
-#define __Pyx_ExceptionSave(type, value, tb)   PyErr_GetExcInfo(type, value, tb)
-#define __Pyx_ExceptionReset(type, value, tb)  PyErr_SetExcInfo(type, value, tb)
+    return PyList_SetSlice(L, PY_SSIZE_T_MAX, PY_SSIZE_T_MAX, v);
 #endif
+}
 
 /* IncludeStringH.proto */
 #include <string.h>
@@ -1310,6 +1347,15 @@ static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level);
 /* ImportFrom.proto */
 static PyObject* __Pyx_ImportFrom(PyObject* module, PyObject* name);
 
+/* CalculateMetaclass.proto */
+static PyObject *__Pyx_CalculateMetaclass(PyTypeObject *metaclass, PyObject *bases);
+
+/* Py3ClassCreate.proto */
+static PyObject *__Pyx_Py3MetaclassPrepare(PyObject *metaclass, PyObject *bases, PyObject *name, PyObject *qualname,
+                                           PyObject *mkw, PyObject *modname, PyObject *doc);
+static PyObject *__Pyx_Py3ClassCreate(PyObject *metaclass, PyObject *name, PyObject *bases, PyObject *dict,
+                                      PyObject *mkw, int calculate_metaclass, int allow_py2_metaclass);
+
 /* CLineInTraceback.proto */
 #ifdef CYTHON_CLINE_IN_TRACEBACK
 #define __Pyx_CLineForTraceback(tstate, c_line)  (((CYTHON_CLINE_IN_TRACEBACK)) ? c_line : 0)
@@ -1342,13 +1388,13 @@ static void __Pyx_AddTraceback(const char *funcname, int c_line,
 #endif
 
 /* CIntFromPy.proto */
-static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *);
+static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *);
 
 /* CIntFromPy.proto */
-static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *);
+static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *);
 
 /* CIntFromPy.proto */
-static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *);
+static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *);
 
 /* CIntToPy.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value);
@@ -1356,28 +1402,12 @@ static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value)
 /* CIntToPy.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
 
-/* CIntToPy.proto */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
-
 /* CIntFromPy.proto */
 static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
 
 /* CIntFromPy.proto */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
 
-/* FastTypeChecks.proto */
-#if CYTHON_COMPILING_IN_CPYTHON
-#define __Pyx_TypeCheck(obj, type) __Pyx_IsSubtype(Py_TYPE(obj), (PyTypeObject *)type)
-static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b);
-static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject *type);
-static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *type1, PyObject *type2);
-#else
-#define __Pyx_TypeCheck(obj, type) PyObject_TypeCheck(obj, (PyTypeObject *)type)
-#define __Pyx_PyErr_GivenExceptionMatches(err, type) PyErr_GivenExceptionMatches(err, type)
-#define __Pyx_PyErr_GivenExceptionMatches2(err, type1, type2) (PyErr_GivenExceptionMatches(err, type1) || PyErr_GivenExceptionMatches(err, type2))
-#endif
-#define __Pyx_PyException_Check(obj) __Pyx_TypeCheck(obj, PyExc_Exception)
-
 /* CheckBinaryVersion.proto */
 static int __Pyx_check_binary_version(void);
 
@@ -1385,176 +1415,441 @@ static int __Pyx_check_binary_version(void);
 static int __Pyx_InitStrings(__Pyx_StringTabEntry *t);
 
 
+/* Module declarations from 'libc.limits' */
+
+/* Module declarations from 'libc.stdint' */
+
 /* Module declarations from 'libc.string' */
 
 /* Module declarations from 'libc.stdlib' */
 
 /* Module declarations from 'fuzzysearch._generic_search' */
 static PyTypeObject *__pyx_ptype_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming = 0;
-static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(char const *, size_t, char const *, size_t, unsigned int, unsigned int, unsigned int, unsigned int); /*proto*/
+static unsigned int __pyx_v_11fuzzysearch_15_generic_search_DOMINATED;
+static unsigned char const *__pyx_f_11fuzzysearch_15_generic_search__get_equivalence_table(PyObject *); /*proto*/
+static CYTHON_INLINE int __pyx_f_11fuzzysearch_15_generic_search_items_match(unsigned char const *, char, char); /*proto*/
+static CYTHON_INLINE int __pyx_f_11fuzzysearch_15_generic_search__dominates(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate const *, struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate const *); /*proto*/
+static CYTHON_INLINE void __pyx_f_11fuzzysearch_15_generic_search__add_candidate(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate, struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *, size_t *, Py_ssize_t *, size_t *, Py_ssize_t *, int); /*proto*/
+static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(char const *, size_t, char const *, size_t, unsigned int, unsigned int, unsigned int, unsigned int, size_t, size_t, unsigned char const *, size_t, int); /*proto*/
 #define __Pyx_MODULE_NAME "fuzzysearch._generic_search"
 extern int __pyx_module_is_main_fuzzysearch___generic_search;
 int __pyx_module_is_main_fuzzysearch___generic_search = 0;
 
 /* Implementation of 'fuzzysearch._generic_search' */
-static PyObject *__pyx_builtin_TypeError;
 static PyObject *__pyx_builtin_ValueError;
+static PyObject *__pyx_builtin_TypeError;
 static PyObject *__pyx_builtin_MemoryError;
 static PyObject *__pyx_builtin_xrange;
 static const char __pyx_k_all[] = "__all__";
+static const char __pyx_k_doc[] = "__doc__";
 static const char __pyx_k_end[] = "end";
-static const char __pyx_k_attr[] = "attr";
 static const char __pyx_k_dist[] = "dist";
 static const char __pyx_k_main[] = "__main__";
 static const char __pyx_k_name[] = "__name__";
 static const char __pyx_k_test[] = "__test__";
 static const char __pyx_k_Match[] = "Match";
 static const char __pyx_k_index[] = "index";
-static const char __pyx_k_match[] = "match";
 static const char __pyx_k_n_ins[] = "n_ins";
 static const char __pyx_k_range[] = "range";
 static const char __pyx_k_start[] = "start";
-static const char __pyx_k_evolve[] = "evolve";
+static const char __pyx_k_table[] = "table";
 static const char __pyx_k_import[] = "__import__";
 static const char __pyx_k_l_dist[] = "l_dist";
+static const char __pyx_k_module[] = "__module__";
 static const char __pyx_k_n_dels[] = "n_dels";
 static const char __pyx_k_n_subs[] = "n_subs";
+static const char __pyx_k_search[] = "search";
 static const char __pyx_k_xrange[] = "xrange";
 static const char __pyx_k_matched[] = "matched";
 static const char __pyx_k_matches[] = "matches";
+static const char __pyx_k_prepare[] = "__prepare__";
 static const char __pyx_k_seq_len[] = "_seq_len";
+static const char __pyx_k_windows[] = "windows";
+static const char __pyx_k_qualname[] = "__qualname__";
 static const char __pyx_k_sequence[] = "sequence";
 static const char __pyx_k_unpacked[] = "unpacked";
 static const char __pyx_k_TypeError[] = "TypeError";
 static const char __pyx_k_add_match[] = "add_match";
+static const char __pyx_k_end_index[] = "end_index";
 static const char __pyx_k_match_ptr[] = "match_ptr";
+static const char __pyx_k_metaclass[] = "__metaclass__";
 static const char __pyx_k_ngram_len[] = "ngram_len";
 static const char __pyx_k_ValueError[] = "ValueError";
 static const char __pyx_k_c_sequence[] = "c_sequence";
 static const char __pyx_k_max_l_dist[] = "max_l_dist";
+static const char __pyx_k_merged_end[] = "merged_end";
 static const char __pyx_k_subseq_len[] = "_subseq_len";
 static const char __pyx_k_subseq_sum[] = "subseq_sum";
+static const char __pyx_k_window_end[] = "window_end";
 static const char __pyx_k_MemoryError[] = "MemoryError";
 static const char __pyx_k_ngram_start[] = "ngram_start";
+static const char __pyx_k_start_index[] = "start_index";
 static const char __pyx_k_subsequence[] = "subsequence";
 static const char __pyx_k_c_max_l_dist[] = "c_max_l_dist";
+static const char __pyx_k_equivalences[] = "equivalences";
+static const char __pyx_k_merge_starts[] = "merge_starts";
+static const char __pyx_k_merged_start[] = "merged_start";
+static const char __pyx_k_n_candidates[] = "n_candidates";
+static const char __pyx_k_report_event[] = "report_event";
 static const char __pyx_k_subseq_index[] = "subseq_index";
+static const char __pyx_k_window_start[] = "window_start";
 static const char __pyx_k_ALLOWED_TYPES[] = "ALLOWED_TYPES";
+static const char __pyx_k_EnoughMatches[] = "_EnoughMatches";
 static const char __pyx_k_c_subsequence[] = "c_subsequence";
 static const char __pyx_k_max_deletions[] = "max_deletions";
 static const char __pyx_k_search_params[] = "search_params";
+static const char __pyx_k_max_candidates[] = "max_candidates";
 static const char __pyx_k_max_insertions[] = "max_insertions";
+static const char __pyx_k_merged_windows[] = "merged_windows";
+static const char __pyx_k_window_matches[] = "window_matches";
 static const char __pyx_k_c_max_deletions[] = "c_max_deletions";
+static const char __pyx_k_c_max_candidates[] = "c_max_candidates";
 static const char __pyx_k_c_max_insertions[] = "c_max_insertions";
+static const char __pyx_k_clamp_index_range[] = "clamp_index_range";
 static const char __pyx_k_max_substitutions[] = "max_substitutions";
 static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
 static const char __pyx_k_fuzzysearch_common[] = "fuzzysearch.common";
 static const char __pyx_k_c_max_substitutions[] = "c_max_substitutions";
-static const char __pyx_k_small_search_length[] = "small_search_length";
+static const char __pyx_k_lp_candidates_limit[] = "lp_candidates_limit";
 static const char __pyx_k_subseq_len_minus_one[] = "_subseq_len_minus_one";
-static const char __pyx_k_small_search_start_index[] = "small_search_start_index";
 static const char __pyx_k_Given_subsequence_is_empty[] = "Given subsequence is empty!";
 static const char __pyx_k_fuzzysearch__generic_search[] = "fuzzysearch._generic_search";
+static const char __pyx_k_fuzzysearch_instrumentation[] = "fuzzysearch.instrumentation";
+static const char __pyx_k_c_generic_linear_programming[] = "c_generic_linear_programming";
 static const char __pyx_k_sequence_is_of_invalid_type_s[] = "sequence is of invalid type %s";
+static const char __pyx_k_an_equivalence_table_must_be_of[] = "an equivalence table must be of length 256*256";
 static const char __pyx_k_c_find_near_matches_generic_lin[] = "_c_find_near_matches_generic_linear_programming.<locals>.add_match";
+static const char __pyx_k_c_has_near_match_generic_linear[] = "c_has_near_match_generic_linear_programming";
 static const char __pyx_k_src_fuzzysearch__generic_search[] = "src/fuzzysearch/_generic_search.pyx";
+static const char __pyx_k_Raised_internally_to_stop_search[] = "Raised internally to stop searching once enough matches were found.";
 static const char __pyx_k_c_find_near_matches_generic_line[] = "c_find_near_matches_generic_linear_programming";
 static const char __pyx_k_c_find_near_matches_generic_ngra[] = "c_find_near_matches_generic_ngrams";
 static const char __pyx_k_subsequence_is_of_invalid_type_s[] = "subsequence is of invalid type %s";
 static const char __pyx_k_the_subsequence_length_must_be_g[] = "the subsequence length must be greater than max_l_dist";
 static PyObject *__pyx_n_s_ALLOWED_TYPES;
+static PyObject *__pyx_n_s_EnoughMatches;
 static PyObject *__pyx_kp_s_Given_subsequence_is_empty;
 static PyObject *__pyx_n_s_Match;
 static PyObject *__pyx_n_s_MemoryError;
+static PyObject *__pyx_kp_s_Raised_internally_to_stop_search;
 static PyObject *__pyx_n_s_TypeError;
 static PyObject *__pyx_n_s_ValueError;
 static PyObject *__pyx_n_s_add_match;
 static PyObject *__pyx_n_s_all;
-static PyObject *__pyx_n_s_attr;
+static PyObject *__pyx_kp_s_an_equivalence_table_must_be_of;
 static PyObject *__pyx_n_s_c_find_near_matches_generic_lin;
 static PyObject *__pyx_n_s_c_find_near_matches_generic_line;
 static PyObject *__pyx_n_s_c_find_near_matches_generic_ngra;
+static PyObject *__pyx_n_s_c_generic_linear_programming;
+static PyObject *__pyx_n_s_c_has_near_match_generic_linear;
+static PyObject *__pyx_n_s_c_max_candidates;
 static PyObject *__pyx_n_s_c_max_deletions;
 static PyObject *__pyx_n_s_c_max_insertions;
 static PyObject *__pyx_n_s_c_max_l_dist;
 static PyObject *__pyx_n_s_c_max_substitutions;
 static PyObject *__pyx_n_s_c_sequence;
 static PyObject *__pyx_n_s_c_subsequence;
+static PyObject *__pyx_n_s_clamp_index_range;
 static PyObject *__pyx_n_s_cline_in_traceback;
 static PyObject *__pyx_n_s_dist;
+static PyObject *__pyx_n_s_doc;
 static PyObject *__pyx_n_s_end;
-static PyObject *__pyx_n_s_evolve;
+static PyObject *__pyx_n_s_end_index;
+static PyObject *__pyx_n_s_equivalences;
 static PyObject *__pyx_n_s_fuzzysearch__generic_search;
 static PyObject *__pyx_n_s_fuzzysearch_common;
+static PyObject *__pyx_n_s_fuzzysearch_instrumentation;
 static PyObject *__pyx_n_s_import;
 static PyObject *__pyx_n_s_index;
 static PyObject *__pyx_n_s_l_dist;
+static PyObject *__pyx_n_s_lp_candidates_limit;
 static PyObject *__pyx_n_s_main;
-static PyObject *__pyx_n_s_match;
 static PyObject *__pyx_n_s_match_ptr;
 static PyObject *__pyx_n_s_matched;
 static PyObject *__pyx_n_s_matches;
+static PyObject *__pyx_n_s_max_candidates;
 static PyObject *__pyx_n_s_max_deletions;
 static PyObject *__pyx_n_s_max_insertions;
 static PyObject *__pyx_n_s_max_l_dist;
 static PyObject *__pyx_n_s_max_substitutions;
+static PyObject *__pyx_n_s_merge_starts;
+static PyObject *__pyx_n_s_merged_end;
+static PyObject *__pyx_n_s_merged_start;
+static PyObject *__pyx_n_s_merged_windows;
+static PyObject *__pyx_n_s_metaclass;
+static PyObject *__pyx_n_s_module;
+static PyObject *__pyx_n_s_n_candidates;
 static PyObject *__pyx_n_s_n_dels;
 static PyObject *__pyx_n_s_n_ins;
 static PyObject *__pyx_n_s_n_subs;
 static PyObject *__pyx_n_s_name;
 static PyObject *__pyx_n_s_ngram_len;
 static PyObject *__pyx_n_s_ngram_start;
+static PyObject *__pyx_n_s_prepare;
+static PyObject *__pyx_n_s_qualname;
 static PyObject *__pyx_n_s_range;
+static PyObject *__pyx_n_s_report_event;
+static PyObject *__pyx_n_s_search;
 static PyObject *__pyx_n_s_search_params;
 static PyObject *__pyx_n_s_seq_len;
 static PyObject *__pyx_n_s_sequence;
 static PyObject *__pyx_kp_s_sequence_is_of_invalid_type_s;
-static PyObject *__pyx_n_s_small_search_length;
-static PyObject *__pyx_n_s_small_search_start_index;
 static PyObject *__pyx_kp_s_src_fuzzysearch__generic_search;
 static PyObject *__pyx_n_s_start;
+static PyObject *__pyx_n_s_start_index;
 static PyObject *__pyx_n_s_subseq_index;
 static PyObject *__pyx_n_s_subseq_len;
 static PyObject *__pyx_n_s_subseq_len_minus_one;
 static PyObject *__pyx_n_s_subseq_sum;
 static PyObject *__pyx_n_s_subsequence;
 static PyObject *__pyx_kp_s_subsequence_is_of_invalid_type_s;
+static PyObject *__pyx_n_s_table;
 static PyObject *__pyx_n_s_test;
 static PyObject *__pyx_kp_s_the_subsequence_length_must_be_g;
 static PyObject *__pyx_n_s_unpacked;
+static PyObject *__pyx_n_s_window_end;
+static PyObject *__pyx_n_s_window_matches;
+static PyObject *__pyx_n_s_window_start;
+static PyObject *__pyx_n_s_windows;
 static PyObject *__pyx_n_s_xrange;
-static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params); /* proto */
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params, PyObject *__pyx_v_start_index, PyObject *__pyx_v_end_index, PyObject *__pyx_v_equivalences, PyObject *__pyx_v_max_candidates, PyObject *__pyx_v_merge_starts); /* proto */
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_has_near_match_generic_linear_programming(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params, PyObject *__pyx_v_start_index, PyObject *__pyx_v_end_index, PyObject *__pyx_v_equivalences, PyObject *__pyx_v_max_candidates); /* proto */
 static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(PyObject *__pyx_self, PyObject *__pyx_v_start, PyObject *__pyx_v_end, PyObject *__pyx_v_dist); /* proto */
-static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_generic_ngrams(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params); /* proto */
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_4c_find_near_matches_generic_ngrams(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params, PyObject *__pyx_v_max_candidates); /* proto */
 static PyObject *__pyx_tp_new_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(PyTypeObject *t, PyObject *a, PyObject *k); /*proto*/
 static PyObject *__pyx_int_0;
 static PyObject *__pyx_int_536870912;
 static PyObject *__pyx_tuple_;
 static PyObject *__pyx_tuple__2;
-static PyObject *__pyx_tuple__4;
+static PyObject *__pyx_tuple__3;
 static PyObject *__pyx_tuple__5;
+static PyObject *__pyx_tuple__6;
 static PyObject *__pyx_tuple__7;
-static PyObject *__pyx_codeobj__3;
-static PyObject *__pyx_codeobj__6;
+static PyObject *__pyx_tuple__9;
+static PyObject *__pyx_tuple__11;
+static PyObject *__pyx_codeobj__4;
 static PyObject *__pyx_codeobj__8;
+static PyObject *__pyx_codeobj__10;
+static PyObject *__pyx_codeobj__12;
 /* Late includes */
 
-/* "fuzzysearch/_generic_search.pyx":25
+/* "fuzzysearch/_generic_search.pyx":35
  * 
  * 
- * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
- *     """search for near-matches of subsequence in sequence
+ * cdef const unsigned char *_get_equivalence_table(equivalences) except? NULL:             # <<<<<<<<<<<<<<
+ *     """Get a pointer to an EquivalenceTable's data, or NULL for None."""
+ *     if equivalences is None:
+ */
+
+static unsigned char const *__pyx_f_11fuzzysearch_15_generic_search__get_equivalence_table(PyObject *__pyx_v_equivalences) {
+  char const *__pyx_v_table;
+  unsigned char const *__pyx_r;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  PyObject *__pyx_t_3 = NULL;
+  char const *__pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_get_equivalence_table", 0);
+
+  /* "fuzzysearch/_generic_search.pyx":37
+ * cdef const unsigned char *_get_equivalence_table(equivalences) except? NULL:
+ *     """Get a pointer to an EquivalenceTable's data, or NULL for None."""
+ *     if equivalences is None:             # <<<<<<<<<<<<<<
+ *         return NULL
+ *     cdef const char *table = equivalences.table
+ */
+  __pyx_t_1 = (__pyx_v_equivalences == Py_None);
+  __pyx_t_2 = (__pyx_t_1 != 0);
+  if (__pyx_t_2) {
+
+    /* "fuzzysearch/_generic_search.pyx":38
+ *     """Get a pointer to an EquivalenceTable's data, or NULL for None."""
+ *     if equivalences is None:
+ *         return NULL             # <<<<<<<<<<<<<<
+ *     cdef const char *table = equivalences.table
+ *     if len(equivalences.table) != 256 * 256:
+ */
+    __pyx_r = NULL;
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_generic_search.pyx":37
+ * cdef const unsigned char *_get_equivalence_table(equivalences) except? NULL:
+ *     """Get a pointer to an EquivalenceTable's data, or NULL for None."""
+ *     if equivalences is None:             # <<<<<<<<<<<<<<
+ *         return NULL
+ *     cdef const char *table = equivalences.table
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":39
+ *     if equivalences is None:
+ *         return NULL
+ *     cdef const char *table = equivalences.table             # <<<<<<<<<<<<<<
+ *     if len(equivalences.table) != 256 * 256:
+ *         raise ValueError('an equivalence table must be of length 256*256')
+ */
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_v_equivalences, __pyx_n_s_table); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 39, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = __Pyx_PyObject_AsString(__pyx_t_3); if (unlikely((!__pyx_t_4) && PyErr_Occurred())) __PYX_ERR(0, 39, __pyx_L1_error)
+  __pyx_v_table = __pyx_t_4;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":40
+ *         return NULL
+ *     cdef const char *table = equivalences.table
+ *     if len(equivalences.table) != 256 * 256:             # <<<<<<<<<<<<<<
+ *         raise ValueError('an equivalence table must be of length 256*256')
+ *     return <const unsigned char *> table
+ */
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_v_equivalences, __pyx_n_s_table); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 40, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_5 = PyObject_Length(__pyx_t_3); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1))) __PYX_ERR(0, 40, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_2 = ((__pyx_t_5 != 0x10000) != 0);
+  if (unlikely(__pyx_t_2)) {
+
+    /* "fuzzysearch/_generic_search.pyx":41
+ *     cdef const char *table = equivalences.table
+ *     if len(equivalences.table) != 256 * 256:
+ *         raise ValueError('an equivalence table must be of length 256*256')             # <<<<<<<<<<<<<<
+ *     return <const unsigned char *> table
+ * 
+ */
+    __pyx_t_3 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 41, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __Pyx_Raise(__pyx_t_3, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __PYX_ERR(0, 41, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":40
+ *         return NULL
+ *     cdef const char *table = equivalences.table
+ *     if len(equivalences.table) != 256 * 256:             # <<<<<<<<<<<<<<
+ *         raise ValueError('an equivalence table must be of length 256*256')
+ *     return <const unsigned char *> table
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":42
+ *     if len(equivalences.table) != 256 * 256:
+ *         raise ValueError('an equivalence table must be of length 256*256')
+ *     return <const unsigned char *> table             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = ((unsigned char const *)__pyx_v_table);
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_generic_search.pyx":35
+ * 
+ * 
+ * cdef const unsigned char *_get_equivalence_table(equivalences) except? NULL:             # <<<<<<<<<<<<<<
+ *     """Get a pointer to an EquivalenceTable's data, or NULL for None."""
+ *     if equivalences is None:
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("fuzzysearch._generic_search._get_equivalence_table", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_generic_search.pyx":45
+ * 
+ * 
+ * cdef inline bint items_match(const unsigned char *table,             # <<<<<<<<<<<<<<
+ *                              char seq_item, char subseq_item):
+ *     if table is NULL:
+ */
+
+static CYTHON_INLINE int __pyx_f_11fuzzysearch_15_generic_search_items_match(unsigned char const *__pyx_v_table, char __pyx_v_seq_item, char __pyx_v_subseq_item) {
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  __Pyx_RefNannySetupContext("items_match", 0);
+
+  /* "fuzzysearch/_generic_search.pyx":47
+ * cdef inline bint items_match(const unsigned char *table,
+ *                              char seq_item, char subseq_item):
+ *     if table is NULL:             # <<<<<<<<<<<<<<
+ *         return seq_item == subseq_item
+ *     return table[(<unsigned char> seq_item) << 8 | <unsigned char> subseq_item] != 0
+ */
+  __pyx_t_1 = ((__pyx_v_table == NULL) != 0);
+  if (__pyx_t_1) {
+
+    /* "fuzzysearch/_generic_search.pyx":48
+ *                              char seq_item, char subseq_item):
+ *     if table is NULL:
+ *         return seq_item == subseq_item             # <<<<<<<<<<<<<<
+ *     return table[(<unsigned char> seq_item) << 8 | <unsigned char> subseq_item] != 0
+ * 
+ */
+    __pyx_r = (__pyx_v_seq_item == __pyx_v_subseq_item);
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_generic_search.pyx":47
+ * cdef inline bint items_match(const unsigned char *table,
+ *                              char seq_item, char subseq_item):
+ *     if table is NULL:             # <<<<<<<<<<<<<<
+ *         return seq_item == subseq_item
+ *     return table[(<unsigned char> seq_item) << 8 | <unsigned char> subseq_item] != 0
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":49
+ *     if table is NULL:
+ *         return seq_item == subseq_item
+ *     return table[(<unsigned char> seq_item) << 8 | <unsigned char> subseq_item] != 0             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = ((__pyx_v_table[((((unsigned char)__pyx_v_seq_item) << 8) | ((unsigned char)__pyx_v_subseq_item))]) != 0);
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_generic_search.pyx":45
+ * 
+ * 
+ * cdef inline bint items_match(const unsigned char *table,             # <<<<<<<<<<<<<<
+ *                              char seq_item, char subseq_item):
+ *     if table is NULL:
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_generic_search.pyx":52
+ * 
  * 
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,
  */
 
 /* Python wrapper */
 static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_1c_find_near_matches_generic_linear_programming(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static char __pyx_doc_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming[] = "search for near-matches of subsequence in sequence\n\n    This searches for near-matches, where the nearly-matching parts of the\n    sequence must meet the following limitations (relative to the subsequence):\n\n    * the maximum allowed number of character substitutions\n    * the maximum allowed number of new characters inserted\n    * and the maximum allowed number of character deletions\n    * the total number of substitutions, insertions and deletions\n    ";
+static char __pyx_doc_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming[] = "search for near-matches of subsequence in sequence\n\n    This searches for near-matches, where the nearly-matching parts of the\n    sequence must meet the following limitations (relative to the subsequence):\n\n    * the maximum allowed number of character substitutions\n    * the maximum allowed number of new characters inserted\n    * and the maximum allowed number of character deletions\n    * the total number of substitutions, insertions and deletions\n\n    Only sequence[start_index:end_index] is searched, but the indexes of the\n    matches are relative to the start of the entire sequence.\n\n    If an EquivalenceTable is given, items are compared according to it.\n\n    If the number of candidates kept exceeds max_candidates, the search is\n    abandoned and None is returned instead; see MAX_LP_CANDIDATES in\n    generic_search.py.  With merge_starts=True, candidates with different\n    starts are pruned together, which bounds their number, and only the\n    best match of every group of overlapping matches is sure to be found.\n    ";
 static PyMethodDef __pyx_mdef_11fuzzysearch_15_generic_search_1c_find_near_matches_generic_linear_programming = {"c_find_near_matches_generic_linear_programming", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_15_generic_search_1c_find_near_matches_generic_linear_programming, METH_VARARGS|METH_KEYWORDS, __pyx_doc_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming};
 static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_1c_find_near_matches_generic_linear_programming(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
   PyObject *__pyx_v_subsequence = 0;
   PyObject *__pyx_v_sequence = 0;
   PyObject *__pyx_v_search_params = 0;
+  PyObject *__pyx_v_start_index = 0;
+  PyObject *__pyx_v_end_index = 0;
+  PyObject *__pyx_v_equivalences = 0;
+  PyObject *__pyx_v_max_candidates = 0;
+  PyObject *__pyx_v_merge_starts = 0;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -1562,12 +1857,59 @@ static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_1c_find_near_matches_g
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("c_find_near_matches_generic_linear_programming (wrapper)", 0);
   {
-    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_subsequence,&__pyx_n_s_sequence,&__pyx_n_s_search_params,0};
-    PyObject* values[3] = {0,0,0};
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_subsequence,&__pyx_n_s_sequence,&__pyx_n_s_search_params,&__pyx_n_s_start_index,&__pyx_n_s_end_index,&__pyx_n_s_equivalences,&__pyx_n_s_max_candidates,&__pyx_n_s_merge_starts,0};
+    PyObject* values[8] = {0,0,0,0,0,0,0,0};
+    values[3] = ((PyObject *)__pyx_int_0);
+
+    /* "fuzzysearch/_generic_search.pyx":53
+ * 
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,
+ *                                                    start_index=0, end_index=None,             # <<<<<<<<<<<<<<
+ *                                                    equivalences=None,
+ *                                                    max_candidates=None,
+ */
+    values[4] = ((PyObject *)Py_None);
+
+    /* "fuzzysearch/_generic_search.pyx":54
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,             # <<<<<<<<<<<<<<
+ *                                                    max_candidates=None,
+ *                                                    merge_starts=False):
+ */
+    values[5] = ((PyObject *)Py_None);
+
+    /* "fuzzysearch/_generic_search.pyx":55
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,
+ *                                                    max_candidates=None,             # <<<<<<<<<<<<<<
+ *                                                    merge_starts=False):
+ *     """search for near-matches of subsequence in sequence
+ */
+    values[6] = ((PyObject *)Py_None);
+
+    /* "fuzzysearch/_generic_search.pyx":56
+ *                                                    equivalences=None,
+ *                                                    max_candidates=None,
+ *                                                    merge_starts=False):             # <<<<<<<<<<<<<<
+ *     """search for near-matches of subsequence in sequence
+ * 
+ */
+    values[7] = ((PyObject *)Py_False);
     if (unlikely(__pyx_kwds)) {
       Py_ssize_t kw_args;
       const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
       switch (pos_args) {
+        case  8: values[7] = PyTuple_GET_ITEM(__pyx_args, 7);
+        CYTHON_FALLTHROUGH;
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
         case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
         CYTHON_FALLTHROUGH;
         case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
@@ -1586,45 +1928,100 @@ static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_1c_find_near_matches_g
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_sequence)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_linear_programming", 1, 3, 3, 1); __PYX_ERR(0, 25, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_linear_programming", 0, 3, 8, 1); __PYX_ERR(0, 52, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  2:
         if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_search_params)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_linear_programming", 1, 3, 3, 2); __PYX_ERR(0, 25, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_linear_programming", 0, 3, 8, 2); __PYX_ERR(0, 52, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start_index);
+          if (value) { values[3] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  4:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end_index);
+          if (value) { values[4] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  5:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_equivalences);
+          if (value) { values[5] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  6:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_max_candidates);
+          if (value) { values[6] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  7:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_merge_starts);
+          if (value) { values[7] = value; kw_args--; }
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_find_near_matches_generic_linear_programming") < 0)) __PYX_ERR(0, 25, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_find_near_matches_generic_linear_programming") < 0)) __PYX_ERR(0, 52, __pyx_L3_error)
       }
-    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
-      goto __pyx_L5_argtuple_error;
     } else {
-      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
-      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
-      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  8: values[7] = PyTuple_GET_ITEM(__pyx_args, 7);
+        CYTHON_FALLTHROUGH;
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
     }
     __pyx_v_subsequence = values[0];
     __pyx_v_sequence = values[1];
     __pyx_v_search_params = values[2];
+    __pyx_v_start_index = values[3];
+    __pyx_v_end_index = values[4];
+    __pyx_v_equivalences = values[5];
+    __pyx_v_max_candidates = values[6];
+    __pyx_v_merge_starts = values[7];
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_linear_programming", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 25, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_linear_programming", 0, 3, 8, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 52, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("fuzzysearch._generic_search.c_find_near_matches_generic_linear_programming", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
-  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming(__pyx_self, __pyx_v_subsequence, __pyx_v_sequence, __pyx_v_search_params);
+  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming(__pyx_self, __pyx_v_subsequence, __pyx_v_sequence, __pyx_v_search_params, __pyx_v_start_index, __pyx_v_end_index, __pyx_v_equivalences, __pyx_v_max_candidates, __pyx_v_merge_starts);
+
+  /* "fuzzysearch/_generic_search.pyx":52
+ * 
+ * 
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,
+ */
 
   /* function exit code */
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params) {
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_generic_linear_programming(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params, PyObject *__pyx_v_start_index, PyObject *__pyx_v_end_index, PyObject *__pyx_v_equivalences, PyObject *__pyx_v_max_candidates, PyObject *__pyx_v_merge_starts) {
   PyObject *__pyx_v_max_substitutions = NULL;
   PyObject *__pyx_v_max_insertions = NULL;
   PyObject *__pyx_v_max_deletions = NULL;
@@ -1642,52 +2039,60 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
   PyObject *__pyx_t_7 = NULL;
   PyObject *__pyx_t_8 = NULL;
   PyObject *(*__pyx_t_9)(PyObject *);
-  char const *__pyx_t_10;
+  int __pyx_t_10;
   char const *__pyx_t_11;
-  Py_ssize_t __pyx_t_12;
+  char const *__pyx_t_12;
   Py_ssize_t __pyx_t_13;
-  unsigned int __pyx_t_14;
-  unsigned int __pyx_t_15;
+  size_t __pyx_t_14;
+  size_t __pyx_t_15;
   unsigned int __pyx_t_16;
   unsigned int __pyx_t_17;
   unsigned int __pyx_t_18;
+  unsigned int __pyx_t_19;
+  unsigned int __pyx_t_20;
+  size_t __pyx_t_21;
+  unsigned char const *__pyx_t_22;
+  size_t __pyx_t_23;
+  size_t __pyx_t_24;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("c_find_near_matches_generic_linear_programming", 0);
+  __Pyx_INCREF(__pyx_v_start_index);
+  __Pyx_INCREF(__pyx_v_end_index);
 
-  /* "fuzzysearch/_generic_search.pyx":36
- *     * the total number of substitutions, insertions and deletions
+  /* "fuzzysearch/_generic_search.pyx":78
+ *     best match of every group of overlapping matches is sure to be found.
  *     """
  *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 36, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 78, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = PyObject_IsInstance(__pyx_v_sequence, __pyx_t_1); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 36, __pyx_L1_error)
+  __pyx_t_2 = PyObject_IsInstance(__pyx_v_sequence, __pyx_t_1); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 78, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __pyx_t_3 = ((!(__pyx_t_2 != 0)) != 0);
   if (unlikely(__pyx_t_3)) {
 
-    /* "fuzzysearch/_generic_search.pyx":37
+    /* "fuzzysearch/_generic_search.pyx":79
  *     """
  *     if not isinstance(sequence, ALLOWED_TYPES):
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
  *     if not isinstance(subsequence, ALLOWED_TYPES):
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  */
-    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_sequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 37, __pyx_L1_error)
+    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_sequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 79, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
-    __pyx_t_4 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 37, __pyx_L1_error)
+    __pyx_t_4 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 79, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_4);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     __Pyx_Raise(__pyx_t_4, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-    __PYX_ERR(0, 37, __pyx_L1_error)
+    __PYX_ERR(0, 79, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":36
- *     * the total number of substitutions, insertions and deletions
+    /* "fuzzysearch/_generic_search.pyx":78
+ *     best match of every group of overlapping matches is sure to be found.
  *     """
  *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
@@ -1695,37 +2100,37 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":38
+  /* "fuzzysearch/_generic_search.pyx":80
  *     if not isinstance(sequence, ALLOWED_TYPES):
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  * 
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 38, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 80, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
-  __pyx_t_3 = PyObject_IsInstance(__pyx_v_subsequence, __pyx_t_4); if (unlikely(__pyx_t_3 == ((int)-1))) __PYX_ERR(0, 38, __pyx_L1_error)
+  __pyx_t_3 = PyObject_IsInstance(__pyx_v_subsequence, __pyx_t_4); if (unlikely(__pyx_t_3 == ((int)-1))) __PYX_ERR(0, 80, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
   __pyx_t_2 = ((!(__pyx_t_3 != 0)) != 0);
   if (unlikely(__pyx_t_2)) {
 
-    /* "fuzzysearch/_generic_search.pyx":39
+    /* "fuzzysearch/_generic_search.pyx":81
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
  * 
  *     if not subsequence:
  */
-    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_subsequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 39, __pyx_L1_error)
+    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_subsequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 81, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_4);
-    __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 39, __pyx_L1_error)
+    __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 81, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
     __Pyx_Raise(__pyx_t_1, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __PYX_ERR(0, 39, __pyx_L1_error)
+    __PYX_ERR(0, 81, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":38
+    /* "fuzzysearch/_generic_search.pyx":80
  *     if not isinstance(sequence, ALLOWED_TYPES):
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
@@ -1734,31 +2139,31 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":41
+  /* "fuzzysearch/_generic_search.pyx":83
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  * 
  *     if not subsequence:             # <<<<<<<<<<<<<<
  *         raise ValueError('Given subsequence is empty!')
  * 
  */
-  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_subsequence); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 41, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_subsequence); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 83, __pyx_L1_error)
   __pyx_t_3 = ((!__pyx_t_2) != 0);
   if (unlikely(__pyx_t_3)) {
 
-    /* "fuzzysearch/_generic_search.pyx":42
+    /* "fuzzysearch/_generic_search.pyx":84
  * 
  *     if not subsequence:
  *         raise ValueError('Given subsequence is empty!')             # <<<<<<<<<<<<<<
  * 
  *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
  */
-    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 42, __pyx_L1_error)
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 84, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
     __Pyx_Raise(__pyx_t_1, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __PYX_ERR(0, 42, __pyx_L1_error)
+    __PYX_ERR(0, 84, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":41
+    /* "fuzzysearch/_generic_search.pyx":83
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  * 
  *     if not subsequence:             # <<<<<<<<<<<<<<
@@ -1767,14 +2172,14 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":44
+  /* "fuzzysearch/_generic_search.pyx":86
  *         raise ValueError('Given subsequence is empty!')
  * 
  *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked             # <<<<<<<<<<<<<<
+ *     start_index, end_index = clamp_index_range(sequence, start_index, end_index)
  * 
- *     cdef const char *c_subsequence = subsequence
  */
-  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_search_params, __pyx_n_s_unpacked); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 44, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_search_params, __pyx_n_s_unpacked); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 86, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
     PyObject* sequence = __pyx_t_1;
@@ -1782,7 +2187,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
     if (unlikely(size != 4)) {
       if (size > 4) __Pyx_RaiseTooManyValuesError(4);
       else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-      __PYX_ERR(0, 44, __pyx_L1_error)
+      __PYX_ERR(0, 86, __pyx_L1_error)
     }
     #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
     if (likely(PyTuple_CheckExact(sequence))) {
@@ -1805,7 +2210,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
       Py_ssize_t i;
       PyObject** temps[4] = {&__pyx_t_4,&__pyx_t_5,&__pyx_t_6,&__pyx_t_7};
       for (i=0; i < 4; i++) {
-        PyObject* item = PySequence_ITEM(sequence, i); if (unlikely(!item)) __PYX_ERR(0, 44, __pyx_L1_error)
+        PyObject* item = PySequence_ITEM(sequence, i); if (unlikely(!item)) __PYX_ERR(0, 86, __pyx_L1_error)
         __Pyx_GOTREF(item);
         *(temps[i]) = item;
       }
@@ -1815,7 +2220,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
   } else {
     Py_ssize_t index = -1;
     PyObject** temps[4] = {&__pyx_t_4,&__pyx_t_5,&__pyx_t_6,&__pyx_t_7};
-    __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 44, __pyx_L1_error)
+    __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 86, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_8);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     __pyx_t_9 = Py_TYPE(__pyx_t_8)->tp_iternext;
@@ -1824,7 +2229,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
       __Pyx_GOTREF(item);
       *(temps[index]) = item;
     }
-    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 4) < 0) __PYX_ERR(0, 44, __pyx_L1_error)
+    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 4) < 0) __PYX_ERR(0, 86, __pyx_L1_error)
     __pyx_t_9 = NULL;
     __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
     goto __pyx_L7_unpacking_done;
@@ -1832,7 +2237,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
     __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
     __pyx_t_9 = NULL;
     if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-    __PYX_ERR(0, 44, __pyx_L1_error)
+    __PYX_ERR(0, 86, __pyx_L1_error)
     __pyx_L7_unpacking_done:;
   }
   __pyx_v_max_substitutions = __pyx_t_4;
@@ -1844,70 +2249,182 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
   __pyx_v_max_l_dist = __pyx_t_7;
   __pyx_t_7 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":46
+  /* "fuzzysearch/_generic_search.pyx":87
+ * 
  *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
+ *     start_index, end_index = clamp_index_range(sequence, start_index, end_index)             # <<<<<<<<<<<<<<
+ * 
+ *     cdef const char *c_subsequence = subsequence
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_7, __pyx_n_s_clamp_index_range); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 87, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __pyx_t_6 = NULL;
+  __pyx_t_10 = 0;
+  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_7))) {
+    __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_7);
+    if (likely(__pyx_t_6)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_7);
+      __Pyx_INCREF(__pyx_t_6);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_7, function);
+      __pyx_t_10 = 1;
+    }
+  }
+  #if CYTHON_FAST_PYCALL
+  if (PyFunction_Check(__pyx_t_7)) {
+    PyObject *__pyx_temp[4] = {__pyx_t_6, __pyx_v_sequence, __pyx_v_start_index, __pyx_v_end_index};
+    __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_7, __pyx_temp+1-__pyx_t_10, 3+__pyx_t_10); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __Pyx_GOTREF(__pyx_t_1);
+  } else
+  #endif
+  #if CYTHON_FAST_PYCCALL
+  if (__Pyx_PyFastCFunction_Check(__pyx_t_7)) {
+    PyObject *__pyx_temp[4] = {__pyx_t_6, __pyx_v_sequence, __pyx_v_start_index, __pyx_v_end_index};
+    __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_7, __pyx_temp+1-__pyx_t_10, 3+__pyx_t_10); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __Pyx_GOTREF(__pyx_t_1);
+  } else
+  #endif
+  {
+    __pyx_t_5 = PyTuple_New(3+__pyx_t_10); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    if (__pyx_t_6) {
+      __Pyx_GIVEREF(__pyx_t_6); PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_t_6); __pyx_t_6 = NULL;
+    }
+    __Pyx_INCREF(__pyx_v_sequence);
+    __Pyx_GIVEREF(__pyx_v_sequence);
+    PyTuple_SET_ITEM(__pyx_t_5, 0+__pyx_t_10, __pyx_v_sequence);
+    __Pyx_INCREF(__pyx_v_start_index);
+    __Pyx_GIVEREF(__pyx_v_start_index);
+    PyTuple_SET_ITEM(__pyx_t_5, 1+__pyx_t_10, __pyx_v_start_index);
+    __Pyx_INCREF(__pyx_v_end_index);
+    __Pyx_GIVEREF(__pyx_v_end_index);
+    PyTuple_SET_ITEM(__pyx_t_5, 2+__pyx_t_10, __pyx_v_end_index);
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_7, __pyx_t_5, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  }
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
+    PyObject* sequence = __pyx_t_1;
+    Py_ssize_t size = __Pyx_PySequence_SIZE(sequence);
+    if (unlikely(size != 2)) {
+      if (size > 2) __Pyx_RaiseTooManyValuesError(2);
+      else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
+      __PYX_ERR(0, 87, __pyx_L1_error)
+    }
+    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    if (likely(PyTuple_CheckExact(sequence))) {
+      __pyx_t_7 = PyTuple_GET_ITEM(sequence, 0); 
+      __pyx_t_5 = PyTuple_GET_ITEM(sequence, 1); 
+    } else {
+      __pyx_t_7 = PyList_GET_ITEM(sequence, 0); 
+      __pyx_t_5 = PyList_GET_ITEM(sequence, 1); 
+    }
+    __Pyx_INCREF(__pyx_t_7);
+    __Pyx_INCREF(__pyx_t_5);
+    #else
+    __pyx_t_7 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+    __pyx_t_5 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    #endif
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  } else {
+    Py_ssize_t index = -1;
+    __pyx_t_6 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 87, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __pyx_t_9 = Py_TYPE(__pyx_t_6)->tp_iternext;
+    index = 0; __pyx_t_7 = __pyx_t_9(__pyx_t_6); if (unlikely(!__pyx_t_7)) goto __pyx_L8_unpacking_failed;
+    __Pyx_GOTREF(__pyx_t_7);
+    index = 1; __pyx_t_5 = __pyx_t_9(__pyx_t_6); if (unlikely(!__pyx_t_5)) goto __pyx_L8_unpacking_failed;
+    __Pyx_GOTREF(__pyx_t_5);
+    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_6), 2) < 0) __PYX_ERR(0, 87, __pyx_L1_error)
+    __pyx_t_9 = NULL;
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    goto __pyx_L9_unpacking_done;
+    __pyx_L8_unpacking_failed:;
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __pyx_t_9 = NULL;
+    if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
+    __PYX_ERR(0, 87, __pyx_L1_error)
+    __pyx_L9_unpacking_done:;
+  }
+  __Pyx_DECREF_SET(__pyx_v_start_index, __pyx_t_7);
+  __pyx_t_7 = 0;
+  __Pyx_DECREF_SET(__pyx_v_end_index, __pyx_t_5);
+  __pyx_t_5 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":89
+ *     start_index, end_index = clamp_index_range(sequence, start_index, end_index)
  * 
  *     cdef const char *c_subsequence = subsequence             # <<<<<<<<<<<<<<
  *     cdef const char *c_sequence = sequence
  * 
  */
-  __pyx_t_10 = __Pyx_PyObject_AsString(__pyx_v_subsequence); if (unlikely((!__pyx_t_10) && PyErr_Occurred())) __PYX_ERR(0, 46, __pyx_L1_error)
-  __pyx_v_c_subsequence = __pyx_t_10;
+  __pyx_t_11 = __Pyx_PyObject_AsString(__pyx_v_subsequence); if (unlikely((!__pyx_t_11) && PyErr_Occurred())) __PYX_ERR(0, 89, __pyx_L1_error)
+  __pyx_v_c_subsequence = __pyx_t_11;
 
-  /* "fuzzysearch/_generic_search.pyx":47
+  /* "fuzzysearch/_generic_search.pyx":90
  * 
  *     cdef const char *c_subsequence = subsequence
  *     cdef const char *c_sequence = sequence             # <<<<<<<<<<<<<<
  * 
  *     return _c_find_near_matches_generic_linear_programming(
  */
-  __pyx_t_11 = __Pyx_PyObject_AsString(__pyx_v_sequence); if (unlikely((!__pyx_t_11) && PyErr_Occurred())) __PYX_ERR(0, 47, __pyx_L1_error)
-  __pyx_v_c_sequence = __pyx_t_11;
+  __pyx_t_12 = __Pyx_PyObject_AsString(__pyx_v_sequence); if (unlikely((!__pyx_t_12) && PyErr_Occurred())) __PYX_ERR(0, 90, __pyx_L1_error)
+  __pyx_v_c_sequence = __pyx_t_12;
 
-  /* "fuzzysearch/_generic_search.pyx":49
+  /* "fuzzysearch/_generic_search.pyx":92
  *     cdef const char *c_sequence = sequence
  * 
  *     return _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
  *         c_subsequence, len(subsequence),
- *         c_sequence, len(sequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,
  */
   __Pyx_XDECREF(__pyx_r);
 
-  /* "fuzzysearch/_generic_search.pyx":50
+  /* "fuzzysearch/_generic_search.pyx":93
  * 
  *     return _c_find_near_matches_generic_linear_programming(
  *         c_subsequence, len(subsequence),             # <<<<<<<<<<<<<<
- *         c_sequence, len(sequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,
  *         max_substitutions if max_substitutions is not None else (1<<29),
  */
-  __pyx_t_12 = PyObject_Length(__pyx_v_subsequence); if (unlikely(__pyx_t_12 == ((Py_ssize_t)-1))) __PYX_ERR(0, 50, __pyx_L1_error)
+  __pyx_t_13 = PyObject_Length(__pyx_v_subsequence); if (unlikely(__pyx_t_13 == ((Py_ssize_t)-1))) __PYX_ERR(0, 93, __pyx_L1_error)
 
-  /* "fuzzysearch/_generic_search.pyx":51
+  /* "fuzzysearch/_generic_search.pyx":94
  *     return _c_find_near_matches_generic_linear_programming(
  *         c_subsequence, len(subsequence),
- *         c_sequence, len(sequence),             # <<<<<<<<<<<<<<
+ *         c_sequence + <size_t> start_index, end_index - start_index,             # <<<<<<<<<<<<<<
  *         max_substitutions if max_substitutions is not None else (1<<29),
  *         max_insertions if max_insertions is not None else (1<<29),
  */
-  __pyx_t_13 = PyObject_Length(__pyx_v_sequence); if (unlikely(__pyx_t_13 == ((Py_ssize_t)-1))) __PYX_ERR(0, 51, __pyx_L1_error)
+  __pyx_t_14 = __Pyx_PyInt_As_size_t(__pyx_v_start_index); if (unlikely((__pyx_t_14 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 94, __pyx_L1_error)
+  __pyx_t_1 = PyNumber_Subtract(__pyx_v_end_index, __pyx_v_start_index); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 94, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_15 = __Pyx_PyInt_As_size_t(__pyx_t_1); if (unlikely((__pyx_t_15 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 94, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":52
+  /* "fuzzysearch/_generic_search.pyx":95
  *         c_subsequence, len(subsequence),
- *         c_sequence, len(sequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,
  *         max_substitutions if max_substitutions is not None else (1<<29),             # <<<<<<<<<<<<<<
  *         max_insertions if max_insertions is not None else (1<<29),
  *         max_deletions if max_deletions is not None else (1<<29),
  */
   __pyx_t_3 = (__pyx_v_max_substitutions != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_15 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_substitutions); if (unlikely((__pyx_t_15 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 52, __pyx_L1_error)
-    __pyx_t_14 = __pyx_t_15;
+    __pyx_t_17 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_substitutions); if (unlikely((__pyx_t_17 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 95, __pyx_L1_error)
+    __pyx_t_16 = __pyx_t_17;
   } else {
-    __pyx_t_14 = 0x20000000;
+    __pyx_t_16 = 0x20000000;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":53
- *         c_sequence, len(sequence),
+  /* "fuzzysearch/_generic_search.pyx":96
+ *         c_sequence + <size_t> start_index, end_index - start_index,
  *         max_substitutions if max_substitutions is not None else (1<<29),
  *         max_insertions if max_insertions is not None else (1<<29),             # <<<<<<<<<<<<<<
  *         max_deletions if max_deletions is not None else (1<<29),
@@ -1915,61 +2432,103 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
  */
   __pyx_t_3 = (__pyx_v_max_insertions != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_16 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_insertions); if (unlikely((__pyx_t_16 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 53, __pyx_L1_error)
-    __pyx_t_15 = __pyx_t_16;
+    __pyx_t_18 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_insertions); if (unlikely((__pyx_t_18 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 96, __pyx_L1_error)
+    __pyx_t_17 = __pyx_t_18;
   } else {
-    __pyx_t_15 = 0x20000000;
+    __pyx_t_17 = 0x20000000;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":54
+  /* "fuzzysearch/_generic_search.pyx":97
  *         max_substitutions if max_substitutions is not None else (1<<29),
  *         max_insertions if max_insertions is not None else (1<<29),
  *         max_deletions if max_deletions is not None else (1<<29),             # <<<<<<<<<<<<<<
  *         max_l_dist if max_l_dist is not None else (1<<29),
- *     )
+ *         0,
  */
   __pyx_t_3 = (__pyx_v_max_deletions != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_17 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_deletions); if (unlikely((__pyx_t_17 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 54, __pyx_L1_error)
-    __pyx_t_16 = __pyx_t_17;
+    __pyx_t_19 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_deletions); if (unlikely((__pyx_t_19 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 97, __pyx_L1_error)
+    __pyx_t_18 = __pyx_t_19;
   } else {
-    __pyx_t_16 = 0x20000000;
+    __pyx_t_18 = 0x20000000;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":55
+  /* "fuzzysearch/_generic_search.pyx":98
  *         max_insertions if max_insertions is not None else (1<<29),
  *         max_deletions if max_deletions is not None else (1<<29),
  *         max_l_dist if max_l_dist is not None else (1<<29),             # <<<<<<<<<<<<<<
- *     )
- * 
+ *         0,
+ *         start_index,
  */
   __pyx_t_3 = (__pyx_v_max_l_dist != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_18 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_l_dist); if (unlikely((__pyx_t_18 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 55, __pyx_L1_error)
-    __pyx_t_17 = __pyx_t_18;
+    __pyx_t_20 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_l_dist); if (unlikely((__pyx_t_20 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 98, __pyx_L1_error)
+    __pyx_t_19 = __pyx_t_20;
   } else {
-    __pyx_t_17 = 0x20000000;
+    __pyx_t_19 = 0x20000000;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":49
+  /* "fuzzysearch/_generic_search.pyx":100
+ *         max_l_dist if max_l_dist is not None else (1<<29),
+ *         0,
+ *         start_index,             # <<<<<<<<<<<<<<
+ *         _get_equivalence_table(equivalences),
+ *         SIZE_MAX if max_candidates is None else max_candidates,
+ */
+  __pyx_t_21 = __Pyx_PyInt_As_size_t(__pyx_v_start_index); if (unlikely((__pyx_t_21 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 100, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":101
+ *         0,
+ *         start_index,
+ *         _get_equivalence_table(equivalences),             # <<<<<<<<<<<<<<
+ *         SIZE_MAX if max_candidates is None else max_candidates,
+ *         merge_starts,
+ */
+  __pyx_t_22 = __pyx_f_11fuzzysearch_15_generic_search__get_equivalence_table(__pyx_v_equivalences); if (unlikely(__pyx_t_22 == ((unsigned char const *)NULL) && PyErr_Occurred())) __PYX_ERR(0, 101, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":102
+ *         start_index,
+ *         _get_equivalence_table(equivalences),
+ *         SIZE_MAX if max_candidates is None else max_candidates,             # <<<<<<<<<<<<<<
+ *         merge_starts,
+ *     )
+ */
+  __pyx_t_3 = (__pyx_v_max_candidates == Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_23 = SIZE_MAX;
+  } else {
+    __pyx_t_24 = __Pyx_PyInt_As_size_t(__pyx_v_max_candidates); if (unlikely((__pyx_t_24 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 102, __pyx_L1_error)
+    __pyx_t_23 = __pyx_t_24;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":103
+ *         _get_equivalence_table(equivalences),
+ *         SIZE_MAX if max_candidates is None else max_candidates,
+ *         merge_starts,             # <<<<<<<<<<<<<<
+ *     )
+ * 
+ */
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_v_merge_starts); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 103, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":92
  *     cdef const char *c_sequence = sequence
  * 
  *     return _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
  *         c_subsequence, len(subsequence),
- *         c_sequence, len(sequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,
  */
-  __pyx_t_1 = __pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(__pyx_v_c_subsequence, __pyx_t_12, __pyx_v_c_sequence, __pyx_t_13, __pyx_t_14, __pyx_t_15, __pyx_t_16, __pyx_t_17); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 49, __pyx_L1_error)
+  __pyx_t_1 = __pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(__pyx_v_c_subsequence, __pyx_t_13, (__pyx_v_c_sequence + ((size_t)__pyx_t_14)), __pyx_t_15, __pyx_t_16, __pyx_t_17, __pyx_t_18, __pyx_t_19, 0, __pyx_t_21, __pyx_t_22, __pyx_t_23, __pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 92, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "fuzzysearch/_generic_search.pyx":25
- * 
+  /* "fuzzysearch/_generic_search.pyx":52
  * 
- * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
- *     """search for near-matches of subsequence in sequence
  * 
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,
  */
 
   /* function exit code */
@@ -1987,39 +2546,82 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_c_find_near_matches_ge
   __Pyx_XDECREF(__pyx_v_max_insertions);
   __Pyx_XDECREF(__pyx_v_max_deletions);
   __Pyx_XDECREF(__pyx_v_max_l_dist);
+  __Pyx_XDECREF(__pyx_v_start_index);
+  __Pyx_XDECREF(__pyx_v_end_index);
   __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "fuzzysearch/_generic_search.pyx":90
- * 
- *     matches = []
- *     def add_match(start, end, dist):             # <<<<<<<<<<<<<<
- *         matches.append(Match(start, end, dist, matched=sequence[start:end]))
+/* "fuzzysearch/_generic_search.pyx":106
+ *     )
  * 
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,
  */
 
 /* Python wrapper */
-static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static PyMethodDef __pyx_mdef_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match = {"add_match", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match, METH_VARARGS|METH_KEYWORDS, 0};
-static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
-  PyObject *__pyx_v_start = 0;
-  PyObject *__pyx_v_end = 0;
-  PyObject *__pyx_v_dist = 0;
+static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_3c_has_near_match_generic_linear_programming(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_11fuzzysearch_15_generic_search_2c_has_near_match_generic_linear_programming[] = "check whether there is any near-match of subsequence in sequence\n\n    This stops searching at the first match found.  See\n    c_find_near_matches_generic_linear_programming() regarding\n    max_candidates; if it is exceeded before a match is found, None is\n    returned.\n    ";
+static PyMethodDef __pyx_mdef_11fuzzysearch_15_generic_search_3c_has_near_match_generic_linear_programming = {"c_has_near_match_generic_linear_programming", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_15_generic_search_3c_has_near_match_generic_linear_programming, METH_VARARGS|METH_KEYWORDS, __pyx_doc_11fuzzysearch_15_generic_search_2c_has_near_match_generic_linear_programming};
+static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_3c_has_near_match_generic_linear_programming(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_subsequence = 0;
+  PyObject *__pyx_v_sequence = 0;
+  PyObject *__pyx_v_search_params = 0;
+  PyObject *__pyx_v_start_index = 0;
+  PyObject *__pyx_v_end_index = 0;
+  PyObject *__pyx_v_equivalences = 0;
+  PyObject *__pyx_v_max_candidates = 0;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
   PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("add_match (wrapper)", 0);
+  __Pyx_RefNannySetupContext("c_has_near_match_generic_linear_programming (wrapper)", 0);
   {
-    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_start,&__pyx_n_s_end,&__pyx_n_s_dist,0};
-    PyObject* values[3] = {0,0,0};
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_subsequence,&__pyx_n_s_sequence,&__pyx_n_s_search_params,&__pyx_n_s_start_index,&__pyx_n_s_end_index,&__pyx_n_s_equivalences,&__pyx_n_s_max_candidates,0};
+    PyObject* values[7] = {0,0,0,0,0,0,0};
+    values[3] = ((PyObject *)__pyx_int_0);
+
+    /* "fuzzysearch/_generic_search.pyx":107
+ * 
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,
+ *                                                 start_index=0, end_index=None,             # <<<<<<<<<<<<<<
+ *                                                 equivalences=None,
+ *                                                 max_candidates=None):
+ */
+    values[4] = ((PyObject *)Py_None);
+
+    /* "fuzzysearch/_generic_search.pyx":108
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,             # <<<<<<<<<<<<<<
+ *                                                 max_candidates=None):
+ *     """check whether there is any near-match of subsequence in sequence
+ */
+    values[5] = ((PyObject *)Py_None);
+
+    /* "fuzzysearch/_generic_search.pyx":109
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,
+ *                                                 max_candidates=None):             # <<<<<<<<<<<<<<
+ *     """check whether there is any near-match of subsequence in sequence
+ * 
+ */
+    values[6] = ((PyObject *)Py_None);
     if (unlikely(__pyx_kwds)) {
       Py_ssize_t kw_args;
       const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
       switch (pos_args) {
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
         case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
         CYTHON_FALLTHROUGH;
         case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
@@ -2032,136 +2634,1261 @@ static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches
       kw_args = PyDict_Size(__pyx_kwds);
       switch (pos_args) {
         case  0:
-        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start)) != 0)) kw_args--;
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_subsequence)) != 0)) kw_args--;
         else goto __pyx_L5_argtuple_error;
         CYTHON_FALLTHROUGH;
         case  1:
-        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end)) != 0)) kw_args--;
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_sequence)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("add_match", 1, 3, 3, 1); __PYX_ERR(0, 90, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("c_has_near_match_generic_linear_programming", 0, 3, 7, 1); __PYX_ERR(0, 106, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  2:
-        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_dist)) != 0)) kw_args--;
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_search_params)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("add_match", 1, 3, 3, 2); __PYX_ERR(0, 90, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("c_has_near_match_generic_linear_programming", 0, 3, 7, 2); __PYX_ERR(0, 106, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start_index);
+          if (value) { values[3] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  4:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end_index);
+          if (value) { values[4] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  5:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_equivalences);
+          if (value) { values[5] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  6:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_max_candidates);
+          if (value) { values[6] = value; kw_args--; }
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "add_match") < 0)) __PYX_ERR(0, 90, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_has_near_match_generic_linear_programming") < 0)) __PYX_ERR(0, 106, __pyx_L3_error)
       }
-    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
-      goto __pyx_L5_argtuple_error;
     } else {
-      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
-      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
-      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
     }
-    __pyx_v_start = values[0];
-    __pyx_v_end = values[1];
-    __pyx_v_dist = values[2];
+    __pyx_v_subsequence = values[0];
+    __pyx_v_sequence = values[1];
+    __pyx_v_search_params = values[2];
+    __pyx_v_start_index = values[3];
+    __pyx_v_end_index = values[4];
+    __pyx_v_equivalences = values[5];
+    __pyx_v_max_candidates = values[6];
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("add_match", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 90, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("c_has_near_match_generic_linear_programming", 0, 3, 7, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 106, __pyx_L3_error)
   __pyx_L3_error:;
-  __Pyx_AddTraceback("fuzzysearch._generic_search._c_find_near_matches_generic_linear_programming.add_match", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_AddTraceback("fuzzysearch._generic_search.c_has_near_match_generic_linear_programming", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
-  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_self, __pyx_v_start, __pyx_v_end, __pyx_v_dist);
+  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_2c_has_near_match_generic_linear_programming(__pyx_self, __pyx_v_subsequence, __pyx_v_sequence, __pyx_v_search_params, __pyx_v_start_index, __pyx_v_end_index, __pyx_v_equivalences, __pyx_v_max_candidates);
+
+  /* "fuzzysearch/_generic_search.pyx":106
+ *     )
+ * 
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,
+ */
 
   /* function exit code */
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(PyObject *__pyx_self, PyObject *__pyx_v_start, PyObject *__pyx_v_end, PyObject *__pyx_v_dist) {
-  struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *__pyx_cur_scope;
-  struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *__pyx_outer_scope;
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_has_near_match_generic_linear_programming(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params, PyObject *__pyx_v_start_index, PyObject *__pyx_v_end_index, PyObject *__pyx_v_equivalences, PyObject *__pyx_v_max_candidates) {
+  PyObject *__pyx_v_max_substitutions = NULL;
+  PyObject *__pyx_v_max_insertions = NULL;
+  PyObject *__pyx_v_max_deletions = NULL;
+  PyObject *__pyx_v_max_l_dist = NULL;
+  char const *__pyx_v_c_subsequence;
+  char const *__pyx_v_c_sequence;
+  PyObject *__pyx_v_matches = NULL;
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   PyObject *__pyx_t_1 = NULL;
-  PyObject *__pyx_t_2 = NULL;
-  PyObject *__pyx_t_3 = NULL;
+  int __pyx_t_2;
+  int __pyx_t_3;
   PyObject *__pyx_t_4 = NULL;
-  Py_ssize_t __pyx_t_5;
-  int __pyx_t_6;
-  Py_ssize_t __pyx_t_7;
-  Py_ssize_t __pyx_t_8;
-  int __pyx_t_9;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *(*__pyx_t_9)(PyObject *);
+  int __pyx_t_10;
+  char const *__pyx_t_11;
+  char const *__pyx_t_12;
+  Py_ssize_t __pyx_t_13;
+  size_t __pyx_t_14;
+  size_t __pyx_t_15;
+  unsigned int __pyx_t_16;
+  unsigned int __pyx_t_17;
+  unsigned int __pyx_t_18;
+  unsigned int __pyx_t_19;
+  unsigned int __pyx_t_20;
+  size_t __pyx_t_21;
+  unsigned char const *__pyx_t_22;
+  size_t __pyx_t_23;
+  size_t __pyx_t_24;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("add_match", 0);
-  __pyx_outer_scope = (struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *) __Pyx_CyFunction_GetClosure(__pyx_self);
-  __pyx_cur_scope = __pyx_outer_scope;
+  __Pyx_RefNannySetupContext("c_has_near_match_generic_linear_programming", 0);
+  __Pyx_INCREF(__pyx_v_start_index);
+  __Pyx_INCREF(__pyx_v_end_index);
 
-  /* "fuzzysearch/_generic_search.pyx":91
- *     matches = []
- *     def add_match(start, end, dist):
- *         matches.append(Match(start, end, dist, matched=sequence[start:end]))             # <<<<<<<<<<<<<<
- * 
- *     cdef size_t index
+  /* "fuzzysearch/_generic_search.pyx":117
+ *     returned.
+ *     """
+ *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
  */
-  if (unlikely(!__pyx_cur_scope->__pyx_v_matches)) { __Pyx_RaiseClosureNameError("matches"); __PYX_ERR(0, 91, __pyx_L1_error) }
-  if (unlikely(__pyx_cur_scope->__pyx_v_matches == Py_None)) {
-    PyErr_Format(PyExc_AttributeError, "'NoneType' object has no attribute '%.30s'", "append");
-    __PYX_ERR(0, 91, __pyx_L1_error)
-  }
-  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_Match); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 91, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 117, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = PyTuple_New(3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 91, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
-  __Pyx_INCREF(__pyx_v_start);
-  __Pyx_GIVEREF(__pyx_v_start);
-  PyTuple_SET_ITEM(__pyx_t_2, 0, __pyx_v_start);
-  __Pyx_INCREF(__pyx_v_end);
-  __Pyx_GIVEREF(__pyx_v_end);
-  PyTuple_SET_ITEM(__pyx_t_2, 1, __pyx_v_end);
-  __Pyx_INCREF(__pyx_v_dist);
-  __Pyx_GIVEREF(__pyx_v_dist);
-  PyTuple_SET_ITEM(__pyx_t_2, 2, __pyx_v_dist);
-  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 91, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_3);
-  __Pyx_INCREF(__pyx_v_start);
-  __pyx_t_4 = __pyx_v_start;
-  __pyx_t_6 = (__pyx_t_4 == Py_None);
-  if (__pyx_t_6) {
-    __pyx_t_5 = 0;
+  __pyx_t_2 = PyObject_IsInstance(__pyx_v_sequence, __pyx_t_1); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 117, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_3 = ((!(__pyx_t_2 != 0)) != 0);
+  if (unlikely(__pyx_t_3)) {
+
+    /* "fuzzysearch/_generic_search.pyx":118
+ *     """
+ *     if not isinstance(sequence, ALLOWED_TYPES):
+ *         raise TypeError('sequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ */
+    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_sequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 118, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __pyx_t_4 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 118, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __Pyx_Raise(__pyx_t_4, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __PYX_ERR(0, 118, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":117
+ *     returned.
+ *     """
+ *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":119
+ *     if not isinstance(sequence, ALLOWED_TYPES):
+ *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 119, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_3 = PyObject_IsInstance(__pyx_v_subsequence, __pyx_t_4); if (unlikely(__pyx_t_3 == ((int)-1))) __PYX_ERR(0, 119, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_2 = ((!(__pyx_t_3 != 0)) != 0);
+  if (unlikely(__pyx_t_2)) {
+
+    /* "fuzzysearch/_generic_search.pyx":120
+ *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
+ * 
+ *     if not subsequence:
+ */
+    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_subsequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 120, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 120, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __PYX_ERR(0, 120, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":119
+ *     if not isinstance(sequence, ALLOWED_TYPES):
+ *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":122
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ *     if not subsequence:             # <<<<<<<<<<<<<<
+ *         raise ValueError('Given subsequence is empty!')
+ * 
+ */
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_subsequence); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 122, __pyx_L1_error)
+  __pyx_t_3 = ((!__pyx_t_2) != 0);
+  if (unlikely(__pyx_t_3)) {
+
+    /* "fuzzysearch/_generic_search.pyx":123
+ * 
+ *     if not subsequence:
+ *         raise ValueError('Given subsequence is empty!')             # <<<<<<<<<<<<<<
+ * 
+ *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
+ */
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 123, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __PYX_ERR(0, 123, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":122
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ *     if not subsequence:             # <<<<<<<<<<<<<<
+ *         raise ValueError('Given subsequence is empty!')
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":125
+ *         raise ValueError('Given subsequence is empty!')
+ * 
+ *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked             # <<<<<<<<<<<<<<
+ *     start_index, end_index = clamp_index_range(sequence, start_index, end_index)
+ * 
+ */
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_search_params, __pyx_n_s_unpacked); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 125, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
+    PyObject* sequence = __pyx_t_1;
+    Py_ssize_t size = __Pyx_PySequence_SIZE(sequence);
+    if (unlikely(size != 4)) {
+      if (size > 4) __Pyx_RaiseTooManyValuesError(4);
+      else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
+      __PYX_ERR(0, 125, __pyx_L1_error)
+    }
+    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    if (likely(PyTuple_CheckExact(sequence))) {
+      __pyx_t_4 = PyTuple_GET_ITEM(sequence, 0); 
+      __pyx_t_5 = PyTuple_GET_ITEM(sequence, 1); 
+      __pyx_t_6 = PyTuple_GET_ITEM(sequence, 2); 
+      __pyx_t_7 = PyTuple_GET_ITEM(sequence, 3); 
+    } else {
+      __pyx_t_4 = PyList_GET_ITEM(sequence, 0); 
+      __pyx_t_5 = PyList_GET_ITEM(sequence, 1); 
+      __pyx_t_6 = PyList_GET_ITEM(sequence, 2); 
+      __pyx_t_7 = PyList_GET_ITEM(sequence, 3); 
+    }
+    __Pyx_INCREF(__pyx_t_4);
+    __Pyx_INCREF(__pyx_t_5);
+    __Pyx_INCREF(__pyx_t_6);
+    __Pyx_INCREF(__pyx_t_7);
+    #else
+    {
+      Py_ssize_t i;
+      PyObject** temps[4] = {&__pyx_t_4,&__pyx_t_5,&__pyx_t_6,&__pyx_t_7};
+      for (i=0; i < 4; i++) {
+        PyObject* item = PySequence_ITEM(sequence, i); if (unlikely(!item)) __PYX_ERR(0, 125, __pyx_L1_error)
+        __Pyx_GOTREF(item);
+        *(temps[i]) = item;
+      }
+    }
+    #endif
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  } else {
+    Py_ssize_t index = -1;
+    PyObject** temps[4] = {&__pyx_t_4,&__pyx_t_5,&__pyx_t_6,&__pyx_t_7};
+    __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 125, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_8);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __pyx_t_9 = Py_TYPE(__pyx_t_8)->tp_iternext;
+    for (index=0; index < 4; index++) {
+      PyObject* item = __pyx_t_9(__pyx_t_8); if (unlikely(!item)) goto __pyx_L6_unpacking_failed;
+      __Pyx_GOTREF(item);
+      *(temps[index]) = item;
+    }
+    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 4) < 0) __PYX_ERR(0, 125, __pyx_L1_error)
+    __pyx_t_9 = NULL;
+    __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+    goto __pyx_L7_unpacking_done;
+    __pyx_L6_unpacking_failed:;
+    __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+    __pyx_t_9 = NULL;
+    if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
+    __PYX_ERR(0, 125, __pyx_L1_error)
+    __pyx_L7_unpacking_done:;
+  }
+  __pyx_v_max_substitutions = __pyx_t_4;
+  __pyx_t_4 = 0;
+  __pyx_v_max_insertions = __pyx_t_5;
+  __pyx_t_5 = 0;
+  __pyx_v_max_deletions = __pyx_t_6;
+  __pyx_t_6 = 0;
+  __pyx_v_max_l_dist = __pyx_t_7;
+  __pyx_t_7 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":126
+ * 
+ *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
+ *     start_index, end_index = clamp_index_range(sequence, start_index, end_index)             # <<<<<<<<<<<<<<
+ * 
+ *     cdef const char *c_subsequence = subsequence
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_7, __pyx_n_s_clamp_index_range); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 126, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __pyx_t_6 = NULL;
+  __pyx_t_10 = 0;
+  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_7))) {
+    __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_7);
+    if (likely(__pyx_t_6)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_7);
+      __Pyx_INCREF(__pyx_t_6);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_7, function);
+      __pyx_t_10 = 1;
+    }
+  }
+  #if CYTHON_FAST_PYCALL
+  if (PyFunction_Check(__pyx_t_7)) {
+    PyObject *__pyx_temp[4] = {__pyx_t_6, __pyx_v_sequence, __pyx_v_start_index, __pyx_v_end_index};
+    __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_7, __pyx_temp+1-__pyx_t_10, 3+__pyx_t_10); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __Pyx_GOTREF(__pyx_t_1);
+  } else
+  #endif
+  #if CYTHON_FAST_PYCCALL
+  if (__Pyx_PyFastCFunction_Check(__pyx_t_7)) {
+    PyObject *__pyx_temp[4] = {__pyx_t_6, __pyx_v_sequence, __pyx_v_start_index, __pyx_v_end_index};
+    __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_7, __pyx_temp+1-__pyx_t_10, 3+__pyx_t_10); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __Pyx_GOTREF(__pyx_t_1);
+  } else
+  #endif
+  {
+    __pyx_t_5 = PyTuple_New(3+__pyx_t_10); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    if (__pyx_t_6) {
+      __Pyx_GIVEREF(__pyx_t_6); PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_t_6); __pyx_t_6 = NULL;
+    }
+    __Pyx_INCREF(__pyx_v_sequence);
+    __Pyx_GIVEREF(__pyx_v_sequence);
+    PyTuple_SET_ITEM(__pyx_t_5, 0+__pyx_t_10, __pyx_v_sequence);
+    __Pyx_INCREF(__pyx_v_start_index);
+    __Pyx_GIVEREF(__pyx_v_start_index);
+    PyTuple_SET_ITEM(__pyx_t_5, 1+__pyx_t_10, __pyx_v_start_index);
+    __Pyx_INCREF(__pyx_v_end_index);
+    __Pyx_GIVEREF(__pyx_v_end_index);
+    PyTuple_SET_ITEM(__pyx_t_5, 2+__pyx_t_10, __pyx_v_end_index);
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_7, __pyx_t_5, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  }
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
+    PyObject* sequence = __pyx_t_1;
+    Py_ssize_t size = __Pyx_PySequence_SIZE(sequence);
+    if (unlikely(size != 2)) {
+      if (size > 2) __Pyx_RaiseTooManyValuesError(2);
+      else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
+      __PYX_ERR(0, 126, __pyx_L1_error)
+    }
+    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    if (likely(PyTuple_CheckExact(sequence))) {
+      __pyx_t_7 = PyTuple_GET_ITEM(sequence, 0); 
+      __pyx_t_5 = PyTuple_GET_ITEM(sequence, 1); 
+    } else {
+      __pyx_t_7 = PyList_GET_ITEM(sequence, 0); 
+      __pyx_t_5 = PyList_GET_ITEM(sequence, 1); 
+    }
+    __Pyx_INCREF(__pyx_t_7);
+    __Pyx_INCREF(__pyx_t_5);
+    #else
+    __pyx_t_7 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+    __pyx_t_5 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    #endif
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  } else {
+    Py_ssize_t index = -1;
+    __pyx_t_6 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 126, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __pyx_t_9 = Py_TYPE(__pyx_t_6)->tp_iternext;
+    index = 0; __pyx_t_7 = __pyx_t_9(__pyx_t_6); if (unlikely(!__pyx_t_7)) goto __pyx_L8_unpacking_failed;
+    __Pyx_GOTREF(__pyx_t_7);
+    index = 1; __pyx_t_5 = __pyx_t_9(__pyx_t_6); if (unlikely(!__pyx_t_5)) goto __pyx_L8_unpacking_failed;
+    __Pyx_GOTREF(__pyx_t_5);
+    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_6), 2) < 0) __PYX_ERR(0, 126, __pyx_L1_error)
+    __pyx_t_9 = NULL;
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    goto __pyx_L9_unpacking_done;
+    __pyx_L8_unpacking_failed:;
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __pyx_t_9 = NULL;
+    if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
+    __PYX_ERR(0, 126, __pyx_L1_error)
+    __pyx_L9_unpacking_done:;
+  }
+  __Pyx_DECREF_SET(__pyx_v_start_index, __pyx_t_7);
+  __pyx_t_7 = 0;
+  __Pyx_DECREF_SET(__pyx_v_end_index, __pyx_t_5);
+  __pyx_t_5 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":128
+ *     start_index, end_index = clamp_index_range(sequence, start_index, end_index)
+ * 
+ *     cdef const char *c_subsequence = subsequence             # <<<<<<<<<<<<<<
+ *     cdef const char *c_sequence = sequence
+ * 
+ */
+  __pyx_t_11 = __Pyx_PyObject_AsString(__pyx_v_subsequence); if (unlikely((!__pyx_t_11) && PyErr_Occurred())) __PYX_ERR(0, 128, __pyx_L1_error)
+  __pyx_v_c_subsequence = __pyx_t_11;
+
+  /* "fuzzysearch/_generic_search.pyx":129
+ * 
+ *     cdef const char *c_subsequence = subsequence
+ *     cdef const char *c_sequence = sequence             # <<<<<<<<<<<<<<
+ * 
+ *     matches = _c_find_near_matches_generic_linear_programming(
+ */
+  __pyx_t_12 = __Pyx_PyObject_AsString(__pyx_v_sequence); if (unlikely((!__pyx_t_12) && PyErr_Occurred())) __PYX_ERR(0, 129, __pyx_L1_error)
+  __pyx_v_c_sequence = __pyx_t_12;
+
+  /* "fuzzysearch/_generic_search.pyx":132
+ * 
+ *     matches = _c_find_near_matches_generic_linear_programming(
+ *         c_subsequence, len(subsequence),             # <<<<<<<<<<<<<<
+ *         c_sequence + <size_t> start_index, end_index - start_index,
+ *         max_substitutions if max_substitutions is not None else (1<<29),
+ */
+  __pyx_t_13 = PyObject_Length(__pyx_v_subsequence); if (unlikely(__pyx_t_13 == ((Py_ssize_t)-1))) __PYX_ERR(0, 132, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":133
+ *     matches = _c_find_near_matches_generic_linear_programming(
+ *         c_subsequence, len(subsequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,             # <<<<<<<<<<<<<<
+ *         max_substitutions if max_substitutions is not None else (1<<29),
+ *         max_insertions if max_insertions is not None else (1<<29),
+ */
+  __pyx_t_14 = __Pyx_PyInt_As_size_t(__pyx_v_start_index); if (unlikely((__pyx_t_14 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 133, __pyx_L1_error)
+  __pyx_t_1 = PyNumber_Subtract(__pyx_v_end_index, __pyx_v_start_index); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 133, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_15 = __Pyx_PyInt_As_size_t(__pyx_t_1); if (unlikely((__pyx_t_15 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 133, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":134
+ *         c_subsequence, len(subsequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,
+ *         max_substitutions if max_substitutions is not None else (1<<29),             # <<<<<<<<<<<<<<
+ *         max_insertions if max_insertions is not None else (1<<29),
+ *         max_deletions if max_deletions is not None else (1<<29),
+ */
+  __pyx_t_3 = (__pyx_v_max_substitutions != Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_17 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_substitutions); if (unlikely((__pyx_t_17 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 134, __pyx_L1_error)
+    __pyx_t_16 = __pyx_t_17;
+  } else {
+    __pyx_t_16 = 0x20000000;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":135
+ *         c_sequence + <size_t> start_index, end_index - start_index,
+ *         max_substitutions if max_substitutions is not None else (1<<29),
+ *         max_insertions if max_insertions is not None else (1<<29),             # <<<<<<<<<<<<<<
+ *         max_deletions if max_deletions is not None else (1<<29),
+ *         max_l_dist if max_l_dist is not None else (1<<29),
+ */
+  __pyx_t_3 = (__pyx_v_max_insertions != Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_18 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_insertions); if (unlikely((__pyx_t_18 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 135, __pyx_L1_error)
+    __pyx_t_17 = __pyx_t_18;
+  } else {
+    __pyx_t_17 = 0x20000000;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":136
+ *         max_substitutions if max_substitutions is not None else (1<<29),
+ *         max_insertions if max_insertions is not None else (1<<29),
+ *         max_deletions if max_deletions is not None else (1<<29),             # <<<<<<<<<<<<<<
+ *         max_l_dist if max_l_dist is not None else (1<<29),
+ *         1,
+ */
+  __pyx_t_3 = (__pyx_v_max_deletions != Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_19 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_deletions); if (unlikely((__pyx_t_19 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 136, __pyx_L1_error)
+    __pyx_t_18 = __pyx_t_19;
+  } else {
+    __pyx_t_18 = 0x20000000;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":137
+ *         max_insertions if max_insertions is not None else (1<<29),
+ *         max_deletions if max_deletions is not None else (1<<29),
+ *         max_l_dist if max_l_dist is not None else (1<<29),             # <<<<<<<<<<<<<<
+ *         1,
+ *         start_index,
+ */
+  __pyx_t_3 = (__pyx_v_max_l_dist != Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_20 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_l_dist); if (unlikely((__pyx_t_20 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 137, __pyx_L1_error)
+    __pyx_t_19 = __pyx_t_20;
+  } else {
+    __pyx_t_19 = 0x20000000;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":139
+ *         max_l_dist if max_l_dist is not None else (1<<29),
+ *         1,
+ *         start_index,             # <<<<<<<<<<<<<<
+ *         _get_equivalence_table(equivalences),
+ *         SIZE_MAX if max_candidates is None else max_candidates,
+ */
+  __pyx_t_21 = __Pyx_PyInt_As_size_t(__pyx_v_start_index); if (unlikely((__pyx_t_21 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 139, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":140
+ *         1,
+ *         start_index,
+ *         _get_equivalence_table(equivalences),             # <<<<<<<<<<<<<<
+ *         SIZE_MAX if max_candidates is None else max_candidates,
+ *         False,
+ */
+  __pyx_t_22 = __pyx_f_11fuzzysearch_15_generic_search__get_equivalence_table(__pyx_v_equivalences); if (unlikely(__pyx_t_22 == ((unsigned char const *)NULL) && PyErr_Occurred())) __PYX_ERR(0, 140, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":141
+ *         start_index,
+ *         _get_equivalence_table(equivalences),
+ *         SIZE_MAX if max_candidates is None else max_candidates,             # <<<<<<<<<<<<<<
+ *         False,
+ *     )
+ */
+  __pyx_t_3 = (__pyx_v_max_candidates == Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_23 = SIZE_MAX;
+  } else {
+    __pyx_t_24 = __Pyx_PyInt_As_size_t(__pyx_v_max_candidates); if (unlikely((__pyx_t_24 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 141, __pyx_L1_error)
+    __pyx_t_23 = __pyx_t_24;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":131
+ *     cdef const char *c_sequence = sequence
+ * 
+ *     matches = _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
+ *         c_subsequence, len(subsequence),
+ *         c_sequence + <size_t> start_index, end_index - start_index,
+ */
+  __pyx_t_1 = __pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(__pyx_v_c_subsequence, __pyx_t_13, (__pyx_v_c_sequence + ((size_t)__pyx_t_14)), __pyx_t_15, __pyx_t_16, __pyx_t_17, __pyx_t_18, __pyx_t_19, 1, __pyx_t_21, __pyx_t_22, __pyx_t_23, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 131, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_v_matches = __pyx_t_1;
+  __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":144
+ *         False,
+ *     )
+ *     return None if matches is None else bool(matches)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline bint _dominates(const GenericSearchCandidate *cand1,
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_3 = (__pyx_v_matches == Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __Pyx_INCREF(Py_None);
+    __pyx_t_1 = Py_None;
+  } else {
+    __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_matches); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 144, __pyx_L1_error)
+    __pyx_t_5 = __Pyx_PyBool_FromLong((!(!__pyx_t_2))); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 144, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    __pyx_t_1 = __pyx_t_5;
+    __pyx_t_5 = 0;
+  }
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_generic_search.pyx":106
+ *     )
+ * 
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_AddTraceback("fuzzysearch._generic_search.c_has_near_match_generic_linear_programming", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XDECREF(__pyx_v_max_substitutions);
+  __Pyx_XDECREF(__pyx_v_max_insertions);
+  __Pyx_XDECREF(__pyx_v_max_deletions);
+  __Pyx_XDECREF(__pyx_v_max_l_dist);
+  __Pyx_XDECREF(__pyx_v_matches);
+  __Pyx_XDECREF(__pyx_v_start_index);
+  __Pyx_XDECREF(__pyx_v_end_index);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_generic_search.pyx":146
+ *     return None if matches is None else bool(matches)
+ * 
+ * cdef inline bint _dominates(const GenericSearchCandidate *cand1,             # <<<<<<<<<<<<<<
+ *                             const GenericSearchCandidate *cand2) nogil:
+ *     return (
+ */
+
+static CYTHON_INLINE int __pyx_f_11fuzzysearch_15_generic_search__dominates(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate const *__pyx_v_cand1, struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate const *__pyx_v_cand2) {
+  int __pyx_r;
+  int __pyx_t_1;
+  int __pyx_t_2;
+
+  /* "fuzzysearch/_generic_search.pyx":149
+ *                             const GenericSearchCandidate *cand2) nogil:
+ *     return (
+ *         cand1.start <= cand2.start and             # <<<<<<<<<<<<<<
+ *         cand1.l_dist <= cand2.l_dist and
+ *         cand1.n_subs <= cand2.n_subs and
+ */
+  __pyx_t_2 = ((__pyx_v_cand1->start <= __pyx_v_cand2->start) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L3_bool_binop_done;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":150
+ *     return (
+ *         cand1.start <= cand2.start and
+ *         cand1.l_dist <= cand2.l_dist and             # <<<<<<<<<<<<<<
+ *         cand1.n_subs <= cand2.n_subs and
+ *         cand1.n_ins <= cand2.n_ins and
+ */
+  __pyx_t_2 = ((__pyx_v_cand1->l_dist <= __pyx_v_cand2->l_dist) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L3_bool_binop_done;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":151
+ *         cand1.start <= cand2.start and
+ *         cand1.l_dist <= cand2.l_dist and
+ *         cand1.n_subs <= cand2.n_subs and             # <<<<<<<<<<<<<<
+ *         cand1.n_ins <= cand2.n_ins and
+ *         cand1.n_dels <= cand2.n_dels
+ */
+  __pyx_t_2 = ((__pyx_v_cand1->n_subs <= __pyx_v_cand2->n_subs) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L3_bool_binop_done;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":152
+ *         cand1.l_dist <= cand2.l_dist and
+ *         cand1.n_subs <= cand2.n_subs and
+ *         cand1.n_ins <= cand2.n_ins and             # <<<<<<<<<<<<<<
+ *         cand1.n_dels <= cand2.n_dels
+ *     )
+ */
+  __pyx_t_2 = ((__pyx_v_cand1->n_ins <= __pyx_v_cand2->n_ins) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L3_bool_binop_done;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":153
+ *         cand1.n_subs <= cand2.n_subs and
+ *         cand1.n_ins <= cand2.n_ins and
+ *         cand1.n_dels <= cand2.n_dels             # <<<<<<<<<<<<<<
+ *     )
+ * 
+ */
+  __pyx_t_2 = ((__pyx_v_cand1->n_dels <= __pyx_v_cand2->n_dels) != 0);
+  __pyx_t_1 = __pyx_t_2;
+  __pyx_L3_bool_binop_done:;
+  __pyx_r = __pyx_t_1;
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_generic_search.pyx":146
+ *     return None if matches is None else bool(matches)
+ * 
+ * cdef inline bint _dominates(const GenericSearchCandidate *cand1,             # <<<<<<<<<<<<<<
+ *                             const GenericSearchCandidate *cand2) nogil:
+ *     return (
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_generic_search.pyx":157
+ * 
+ * 
+ * cdef inline void _add_candidate(GenericSearchCandidate cand,             # <<<<<<<<<<<<<<
+ *                                 GenericSearchCandidate *candidates,
+ *                                 size_t *n_candidates,
+ */
+
+static CYTHON_INLINE void __pyx_f_11fuzzysearch_15_generic_search__add_candidate(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate __pyx_v_cand, struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *__pyx_v_candidates, size_t *__pyx_v_n_candidates, Py_ssize_t *__pyx_v_next_in_group, size_t *__pyx_v_group_starts, Py_ssize_t *__pyx_v_group_heads, int __pyx_v_merge_starts) {
+  size_t __pyx_v_key;
+  size_t __pyx_v_group_start;
+  Py_ssize_t __pyx_v_i;
+  Py_ssize_t __pyx_v_prev_i;
+  size_t __pyx_t_1;
+  int __pyx_t_2;
+  long __pyx_t_3;
+
+  /* "fuzzysearch/_generic_search.pyx":178
+ *     candidates with each subseq_index are then in the same chain.
+ *     """
+ *     cdef size_t key = cand.subseq_index             # <<<<<<<<<<<<<<
+ *     cdef size_t group_start = 0 if merge_starts else cand.start
+ *     cdef Py_ssize_t i, prev_i = -1
+ */
+  __pyx_t_1 = __pyx_v_cand.subseq_index;
+  __pyx_v_key = __pyx_t_1;
+
+  /* "fuzzysearch/_generic_search.pyx":179
+ *     """
+ *     cdef size_t key = cand.subseq_index
+ *     cdef size_t group_start = 0 if merge_starts else cand.start             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t i, prev_i = -1
+ * 
+ */
+  if ((__pyx_v_merge_starts != 0)) {
+    __pyx_t_1 = 0;
+  } else {
+    __pyx_t_1 = __pyx_v_cand.start;
+  }
+  __pyx_v_group_start = __pyx_t_1;
+
+  /* "fuzzysearch/_generic_search.pyx":180
+ *     cdef size_t key = cand.subseq_index
+ *     cdef size_t group_start = 0 if merge_starts else cand.start
+ *     cdef Py_ssize_t i, prev_i = -1             # <<<<<<<<<<<<<<
+ * 
+ *     if group_starts[key] == group_start:
+ */
+  __pyx_v_prev_i = -1L;
+
+  /* "fuzzysearch/_generic_search.pyx":182
+ *     cdef Py_ssize_t i, prev_i = -1
+ * 
+ *     if group_starts[key] == group_start:             # <<<<<<<<<<<<<<
+ *         i = group_heads[key]
+ *         while i != -1:
+ */
+  __pyx_t_2 = (((__pyx_v_group_starts[__pyx_v_key]) == __pyx_v_group_start) != 0);
+  if (__pyx_t_2) {
+
+    /* "fuzzysearch/_generic_search.pyx":183
+ * 
+ *     if group_starts[key] == group_start:
+ *         i = group_heads[key]             # <<<<<<<<<<<<<<
+ *         while i != -1:
+ *             if _dominates(&candidates[i], &cand):
+ */
+    __pyx_v_i = (__pyx_v_group_heads[__pyx_v_key]);
+
+    /* "fuzzysearch/_generic_search.pyx":184
+ *     if group_starts[key] == group_start:
+ *         i = group_heads[key]
+ *         while i != -1:             # <<<<<<<<<<<<<<
+ *             if _dominates(&candidates[i], &cand):
+ *                 return
+ */
+    while (1) {
+      __pyx_t_2 = ((__pyx_v_i != -1L) != 0);
+      if (!__pyx_t_2) break;
+
+      /* "fuzzysearch/_generic_search.pyx":185
+ *         i = group_heads[key]
+ *         while i != -1:
+ *             if _dominates(&candidates[i], &cand):             # <<<<<<<<<<<<<<
+ *                 return
+ *             if _dominates(&cand, &candidates[i]):
+ */
+      __pyx_t_2 = (__pyx_f_11fuzzysearch_15_generic_search__dominates((&(__pyx_v_candidates[__pyx_v_i])), (&__pyx_v_cand)) != 0);
+      if (__pyx_t_2) {
+
+        /* "fuzzysearch/_generic_search.pyx":186
+ *         while i != -1:
+ *             if _dominates(&candidates[i], &cand):
+ *                 return             # <<<<<<<<<<<<<<
+ *             if _dominates(&cand, &candidates[i]):
+ *                 candidates[i].l_dist = DOMINATED
+ */
+        goto __pyx_L0;
+
+        /* "fuzzysearch/_generic_search.pyx":185
+ *         i = group_heads[key]
+ *         while i != -1:
+ *             if _dominates(&candidates[i], &cand):             # <<<<<<<<<<<<<<
+ *                 return
+ *             if _dominates(&cand, &candidates[i]):
+ */
+      }
+
+      /* "fuzzysearch/_generic_search.pyx":187
+ *             if _dominates(&candidates[i], &cand):
+ *                 return
+ *             if _dominates(&cand, &candidates[i]):             # <<<<<<<<<<<<<<
+ *                 candidates[i].l_dist = DOMINATED
+ *                 if prev_i == -1:
+ */
+      __pyx_t_2 = (__pyx_f_11fuzzysearch_15_generic_search__dominates((&__pyx_v_cand), (&(__pyx_v_candidates[__pyx_v_i]))) != 0);
+      if (__pyx_t_2) {
+
+        /* "fuzzysearch/_generic_search.pyx":188
+ *                 return
+ *             if _dominates(&cand, &candidates[i]):
+ *                 candidates[i].l_dist = DOMINATED             # <<<<<<<<<<<<<<
+ *                 if prev_i == -1:
+ *                     group_heads[key] = next_in_group[i]
+ */
+        (__pyx_v_candidates[__pyx_v_i]).l_dist = __pyx_v_11fuzzysearch_15_generic_search_DOMINATED;
+
+        /* "fuzzysearch/_generic_search.pyx":189
+ *             if _dominates(&cand, &candidates[i]):
+ *                 candidates[i].l_dist = DOMINATED
+ *                 if prev_i == -1:             # <<<<<<<<<<<<<<
+ *                     group_heads[key] = next_in_group[i]
+ *                 else:
+ */
+        __pyx_t_2 = ((__pyx_v_prev_i == -1L) != 0);
+        if (__pyx_t_2) {
+
+          /* "fuzzysearch/_generic_search.pyx":190
+ *                 candidates[i].l_dist = DOMINATED
+ *                 if prev_i == -1:
+ *                     group_heads[key] = next_in_group[i]             # <<<<<<<<<<<<<<
+ *                 else:
+ *                     next_in_group[prev_i] = next_in_group[i]
+ */
+          (__pyx_v_group_heads[__pyx_v_key]) = (__pyx_v_next_in_group[__pyx_v_i]);
+
+          /* "fuzzysearch/_generic_search.pyx":189
+ *             if _dominates(&cand, &candidates[i]):
+ *                 candidates[i].l_dist = DOMINATED
+ *                 if prev_i == -1:             # <<<<<<<<<<<<<<
+ *                     group_heads[key] = next_in_group[i]
+ *                 else:
+ */
+          goto __pyx_L8;
+        }
+
+        /* "fuzzysearch/_generic_search.pyx":192
+ *                     group_heads[key] = next_in_group[i]
+ *                 else:
+ *                     next_in_group[prev_i] = next_in_group[i]             # <<<<<<<<<<<<<<
+ *             else:
+ *                 prev_i = i
+ */
+        /*else*/ {
+          (__pyx_v_next_in_group[__pyx_v_prev_i]) = (__pyx_v_next_in_group[__pyx_v_i]);
+        }
+        __pyx_L8:;
+
+        /* "fuzzysearch/_generic_search.pyx":187
+ *             if _dominates(&candidates[i], &cand):
+ *                 return
+ *             if _dominates(&cand, &candidates[i]):             # <<<<<<<<<<<<<<
+ *                 candidates[i].l_dist = DOMINATED
+ *                 if prev_i == -1:
+ */
+        goto __pyx_L7;
+      }
+
+      /* "fuzzysearch/_generic_search.pyx":194
+ *                     next_in_group[prev_i] = next_in_group[i]
+ *             else:
+ *                 prev_i = i             # <<<<<<<<<<<<<<
+ *             i = next_in_group[i]
+ *     else:
+ */
+      /*else*/ {
+        __pyx_v_prev_i = __pyx_v_i;
+      }
+      __pyx_L7:;
+
+      /* "fuzzysearch/_generic_search.pyx":195
+ *             else:
+ *                 prev_i = i
+ *             i = next_in_group[i]             # <<<<<<<<<<<<<<
+ *     else:
+ *         group_starts[key] = group_start
+ */
+      __pyx_v_i = (__pyx_v_next_in_group[__pyx_v_i]);
+    }
+
+    /* "fuzzysearch/_generic_search.pyx":182
+ *     cdef Py_ssize_t i, prev_i = -1
+ * 
+ *     if group_starts[key] == group_start:             # <<<<<<<<<<<<<<
+ *         i = group_heads[key]
+ *         while i != -1:
+ */
+    goto __pyx_L3;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":197
+ *             i = next_in_group[i]
+ *     else:
+ *         group_starts[key] = group_start             # <<<<<<<<<<<<<<
+ *         group_heads[key] = -1
+ * 
+ */
+  /*else*/ {
+    (__pyx_v_group_starts[__pyx_v_key]) = __pyx_v_group_start;
+
+    /* "fuzzysearch/_generic_search.pyx":198
+ *     else:
+ *         group_starts[key] = group_start
+ *         group_heads[key] = -1             # <<<<<<<<<<<<<<
+ * 
+ *     candidates[n_candidates[0]] = cand
+ */
+    (__pyx_v_group_heads[__pyx_v_key]) = -1L;
+  }
+  __pyx_L3:;
+
+  /* "fuzzysearch/_generic_search.pyx":200
+ *         group_heads[key] = -1
+ * 
+ *     candidates[n_candidates[0]] = cand             # <<<<<<<<<<<<<<
+ *     next_in_group[n_candidates[0]] = group_heads[key]
+ *     group_heads[key] = n_candidates[0]
+ */
+  (__pyx_v_candidates[(__pyx_v_n_candidates[0])]) = __pyx_v_cand;
+
+  /* "fuzzysearch/_generic_search.pyx":201
+ * 
+ *     candidates[n_candidates[0]] = cand
+ *     next_in_group[n_candidates[0]] = group_heads[key]             # <<<<<<<<<<<<<<
+ *     group_heads[key] = n_candidates[0]
+ *     n_candidates[0] += 1
+ */
+  (__pyx_v_next_in_group[(__pyx_v_n_candidates[0])]) = (__pyx_v_group_heads[__pyx_v_key]);
+
+  /* "fuzzysearch/_generic_search.pyx":202
+ *     candidates[n_candidates[0]] = cand
+ *     next_in_group[n_candidates[0]] = group_heads[key]
+ *     group_heads[key] = n_candidates[0]             # <<<<<<<<<<<<<<
+ *     n_candidates[0] += 1
+ * 
+ */
+  (__pyx_v_group_heads[__pyx_v_key]) = (__pyx_v_n_candidates[0]);
+
+  /* "fuzzysearch/_generic_search.pyx":203
+ *     next_in_group[n_candidates[0]] = group_heads[key]
+ *     group_heads[key] = n_candidates[0]
+ *     n_candidates[0] += 1             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_t_3 = 0;
+  (__pyx_v_n_candidates[__pyx_t_3]) = ((__pyx_v_n_candidates[__pyx_t_3]) + 1);
+
+  /* "fuzzysearch/_generic_search.pyx":157
+ * 
+ * 
+ * cdef inline void _add_candidate(GenericSearchCandidate cand,             # <<<<<<<<<<<<<<
+ *                                 GenericSearchCandidate *candidates,
+ *                                 size_t *n_candidates,
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+}
+
+/* "fuzzysearch/_generic_search.pyx":264
+ * 
+ *     matches = []
+ *     def add_match(start, end, dist):             # <<<<<<<<<<<<<<
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static PyMethodDef __pyx_mdef_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match = {"add_match", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match, METH_VARARGS|METH_KEYWORDS, 0};
+static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_start = 0;
+  PyObject *__pyx_v_end = 0;
+  PyObject *__pyx_v_dist = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("add_match (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_start,&__pyx_n_s_end,&__pyx_n_s_dist,0};
+    PyObject* values[3] = {0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("add_match", 1, 3, 3, 1); __PYX_ERR(0, 264, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_dist)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("add_match", 1, 3, 3, 2); __PYX_ERR(0, 264, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "add_match") < 0)) __PYX_ERR(0, 264, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+    }
+    __pyx_v_start = values[0];
+    __pyx_v_end = values[1];
+    __pyx_v_dist = values[2];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("add_match", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 264, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("fuzzysearch._generic_search._c_find_near_matches_generic_linear_programming.add_match", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_self, __pyx_v_start, __pyx_v_end, __pyx_v_dist);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(PyObject *__pyx_self, PyObject *__pyx_v_start, PyObject *__pyx_v_end, PyObject *__pyx_v_dist) {
+  struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *__pyx_cur_scope;
+  struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *__pyx_outer_scope;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  Py_ssize_t __pyx_t_5;
+  int __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  int __pyx_t_9;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("add_match", 0);
+  __pyx_outer_scope = (struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *) __Pyx_CyFunction_GetClosure(__pyx_self);
+  __pyx_cur_scope = __pyx_outer_scope;
+
+  /* "fuzzysearch/_generic_search.pyx":265
+ *     matches = []
+ *     def add_match(start, end, dist):
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,             # <<<<<<<<<<<<<<
+ *                              matched=sequence[start:end]))
+ *         if len(matches) == max_matches:
+ */
+  if (unlikely(!__pyx_cur_scope->__pyx_v_matches)) { __Pyx_RaiseClosureNameError("matches"); __PYX_ERR(0, 265, __pyx_L1_error) }
+  if (unlikely(__pyx_cur_scope->__pyx_v_matches == Py_None)) {
+    PyErr_Format(PyExc_AttributeError, "'NoneType' object has no attribute '%.30s'", "append");
+    __PYX_ERR(0, 265, __pyx_L1_error)
+  }
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_Match); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyInt_FromSize_t(__pyx_cur_scope->__pyx_v_index_offset); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = PyNumber_Add(__pyx_v_start, __pyx_t_2); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = __Pyx_PyInt_FromSize_t(__pyx_cur_scope->__pyx_v_index_offset); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_4 = PyNumber_Add(__pyx_v_end, __pyx_t_2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = PyTuple_New(3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_GIVEREF(__pyx_t_3);
+  PyTuple_SET_ITEM(__pyx_t_2, 0, __pyx_t_3);
+  __Pyx_GIVEREF(__pyx_t_4);
+  PyTuple_SET_ITEM(__pyx_t_2, 1, __pyx_t_4);
+  __Pyx_INCREF(__pyx_v_dist);
+  __Pyx_GIVEREF(__pyx_v_dist);
+  PyTuple_SET_ITEM(__pyx_t_2, 2, __pyx_v_dist);
+  __pyx_t_3 = 0;
+  __pyx_t_4 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":266
+ *     def add_match(start, end, dist):
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))             # <<<<<<<<<<<<<<
+ *         if len(matches) == max_matches:
+ *             raise _EnoughMatches()
+ */
+  __pyx_t_4 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 266, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_INCREF(__pyx_v_start);
+  __pyx_t_3 = __pyx_v_start;
+  __pyx_t_6 = (__pyx_t_3 == Py_None);
+  if (__pyx_t_6) {
+    __pyx_t_5 = 0;
   } else {
-    __pyx_t_7 = __Pyx_PyIndex_AsSsize_t(__pyx_t_4); if (unlikely((__pyx_t_7 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 91, __pyx_L1_error)
+    __pyx_t_7 = __Pyx_PyIndex_AsSsize_t(__pyx_t_3); if (unlikely((__pyx_t_7 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 266, __pyx_L1_error)
     __pyx_t_5 = __pyx_t_7;
   }
-  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_INCREF(__pyx_v_end);
-  __pyx_t_4 = __pyx_v_end;
-  __pyx_t_6 = (__pyx_t_4 == Py_None);
+  __pyx_t_3 = __pyx_v_end;
+  __pyx_t_6 = (__pyx_t_3 == Py_None);
   if (__pyx_t_6) {
     __pyx_t_7 = PY_SSIZE_T_MAX;
   } else {
-    __pyx_t_8 = __Pyx_PyIndex_AsSsize_t(__pyx_t_4); if (unlikely((__pyx_t_8 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 91, __pyx_L1_error)
+    __pyx_t_8 = __Pyx_PyIndex_AsSsize_t(__pyx_t_3); if (unlikely((__pyx_t_8 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 266, __pyx_L1_error)
     __pyx_t_7 = __pyx_t_8;
   }
-  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-  __pyx_t_4 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_sequence + __pyx_t_5, __pyx_t_7 - __pyx_t_5); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 91, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_4);
-  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_matched, __pyx_t_4) < 0) __PYX_ERR(0, 91, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-  __pyx_t_4 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_2, __pyx_t_3); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 91, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_sequence + __pyx_t_5, __pyx_t_7 - __pyx_t_5); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 266, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  if (PyDict_SetItem(__pyx_t_4, __pyx_n_s_matched, __pyx_t_3) < 0) __PYX_ERR(0, 266, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":265
+ *     matches = []
+ *     def add_match(start, end, dist):
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,             # <<<<<<<<<<<<<<
+ *                              matched=sequence[start:end]))
+ *         if len(matches) == max_matches:
+ */
+  __pyx_t_3 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_2, __pyx_t_4); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-  __pyx_t_9 = __Pyx_PyList_Append(__pyx_cur_scope->__pyx_v_matches, __pyx_t_4); if (unlikely(__pyx_t_9 == ((int)-1))) __PYX_ERR(0, 91, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_9 = __Pyx_PyList_Append(__pyx_cur_scope->__pyx_v_matches, __pyx_t_3); if (unlikely(__pyx_t_9 == ((int)-1))) __PYX_ERR(0, 265, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":90
+  /* "fuzzysearch/_generic_search.pyx":267
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))
+ *         if len(matches) == max_matches:             # <<<<<<<<<<<<<<
+ *             raise _EnoughMatches()
+ * 
+ */
+  if (unlikely(!__pyx_cur_scope->__pyx_v_matches)) { __Pyx_RaiseClosureNameError("matches"); __PYX_ERR(0, 267, __pyx_L1_error) }
+  __pyx_t_3 = __pyx_cur_scope->__pyx_v_matches;
+  __Pyx_INCREF(__pyx_t_3);
+  if (unlikely(__pyx_t_3 == Py_None)) {
+    PyErr_SetString(PyExc_TypeError, "object of type 'NoneType' has no len()");
+    __PYX_ERR(0, 267, __pyx_L1_error)
+  }
+  __pyx_t_7 = PyList_GET_SIZE(__pyx_t_3); if (unlikely(__pyx_t_7 == ((Py_ssize_t)-1))) __PYX_ERR(0, 267, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_6 = ((__pyx_t_7 == __pyx_cur_scope->__pyx_v_max_matches) != 0);
+  if (unlikely(__pyx_t_6)) {
+
+    /* "fuzzysearch/_generic_search.pyx":268
+ *                              matched=sequence[start:end]))
+ *         if len(matches) == max_matches:
+ *             raise _EnoughMatches()             # <<<<<<<<<<<<<<
+ * 
+ *     cdef size_t index
+ */
+    __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_EnoughMatches); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 268, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __pyx_t_2 = NULL;
+    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_4))) {
+      __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_4);
+      if (likely(__pyx_t_2)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+        __Pyx_INCREF(__pyx_t_2);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_4, function);
+      }
+    }
+    __pyx_t_3 = (__pyx_t_2) ? __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_t_2) : __Pyx_PyObject_CallNoArg(__pyx_t_4);
+    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 268, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __Pyx_Raise(__pyx_t_3, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __PYX_ERR(0, 268, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":267
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))
+ *         if len(matches) == max_matches:             # <<<<<<<<<<<<<<
+ *             raise _EnoughMatches()
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":264
  * 
  *     matches = []
  *     def add_match(start, end, dist):             # <<<<<<<<<<<<<<
- *         matches.append(Match(start, end, dist, matched=sequence[start:end]))
- * 
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))
  */
 
   /* function exit code */
@@ -2180,7 +3907,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches
   return __pyx_r;
 }
 
-/* "fuzzysearch/_generic_search.pyx":61
+/* "fuzzysearch/_generic_search.pyx":209
  * # subsequence strings, which means if they contain null bytes the data after
  * # the first null byte will not be copied.
  * cdef _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
@@ -2188,7 +3915,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches
  *         const char* sequence, size_t seq_len,
  */
 
-static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(char const *__pyx_v_subsequence, size_t __pyx_v_subseq_len, char const *__pyx_v_sequence, size_t __pyx_v_seq_len, unsigned int __pyx_v_max_substitutions, unsigned int __pyx_v_max_insertions, unsigned int __pyx_v_max_deletions, unsigned int __pyx_v_max_l_dist) {
+static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(char const *__pyx_v_subsequence, size_t __pyx_v_subseq_len, char const *__pyx_v_sequence, size_t __pyx_v_seq_len, unsigned int __pyx_v_max_substitutions, unsigned int __pyx_v_max_insertions, unsigned int __pyx_v_max_deletions, unsigned int __pyx_v_max_l_dist, size_t __pyx_v_max_matches, size_t __pyx_v_index_offset, unsigned char const *__pyx_v_table, size_t __pyx_v_max_candidates, int __pyx_v_merge_starts) {
   struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *__pyx_cur_scope;
   unsigned int __pyx_v_subseq_len_minus_one;
   size_t __pyx_v_alloc_size;
@@ -2199,6 +3926,11 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
   size_t __pyx_v_n_candidates;
   size_t __pyx_v_n_new_candidates;
   size_t __pyx_v_n_cand;
+  size_t __pyx_v_n_kept;
+  Py_ssize_t *__pyx_v_next_in_group;
+  Py_ssize_t *__pyx_v__tmp_next_in_group;
+  size_t *__pyx_v_group_starts;
+  Py_ssize_t *__pyx_v_group_heads;
   PyObject *__pyx_v_add_match = 0;
   size_t __pyx_v_index;
   char __pyx_v_seq_char;
@@ -2210,26 +3942,26 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
   size_t __pyx_t_2;
   size_t __pyx_t_3;
   int __pyx_t_4;
-  PyObject *__pyx_t_5 = NULL;
-  char *__pyx_t_6;
-  char *__pyx_t_7;
-  char *__pyx_t_8;
-  char *__pyx_t_9;
-  struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate __pyx_t_10;
-  PyObject *__pyx_t_11 = NULL;
-  PyObject *__pyx_t_12 = NULL;
-  PyObject *__pyx_t_13 = NULL;
-  PyObject *__pyx_t_14 = NULL;
-  int __pyx_t_15;
-  unsigned int __pyx_t_16;
-  unsigned int __pyx_t_17;
-  unsigned int __pyx_t_18;
-  int __pyx_t_19;
-  int __pyx_t_20;
-  char const *__pyx_t_21;
-  PyObject *__pyx_t_22 = NULL;
-  PyObject *__pyx_t_23 = NULL;
-  PyObject *__pyx_t_24 = NULL;
+  int __pyx_t_5;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *__pyx_t_9 = NULL;
+  char *__pyx_t_10;
+  char *__pyx_t_11;
+  char *__pyx_t_12;
+  char *__pyx_t_13;
+  struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate __pyx_t_14;
+  PyObject *__pyx_t_15 = NULL;
+  PyObject *__pyx_t_16 = NULL;
+  PyObject *__pyx_t_17 = NULL;
+  PyObject *__pyx_t_18 = NULL;
+  unsigned int __pyx_t_19;
+  unsigned int __pyx_t_20;
+  unsigned int __pyx_t_21;
+  int __pyx_t_22;
+  int __pyx_t_23;
+  char const *__pyx_t_24;
   PyObject *__pyx_t_25 = NULL;
   PyObject *__pyx_t_26 = NULL;
   PyObject *__pyx_t_27 = NULL;
@@ -2241,45 +3973,47 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
   if (unlikely(!__pyx_cur_scope)) {
     __pyx_cur_scope = ((struct __pyx_obj_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming *)Py_None);
     __Pyx_INCREF(Py_None);
-    __PYX_ERR(0, 61, __pyx_L1_error)
+    __PYX_ERR(0, 209, __pyx_L1_error)
   } else {
     __Pyx_GOTREF(__pyx_cur_scope);
   }
   __pyx_cur_scope->__pyx_v_sequence = __pyx_v_sequence;
+  __pyx_cur_scope->__pyx_v_max_matches = __pyx_v_max_matches;
+  __pyx_cur_scope->__pyx_v_index_offset = __pyx_v_index_offset;
 
-  /* "fuzzysearch/_generic_search.pyx":69
- *         unsigned int max_l_dist,
- * ):
+  /* "fuzzysearch/_generic_search.pyx":230
+ *     see _add_candidate().
+ *     """
  *     cdef unsigned int subseq_len_minus_one = subseq_len - 1             # <<<<<<<<<<<<<<
  * 
  *     cdef size_t alloc_size
  */
   __pyx_v_subseq_len_minus_one = (__pyx_v_subseq_len - 1);
 
-  /* "fuzzysearch/_generic_search.pyx":76
+  /* "fuzzysearch/_generic_search.pyx":237
  *     cdef GenericSearchCandidate* _tmp
  *     cdef GenericSearchCandidate cand
  *     cdef size_t n_candidates = 0             # <<<<<<<<<<<<<<
  *     cdef size_t n_new_candidates = 0
- *     cdef size_t n_cand
+ *     cdef size_t n_cand, n_kept
  */
   __pyx_v_n_candidates = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":77
+  /* "fuzzysearch/_generic_search.pyx":238
  *     cdef GenericSearchCandidate cand
  *     cdef size_t n_candidates = 0
  *     cdef size_t n_new_candidates = 0             # <<<<<<<<<<<<<<
- *     cdef size_t n_cand
- * 
+ *     cdef size_t n_cand, n_kept
+ *     # for pruning dominated candidates; see _add_candidate()
  */
   __pyx_v_n_new_candidates = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":80
- *     cdef size_t n_cand
+  /* "fuzzysearch/_generic_search.pyx":246
+ *     cdef Py_ssize_t *group_heads
  * 
  *     alloc_size = min(<size_t> 10, subseq_len * 3 + 1)             # <<<<<<<<<<<<<<
  *     candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:
+ *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
  */
   __pyx_t_1 = ((__pyx_v_subseq_len * 3) + 1);
   __pyx_t_2 = ((size_t)10);
@@ -2290,115 +4024,214 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
   }
   __pyx_v_alloc_size = __pyx_t_3;
 
-  /* "fuzzysearch/_generic_search.pyx":81
+  /* "fuzzysearch/_generic_search.pyx":247
  * 
  *     alloc_size = min(<size_t> 10, subseq_len * 3 + 1)
  *     candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))             # <<<<<<<<<<<<<<
- *     if candidates is NULL:
- *         raise MemoryError()
+ *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
+ *     next_in_group = <Py_ssize_t *> malloc(alloc_size * sizeof(Py_ssize_t))
  */
   __pyx_v_candidates = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)malloc((__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
 
-  /* "fuzzysearch/_generic_search.pyx":82
+  /* "fuzzysearch/_generic_search.pyx":248
  *     alloc_size = min(<size_t> 10, subseq_len * 3 + 1)
  *     candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:             # <<<<<<<<<<<<<<
- *         raise MemoryError()
- *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
+ *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))             # <<<<<<<<<<<<<<
+ *     next_in_group = <Py_ssize_t *> malloc(alloc_size * sizeof(Py_ssize_t))
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
  */
-  __pyx_t_4 = ((__pyx_v_candidates == NULL) != 0);
-  if (unlikely(__pyx_t_4)) {
+  __pyx_v_new_candidates = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)malloc((__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
 
-    /* "fuzzysearch/_generic_search.pyx":83
+  /* "fuzzysearch/_generic_search.pyx":249
  *     candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:
- *         raise MemoryError()             # <<<<<<<<<<<<<<
  *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:
+ *     next_in_group = <Py_ssize_t *> malloc(alloc_size * sizeof(Py_ssize_t))             # <<<<<<<<<<<<<<
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
  */
-    PyErr_NoMemory(); __PYX_ERR(0, 83, __pyx_L1_error)
+  __pyx_v_next_in_group = ((Py_ssize_t *)malloc((__pyx_v_alloc_size * (sizeof(Py_ssize_t)))));
 
-    /* "fuzzysearch/_generic_search.pyx":82
- *     alloc_size = min(<size_t> 10, subseq_len * 3 + 1)
- *     candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:             # <<<<<<<<<<<<<<
- *         raise MemoryError()
+  /* "fuzzysearch/_generic_search.pyx":250
  *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
+ *     next_in_group = <Py_ssize_t *> malloc(alloc_size * sizeof(Py_ssize_t))
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))             # <<<<<<<<<<<<<<
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \
+ */
+  __pyx_v_group_starts = ((size_t *)malloc((__pyx_v_subseq_len * (sizeof(size_t)))));
+
+  /* "fuzzysearch/_generic_search.pyx":251
+ *     next_in_group = <Py_ssize_t *> malloc(alloc_size * sizeof(Py_ssize_t))
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))             # <<<<<<<<<<<<<<
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \
+ *             group_starts is NULL or group_heads is NULL:
+ */
+  __pyx_v_group_heads = ((Py_ssize_t *)malloc((__pyx_v_subseq_len * (sizeof(Py_ssize_t)))));
+
+  /* "fuzzysearch/_generic_search.pyx":252
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \             # <<<<<<<<<<<<<<
+ *             group_starts is NULL or group_heads is NULL:
+ *         free(candidates)
  */
+  __pyx_t_5 = ((__pyx_v_candidates == NULL) != 0);
+  if (!__pyx_t_5) {
+  } else {
+    __pyx_t_4 = __pyx_t_5;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_5 = ((__pyx_v_new_candidates == NULL) != 0);
+  if (!__pyx_t_5) {
+  } else {
+    __pyx_t_4 = __pyx_t_5;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_5 = ((__pyx_v_next_in_group == NULL) != 0);
+  if (!__pyx_t_5) {
+  } else {
+    __pyx_t_4 = __pyx_t_5;
+    goto __pyx_L4_bool_binop_done;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":84
- *     if candidates is NULL:
- *         raise MemoryError()
- *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))             # <<<<<<<<<<<<<<
- *     if candidates is NULL:
+  /* "fuzzysearch/_generic_search.pyx":253
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \
+ *             group_starts is NULL or group_heads is NULL:             # <<<<<<<<<<<<<<
  *         free(candidates)
+ *         free(new_candidates)
  */
-  __pyx_v_new_candidates = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)malloc((__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
-
-  /* "fuzzysearch/_generic_search.pyx":85
- *         raise MemoryError()
- *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:             # <<<<<<<<<<<<<<
+  __pyx_t_5 = ((__pyx_v_group_starts == NULL) != 0);
+  if (!__pyx_t_5) {
+  } else {
+    __pyx_t_4 = __pyx_t_5;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_5 = ((__pyx_v_group_heads == NULL) != 0);
+  __pyx_t_4 = __pyx_t_5;
+  __pyx_L4_bool_binop_done:;
+
+  /* "fuzzysearch/_generic_search.pyx":252
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \             # <<<<<<<<<<<<<<
+ *             group_starts is NULL or group_heads is NULL:
  *         free(candidates)
- *         raise MemoryError()
  */
-  __pyx_t_4 = ((__pyx_v_candidates == NULL) != 0);
   if (unlikely(__pyx_t_4)) {
 
-    /* "fuzzysearch/_generic_search.pyx":86
- *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:
+    /* "fuzzysearch/_generic_search.pyx":254
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \
+ *             group_starts is NULL or group_heads is NULL:
  *         free(candidates)             # <<<<<<<<<<<<<<
- *         raise MemoryError()
- * 
+ *         free(new_candidates)
+ *         free(next_in_group)
  */
     free(__pyx_v_candidates);
 
-    /* "fuzzysearch/_generic_search.pyx":87
- *     if candidates is NULL:
+    /* "fuzzysearch/_generic_search.pyx":255
+ *             group_starts is NULL or group_heads is NULL:
  *         free(candidates)
- *         raise MemoryError()             # <<<<<<<<<<<<<<
- * 
- *     matches = []
+ *         free(new_candidates)             # <<<<<<<<<<<<<<
+ *         free(next_in_group)
+ *         free(group_starts)
  */
-    PyErr_NoMemory(); __PYX_ERR(0, 87, __pyx_L1_error)
+    free(__pyx_v_new_candidates);
 
-    /* "fuzzysearch/_generic_search.pyx":85
- *         raise MemoryError()
- *     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
- *     if candidates is NULL:             # <<<<<<<<<<<<<<
+    /* "fuzzysearch/_generic_search.pyx":256
  *         free(candidates)
+ *         free(new_candidates)
+ *         free(next_in_group)             # <<<<<<<<<<<<<<
+ *         free(group_starts)
+ *         free(group_heads)
+ */
+    free(__pyx_v_next_in_group);
+
+    /* "fuzzysearch/_generic_search.pyx":257
+ *         free(new_candidates)
+ *         free(next_in_group)
+ *         free(group_starts)             # <<<<<<<<<<<<<<
+ *         free(group_heads)
+ *         raise MemoryError()
+ */
+    free(__pyx_v_group_starts);
+
+    /* "fuzzysearch/_generic_search.pyx":258
+ *         free(next_in_group)
+ *         free(group_starts)
+ *         free(group_heads)             # <<<<<<<<<<<<<<
  *         raise MemoryError()
+ *     for n_cand in xrange(subseq_len):
+ */
+    free(__pyx_v_group_heads);
+
+    /* "fuzzysearch/_generic_search.pyx":259
+ *         free(group_starts)
+ *         free(group_heads)
+ *         raise MemoryError()             # <<<<<<<<<<<<<<
+ *     for n_cand in xrange(subseq_len):
+ *         group_starts[n_cand] = SIZE_MAX
+ */
+    PyErr_NoMemory(); __PYX_ERR(0, 259, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":252
+ *     group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
+ *     group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
+ *     if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \             # <<<<<<<<<<<<<<
+ *             group_starts is NULL or group_heads is NULL:
+ *         free(candidates)
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":89
+  /* "fuzzysearch/_generic_search.pyx":260
+ *         free(group_heads)
  *         raise MemoryError()
+ *     for n_cand in xrange(subseq_len):             # <<<<<<<<<<<<<<
+ *         group_starts[n_cand] = SIZE_MAX
+ * 
+ */
+  __pyx_t_3 = __pyx_v_subseq_len;
+  __pyx_t_1 = __pyx_t_3;
+  for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_1; __pyx_t_2+=1) {
+    __pyx_v_n_cand = __pyx_t_2;
+
+    /* "fuzzysearch/_generic_search.pyx":261
+ *         raise MemoryError()
+ *     for n_cand in xrange(subseq_len):
+ *         group_starts[n_cand] = SIZE_MAX             # <<<<<<<<<<<<<<
+ * 
+ *     matches = []
+ */
+    (__pyx_v_group_starts[__pyx_v_n_cand]) = SIZE_MAX;
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":263
+ *         group_starts[n_cand] = SIZE_MAX
  * 
  *     matches = []             # <<<<<<<<<<<<<<
  *     def add_match(start, end, dist):
- *         matches.append(Match(start, end, dist, matched=sequence[start:end]))
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
  */
-  __pyx_t_5 = PyList_New(0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 89, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_5);
-  __Pyx_GIVEREF(__pyx_t_5);
-  __pyx_cur_scope->__pyx_v_matches = ((PyObject*)__pyx_t_5);
-  __pyx_t_5 = 0;
+  __pyx_t_6 = PyList_New(0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 263, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_GIVEREF(__pyx_t_6);
+  __pyx_cur_scope->__pyx_v_matches = ((PyObject*)__pyx_t_6);
+  __pyx_t_6 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":90
+  /* "fuzzysearch/_generic_search.pyx":264
  * 
  *     matches = []
  *     def add_match(start, end, dist):             # <<<<<<<<<<<<<<
- *         matches.append(Match(start, end, dist, matched=sequence[start:end]))
- * 
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))
  */
-  __pyx_t_5 = __Pyx_CyFunction_New(&__pyx_mdef_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match, 0, __pyx_n_s_c_find_near_matches_generic_lin, ((PyObject*)__pyx_cur_scope), __pyx_n_s_fuzzysearch__generic_search, __pyx_d, ((PyObject *)__pyx_codeobj__3)); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 90, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_5);
-  __pyx_v_add_match = __pyx_t_5;
-  __pyx_t_5 = 0;
+  __pyx_t_6 = __Pyx_CyFunction_New(&__pyx_mdef_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_1add_match, 0, __pyx_n_s_c_find_near_matches_generic_lin, ((PyObject*)__pyx_cur_scope), __pyx_n_s_fuzzysearch__generic_search, __pyx_d, ((PyObject *)__pyx_codeobj__4)); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 264, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __pyx_v_add_match = __pyx_t_6;
+  __pyx_t_6 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":97
+  /* "fuzzysearch/_generic_search.pyx":274
  *     cdef unsigned int n_skipped
  * 
  *     try:             # <<<<<<<<<<<<<<
@@ -2406,1139 +4239,1506 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
  *         have_realloced = False
  */
   /*try:*/ {
+    {
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __Pyx_ExceptionSave(&__pyx_t_7, &__pyx_t_8, &__pyx_t_9);
+      __Pyx_XGOTREF(__pyx_t_7);
+      __Pyx_XGOTREF(__pyx_t_8);
+      __Pyx_XGOTREF(__pyx_t_9);
+      /*try:*/ {
 
-    /* "fuzzysearch/_generic_search.pyx":98
+        /* "fuzzysearch/_generic_search.pyx":275
  * 
  *     try:
  *         index = 0             # <<<<<<<<<<<<<<
  *         have_realloced = False
  *         for seq_char in sequence[:seq_len]:
  */
-    __pyx_v_index = 0;
+        __pyx_v_index = 0;
 
-    /* "fuzzysearch/_generic_search.pyx":99
+        /* "fuzzysearch/_generic_search.pyx":276
  *     try:
  *         index = 0
  *         have_realloced = False             # <<<<<<<<<<<<<<
  *         for seq_char in sequence[:seq_len]:
  *             candidates[n_candidates] = GenericSearchCandidate(index, 0, 0, 0, 0, 0)
  */
-    __pyx_v_have_realloced = 0;
+        __pyx_v_have_realloced = 0;
 
-    /* "fuzzysearch/_generic_search.pyx":100
+        /* "fuzzysearch/_generic_search.pyx":277
  *         index = 0
  *         have_realloced = False
  *         for seq_char in sequence[:seq_len]:             # <<<<<<<<<<<<<<
  *             candidates[n_candidates] = GenericSearchCandidate(index, 0, 0, 0, 0, 0)
  *             n_candidates += 1
  */
-    __pyx_t_5 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_sequence + 0, __pyx_v_seq_len - 0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 100, __pyx_L6_error)
-    __Pyx_GOTREF(__pyx_t_5);
-    __pyx_t_7 = PyBytes_AS_STRING(__pyx_t_5);
-    __pyx_t_8 = (__pyx_t_7 + PyBytes_GET_SIZE(__pyx_t_5));
-    for (__pyx_t_9 = __pyx_t_7; __pyx_t_9 < __pyx_t_8; __pyx_t_9++) {
-      __pyx_t_6 = __pyx_t_9;
-      __pyx_v_seq_char = (__pyx_t_6[0]);
+        __pyx_t_6 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_sequence + 0, __pyx_v_seq_len - 0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 277, __pyx_L14_error)
+        __Pyx_GOTREF(__pyx_t_6);
+        __pyx_t_11 = PyBytes_AS_STRING(__pyx_t_6);
+        __pyx_t_12 = (__pyx_t_11 + PyBytes_GET_SIZE(__pyx_t_6));
+        for (__pyx_t_13 = __pyx_t_11; __pyx_t_13 < __pyx_t_12; __pyx_t_13++) {
+          __pyx_t_10 = __pyx_t_13;
+          __pyx_v_seq_char = (__pyx_t_10[0]);
 
-      /* "fuzzysearch/_generic_search.pyx":101
+          /* "fuzzysearch/_generic_search.pyx":278
  *         have_realloced = False
  *         for seq_char in sequence[:seq_len]:
  *             candidates[n_candidates] = GenericSearchCandidate(index, 0, 0, 0, 0, 0)             # <<<<<<<<<<<<<<
  *             n_candidates += 1
  * 
  */
-      __pyx_t_10.start = __pyx_v_index;
-      __pyx_t_10.subseq_index = 0;
-      __pyx_t_10.l_dist = 0;
-      __pyx_t_10.n_subs = 0;
-      __pyx_t_10.n_ins = 0;
-      __pyx_t_10.n_dels = 0;
-      (__pyx_v_candidates[__pyx_v_n_candidates]) = __pyx_t_10;
+          __pyx_t_14.start = __pyx_v_index;
+          __pyx_t_14.subseq_index = 0;
+          __pyx_t_14.l_dist = 0;
+          __pyx_t_14.n_subs = 0;
+          __pyx_t_14.n_ins = 0;
+          __pyx_t_14.n_dels = 0;
+          (__pyx_v_candidates[__pyx_v_n_candidates]) = __pyx_t_14;
 
-      /* "fuzzysearch/_generic_search.pyx":102
+          /* "fuzzysearch/_generic_search.pyx":279
  *         for seq_char in sequence[:seq_len]:
  *             candidates[n_candidates] = GenericSearchCandidate(index, 0, 0, 0, 0, 0)
  *             n_candidates += 1             # <<<<<<<<<<<<<<
  * 
  *             for n_cand in xrange(n_candidates):
  */
-      __pyx_v_n_candidates = (__pyx_v_n_candidates + 1);
+          __pyx_v_n_candidates = (__pyx_v_n_candidates + 1);
 
-      /* "fuzzysearch/_generic_search.pyx":104
+          /* "fuzzysearch/_generic_search.pyx":281
  *             n_candidates += 1
  * 
  *             for n_cand in xrange(n_candidates):             # <<<<<<<<<<<<<<
  *                 cand = candidates[n_cand]
  * 
  */
-      __pyx_t_3 = __pyx_v_n_candidates;
-      __pyx_t_1 = __pyx_t_3;
-      for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_1; __pyx_t_2+=1) {
-        __pyx_v_n_cand = __pyx_t_2;
+          __pyx_t_3 = __pyx_v_n_candidates;
+          __pyx_t_1 = __pyx_t_3;
+          for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_1; __pyx_t_2+=1) {
+            __pyx_v_n_cand = __pyx_t_2;
 
-        /* "fuzzysearch/_generic_search.pyx":105
+            /* "fuzzysearch/_generic_search.pyx":282
  * 
  *             for n_cand in xrange(n_candidates):
  *                 cand = candidates[n_cand]             # <<<<<<<<<<<<<<
  * 
  *                 if n_new_candidates + 4 > alloc_size:
  */
-        __pyx_v_cand = (__pyx_v_candidates[__pyx_v_n_cand]);
+            __pyx_v_cand = (__pyx_v_candidates[__pyx_v_n_cand]);
 
-        /* "fuzzysearch/_generic_search.pyx":107
+            /* "fuzzysearch/_generic_search.pyx":284
  *                 cand = candidates[n_cand]
  * 
  *                 if n_new_candidates + 4 > alloc_size:             # <<<<<<<<<<<<<<
  *                     alloc_size *= 2
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  */
-        __pyx_t_4 = (((__pyx_v_n_new_candidates + 4) > __pyx_v_alloc_size) != 0);
-        if (__pyx_t_4) {
+            __pyx_t_4 = (((__pyx_v_n_new_candidates + 4) > __pyx_v_alloc_size) != 0);
+            if (__pyx_t_4) {
 
-          /* "fuzzysearch/_generic_search.pyx":108
+              /* "fuzzysearch/_generic_search.pyx":285
  * 
  *                 if n_new_candidates + 4 > alloc_size:
  *                     alloc_size *= 2             # <<<<<<<<<<<<<<
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                     if _tmp is NULL:
  */
-          __pyx_v_alloc_size = (__pyx_v_alloc_size * 2);
+              __pyx_v_alloc_size = (__pyx_v_alloc_size * 2);
 
-          /* "fuzzysearch/_generic_search.pyx":109
+              /* "fuzzysearch/_generic_search.pyx":286
  *                 if n_new_candidates + 4 > alloc_size:
  *                     alloc_size *= 2
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))             # <<<<<<<<<<<<<<
  *                     if _tmp is NULL:
  *                         raise MemoryError()
  */
-          __pyx_v__tmp = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)realloc(__pyx_v_new_candidates, (__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
+              __pyx_v__tmp = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)realloc(__pyx_v_new_candidates, (__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
 
-          /* "fuzzysearch/_generic_search.pyx":110
+              /* "fuzzysearch/_generic_search.pyx":287
  *                     alloc_size *= 2
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                     if _tmp is NULL:             # <<<<<<<<<<<<<<
  *                         raise MemoryError()
  *                     new_candidates = _tmp
  */
-          __pyx_t_4 = ((__pyx_v__tmp == NULL) != 0);
-          if (unlikely(__pyx_t_4)) {
+              __pyx_t_4 = ((__pyx_v__tmp == NULL) != 0);
+              if (unlikely(__pyx_t_4)) {
 
-            /* "fuzzysearch/_generic_search.pyx":111
+                /* "fuzzysearch/_generic_search.pyx":288
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                     if _tmp is NULL:
  *                         raise MemoryError()             # <<<<<<<<<<<<<<
  *                     new_candidates = _tmp
- *                     have_realloced = True
+ *                     _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))
  */
-            PyErr_NoMemory(); __PYX_ERR(0, 111, __pyx_L6_error)
+                PyErr_NoMemory(); __PYX_ERR(0, 288, __pyx_L14_error)
 
-            /* "fuzzysearch/_generic_search.pyx":110
+                /* "fuzzysearch/_generic_search.pyx":287
  *                     alloc_size *= 2
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                     if _tmp is NULL:             # <<<<<<<<<<<<<<
  *                         raise MemoryError()
  *                     new_candidates = _tmp
  */
-          }
+              }
 
-          /* "fuzzysearch/_generic_search.pyx":112
+              /* "fuzzysearch/_generic_search.pyx":289
  *                     if _tmp is NULL:
  *                         raise MemoryError()
  *                     new_candidates = _tmp             # <<<<<<<<<<<<<<
+ *                     _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))
+ *                     if _tmp_next_in_group is NULL:
+ */
+              __pyx_v_new_candidates = __pyx_v__tmp;
+
+              /* "fuzzysearch/_generic_search.pyx":290
+ *                         raise MemoryError()
+ *                     new_candidates = _tmp
+ *                     _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))             # <<<<<<<<<<<<<<
+ *                     if _tmp_next_in_group is NULL:
+ *                         raise MemoryError()
+ */
+              __pyx_v__tmp_next_in_group = ((Py_ssize_t *)realloc(__pyx_v_next_in_group, (__pyx_v_alloc_size * (sizeof(Py_ssize_t)))));
+
+              /* "fuzzysearch/_generic_search.pyx":291
+ *                     new_candidates = _tmp
+ *                     _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))
+ *                     if _tmp_next_in_group is NULL:             # <<<<<<<<<<<<<<
+ *                         raise MemoryError()
+ *                     next_in_group = _tmp_next_in_group
+ */
+              __pyx_t_4 = ((__pyx_v__tmp_next_in_group == NULL) != 0);
+              if (unlikely(__pyx_t_4)) {
+
+                /* "fuzzysearch/_generic_search.pyx":292
+ *                     _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))
+ *                     if _tmp_next_in_group is NULL:
+ *                         raise MemoryError()             # <<<<<<<<<<<<<<
+ *                     next_in_group = _tmp_next_in_group
+ *                     have_realloced = True
+ */
+                PyErr_NoMemory(); __PYX_ERR(0, 292, __pyx_L14_error)
+
+                /* "fuzzysearch/_generic_search.pyx":291
+ *                     new_candidates = _tmp
+ *                     _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))
+ *                     if _tmp_next_in_group is NULL:             # <<<<<<<<<<<<<<
+ *                         raise MemoryError()
+ *                     next_in_group = _tmp_next_in_group
+ */
+              }
+
+              /* "fuzzysearch/_generic_search.pyx":293
+ *                     if _tmp_next_in_group is NULL:
+ *                         raise MemoryError()
+ *                     next_in_group = _tmp_next_in_group             # <<<<<<<<<<<<<<
  *                     have_realloced = True
  * 
  */
-          __pyx_v_new_candidates = __pyx_v__tmp;
+              __pyx_v_next_in_group = __pyx_v__tmp_next_in_group;
 
-          /* "fuzzysearch/_generic_search.pyx":113
+              /* "fuzzysearch/_generic_search.pyx":294
  *                         raise MemoryError()
- *                     new_candidates = _tmp
+ *                     next_in_group = _tmp_next_in_group
  *                     have_realloced = True             # <<<<<<<<<<<<<<
  * 
  *                 # if this sequence char is the candidate's next expected char
  */
-          __pyx_v_have_realloced = 1;
+              __pyx_v_have_realloced = 1;
 
-          /* "fuzzysearch/_generic_search.pyx":107
+              /* "fuzzysearch/_generic_search.pyx":284
  *                 cand = candidates[n_cand]
  * 
  *                 if n_new_candidates + 4 > alloc_size:             # <<<<<<<<<<<<<<
  *                     alloc_size *= 2
  *                     _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  */
-        }
+            }
 
-        /* "fuzzysearch/_generic_search.pyx":116
+            /* "fuzzysearch/_generic_search.pyx":297
  * 
  *                 # if this sequence char is the candidate's next expected char
- *                 if seq_char == subsequence[cand.subseq_index]:             # <<<<<<<<<<<<<<
+ *                 if items_match(table, seq_char, subsequence[cand.subseq_index]):             # <<<<<<<<<<<<<<
  *                     # if reached the end of the subsequence, return a match
  *                     if cand.subseq_index == subseq_len_minus_one:
  */
-        __pyx_t_4 = ((__pyx_v_seq_char == (__pyx_v_subsequence[__pyx_v_cand.subseq_index])) != 0);
-        if (__pyx_t_4) {
+            __pyx_t_4 = (__pyx_f_11fuzzysearch_15_generic_search_items_match(__pyx_v_table, __pyx_v_seq_char, (__pyx_v_subsequence[__pyx_v_cand.subseq_index])) != 0);
+            if (__pyx_t_4) {
 
-          /* "fuzzysearch/_generic_search.pyx":118
- *                 if seq_char == subsequence[cand.subseq_index]:
+              /* "fuzzysearch/_generic_search.pyx":299
+ *                 if items_match(table, seq_char, subsequence[cand.subseq_index]):
  *                     # if reached the end of the subsequence, return a match
  *                     if cand.subseq_index == subseq_len_minus_one:             # <<<<<<<<<<<<<<
  *                         add_match(cand.start, index + 1, cand.l_dist)
  *                     # otherwise, update the candidate's subseq_index and keep it
  */
-          __pyx_t_4 = ((__pyx_v_cand.subseq_index == __pyx_v_subseq_len_minus_one) != 0);
-          if (__pyx_t_4) {
+              __pyx_t_4 = ((__pyx_v_cand.subseq_index == __pyx_v_subseq_len_minus_one) != 0);
+              if (__pyx_t_4) {
 
-            /* "fuzzysearch/_generic_search.pyx":119
+                /* "fuzzysearch/_generic_search.pyx":300
  *                     # if reached the end of the subsequence, return a match
  *                     if cand.subseq_index == subseq_len_minus_one:
  *                         add_match(cand.start, index + 1, cand.l_dist)             # <<<<<<<<<<<<<<
  *                     # otherwise, update the candidate's subseq_index and keep it
  *                     else:
  */
-            __pyx_t_11 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 119, __pyx_L6_error)
-            __Pyx_GOTREF(__pyx_t_11);
-            __pyx_t_12 = __Pyx_PyInt_FromSize_t((__pyx_v_index + 1)); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 119, __pyx_L6_error)
-            __Pyx_GOTREF(__pyx_t_12);
-            __pyx_t_13 = __Pyx_PyInt_From_unsigned_int(__pyx_v_cand.l_dist); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 119, __pyx_L6_error)
-            __Pyx_GOTREF(__pyx_t_13);
-            __pyx_t_14 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_11, __pyx_t_12, __pyx_t_13); if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 119, __pyx_L6_error)
-            __Pyx_GOTREF(__pyx_t_14);
-            __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-            __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-            __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-            __Pyx_DECREF(__pyx_t_14); __pyx_t_14 = 0;
-
-            /* "fuzzysearch/_generic_search.pyx":118
- *                 if seq_char == subsequence[cand.subseq_index]:
+                __pyx_t_15 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_15)) __PYX_ERR(0, 300, __pyx_L14_error)
+                __Pyx_GOTREF(__pyx_t_15);
+                __pyx_t_16 = __Pyx_PyInt_FromSize_t((__pyx_v_index + 1)); if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 300, __pyx_L14_error)
+                __Pyx_GOTREF(__pyx_t_16);
+                __pyx_t_17 = __Pyx_PyInt_From_unsigned_int(__pyx_v_cand.l_dist); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 300, __pyx_L14_error)
+                __Pyx_GOTREF(__pyx_t_17);
+                __pyx_t_18 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_15, __pyx_t_16, __pyx_t_17); if (unlikely(!__pyx_t_18)) __PYX_ERR(0, 300, __pyx_L14_error)
+                __Pyx_GOTREF(__pyx_t_18);
+                __Pyx_DECREF(__pyx_t_15); __pyx_t_15 = 0;
+                __Pyx_DECREF(__pyx_t_16); __pyx_t_16 = 0;
+                __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+                __Pyx_DECREF(__pyx_t_18); __pyx_t_18 = 0;
+
+                /* "fuzzysearch/_generic_search.pyx":299
+ *                 if items_match(table, seq_char, subsequence[cand.subseq_index]):
  *                     # if reached the end of the subsequence, return a match
  *                     if cand.subseq_index == subseq_len_minus_one:             # <<<<<<<<<<<<<<
  *                         add_match(cand.start, index + 1, cand.l_dist)
  *                     # otherwise, update the candidate's subseq_index and keep it
  */
-            goto __pyx_L15;
-          }
+                goto __pyx_L28;
+              }
 
-          /* "fuzzysearch/_generic_search.pyx":122
+              /* "fuzzysearch/_generic_search.pyx":303
  *                     # otherwise, update the candidate's subseq_index and keep it
  *                     else:
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                             cand.start, cand.subseq_index + 1,
- *                             cand.l_dist, cand.n_subs,
+ *                         _add_candidate(             # <<<<<<<<<<<<<<
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index + 1,
  */
-          /*else*/ {
+              /*else*/ {
 
-            /* "fuzzysearch/_generic_search.pyx":123
- *                     else:
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                             cand.start, cand.subseq_index + 1,             # <<<<<<<<<<<<<<
- *                             cand.l_dist, cand.n_subs,
- *                             cand.n_ins, cand.n_dels,
- */
-            __pyx_t_10.start = __pyx_v_cand.start;
-            __pyx_t_10.subseq_index = (__pyx_v_cand.subseq_index + 1);
-
-            /* "fuzzysearch/_generic_search.pyx":124
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                             cand.start, cand.subseq_index + 1,
- *                             cand.l_dist, cand.n_subs,             # <<<<<<<<<<<<<<
- *                             cand.n_ins, cand.n_dels,
- *                         )
+                /* "fuzzysearch/_generic_search.pyx":305
+ *                         _add_candidate(
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index + 1,             # <<<<<<<<<<<<<<
+ *                                 cand.l_dist, cand.n_subs,
+ *                                 cand.n_ins, cand.n_dels,
  */
-            __pyx_t_10.l_dist = __pyx_v_cand.l_dist;
-            __pyx_t_10.n_subs = __pyx_v_cand.n_subs;
+                __pyx_t_14.start = __pyx_v_cand.start;
+                __pyx_t_14.subseq_index = (__pyx_v_cand.subseq_index + 1);
 
-            /* "fuzzysearch/_generic_search.pyx":125
- *                             cand.start, cand.subseq_index + 1,
- *                             cand.l_dist, cand.n_subs,
- *                             cand.n_ins, cand.n_dels,             # <<<<<<<<<<<<<<
- *                         )
- *                         n_new_candidates += 1
+                /* "fuzzysearch/_generic_search.pyx":306
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index + 1,
+ *                                 cand.l_dist, cand.n_subs,             # <<<<<<<<<<<<<<
+ *                                 cand.n_ins, cand.n_dels,
+ *                             ),
  */
-            __pyx_t_10.n_ins = __pyx_v_cand.n_ins;
-            __pyx_t_10.n_dels = __pyx_v_cand.n_dels;
+                __pyx_t_14.l_dist = __pyx_v_cand.l_dist;
+                __pyx_t_14.n_subs = __pyx_v_cand.n_subs;
 
-            /* "fuzzysearch/_generic_search.pyx":122
- *                     # otherwise, update the candidate's subseq_index and keep it
- *                     else:
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                             cand.start, cand.subseq_index + 1,
- *                             cand.l_dist, cand.n_subs,
+                /* "fuzzysearch/_generic_search.pyx":307
+ *                                 cand.start, cand.subseq_index + 1,
+ *                                 cand.l_dist, cand.n_subs,
+ *                                 cand.n_ins, cand.n_dels,             # <<<<<<<<<<<<<<
+ *                             ),
+ *                             new_candidates, &n_new_candidates,
  */
-            (__pyx_v_new_candidates[__pyx_v_n_new_candidates]) = __pyx_t_10;
+                __pyx_t_14.n_ins = __pyx_v_cand.n_ins;
+                __pyx_t_14.n_dels = __pyx_v_cand.n_dels;
 
-            /* "fuzzysearch/_generic_search.pyx":127
- *                             cand.n_ins, cand.n_dels,
- *                         )
- *                         n_new_candidates += 1             # <<<<<<<<<<<<<<
- * 
- *                 # if this sequence char is *not* the candidate's next expected char
+                /* "fuzzysearch/_generic_search.pyx":303
+ *                     # otherwise, update the candidate's subseq_index and keep it
+ *                     else:
+ *                         _add_candidate(             # <<<<<<<<<<<<<<
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index + 1,
  */
-            __pyx_v_n_new_candidates = (__pyx_v_n_new_candidates + 1);
-          }
-          __pyx_L15:;
+                __pyx_f_11fuzzysearch_15_generic_search__add_candidate(__pyx_t_14, __pyx_v_new_candidates, (&__pyx_v_n_new_candidates), __pyx_v_next_in_group, __pyx_v_group_starts, __pyx_v_group_heads, __pyx_v_merge_starts);
+              }
+              __pyx_L28:;
 
-          /* "fuzzysearch/_generic_search.pyx":116
+              /* "fuzzysearch/_generic_search.pyx":297
  * 
  *                 # if this sequence char is the candidate's next expected char
- *                 if seq_char == subsequence[cand.subseq_index]:             # <<<<<<<<<<<<<<
+ *                 if items_match(table, seq_char, subsequence[cand.subseq_index]):             # <<<<<<<<<<<<<<
  *                     # if reached the end of the subsequence, return a match
  *                     if cand.subseq_index == subseq_len_minus_one:
  */
-          goto __pyx_L14;
-        }
+              goto __pyx_L27;
+            }
 
-        /* "fuzzysearch/_generic_search.pyx":134
+            /* "fuzzysearch/_generic_search.pyx":319
  *                     # unless this candidate has already skipped the maximum allowed
  *                     # number of characters
  *                     if cand.l_dist == max_l_dist:             # <<<<<<<<<<<<<<
  *                         continue
  * 
  */
-        /*else*/ {
-          __pyx_t_4 = ((__pyx_v_cand.l_dist == __pyx_v_max_l_dist) != 0);
-          if (__pyx_t_4) {
+            /*else*/ {
+              __pyx_t_4 = ((__pyx_v_cand.l_dist == __pyx_v_max_l_dist) != 0);
+              if (__pyx_t_4) {
 
-            /* "fuzzysearch/_generic_search.pyx":135
+                /* "fuzzysearch/_generic_search.pyx":320
  *                     # number of characters
  *                     if cand.l_dist == max_l_dist:
  *                         continue             # <<<<<<<<<<<<<<
  * 
  *                     if cand.n_ins < max_insertions:
  */
-            goto __pyx_L10_continue;
+                goto __pyx_L22_continue;
 
-            /* "fuzzysearch/_generic_search.pyx":134
+                /* "fuzzysearch/_generic_search.pyx":319
  *                     # unless this candidate has already skipped the maximum allowed
  *                     # number of characters
  *                     if cand.l_dist == max_l_dist:             # <<<<<<<<<<<<<<
  *                         continue
  * 
  */
-          }
+              }
 
-          /* "fuzzysearch/_generic_search.pyx":137
+              /* "fuzzysearch/_generic_search.pyx":322
  *                         continue
  * 
  *                     if cand.n_ins < max_insertions:             # <<<<<<<<<<<<<<
  *                         # add a candidate skipping a sequence char
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(
+ *                         _add_candidate(
  */
-          __pyx_t_4 = ((__pyx_v_cand.n_ins < __pyx_v_max_insertions) != 0);
-          if (__pyx_t_4) {
+              __pyx_t_4 = ((__pyx_v_cand.n_ins < __pyx_v_max_insertions) != 0);
+              if (__pyx_t_4) {
 
-            /* "fuzzysearch/_generic_search.pyx":140
- *                         # add a candidate skipping a sequence char
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                             cand.start, cand.subseq_index,             # <<<<<<<<<<<<<<
- *                             cand.l_dist + 1, cand.n_subs,
- *                             cand.n_ins + 1, cand.n_dels,
- */
-            __pyx_t_10.start = __pyx_v_cand.start;
-            __pyx_t_10.subseq_index = __pyx_v_cand.subseq_index;
-
-            /* "fuzzysearch/_generic_search.pyx":141
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                             cand.start, cand.subseq_index,
- *                             cand.l_dist + 1, cand.n_subs,             # <<<<<<<<<<<<<<
- *                             cand.n_ins + 1, cand.n_dels,
- *                         )
+                /* "fuzzysearch/_generic_search.pyx":326
+ *                         _add_candidate(
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index,             # <<<<<<<<<<<<<<
+ *                                 cand.l_dist + 1, cand.n_subs,
+ *                                 cand.n_ins + 1, cand.n_dels,
  */
-            __pyx_t_10.l_dist = (__pyx_v_cand.l_dist + 1);
-            __pyx_t_10.n_subs = __pyx_v_cand.n_subs;
+                __pyx_t_14.start = __pyx_v_cand.start;
+                __pyx_t_14.subseq_index = __pyx_v_cand.subseq_index;
 
-            /* "fuzzysearch/_generic_search.pyx":142
- *                             cand.start, cand.subseq_index,
- *                             cand.l_dist + 1, cand.n_subs,
- *                             cand.n_ins + 1, cand.n_dels,             # <<<<<<<<<<<<<<
- *                         )
- *                         n_new_candidates += 1
+                /* "fuzzysearch/_generic_search.pyx":327
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index,
+ *                                 cand.l_dist + 1, cand.n_subs,             # <<<<<<<<<<<<<<
+ *                                 cand.n_ins + 1, cand.n_dels,
+ *                             ),
  */
-            __pyx_t_10.n_ins = (__pyx_v_cand.n_ins + 1);
-            __pyx_t_10.n_dels = __pyx_v_cand.n_dels;
+                __pyx_t_14.l_dist = (__pyx_v_cand.l_dist + 1);
+                __pyx_t_14.n_subs = __pyx_v_cand.n_subs;
 
-            /* "fuzzysearch/_generic_search.pyx":139
- *                     if cand.n_ins < max_insertions:
- *                         # add a candidate skipping a sequence char
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                             cand.start, cand.subseq_index,
- *                             cand.l_dist + 1, cand.n_subs,
+                /* "fuzzysearch/_generic_search.pyx":328
+ *                                 cand.start, cand.subseq_index,
+ *                                 cand.l_dist + 1, cand.n_subs,
+ *                                 cand.n_ins + 1, cand.n_dels,             # <<<<<<<<<<<<<<
+ *                             ),
+ *                             new_candidates, &n_new_candidates,
  */
-            (__pyx_v_new_candidates[__pyx_v_n_new_candidates]) = __pyx_t_10;
+                __pyx_t_14.n_ins = (__pyx_v_cand.n_ins + 1);
+                __pyx_t_14.n_dels = __pyx_v_cand.n_dels;
 
-            /* "fuzzysearch/_generic_search.pyx":144
- *                             cand.n_ins + 1, cand.n_dels,
- *                         )
- *                         n_new_candidates += 1             # <<<<<<<<<<<<<<
- * 
- *                     if cand.subseq_index + 1 < subseq_len:
+                /* "fuzzysearch/_generic_search.pyx":324
+ *                     if cand.n_ins < max_insertions:
+ *                         # add a candidate skipping a sequence char
+ *                         _add_candidate(             # <<<<<<<<<<<<<<
+ *                             GenericSearchCandidate(
+ *                                 cand.start, cand.subseq_index,
  */
-            __pyx_v_n_new_candidates = (__pyx_v_n_new_candidates + 1);
+                __pyx_f_11fuzzysearch_15_generic_search__add_candidate(__pyx_t_14, __pyx_v_new_candidates, (&__pyx_v_n_new_candidates), __pyx_v_next_in_group, __pyx_v_group_starts, __pyx_v_group_heads, __pyx_v_merge_starts);
 
-            /* "fuzzysearch/_generic_search.pyx":137
+                /* "fuzzysearch/_generic_search.pyx":322
  *                         continue
  * 
  *                     if cand.n_ins < max_insertions:             # <<<<<<<<<<<<<<
  *                         # add a candidate skipping a sequence char
- *                         new_candidates[n_new_candidates] = GenericSearchCandidate(
+ *                         _add_candidate(
  */
-          }
+              }
 
-          /* "fuzzysearch/_generic_search.pyx":146
- *                         n_new_candidates += 1
+              /* "fuzzysearch/_generic_search.pyx":335
+ *                         )
  * 
  *                     if cand.subseq_index + 1 < subseq_len:             # <<<<<<<<<<<<<<
  *                         if cand.n_subs < max_substitutions:
  *                             # add a candidate skipping both a sequence char and a
  */
-          __pyx_t_4 = (((__pyx_v_cand.subseq_index + 1) < __pyx_v_subseq_len) != 0);
-          if (__pyx_t_4) {
+              __pyx_t_4 = (((__pyx_v_cand.subseq_index + 1) < __pyx_v_subseq_len) != 0);
+              if (__pyx_t_4) {
 
-            /* "fuzzysearch/_generic_search.pyx":147
+                /* "fuzzysearch/_generic_search.pyx":336
  * 
  *                     if cand.subseq_index + 1 < subseq_len:
  *                         if cand.n_subs < max_substitutions:             # <<<<<<<<<<<<<<
  *                             # add a candidate skipping both a sequence char and a
  *                             # subsequence char
  */
-            __pyx_t_4 = ((__pyx_v_cand.n_subs < __pyx_v_max_substitutions) != 0);
-            if (__pyx_t_4) {
+                __pyx_t_4 = ((__pyx_v_cand.n_subs < __pyx_v_max_substitutions) != 0);
+                if (__pyx_t_4) {
 
-              /* "fuzzysearch/_generic_search.pyx":151
- *                             # subsequence char
- *                             new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                                 cand.start, cand.subseq_index + 1,             # <<<<<<<<<<<<<<
- *                                 cand.l_dist + 1, cand.n_subs + 1,
- *                                 cand.n_ins, cand.n_dels,
+                  /* "fuzzysearch/_generic_search.pyx":341
+ *                             _add_candidate(
+ *                                 GenericSearchCandidate(
+ *                                     cand.start, cand.subseq_index + 1,             # <<<<<<<<<<<<<<
+ *                                     cand.l_dist + 1, cand.n_subs + 1,
+ *                                     cand.n_ins, cand.n_dels,
  */
-              __pyx_t_10.start = __pyx_v_cand.start;
-              __pyx_t_10.subseq_index = (__pyx_v_cand.subseq_index + 1);
+                  __pyx_t_14.start = __pyx_v_cand.start;
+                  __pyx_t_14.subseq_index = (__pyx_v_cand.subseq_index + 1);
 
-              /* "fuzzysearch/_generic_search.pyx":152
- *                             new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                                 cand.start, cand.subseq_index + 1,
- *                                 cand.l_dist + 1, cand.n_subs + 1,             # <<<<<<<<<<<<<<
- *                                 cand.n_ins, cand.n_dels,
- *                             )
+                  /* "fuzzysearch/_generic_search.pyx":342
+ *                                 GenericSearchCandidate(
+ *                                     cand.start, cand.subseq_index + 1,
+ *                                     cand.l_dist + 1, cand.n_subs + 1,             # <<<<<<<<<<<<<<
+ *                                     cand.n_ins, cand.n_dels,
+ *                                 ),
  */
-              __pyx_t_10.l_dist = (__pyx_v_cand.l_dist + 1);
-              __pyx_t_10.n_subs = (__pyx_v_cand.n_subs + 1);
+                  __pyx_t_14.l_dist = (__pyx_v_cand.l_dist + 1);
+                  __pyx_t_14.n_subs = (__pyx_v_cand.n_subs + 1);
 
-              /* "fuzzysearch/_generic_search.pyx":153
- *                                 cand.start, cand.subseq_index + 1,
- *                                 cand.l_dist + 1, cand.n_subs + 1,
- *                                 cand.n_ins, cand.n_dels,             # <<<<<<<<<<<<<<
- *                             )
- *                             n_new_candidates += 1
+                  /* "fuzzysearch/_generic_search.pyx":343
+ *                                     cand.start, cand.subseq_index + 1,
+ *                                     cand.l_dist + 1, cand.n_subs + 1,
+ *                                     cand.n_ins, cand.n_dels,             # <<<<<<<<<<<<<<
+ *                                 ),
+ *                                 new_candidates, &n_new_candidates,
  */
-              __pyx_t_10.n_ins = __pyx_v_cand.n_ins;
-              __pyx_t_10.n_dels = __pyx_v_cand.n_dels;
+                  __pyx_t_14.n_ins = __pyx_v_cand.n_ins;
+                  __pyx_t_14.n_dels = __pyx_v_cand.n_dels;
 
-              /* "fuzzysearch/_generic_search.pyx":150
+                  /* "fuzzysearch/_generic_search.pyx":339
  *                             # add a candidate skipping both a sequence char and a
  *                             # subsequence char
- *                             new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                                 cand.start, cand.subseq_index + 1,
- *                                 cand.l_dist + 1, cand.n_subs + 1,
- */
-              (__pyx_v_new_candidates[__pyx_v_n_new_candidates]) = __pyx_t_10;
-
-              /* "fuzzysearch/_generic_search.pyx":155
- *                                 cand.n_ins, cand.n_dels,
- *                             )
- *                             n_new_candidates += 1             # <<<<<<<<<<<<<<
- *                         elif cand.n_dels < max_deletions and cand.n_ins < max_insertions:
- *                             # add a candidate skipping both a sequence char and a
+ *                             _add_candidate(             # <<<<<<<<<<<<<<
+ *                                 GenericSearchCandidate(
+ *                                     cand.start, cand.subseq_index + 1,
  */
-              __pyx_v_n_new_candidates = (__pyx_v_n_new_candidates + 1);
+                  __pyx_f_11fuzzysearch_15_generic_search__add_candidate(__pyx_t_14, __pyx_v_new_candidates, (&__pyx_v_n_new_candidates), __pyx_v_next_in_group, __pyx_v_group_starts, __pyx_v_group_heads, __pyx_v_merge_starts);
 
-              /* "fuzzysearch/_generic_search.pyx":147
+                  /* "fuzzysearch/_generic_search.pyx":336
  * 
  *                     if cand.subseq_index + 1 < subseq_len:
  *                         if cand.n_subs < max_substitutions:             # <<<<<<<<<<<<<<
  *                             # add a candidate skipping both a sequence char and a
  *                             # subsequence char
  */
-              goto __pyx_L19;
-            }
+                  goto __pyx_L32;
+                }
 
-            /* "fuzzysearch/_generic_search.pyx":156
+                /* "fuzzysearch/_generic_search.pyx":349
+ *                                 merge_starts,
  *                             )
- *                             n_new_candidates += 1
  *                         elif cand.n_dels < max_deletions and cand.n_ins < max_insertions:             # <<<<<<<<<<<<<<
  *                             # add a candidate skipping both a sequence char and a
  *                             # subsequence char
  */
-            __pyx_t_15 = ((__pyx_v_cand.n_dels < __pyx_v_max_deletions) != 0);
-            if (__pyx_t_15) {
-            } else {
-              __pyx_t_4 = __pyx_t_15;
-              goto __pyx_L20_bool_binop_done;
-            }
-            __pyx_t_15 = ((__pyx_v_cand.n_ins < __pyx_v_max_insertions) != 0);
-            __pyx_t_4 = __pyx_t_15;
-            __pyx_L20_bool_binop_done:;
-            if (__pyx_t_4) {
-
-              /* "fuzzysearch/_generic_search.pyx":160
- *                             # subsequence char
- *                             new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                                 cand.start, cand.subseq_index + 1,             # <<<<<<<<<<<<<<
- *                                 cand.l_dist + 1, cand.n_subs,
- *                                 cand.n_ins + 1, cand.n_dels + 1,
- */
-              __pyx_t_10.start = __pyx_v_cand.start;
-              __pyx_t_10.subseq_index = (__pyx_v_cand.subseq_index + 1);
-
-              /* "fuzzysearch/_generic_search.pyx":161
- *                             new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                                 cand.start, cand.subseq_index + 1,
- *                                 cand.l_dist + 1, cand.n_subs,             # <<<<<<<<<<<<<<
- *                                 cand.n_ins + 1, cand.n_dels + 1,
- *                             )
- */
-              __pyx_t_10.l_dist = (__pyx_v_cand.l_dist + 1);
-              __pyx_t_10.n_subs = __pyx_v_cand.n_subs;
-
-              /* "fuzzysearch/_generic_search.pyx":162
- *                                 cand.start, cand.subseq_index + 1,
- *                                 cand.l_dist + 1, cand.n_subs,
- *                                 cand.n_ins + 1, cand.n_dels + 1,             # <<<<<<<<<<<<<<
- *                             )
- *                             n_new_candidates += 1
- */
-              __pyx_t_10.n_ins = (__pyx_v_cand.n_ins + 1);
-              __pyx_t_10.n_dels = (__pyx_v_cand.n_dels + 1);
-
-              /* "fuzzysearch/_generic_search.pyx":159
+                __pyx_t_5 = ((__pyx_v_cand.n_dels < __pyx_v_max_deletions) != 0);
+                if (__pyx_t_5) {
+                } else {
+                  __pyx_t_4 = __pyx_t_5;
+                  goto __pyx_L33_bool_binop_done;
+                }
+                __pyx_t_5 = ((__pyx_v_cand.n_ins < __pyx_v_max_insertions) != 0);
+                __pyx_t_4 = __pyx_t_5;
+                __pyx_L33_bool_binop_done:;
+                if (__pyx_t_4) {
+
+                  /* "fuzzysearch/_generic_search.pyx":354
+ *                             _add_candidate(
+ *                                 GenericSearchCandidate(
+ *                                     cand.start, cand.subseq_index + 1,             # <<<<<<<<<<<<<<
+ *                                     cand.l_dist + 1, cand.n_subs,
+ *                                     cand.n_ins + 1, cand.n_dels + 1,
+ */
+                  __pyx_t_14.start = __pyx_v_cand.start;
+                  __pyx_t_14.subseq_index = (__pyx_v_cand.subseq_index + 1);
+
+                  /* "fuzzysearch/_generic_search.pyx":355
+ *                                 GenericSearchCandidate(
+ *                                     cand.start, cand.subseq_index + 1,
+ *                                     cand.l_dist + 1, cand.n_subs,             # <<<<<<<<<<<<<<
+ *                                     cand.n_ins + 1, cand.n_dels + 1,
+ *                                 ),
+ */
+                  __pyx_t_14.l_dist = (__pyx_v_cand.l_dist + 1);
+                  __pyx_t_14.n_subs = __pyx_v_cand.n_subs;
+
+                  /* "fuzzysearch/_generic_search.pyx":356
+ *                                     cand.start, cand.subseq_index + 1,
+ *                                     cand.l_dist + 1, cand.n_subs,
+ *                                     cand.n_ins + 1, cand.n_dels + 1,             # <<<<<<<<<<<<<<
+ *                                 ),
+ *                                 new_candidates, &n_new_candidates,
+ */
+                  __pyx_t_14.n_ins = (__pyx_v_cand.n_ins + 1);
+                  __pyx_t_14.n_dels = (__pyx_v_cand.n_dels + 1);
+
+                  /* "fuzzysearch/_generic_search.pyx":352
  *                             # add a candidate skipping both a sequence char and a
  *                             # subsequence char
- *                             new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                                 cand.start, cand.subseq_index + 1,
- *                                 cand.l_dist + 1, cand.n_subs,
- */
-              (__pyx_v_new_candidates[__pyx_v_n_new_candidates]) = __pyx_t_10;
-
-              /* "fuzzysearch/_generic_search.pyx":164
- *                                 cand.n_ins + 1, cand.n_dels + 1,
- *                             )
- *                             n_new_candidates += 1             # <<<<<<<<<<<<<<
- *                     else:
- *                         # cand.subseq_index == _subseq_len - 1
+ *                             _add_candidate(             # <<<<<<<<<<<<<<
+ *                                 GenericSearchCandidate(
+ *                                     cand.start, cand.subseq_index + 1,
  */
-              __pyx_v_n_new_candidates = (__pyx_v_n_new_candidates + 1);
+                  __pyx_f_11fuzzysearch_15_generic_search__add_candidate(__pyx_t_14, __pyx_v_new_candidates, (&__pyx_v_n_new_candidates), __pyx_v_next_in_group, __pyx_v_group_starts, __pyx_v_group_heads, __pyx_v_merge_starts);
 
-              /* "fuzzysearch/_generic_search.pyx":156
+                  /* "fuzzysearch/_generic_search.pyx":349
+ *                                 merge_starts,
  *                             )
- *                             n_new_candidates += 1
  *                         elif cand.n_dels < max_deletions and cand.n_ins < max_insertions:             # <<<<<<<<<<<<<<
  *                             # add a candidate skipping both a sequence char and a
  *                             # subsequence char
  */
-            }
-            __pyx_L19:;
+                }
+                __pyx_L32:;
 
-            /* "fuzzysearch/_generic_search.pyx":146
- *                         n_new_candidates += 1
+                /* "fuzzysearch/_generic_search.pyx":335
+ *                         )
  * 
  *                     if cand.subseq_index + 1 < subseq_len:             # <<<<<<<<<<<<<<
  *                         if cand.n_subs < max_substitutions:
  *                             # add a candidate skipping both a sequence char and a
  */
-            goto __pyx_L18;
-          }
+                goto __pyx_L31;
+              }
 
-          /* "fuzzysearch/_generic_search.pyx":167
+              /* "fuzzysearch/_generic_search.pyx":364
  *                     else:
  *                         # cand.subseq_index == _subseq_len - 1
  *                         if (             # <<<<<<<<<<<<<<
  *                                 cand.n_subs < max_substitutions or
  *                                 (
  */
-          /*else*/ {
+              /*else*/ {
 
-            /* "fuzzysearch/_generic_search.pyx":168
+                /* "fuzzysearch/_generic_search.pyx":365
  *                         # cand.subseq_index == _subseq_len - 1
  *                         if (
  *                                 cand.n_subs < max_substitutions or             # <<<<<<<<<<<<<<
  *                                 (
  *                                     cand.n_dels < max_deletions and
  */
-            __pyx_t_15 = ((__pyx_v_cand.n_subs < __pyx_v_max_substitutions) != 0);
-            if (!__pyx_t_15) {
-            } else {
-              __pyx_t_4 = __pyx_t_15;
-              goto __pyx_L23_bool_binop_done;
-            }
+                __pyx_t_5 = ((__pyx_v_cand.n_subs < __pyx_v_max_substitutions) != 0);
+                if (!__pyx_t_5) {
+                } else {
+                  __pyx_t_4 = __pyx_t_5;
+                  goto __pyx_L36_bool_binop_done;
+                }
 
-            /* "fuzzysearch/_generic_search.pyx":170
+                /* "fuzzysearch/_generic_search.pyx":367
  *                                 cand.n_subs < max_substitutions or
  *                                 (
  *                                     cand.n_dels < max_deletions and             # <<<<<<<<<<<<<<
  *                                     cand.n_ins < max_insertions
  *                                 )
  */
-            __pyx_t_15 = ((__pyx_v_cand.n_dels < __pyx_v_max_deletions) != 0);
-            if (__pyx_t_15) {
-            } else {
-              __pyx_t_4 = __pyx_t_15;
-              goto __pyx_L23_bool_binop_done;
-            }
+                __pyx_t_5 = ((__pyx_v_cand.n_dels < __pyx_v_max_deletions) != 0);
+                if (__pyx_t_5) {
+                } else {
+                  __pyx_t_4 = __pyx_t_5;
+                  goto __pyx_L36_bool_binop_done;
+                }
 
-            /* "fuzzysearch/_generic_search.pyx":171
+                /* "fuzzysearch/_generic_search.pyx":368
  *                                 (
  *                                     cand.n_dels < max_deletions and
  *                                     cand.n_ins < max_insertions             # <<<<<<<<<<<<<<
  *                                 )
  *                         ):
  */
-            __pyx_t_15 = ((__pyx_v_cand.n_ins < __pyx_v_max_insertions) != 0);
-            __pyx_t_4 = __pyx_t_15;
-            __pyx_L23_bool_binop_done:;
+                __pyx_t_5 = ((__pyx_v_cand.n_ins < __pyx_v_max_insertions) != 0);
+                __pyx_t_4 = __pyx_t_5;
+                __pyx_L36_bool_binop_done:;
 
-            /* "fuzzysearch/_generic_search.pyx":167
+                /* "fuzzysearch/_generic_search.pyx":364
  *                     else:
  *                         # cand.subseq_index == _subseq_len - 1
  *                         if (             # <<<<<<<<<<<<<<
  *                                 cand.n_subs < max_substitutions or
  *                                 (
  */
-            if (__pyx_t_4) {
+                if (__pyx_t_4) {
 
-              /* "fuzzysearch/_generic_search.pyx":174
+                  /* "fuzzysearch/_generic_search.pyx":371
  *                                 )
  *                         ):
  *                             add_match(cand.start, index + 1, cand.l_dist + 1)             # <<<<<<<<<<<<<<
  * 
  *                     # try skipping subsequence chars
  */
-              __pyx_t_14 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 174, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_14);
-              __pyx_t_13 = __Pyx_PyInt_FromSize_t((__pyx_v_index + 1)); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 174, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_13);
-              __pyx_t_12 = __Pyx_PyInt_From_long((__pyx_v_cand.l_dist + 1)); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 174, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_12);
-              __pyx_t_11 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_14, __pyx_t_13, __pyx_t_12); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 174, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_11);
-              __Pyx_DECREF(__pyx_t_14); __pyx_t_14 = 0;
-              __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-              __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-              __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-
-              /* "fuzzysearch/_generic_search.pyx":167
+                  __pyx_t_18 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_18)) __PYX_ERR(0, 371, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_18);
+                  __pyx_t_17 = __Pyx_PyInt_FromSize_t((__pyx_v_index + 1)); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 371, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_17);
+                  __pyx_t_16 = __Pyx_PyInt_From_long((__pyx_v_cand.l_dist + 1)); if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 371, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_16);
+                  __pyx_t_15 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_18, __pyx_t_17, __pyx_t_16); if (unlikely(!__pyx_t_15)) __PYX_ERR(0, 371, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_15);
+                  __Pyx_DECREF(__pyx_t_18); __pyx_t_18 = 0;
+                  __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+                  __Pyx_DECREF(__pyx_t_16); __pyx_t_16 = 0;
+                  __Pyx_DECREF(__pyx_t_15); __pyx_t_15 = 0;
+
+                  /* "fuzzysearch/_generic_search.pyx":364
  *                     else:
  *                         # cand.subseq_index == _subseq_len - 1
  *                         if (             # <<<<<<<<<<<<<<
  *                                 cand.n_subs < max_substitutions or
  *                                 (
  */
-            }
-          }
-          __pyx_L18:;
+                }
+              }
+              __pyx_L31:;
 
-          /* "fuzzysearch/_generic_search.pyx":177
+              /* "fuzzysearch/_generic_search.pyx":374
  * 
  *                     # try skipping subsequence chars
  *                     for n_skipped in xrange(<unsigned int> 1, min(max_deletions - cand.n_dels, max_l_dist - cand.l_dist) + <unsigned int> 1):             # <<<<<<<<<<<<<<
  *                         # if skipping n_dels sub-sequence chars reaches the end
  *                         # of the sub-sequence, yield a match
  */
-          __pyx_t_16 = (__pyx_v_max_l_dist - __pyx_v_cand.l_dist);
-          __pyx_t_17 = (__pyx_v_max_deletions - __pyx_v_cand.n_dels);
-          if (((__pyx_t_16 < __pyx_t_17) != 0)) {
-            __pyx_t_18 = __pyx_t_16;
-          } else {
-            __pyx_t_18 = __pyx_t_17;
-          }
-          __pyx_t_16 = (__pyx_t_18 + ((unsigned int)1));
-          __pyx_t_18 = __pyx_t_16;
-          for (__pyx_t_17 = ((unsigned int)1); __pyx_t_17 < __pyx_t_18; __pyx_t_17+=1) {
-            __pyx_v_n_skipped = __pyx_t_17;
+              __pyx_t_19 = (__pyx_v_max_l_dist - __pyx_v_cand.l_dist);
+              __pyx_t_20 = (__pyx_v_max_deletions - __pyx_v_cand.n_dels);
+              if (((__pyx_t_19 < __pyx_t_20) != 0)) {
+                __pyx_t_21 = __pyx_t_19;
+              } else {
+                __pyx_t_21 = __pyx_t_20;
+              }
+              __pyx_t_19 = (__pyx_t_21 + ((unsigned int)1));
+              __pyx_t_21 = __pyx_t_19;
+              for (__pyx_t_20 = ((unsigned int)1); __pyx_t_20 < __pyx_t_21; __pyx_t_20+=1) {
+                __pyx_v_n_skipped = __pyx_t_20;
 
-            /* "fuzzysearch/_generic_search.pyx":180
+                /* "fuzzysearch/_generic_search.pyx":377
  *                         # if skipping n_dels sub-sequence chars reaches the end
  *                         # of the sub-sequence, yield a match
  *                         if cand.subseq_index + n_skipped == subseq_len:             # <<<<<<<<<<<<<<
  *                             add_match(cand.start, index, cand.l_dist + n_skipped)
  *                             break
  */
-            __pyx_t_4 = (((__pyx_v_cand.subseq_index + __pyx_v_n_skipped) == __pyx_v_subseq_len) != 0);
-            if (__pyx_t_4) {
+                __pyx_t_4 = (((__pyx_v_cand.subseq_index + __pyx_v_n_skipped) == __pyx_v_subseq_len) != 0);
+                if (__pyx_t_4) {
 
-              /* "fuzzysearch/_generic_search.pyx":181
+                  /* "fuzzysearch/_generic_search.pyx":378
  *                         # of the sub-sequence, yield a match
  *                         if cand.subseq_index + n_skipped == subseq_len:
  *                             add_match(cand.start, index, cand.l_dist + n_skipped)             # <<<<<<<<<<<<<<
  *                             break
  *                         # otherwise, if skipping n_skipped sub-sequence chars
  */
-              __pyx_t_11 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 181, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_11);
-              __pyx_t_12 = __Pyx_PyInt_FromSize_t(__pyx_v_index); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 181, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_12);
-              __pyx_t_13 = __Pyx_PyInt_From_unsigned_int((__pyx_v_cand.l_dist + __pyx_v_n_skipped)); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 181, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_13);
-              __pyx_t_14 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_11, __pyx_t_12, __pyx_t_13); if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 181, __pyx_L6_error)
-              __Pyx_GOTREF(__pyx_t_14);
-              __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-              __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-              __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-              __Pyx_DECREF(__pyx_t_14); __pyx_t_14 = 0;
-
-              /* "fuzzysearch/_generic_search.pyx":182
+                  __pyx_t_15 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_15)) __PYX_ERR(0, 378, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_15);
+                  __pyx_t_16 = __Pyx_PyInt_FromSize_t(__pyx_v_index); if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 378, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_16);
+                  __pyx_t_17 = __Pyx_PyInt_From_unsigned_int((__pyx_v_cand.l_dist + __pyx_v_n_skipped)); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 378, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_17);
+                  __pyx_t_18 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_15, __pyx_t_16, __pyx_t_17); if (unlikely(!__pyx_t_18)) __PYX_ERR(0, 378, __pyx_L14_error)
+                  __Pyx_GOTREF(__pyx_t_18);
+                  __Pyx_DECREF(__pyx_t_15); __pyx_t_15 = 0;
+                  __Pyx_DECREF(__pyx_t_16); __pyx_t_16 = 0;
+                  __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+                  __Pyx_DECREF(__pyx_t_18); __pyx_t_18 = 0;
+
+                  /* "fuzzysearch/_generic_search.pyx":379
  *                         if cand.subseq_index + n_skipped == subseq_len:
  *                             add_match(cand.start, index, cand.l_dist + n_skipped)
  *                             break             # <<<<<<<<<<<<<<
  *                         # otherwise, if skipping n_skipped sub-sequence chars
  *                         # reaches a sub-sequence char identical to this sequence
  */
-              goto __pyx_L27_break;
+                  goto __pyx_L40_break;
 
-              /* "fuzzysearch/_generic_search.pyx":180
+                  /* "fuzzysearch/_generic_search.pyx":377
  *                         # if skipping n_dels sub-sequence chars reaches the end
  *                         # of the sub-sequence, yield a match
  *                         if cand.subseq_index + n_skipped == subseq_len:             # <<<<<<<<<<<<<<
  *                             add_match(cand.start, index, cand.l_dist + n_skipped)
  *                             break
  */
-            }
+                }
 
-            /* "fuzzysearch/_generic_search.pyx":186
+                /* "fuzzysearch/_generic_search.pyx":383
  *                         # reaches a sub-sequence char identical to this sequence
  *                         # char ...
- *                         elif seq_char == subsequence[cand.subseq_index + n_skipped]:             # <<<<<<<<<<<<<<
+ *                         elif items_match(table, seq_char, subsequence[cand.subseq_index + n_skipped]):             # <<<<<<<<<<<<<<
  *                             # if this is the last char of the sub-sequence, yield
  *                             # a match
  */
-            __pyx_t_4 = ((__pyx_v_seq_char == (__pyx_v_subsequence[(__pyx_v_cand.subseq_index + __pyx_v_n_skipped)])) != 0);
-            if (__pyx_t_4) {
+                __pyx_t_4 = (__pyx_f_11fuzzysearch_15_generic_search_items_match(__pyx_v_table, __pyx_v_seq_char, (__pyx_v_subsequence[(__pyx_v_cand.subseq_index + __pyx_v_n_skipped)])) != 0);
+                if (__pyx_t_4) {
 
-              /* "fuzzysearch/_generic_search.pyx":189
+                  /* "fuzzysearch/_generic_search.pyx":386
  *                             # if this is the last char of the sub-sequence, yield
  *                             # a match
  *                             if cand.subseq_index + n_skipped + 1 == subseq_len:             # <<<<<<<<<<<<<<
  *                                 add_match(cand.start, index, cand.l_dist + n_skipped)
  *                             # otherwise add a candidate skipping n_skipped
  */
-              __pyx_t_4 = ((((__pyx_v_cand.subseq_index + __pyx_v_n_skipped) + 1) == __pyx_v_subseq_len) != 0);
-              if (__pyx_t_4) {
+                  __pyx_t_4 = ((((__pyx_v_cand.subseq_index + __pyx_v_n_skipped) + 1) == __pyx_v_subseq_len) != 0);
+                  if (__pyx_t_4) {
 
-                /* "fuzzysearch/_generic_search.pyx":190
+                    /* "fuzzysearch/_generic_search.pyx":387
  *                             # a match
  *                             if cand.subseq_index + n_skipped + 1 == subseq_len:
  *                                 add_match(cand.start, index, cand.l_dist + n_skipped)             # <<<<<<<<<<<<<<
  *                             # otherwise add a candidate skipping n_skipped
  *                             # subsequence chars
  */
-                __pyx_t_14 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 190, __pyx_L6_error)
-                __Pyx_GOTREF(__pyx_t_14);
-                __pyx_t_13 = __Pyx_PyInt_FromSize_t(__pyx_v_index); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 190, __pyx_L6_error)
-                __Pyx_GOTREF(__pyx_t_13);
-                __pyx_t_12 = __Pyx_PyInt_From_unsigned_int((__pyx_v_cand.l_dist + __pyx_v_n_skipped)); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 190, __pyx_L6_error)
-                __Pyx_GOTREF(__pyx_t_12);
-                __pyx_t_11 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_14, __pyx_t_13, __pyx_t_12); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 190, __pyx_L6_error)
-                __Pyx_GOTREF(__pyx_t_11);
-                __Pyx_DECREF(__pyx_t_14); __pyx_t_14 = 0;
-                __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-                __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-                __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-
-                /* "fuzzysearch/_generic_search.pyx":189
+                    __pyx_t_18 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_18)) __PYX_ERR(0, 387, __pyx_L14_error)
+                    __Pyx_GOTREF(__pyx_t_18);
+                    __pyx_t_17 = __Pyx_PyInt_FromSize_t(__pyx_v_index); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 387, __pyx_L14_error)
+                    __Pyx_GOTREF(__pyx_t_17);
+                    __pyx_t_16 = __Pyx_PyInt_From_unsigned_int((__pyx_v_cand.l_dist + __pyx_v_n_skipped)); if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 387, __pyx_L14_error)
+                    __Pyx_GOTREF(__pyx_t_16);
+                    __pyx_t_15 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_18, __pyx_t_17, __pyx_t_16); if (unlikely(!__pyx_t_15)) __PYX_ERR(0, 387, __pyx_L14_error)
+                    __Pyx_GOTREF(__pyx_t_15);
+                    __Pyx_DECREF(__pyx_t_18); __pyx_t_18 = 0;
+                    __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+                    __Pyx_DECREF(__pyx_t_16); __pyx_t_16 = 0;
+                    __Pyx_DECREF(__pyx_t_15); __pyx_t_15 = 0;
+
+                    /* "fuzzysearch/_generic_search.pyx":386
  *                             # if this is the last char of the sub-sequence, yield
  *                             # a match
  *                             if cand.subseq_index + n_skipped + 1 == subseq_len:             # <<<<<<<<<<<<<<
  *                                 add_match(cand.start, index, cand.l_dist + n_skipped)
  *                             # otherwise add a candidate skipping n_skipped
  */
-                goto __pyx_L29;
-              }
+                    goto __pyx_L42;
+                  }
 
-              /* "fuzzysearch/_generic_search.pyx":194
+                  /* "fuzzysearch/_generic_search.pyx":391
  *                             # subsequence chars
  *                             else:
- *                                 new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                                     cand.start, cand.subseq_index + 1 + n_skipped,
- *                                     cand.l_dist + n_skipped, cand.n_subs,
- */
-              /*else*/ {
-
-                /* "fuzzysearch/_generic_search.pyx":195
- *                             else:
- *                                 new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                                     cand.start, cand.subseq_index + 1 + n_skipped,             # <<<<<<<<<<<<<<
- *                                     cand.l_dist + n_skipped, cand.n_subs,
- *                                     cand.n_ins, cand.n_dels + n_skipped,
- */
-                __pyx_t_10.start = __pyx_v_cand.start;
-                __pyx_t_10.subseq_index = ((__pyx_v_cand.subseq_index + 1) + __pyx_v_n_skipped);
-
-                /* "fuzzysearch/_generic_search.pyx":196
- *                                 new_candidates[n_new_candidates] = GenericSearchCandidate(
- *                                     cand.start, cand.subseq_index + 1 + n_skipped,
- *                                     cand.l_dist + n_skipped, cand.n_subs,             # <<<<<<<<<<<<<<
- *                                     cand.n_ins, cand.n_dels + n_skipped,
- *                                 )
- */
-                __pyx_t_10.l_dist = (__pyx_v_cand.l_dist + __pyx_v_n_skipped);
-                __pyx_t_10.n_subs = __pyx_v_cand.n_subs;
-
-                /* "fuzzysearch/_generic_search.pyx":197
- *                                     cand.start, cand.subseq_index + 1 + n_skipped,
- *                                     cand.l_dist + n_skipped, cand.n_subs,
- *                                     cand.n_ins, cand.n_dels + n_skipped,             # <<<<<<<<<<<<<<
- *                                 )
- *                                 n_new_candidates += 1
- */
-                __pyx_t_10.n_ins = __pyx_v_cand.n_ins;
-                __pyx_t_10.n_dels = (__pyx_v_cand.n_dels + __pyx_v_n_skipped);
-
-                /* "fuzzysearch/_generic_search.pyx":194
+ *                                 _add_candidate(             # <<<<<<<<<<<<<<
+ *                                     GenericSearchCandidate(
+ *                                         cand.start, cand.subseq_index + 1 + n_skipped,
+ */
+                  /*else*/ {
+
+                    /* "fuzzysearch/_generic_search.pyx":393
+ *                                 _add_candidate(
+ *                                     GenericSearchCandidate(
+ *                                         cand.start, cand.subseq_index + 1 + n_skipped,             # <<<<<<<<<<<<<<
+ *                                         cand.l_dist + n_skipped, cand.n_subs,
+ *                                         cand.n_ins, cand.n_dels + n_skipped,
+ */
+                    __pyx_t_14.start = __pyx_v_cand.start;
+                    __pyx_t_14.subseq_index = ((__pyx_v_cand.subseq_index + 1) + __pyx_v_n_skipped);
+
+                    /* "fuzzysearch/_generic_search.pyx":394
+ *                                     GenericSearchCandidate(
+ *                                         cand.start, cand.subseq_index + 1 + n_skipped,
+ *                                         cand.l_dist + n_skipped, cand.n_subs,             # <<<<<<<<<<<<<<
+ *                                         cand.n_ins, cand.n_dels + n_skipped,
+ *                                     ),
+ */
+                    __pyx_t_14.l_dist = (__pyx_v_cand.l_dist + __pyx_v_n_skipped);
+                    __pyx_t_14.n_subs = __pyx_v_cand.n_subs;
+
+                    /* "fuzzysearch/_generic_search.pyx":395
+ *                                         cand.start, cand.subseq_index + 1 + n_skipped,
+ *                                         cand.l_dist + n_skipped, cand.n_subs,
+ *                                         cand.n_ins, cand.n_dels + n_skipped,             # <<<<<<<<<<<<<<
+ *                                     ),
+ *                                     new_candidates, &n_new_candidates,
+ */
+                    __pyx_t_14.n_ins = __pyx_v_cand.n_ins;
+                    __pyx_t_14.n_dels = (__pyx_v_cand.n_dels + __pyx_v_n_skipped);
+
+                    /* "fuzzysearch/_generic_search.pyx":391
  *                             # subsequence chars
  *                             else:
- *                                 new_candidates[n_new_candidates] = GenericSearchCandidate(             # <<<<<<<<<<<<<<
- *                                     cand.start, cand.subseq_index + 1 + n_skipped,
- *                                     cand.l_dist + n_skipped, cand.n_subs,
- */
-                (__pyx_v_new_candidates[__pyx_v_n_new_candidates]) = __pyx_t_10;
-
-                /* "fuzzysearch/_generic_search.pyx":199
- *                                     cand.n_ins, cand.n_dels + n_skipped,
- *                                 )
- *                                 n_new_candidates += 1             # <<<<<<<<<<<<<<
- *                             break
- *                     # note: if the above loop ends without a break, that means that
+ *                                 _add_candidate(             # <<<<<<<<<<<<<<
+ *                                     GenericSearchCandidate(
+ *                                         cand.start, cand.subseq_index + 1 + n_skipped,
  */
-                __pyx_v_n_new_candidates = (__pyx_v_n_new_candidates + 1);
-              }
-              __pyx_L29:;
+                    __pyx_f_11fuzzysearch_15_generic_search__add_candidate(__pyx_t_14, __pyx_v_new_candidates, (&__pyx_v_n_new_candidates), __pyx_v_next_in_group, __pyx_v_group_starts, __pyx_v_group_heads, __pyx_v_merge_starts);
+                  }
+                  __pyx_L42:;
 
-              /* "fuzzysearch/_generic_search.pyx":200
+                  /* "fuzzysearch/_generic_search.pyx":401
+ *                                     merge_starts,
  *                                 )
- *                                 n_new_candidates += 1
  *                             break             # <<<<<<<<<<<<<<
  *                     # note: if the above loop ends without a break, that means that
  *                     # no candidate could be added / yielded by skipping sub-sequence
  */
-              goto __pyx_L27_break;
+                  goto __pyx_L40_break;
 
-              /* "fuzzysearch/_generic_search.pyx":186
+                  /* "fuzzysearch/_generic_search.pyx":383
  *                         # reaches a sub-sequence char identical to this sequence
  *                         # char ...
- *                         elif seq_char == subsequence[cand.subseq_index + n_skipped]:             # <<<<<<<<<<<<<<
+ *                         elif items_match(table, seq_char, subsequence[cand.subseq_index + n_skipped]):             # <<<<<<<<<<<<<<
  *                             # if this is the last char of the sub-sequence, yield
  *                             # a match
  */
+                }
+              }
+              __pyx_L40_break:;
             }
+            __pyx_L27:;
+            __pyx_L22_continue:;
           }
-          __pyx_L27_break:;
-        }
-        __pyx_L14:;
-        __pyx_L10_continue:;
-      }
 
-      /* "fuzzysearch/_generic_search.pyx":206
+          /* "fuzzysearch/_generic_search.pyx":408
+ *             # drop the dominated candidates, and reset the groups for the
+ *             # next step
+ *             n_kept = 0             # <<<<<<<<<<<<<<
+ *             for n_cand in xrange(n_new_candidates):
+ *                 group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX
+ */
+          __pyx_v_n_kept = 0;
+
+          /* "fuzzysearch/_generic_search.pyx":409
+ *             # next step
+ *             n_kept = 0
+ *             for n_cand in xrange(n_new_candidates):             # <<<<<<<<<<<<<<
+ *                 group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX
+ *                 if new_candidates[n_cand].l_dist != DOMINATED:
+ */
+          __pyx_t_3 = __pyx_v_n_new_candidates;
+          __pyx_t_1 = __pyx_t_3;
+          for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_1; __pyx_t_2+=1) {
+            __pyx_v_n_cand = __pyx_t_2;
+
+            /* "fuzzysearch/_generic_search.pyx":410
+ *             n_kept = 0
+ *             for n_cand in xrange(n_new_candidates):
+ *                 group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX             # <<<<<<<<<<<<<<
+ *                 if new_candidates[n_cand].l_dist != DOMINATED:
+ *                     new_candidates[n_kept] = new_candidates[n_cand]
+ */
+            (__pyx_v_group_starts[(__pyx_v_new_candidates[__pyx_v_n_cand]).subseq_index]) = SIZE_MAX;
+
+            /* "fuzzysearch/_generic_search.pyx":411
+ *             for n_cand in xrange(n_new_candidates):
+ *                 group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX
+ *                 if new_candidates[n_cand].l_dist != DOMINATED:             # <<<<<<<<<<<<<<
+ *                     new_candidates[n_kept] = new_candidates[n_cand]
+ *                     n_kept += 1
+ */
+            __pyx_t_4 = (((__pyx_v_new_candidates[__pyx_v_n_cand]).l_dist != __pyx_v_11fuzzysearch_15_generic_search_DOMINATED) != 0);
+            if (__pyx_t_4) {
+
+              /* "fuzzysearch/_generic_search.pyx":412
+ *                 group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX
+ *                 if new_candidates[n_cand].l_dist != DOMINATED:
+ *                     new_candidates[n_kept] = new_candidates[n_cand]             # <<<<<<<<<<<<<<
+ *                     n_kept += 1
+ *             n_new_candidates = n_kept
+ */
+              (__pyx_v_new_candidates[__pyx_v_n_kept]) = (__pyx_v_new_candidates[__pyx_v_n_cand]);
+
+              /* "fuzzysearch/_generic_search.pyx":413
+ *                 if new_candidates[n_cand].l_dist != DOMINATED:
+ *                     new_candidates[n_kept] = new_candidates[n_cand]
+ *                     n_kept += 1             # <<<<<<<<<<<<<<
+ *             n_new_candidates = n_kept
+ * 
+ */
+              __pyx_v_n_kept = (__pyx_v_n_kept + 1);
+
+              /* "fuzzysearch/_generic_search.pyx":411
+ *             for n_cand in xrange(n_new_candidates):
+ *                 group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX
+ *                 if new_candidates[n_cand].l_dist != DOMINATED:             # <<<<<<<<<<<<<<
+ *                     new_candidates[n_kept] = new_candidates[n_cand]
+ *                     n_kept += 1
+ */
+            }
+          }
+
+          /* "fuzzysearch/_generic_search.pyx":414
+ *                     new_candidates[n_kept] = new_candidates[n_cand]
+ *                     n_kept += 1
+ *             n_new_candidates = n_kept             # <<<<<<<<<<<<<<
+ * 
+ *             if not merge_starts and n_new_candidates > max_candidates:
+ */
+          __pyx_v_n_new_candidates = __pyx_v_n_kept;
+
+          /* "fuzzysearch/_generic_search.pyx":416
+ *             n_new_candidates = n_kept
+ * 
+ *             if not merge_starts and n_new_candidates > max_candidates:             # <<<<<<<<<<<<<<
+ *                 report_event('lp_candidates_limit',
+ *                              search='c_generic_linear_programming',
+ */
+          __pyx_t_5 = ((!(__pyx_v_merge_starts != 0)) != 0);
+          if (__pyx_t_5) {
+          } else {
+            __pyx_t_4 = __pyx_t_5;
+            goto __pyx_L47_bool_binop_done;
+          }
+          __pyx_t_5 = ((__pyx_v_n_new_candidates > __pyx_v_max_candidates) != 0);
+          __pyx_t_4 = __pyx_t_5;
+          __pyx_L47_bool_binop_done:;
+          if (__pyx_t_4) {
+
+            /* "fuzzysearch/_generic_search.pyx":417
+ * 
+ *             if not merge_starts and n_new_candidates > max_candidates:
+ *                 report_event('lp_candidates_limit',             # <<<<<<<<<<<<<<
+ *                              search='c_generic_linear_programming',
+ *                              index=index + index_offset,
+ */
+            __Pyx_GetModuleGlobalName(__pyx_t_15, __pyx_n_s_report_event); if (unlikely(!__pyx_t_15)) __PYX_ERR(0, 417, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_15);
+
+            /* "fuzzysearch/_generic_search.pyx":418
+ *             if not merge_starts and n_new_candidates > max_candidates:
+ *                 report_event('lp_candidates_limit',
+ *                              search='c_generic_linear_programming',             # <<<<<<<<<<<<<<
+ *                              index=index + index_offset,
+ *                              n_candidates=n_new_candidates,
+ */
+            __pyx_t_16 = __Pyx_PyDict_NewPresized(4); if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 418, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_16);
+            if (PyDict_SetItem(__pyx_t_16, __pyx_n_s_search, __pyx_n_s_c_generic_linear_programming) < 0) __PYX_ERR(0, 418, __pyx_L14_error)
+
+            /* "fuzzysearch/_generic_search.pyx":419
+ *                 report_event('lp_candidates_limit',
+ *                              search='c_generic_linear_programming',
+ *                              index=index + index_offset,             # <<<<<<<<<<<<<<
+ *                              n_candidates=n_new_candidates,
+ *                              max_candidates=max_candidates)
+ */
+            __pyx_t_17 = __Pyx_PyInt_FromSize_t((__pyx_v_index + __pyx_cur_scope->__pyx_v_index_offset)); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 419, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_17);
+            if (PyDict_SetItem(__pyx_t_16, __pyx_n_s_index, __pyx_t_17) < 0) __PYX_ERR(0, 418, __pyx_L14_error)
+            __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+
+            /* "fuzzysearch/_generic_search.pyx":420
+ *                              search='c_generic_linear_programming',
+ *                              index=index + index_offset,
+ *                              n_candidates=n_new_candidates,             # <<<<<<<<<<<<<<
+ *                              max_candidates=max_candidates)
+ *                 return None
+ */
+            __pyx_t_17 = __Pyx_PyInt_FromSize_t(__pyx_v_n_new_candidates); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 420, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_17);
+            if (PyDict_SetItem(__pyx_t_16, __pyx_n_s_n_candidates, __pyx_t_17) < 0) __PYX_ERR(0, 418, __pyx_L14_error)
+            __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+
+            /* "fuzzysearch/_generic_search.pyx":421
+ *                              index=index + index_offset,
+ *                              n_candidates=n_new_candidates,
+ *                              max_candidates=max_candidates)             # <<<<<<<<<<<<<<
+ *                 return None
+ * 
+ */
+            __pyx_t_17 = __Pyx_PyInt_FromSize_t(__pyx_v_max_candidates); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 421, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_17);
+            if (PyDict_SetItem(__pyx_t_16, __pyx_n_s_max_candidates, __pyx_t_17) < 0) __PYX_ERR(0, 418, __pyx_L14_error)
+            __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+
+            /* "fuzzysearch/_generic_search.pyx":417
+ * 
+ *             if not merge_starts and n_new_candidates > max_candidates:
+ *                 report_event('lp_candidates_limit',             # <<<<<<<<<<<<<<
+ *                              search='c_generic_linear_programming',
+ *                              index=index + index_offset,
+ */
+            __pyx_t_17 = __Pyx_PyObject_Call(__pyx_t_15, __pyx_tuple__5, __pyx_t_16); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 417, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_17);
+            __Pyx_DECREF(__pyx_t_15); __pyx_t_15 = 0;
+            __Pyx_DECREF(__pyx_t_16); __pyx_t_16 = 0;
+            __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+
+            /* "fuzzysearch/_generic_search.pyx":422
+ *                              n_candidates=n_new_candidates,
+ *                              max_candidates=max_candidates)
+ *                 return None             # <<<<<<<<<<<<<<
+ * 
+ *             # new_candidates = candidates; candidates = []
+ */
+            __Pyx_XDECREF(__pyx_r);
+            __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+            __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+            goto __pyx_L18_try_return;
+
+            /* "fuzzysearch/_generic_search.pyx":416
+ *             n_new_candidates = n_kept
+ * 
+ *             if not merge_starts and n_new_candidates > max_candidates:             # <<<<<<<<<<<<<<
+ *                 report_event('lp_candidates_limit',
+ *                              search='c_generic_linear_programming',
+ */
+          }
+
+          /* "fuzzysearch/_generic_search.pyx":425
  * 
  *             # new_candidates = candidates; candidates = []
  *             _tmp = candidates             # <<<<<<<<<<<<<<
  *             candidates = new_candidates
  *             new_candidates = _tmp
  */
-      __pyx_v__tmp = __pyx_v_candidates;
+          __pyx_v__tmp = __pyx_v_candidates;
 
-      /* "fuzzysearch/_generic_search.pyx":207
+          /* "fuzzysearch/_generic_search.pyx":426
  *             # new_candidates = candidates; candidates = []
  *             _tmp = candidates
  *             candidates = new_candidates             # <<<<<<<<<<<<<<
  *             new_candidates = _tmp
  *             n_candidates = n_new_candidates
  */
-      __pyx_v_candidates = __pyx_v_new_candidates;
+          __pyx_v_candidates = __pyx_v_new_candidates;
 
-      /* "fuzzysearch/_generic_search.pyx":208
+          /* "fuzzysearch/_generic_search.pyx":427
  *             _tmp = candidates
  *             candidates = new_candidates
  *             new_candidates = _tmp             # <<<<<<<<<<<<<<
  *             n_candidates = n_new_candidates
  *             n_new_candidates = 0
  */
-      __pyx_v_new_candidates = __pyx_v__tmp;
+          __pyx_v_new_candidates = __pyx_v__tmp;
 
-      /* "fuzzysearch/_generic_search.pyx":209
+          /* "fuzzysearch/_generic_search.pyx":428
  *             candidates = new_candidates
  *             new_candidates = _tmp
  *             n_candidates = n_new_candidates             # <<<<<<<<<<<<<<
  *             n_new_candidates = 0
  * 
  */
-      __pyx_v_n_candidates = __pyx_v_n_new_candidates;
+          __pyx_v_n_candidates = __pyx_v_n_new_candidates;
 
-      /* "fuzzysearch/_generic_search.pyx":210
+          /* "fuzzysearch/_generic_search.pyx":429
  *             new_candidates = _tmp
  *             n_candidates = n_new_candidates
  *             n_new_candidates = 0             # <<<<<<<<<<<<<<
  * 
  *             if have_realloced:
  */
-      __pyx_v_n_new_candidates = 0;
+          __pyx_v_n_new_candidates = 0;
 
-      /* "fuzzysearch/_generic_search.pyx":212
+          /* "fuzzysearch/_generic_search.pyx":431
  *             n_new_candidates = 0
  * 
  *             if have_realloced:             # <<<<<<<<<<<<<<
  *                 have_realloced = False
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  */
-      __pyx_t_4 = (__pyx_v_have_realloced != 0);
-      if (__pyx_t_4) {
+          __pyx_t_4 = (__pyx_v_have_realloced != 0);
+          if (__pyx_t_4) {
 
-        /* "fuzzysearch/_generic_search.pyx":213
+            /* "fuzzysearch/_generic_search.pyx":432
  * 
  *             if have_realloced:
  *                 have_realloced = False             # <<<<<<<<<<<<<<
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                 if _tmp is NULL:
  */
-        __pyx_v_have_realloced = 0;
+            __pyx_v_have_realloced = 0;
 
-        /* "fuzzysearch/_generic_search.pyx":214
+            /* "fuzzysearch/_generic_search.pyx":433
  *             if have_realloced:
  *                 have_realloced = False
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))             # <<<<<<<<<<<<<<
  *                 if _tmp is NULL:
  *                     raise MemoryError()
  */
-        __pyx_v__tmp = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)realloc(__pyx_v_new_candidates, (__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
+            __pyx_v__tmp = ((struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate *)realloc(__pyx_v_new_candidates, (__pyx_v_alloc_size * (sizeof(struct __pyx_t_11fuzzysearch_15_generic_search_GenericSearchCandidate)))));
 
-        /* "fuzzysearch/_generic_search.pyx":215
+            /* "fuzzysearch/_generic_search.pyx":434
  *                 have_realloced = False
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                 if _tmp is NULL:             # <<<<<<<<<<<<<<
  *                     raise MemoryError()
  *                 new_candidates = _tmp
  */
-        __pyx_t_4 = ((__pyx_v__tmp == NULL) != 0);
-        if (unlikely(__pyx_t_4)) {
+            __pyx_t_4 = ((__pyx_v__tmp == NULL) != 0);
+            if (unlikely(__pyx_t_4)) {
 
-          /* "fuzzysearch/_generic_search.pyx":216
+              /* "fuzzysearch/_generic_search.pyx":435
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                 if _tmp is NULL:
  *                     raise MemoryError()             # <<<<<<<<<<<<<<
  *                 new_candidates = _tmp
  * 
  */
-          PyErr_NoMemory(); __PYX_ERR(0, 216, __pyx_L6_error)
+              PyErr_NoMemory(); __PYX_ERR(0, 435, __pyx_L14_error)
 
-          /* "fuzzysearch/_generic_search.pyx":215
+              /* "fuzzysearch/_generic_search.pyx":434
  *                 have_realloced = False
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  *                 if _tmp is NULL:             # <<<<<<<<<<<<<<
  *                     raise MemoryError()
  *                 new_candidates = _tmp
  */
-        }
+            }
 
-        /* "fuzzysearch/_generic_search.pyx":217
+            /* "fuzzysearch/_generic_search.pyx":436
  *                 if _tmp is NULL:
  *                     raise MemoryError()
  *                 new_candidates = _tmp             # <<<<<<<<<<<<<<
  * 
  *             index += 1
  */
-        __pyx_v_new_candidates = __pyx_v__tmp;
+            __pyx_v_new_candidates = __pyx_v__tmp;
 
-        /* "fuzzysearch/_generic_search.pyx":212
+            /* "fuzzysearch/_generic_search.pyx":431
  *             n_new_candidates = 0
  * 
  *             if have_realloced:             # <<<<<<<<<<<<<<
  *                 have_realloced = False
  *                 _tmp = <GenericSearchCandidate *>realloc(new_candidates, alloc_size * sizeof(GenericSearchCandidate))
  */
-      }
+          }
 
-      /* "fuzzysearch/_generic_search.pyx":219
+          /* "fuzzysearch/_generic_search.pyx":438
  *                 new_candidates = _tmp
  * 
  *             index += 1             # <<<<<<<<<<<<<<
  * 
  *         for n_cand in xrange(n_candidates):
  */
-      __pyx_v_index = (__pyx_v_index + 1);
-    }
-    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+          __pyx_v_index = (__pyx_v_index + 1);
+        }
+        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
 
-    /* "fuzzysearch/_generic_search.pyx":221
+        /* "fuzzysearch/_generic_search.pyx":440
  *             index += 1
  * 
  *         for n_cand in xrange(n_candidates):             # <<<<<<<<<<<<<<
  *             cand = candidates[n_cand]
  *             # note: index == length(sequence)
  */
-    __pyx_t_3 = __pyx_v_n_candidates;
-    __pyx_t_1 = __pyx_t_3;
-    for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_1; __pyx_t_2+=1) {
-      __pyx_v_n_cand = __pyx_t_2;
+        __pyx_t_3 = __pyx_v_n_candidates;
+        __pyx_t_1 = __pyx_t_3;
+        for (__pyx_t_2 = 0; __pyx_t_2 < __pyx_t_1; __pyx_t_2+=1) {
+          __pyx_v_n_cand = __pyx_t_2;
 
-      /* "fuzzysearch/_generic_search.pyx":222
+          /* "fuzzysearch/_generic_search.pyx":441
  * 
  *         for n_cand in xrange(n_candidates):
  *             cand = candidates[n_cand]             # <<<<<<<<<<<<<<
  *             # note: index == length(sequence)
  *             n_skipped = subseq_len - cand.subseq_index
  */
-      __pyx_v_cand = (__pyx_v_candidates[__pyx_v_n_cand]);
+          __pyx_v_cand = (__pyx_v_candidates[__pyx_v_n_cand]);
 
-      /* "fuzzysearch/_generic_search.pyx":224
+          /* "fuzzysearch/_generic_search.pyx":443
  *             cand = candidates[n_cand]
  *             # note: index == length(sequence)
  *             n_skipped = subseq_len - cand.subseq_index             # <<<<<<<<<<<<<<
  *             if cand.n_dels + n_skipped <= max_deletions and \
  *                cand.l_dist + n_skipped <= max_l_dist:
  */
-      __pyx_v_n_skipped = (__pyx_v_subseq_len - __pyx_v_cand.subseq_index);
+          __pyx_v_n_skipped = (__pyx_v_subseq_len - __pyx_v_cand.subseq_index);
 
-      /* "fuzzysearch/_generic_search.pyx":225
+          /* "fuzzysearch/_generic_search.pyx":444
  *             # note: index == length(sequence)
  *             n_skipped = subseq_len - cand.subseq_index
  *             if cand.n_dels + n_skipped <= max_deletions and \             # <<<<<<<<<<<<<<
  *                cand.l_dist + n_skipped <= max_l_dist:
  *                 add_match(cand.start, index, cand.l_dist + n_skipped)
  */
-      __pyx_t_15 = (((__pyx_v_cand.n_dels + __pyx_v_n_skipped) <= __pyx_v_max_deletions) != 0);
-      if (__pyx_t_15) {
-      } else {
-        __pyx_t_4 = __pyx_t_15;
-        goto __pyx_L35_bool_binop_done;
-      }
+          __pyx_t_5 = (((__pyx_v_cand.n_dels + __pyx_v_n_skipped) <= __pyx_v_max_deletions) != 0);
+          if (__pyx_t_5) {
+          } else {
+            __pyx_t_4 = __pyx_t_5;
+            goto __pyx_L54_bool_binop_done;
+          }
 
-      /* "fuzzysearch/_generic_search.pyx":226
+          /* "fuzzysearch/_generic_search.pyx":445
  *             n_skipped = subseq_len - cand.subseq_index
  *             if cand.n_dels + n_skipped <= max_deletions and \
  *                cand.l_dist + n_skipped <= max_l_dist:             # <<<<<<<<<<<<<<
  *                 add_match(cand.start, index, cand.l_dist + n_skipped)
  * 
  */
-      __pyx_t_15 = (((__pyx_v_cand.l_dist + __pyx_v_n_skipped) <= __pyx_v_max_l_dist) != 0);
-      __pyx_t_4 = __pyx_t_15;
-      __pyx_L35_bool_binop_done:;
+          __pyx_t_5 = (((__pyx_v_cand.l_dist + __pyx_v_n_skipped) <= __pyx_v_max_l_dist) != 0);
+          __pyx_t_4 = __pyx_t_5;
+          __pyx_L54_bool_binop_done:;
 
-      /* "fuzzysearch/_generic_search.pyx":225
+          /* "fuzzysearch/_generic_search.pyx":444
  *             # note: index == length(sequence)
  *             n_skipped = subseq_len - cand.subseq_index
  *             if cand.n_dels + n_skipped <= max_deletions and \             # <<<<<<<<<<<<<<
  *                cand.l_dist + n_skipped <= max_l_dist:
  *                 add_match(cand.start, index, cand.l_dist + n_skipped)
  */
-      if (__pyx_t_4) {
+          if (__pyx_t_4) {
 
-        /* "fuzzysearch/_generic_search.pyx":227
+            /* "fuzzysearch/_generic_search.pyx":446
  *             if cand.n_dels + n_skipped <= max_deletions and \
  *                cand.l_dist + n_skipped <= max_l_dist:
  *                 add_match(cand.start, index, cand.l_dist + n_skipped)             # <<<<<<<<<<<<<<
  * 
- *     finally:
+ *     except _EnoughMatches:
  */
-        __pyx_t_5 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 227, __pyx_L6_error)
-        __Pyx_GOTREF(__pyx_t_5);
-        __pyx_t_11 = __Pyx_PyInt_FromSize_t(__pyx_v_index); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 227, __pyx_L6_error)
-        __Pyx_GOTREF(__pyx_t_11);
-        __pyx_t_12 = __Pyx_PyInt_From_unsigned_int((__pyx_v_cand.l_dist + __pyx_v_n_skipped)); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 227, __pyx_L6_error)
-        __Pyx_GOTREF(__pyx_t_12);
-        __pyx_t_13 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_5, __pyx_t_11, __pyx_t_12); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 227, __pyx_L6_error)
-        __Pyx_GOTREF(__pyx_t_13);
-        __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-        __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-        __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-        __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-
-        /* "fuzzysearch/_generic_search.pyx":225
+            __pyx_t_6 = __Pyx_PyInt_FromSize_t(__pyx_v_cand.start); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 446, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_6);
+            __pyx_t_17 = __Pyx_PyInt_FromSize_t(__pyx_v_index); if (unlikely(!__pyx_t_17)) __PYX_ERR(0, 446, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_17);
+            __pyx_t_16 = __Pyx_PyInt_From_unsigned_int((__pyx_v_cand.l_dist + __pyx_v_n_skipped)); if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 446, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_16);
+            __pyx_t_15 = __pyx_pf_11fuzzysearch_15_generic_search_47_c_find_near_matches_generic_linear_programming_add_match(__pyx_v_add_match, __pyx_t_6, __pyx_t_17, __pyx_t_16); if (unlikely(!__pyx_t_15)) __PYX_ERR(0, 446, __pyx_L14_error)
+            __Pyx_GOTREF(__pyx_t_15);
+            __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+            __Pyx_DECREF(__pyx_t_17); __pyx_t_17 = 0;
+            __Pyx_DECREF(__pyx_t_16); __pyx_t_16 = 0;
+            __Pyx_DECREF(__pyx_t_15); __pyx_t_15 = 0;
+
+            /* "fuzzysearch/_generic_search.pyx":444
  *             # note: index == length(sequence)
  *             n_skipped = subseq_len - cand.subseq_index
  *             if cand.n_dels + n_skipped <= max_deletions and \             # <<<<<<<<<<<<<<
  *                cand.l_dist + n_skipped <= max_l_dist:
  *                 add_match(cand.start, index, cand.l_dist + n_skipped)
  */
+          }
+        }
+
+        /* "fuzzysearch/_generic_search.pyx":274
+ *     cdef unsigned int n_skipped
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         index = 0
+ *         have_realloced = False
+ */
+      }
+      __Pyx_XDECREF(__pyx_t_7); __pyx_t_7 = 0;
+      __Pyx_XDECREF(__pyx_t_8); __pyx_t_8 = 0;
+      __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
+      goto __pyx_L19_try_end;
+      __pyx_L14_error:;
+      __Pyx_XDECREF(__pyx_t_15); __pyx_t_15 = 0;
+      __Pyx_XDECREF(__pyx_t_16); __pyx_t_16 = 0;
+      __Pyx_XDECREF(__pyx_t_17); __pyx_t_17 = 0;
+      __Pyx_XDECREF(__pyx_t_18); __pyx_t_18 = 0;
+      __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+
+      /* "fuzzysearch/_generic_search.pyx":448
+ *                 add_match(cand.start, index, cand.l_dist + n_skipped)
+ * 
+ *     except _EnoughMatches:             # <<<<<<<<<<<<<<
+ *         pass
+ * 
+ */
+      __Pyx_ErrFetch(&__pyx_t_15, &__pyx_t_16, &__pyx_t_17);
+      __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_EnoughMatches); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 448, __pyx_L16_except_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      __pyx_t_22 = __Pyx_PyErr_GivenExceptionMatches(__pyx_t_15, __pyx_t_6);
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+      __Pyx_ErrRestore(__pyx_t_15, __pyx_t_16, __pyx_t_17);
+      __pyx_t_15 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0;
+      if (__pyx_t_22) {
+        __Pyx_ErrRestore(0,0,0);
+        goto __pyx_L15_exception_handled;
       }
+      goto __pyx_L16_except_error;
+      __pyx_L16_except_error:;
+
+      /* "fuzzysearch/_generic_search.pyx":274
+ *     cdef unsigned int n_skipped
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         index = 0
+ *         have_realloced = False
+ */
+      __Pyx_XGIVEREF(__pyx_t_7);
+      __Pyx_XGIVEREF(__pyx_t_8);
+      __Pyx_XGIVEREF(__pyx_t_9);
+      __Pyx_ExceptionReset(__pyx_t_7, __pyx_t_8, __pyx_t_9);
+      goto __pyx_L12_error;
+      __pyx_L18_try_return:;
+      __Pyx_XGIVEREF(__pyx_t_7);
+      __Pyx_XGIVEREF(__pyx_t_8);
+      __Pyx_XGIVEREF(__pyx_t_9);
+      __Pyx_ExceptionReset(__pyx_t_7, __pyx_t_8, __pyx_t_9);
+      goto __pyx_L11_return;
+      __pyx_L15_exception_handled:;
+      __Pyx_XGIVEREF(__pyx_t_7);
+      __Pyx_XGIVEREF(__pyx_t_8);
+      __Pyx_XGIVEREF(__pyx_t_9);
+      __Pyx_ExceptionReset(__pyx_t_7, __pyx_t_8, __pyx_t_9);
+      __pyx_L19_try_end:;
     }
   }
 
-  /* "fuzzysearch/_generic_search.pyx":230
+  /* "fuzzysearch/_generic_search.pyx":452
  * 
  *     finally:
  *         free(candidates)             # <<<<<<<<<<<<<<
  *         free(new_candidates)
- * 
+ *         free(next_in_group)
  */
   /*finally:*/ {
     /*normal exit:*/{
       free(__pyx_v_candidates);
 
-      /* "fuzzysearch/_generic_search.pyx":231
+      /* "fuzzysearch/_generic_search.pyx":453
  *     finally:
  *         free(candidates)
  *         free(new_candidates)             # <<<<<<<<<<<<<<
+ *         free(next_in_group)
+ *         free(group_starts)
+ */
+      free(__pyx_v_new_candidates);
+
+      /* "fuzzysearch/_generic_search.pyx":454
+ *         free(candidates)
+ *         free(new_candidates)
+ *         free(next_in_group)             # <<<<<<<<<<<<<<
+ *         free(group_starts)
+ *         free(group_heads)
+ */
+      free(__pyx_v_next_in_group);
+
+      /* "fuzzysearch/_generic_search.pyx":455
+ *         free(new_candidates)
+ *         free(next_in_group)
+ *         free(group_starts)             # <<<<<<<<<<<<<<
+ *         free(group_heads)
+ * 
+ */
+      free(__pyx_v_group_starts);
+
+      /* "fuzzysearch/_generic_search.pyx":456
+ *         free(next_in_group)
+ *         free(group_starts)
+ *         free(group_heads)             # <<<<<<<<<<<<<<
  * 
  *     return matches
  */
-      free(__pyx_v_new_candidates);
-      goto __pyx_L7;
+      free(__pyx_v_group_heads);
+      goto __pyx_L13;
     }
-    __pyx_L6_error:;
+    __pyx_L12_error:;
     /*exception exit:*/{
       __Pyx_PyThreadState_declare
       __Pyx_PyThreadState_assign
-      __pyx_t_22 = 0; __pyx_t_23 = 0; __pyx_t_24 = 0; __pyx_t_25 = 0; __pyx_t_26 = 0; __pyx_t_27 = 0;
-      __Pyx_XDECREF(__pyx_t_11); __pyx_t_11 = 0;
-      __Pyx_XDECREF(__pyx_t_12); __pyx_t_12 = 0;
-      __Pyx_XDECREF(__pyx_t_13); __pyx_t_13 = 0;
-      __Pyx_XDECREF(__pyx_t_14); __pyx_t_14 = 0;
-      __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
+      __pyx_t_9 = 0; __pyx_t_8 = 0; __pyx_t_7 = 0; __pyx_t_25 = 0; __pyx_t_26 = 0; __pyx_t_27 = 0;
+      __Pyx_XDECREF(__pyx_t_15); __pyx_t_15 = 0;
+      __Pyx_XDECREF(__pyx_t_16); __pyx_t_16 = 0;
+      __Pyx_XDECREF(__pyx_t_17); __pyx_t_17 = 0;
+      __Pyx_XDECREF(__pyx_t_18); __pyx_t_18 = 0;
+      __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
       if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_25, &__pyx_t_26, &__pyx_t_27);
-      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_22, &__pyx_t_23, &__pyx_t_24) < 0)) __Pyx_ErrFetch(&__pyx_t_22, &__pyx_t_23, &__pyx_t_24);
-      __Pyx_XGOTREF(__pyx_t_22);
-      __Pyx_XGOTREF(__pyx_t_23);
-      __Pyx_XGOTREF(__pyx_t_24);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_9, &__pyx_t_8, &__pyx_t_7) < 0)) __Pyx_ErrFetch(&__pyx_t_9, &__pyx_t_8, &__pyx_t_7);
+      __Pyx_XGOTREF(__pyx_t_9);
+      __Pyx_XGOTREF(__pyx_t_8);
+      __Pyx_XGOTREF(__pyx_t_7);
       __Pyx_XGOTREF(__pyx_t_25);
       __Pyx_XGOTREF(__pyx_t_26);
       __Pyx_XGOTREF(__pyx_t_27);
-      __pyx_t_19 = __pyx_lineno; __pyx_t_20 = __pyx_clineno; __pyx_t_21 = __pyx_filename;
+      __pyx_t_22 = __pyx_lineno; __pyx_t_23 = __pyx_clineno; __pyx_t_24 = __pyx_filename;
       {
 
-        /* "fuzzysearch/_generic_search.pyx":230
+        /* "fuzzysearch/_generic_search.pyx":452
  * 
  *     finally:
  *         free(candidates)             # <<<<<<<<<<<<<<
  *         free(new_candidates)
- * 
+ *         free(next_in_group)
  */
         free(__pyx_v_candidates);
 
-        /* "fuzzysearch/_generic_search.pyx":231
- *     finally:
- *         free(candidates)
- *         free(new_candidates)             # <<<<<<<<<<<<<<
+        /* "fuzzysearch/_generic_search.pyx":453
+ *     finally:
+ *         free(candidates)
+ *         free(new_candidates)             # <<<<<<<<<<<<<<
+ *         free(next_in_group)
+ *         free(group_starts)
+ */
+        free(__pyx_v_new_candidates);
+
+        /* "fuzzysearch/_generic_search.pyx":454
+ *         free(candidates)
+ *         free(new_candidates)
+ *         free(next_in_group)             # <<<<<<<<<<<<<<
+ *         free(group_starts)
+ *         free(group_heads)
+ */
+        free(__pyx_v_next_in_group);
+
+        /* "fuzzysearch/_generic_search.pyx":455
+ *         free(new_candidates)
+ *         free(next_in_group)
+ *         free(group_starts)             # <<<<<<<<<<<<<<
+ *         free(group_heads)
+ * 
+ */
+        free(__pyx_v_group_starts);
+
+        /* "fuzzysearch/_generic_search.pyx":456
+ *         free(next_in_group)
+ *         free(group_starts)
+ *         free(group_heads)             # <<<<<<<<<<<<<<
+ * 
+ *     return matches
+ */
+        free(__pyx_v_group_heads);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_25);
+        __Pyx_XGIVEREF(__pyx_t_26);
+        __Pyx_XGIVEREF(__pyx_t_27);
+        __Pyx_ExceptionReset(__pyx_t_25, __pyx_t_26, __pyx_t_27);
+      }
+      __Pyx_XGIVEREF(__pyx_t_9);
+      __Pyx_XGIVEREF(__pyx_t_8);
+      __Pyx_XGIVEREF(__pyx_t_7);
+      __Pyx_ErrRestore(__pyx_t_9, __pyx_t_8, __pyx_t_7);
+      __pyx_t_9 = 0; __pyx_t_8 = 0; __pyx_t_7 = 0; __pyx_t_25 = 0; __pyx_t_26 = 0; __pyx_t_27 = 0;
+      __pyx_lineno = __pyx_t_22; __pyx_clineno = __pyx_t_23; __pyx_filename = __pyx_t_24;
+      goto __pyx_L1_error;
+    }
+    __pyx_L11_return: {
+      __pyx_t_27 = __pyx_r;
+      __pyx_r = 0;
+
+      /* "fuzzysearch/_generic_search.pyx":452
+ * 
+ *     finally:
+ *         free(candidates)             # <<<<<<<<<<<<<<
+ *         free(new_candidates)
+ *         free(next_in_group)
+ */
+      free(__pyx_v_candidates);
+
+      /* "fuzzysearch/_generic_search.pyx":453
+ *     finally:
+ *         free(candidates)
+ *         free(new_candidates)             # <<<<<<<<<<<<<<
+ *         free(next_in_group)
+ *         free(group_starts)
+ */
+      free(__pyx_v_new_candidates);
+
+      /* "fuzzysearch/_generic_search.pyx":454
+ *         free(candidates)
+ *         free(new_candidates)
+ *         free(next_in_group)             # <<<<<<<<<<<<<<
+ *         free(group_starts)
+ *         free(group_heads)
+ */
+      free(__pyx_v_next_in_group);
+
+      /* "fuzzysearch/_generic_search.pyx":455
+ *         free(new_candidates)
+ *         free(next_in_group)
+ *         free(group_starts)             # <<<<<<<<<<<<<<
+ *         free(group_heads)
+ * 
+ */
+      free(__pyx_v_group_starts);
+
+      /* "fuzzysearch/_generic_search.pyx":456
+ *         free(next_in_group)
+ *         free(group_starts)
+ *         free(group_heads)             # <<<<<<<<<<<<<<
  * 
  *     return matches
  */
-        free(__pyx_v_new_candidates);
-      }
-      if (PY_MAJOR_VERSION >= 3) {
-        __Pyx_XGIVEREF(__pyx_t_25);
-        __Pyx_XGIVEREF(__pyx_t_26);
-        __Pyx_XGIVEREF(__pyx_t_27);
-        __Pyx_ExceptionReset(__pyx_t_25, __pyx_t_26, __pyx_t_27);
-      }
-      __Pyx_XGIVEREF(__pyx_t_22);
-      __Pyx_XGIVEREF(__pyx_t_23);
-      __Pyx_XGIVEREF(__pyx_t_24);
-      __Pyx_ErrRestore(__pyx_t_22, __pyx_t_23, __pyx_t_24);
-      __pyx_t_22 = 0; __pyx_t_23 = 0; __pyx_t_24 = 0; __pyx_t_25 = 0; __pyx_t_26 = 0; __pyx_t_27 = 0;
-      __pyx_lineno = __pyx_t_19; __pyx_clineno = __pyx_t_20; __pyx_filename = __pyx_t_21;
-      goto __pyx_L1_error;
+      free(__pyx_v_group_heads);
+      __pyx_r = __pyx_t_27;
+      __pyx_t_27 = 0;
+      goto __pyx_L0;
     }
-    __pyx_L7:;
+    __pyx_L13:;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":233
- *         free(new_candidates)
+  /* "fuzzysearch/_generic_search.pyx":458
+ *         free(group_heads)
  * 
  *     return matches             # <<<<<<<<<<<<<<
  * 
@@ -3549,7 +5749,7 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
   __pyx_r = __pyx_cur_scope->__pyx_v_matches;
   goto __pyx_L0;
 
-  /* "fuzzysearch/_generic_search.pyx":61
+  /* "fuzzysearch/_generic_search.pyx":209
  * # subsequence strings, which means if they contain null bytes the data after
  * # the first null byte will not be copied.
  * cdef _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
@@ -3559,11 +5759,11 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
 
   /* function exit code */
   __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_5);
-  __Pyx_XDECREF(__pyx_t_11);
-  __Pyx_XDECREF(__pyx_t_12);
-  __Pyx_XDECREF(__pyx_t_13);
-  __Pyx_XDECREF(__pyx_t_14);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_15);
+  __Pyx_XDECREF(__pyx_t_16);
+  __Pyx_XDECREF(__pyx_t_17);
+  __Pyx_XDECREF(__pyx_t_18);
   __Pyx_AddTraceback("fuzzysearch._generic_search._c_find_near_matches_generic_linear_programming", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __pyx_r = 0;
   __pyx_L0:;
@@ -3574,22 +5774,23 @@ static PyObject *__pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_ge
   return __pyx_r;
 }
 
-/* "fuzzysearch/_generic_search.pyx":237
+/* "fuzzysearch/_generic_search.pyx":462
  * 
  * 
- * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
+ * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                        max_candidates=None):
  *     """search for near-matches of subsequence in sequence
- * 
  */
 
 /* Python wrapper */
-static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_3c_find_near_matches_generic_ngrams(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static char __pyx_doc_11fuzzysearch_15_generic_search_2c_find_near_matches_generic_ngrams[] = "search for near-matches of subsequence in sequence\n\n    This searches for near-matches, where the nearly-matching parts of the\n    sequence must meet the following limitations (relative to the subsequence):\n\n    * the maximum allowed number of character substitutions\n    * the maximum allowed number of new characters inserted\n    * and the maximum allowed number of character deletions\n    * the total number of substitutions, insertions and deletions\n    ";
-static PyMethodDef __pyx_mdef_11fuzzysearch_15_generic_search_3c_find_near_matches_generic_ngrams = {"c_find_near_matches_generic_ngrams", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_15_generic_search_3c_find_near_matches_generic_ngrams, METH_VARARGS|METH_KEYWORDS, __pyx_doc_11fuzzysearch_15_generic_search_2c_find_near_matches_generic_ngrams};
-static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_3c_find_near_matches_generic_ngrams(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_5c_find_near_matches_generic_ngrams(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_11fuzzysearch_15_generic_search_4c_find_near_matches_generic_ngrams[] = "search for near-matches of subsequence in sequence\n\n    This searches for near-matches, where the nearly-matching parts of the\n    sequence must meet the following limitations (relative to the subsequence):\n\n    * the maximum allowed number of character substitutions\n    * the maximum allowed number of new characters inserted\n    * and the maximum allowed number of character deletions\n    * the total number of substitutions, insertions and deletions\n\n    See c_find_near_matches_generic_linear_programming() regarding\n    max_candidates.  Windows of the sequence in which it is exceeded are\n    searched again with merge_starts=True.\n    ";
+static PyMethodDef __pyx_mdef_11fuzzysearch_15_generic_search_5c_find_near_matches_generic_ngrams = {"c_find_near_matches_generic_ngrams", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_15_generic_search_5c_find_near_matches_generic_ngrams, METH_VARARGS|METH_KEYWORDS, __pyx_doc_11fuzzysearch_15_generic_search_4c_find_near_matches_generic_ngrams};
+static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_5c_find_near_matches_generic_ngrams(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
   PyObject *__pyx_v_subsequence = 0;
   PyObject *__pyx_v_sequence = 0;
   PyObject *__pyx_v_search_params = 0;
+  PyObject *__pyx_v_max_candidates = 0;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -3597,12 +5798,23 @@ static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_3c_find_near_matches_g
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("c_find_near_matches_generic_ngrams (wrapper)", 0);
   {
-    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_subsequence,&__pyx_n_s_sequence,&__pyx_n_s_search_params,0};
-    PyObject* values[3] = {0,0,0};
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_subsequence,&__pyx_n_s_sequence,&__pyx_n_s_search_params,&__pyx_n_s_max_candidates,0};
+    PyObject* values[4] = {0,0,0,0};
+
+    /* "fuzzysearch/_generic_search.pyx":463
+ * 
+ * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,
+ *                                        max_candidates=None):             # <<<<<<<<<<<<<<
+ *     """search for near-matches of subsequence in sequence
+ * 
+ */
+    values[3] = ((PyObject *)Py_None);
     if (unlikely(__pyx_kwds)) {
       Py_ssize_t kw_args;
       const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
       switch (pos_args) {
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
         case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
         CYTHON_FALLTHROUGH;
         case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
@@ -3621,45 +5833,64 @@ static PyObject *__pyx_pw_11fuzzysearch_15_generic_search_3c_find_near_matches_g
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_sequence)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_ngrams", 1, 3, 3, 1); __PYX_ERR(0, 237, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_ngrams", 0, 3, 4, 1); __PYX_ERR(0, 462, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  2:
         if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_search_params)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_ngrams", 1, 3, 3, 2); __PYX_ERR(0, 237, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_ngrams", 0, 3, 4, 2); __PYX_ERR(0, 462, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_max_candidates);
+          if (value) { values[3] = value; kw_args--; }
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_find_near_matches_generic_ngrams") < 0)) __PYX_ERR(0, 237, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_find_near_matches_generic_ngrams") < 0)) __PYX_ERR(0, 462, __pyx_L3_error)
       }
-    } else if (PyTuple_GET_SIZE(__pyx_args) != 3) {
-      goto __pyx_L5_argtuple_error;
     } else {
-      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
-      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
-      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
     }
     __pyx_v_subsequence = values[0];
     __pyx_v_sequence = values[1];
     __pyx_v_search_params = values[2];
+    __pyx_v_max_candidates = values[3];
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_ngrams", 1, 3, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 237, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("c_find_near_matches_generic_ngrams", 0, 3, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 462, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("fuzzysearch._generic_search.c_find_near_matches_generic_ngrams", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
-  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_generic_ngrams(__pyx_self, __pyx_v_subsequence, __pyx_v_sequence, __pyx_v_search_params);
+  __pyx_r = __pyx_pf_11fuzzysearch_15_generic_search_4c_find_near_matches_generic_ngrams(__pyx_self, __pyx_v_subsequence, __pyx_v_sequence, __pyx_v_search_params, __pyx_v_max_candidates);
+
+  /* "fuzzysearch/_generic_search.pyx":462
+ * 
+ * 
+ * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                        max_candidates=None):
+ *     """search for near-matches of subsequence in sequence
+ */
 
   /* function exit code */
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_generic_ngrams(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params) {
+static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_4c_find_near_matches_generic_ngrams(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_search_params, PyObject *__pyx_v_max_candidates) {
   PyObject *__pyx_v_max_substitutions = NULL;
   PyObject *__pyx_v_max_insertions = NULL;
   PyObject *__pyx_v_max_deletions = NULL;
@@ -3671,16 +5902,21 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   unsigned int __pyx_v_c_max_insertions;
   unsigned int __pyx_v_c_max_deletions;
   unsigned int __pyx_v_c_max_l_dist;
+  size_t __pyx_v_c_max_candidates;
   char const *__pyx_v_c_sequence;
   char const *__pyx_v_c_subsequence;
   size_t __pyx_v_ngram_len;
-  int __pyx_v_small_search_start_index;
+  Py_ssize_t __pyx_v_window_start;
+  Py_ssize_t __pyx_v_window_end;
+  Py_ssize_t __pyx_v_merged_start;
+  Py_ssize_t __pyx_v_merged_end;
   size_t __pyx_v_ngram_start;
   char *__pyx_v_match_ptr;
   int __pyx_v_subseq_sum;
+  PyObject *__pyx_v_windows = NULL;
+  PyObject *__pyx_v_merged_windows = NULL;
   PyObject *__pyx_v_matches = NULL;
-  PyObject *__pyx_v_small_search_length = NULL;
-  PyObject *__pyx_v_match = NULL;
+  PyObject *__pyx_v_window_matches = NULL;
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   PyObject *__pyx_t_1 = NULL;
@@ -3695,53 +5931,52 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   Py_ssize_t __pyx_t_10;
   unsigned int __pyx_t_11;
   unsigned int __pyx_t_12;
-  char const *__pyx_t_13;
-  char const *__pyx_t_14;
-  long __pyx_t_15;
-  PyObject *(*__pyx_t_16)(PyObject *);
-  size_t __pyx_t_17;
-  Py_ssize_t __pyx_t_18;
-  PyObject *(*__pyx_t_19)(PyObject *);
-  PyObject *__pyx_t_20 = NULL;
-  PyObject *__pyx_t_21 = NULL;
-  int __pyx_t_22;
+  size_t __pyx_t_13;
+  size_t __pyx_t_14;
+  char const *__pyx_t_15;
+  char const *__pyx_t_16;
+  long __pyx_t_17;
+  PyObject *(*__pyx_t_18)(PyObject *);
+  int __pyx_t_19;
+  Py_ssize_t __pyx_t_20;
+  Py_ssize_t __pyx_t_21;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("c_find_near_matches_generic_ngrams", 0);
 
-  /* "fuzzysearch/_generic_search.pyx":248
- *     * the total number of substitutions, insertions and deletions
+  /* "fuzzysearch/_generic_search.pyx":478
+ *     searched again with merge_starts=True.
  *     """
  *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 248, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 478, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = PyObject_IsInstance(__pyx_v_sequence, __pyx_t_1); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 248, __pyx_L1_error)
+  __pyx_t_2 = PyObject_IsInstance(__pyx_v_sequence, __pyx_t_1); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 478, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __pyx_t_3 = ((!(__pyx_t_2 != 0)) != 0);
   if (unlikely(__pyx_t_3)) {
 
-    /* "fuzzysearch/_generic_search.pyx":249
+    /* "fuzzysearch/_generic_search.pyx":479
  *     """
  *     if not isinstance(sequence, ALLOWED_TYPES):
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
  *     if not isinstance(subsequence, ALLOWED_TYPES):
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  */
-    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_sequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 249, __pyx_L1_error)
+    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_sequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 479, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
-    __pyx_t_4 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 249, __pyx_L1_error)
+    __pyx_t_4 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 479, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_4);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     __Pyx_Raise(__pyx_t_4, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-    __PYX_ERR(0, 249, __pyx_L1_error)
+    __PYX_ERR(0, 479, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":248
- *     * the total number of substitutions, insertions and deletions
+    /* "fuzzysearch/_generic_search.pyx":478
+ *     searched again with merge_starts=True.
  *     """
  *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
@@ -3749,37 +5984,37 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":250
+  /* "fuzzysearch/_generic_search.pyx":480
  *     if not isinstance(sequence, ALLOWED_TYPES):
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  * 
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 480, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
-  __pyx_t_3 = PyObject_IsInstance(__pyx_v_subsequence, __pyx_t_4); if (unlikely(__pyx_t_3 == ((int)-1))) __PYX_ERR(0, 250, __pyx_L1_error)
+  __pyx_t_3 = PyObject_IsInstance(__pyx_v_subsequence, __pyx_t_4); if (unlikely(__pyx_t_3 == ((int)-1))) __PYX_ERR(0, 480, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
   __pyx_t_2 = ((!(__pyx_t_3 != 0)) != 0);
   if (unlikely(__pyx_t_2)) {
 
-    /* "fuzzysearch/_generic_search.pyx":251
+    /* "fuzzysearch/_generic_search.pyx":481
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
  * 
  *     if not subsequence:
  */
-    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_subsequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 251, __pyx_L1_error)
+    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_subsequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 481, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_4);
-    __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 251, __pyx_L1_error)
+    __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 481, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
     __Pyx_Raise(__pyx_t_1, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __PYX_ERR(0, 251, __pyx_L1_error)
+    __PYX_ERR(0, 481, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":250
+    /* "fuzzysearch/_generic_search.pyx":480
  *     if not isinstance(sequence, ALLOWED_TYPES):
  *         raise TypeError('sequence is of invalid type %s' % type(subsequence))
  *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
@@ -3788,31 +6023,31 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":253
+  /* "fuzzysearch/_generic_search.pyx":483
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  * 
  *     if not subsequence:             # <<<<<<<<<<<<<<
  *         raise ValueError('Given subsequence is empty!')
  * 
  */
-  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_subsequence); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 253, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_subsequence); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 483, __pyx_L1_error)
   __pyx_t_3 = ((!__pyx_t_2) != 0);
   if (unlikely(__pyx_t_3)) {
 
-    /* "fuzzysearch/_generic_search.pyx":254
+    /* "fuzzysearch/_generic_search.pyx":484
  * 
  *     if not subsequence:
  *         raise ValueError('Given subsequence is empty!')             # <<<<<<<<<<<<<<
  * 
  *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
  */
-    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 254, __pyx_L1_error)
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 484, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
     __Pyx_Raise(__pyx_t_1, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __PYX_ERR(0, 254, __pyx_L1_error)
+    __PYX_ERR(0, 484, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":253
+    /* "fuzzysearch/_generic_search.pyx":483
  *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
  * 
  *     if not subsequence:             # <<<<<<<<<<<<<<
@@ -3821,14 +6056,14 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":256
+  /* "fuzzysearch/_generic_search.pyx":486
  *         raise ValueError('Given subsequence is empty!')
  * 
  *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked             # <<<<<<<<<<<<<<
  * 
  *     # optimization: prepare some often used things in advance
  */
-  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_search_params, __pyx_n_s_unpacked); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 256, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_search_params, __pyx_n_s_unpacked); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 486, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
     PyObject* sequence = __pyx_t_1;
@@ -3836,7 +6071,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
     if (unlikely(size != 4)) {
       if (size > 4) __Pyx_RaiseTooManyValuesError(4);
       else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-      __PYX_ERR(0, 256, __pyx_L1_error)
+      __PYX_ERR(0, 486, __pyx_L1_error)
     }
     #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
     if (likely(PyTuple_CheckExact(sequence))) {
@@ -3859,7 +6094,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
       Py_ssize_t i;
       PyObject** temps[4] = {&__pyx_t_4,&__pyx_t_5,&__pyx_t_6,&__pyx_t_7};
       for (i=0; i < 4; i++) {
-        PyObject* item = PySequence_ITEM(sequence, i); if (unlikely(!item)) __PYX_ERR(0, 256, __pyx_L1_error)
+        PyObject* item = PySequence_ITEM(sequence, i); if (unlikely(!item)) __PYX_ERR(0, 486, __pyx_L1_error)
         __Pyx_GOTREF(item);
         *(temps[i]) = item;
       }
@@ -3869,7 +6104,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   } else {
     Py_ssize_t index = -1;
     PyObject** temps[4] = {&__pyx_t_4,&__pyx_t_5,&__pyx_t_6,&__pyx_t_7};
-    __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 256, __pyx_L1_error)
+    __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 486, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_8);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     __pyx_t_9 = Py_TYPE(__pyx_t_8)->tp_iternext;
@@ -3878,7 +6113,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
       __Pyx_GOTREF(item);
       *(temps[index]) = item;
     }
-    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 4) < 0) __PYX_ERR(0, 256, __pyx_L1_error)
+    if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 4) < 0) __PYX_ERR(0, 486, __pyx_L1_error)
     __pyx_t_9 = NULL;
     __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
     goto __pyx_L7_unpacking_done;
@@ -3886,7 +6121,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
     __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
     __pyx_t_9 = NULL;
     if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-    __PYX_ERR(0, 256, __pyx_L1_error)
+    __PYX_ERR(0, 486, __pyx_L1_error)
     __pyx_L7_unpacking_done:;
   }
   __pyx_v_max_substitutions = __pyx_t_4;
@@ -3898,17 +6133,17 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   __pyx_v_max_l_dist = __pyx_t_7;
   __pyx_t_7 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":259
+  /* "fuzzysearch/_generic_search.pyx":489
  * 
  *     # optimization: prepare some often used things in advance
  *     cdef size_t _subseq_len = len(subsequence)             # <<<<<<<<<<<<<<
  *     cdef size_t _subseq_len_minus_one = _subseq_len - 1
  *     cdef size_t _seq_len = len(sequence)
  */
-  __pyx_t_10 = PyObject_Length(__pyx_v_subsequence); if (unlikely(__pyx_t_10 == ((Py_ssize_t)-1))) __PYX_ERR(0, 259, __pyx_L1_error)
+  __pyx_t_10 = PyObject_Length(__pyx_v_subsequence); if (unlikely(__pyx_t_10 == ((Py_ssize_t)-1))) __PYX_ERR(0, 489, __pyx_L1_error)
   __pyx_v__subseq_len = __pyx_t_10;
 
-  /* "fuzzysearch/_generic_search.pyx":260
+  /* "fuzzysearch/_generic_search.pyx":490
  *     # optimization: prepare some often used things in advance
  *     cdef size_t _subseq_len = len(subsequence)
  *     cdef size_t _subseq_len_minus_one = _subseq_len - 1             # <<<<<<<<<<<<<<
@@ -3917,17 +6152,17 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   __pyx_v__subseq_len_minus_one = (__pyx_v__subseq_len - 1);
 
-  /* "fuzzysearch/_generic_search.pyx":261
+  /* "fuzzysearch/_generic_search.pyx":491
  *     cdef size_t _subseq_len = len(subsequence)
  *     cdef size_t _subseq_len_minus_one = _subseq_len - 1
  *     cdef size_t _seq_len = len(sequence)             # <<<<<<<<<<<<<<
  * 
  *     cdef unsigned int c_max_substitutions = max_substitutions if max_substitutions is not None else (1<<29)
  */
-  __pyx_t_10 = PyObject_Length(__pyx_v_sequence); if (unlikely(__pyx_t_10 == ((Py_ssize_t)-1))) __PYX_ERR(0, 261, __pyx_L1_error)
+  __pyx_t_10 = PyObject_Length(__pyx_v_sequence); if (unlikely(__pyx_t_10 == ((Py_ssize_t)-1))) __PYX_ERR(0, 491, __pyx_L1_error)
   __pyx_v__seq_len = __pyx_t_10;
 
-  /* "fuzzysearch/_generic_search.pyx":263
+  /* "fuzzysearch/_generic_search.pyx":493
  *     cdef size_t _seq_len = len(sequence)
  * 
  *     cdef unsigned int c_max_substitutions = max_substitutions if max_substitutions is not None else (1<<29)             # <<<<<<<<<<<<<<
@@ -3936,14 +6171,14 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   __pyx_t_3 = (__pyx_v_max_substitutions != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_12 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_substitutions); if (unlikely((__pyx_t_12 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 263, __pyx_L1_error)
+    __pyx_t_12 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_substitutions); if (unlikely((__pyx_t_12 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 493, __pyx_L1_error)
     __pyx_t_11 = __pyx_t_12;
   } else {
     __pyx_t_11 = 0x20000000;
   }
   __pyx_v_c_max_substitutions = __pyx_t_11;
 
-  /* "fuzzysearch/_generic_search.pyx":264
+  /* "fuzzysearch/_generic_search.pyx":494
  * 
  *     cdef unsigned int c_max_substitutions = max_substitutions if max_substitutions is not None else (1<<29)
  *     cdef unsigned int c_max_insertions = max_insertions if max_insertions is not None else (1<<29)             # <<<<<<<<<<<<<<
@@ -3952,14 +6187,14 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   __pyx_t_3 = (__pyx_v_max_insertions != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_12 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_insertions); if (unlikely((__pyx_t_12 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 264, __pyx_L1_error)
+    __pyx_t_12 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_insertions); if (unlikely((__pyx_t_12 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 494, __pyx_L1_error)
     __pyx_t_11 = __pyx_t_12;
   } else {
     __pyx_t_11 = 0x20000000;
   }
   __pyx_v_c_max_insertions = __pyx_t_11;
 
-  /* "fuzzysearch/_generic_search.pyx":265
+  /* "fuzzysearch/_generic_search.pyx":495
  *     cdef unsigned int c_max_substitutions = max_substitutions if max_substitutions is not None else (1<<29)
  *     cdef unsigned int c_max_insertions = max_insertions if max_insertions is not None else (1<<29)
  *     cdef unsigned int c_max_deletions = max_deletions if max_deletions is not None else (1<<29)             # <<<<<<<<<<<<<<
@@ -3968,14 +6203,14 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   __pyx_t_3 = (__pyx_v_max_deletions != Py_None);
   if ((__pyx_t_3 != 0)) {
-    __pyx_t_12 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_deletions); if (unlikely((__pyx_t_12 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 265, __pyx_L1_error)
+    __pyx_t_12 = __Pyx_PyInt_As_unsigned_int(__pyx_v_max_deletions); if (unlikely((__pyx_t_12 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 495, __pyx_L1_error)
     __pyx_t_11 = __pyx_t_12;
   } else {
     __pyx_t_11 = 0x20000000;
   }
   __pyx_v_c_max_deletions = __pyx_t_11;
 
-  /* "fuzzysearch/_generic_search.pyx":270
+  /* "fuzzysearch/_generic_search.pyx":500
  *     cdef unsigned int c_max_l_dist = min(
  *         max_l_dist if max_l_dist is not None else (1<<29),
  *         c_max_substitutions + c_max_insertions + c_max_deletions,             # <<<<<<<<<<<<<<
@@ -3984,7 +6219,7 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   __pyx_t_11 = ((__pyx_v_c_max_substitutions + __pyx_v_c_max_insertions) + __pyx_v_c_max_deletions);
 
-  /* "fuzzysearch/_generic_search.pyx":269
+  /* "fuzzysearch/_generic_search.pyx":499
  *     # TODO: write a good comment
  *     cdef unsigned int c_max_l_dist = min(
  *         max_l_dist if max_l_dist is not None else (1<<29),             # <<<<<<<<<<<<<<
@@ -4000,21 +6235,21 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
     __pyx_t_1 = __pyx_int_536870912;
   }
 
-  /* "fuzzysearch/_generic_search.pyx":270
+  /* "fuzzysearch/_generic_search.pyx":500
  *     cdef unsigned int c_max_l_dist = min(
  *         max_l_dist if max_l_dist is not None else (1<<29),
  *         c_max_substitutions + c_max_insertions + c_max_deletions,             # <<<<<<<<<<<<<<
  *     )
  * 
  */
-  __pyx_t_6 = __Pyx_PyInt_From_unsigned_int(__pyx_t_11); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 270, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyInt_From_unsigned_int(__pyx_t_11); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 500, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
-  __pyx_t_5 = PyObject_RichCompare(__pyx_t_6, __pyx_t_1, Py_LT); __Pyx_XGOTREF(__pyx_t_5); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 270, __pyx_L1_error)
+  __pyx_t_5 = PyObject_RichCompare(__pyx_t_6, __pyx_t_1, Py_LT); __Pyx_XGOTREF(__pyx_t_5); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 500, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_5); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 270, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_5); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 500, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
   if (__pyx_t_3) {
-    __pyx_t_5 = __Pyx_PyInt_From_unsigned_int(__pyx_t_11); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 270, __pyx_L1_error)
+    __pyx_t_5 = __Pyx_PyInt_From_unsigned_int(__pyx_t_11); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 500, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_5);
     __pyx_t_7 = __pyx_t_5;
     __pyx_t_5 = 0;
@@ -4023,45 +6258,61 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
     __pyx_t_7 = __pyx_t_1;
   }
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_11 = __Pyx_PyInt_As_unsigned_int(__pyx_t_7); if (unlikely((__pyx_t_11 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 270, __pyx_L1_error)
+  __pyx_t_11 = __Pyx_PyInt_As_unsigned_int(__pyx_t_7); if (unlikely((__pyx_t_11 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 500, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
   __pyx_v_c_max_l_dist = __pyx_t_11;
 
-  /* "fuzzysearch/_generic_search.pyx":273
+  /* "fuzzysearch/_generic_search.pyx":503
  *     )
  * 
+ *     cdef size_t c_max_candidates = SIZE_MAX if max_candidates is None else max_candidates             # <<<<<<<<<<<<<<
+ * 
+ *     cdef const char* c_sequence = sequence
+ */
+  __pyx_t_3 = (__pyx_v_max_candidates == Py_None);
+  if ((__pyx_t_3 != 0)) {
+    __pyx_t_13 = SIZE_MAX;
+  } else {
+    __pyx_t_14 = __Pyx_PyInt_As_size_t(__pyx_v_max_candidates); if (unlikely((__pyx_t_14 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 503, __pyx_L1_error)
+    __pyx_t_13 = __pyx_t_14;
+  }
+  __pyx_v_c_max_candidates = __pyx_t_13;
+
+  /* "fuzzysearch/_generic_search.pyx":505
+ *     cdef size_t c_max_candidates = SIZE_MAX if max_candidates is None else max_candidates
+ * 
  *     cdef const char* c_sequence = sequence             # <<<<<<<<<<<<<<
  *     cdef const char* c_subsequence = subsequence
  * 
  */
-  __pyx_t_13 = __Pyx_PyObject_AsString(__pyx_v_sequence); if (unlikely((!__pyx_t_13) && PyErr_Occurred())) __PYX_ERR(0, 273, __pyx_L1_error)
-  __pyx_v_c_sequence = __pyx_t_13;
+  __pyx_t_15 = __Pyx_PyObject_AsString(__pyx_v_sequence); if (unlikely((!__pyx_t_15) && PyErr_Occurred())) __PYX_ERR(0, 505, __pyx_L1_error)
+  __pyx_v_c_sequence = __pyx_t_15;
 
-  /* "fuzzysearch/_generic_search.pyx":274
+  /* "fuzzysearch/_generic_search.pyx":506
  * 
  *     cdef const char* c_sequence = sequence
  *     cdef const char* c_subsequence = subsequence             # <<<<<<<<<<<<<<
  * 
  *     cdef size_t ngram_len = _subseq_len // (c_max_l_dist + 1)
  */
-  __pyx_t_14 = __Pyx_PyObject_AsString(__pyx_v_subsequence); if (unlikely((!__pyx_t_14) && PyErr_Occurred())) __PYX_ERR(0, 274, __pyx_L1_error)
-  __pyx_v_c_subsequence = __pyx_t_14;
+  __pyx_t_16 = __Pyx_PyObject_AsString(__pyx_v_subsequence); if (unlikely((!__pyx_t_16) && PyErr_Occurred())) __PYX_ERR(0, 506, __pyx_L1_error)
+  __pyx_v_c_subsequence = __pyx_t_16;
 
-  /* "fuzzysearch/_generic_search.pyx":276
+  /* "fuzzysearch/_generic_search.pyx":508
  *     cdef const char* c_subsequence = subsequence
  * 
  *     cdef size_t ngram_len = _subseq_len // (c_max_l_dist + 1)             # <<<<<<<<<<<<<<
  *     if ngram_len == 0:
  *         raise ValueError('the subsequence length must be greater than max_l_dist')
  */
-  __pyx_t_15 = (__pyx_v_c_max_l_dist + 1);
-  if (unlikely(__pyx_t_15 == 0)) {
+  __pyx_t_17 = (__pyx_v_c_max_l_dist + 1);
+  if (unlikely(__pyx_t_17 == 0)) {
     PyErr_SetString(PyExc_ZeroDivisionError, "integer division or modulo by zero");
-    __PYX_ERR(0, 276, __pyx_L1_error)
+    __PYX_ERR(0, 508, __pyx_L1_error)
   }
-  __pyx_v_ngram_len = (__pyx_v__subseq_len / __pyx_t_15);
+  __pyx_v_ngram_len = (__pyx_v__subseq_len / __pyx_t_17);
 
-  /* "fuzzysearch/_generic_search.pyx":277
+  /* "fuzzysearch/_generic_search.pyx":509
  * 
  *     cdef size_t ngram_len = _subseq_len // (c_max_l_dist + 1)
  *     if ngram_len == 0:             # <<<<<<<<<<<<<<
@@ -4071,20 +6322,20 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   __pyx_t_3 = ((__pyx_v_ngram_len == 0) != 0);
   if (unlikely(__pyx_t_3)) {
 
-    /* "fuzzysearch/_generic_search.pyx":278
+    /* "fuzzysearch/_generic_search.pyx":510
  *     cdef size_t ngram_len = _subseq_len // (c_max_l_dist + 1)
  *     if ngram_len == 0:
  *         raise ValueError('the subsequence length must be greater than max_l_dist')             # <<<<<<<<<<<<<<
  * 
- *     cdef int index, small_search_start_index
+ *     cdef Py_ssize_t window_start, window_end
  */
-    __pyx_t_7 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple__4, NULL); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 278, __pyx_L1_error)
+    __pyx_t_7 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple__6, NULL); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 510, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_7);
     __Pyx_Raise(__pyx_t_7, 0, 0, 0);
     __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-    __PYX_ERR(0, 278, __pyx_L1_error)
+    __PYX_ERR(0, 510, __pyx_L1_error)
 
-    /* "fuzzysearch/_generic_search.pyx":277
+    /* "fuzzysearch/_generic_search.pyx":509
  * 
  *     cdef size_t ngram_len = _subseq_len // (c_max_l_dist + 1)
  *     if ngram_len == 0:             # <<<<<<<<<<<<<<
@@ -4093,30 +6344,40 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
   }
 
-  /* "fuzzysearch/_generic_search.pyx":286
- *     cdef int subseq_sum
+  /* "fuzzysearch/_generic_search.pyx":513
  * 
- *     matches = []             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t window_start, window_end
+ *     cdef Py_ssize_t merged_start = -1, merged_end = -1             # <<<<<<<<<<<<<<
+ *     cdef size_t ngram_start
+ * 
+ */
+  __pyx_v_merged_start = -1L;
+  __pyx_v_merged_end = -1L;
+
+  /* "fuzzysearch/_generic_search.pyx":520
+ * 
+ *     # find the windows of the sequence around the exact matches of n-grams
+ *     windows = []             # <<<<<<<<<<<<<<
  *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):
- *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
+ *         if ngram_start + ngram_len > _seq_len:
  */
-  __pyx_t_7 = PyList_New(0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 286, __pyx_L1_error)
+  __pyx_t_7 = PyList_New(0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 520, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_7);
-  __pyx_v_matches = ((PyObject*)__pyx_t_7);
+  __pyx_v_windows = ((PyObject*)__pyx_t_7);
   __pyx_t_7 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":287
- * 
- *     matches = []
+  /* "fuzzysearch/_generic_search.pyx":521
+ *     # find the windows of the sequence around the exact matches of n-grams
+ *     windows = []
  *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):             # <<<<<<<<<<<<<<
- *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
- * 
+ *         if ngram_start + ngram_len > _seq_len:
+ *             break
  */
-  __pyx_t_7 = __Pyx_PyInt_FromSize_t(((__pyx_v__subseq_len - __pyx_v_ngram_len) + 1)); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 287, __pyx_L1_error)
+  __pyx_t_7 = __Pyx_PyInt_FromSize_t(((__pyx_v__subseq_len - __pyx_v_ngram_len) + 1)); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 521, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_7);
-  __pyx_t_1 = __Pyx_PyInt_FromSize_t(__pyx_v_ngram_len); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 287, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyInt_FromSize_t(__pyx_v_ngram_len); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 521, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_5 = PyTuple_New(3); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 287, __pyx_L1_error)
+  __pyx_t_5 = PyTuple_New(3); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 521, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_5);
   __Pyx_INCREF(__pyx_int_0);
   __Pyx_GIVEREF(__pyx_int_0);
@@ -4127,63 +6388,91 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   PyTuple_SET_ITEM(__pyx_t_5, 2, __pyx_t_1);
   __pyx_t_7 = 0;
   __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_xrange, __pyx_t_5, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 287, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_xrange, __pyx_t_5, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 521, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
   if (likely(PyList_CheckExact(__pyx_t_1)) || PyTuple_CheckExact(__pyx_t_1)) {
     __pyx_t_5 = __pyx_t_1; __Pyx_INCREF(__pyx_t_5); __pyx_t_10 = 0;
-    __pyx_t_16 = NULL;
+    __pyx_t_18 = NULL;
   } else {
-    __pyx_t_10 = -1; __pyx_t_5 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 287, __pyx_L1_error)
+    __pyx_t_10 = -1; __pyx_t_5 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 521, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_5);
-    __pyx_t_16 = Py_TYPE(__pyx_t_5)->tp_iternext; if (unlikely(!__pyx_t_16)) __PYX_ERR(0, 287, __pyx_L1_error)
+    __pyx_t_18 = Py_TYPE(__pyx_t_5)->tp_iternext; if (unlikely(!__pyx_t_18)) __PYX_ERR(0, 521, __pyx_L1_error)
   }
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   for (;;) {
-    if (likely(!__pyx_t_16)) {
+    if (likely(!__pyx_t_18)) {
       if (likely(PyList_CheckExact(__pyx_t_5))) {
         if (__pyx_t_10 >= PyList_GET_SIZE(__pyx_t_5)) break;
         #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-        __pyx_t_1 = PyList_GET_ITEM(__pyx_t_5, __pyx_t_10); __Pyx_INCREF(__pyx_t_1); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 287, __pyx_L1_error)
+        __pyx_t_1 = PyList_GET_ITEM(__pyx_t_5, __pyx_t_10); __Pyx_INCREF(__pyx_t_1); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 521, __pyx_L1_error)
         #else
-        __pyx_t_1 = PySequence_ITEM(__pyx_t_5, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 287, __pyx_L1_error)
+        __pyx_t_1 = PySequence_ITEM(__pyx_t_5, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 521, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_1);
         #endif
       } else {
         if (__pyx_t_10 >= PyTuple_GET_SIZE(__pyx_t_5)) break;
         #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-        __pyx_t_1 = PyTuple_GET_ITEM(__pyx_t_5, __pyx_t_10); __Pyx_INCREF(__pyx_t_1); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 287, __pyx_L1_error)
+        __pyx_t_1 = PyTuple_GET_ITEM(__pyx_t_5, __pyx_t_10); __Pyx_INCREF(__pyx_t_1); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 521, __pyx_L1_error)
         #else
-        __pyx_t_1 = PySequence_ITEM(__pyx_t_5, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 287, __pyx_L1_error)
+        __pyx_t_1 = PySequence_ITEM(__pyx_t_5, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 521, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_1);
         #endif
       }
     } else {
-      __pyx_t_1 = __pyx_t_16(__pyx_t_5);
+      __pyx_t_1 = __pyx_t_18(__pyx_t_5);
       if (unlikely(!__pyx_t_1)) {
         PyObject* exc_type = PyErr_Occurred();
         if (exc_type) {
           if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-          else __PYX_ERR(0, 287, __pyx_L1_error)
+          else __PYX_ERR(0, 521, __pyx_L1_error)
         }
         break;
       }
       __Pyx_GOTREF(__pyx_t_1);
     }
-    __pyx_t_17 = __Pyx_PyInt_As_size_t(__pyx_t_1); if (unlikely((__pyx_t_17 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 287, __pyx_L1_error)
+    __pyx_t_13 = __Pyx_PyInt_As_size_t(__pyx_t_1); if (unlikely((__pyx_t_13 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 521, __pyx_L1_error)
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __pyx_v_ngram_start = __pyx_t_17;
+    __pyx_v_ngram_start = __pyx_t_13;
 
-    /* "fuzzysearch/_generic_search.pyx":288
- *     matches = []
+    /* "fuzzysearch/_generic_search.pyx":522
+ *     windows = []
+ *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):
+ *         if ngram_start + ngram_len > _seq_len:             # <<<<<<<<<<<<<<
+ *             break
+ *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
+ */
+    __pyx_t_3 = (((__pyx_v_ngram_start + __pyx_v_ngram_len) > __pyx_v__seq_len) != 0);
+    if (__pyx_t_3) {
+
+      /* "fuzzysearch/_generic_search.pyx":523
+ *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):
+ *         if ngram_start + ngram_len > _seq_len:
+ *             break             # <<<<<<<<<<<<<<
+ *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
+ * 
+ */
+      goto __pyx_L10_break;
+
+      /* "fuzzysearch/_generic_search.pyx":522
+ *     windows = []
  *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):
+ *         if ngram_start + ngram_len > _seq_len:             # <<<<<<<<<<<<<<
+ *             break
+ *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
+ */
+    }
+
+    /* "fuzzysearch/_generic_search.pyx":524
+ *         if ngram_start + ngram_len > _seq_len:
+ *             break
  *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)             # <<<<<<<<<<<<<<
  * 
  *         match_ptr = <char *>simple_memmem_with_needle_sum(
  */
     __pyx_v_subseq_sum = calc_sum((__pyx_v_c_subsequence + __pyx_v_ngram_start), __pyx_v_ngram_len);
 
-    /* "fuzzysearch/_generic_search.pyx":290
+    /* "fuzzysearch/_generic_search.pyx":526
  *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
  * 
  *         match_ptr = <char *>simple_memmem_with_needle_sum(             # <<<<<<<<<<<<<<
@@ -4192,287 +6481,539 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
  */
     __pyx_v_match_ptr = ((char *)simple_memmem_with_needle_sum((((char *)__pyx_v_c_sequence) + __pyx_v_ngram_start), (__pyx_v__seq_len - __pyx_v_ngram_start), (((char *)__pyx_v_c_subsequence) + __pyx_v_ngram_start), __pyx_v_ngram_len, __pyx_v_subseq_sum));
 
-    /* "fuzzysearch/_generic_search.pyx":297
+    /* "fuzzysearch/_generic_search.pyx":533
  *             subseq_sum)
  * 
  *         while match_ptr != NULL:             # <<<<<<<<<<<<<<
- *             small_search_start_index = (match_ptr - c_sequence) - ngram_start - c_max_l_dist
- *             small_search_length = _subseq_len + (2 * c_max_l_dist)
+ *             window_start = (match_ptr - c_sequence) - <Py_ssize_t> ngram_start - c_max_l_dist
+ *             window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)
  */
     while (1) {
       __pyx_t_3 = ((__pyx_v_match_ptr != NULL) != 0);
       if (!__pyx_t_3) break;
 
-      /* "fuzzysearch/_generic_search.pyx":298
+      /* "fuzzysearch/_generic_search.pyx":534
  * 
  *         while match_ptr != NULL:
- *             small_search_start_index = (match_ptr - c_sequence) - ngram_start - c_max_l_dist             # <<<<<<<<<<<<<<
- *             small_search_length = _subseq_len + (2 * c_max_l_dist)
- *             if small_search_start_index < 0:
+ *             window_start = (match_ptr - c_sequence) - <Py_ssize_t> ngram_start - c_max_l_dist             # <<<<<<<<<<<<<<
+ *             window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)
+ *             if window_start < 0:
  */
-      __pyx_v_small_search_start_index = (((__pyx_v_match_ptr - __pyx_v_c_sequence) - __pyx_v_ngram_start) - __pyx_v_c_max_l_dist);
+      __pyx_v_window_start = (((__pyx_v_match_ptr - __pyx_v_c_sequence) - ((Py_ssize_t)__pyx_v_ngram_start)) - __pyx_v_c_max_l_dist);
 
-      /* "fuzzysearch/_generic_search.pyx":299
+      /* "fuzzysearch/_generic_search.pyx":535
  *         while match_ptr != NULL:
- *             small_search_start_index = (match_ptr - c_sequence) - ngram_start - c_max_l_dist
- *             small_search_length = _subseq_len + (2 * c_max_l_dist)             # <<<<<<<<<<<<<<
- *             if small_search_start_index < 0:
- *                 small_search_length += small_search_start_index
+ *             window_start = (match_ptr - c_sequence) - <Py_ssize_t> ngram_start - c_max_l_dist
+ *             window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)             # <<<<<<<<<<<<<<
+ *             if window_start < 0:
+ *                 window_start = 0
  */
-      __pyx_t_1 = __Pyx_PyInt_FromSize_t((__pyx_v__subseq_len + (2 * __pyx_v_c_max_l_dist))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 299, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_XDECREF_SET(__pyx_v_small_search_length, __pyx_t_1);
-      __pyx_t_1 = 0;
+      __pyx_v_window_end = (__pyx_v_window_start + ((Py_ssize_t)(__pyx_v__subseq_len + (2 * __pyx_v_c_max_l_dist))));
 
-      /* "fuzzysearch/_generic_search.pyx":300
- *             small_search_start_index = (match_ptr - c_sequence) - ngram_start - c_max_l_dist
- *             small_search_length = _subseq_len + (2 * c_max_l_dist)
- *             if small_search_start_index < 0:             # <<<<<<<<<<<<<<
- *                 small_search_length += small_search_start_index
- *                 small_search_start_index = 0
+      /* "fuzzysearch/_generic_search.pyx":536
+ *             window_start = (match_ptr - c_sequence) - <Py_ssize_t> ngram_start - c_max_l_dist
+ *             window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)
+ *             if window_start < 0:             # <<<<<<<<<<<<<<
+ *                 window_start = 0
+ *             if window_end > <Py_ssize_t> _seq_len:
  */
-      __pyx_t_3 = ((__pyx_v_small_search_start_index < 0) != 0);
+      __pyx_t_3 = ((__pyx_v_window_start < 0) != 0);
       if (__pyx_t_3) {
 
-        /* "fuzzysearch/_generic_search.pyx":301
- *             small_search_length = _subseq_len + (2 * c_max_l_dist)
- *             if small_search_start_index < 0:
- *                 small_search_length += small_search_start_index             # <<<<<<<<<<<<<<
- *                 small_search_start_index = 0
- *             if small_search_start_index + small_search_length > _seq_len:
+        /* "fuzzysearch/_generic_search.pyx":537
+ *             window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)
+ *             if window_start < 0:
+ *                 window_start = 0             # <<<<<<<<<<<<<<
+ *             if window_end > <Py_ssize_t> _seq_len:
+ *                 window_end = _seq_len
  */
-        __pyx_t_1 = __Pyx_PyInt_From_int(__pyx_v_small_search_start_index); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 301, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_1);
-        __pyx_t_7 = PyNumber_InPlaceAdd(__pyx_v_small_search_length, __pyx_t_1); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 301, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_7);
-        __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-        __Pyx_DECREF_SET(__pyx_v_small_search_length, __pyx_t_7);
-        __pyx_t_7 = 0;
-
-        /* "fuzzysearch/_generic_search.pyx":302
- *             if small_search_start_index < 0:
- *                 small_search_length += small_search_start_index
- *                 small_search_start_index = 0             # <<<<<<<<<<<<<<
- *             if small_search_start_index + small_search_length > _seq_len:
- *                 small_search_length = _seq_len - small_search_start_index
- */
-        __pyx_v_small_search_start_index = 0;
-
-        /* "fuzzysearch/_generic_search.pyx":300
- *             small_search_start_index = (match_ptr - c_sequence) - ngram_start - c_max_l_dist
- *             small_search_length = _subseq_len + (2 * c_max_l_dist)
- *             if small_search_start_index < 0:             # <<<<<<<<<<<<<<
- *                 small_search_length += small_search_start_index
- *                 small_search_start_index = 0
+        __pyx_v_window_start = 0;
+
+        /* "fuzzysearch/_generic_search.pyx":536
+ *             window_start = (match_ptr - c_sequence) - <Py_ssize_t> ngram_start - c_max_l_dist
+ *             window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)
+ *             if window_start < 0:             # <<<<<<<<<<<<<<
+ *                 window_start = 0
+ *             if window_end > <Py_ssize_t> _seq_len:
  */
       }
 
-      /* "fuzzysearch/_generic_search.pyx":303
- *                 small_search_length += small_search_start_index
- *                 small_search_start_index = 0
- *             if small_search_start_index + small_search_length > _seq_len:             # <<<<<<<<<<<<<<
- *                 small_search_length = _seq_len - small_search_start_index
- *             # try to expand left and/or right according to n_ngram
+      /* "fuzzysearch/_generic_search.pyx":538
+ *             if window_start < 0:
+ *                 window_start = 0
+ *             if window_end > <Py_ssize_t> _seq_len:             # <<<<<<<<<<<<<<
+ *                 window_end = _seq_len
+ *             windows.append((window_start, window_end))
  */
-      __pyx_t_7 = __Pyx_PyInt_From_int(__pyx_v_small_search_start_index); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 303, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_7);
-      __pyx_t_1 = PyNumber_Add(__pyx_t_7, __pyx_v_small_search_length); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 303, __pyx_L1_error)
+      __pyx_t_3 = ((__pyx_v_window_end > ((Py_ssize_t)__pyx_v__seq_len)) != 0);
+      if (__pyx_t_3) {
+
+        /* "fuzzysearch/_generic_search.pyx":539
+ *                 window_start = 0
+ *             if window_end > <Py_ssize_t> _seq_len:
+ *                 window_end = _seq_len             # <<<<<<<<<<<<<<
+ *             windows.append((window_start, window_end))
+ *             match_ptr = <char *>simple_memmem_with_needle_sum(
+ */
+        __pyx_v_window_end = __pyx_v__seq_len;
+
+        /* "fuzzysearch/_generic_search.pyx":538
+ *             if window_start < 0:
+ *                 window_start = 0
+ *             if window_end > <Py_ssize_t> _seq_len:             # <<<<<<<<<<<<<<
+ *                 window_end = _seq_len
+ *             windows.append((window_start, window_end))
+ */
+      }
+
+      /* "fuzzysearch/_generic_search.pyx":540
+ *             if window_end > <Py_ssize_t> _seq_len:
+ *                 window_end = _seq_len
+ *             windows.append((window_start, window_end))             # <<<<<<<<<<<<<<
+ *             match_ptr = <char *>simple_memmem_with_needle_sum(
+ *                 <char *>match_ptr + 1, _seq_len - (match_ptr - c_sequence) - 1,
+ */
+      __pyx_t_1 = PyInt_FromSsize_t(__pyx_v_window_start); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 540, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __pyx_t_7 = __Pyx_PyInt_FromSize_t(__pyx_v__seq_len); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 303, __pyx_L1_error)
+      __pyx_t_7 = PyInt_FromSsize_t(__pyx_v_window_end); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 540, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_7);
-      __pyx_t_6 = PyObject_RichCompare(__pyx_t_1, __pyx_t_7, Py_GT); __Pyx_XGOTREF(__pyx_t_6); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 303, __pyx_L1_error)
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_6); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 303, __pyx_L1_error)
+      __pyx_t_6 = PyTuple_New(2); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 540, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_GIVEREF(__pyx_t_1);
+      PyTuple_SET_ITEM(__pyx_t_6, 0, __pyx_t_1);
+      __Pyx_GIVEREF(__pyx_t_7);
+      PyTuple_SET_ITEM(__pyx_t_6, 1, __pyx_t_7);
+      __pyx_t_1 = 0;
+      __pyx_t_7 = 0;
+      __pyx_t_19 = __Pyx_PyList_Append(__pyx_v_windows, __pyx_t_6); if (unlikely(__pyx_t_19 == ((int)-1))) __PYX_ERR(0, 540, __pyx_L1_error)
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      if (__pyx_t_3) {
 
-        /* "fuzzysearch/_generic_search.pyx":304
- *                 small_search_start_index = 0
- *             if small_search_start_index + small_search_length > _seq_len:
- *                 small_search_length = _seq_len - small_search_start_index             # <<<<<<<<<<<<<<
- *             # try to expand left and/or right according to n_ngram
- *             for match in _c_find_near_matches_generic_linear_programming(
+      /* "fuzzysearch/_generic_search.pyx":541
+ *                 window_end = _seq_len
+ *             windows.append((window_start, window_end))
+ *             match_ptr = <char *>simple_memmem_with_needle_sum(             # <<<<<<<<<<<<<<
+ *                 <char *>match_ptr + 1, _seq_len - (match_ptr - c_sequence) - 1,
+ *                 <char *>c_subsequence + ngram_start, ngram_len,
  */
-        __pyx_t_6 = __Pyx_PyInt_FromSize_t((__pyx_v__seq_len - __pyx_v_small_search_start_index)); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 304, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_6);
-        __Pyx_DECREF_SET(__pyx_v_small_search_length, __pyx_t_6);
-        __pyx_t_6 = 0;
+      __pyx_v_match_ptr = ((char *)simple_memmem_with_needle_sum((((char *)__pyx_v_match_ptr) + 1), ((__pyx_v__seq_len - (__pyx_v_match_ptr - __pyx_v_c_sequence)) - 1), (((char *)__pyx_v_c_subsequence) + __pyx_v_ngram_start), __pyx_v_ngram_len, __pyx_v_subseq_sum));
+    }
 
-        /* "fuzzysearch/_generic_search.pyx":303
- *                 small_search_length += small_search_start_index
- *                 small_search_start_index = 0
- *             if small_search_start_index + small_search_length > _seq_len:             # <<<<<<<<<<<<<<
- *                 small_search_length = _seq_len - small_search_start_index
- *             # try to expand left and/or right according to n_ngram
+    /* "fuzzysearch/_generic_search.pyx":521
+ *     # find the windows of the sequence around the exact matches of n-grams
+ *     windows = []
+ *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):             # <<<<<<<<<<<<<<
+ *         if ngram_start + ngram_len > _seq_len:
+ *             break
  */
-      }
+  }
+  __pyx_L10_break:;
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
 
-      /* "fuzzysearch/_generic_search.pyx":309
- *                 c_subsequence, _subseq_len,
- *                 c_sequence + small_search_start_index,
- *                 small_search_length,             # <<<<<<<<<<<<<<
- *                 c_max_substitutions, c_max_insertions, c_max_deletions, c_max_l_dist,
- *             ):
+  /* "fuzzysearch/_generic_search.pyx":547
+ * 
+ *     # merge overlapping windows, so that each is searched only once
+ *     windows.sort()             # <<<<<<<<<<<<<<
+ *     merged_windows = []
+ *     for window_start, window_end in windows:
  */
-      __pyx_t_17 = __Pyx_PyInt_As_size_t(__pyx_v_small_search_length); if (unlikely((__pyx_t_17 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 309, __pyx_L1_error)
+  __pyx_t_19 = PyList_Sort(__pyx_v_windows); if (unlikely(__pyx_t_19 == ((int)-1))) __PYX_ERR(0, 547, __pyx_L1_error)
 
-      /* "fuzzysearch/_generic_search.pyx":306
- *                 small_search_length = _seq_len - small_search_start_index
- *             # try to expand left and/or right according to n_ngram
- *             for match in _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
- *                 c_subsequence, _subseq_len,
- *                 c_sequence + small_search_start_index,
+  /* "fuzzysearch/_generic_search.pyx":548
+ *     # merge overlapping windows, so that each is searched only once
+ *     windows.sort()
+ *     merged_windows = []             # <<<<<<<<<<<<<<
+ *     for window_start, window_end in windows:
+ *         if merged_end != -1 and window_start <= merged_end:
  */
-      __pyx_t_6 = __pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(__pyx_v_c_subsequence, __pyx_v__subseq_len, (__pyx_v_c_sequence + __pyx_v_small_search_start_index), __pyx_t_17, __pyx_v_c_max_substitutions, __pyx_v_c_max_insertions, __pyx_v_c_max_deletions, __pyx_v_c_max_l_dist); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 306, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_6);
-      if (likely(PyList_CheckExact(__pyx_t_6)) || PyTuple_CheckExact(__pyx_t_6)) {
-        __pyx_t_7 = __pyx_t_6; __Pyx_INCREF(__pyx_t_7); __pyx_t_18 = 0;
-        __pyx_t_19 = NULL;
+  __pyx_t_5 = PyList_New(0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 548, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_v_merged_windows = ((PyObject*)__pyx_t_5);
+  __pyx_t_5 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":549
+ *     windows.sort()
+ *     merged_windows = []
+ *     for window_start, window_end in windows:             # <<<<<<<<<<<<<<
+ *         if merged_end != -1 and window_start <= merged_end:
+ *             if window_end > merged_end:
+ */
+  __pyx_t_5 = __pyx_v_windows; __Pyx_INCREF(__pyx_t_5); __pyx_t_10 = 0;
+  for (;;) {
+    if (__pyx_t_10 >= PyList_GET_SIZE(__pyx_t_5)) break;
+    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    __pyx_t_6 = PyList_GET_ITEM(__pyx_t_5, __pyx_t_10); __Pyx_INCREF(__pyx_t_6); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 549, __pyx_L1_error)
+    #else
+    __pyx_t_6 = PySequence_ITEM(__pyx_t_5, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 549, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    #endif
+    if ((likely(PyTuple_CheckExact(__pyx_t_6))) || (PyList_CheckExact(__pyx_t_6))) {
+      PyObject* sequence = __pyx_t_6;
+      Py_ssize_t size = __Pyx_PySequence_SIZE(sequence);
+      if (unlikely(size != 2)) {
+        if (size > 2) __Pyx_RaiseTooManyValuesError(2);
+        else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
+        __PYX_ERR(0, 549, __pyx_L1_error)
+      }
+      #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+      if (likely(PyTuple_CheckExact(sequence))) {
+        __pyx_t_7 = PyTuple_GET_ITEM(sequence, 0); 
+        __pyx_t_1 = PyTuple_GET_ITEM(sequence, 1); 
       } else {
-        __pyx_t_18 = -1; __pyx_t_7 = PyObject_GetIter(__pyx_t_6); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 306, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_7);
-        __pyx_t_19 = Py_TYPE(__pyx_t_7)->tp_iternext; if (unlikely(!__pyx_t_19)) __PYX_ERR(0, 306, __pyx_L1_error)
+        __pyx_t_7 = PyList_GET_ITEM(sequence, 0); 
+        __pyx_t_1 = PyList_GET_ITEM(sequence, 1); 
       }
+      __Pyx_INCREF(__pyx_t_7);
+      __Pyx_INCREF(__pyx_t_1);
+      #else
+      __pyx_t_7 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 549, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_7);
+      __pyx_t_1 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 549, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_1);
+      #endif
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      for (;;) {
-        if (likely(!__pyx_t_19)) {
-          if (likely(PyList_CheckExact(__pyx_t_7))) {
-            if (__pyx_t_18 >= PyList_GET_SIZE(__pyx_t_7)) break;
-            #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-            __pyx_t_6 = PyList_GET_ITEM(__pyx_t_7, __pyx_t_18); __Pyx_INCREF(__pyx_t_6); __pyx_t_18++; if (unlikely(0 < 0)) __PYX_ERR(0, 306, __pyx_L1_error)
-            #else
-            __pyx_t_6 = PySequence_ITEM(__pyx_t_7, __pyx_t_18); __pyx_t_18++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 306, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_6);
-            #endif
-          } else {
-            if (__pyx_t_18 >= PyTuple_GET_SIZE(__pyx_t_7)) break;
-            #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-            __pyx_t_6 = PyTuple_GET_ITEM(__pyx_t_7, __pyx_t_18); __Pyx_INCREF(__pyx_t_6); __pyx_t_18++; if (unlikely(0 < 0)) __PYX_ERR(0, 306, __pyx_L1_error)
-            #else
-            __pyx_t_6 = PySequence_ITEM(__pyx_t_7, __pyx_t_18); __pyx_t_18++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 306, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_6);
-            #endif
-          }
-        } else {
-          __pyx_t_6 = __pyx_t_19(__pyx_t_7);
-          if (unlikely(!__pyx_t_6)) {
-            PyObject* exc_type = PyErr_Occurred();
-            if (exc_type) {
-              if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-              else __PYX_ERR(0, 306, __pyx_L1_error)
-            }
-            break;
-          }
-          __Pyx_GOTREF(__pyx_t_6);
-        }
-        __Pyx_XDECREF_SET(__pyx_v_match, __pyx_t_6);
-        __pyx_t_6 = 0;
+    } else {
+      Py_ssize_t index = -1;
+      __pyx_t_4 = PyObject_GetIter(__pyx_t_6); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 549, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_4);
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+      __pyx_t_9 = Py_TYPE(__pyx_t_4)->tp_iternext;
+      index = 0; __pyx_t_7 = __pyx_t_9(__pyx_t_4); if (unlikely(!__pyx_t_7)) goto __pyx_L18_unpacking_failed;
+      __Pyx_GOTREF(__pyx_t_7);
+      index = 1; __pyx_t_1 = __pyx_t_9(__pyx_t_4); if (unlikely(!__pyx_t_1)) goto __pyx_L18_unpacking_failed;
+      __Pyx_GOTREF(__pyx_t_1);
+      if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_4), 2) < 0) __PYX_ERR(0, 549, __pyx_L1_error)
+      __pyx_t_9 = NULL;
+      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      goto __pyx_L19_unpacking_done;
+      __pyx_L18_unpacking_failed:;
+      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      __pyx_t_9 = NULL;
+      if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
+      __PYX_ERR(0, 549, __pyx_L1_error)
+      __pyx_L19_unpacking_done:;
+    }
+    __pyx_t_20 = __Pyx_PyIndex_AsSsize_t(__pyx_t_7); if (unlikely((__pyx_t_20 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 549, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+    __pyx_t_21 = __Pyx_PyIndex_AsSsize_t(__pyx_t_1); if (unlikely((__pyx_t_21 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 549, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __pyx_v_window_start = __pyx_t_20;
+    __pyx_v_window_end = __pyx_t_21;
+
+    /* "fuzzysearch/_generic_search.pyx":550
+ *     merged_windows = []
+ *     for window_start, window_end in windows:
+ *         if merged_end != -1 and window_start <= merged_end:             # <<<<<<<<<<<<<<
+ *             if window_end > merged_end:
+ *                 merged_end = window_end
+ */
+    __pyx_t_2 = ((__pyx_v_merged_end != -1L) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_3 = __pyx_t_2;
+      goto __pyx_L21_bool_binop_done;
+    }
+    __pyx_t_2 = ((__pyx_v_window_start <= __pyx_v_merged_end) != 0);
+    __pyx_t_3 = __pyx_t_2;
+    __pyx_L21_bool_binop_done:;
+    if (__pyx_t_3) {
 
-        /* "fuzzysearch/_generic_search.pyx":312
- *                 c_max_substitutions, c_max_insertions, c_max_deletions, c_max_l_dist,
- *             ):
- *                 matches.append(attr.evolve(match,             # <<<<<<<<<<<<<<
- *                     start=match.start + small_search_start_index,
- *                     end=match.end + small_search_start_index,
+      /* "fuzzysearch/_generic_search.pyx":551
+ *     for window_start, window_end in windows:
+ *         if merged_end != -1 and window_start <= merged_end:
+ *             if window_end > merged_end:             # <<<<<<<<<<<<<<
+ *                 merged_end = window_end
+ *             continue
  */
-        __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_attr); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 312, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_6);
-        __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_evolve); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 312, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_1);
-        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-        __pyx_t_6 = PyTuple_New(1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 312, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_6);
-        __Pyx_INCREF(__pyx_v_match);
-        __Pyx_GIVEREF(__pyx_v_match);
-        PyTuple_SET_ITEM(__pyx_t_6, 0, __pyx_v_match);
-
-        /* "fuzzysearch/_generic_search.pyx":313
- *             ):
- *                 matches.append(attr.evolve(match,
- *                     start=match.start + small_search_start_index,             # <<<<<<<<<<<<<<
- *                     end=match.end + small_search_start_index,
- *                 ))
- */
-        __pyx_t_4 = __Pyx_PyDict_NewPresized(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 313, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_4);
-        __pyx_t_8 = __Pyx_PyObject_GetAttrStr(__pyx_v_match, __pyx_n_s_start); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 313, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_8);
-        __pyx_t_20 = __Pyx_PyInt_From_int(__pyx_v_small_search_start_index); if (unlikely(!__pyx_t_20)) __PYX_ERR(0, 313, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_20);
-        __pyx_t_21 = PyNumber_Add(__pyx_t_8, __pyx_t_20); if (unlikely(!__pyx_t_21)) __PYX_ERR(0, 313, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_21);
-        __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-        __Pyx_DECREF(__pyx_t_20); __pyx_t_20 = 0;
-        if (PyDict_SetItem(__pyx_t_4, __pyx_n_s_start, __pyx_t_21) < 0) __PYX_ERR(0, 313, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_21); __pyx_t_21 = 0;
-
-        /* "fuzzysearch/_generic_search.pyx":314
- *                 matches.append(attr.evolve(match,
- *                     start=match.start + small_search_start_index,
- *                     end=match.end + small_search_start_index,             # <<<<<<<<<<<<<<
- *                 ))
- *             match_ptr = <char *>simple_memmem_with_needle_sum(
+      __pyx_t_3 = ((__pyx_v_window_end > __pyx_v_merged_end) != 0);
+      if (__pyx_t_3) {
+
+        /* "fuzzysearch/_generic_search.pyx":552
+ *         if merged_end != -1 and window_start <= merged_end:
+ *             if window_end > merged_end:
+ *                 merged_end = window_end             # <<<<<<<<<<<<<<
+ *             continue
+ *         if merged_end != -1:
  */
-        __pyx_t_21 = __Pyx_PyObject_GetAttrStr(__pyx_v_match, __pyx_n_s_end); if (unlikely(!__pyx_t_21)) __PYX_ERR(0, 314, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_21);
-        __pyx_t_20 = __Pyx_PyInt_From_int(__pyx_v_small_search_start_index); if (unlikely(!__pyx_t_20)) __PYX_ERR(0, 314, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_20);
-        __pyx_t_8 = PyNumber_Add(__pyx_t_21, __pyx_t_20); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 314, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_8);
-        __Pyx_DECREF(__pyx_t_21); __pyx_t_21 = 0;
-        __Pyx_DECREF(__pyx_t_20); __pyx_t_20 = 0;
-        if (PyDict_SetItem(__pyx_t_4, __pyx_n_s_end, __pyx_t_8) < 0) __PYX_ERR(0, 313, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-
-        /* "fuzzysearch/_generic_search.pyx":312
- *                 c_max_substitutions, c_max_insertions, c_max_deletions, c_max_l_dist,
- *             ):
- *                 matches.append(attr.evolve(match,             # <<<<<<<<<<<<<<
- *                     start=match.start + small_search_start_index,
- *                     end=match.end + small_search_start_index,
- */
-        __pyx_t_8 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_6, __pyx_t_4); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 312, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_8);
-        __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-        __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-        __pyx_t_22 = __Pyx_PyList_Append(__pyx_v_matches, __pyx_t_8); if (unlikely(__pyx_t_22 == ((int)-1))) __PYX_ERR(0, 312, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-
-        /* "fuzzysearch/_generic_search.pyx":306
- *                 small_search_length = _seq_len - small_search_start_index
- *             # try to expand left and/or right according to n_ngram
- *             for match in _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
- *                 c_subsequence, _subseq_len,
- *                 c_sequence + small_search_start_index,
+        __pyx_v_merged_end = __pyx_v_window_end;
+
+        /* "fuzzysearch/_generic_search.pyx":551
+ *     for window_start, window_end in windows:
+ *         if merged_end != -1 and window_start <= merged_end:
+ *             if window_end > merged_end:             # <<<<<<<<<<<<<<
+ *                 merged_end = window_end
+ *             continue
  */
       }
+
+      /* "fuzzysearch/_generic_search.pyx":553
+ *             if window_end > merged_end:
+ *                 merged_end = window_end
+ *             continue             # <<<<<<<<<<<<<<
+ *         if merged_end != -1:
+ *             merged_windows.append((merged_start, merged_end))
+ */
+      goto __pyx_L16_continue;
+
+      /* "fuzzysearch/_generic_search.pyx":550
+ *     merged_windows = []
+ *     for window_start, window_end in windows:
+ *         if merged_end != -1 and window_start <= merged_end:             # <<<<<<<<<<<<<<
+ *             if window_end > merged_end:
+ *                 merged_end = window_end
+ */
+    }
+
+    /* "fuzzysearch/_generic_search.pyx":554
+ *                 merged_end = window_end
+ *             continue
+ *         if merged_end != -1:             # <<<<<<<<<<<<<<
+ *             merged_windows.append((merged_start, merged_end))
+ *         merged_start, merged_end = window_start, window_end
+ */
+    __pyx_t_3 = ((__pyx_v_merged_end != -1L) != 0);
+    if (__pyx_t_3) {
+
+      /* "fuzzysearch/_generic_search.pyx":555
+ *             continue
+ *         if merged_end != -1:
+ *             merged_windows.append((merged_start, merged_end))             # <<<<<<<<<<<<<<
+ *         merged_start, merged_end = window_start, window_end
+ *     if merged_end != -1:
+ */
+      __pyx_t_6 = PyInt_FromSsize_t(__pyx_v_merged_start); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 555, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      __pyx_t_1 = PyInt_FromSsize_t(__pyx_v_merged_end); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 555, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_1);
+      __pyx_t_7 = PyTuple_New(2); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 555, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_7);
+      __Pyx_GIVEREF(__pyx_t_6);
+      PyTuple_SET_ITEM(__pyx_t_7, 0, __pyx_t_6);
+      __Pyx_GIVEREF(__pyx_t_1);
+      PyTuple_SET_ITEM(__pyx_t_7, 1, __pyx_t_1);
+      __pyx_t_6 = 0;
+      __pyx_t_1 = 0;
+      __pyx_t_19 = __Pyx_PyList_Append(__pyx_v_merged_windows, __pyx_t_7); if (unlikely(__pyx_t_19 == ((int)-1))) __PYX_ERR(0, 555, __pyx_L1_error)
       __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
 
-      /* "fuzzysearch/_generic_search.pyx":316
- *                     end=match.end + small_search_start_index,
- *                 ))
- *             match_ptr = <char *>simple_memmem_with_needle_sum(             # <<<<<<<<<<<<<<
- *                 <char *>match_ptr + 1, _seq_len - (match_ptr - c_sequence) - 1,
- *                 <char *>c_subsequence + ngram_start, ngram_len,
+      /* "fuzzysearch/_generic_search.pyx":554
+ *                 merged_end = window_end
+ *             continue
+ *         if merged_end != -1:             # <<<<<<<<<<<<<<
+ *             merged_windows.append((merged_start, merged_end))
+ *         merged_start, merged_end = window_start, window_end
  */
-      __pyx_v_match_ptr = ((char *)simple_memmem_with_needle_sum((((char *)__pyx_v_match_ptr) + 1), ((__pyx_v__seq_len - (__pyx_v_match_ptr - __pyx_v_c_sequence)) - 1), (((char *)__pyx_v_c_subsequence) + __pyx_v_ngram_start), __pyx_v_ngram_len, __pyx_v_subseq_sum));
     }
 
-    /* "fuzzysearch/_generic_search.pyx":287
+    /* "fuzzysearch/_generic_search.pyx":556
+ *         if merged_end != -1:
+ *             merged_windows.append((merged_start, merged_end))
+ *         merged_start, merged_end = window_start, window_end             # <<<<<<<<<<<<<<
+ *     if merged_end != -1:
+ *         merged_windows.append((merged_start, merged_end))
+ */
+    __pyx_t_21 = __pyx_v_window_start;
+    __pyx_t_20 = __pyx_v_window_end;
+    __pyx_v_merged_start = __pyx_t_21;
+    __pyx_v_merged_end = __pyx_t_20;
+
+    /* "fuzzysearch/_generic_search.pyx":549
+ *     windows.sort()
+ *     merged_windows = []
+ *     for window_start, window_end in windows:             # <<<<<<<<<<<<<<
+ *         if merged_end != -1 and window_start <= merged_end:
+ *             if window_end > merged_end:
+ */
+    __pyx_L16_continue:;
+  }
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":557
+ *             merged_windows.append((merged_start, merged_end))
+ *         merged_start, merged_end = window_start, window_end
+ *     if merged_end != -1:             # <<<<<<<<<<<<<<
+ *         merged_windows.append((merged_start, merged_end))
+ * 
+ */
+  __pyx_t_3 = ((__pyx_v_merged_end != -1L) != 0);
+  if (__pyx_t_3) {
+
+    /* "fuzzysearch/_generic_search.pyx":558
+ *         merged_start, merged_end = window_start, window_end
+ *     if merged_end != -1:
+ *         merged_windows.append((merged_start, merged_end))             # <<<<<<<<<<<<<<
+ * 
+ *     # search the windows directly in the sequence
+ */
+    __pyx_t_5 = PyInt_FromSsize_t(__pyx_v_merged_start); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 558, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    __pyx_t_7 = PyInt_FromSsize_t(__pyx_v_merged_end); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 558, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+    __pyx_t_1 = PyTuple_New(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 558, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_GIVEREF(__pyx_t_5);
+    PyTuple_SET_ITEM(__pyx_t_1, 0, __pyx_t_5);
+    __Pyx_GIVEREF(__pyx_t_7);
+    PyTuple_SET_ITEM(__pyx_t_1, 1, __pyx_t_7);
+    __pyx_t_5 = 0;
+    __pyx_t_7 = 0;
+    __pyx_t_19 = __Pyx_PyList_Append(__pyx_v_merged_windows, __pyx_t_1); if (unlikely(__pyx_t_19 == ((int)-1))) __PYX_ERR(0, 558, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+    /* "fuzzysearch/_generic_search.pyx":557
+ *             merged_windows.append((merged_start, merged_end))
+ *         merged_start, merged_end = window_start, window_end
+ *     if merged_end != -1:             # <<<<<<<<<<<<<<
+ *         merged_windows.append((merged_start, merged_end))
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_generic_search.pyx":561
  * 
+ *     # search the windows directly in the sequence
+ *     matches = []             # <<<<<<<<<<<<<<
+ *     for merged_start, merged_end in merged_windows:
+ *         window_matches = _c_find_near_matches_generic_linear_programming(
+ */
+  __pyx_t_1 = PyList_New(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 561, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_v_matches = ((PyObject*)__pyx_t_1);
+  __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":562
+ *     # search the windows directly in the sequence
  *     matches = []
- *     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):             # <<<<<<<<<<<<<<
- *         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
+ *     for merged_start, merged_end in merged_windows:             # <<<<<<<<<<<<<<
+ *         window_matches = _c_find_near_matches_generic_linear_programming(
+ *             c_subsequence, _subseq_len,
+ */
+  __pyx_t_1 = __pyx_v_merged_windows; __Pyx_INCREF(__pyx_t_1); __pyx_t_10 = 0;
+  for (;;) {
+    if (__pyx_t_10 >= PyList_GET_SIZE(__pyx_t_1)) break;
+    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    __pyx_t_7 = PyList_GET_ITEM(__pyx_t_1, __pyx_t_10); __Pyx_INCREF(__pyx_t_7); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 562, __pyx_L1_error)
+    #else
+    __pyx_t_7 = PySequence_ITEM(__pyx_t_1, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 562, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+    #endif
+    if ((likely(PyTuple_CheckExact(__pyx_t_7))) || (PyList_CheckExact(__pyx_t_7))) {
+      PyObject* sequence = __pyx_t_7;
+      Py_ssize_t size = __Pyx_PySequence_SIZE(sequence);
+      if (unlikely(size != 2)) {
+        if (size > 2) __Pyx_RaiseTooManyValuesError(2);
+        else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
+        __PYX_ERR(0, 562, __pyx_L1_error)
+      }
+      #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+      if (likely(PyTuple_CheckExact(sequence))) {
+        __pyx_t_5 = PyTuple_GET_ITEM(sequence, 0); 
+        __pyx_t_6 = PyTuple_GET_ITEM(sequence, 1); 
+      } else {
+        __pyx_t_5 = PyList_GET_ITEM(sequence, 0); 
+        __pyx_t_6 = PyList_GET_ITEM(sequence, 1); 
+      }
+      __Pyx_INCREF(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_6);
+      #else
+      __pyx_t_5 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 562, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __pyx_t_6 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 562, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      #endif
+      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+    } else {
+      Py_ssize_t index = -1;
+      __pyx_t_4 = PyObject_GetIter(__pyx_t_7); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 562, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_4);
+      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+      __pyx_t_9 = Py_TYPE(__pyx_t_4)->tp_iternext;
+      index = 0; __pyx_t_5 = __pyx_t_9(__pyx_t_4); if (unlikely(!__pyx_t_5)) goto __pyx_L28_unpacking_failed;
+      __Pyx_GOTREF(__pyx_t_5);
+      index = 1; __pyx_t_6 = __pyx_t_9(__pyx_t_4); if (unlikely(!__pyx_t_6)) goto __pyx_L28_unpacking_failed;
+      __Pyx_GOTREF(__pyx_t_6);
+      if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_4), 2) < 0) __PYX_ERR(0, 562, __pyx_L1_error)
+      __pyx_t_9 = NULL;
+      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      goto __pyx_L29_unpacking_done;
+      __pyx_L28_unpacking_failed:;
+      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      __pyx_t_9 = NULL;
+      if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
+      __PYX_ERR(0, 562, __pyx_L1_error)
+      __pyx_L29_unpacking_done:;
+    }
+    __pyx_t_20 = __Pyx_PyIndex_AsSsize_t(__pyx_t_5); if (unlikely((__pyx_t_20 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 562, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+    __pyx_t_21 = __Pyx_PyIndex_AsSsize_t(__pyx_t_6); if (unlikely((__pyx_t_21 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 562, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __pyx_v_merged_start = __pyx_t_20;
+    __pyx_v_merged_end = __pyx_t_21;
+
+    /* "fuzzysearch/_generic_search.pyx":563
+ *     matches = []
+ *     for merged_start, merged_end in merged_windows:
+ *         window_matches = _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
+ *             c_subsequence, _subseq_len,
+ *             c_sequence + merged_start, merged_end - merged_start,
+ */
+    __pyx_t_7 = __pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(__pyx_v_c_subsequence, __pyx_v__subseq_len, (__pyx_v_c_sequence + __pyx_v_merged_start), (__pyx_v_merged_end - __pyx_v_merged_start), __pyx_v_c_max_substitutions, __pyx_v_c_max_insertions, __pyx_v_c_max_deletions, __pyx_v_c_max_l_dist, 0, __pyx_v_merged_start, NULL, __pyx_v_c_max_candidates, 0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 563, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+    __Pyx_XDECREF_SET(__pyx_v_window_matches, __pyx_t_7);
+    __pyx_t_7 = 0;
+
+    /* "fuzzysearch/_generic_search.pyx":569
+ *             0, merged_start, NULL, c_max_candidates, False,
+ *         )
+ *         if window_matches is None:             # <<<<<<<<<<<<<<
+ *             # too many candidates; search the window again, pruning
+ *             # candidates with different starts together
+ */
+    __pyx_t_3 = (__pyx_v_window_matches == Py_None);
+    __pyx_t_2 = (__pyx_t_3 != 0);
+    if (__pyx_t_2) {
+
+      /* "fuzzysearch/_generic_search.pyx":572
+ *             # too many candidates; search the window again, pruning
+ *             # candidates with different starts together
+ *             window_matches = _c_find_near_matches_generic_linear_programming(             # <<<<<<<<<<<<<<
+ *                 c_subsequence, _subseq_len,
+ *                 c_sequence + merged_start, merged_end - merged_start,
+ */
+      __pyx_t_7 = __pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming(__pyx_v_c_subsequence, __pyx_v__subseq_len, (__pyx_v_c_sequence + __pyx_v_merged_start), (__pyx_v_merged_end - __pyx_v_merged_start), __pyx_v_c_max_substitutions, __pyx_v_c_max_insertions, __pyx_v_c_max_deletions, __pyx_v_c_max_l_dist, 0, __pyx_v_merged_start, NULL, SIZE_MAX, 1); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 572, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_7);
+      __Pyx_DECREF_SET(__pyx_v_window_matches, __pyx_t_7);
+      __pyx_t_7 = 0;
+
+      /* "fuzzysearch/_generic_search.pyx":569
+ *             0, merged_start, NULL, c_max_candidates, False,
+ *         )
+ *         if window_matches is None:             # <<<<<<<<<<<<<<
+ *             # too many candidates; search the window again, pruning
+ *             # candidates with different starts together
+ */
+    }
+
+    /* "fuzzysearch/_generic_search.pyx":578
+ *                 0, merged_start, NULL, SIZE_MAX, True,
+ *             )
+ *         matches.extend(window_matches)             # <<<<<<<<<<<<<<
  * 
+ *     return matches
+ */
+    __pyx_t_19 = __Pyx_PyList_Extend(__pyx_v_matches, __pyx_v_window_matches); if (unlikely(__pyx_t_19 == ((int)-1))) __PYX_ERR(0, 578, __pyx_L1_error)
+
+    /* "fuzzysearch/_generic_search.pyx":562
+ *     # search the windows directly in the sequence
+ *     matches = []
+ *     for merged_start, merged_end in merged_windows:             # <<<<<<<<<<<<<<
+ *         window_matches = _c_find_near_matches_generic_linear_programming(
+ *             c_subsequence, _subseq_len,
  */
   }
-  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":321
- *                 subseq_sum)
+  /* "fuzzysearch/_generic_search.pyx":580
+ *         matches.extend(window_matches)
  * 
  *     return matches             # <<<<<<<<<<<<<<
  */
@@ -4481,12 +7022,12 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   __pyx_r = __pyx_v_matches;
   goto __pyx_L0;
 
-  /* "fuzzysearch/_generic_search.pyx":237
+  /* "fuzzysearch/_generic_search.pyx":462
  * 
  * 
- * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
+ * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                        max_candidates=None):
  *     """search for near-matches of subsequence in sequence
- * 
  */
 
   /* function exit code */
@@ -4497,8 +7038,6 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   __Pyx_XDECREF(__pyx_t_6);
   __Pyx_XDECREF(__pyx_t_7);
   __Pyx_XDECREF(__pyx_t_8);
-  __Pyx_XDECREF(__pyx_t_20);
-  __Pyx_XDECREF(__pyx_t_21);
   __Pyx_AddTraceback("fuzzysearch._generic_search.c_find_near_matches_generic_ngrams", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __pyx_r = NULL;
   __pyx_L0:;
@@ -4506,9 +7045,10 @@ static PyObject *__pyx_pf_11fuzzysearch_15_generic_search_2c_find_near_matches_g
   __Pyx_XDECREF(__pyx_v_max_insertions);
   __Pyx_XDECREF(__pyx_v_max_deletions);
   __Pyx_XDECREF(__pyx_v_max_l_dist);
+  __Pyx_XDECREF(__pyx_v_windows);
+  __Pyx_XDECREF(__pyx_v_merged_windows);
   __Pyx_XDECREF(__pyx_v_matches);
-  __Pyx_XDECREF(__pyx_v_small_search_length);
-  __Pyx_XDECREF(__pyx_v_match);
+  __Pyx_XDECREF(__pyx_v_window_matches);
   __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
@@ -4679,76 +7219,101 @@ static struct PyModuleDef __pyx_moduledef = {
 
 static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_ALLOWED_TYPES, __pyx_k_ALLOWED_TYPES, sizeof(__pyx_k_ALLOWED_TYPES), 0, 0, 1, 1},
+  {&__pyx_n_s_EnoughMatches, __pyx_k_EnoughMatches, sizeof(__pyx_k_EnoughMatches), 0, 0, 1, 1},
   {&__pyx_kp_s_Given_subsequence_is_empty, __pyx_k_Given_subsequence_is_empty, sizeof(__pyx_k_Given_subsequence_is_empty), 0, 0, 1, 0},
   {&__pyx_n_s_Match, __pyx_k_Match, sizeof(__pyx_k_Match), 0, 0, 1, 1},
   {&__pyx_n_s_MemoryError, __pyx_k_MemoryError, sizeof(__pyx_k_MemoryError), 0, 0, 1, 1},
+  {&__pyx_kp_s_Raised_internally_to_stop_search, __pyx_k_Raised_internally_to_stop_search, sizeof(__pyx_k_Raised_internally_to_stop_search), 0, 0, 1, 0},
   {&__pyx_n_s_TypeError, __pyx_k_TypeError, sizeof(__pyx_k_TypeError), 0, 0, 1, 1},
   {&__pyx_n_s_ValueError, __pyx_k_ValueError, sizeof(__pyx_k_ValueError), 0, 0, 1, 1},
   {&__pyx_n_s_add_match, __pyx_k_add_match, sizeof(__pyx_k_add_match), 0, 0, 1, 1},
   {&__pyx_n_s_all, __pyx_k_all, sizeof(__pyx_k_all), 0, 0, 1, 1},
-  {&__pyx_n_s_attr, __pyx_k_attr, sizeof(__pyx_k_attr), 0, 0, 1, 1},
+  {&__pyx_kp_s_an_equivalence_table_must_be_of, __pyx_k_an_equivalence_table_must_be_of, sizeof(__pyx_k_an_equivalence_table_must_be_of), 0, 0, 1, 0},
   {&__pyx_n_s_c_find_near_matches_generic_lin, __pyx_k_c_find_near_matches_generic_lin, sizeof(__pyx_k_c_find_near_matches_generic_lin), 0, 0, 1, 1},
   {&__pyx_n_s_c_find_near_matches_generic_line, __pyx_k_c_find_near_matches_generic_line, sizeof(__pyx_k_c_find_near_matches_generic_line), 0, 0, 1, 1},
   {&__pyx_n_s_c_find_near_matches_generic_ngra, __pyx_k_c_find_near_matches_generic_ngra, sizeof(__pyx_k_c_find_near_matches_generic_ngra), 0, 0, 1, 1},
+  {&__pyx_n_s_c_generic_linear_programming, __pyx_k_c_generic_linear_programming, sizeof(__pyx_k_c_generic_linear_programming), 0, 0, 1, 1},
+  {&__pyx_n_s_c_has_near_match_generic_linear, __pyx_k_c_has_near_match_generic_linear, sizeof(__pyx_k_c_has_near_match_generic_linear), 0, 0, 1, 1},
+  {&__pyx_n_s_c_max_candidates, __pyx_k_c_max_candidates, sizeof(__pyx_k_c_max_candidates), 0, 0, 1, 1},
   {&__pyx_n_s_c_max_deletions, __pyx_k_c_max_deletions, sizeof(__pyx_k_c_max_deletions), 0, 0, 1, 1},
   {&__pyx_n_s_c_max_insertions, __pyx_k_c_max_insertions, sizeof(__pyx_k_c_max_insertions), 0, 0, 1, 1},
   {&__pyx_n_s_c_max_l_dist, __pyx_k_c_max_l_dist, sizeof(__pyx_k_c_max_l_dist), 0, 0, 1, 1},
   {&__pyx_n_s_c_max_substitutions, __pyx_k_c_max_substitutions, sizeof(__pyx_k_c_max_substitutions), 0, 0, 1, 1},
   {&__pyx_n_s_c_sequence, __pyx_k_c_sequence, sizeof(__pyx_k_c_sequence), 0, 0, 1, 1},
   {&__pyx_n_s_c_subsequence, __pyx_k_c_subsequence, sizeof(__pyx_k_c_subsequence), 0, 0, 1, 1},
+  {&__pyx_n_s_clamp_index_range, __pyx_k_clamp_index_range, sizeof(__pyx_k_clamp_index_range), 0, 0, 1, 1},
   {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
   {&__pyx_n_s_dist, __pyx_k_dist, sizeof(__pyx_k_dist), 0, 0, 1, 1},
+  {&__pyx_n_s_doc, __pyx_k_doc, sizeof(__pyx_k_doc), 0, 0, 1, 1},
   {&__pyx_n_s_end, __pyx_k_end, sizeof(__pyx_k_end), 0, 0, 1, 1},
-  {&__pyx_n_s_evolve, __pyx_k_evolve, sizeof(__pyx_k_evolve), 0, 0, 1, 1},
+  {&__pyx_n_s_end_index, __pyx_k_end_index, sizeof(__pyx_k_end_index), 0, 0, 1, 1},
+  {&__pyx_n_s_equivalences, __pyx_k_equivalences, sizeof(__pyx_k_equivalences), 0, 0, 1, 1},
   {&__pyx_n_s_fuzzysearch__generic_search, __pyx_k_fuzzysearch__generic_search, sizeof(__pyx_k_fuzzysearch__generic_search), 0, 0, 1, 1},
   {&__pyx_n_s_fuzzysearch_common, __pyx_k_fuzzysearch_common, sizeof(__pyx_k_fuzzysearch_common), 0, 0, 1, 1},
+  {&__pyx_n_s_fuzzysearch_instrumentation, __pyx_k_fuzzysearch_instrumentation, sizeof(__pyx_k_fuzzysearch_instrumentation), 0, 0, 1, 1},
   {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
   {&__pyx_n_s_index, __pyx_k_index, sizeof(__pyx_k_index), 0, 0, 1, 1},
   {&__pyx_n_s_l_dist, __pyx_k_l_dist, sizeof(__pyx_k_l_dist), 0, 0, 1, 1},
+  {&__pyx_n_s_lp_candidates_limit, __pyx_k_lp_candidates_limit, sizeof(__pyx_k_lp_candidates_limit), 0, 0, 1, 1},
   {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
-  {&__pyx_n_s_match, __pyx_k_match, sizeof(__pyx_k_match), 0, 0, 1, 1},
   {&__pyx_n_s_match_ptr, __pyx_k_match_ptr, sizeof(__pyx_k_match_ptr), 0, 0, 1, 1},
   {&__pyx_n_s_matched, __pyx_k_matched, sizeof(__pyx_k_matched), 0, 0, 1, 1},
   {&__pyx_n_s_matches, __pyx_k_matches, sizeof(__pyx_k_matches), 0, 0, 1, 1},
+  {&__pyx_n_s_max_candidates, __pyx_k_max_candidates, sizeof(__pyx_k_max_candidates), 0, 0, 1, 1},
   {&__pyx_n_s_max_deletions, __pyx_k_max_deletions, sizeof(__pyx_k_max_deletions), 0, 0, 1, 1},
   {&__pyx_n_s_max_insertions, __pyx_k_max_insertions, sizeof(__pyx_k_max_insertions), 0, 0, 1, 1},
   {&__pyx_n_s_max_l_dist, __pyx_k_max_l_dist, sizeof(__pyx_k_max_l_dist), 0, 0, 1, 1},
   {&__pyx_n_s_max_substitutions, __pyx_k_max_substitutions, sizeof(__pyx_k_max_substitutions), 0, 0, 1, 1},
+  {&__pyx_n_s_merge_starts, __pyx_k_merge_starts, sizeof(__pyx_k_merge_starts), 0, 0, 1, 1},
+  {&__pyx_n_s_merged_end, __pyx_k_merged_end, sizeof(__pyx_k_merged_end), 0, 0, 1, 1},
+  {&__pyx_n_s_merged_start, __pyx_k_merged_start, sizeof(__pyx_k_merged_start), 0, 0, 1, 1},
+  {&__pyx_n_s_merged_windows, __pyx_k_merged_windows, sizeof(__pyx_k_merged_windows), 0, 0, 1, 1},
+  {&__pyx_n_s_metaclass, __pyx_k_metaclass, sizeof(__pyx_k_metaclass), 0, 0, 1, 1},
+  {&__pyx_n_s_module, __pyx_k_module, sizeof(__pyx_k_module), 0, 0, 1, 1},
+  {&__pyx_n_s_n_candidates, __pyx_k_n_candidates, sizeof(__pyx_k_n_candidates), 0, 0, 1, 1},
   {&__pyx_n_s_n_dels, __pyx_k_n_dels, sizeof(__pyx_k_n_dels), 0, 0, 1, 1},
   {&__pyx_n_s_n_ins, __pyx_k_n_ins, sizeof(__pyx_k_n_ins), 0, 0, 1, 1},
   {&__pyx_n_s_n_subs, __pyx_k_n_subs, sizeof(__pyx_k_n_subs), 0, 0, 1, 1},
   {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
   {&__pyx_n_s_ngram_len, __pyx_k_ngram_len, sizeof(__pyx_k_ngram_len), 0, 0, 1, 1},
   {&__pyx_n_s_ngram_start, __pyx_k_ngram_start, sizeof(__pyx_k_ngram_start), 0, 0, 1, 1},
+  {&__pyx_n_s_prepare, __pyx_k_prepare, sizeof(__pyx_k_prepare), 0, 0, 1, 1},
+  {&__pyx_n_s_qualname, __pyx_k_qualname, sizeof(__pyx_k_qualname), 0, 0, 1, 1},
   {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
+  {&__pyx_n_s_report_event, __pyx_k_report_event, sizeof(__pyx_k_report_event), 0, 0, 1, 1},
+  {&__pyx_n_s_search, __pyx_k_search, sizeof(__pyx_k_search), 0, 0, 1, 1},
   {&__pyx_n_s_search_params, __pyx_k_search_params, sizeof(__pyx_k_search_params), 0, 0, 1, 1},
   {&__pyx_n_s_seq_len, __pyx_k_seq_len, sizeof(__pyx_k_seq_len), 0, 0, 1, 1},
   {&__pyx_n_s_sequence, __pyx_k_sequence, sizeof(__pyx_k_sequence), 0, 0, 1, 1},
   {&__pyx_kp_s_sequence_is_of_invalid_type_s, __pyx_k_sequence_is_of_invalid_type_s, sizeof(__pyx_k_sequence_is_of_invalid_type_s), 0, 0, 1, 0},
-  {&__pyx_n_s_small_search_length, __pyx_k_small_search_length, sizeof(__pyx_k_small_search_length), 0, 0, 1, 1},
-  {&__pyx_n_s_small_search_start_index, __pyx_k_small_search_start_index, sizeof(__pyx_k_small_search_start_index), 0, 0, 1, 1},
   {&__pyx_kp_s_src_fuzzysearch__generic_search, __pyx_k_src_fuzzysearch__generic_search, sizeof(__pyx_k_src_fuzzysearch__generic_search), 0, 0, 1, 0},
   {&__pyx_n_s_start, __pyx_k_start, sizeof(__pyx_k_start), 0, 0, 1, 1},
+  {&__pyx_n_s_start_index, __pyx_k_start_index, sizeof(__pyx_k_start_index), 0, 0, 1, 1},
   {&__pyx_n_s_subseq_index, __pyx_k_subseq_index, sizeof(__pyx_k_subseq_index), 0, 0, 1, 1},
   {&__pyx_n_s_subseq_len, __pyx_k_subseq_len, sizeof(__pyx_k_subseq_len), 0, 0, 1, 1},
   {&__pyx_n_s_subseq_len_minus_one, __pyx_k_subseq_len_minus_one, sizeof(__pyx_k_subseq_len_minus_one), 0, 0, 1, 1},
   {&__pyx_n_s_subseq_sum, __pyx_k_subseq_sum, sizeof(__pyx_k_subseq_sum), 0, 0, 1, 1},
   {&__pyx_n_s_subsequence, __pyx_k_subsequence, sizeof(__pyx_k_subsequence), 0, 0, 1, 1},
   {&__pyx_kp_s_subsequence_is_of_invalid_type_s, __pyx_k_subsequence_is_of_invalid_type_s, sizeof(__pyx_k_subsequence_is_of_invalid_type_s), 0, 0, 1, 0},
+  {&__pyx_n_s_table, __pyx_k_table, sizeof(__pyx_k_table), 0, 0, 1, 1},
   {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
   {&__pyx_kp_s_the_subsequence_length_must_be_g, __pyx_k_the_subsequence_length_must_be_g, sizeof(__pyx_k_the_subsequence_length_must_be_g), 0, 0, 1, 0},
   {&__pyx_n_s_unpacked, __pyx_k_unpacked, sizeof(__pyx_k_unpacked), 0, 0, 1, 1},
+  {&__pyx_n_s_window_end, __pyx_k_window_end, sizeof(__pyx_k_window_end), 0, 0, 1, 1},
+  {&__pyx_n_s_window_matches, __pyx_k_window_matches, sizeof(__pyx_k_window_matches), 0, 0, 1, 1},
+  {&__pyx_n_s_window_start, __pyx_k_window_start, sizeof(__pyx_k_window_start), 0, 0, 1, 1},
+  {&__pyx_n_s_windows, __pyx_k_windows, sizeof(__pyx_k_windows), 0, 0, 1, 1},
   {&__pyx_n_s_xrange, __pyx_k_xrange, sizeof(__pyx_k_xrange), 0, 0, 1, 1},
   {0, 0, 0, 0, 0, 0, 0}
 };
 static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
-  __pyx_builtin_TypeError = __Pyx_GetBuiltinName(__pyx_n_s_TypeError); if (!__pyx_builtin_TypeError) __PYX_ERR(0, 37, __pyx_L1_error)
-  __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(0, 42, __pyx_L1_error)
-  __pyx_builtin_MemoryError = __Pyx_GetBuiltinName(__pyx_n_s_MemoryError); if (!__pyx_builtin_MemoryError) __PYX_ERR(0, 83, __pyx_L1_error)
+  __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(0, 41, __pyx_L1_error)
+  __pyx_builtin_TypeError = __Pyx_GetBuiltinName(__pyx_n_s_TypeError); if (!__pyx_builtin_TypeError) __PYX_ERR(0, 79, __pyx_L1_error)
+  __pyx_builtin_MemoryError = __Pyx_GetBuiltinName(__pyx_n_s_MemoryError); if (!__pyx_builtin_MemoryError) __PYX_ERR(0, 259, __pyx_L1_error)
   #if PY_MAJOR_VERSION >= 3
-  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_xrange) __PYX_ERR(0, 104, __pyx_L1_error)
+  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_xrange) __PYX_ERR(0, 260, __pyx_L1_error)
   #else
-  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_xrange); if (!__pyx_builtin_xrange) __PYX_ERR(0, 104, __pyx_L1_error)
+  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_xrange); if (!__pyx_builtin_xrange) __PYX_ERR(0, 260, __pyx_L1_error)
   #endif
   return 0;
   __pyx_L1_error:;
@@ -4759,63 +7324,97 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
 
-  /* "fuzzysearch/_generic_search.pyx":42
+  /* "fuzzysearch/_generic_search.pyx":41
+ *     cdef const char *table = equivalences.table
+ *     if len(equivalences.table) != 256 * 256:
+ *         raise ValueError('an equivalence table must be of length 256*256')             # <<<<<<<<<<<<<<
+ *     return <const unsigned char *> table
+ * 
+ */
+  __pyx_tuple_ = PyTuple_Pack(1, __pyx_kp_s_an_equivalence_table_must_be_of); if (unlikely(!__pyx_tuple_)) __PYX_ERR(0, 41, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple_);
+  __Pyx_GIVEREF(__pyx_tuple_);
+
+  /* "fuzzysearch/_generic_search.pyx":84
  * 
  *     if not subsequence:
  *         raise ValueError('Given subsequence is empty!')             # <<<<<<<<<<<<<<
  * 
  *     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
  */
-  __pyx_tuple_ = PyTuple_Pack(1, __pyx_kp_s_Given_subsequence_is_empty); if (unlikely(!__pyx_tuple_)) __PYX_ERR(0, 42, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple_);
-  __Pyx_GIVEREF(__pyx_tuple_);
+  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_kp_s_Given_subsequence_is_empty); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(0, 84, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__2);
+  __Pyx_GIVEREF(__pyx_tuple__2);
 
-  /* "fuzzysearch/_generic_search.pyx":90
+  /* "fuzzysearch/_generic_search.pyx":264
  * 
  *     matches = []
  *     def add_match(start, end, dist):             # <<<<<<<<<<<<<<
- *         matches.append(Match(start, end, dist, matched=sequence[start:end]))
+ *         matches.append(Match(start + index_offset, end + index_offset, dist,
+ *                              matched=sequence[start:end]))
+ */
+  __pyx_tuple__3 = PyTuple_Pack(3, __pyx_n_s_start, __pyx_n_s_end, __pyx_n_s_dist); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(0, 264, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__3);
+  __Pyx_GIVEREF(__pyx_tuple__3);
+  __pyx_codeobj__4 = (PyObject*)__Pyx_PyCode_New(3, 0, 3, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__3, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_add_match, 264, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__4)) __PYX_ERR(0, 264, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":417
  * 
+ *             if not merge_starts and n_new_candidates > max_candidates:
+ *                 report_event('lp_candidates_limit',             # <<<<<<<<<<<<<<
+ *                              search='c_generic_linear_programming',
+ *                              index=index + index_offset,
  */
-  __pyx_tuple__2 = PyTuple_Pack(3, __pyx_n_s_start, __pyx_n_s_end, __pyx_n_s_dist); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(0, 90, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__2);
-  __Pyx_GIVEREF(__pyx_tuple__2);
-  __pyx_codeobj__3 = (PyObject*)__Pyx_PyCode_New(3, 0, 3, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__2, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_add_match, 90, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__3)) __PYX_ERR(0, 90, __pyx_L1_error)
+  __pyx_tuple__5 = PyTuple_Pack(1, __pyx_n_s_lp_candidates_limit); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 417, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__5);
+  __Pyx_GIVEREF(__pyx_tuple__5);
 
-  /* "fuzzysearch/_generic_search.pyx":278
+  /* "fuzzysearch/_generic_search.pyx":510
  *     cdef size_t ngram_len = _subseq_len // (c_max_l_dist + 1)
  *     if ngram_len == 0:
  *         raise ValueError('the subsequence length must be greater than max_l_dist')             # <<<<<<<<<<<<<<
  * 
- *     cdef int index, small_search_start_index
+ *     cdef Py_ssize_t window_start, window_end
  */
-  __pyx_tuple__4 = PyTuple_Pack(1, __pyx_kp_s_the_subsequence_length_must_be_g); if (unlikely(!__pyx_tuple__4)) __PYX_ERR(0, 278, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__4);
-  __Pyx_GIVEREF(__pyx_tuple__4);
+  __pyx_tuple__6 = PyTuple_Pack(1, __pyx_kp_s_the_subsequence_length_must_be_g); if (unlikely(!__pyx_tuple__6)) __PYX_ERR(0, 510, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__6);
+  __Pyx_GIVEREF(__pyx_tuple__6);
 
-  /* "fuzzysearch/_generic_search.pyx":25
+  /* "fuzzysearch/_generic_search.pyx":52
  * 
  * 
- * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
- *     """search for near-matches of subsequence in sequence
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,
+ */
+  __pyx_tuple__7 = PyTuple_Pack(14, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_search_params, __pyx_n_s_start_index, __pyx_n_s_end_index, __pyx_n_s_equivalences, __pyx_n_s_max_candidates, __pyx_n_s_merge_starts, __pyx_n_s_max_substitutions, __pyx_n_s_max_insertions, __pyx_n_s_max_deletions, __pyx_n_s_max_l_dist, __pyx_n_s_c_subsequence, __pyx_n_s_c_sequence); if (unlikely(!__pyx_tuple__7)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__7);
+  __Pyx_GIVEREF(__pyx_tuple__7);
+  __pyx_codeobj__8 = (PyObject*)__Pyx_PyCode_New(8, 0, 14, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__7, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_c_find_near_matches_generic_line, 52, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__8)) __PYX_ERR(0, 52, __pyx_L1_error)
+
+  /* "fuzzysearch/_generic_search.pyx":106
+ *     )
  * 
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,
  */
-  __pyx_tuple__5 = PyTuple_Pack(9, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_search_params, __pyx_n_s_max_substitutions, __pyx_n_s_max_insertions, __pyx_n_s_max_deletions, __pyx_n_s_max_l_dist, __pyx_n_s_c_subsequence, __pyx_n_s_c_sequence); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 25, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__5);
-  __Pyx_GIVEREF(__pyx_tuple__5);
-  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(3, 0, 9, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_c_find_near_matches_generic_line, 25, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 25, __pyx_L1_error)
+  __pyx_tuple__9 = PyTuple_Pack(14, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_search_params, __pyx_n_s_start_index, __pyx_n_s_end_index, __pyx_n_s_equivalences, __pyx_n_s_max_candidates, __pyx_n_s_max_substitutions, __pyx_n_s_max_insertions, __pyx_n_s_max_deletions, __pyx_n_s_max_l_dist, __pyx_n_s_c_subsequence, __pyx_n_s_c_sequence, __pyx_n_s_matches); if (unlikely(!__pyx_tuple__9)) __PYX_ERR(0, 106, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__9);
+  __Pyx_GIVEREF(__pyx_tuple__9);
+  __pyx_codeobj__10 = (PyObject*)__Pyx_PyCode_New(7, 0, 14, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__9, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_c_has_near_match_generic_linear, 106, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__10)) __PYX_ERR(0, 106, __pyx_L1_error)
 
-  /* "fuzzysearch/_generic_search.pyx":237
+  /* "fuzzysearch/_generic_search.pyx":462
  * 
  * 
- * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
+ * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                        max_candidates=None):
  *     """search for near-matches of subsequence in sequence
- * 
  */
-  __pyx_tuple__7 = PyTuple_Pack(25, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_search_params, __pyx_n_s_max_substitutions, __pyx_n_s_max_insertions, __pyx_n_s_max_deletions, __pyx_n_s_max_l_dist, __pyx_n_s_subseq_len, __pyx_n_s_subseq_len_minus_one, __pyx_n_s_seq_len, __pyx_n_s_c_max_substitutions, __pyx_n_s_c_max_insertions, __pyx_n_s_c_max_deletions, __pyx_n_s_c_max_l_dist, __pyx_n_s_c_sequence, __pyx_n_s_c_subsequence, __pyx_n_s_ngram_len, __pyx_n_s_index, __pyx_n_s_small_search_start_index, __pyx_n_s_ngram_start, __pyx_n_s_match_ptr, __pyx_n_s_subseq_sum, __pyx_n_s_matches, __pyx_n_s_small_search_length, __pyx_n_s_match); if (unlikely(!__pyx_tuple__7)) __PYX_ERR(0, 237, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__7);
-  __Pyx_GIVEREF(__pyx_tuple__7);
-  __pyx_codeobj__8 = (PyObject*)__Pyx_PyCode_New(3, 0, 25, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__7, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_c_find_near_matches_generic_ngra, 237, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__8)) __PYX_ERR(0, 237, __pyx_L1_error)
+  __pyx_tuple__11 = PyTuple_Pack(30, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_search_params, __pyx_n_s_max_candidates, __pyx_n_s_max_substitutions, __pyx_n_s_max_insertions, __pyx_n_s_max_deletions, __pyx_n_s_max_l_dist, __pyx_n_s_subseq_len, __pyx_n_s_subseq_len_minus_one, __pyx_n_s_seq_len, __pyx_n_s_c_max_substitutions, __pyx_n_s_c_max_insertions, __pyx_n_s_c_max_deletions, __pyx_n_s_c_max_l_dist, __pyx_n_s_c_max_candidates, __pyx_n_s_c_sequence, __pyx_n_s_c_subsequence, __pyx_n_s_ngram_len, __pyx_n_s_window_start, __pyx_n_s_window_end, __pyx_n_s_merged_start, __pyx_n_s_merged_end, __pyx_n_s_ngram_start, __pyx_n_s_match_ptr, __pyx_n_s_subseq_sum, __pyx_n_s_windows, __pyx_n_s_merged_windows, __pyx_n_s_matches, __pyx_n_s_window_matches); if (unlikely(!__pyx_tuple__11)) __PYX_ERR(0, 462, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__11);
+  __Pyx_GIVEREF(__pyx_tuple__11);
+  __pyx_codeobj__12 = (PyObject*)__Pyx_PyCode_New(4, 0, 30, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__11, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__generic_search, __pyx_n_s_c_find_near_matches_generic_ngra, 462, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__12)) __PYX_ERR(0, 462, __pyx_L1_error)
   __Pyx_RefNannyFinishContext();
   return 0;
   __pyx_L1_error:;
@@ -4871,7 +7470,7 @@ static int __Pyx_modinit_type_init_code(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
   /*--- Type init code ---*/
-  if (PyType_Ready(&__pyx_type_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming) < 0) __PYX_ERR(0, 61, __pyx_L1_error)
+  if (PyType_Ready(&__pyx_type_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming) < 0) __PYX_ERR(0, 209, __pyx_L1_error)
   #if PY_VERSION_HEX < 0x030800B1
   __pyx_type_11fuzzysearch_15_generic_search___pyx_scope_struct____pyx_f_11fuzzysearch_15_generic_search__c_find_near_matches_generic_linear_programming.tp_print = 0;
   #endif
@@ -5006,6 +7605,8 @@ static CYTHON_SMALL_CODE int __pyx_pymod_exec__generic_search(PyObject *__pyx_py
 {
   PyObject *__pyx_t_1 = NULL;
   PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -5112,104 +7713,168 @@ if (!__Pyx_RefNanny) {
   #endif
 
   /* "fuzzysearch/_generic_search.pyx":1
- * import attr             # <<<<<<<<<<<<<<
- * from fuzzysearch.common import Match
- * from libc.stdlib cimport malloc, free, realloc
- */
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_attr, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_attr, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "fuzzysearch/_generic_search.pyx":2
- * import attr
- * from fuzzysearch.common import Match             # <<<<<<<<<<<<<<
- * from libc.stdlib cimport malloc, free, realloc
- * 
+ * from fuzzysearch.common import Match, clamp_index_range             # <<<<<<<<<<<<<<
+ * from fuzzysearch.instrumentation import report_event
+ * from libc.limits cimport UINT_MAX
  */
-  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 2, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_Match);
   __Pyx_GIVEREF(__pyx_n_s_Match);
   PyList_SET_ITEM(__pyx_t_1, 0, __pyx_n_s_Match);
-  __pyx_t_2 = __Pyx_Import(__pyx_n_s_fuzzysearch_common, __pyx_t_1, -1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 2, __pyx_L1_error)
+  __Pyx_INCREF(__pyx_n_s_clamp_index_range);
+  __Pyx_GIVEREF(__pyx_n_s_clamp_index_range);
+  PyList_SET_ITEM(__pyx_t_1, 1, __pyx_n_s_clamp_index_range);
+  __pyx_t_2 = __Pyx_Import(__pyx_n_s_fuzzysearch_common, __pyx_t_1, -1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 1, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_Match); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 2, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_Match); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_Match, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_clamp_index_range); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_Match, __pyx_t_1) < 0) __PYX_ERR(0, 2, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_clamp_index_range, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":11
+  /* "fuzzysearch/_generic_search.pyx":2
+ * from fuzzysearch.common import Match, clamp_index_range
+ * from fuzzysearch.instrumentation import report_event             # <<<<<<<<<<<<<<
+ * from libc.limits cimport UINT_MAX
+ * from libc.stdint cimport SIZE_MAX
+ */
+  __pyx_t_2 = PyList_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 2, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_INCREF(__pyx_n_s_report_event);
+  __Pyx_GIVEREF(__pyx_n_s_report_event);
+  PyList_SET_ITEM(__pyx_t_2, 0, __pyx_n_s_report_event);
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_fuzzysearch_instrumentation, __pyx_t_2, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 2, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_report_event); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 2, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_report_event, __pyx_t_2) < 0) __PYX_ERR(0, 2, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":13
  *                                         int needle_sum)
  * 
  * __all__ = [             # <<<<<<<<<<<<<<
  *     'c_find_near_matches_generic_linear_programming',
  *     'c_find_near_matches_generic_ngrams',
  */
-  __pyx_t_2 = PyList_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 11, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_1 = PyList_New(3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 13, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_c_find_near_matches_generic_line);
   __Pyx_GIVEREF(__pyx_n_s_c_find_near_matches_generic_line);
-  PyList_SET_ITEM(__pyx_t_2, 0, __pyx_n_s_c_find_near_matches_generic_line);
+  PyList_SET_ITEM(__pyx_t_1, 0, __pyx_n_s_c_find_near_matches_generic_line);
   __Pyx_INCREF(__pyx_n_s_c_find_near_matches_generic_ngra);
   __Pyx_GIVEREF(__pyx_n_s_c_find_near_matches_generic_ngra);
-  PyList_SET_ITEM(__pyx_t_2, 1, __pyx_n_s_c_find_near_matches_generic_ngra);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_all, __pyx_t_2) < 0) __PYX_ERR(0, 11, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  PyList_SET_ITEM(__pyx_t_1, 1, __pyx_n_s_c_find_near_matches_generic_ngra);
+  __Pyx_INCREF(__pyx_n_s_c_has_near_match_generic_linear);
+  __Pyx_GIVEREF(__pyx_n_s_c_has_near_match_generic_linear);
+  PyList_SET_ITEM(__pyx_t_1, 2, __pyx_n_s_c_has_near_match_generic_linear);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_all, __pyx_t_1) < 0) __PYX_ERR(0, 13, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":22
+  /* "fuzzysearch/_generic_search.pyx":25
  * 
  * 
  * ALLOWED_TYPES = (bytes, bytearray)             # <<<<<<<<<<<<<<
  * 
- * 
+ * # marks candidates which were found to be dominated by another candidate
  */
-  __pyx_t_2 = PyTuple_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 22, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_1 = PyTuple_New(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 25, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(((PyObject *)(&PyBytes_Type)));
   __Pyx_GIVEREF(((PyObject *)(&PyBytes_Type)));
-  PyTuple_SET_ITEM(__pyx_t_2, 0, ((PyObject *)(&PyBytes_Type)));
+  PyTuple_SET_ITEM(__pyx_t_1, 0, ((PyObject *)(&PyBytes_Type)));
   __Pyx_INCREF(((PyObject *)(&PyByteArray_Type)));
   __Pyx_GIVEREF(((PyObject *)(&PyByteArray_Type)));
-  PyTuple_SET_ITEM(__pyx_t_2, 1, ((PyObject *)(&PyByteArray_Type)));
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ALLOWED_TYPES, __pyx_t_2) < 0) __PYX_ERR(0, 22, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  PyTuple_SET_ITEM(__pyx_t_1, 1, ((PyObject *)(&PyByteArray_Type)));
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ALLOWED_TYPES, __pyx_t_1) < 0) __PYX_ERR(0, 25, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "fuzzysearch/_generic_search.pyx":25
+  /* "fuzzysearch/_generic_search.pyx":28
  * 
+ * # marks candidates which were found to be dominated by another candidate
+ * cdef unsigned int DOMINATED = UINT_MAX             # <<<<<<<<<<<<<<
  * 
- * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
- *     """search for near-matches of subsequence in sequence
  * 
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_11fuzzysearch_15_generic_search_1c_find_near_matches_generic_linear_programming, NULL, __pyx_n_s_fuzzysearch__generic_search); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 25, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_find_near_matches_generic_line, __pyx_t_2) < 0) __PYX_ERR(0, 25, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_v_11fuzzysearch_15_generic_search_DOMINATED = UINT_MAX;
 
-  /* "fuzzysearch/_generic_search.pyx":237
+  /* "fuzzysearch/_generic_search.pyx":31
  * 
  * 
- * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):             # <<<<<<<<<<<<<<
- *     """search for near-matches of subsequence in sequence
+ * class _EnoughMatches(Exception):             # <<<<<<<<<<<<<<
+ *     """Raised internally to stop searching once enough matches were found."""
  * 
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_11fuzzysearch_15_generic_search_3c_find_near_matches_generic_ngrams, NULL, __pyx_n_s_fuzzysearch__generic_search); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 237, __pyx_L1_error)
+  __pyx_t_1 = PyTuple_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 31, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_INCREF(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
+  __Pyx_GIVEREF(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
+  PyTuple_SET_ITEM(__pyx_t_1, 0, ((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
+  __pyx_t_2 = __Pyx_CalculateMetaclass(NULL, __pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 31, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_find_near_matches_generic_ngra, __pyx_t_2) < 0) __PYX_ERR(0, 237, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_Py3MetaclassPrepare(__pyx_t_2, __pyx_t_1, __pyx_n_s_EnoughMatches, __pyx_n_s_EnoughMatches, (PyObject *) NULL, __pyx_n_s_fuzzysearch__generic_search, __pyx_kp_s_Raised_internally_to_stop_search); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 31, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = __Pyx_Py3ClassCreate(__pyx_t_2, __pyx_n_s_EnoughMatches, __pyx_t_1, __pyx_t_3, NULL, 0, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 31, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_EnoughMatches, __pyx_t_4) < 0) __PYX_ERR(0, 31, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":52
+ * 
+ * 
+ * def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                    start_index=0, end_index=None,
+ *                                                    equivalences=None,
+ */
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_11fuzzysearch_15_generic_search_1c_find_near_matches_generic_linear_programming, NULL, __pyx_n_s_fuzzysearch__generic_search); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_find_near_matches_generic_line, __pyx_t_1) < 0) __PYX_ERR(0, 52, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":106
+ *     )
+ * 
+ * def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                                 start_index=0, end_index=None,
+ *                                                 equivalences=None,
+ */
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_11fuzzysearch_15_generic_search_3c_has_near_match_generic_linear_programming, NULL, __pyx_n_s_fuzzysearch__generic_search); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 106, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_has_near_match_generic_linear, __pyx_t_1) < 0) __PYX_ERR(0, 106, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_generic_search.pyx":462
+ * 
+ * 
+ * def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,             # <<<<<<<<<<<<<<
+ *                                        max_candidates=None):
+ *     """search for near-matches of subsequence in sequence
+ */
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_11fuzzysearch_15_generic_search_5c_find_near_matches_generic_ngrams, NULL, __pyx_n_s_fuzzysearch__generic_search); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 462, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_find_near_matches_generic_ngra, __pyx_t_1) < 0) __PYX_ERR(0, 462, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
   /* "fuzzysearch/_generic_search.pyx":1
- * import attr             # <<<<<<<<<<<<<<
- * from fuzzysearch.common import Match
- * from libc.stdlib cimport malloc, free, realloc
+ * from fuzzysearch.common import Match, clamp_index_range             # <<<<<<<<<<<<<<
+ * from fuzzysearch.instrumentation import report_event
+ * from libc.limits cimport UINT_MAX
  */
-  __pyx_t_2 = __Pyx_PyDict_NewPresized(0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 1, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_test, __pyx_t_2) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_1 = __Pyx_PyDict_NewPresized(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_test, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
   /*--- Wrapped vars code ---*/
 
@@ -5217,6 +7882,8 @@ if (!__Pyx_RefNanny) {
   __pyx_L1_error:;
   __Pyx_XDECREF(__pyx_t_1);
   __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
   if (__pyx_m) {
     if (__pyx_d) {
       __Pyx_AddTraceback("init fuzzysearch._generic_search", __pyx_clineno, __pyx_lineno, __pyx_filename);
@@ -5276,11 +7943,214 @@ static PyObject *__Pyx_GetBuiltinName(PyObject *name) {
 #if PY_MAJOR_VERSION >= 3
             "name '%U' is not defined", name);
 #else
-            "name '%.200s' is not defined", PyString_AS_STRING(name));
+            "name '%.200s' is not defined", PyString_AS_STRING(name));
+#endif
+    }
+    return result;
+}
+
+/* PyObjectCall */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
+    PyObject *result;
+    ternaryfunc call = Py_TYPE(func)->tp_call;
+    if (unlikely(!call))
+        return PyObject_Call(func, arg, kw);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = (*call)(func, arg, kw);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
+    }
+    return result;
+}
+#endif
+
+/* PyErrFetchRestore */
+#if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    tmp_type = tstate->curexc_type;
+    tmp_value = tstate->curexc_value;
+    tmp_tb = tstate->curexc_traceback;
+    tstate->curexc_type = type;
+    tstate->curexc_value = value;
+    tstate->curexc_traceback = tb;
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    *type = tstate->curexc_type;
+    *value = tstate->curexc_value;
+    *tb = tstate->curexc_traceback;
+    tstate->curexc_type = 0;
+    tstate->curexc_value = 0;
+    tstate->curexc_traceback = 0;
+}
+#endif
+
+/* RaiseException */
+#if PY_MAJOR_VERSION < 3
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb,
+                        CYTHON_UNUSED PyObject *cause) {
+    __Pyx_PyThreadState_declare
+    Py_XINCREF(type);
+    if (!value || value == Py_None)
+        value = NULL;
+    else
+        Py_INCREF(value);
+    if (!tb || tb == Py_None)
+        tb = NULL;
+    else {
+        Py_INCREF(tb);
+        if (!PyTraceBack_Check(tb)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: arg 3 must be a traceback or None");
+            goto raise_error;
+        }
+    }
+    if (PyType_Check(type)) {
+#if CYTHON_COMPILING_IN_PYPY
+        if (!value) {
+            Py_INCREF(Py_None);
+            value = Py_None;
+        }
+#endif
+        PyErr_NormalizeException(&type, &value, &tb);
+    } else {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto raise_error;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(type);
+        Py_INCREF(type);
+        if (!PyType_IsSubtype((PyTypeObject *)type, (PyTypeObject *)PyExc_BaseException)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: exception class must be a subclass of BaseException");
+            goto raise_error;
+        }
+    }
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrRestore(type, value, tb);
+    return;
+raise_error:
+    Py_XDECREF(value);
+    Py_XDECREF(type);
+    Py_XDECREF(tb);
+    return;
+}
+#else
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
+    PyObject* owned_instance = NULL;
+    if (tb == Py_None) {
+        tb = 0;
+    } else if (tb && !PyTraceBack_Check(tb)) {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: arg 3 must be a traceback or None");
+        goto bad;
+    }
+    if (value == Py_None)
+        value = 0;
+    if (PyExceptionInstance_Check(type)) {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto bad;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(value);
+    } else if (PyExceptionClass_Check(type)) {
+        PyObject *instance_class = NULL;
+        if (value && PyExceptionInstance_Check(value)) {
+            instance_class = (PyObject*) Py_TYPE(value);
+            if (instance_class != type) {
+                int is_subclass = PyObject_IsSubclass(instance_class, type);
+                if (!is_subclass) {
+                    instance_class = NULL;
+                } else if (unlikely(is_subclass == -1)) {
+                    goto bad;
+                } else {
+                    type = instance_class;
+                }
+            }
+        }
+        if (!instance_class) {
+            PyObject *args;
+            if (!value)
+                args = PyTuple_New(0);
+            else if (PyTuple_Check(value)) {
+                Py_INCREF(value);
+                args = value;
+            } else
+                args = PyTuple_Pack(1, value);
+            if (!args)
+                goto bad;
+            owned_instance = PyObject_Call(type, args, NULL);
+            Py_DECREF(args);
+            if (!owned_instance)
+                goto bad;
+            value = owned_instance;
+            if (!PyExceptionInstance_Check(value)) {
+                PyErr_Format(PyExc_TypeError,
+                             "calling %R should have returned an instance of "
+                             "BaseException, not %R",
+                             type, Py_TYPE(value));
+                goto bad;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: exception class must be a subclass of BaseException");
+        goto bad;
+    }
+    if (cause) {
+        PyObject *fixed_cause;
+        if (cause == Py_None) {
+            fixed_cause = NULL;
+        } else if (PyExceptionClass_Check(cause)) {
+            fixed_cause = PyObject_CallObject(cause, NULL);
+            if (fixed_cause == NULL)
+                goto bad;
+        } else if (PyExceptionInstance_Check(cause)) {
+            fixed_cause = cause;
+            Py_INCREF(fixed_cause);
+        } else {
+            PyErr_SetString(PyExc_TypeError,
+                            "exception causes must derive from "
+                            "BaseException");
+            goto bad;
+        }
+        PyException_SetCause(value, fixed_cause);
+    }
+    PyErr_SetObject(type, value);
+    if (tb) {
+#if CYTHON_COMPILING_IN_PYPY
+        PyObject *tmp_type, *tmp_value, *tmp_tb;
+        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
+        Py_INCREF(tb);
+        PyErr_Restore(tmp_type, tmp_value, tb);
+        Py_XDECREF(tmp_tb);
+#else
+        PyThreadState *tstate = __Pyx_PyThreadState_Current;
+        PyObject* tmp_tb = tstate->curexc_traceback;
+        if (tb != tmp_tb) {
+            Py_INCREF(tb);
+            tstate->curexc_traceback = tb;
+            Py_XDECREF(tmp_tb);
+        }
 #endif
     }
-    return result;
+bad:
+    Py_XDECREF(owned_instance);
+    return;
 }
+#endif
 
 /* RaiseArgTupleInvalid */
 static void __Pyx_RaiseArgtupleInvalid(
@@ -5627,26 +8497,6 @@ done:
 #endif
 #endif
 
-/* PyObjectCall */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
-    PyObject *result;
-    ternaryfunc call = Py_TYPE(func)->tp_call;
-    if (unlikely(!call))
-        return PyObject_Call(func, arg, kw);
-    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
-        return NULL;
-    result = (*call)(func, arg, kw);
-    Py_LeaveRecursiveCall();
-    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
-        PyErr_SetString(
-            PyExc_SystemError,
-            "NULL result without error in PyObject_Call");
-    }
-    return result;
-}
-#endif
-
 /* PyObjectCallMethO */
 #if CYTHON_COMPILING_IN_CPYTHON
 static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg) {
@@ -5683,210 +8533,27 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObjec
 #if CYTHON_FAST_PYCALL
     if (PyFunction_Check(func)) {
         return __Pyx_PyFunction_FastCall(func, &arg, 1);
-    }
-#endif
-    if (likely(PyCFunction_Check(func))) {
-        if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
-            return __Pyx_PyObject_CallMethO(func, arg);
-#if CYTHON_FAST_PYCCALL
-        } else if (__Pyx_PyFastCFunction_Check(func)) {
-            return __Pyx_PyCFunction_FastCall(func, &arg, 1);
-#endif
-        }
-    }
-    return __Pyx__PyObject_CallOneArg(func, arg);
-}
-#else
-static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
-    PyObject *result;
-    PyObject *args = PyTuple_Pack(1, arg);
-    if (unlikely(!args)) return NULL;
-    result = __Pyx_PyObject_Call(func, args, NULL);
-    Py_DECREF(args);
-    return result;
-}
-#endif
-
-/* PyErrFetchRestore */
-#if CYTHON_FAST_THREAD_STATE
-static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    tmp_type = tstate->curexc_type;
-    tmp_value = tstate->curexc_value;
-    tmp_tb = tstate->curexc_traceback;
-    tstate->curexc_type = type;
-    tstate->curexc_value = value;
-    tstate->curexc_traceback = tb;
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
-}
-static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
-    *type = tstate->curexc_type;
-    *value = tstate->curexc_value;
-    *tb = tstate->curexc_traceback;
-    tstate->curexc_type = 0;
-    tstate->curexc_value = 0;
-    tstate->curexc_traceback = 0;
-}
-#endif
-
-/* RaiseException */
-#if PY_MAJOR_VERSION < 3
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb,
-                        CYTHON_UNUSED PyObject *cause) {
-    __Pyx_PyThreadState_declare
-    Py_XINCREF(type);
-    if (!value || value == Py_None)
-        value = NULL;
-    else
-        Py_INCREF(value);
-    if (!tb || tb == Py_None)
-        tb = NULL;
-    else {
-        Py_INCREF(tb);
-        if (!PyTraceBack_Check(tb)) {
-            PyErr_SetString(PyExc_TypeError,
-                "raise: arg 3 must be a traceback or None");
-            goto raise_error;
-        }
-    }
-    if (PyType_Check(type)) {
-#if CYTHON_COMPILING_IN_PYPY
-        if (!value) {
-            Py_INCREF(Py_None);
-            value = Py_None;
-        }
-#endif
-        PyErr_NormalizeException(&type, &value, &tb);
-    } else {
-        if (value) {
-            PyErr_SetString(PyExc_TypeError,
-                "instance exception may not have a separate value");
-            goto raise_error;
-        }
-        value = type;
-        type = (PyObject*) Py_TYPE(type);
-        Py_INCREF(type);
-        if (!PyType_IsSubtype((PyTypeObject *)type, (PyTypeObject *)PyExc_BaseException)) {
-            PyErr_SetString(PyExc_TypeError,
-                "raise: exception class must be a subclass of BaseException");
-            goto raise_error;
-        }
-    }
-    __Pyx_PyThreadState_assign
-    __Pyx_ErrRestore(type, value, tb);
-    return;
-raise_error:
-    Py_XDECREF(value);
-    Py_XDECREF(type);
-    Py_XDECREF(tb);
-    return;
-}
-#else
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
-    PyObject* owned_instance = NULL;
-    if (tb == Py_None) {
-        tb = 0;
-    } else if (tb && !PyTraceBack_Check(tb)) {
-        PyErr_SetString(PyExc_TypeError,
-            "raise: arg 3 must be a traceback or None");
-        goto bad;
-    }
-    if (value == Py_None)
-        value = 0;
-    if (PyExceptionInstance_Check(type)) {
-        if (value) {
-            PyErr_SetString(PyExc_TypeError,
-                "instance exception may not have a separate value");
-            goto bad;
-        }
-        value = type;
-        type = (PyObject*) Py_TYPE(value);
-    } else if (PyExceptionClass_Check(type)) {
-        PyObject *instance_class = NULL;
-        if (value && PyExceptionInstance_Check(value)) {
-            instance_class = (PyObject*) Py_TYPE(value);
-            if (instance_class != type) {
-                int is_subclass = PyObject_IsSubclass(instance_class, type);
-                if (!is_subclass) {
-                    instance_class = NULL;
-                } else if (unlikely(is_subclass == -1)) {
-                    goto bad;
-                } else {
-                    type = instance_class;
-                }
-            }
-        }
-        if (!instance_class) {
-            PyObject *args;
-            if (!value)
-                args = PyTuple_New(0);
-            else if (PyTuple_Check(value)) {
-                Py_INCREF(value);
-                args = value;
-            } else
-                args = PyTuple_Pack(1, value);
-            if (!args)
-                goto bad;
-            owned_instance = PyObject_Call(type, args, NULL);
-            Py_DECREF(args);
-            if (!owned_instance)
-                goto bad;
-            value = owned_instance;
-            if (!PyExceptionInstance_Check(value)) {
-                PyErr_Format(PyExc_TypeError,
-                             "calling %R should have returned an instance of "
-                             "BaseException, not %R",
-                             type, Py_TYPE(value));
-                goto bad;
-            }
-        }
-    } else {
-        PyErr_SetString(PyExc_TypeError,
-            "raise: exception class must be a subclass of BaseException");
-        goto bad;
-    }
-    if (cause) {
-        PyObject *fixed_cause;
-        if (cause == Py_None) {
-            fixed_cause = NULL;
-        } else if (PyExceptionClass_Check(cause)) {
-            fixed_cause = PyObject_CallObject(cause, NULL);
-            if (fixed_cause == NULL)
-                goto bad;
-        } else if (PyExceptionInstance_Check(cause)) {
-            fixed_cause = cause;
-            Py_INCREF(fixed_cause);
-        } else {
-            PyErr_SetString(PyExc_TypeError,
-                            "exception causes must derive from "
-                            "BaseException");
-            goto bad;
-        }
-        PyException_SetCause(value, fixed_cause);
-    }
-    PyErr_SetObject(type, value);
-    if (tb) {
-#if CYTHON_COMPILING_IN_PYPY
-        PyObject *tmp_type, *tmp_value, *tmp_tb;
-        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
-        Py_INCREF(tb);
-        PyErr_Restore(tmp_type, tmp_value, tb);
-        Py_XDECREF(tmp_tb);
-#else
-        PyThreadState *tstate = __Pyx_PyThreadState_Current;
-        PyObject* tmp_tb = tstate->curexc_traceback;
-        if (tb != tmp_tb) {
-            Py_INCREF(tb);
-            tstate->curexc_traceback = tb;
-            Py_XDECREF(tmp_tb);
-        }
+    }
+#endif
+    if (likely(PyCFunction_Check(func))) {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
+            return __Pyx_PyObject_CallMethO(func, arg);
+#if CYTHON_FAST_PYCCALL
+        } else if (__Pyx_PyFastCFunction_Check(func)) {
+            return __Pyx_PyCFunction_FastCall(func, &arg, 1);
 #endif
+        }
     }
-bad:
-    Py_XDECREF(owned_instance);
-    return;
+    return __Pyx__PyObject_CallOneArg(func, arg);
+}
+#else
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_Pack(1, arg);
+    if (unlikely(!args)) return NULL;
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
 }
 #endif
 
@@ -5955,6 +8622,28 @@ static CYTHON_INLINE void __Pyx_RaiseClosureNameError(const char *varname) {
     PyErr_Format(PyExc_NameError, "free variable '%s' referenced before assignment in enclosing scope", varname);
 }
 
+/* PyObjectCallNoArg */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func) {
+#if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(func)) {
+        return __Pyx_PyFunction_FastCall(func, NULL, 0);
+    }
+#endif
+#ifdef __Pyx_CyFunction_USED
+    if (likely(PyCFunction_Check(func) || __Pyx_CyFunction_Check(func)))
+#else
+    if (likely(PyCFunction_Check(func)))
+#endif
+    {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_NOARGS)) {
+            return __Pyx_PyObject_CallMethO(func, NULL);
+        }
+    }
+    return __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL);
+}
+#endif
+
 /* FetchCommonType */
 static PyTypeObject* __Pyx_FetchCommonType(PyTypeObject* type) {
     PyObject* fake_module;
@@ -6496,127 +9185,283 @@ static PyObject *__Pyx_CyFunction_CallAsMethod(PyObject *func, PyObject *args, P
                          cyfunc->func_qualname);
             return NULL;
         }
-        result = __Pyx_CyFunction_CallMethod(func, self, new_args, kw);
-        Py_DECREF(new_args);
-    } else {
-        result = __Pyx_CyFunction_Call(func, args, kw);
+        result = __Pyx_CyFunction_CallMethod(func, self, new_args, kw);
+        Py_DECREF(new_args);
+    } else {
+        result = __Pyx_CyFunction_Call(func, args, kw);
+    }
+    return result;
+}
+static PyTypeObject __pyx_CyFunctionType_type = {
+    PyVarObject_HEAD_INIT(0, 0)
+    "cython_function_or_method",
+    sizeof(__pyx_CyFunctionObject),
+    0,
+    (destructor) __Pyx_CyFunction_dealloc,
+    0,
+    0,
+    0,
+#if PY_MAJOR_VERSION < 3
+    0,
+#else
+    0,
+#endif
+    (reprfunc) __Pyx_CyFunction_repr,
+    0,
+    0,
+    0,
+    0,
+    __Pyx_CyFunction_CallAsMethod,
+    0,
+    0,
+    0,
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
+    0,
+    (traverseproc) __Pyx_CyFunction_traverse,
+    (inquiry) __Pyx_CyFunction_clear,
+    0,
+#if PY_VERSION_HEX < 0x030500A0
+    offsetof(__pyx_CyFunctionObject, func_weakreflist),
+#else
+    offsetof(PyCFunctionObject, m_weakreflist),
+#endif
+    0,
+    0,
+    __pyx_CyFunction_methods,
+    __pyx_CyFunction_members,
+    __pyx_CyFunction_getsets,
+    0,
+    0,
+    __Pyx_CyFunction_descr_get,
+    0,
+    offsetof(__pyx_CyFunctionObject, func_dict),
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+#if PY_VERSION_HEX >= 0x030400a1
+    0,
+#endif
+#if PY_VERSION_HEX >= 0x030800b1 && (!CYTHON_COMPILING_IN_PYPY || PYPY_VERSION_NUM >= 0x07030800)
+    0,
+#endif
+#if PY_VERSION_HEX >= 0x030800b4 && PY_VERSION_HEX < 0x03090000
+    0,
+#endif
+#if CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX >= 0x03090000
+    0,
+#endif
+};
+static int __pyx_CyFunction_init(void) {
+    __pyx_CyFunctionType = __Pyx_FetchCommonType(&__pyx_CyFunctionType_type);
+    if (unlikely(__pyx_CyFunctionType == NULL)) {
+        return -1;
+    }
+    return 0;
+}
+static CYTHON_INLINE void *__Pyx_CyFunction_InitDefaults(PyObject *func, size_t size, int pyobjects) {
+    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
+    m->defaults = PyObject_Malloc(size);
+    if (unlikely(!m->defaults))
+        return PyErr_NoMemory();
+    memset(m->defaults, 0, size);
+    m->defaults_pyobjects = pyobjects;
+    m->defaults_size = size;
+    return m->defaults;
+}
+static CYTHON_INLINE void __Pyx_CyFunction_SetDefaultsTuple(PyObject *func, PyObject *tuple) {
+    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
+    m->defaults_tuple = tuple;
+    Py_INCREF(tuple);
+}
+static CYTHON_INLINE void __Pyx_CyFunction_SetDefaultsKwDict(PyObject *func, PyObject *dict) {
+    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
+    m->defaults_kwdict = dict;
+    Py_INCREF(dict);
+}
+static CYTHON_INLINE void __Pyx_CyFunction_SetAnnotationsDict(PyObject *func, PyObject *dict) {
+    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
+    m->func_annotations = dict;
+    Py_INCREF(dict);
+}
+
+/* CythonFunction */
+static PyObject *__Pyx_CyFunction_New(PyMethodDef *ml, int flags, PyObject* qualname,
+                                      PyObject *closure, PyObject *module, PyObject* globals, PyObject* code) {
+    PyObject *op = __Pyx_CyFunction_Init(
+        PyObject_GC_New(__pyx_CyFunctionObject, __pyx_CyFunctionType),
+        ml, flags, qualname, closure, module, globals, code
+    );
+    if (likely(op)) {
+        PyObject_GC_Track(op);
+    }
+    return op;
+}
+
+/* GetTopmostException */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem *
+__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
+{
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
+           exc_info->previous_item != NULL)
+    {
+        exc_info = exc_info->previous_item;
+    }
+    return exc_info;
+}
+#endif
+
+/* SaveResetException */
+#if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
+    *type = exc_info->exc_type;
+    *value = exc_info->exc_value;
+    *tb = exc_info->exc_traceback;
+    #else
+    *type = tstate->exc_type;
+    *value = tstate->exc_value;
+    *tb = tstate->exc_traceback;
+    #endif
+    Py_XINCREF(*type);
+    Py_XINCREF(*value);
+    Py_XINCREF(*tb);
+}
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    tmp_type = exc_info->exc_type;
+    tmp_value = exc_info->exc_value;
+    tmp_tb = exc_info->exc_traceback;
+    exc_info->exc_type = type;
+    exc_info->exc_value = value;
+    exc_info->exc_traceback = tb;
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = type;
+    tstate->exc_value = value;
+    tstate->exc_traceback = tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+#endif
+
+/* FastTypeChecks */
+#if CYTHON_COMPILING_IN_CPYTHON
+static int __Pyx_InBases(PyTypeObject *a, PyTypeObject *b) {
+    while (a) {
+        a = a->tp_base;
+        if (a == b)
+            return 1;
+    }
+    return b == &PyBaseObject_Type;
+}
+static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b) {
+    PyObject *mro;
+    if (a == b) return 1;
+    mro = a->tp_mro;
+    if (likely(mro)) {
+        Py_ssize_t i, n;
+        n = PyTuple_GET_SIZE(mro);
+        for (i = 0; i < n; i++) {
+            if (PyTuple_GET_ITEM(mro, i) == (PyObject *)b)
+                return 1;
+        }
+        return 0;
+    }
+    return __Pyx_InBases(a, b);
+}
+#if PY_MAJOR_VERSION == 2
+static int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject* exc_type2) {
+    PyObject *exception, *value, *tb;
+    int res;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&exception, &value, &tb);
+    res = exc_type1 ? PyObject_IsSubclass(err, exc_type1) : 0;
+    if (unlikely(res == -1)) {
+        PyErr_WriteUnraisable(err);
+        res = 0;
+    }
+    if (!res) {
+        res = PyObject_IsSubclass(err, exc_type2);
+        if (unlikely(res == -1)) {
+            PyErr_WriteUnraisable(err);
+            res = 0;
+        }
     }
-    return result;
+    __Pyx_ErrRestore(exception, value, tb);
+    return res;
 }
-static PyTypeObject __pyx_CyFunctionType_type = {
-    PyVarObject_HEAD_INIT(0, 0)
-    "cython_function_or_method",
-    sizeof(__pyx_CyFunctionObject),
-    0,
-    (destructor) __Pyx_CyFunction_dealloc,
-    0,
-    0,
-    0,
-#if PY_MAJOR_VERSION < 3
-    0,
-#else
-    0,
-#endif
-    (reprfunc) __Pyx_CyFunction_repr,
-    0,
-    0,
-    0,
-    0,
-    __Pyx_CyFunction_CallAsMethod,
-    0,
-    0,
-    0,
-    0,
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
-    0,
-    (traverseproc) __Pyx_CyFunction_traverse,
-    (inquiry) __Pyx_CyFunction_clear,
-    0,
-#if PY_VERSION_HEX < 0x030500A0
-    offsetof(__pyx_CyFunctionObject, func_weakreflist),
 #else
-    offsetof(PyCFunctionObject, m_weakreflist),
-#endif
-    0,
-    0,
-    __pyx_CyFunction_methods,
-    __pyx_CyFunction_members,
-    __pyx_CyFunction_getsets,
-    0,
-    0,
-    __Pyx_CyFunction_descr_get,
-    0,
-    offsetof(__pyx_CyFunctionObject, func_dict),
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-    0,
-#if PY_VERSION_HEX >= 0x030400a1
-    0,
-#endif
-#if PY_VERSION_HEX >= 0x030800b1 && (!CYTHON_COMPILING_IN_PYPY || PYPY_VERSION_NUM >= 0x07030800)
-    0,
-#endif
-#if PY_VERSION_HEX >= 0x030800b4 && PY_VERSION_HEX < 0x03090000
-    0,
+static CYTHON_INLINE int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject *exc_type2) {
+    int res = exc_type1 ? __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type1) : 0;
+    if (!res) {
+        res = __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type2);
+    }
+    return res;
+}
 #endif
-#if CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX >= 0x03090000
-    0,
+static int __Pyx_PyErr_GivenExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
+    Py_ssize_t i, n;
+    assert(PyExceptionClass_Check(exc_type));
+    n = PyTuple_GET_SIZE(tuple);
+#if PY_MAJOR_VERSION >= 3
+    for (i=0; i<n; i++) {
+        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+    }
 #endif
-};
-static int __pyx_CyFunction_init(void) {
-    __pyx_CyFunctionType = __Pyx_FetchCommonType(&__pyx_CyFunctionType_type);
-    if (unlikely(__pyx_CyFunctionType == NULL)) {
-        return -1;
+    for (i=0; i<n; i++) {
+        PyObject *t = PyTuple_GET_ITEM(tuple, i);
+        #if PY_MAJOR_VERSION < 3
+        if (likely(exc_type == t)) return 1;
+        #endif
+        if (likely(PyExceptionClass_Check(t))) {
+            if (__Pyx_inner_PyErr_GivenExceptionMatches2(exc_type, NULL, t)) return 1;
+        } else {
+        }
     }
     return 0;
 }
-static CYTHON_INLINE void *__Pyx_CyFunction_InitDefaults(PyObject *func, size_t size, int pyobjects) {
-    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
-    m->defaults = PyObject_Malloc(size);
-    if (unlikely(!m->defaults))
-        return PyErr_NoMemory();
-    memset(m->defaults, 0, size);
-    m->defaults_pyobjects = pyobjects;
-    m->defaults_size = size;
-    return m->defaults;
-}
-static CYTHON_INLINE void __Pyx_CyFunction_SetDefaultsTuple(PyObject *func, PyObject *tuple) {
-    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
-    m->defaults_tuple = tuple;
-    Py_INCREF(tuple);
-}
-static CYTHON_INLINE void __Pyx_CyFunction_SetDefaultsKwDict(PyObject *func, PyObject *dict) {
-    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
-    m->defaults_kwdict = dict;
-    Py_INCREF(dict);
-}
-static CYTHON_INLINE void __Pyx_CyFunction_SetAnnotationsDict(PyObject *func, PyObject *dict) {
-    __pyx_CyFunctionObject *m = (__pyx_CyFunctionObject *) func;
-    m->func_annotations = dict;
-    Py_INCREF(dict);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject* exc_type) {
+    if (likely(err == exc_type)) return 1;
+    if (likely(PyExceptionClass_Check(err))) {
+        if (likely(PyExceptionClass_Check(exc_type))) {
+            return __Pyx_inner_PyErr_GivenExceptionMatches2(err, NULL, exc_type);
+        } else if (likely(PyTuple_Check(exc_type))) {
+            return __Pyx_PyErr_GivenExceptionMatchesTuple(err, exc_type);
+        } else {
+        }
+    }
+    return PyErr_GivenExceptionMatches(err, exc_type);
 }
-
-/* CythonFunction */
-static PyObject *__Pyx_CyFunction_New(PyMethodDef *ml, int flags, PyObject* qualname,
-                                      PyObject *closure, PyObject *module, PyObject* globals, PyObject* code) {
-    PyObject *op = __Pyx_CyFunction_Init(
-        PyObject_GC_New(__pyx_CyFunctionObject, __pyx_CyFunctionType),
-        ml, flags, qualname, closure, module, globals, code
-    );
-    if (likely(op)) {
-        PyObject_GC_Track(op);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *exc_type1, PyObject *exc_type2) {
+    assert(PyExceptionClass_Check(exc_type1));
+    assert(PyExceptionClass_Check(exc_type2));
+    if (likely(err == exc_type1 || err == exc_type2)) return 1;
+    if (likely(PyExceptionClass_Check(err))) {
+        return __Pyx_inner_PyErr_GivenExceptionMatches2(err, exc_type1, exc_type2);
     }
-    return op;
+    return (PyErr_GivenExceptionMatches(err, exc_type1) || PyErr_GivenExceptionMatches(err, exc_type2));
 }
+#endif
 
 /* GetException */
 #if CYTHON_FAST_THREAD_STATE
@@ -6727,62 +9572,6 @@ static CYTHON_INLINE void __Pyx_ExceptionSwap(PyObject **type, PyObject **value,
 }
 #endif
 
-/* GetTopmostException */
-#if CYTHON_USE_EXC_INFO_STACK
-static _PyErr_StackItem *
-__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
-{
-    _PyErr_StackItem *exc_info = tstate->exc_info;
-    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
-           exc_info->previous_item != NULL)
-    {
-        exc_info = exc_info->previous_item;
-    }
-    return exc_info;
-}
-#endif
-
-/* SaveResetException */
-#if CYTHON_FAST_THREAD_STATE
-static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
-    #if CYTHON_USE_EXC_INFO_STACK
-    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
-    *type = exc_info->exc_type;
-    *value = exc_info->exc_value;
-    *tb = exc_info->exc_traceback;
-    #else
-    *type = tstate->exc_type;
-    *value = tstate->exc_value;
-    *tb = tstate->exc_traceback;
-    #endif
-    Py_XINCREF(*type);
-    Py_XINCREF(*value);
-    Py_XINCREF(*tb);
-}
-static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    #if CYTHON_USE_EXC_INFO_STACK
-    _PyErr_StackItem *exc_info = tstate->exc_info;
-    tmp_type = exc_info->exc_type;
-    tmp_value = exc_info->exc_value;
-    tmp_tb = exc_info->exc_traceback;
-    exc_info->exc_type = type;
-    exc_info->exc_value = value;
-    exc_info->exc_traceback = tb;
-    #else
-    tmp_type = tstate->exc_type;
-    tmp_value = tstate->exc_value;
-    tmp_tb = tstate->exc_traceback;
-    tstate->exc_type = type;
-    tstate->exc_value = value;
-    tstate->exc_traceback = tb;
-    #endif
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
-}
-#endif
-
 /* PyObject_GenericGetAttrNoDict */
 #if CYTHON_USE_TYPE_SLOTS && CYTHON_USE_PYTYPE_LOOKUP && PY_VERSION_HEX < 0x03070000
 static PyObject *__Pyx_RaiseGenericGetAttributeError(PyTypeObject *tp, PyObject *attr_name) {
@@ -6902,6 +9691,112 @@ static PyObject* __Pyx_ImportFrom(PyObject* module, PyObject* name) {
     return value;
 }
 
+/* CalculateMetaclass */
+static PyObject *__Pyx_CalculateMetaclass(PyTypeObject *metaclass, PyObject *bases) {
+    Py_ssize_t i, nbases = PyTuple_GET_SIZE(bases);
+    for (i=0; i < nbases; i++) {
+        PyTypeObject *tmptype;
+        PyObject *tmp = PyTuple_GET_ITEM(bases, i);
+        tmptype = Py_TYPE(tmp);
+#if PY_MAJOR_VERSION < 3
+        if (tmptype == &PyClass_Type)
+            continue;
+#endif
+        if (!metaclass) {
+            metaclass = tmptype;
+            continue;
+        }
+        if (PyType_IsSubtype(metaclass, tmptype))
+            continue;
+        if (PyType_IsSubtype(tmptype, metaclass)) {
+            metaclass = tmptype;
+            continue;
+        }
+        PyErr_SetString(PyExc_TypeError,
+                        "metaclass conflict: "
+                        "the metaclass of a derived class "
+                        "must be a (non-strict) subclass "
+                        "of the metaclasses of all its bases");
+        return NULL;
+    }
+    if (!metaclass) {
+#if PY_MAJOR_VERSION < 3
+        metaclass = &PyClass_Type;
+#else
+        metaclass = &PyType_Type;
+#endif
+    }
+    Py_INCREF((PyObject*) metaclass);
+    return (PyObject*) metaclass;
+}
+
+/* Py3ClassCreate */
+static PyObject *__Pyx_Py3MetaclassPrepare(PyObject *metaclass, PyObject *bases, PyObject *name,
+                                           PyObject *qualname, PyObject *mkw, PyObject *modname, PyObject *doc) {
+    PyObject *ns;
+    if (metaclass) {
+        PyObject *prep = __Pyx_PyObject_GetAttrStr(metaclass, __pyx_n_s_prepare);
+        if (prep) {
+            PyObject *pargs = PyTuple_Pack(2, name, bases);
+            if (unlikely(!pargs)) {
+                Py_DECREF(prep);
+                return NULL;
+            }
+            ns = PyObject_Call(prep, pargs, mkw);
+            Py_DECREF(prep);
+            Py_DECREF(pargs);
+        } else {
+            if (unlikely(!PyErr_ExceptionMatches(PyExc_AttributeError)))
+                return NULL;
+            PyErr_Clear();
+            ns = PyDict_New();
+        }
+    } else {
+        ns = PyDict_New();
+    }
+    if (unlikely(!ns))
+        return NULL;
+    if (unlikely(PyObject_SetItem(ns, __pyx_n_s_module, modname) < 0)) goto bad;
+    if (unlikely(PyObject_SetItem(ns, __pyx_n_s_qualname, qualname) < 0)) goto bad;
+    if (unlikely(doc && PyObject_SetItem(ns, __pyx_n_s_doc, doc) < 0)) goto bad;
+    return ns;
+bad:
+    Py_DECREF(ns);
+    return NULL;
+}
+static PyObject *__Pyx_Py3ClassCreate(PyObject *metaclass, PyObject *name, PyObject *bases,
+                                      PyObject *dict, PyObject *mkw,
+                                      int calculate_metaclass, int allow_py2_metaclass) {
+    PyObject *result, *margs;
+    PyObject *owned_metaclass = NULL;
+    if (allow_py2_metaclass) {
+        owned_metaclass = PyObject_GetItem(dict, __pyx_n_s_metaclass);
+        if (owned_metaclass) {
+            metaclass = owned_metaclass;
+        } else if (likely(PyErr_ExceptionMatches(PyExc_KeyError))) {
+            PyErr_Clear();
+        } else {
+            return NULL;
+        }
+    }
+    if (calculate_metaclass && (!metaclass || PyType_Check(metaclass))) {
+        metaclass = __Pyx_CalculateMetaclass((PyTypeObject*) metaclass, bases);
+        Py_XDECREF(owned_metaclass);
+        if (unlikely(!metaclass))
+            return NULL;
+        owned_metaclass = metaclass;
+    }
+    margs = PyTuple_Pack(3, name, bases, dict);
+    if (unlikely(!margs)) {
+        result = NULL;
+    } else {
+        result = PyObject_Call(metaclass, margs, mkw);
+        Py_DECREF(margs);
+    }
+    Py_XDECREF(owned_metaclass);
+    return result;
+}
+
 /* CLineInTraceback */
 #ifndef CYTHON_CLINE_IN_TRACEBACK
 static int __Pyx_CLineForTraceback(CYTHON_NCP_UNUSED PyThreadState *tstate, int c_line) {
@@ -7154,26 +10049,26 @@ bad:
     }
 
 /* CIntFromPy */
-static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
+static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
 #pragma GCC diagnostic push
 #pragma GCC diagnostic ignored "-Wconversion"
 #endif
-    const unsigned int neg_one = (unsigned int) -1, const_zero = (unsigned int) 0;
+    const size_t neg_one = (size_t) -1, const_zero = (size_t) 0;
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
 #pragma GCC diagnostic pop
 #endif
     const int is_unsigned = neg_one > const_zero;
 #if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
-        if (sizeof(unsigned int) < sizeof(long)) {
-            __PYX_VERIFY_RETURN_INT(unsigned int, long, PyInt_AS_LONG(x))
+        if (sizeof(size_t) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(size_t, long, PyInt_AS_LONG(x))
         } else {
             long val = PyInt_AS_LONG(x);
             if (is_unsigned && unlikely(val < 0)) {
                 goto raise_neg_overflow;
             }
-            return (unsigned int) val;
+            return (size_t) val;
         }
     } else
 #endif
@@ -7182,32 +10077,32 @@ static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
 #if CYTHON_USE_PYLONG_INTERNALS
             const digit* digits = ((PyLongObject*)x)->ob_digit;
             switch (Py_SIZE(x)) {
-                case  0: return (unsigned int) 0;
-                case  1: __PYX_VERIFY_RETURN_INT(unsigned int, digit, digits[0])
+                case  0: return (size_t) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(size_t, digit, digits[0])
                 case 2:
-                    if (8 * sizeof(unsigned int) > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) >= 2 * PyLong_SHIFT) {
-                            return (unsigned int) (((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) >= 2 * PyLong_SHIFT) {
+                            return (size_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
                         }
                     }
                     break;
                 case 3:
-                    if (8 * sizeof(unsigned int) > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) >= 3 * PyLong_SHIFT) {
-                            return (unsigned int) (((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) >= 3 * PyLong_SHIFT) {
+                            return (size_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
                         }
                     }
                     break;
                 case 4:
-                    if (8 * sizeof(unsigned int) > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) >= 4 * PyLong_SHIFT) {
-                            return (unsigned int) (((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) >= 4 * PyLong_SHIFT) {
+                            return (size_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
                         }
                     }
                     break;
@@ -7221,86 +10116,86 @@ static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
             {
                 int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
                 if (unlikely(result < 0))
-                    return (unsigned int) -1;
+                    return (size_t) -1;
                 if (unlikely(result == 1))
                     goto raise_neg_overflow;
             }
 #endif
-            if (sizeof(unsigned int) <= sizeof(unsigned long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, unsigned long, PyLong_AsUnsignedLong(x))
+            if (sizeof(size_t) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, unsigned long, PyLong_AsUnsignedLong(x))
 #ifdef HAVE_LONG_LONG
-            } else if (sizeof(unsigned int) <= sizeof(unsigned PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+            } else if (sizeof(size_t) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
 #endif
             }
         } else {
 #if CYTHON_USE_PYLONG_INTERNALS
             const digit* digits = ((PyLongObject*)x)->ob_digit;
             switch (Py_SIZE(x)) {
-                case  0: return (unsigned int) 0;
-                case -1: __PYX_VERIFY_RETURN_INT(unsigned int, sdigit, (sdigit) (-(sdigit)digits[0]))
-                case  1: __PYX_VERIFY_RETURN_INT(unsigned int,  digit, +digits[0])
+                case  0: return (size_t) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(size_t, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(size_t,  digit, +digits[0])
                 case -2:
-                    if (8 * sizeof(unsigned int) - 1 > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) - 1 > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
-                            return (unsigned int) (((unsigned int)-1)*(((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
+                            return (size_t) (((size_t)-1)*(((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
                         }
                     }
                     break;
                 case 2:
-                    if (8 * sizeof(unsigned int) > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
-                            return (unsigned int) ((((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
+                            return (size_t) ((((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
                         }
                     }
                     break;
                 case -3:
-                    if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
-                            return (unsigned int) (((unsigned int)-1)*(((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
+                            return (size_t) (((size_t)-1)*(((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
                         }
                     }
                     break;
                 case 3:
-                    if (8 * sizeof(unsigned int) > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
-                            return (unsigned int) ((((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
+                            return (size_t) ((((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
                         }
                     }
                     break;
                 case -4:
-                    if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) - 1 > 4 * PyLong_SHIFT) {
-                            return (unsigned int) (((unsigned int)-1)*(((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 4 * PyLong_SHIFT) {
+                            return (size_t) (((size_t)-1)*(((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
                         }
                     }
                     break;
                 case 4:
-                    if (8 * sizeof(unsigned int) > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(size_t) > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(unsigned int) - 1 > 4 * PyLong_SHIFT) {
-                            return (unsigned int) ((((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 4 * PyLong_SHIFT) {
+                            return (size_t) ((((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
                         }
                     }
                     break;
             }
 #endif
-            if (sizeof(unsigned int) <= sizeof(long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, long, PyLong_AsLong(x))
+            if (sizeof(size_t) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, long, PyLong_AsLong(x))
 #ifdef HAVE_LONG_LONG
-            } else if (sizeof(unsigned int) <= sizeof(PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, PY_LONG_LONG, PyLong_AsLongLong(x))
+            } else if (sizeof(size_t) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, PY_LONG_LONG, PyLong_AsLongLong(x))
 #endif
             }
         }
@@ -7309,7 +10204,7 @@ static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
             PyErr_SetString(PyExc_RuntimeError,
                             "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
 #else
-            unsigned int val;
+            size_t val;
             PyObject *v = __Pyx_PyNumber_IntOrLong(x);
  #if PY_MAJOR_VERSION < 3
             if (likely(v) && !PyLong_Check(v)) {
@@ -7329,47 +10224,47 @@ static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
                     return val;
             }
 #endif
-            return (unsigned int) -1;
+            return (size_t) -1;
         }
     } else {
-        unsigned int val;
+        size_t val;
         PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
-        if (!tmp) return (unsigned int) -1;
-        val = __Pyx_PyInt_As_unsigned_int(tmp);
+        if (!tmp) return (size_t) -1;
+        val = __Pyx_PyInt_As_size_t(tmp);
         Py_DECREF(tmp);
         return val;
     }
 raise_overflow:
     PyErr_SetString(PyExc_OverflowError,
-        "value too large to convert to unsigned int");
-    return (unsigned int) -1;
+        "value too large to convert to size_t");
+    return (size_t) -1;
 raise_neg_overflow:
     PyErr_SetString(PyExc_OverflowError,
-        "can't convert negative value to unsigned int");
-    return (unsigned int) -1;
+        "can't convert negative value to size_t");
+    return (size_t) -1;
 }
 
 /* CIntFromPy */
-static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *x) {
+static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
 #pragma GCC diagnostic push
 #pragma GCC diagnostic ignored "-Wconversion"
 #endif
-    const char neg_one = (char) -1, const_zero = (char) 0;
+    const unsigned int neg_one = (unsigned int) -1, const_zero = (unsigned int) 0;
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
 #pragma GCC diagnostic pop
 #endif
     const int is_unsigned = neg_one > const_zero;
 #if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
-        if (sizeof(char) < sizeof(long)) {
-            __PYX_VERIFY_RETURN_INT(char, long, PyInt_AS_LONG(x))
+        if (sizeof(unsigned int) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(unsigned int, long, PyInt_AS_LONG(x))
         } else {
             long val = PyInt_AS_LONG(x);
             if (is_unsigned && unlikely(val < 0)) {
                 goto raise_neg_overflow;
             }
-            return (char) val;
+            return (unsigned int) val;
         }
     } else
 #endif
@@ -7378,32 +10273,32 @@ static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *x) {
 #if CYTHON_USE_PYLONG_INTERNALS
             const digit* digits = ((PyLongObject*)x)->ob_digit;
             switch (Py_SIZE(x)) {
-                case  0: return (char) 0;
-                case  1: __PYX_VERIFY_RETURN_INT(char, digit, digits[0])
+                case  0: return (unsigned int) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(unsigned int, digit, digits[0])
                 case 2:
-                    if (8 * sizeof(char) > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) >= 2 * PyLong_SHIFT) {
-                            return (char) (((((char)digits[1]) << PyLong_SHIFT) | (char)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) >= 2 * PyLong_SHIFT) {
+                            return (unsigned int) (((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
                         }
                     }
                     break;
                 case 3:
-                    if (8 * sizeof(char) > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) >= 3 * PyLong_SHIFT) {
-                            return (char) (((((((char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) >= 3 * PyLong_SHIFT) {
+                            return (unsigned int) (((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
                         }
                     }
                     break;
                 case 4:
-                    if (8 * sizeof(char) > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) >= 4 * PyLong_SHIFT) {
-                            return (char) (((((((((char)digits[3]) << PyLong_SHIFT) | (char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) >= 4 * PyLong_SHIFT) {
+                            return (unsigned int) (((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
                         }
                     }
                     break;
@@ -7417,86 +10312,86 @@ static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *x) {
             {
                 int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
                 if (unlikely(result < 0))
-                    return (char) -1;
+                    return (unsigned int) -1;
                 if (unlikely(result == 1))
                     goto raise_neg_overflow;
             }
 #endif
-            if (sizeof(char) <= sizeof(unsigned long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(char, unsigned long, PyLong_AsUnsignedLong(x))
+            if (sizeof(unsigned int) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, unsigned long, PyLong_AsUnsignedLong(x))
 #ifdef HAVE_LONG_LONG
-            } else if (sizeof(char) <= sizeof(unsigned PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(char, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+            } else if (sizeof(unsigned int) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
 #endif
             }
         } else {
 #if CYTHON_USE_PYLONG_INTERNALS
             const digit* digits = ((PyLongObject*)x)->ob_digit;
             switch (Py_SIZE(x)) {
-                case  0: return (char) 0;
-                case -1: __PYX_VERIFY_RETURN_INT(char, sdigit, (sdigit) (-(sdigit)digits[0]))
-                case  1: __PYX_VERIFY_RETURN_INT(char,  digit, +digits[0])
+                case  0: return (unsigned int) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(unsigned int, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(unsigned int,  digit, +digits[0])
                 case -2:
-                    if (8 * sizeof(char) - 1 > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) - 1 > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) - 1 > 2 * PyLong_SHIFT) {
-                            return (char) (((char)-1)*(((((char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
+                            return (unsigned int) (((unsigned int)-1)*(((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
                         }
                     }
                     break;
                 case 2:
-                    if (8 * sizeof(char) > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) - 1 > 2 * PyLong_SHIFT) {
-                            return (char) ((((((char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
+                            return (unsigned int) ((((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
                         }
                     }
                     break;
                 case -3:
-                    if (8 * sizeof(char) - 1 > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) - 1 > 3 * PyLong_SHIFT) {
-                            return (char) (((char)-1)*(((((((char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
+                            return (unsigned int) (((unsigned int)-1)*(((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
                         }
                     }
                     break;
                 case 3:
-                    if (8 * sizeof(char) > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) - 1 > 3 * PyLong_SHIFT) {
-                            return (char) ((((((((char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
+                            return (unsigned int) ((((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
                         }
                     }
                     break;
                 case -4:
-                    if (8 * sizeof(char) - 1 > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) - 1 > 4 * PyLong_SHIFT) {
-                            return (char) (((char)-1)*(((((((((char)digits[3]) << PyLong_SHIFT) | (char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 4 * PyLong_SHIFT) {
+                            return (unsigned int) (((unsigned int)-1)*(((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
                         }
                     }
                     break;
                 case 4:
-                    if (8 * sizeof(char) > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(unsigned int) > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(char) - 1 > 4 * PyLong_SHIFT) {
-                            return (char) ((((((((((char)digits[3]) << PyLong_SHIFT) | (char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 4 * PyLong_SHIFT) {
+                            return (unsigned int) ((((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
                         }
                     }
                     break;
             }
 #endif
-            if (sizeof(char) <= sizeof(long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(char, long, PyLong_AsLong(x))
+            if (sizeof(unsigned int) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, long, PyLong_AsLong(x))
 #ifdef HAVE_LONG_LONG
-            } else if (sizeof(char) <= sizeof(PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(char, PY_LONG_LONG, PyLong_AsLongLong(x))
+            } else if (sizeof(unsigned int) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, PY_LONG_LONG, PyLong_AsLongLong(x))
 #endif
             }
         }
@@ -7505,7 +10400,7 @@ static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *x) {
             PyErr_SetString(PyExc_RuntimeError,
                             "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
 #else
-            char val;
+            unsigned int val;
             PyObject *v = __Pyx_PyNumber_IntOrLong(x);
  #if PY_MAJOR_VERSION < 3
             if (likely(v) && !PyLong_Check(v)) {
@@ -7525,47 +10420,47 @@ static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *x) {
                     return val;
             }
 #endif
-            return (char) -1;
+            return (unsigned int) -1;
         }
     } else {
-        char val;
+        unsigned int val;
         PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
-        if (!tmp) return (char) -1;
-        val = __Pyx_PyInt_As_char(tmp);
+        if (!tmp) return (unsigned int) -1;
+        val = __Pyx_PyInt_As_unsigned_int(tmp);
         Py_DECREF(tmp);
         return val;
     }
 raise_overflow:
     PyErr_SetString(PyExc_OverflowError,
-        "value too large to convert to char");
-    return (char) -1;
+        "value too large to convert to unsigned int");
+    return (unsigned int) -1;
 raise_neg_overflow:
     PyErr_SetString(PyExc_OverflowError,
-        "can't convert negative value to char");
-    return (char) -1;
+        "can't convert negative value to unsigned int");
+    return (unsigned int) -1;
 }
 
 /* CIntFromPy */
-static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
+static CYTHON_INLINE char __Pyx_PyInt_As_char(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
 #pragma GCC diagnostic push
 #pragma GCC diagnostic ignored "-Wconversion"
 #endif
-    const size_t neg_one = (size_t) -1, const_zero = (size_t) 0;
+    const char neg_one = (char) -1, const_zero = (char) 0;
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
 #pragma GCC diagnostic pop
 #endif
     const int is_unsigned = neg_one > const_zero;
 #if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
-        if (sizeof(size_t) < sizeof(long)) {
-            __PYX_VERIFY_RETURN_INT(size_t, long, PyInt_AS_LONG(x))
+        if (sizeof(char) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(char, long, PyInt_AS_LONG(x))
         } else {
             long val = PyInt_AS_LONG(x);
             if (is_unsigned && unlikely(val < 0)) {
                 goto raise_neg_overflow;
             }
-            return (size_t) val;
+            return (char) val;
         }
     } else
 #endif
@@ -7574,32 +10469,32 @@ static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
 #if CYTHON_USE_PYLONG_INTERNALS
             const digit* digits = ((PyLongObject*)x)->ob_digit;
             switch (Py_SIZE(x)) {
-                case  0: return (size_t) 0;
-                case  1: __PYX_VERIFY_RETURN_INT(size_t, digit, digits[0])
+                case  0: return (char) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(char, digit, digits[0])
                 case 2:
-                    if (8 * sizeof(size_t) > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) >= 2 * PyLong_SHIFT) {
-                            return (size_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) >= 2 * PyLong_SHIFT) {
+                            return (char) (((((char)digits[1]) << PyLong_SHIFT) | (char)digits[0]));
                         }
                     }
                     break;
                 case 3:
-                    if (8 * sizeof(size_t) > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) >= 3 * PyLong_SHIFT) {
-                            return (size_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) >= 3 * PyLong_SHIFT) {
+                            return (char) (((((((char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0]));
                         }
                     }
                     break;
                 case 4:
-                    if (8 * sizeof(size_t) > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) >= 4 * PyLong_SHIFT) {
-                            return (size_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) >= 4 * PyLong_SHIFT) {
+                            return (char) (((((((((char)digits[3]) << PyLong_SHIFT) | (char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0]));
                         }
                     }
                     break;
@@ -7613,86 +10508,86 @@ static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
             {
                 int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
                 if (unlikely(result < 0))
-                    return (size_t) -1;
+                    return (char) -1;
                 if (unlikely(result == 1))
                     goto raise_neg_overflow;
             }
 #endif
-            if (sizeof(size_t) <= sizeof(unsigned long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(size_t, unsigned long, PyLong_AsUnsignedLong(x))
+            if (sizeof(char) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(char, unsigned long, PyLong_AsUnsignedLong(x))
 #ifdef HAVE_LONG_LONG
-            } else if (sizeof(size_t) <= sizeof(unsigned PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(size_t, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+            } else if (sizeof(char) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(char, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
 #endif
             }
         } else {
 #if CYTHON_USE_PYLONG_INTERNALS
             const digit* digits = ((PyLongObject*)x)->ob_digit;
             switch (Py_SIZE(x)) {
-                case  0: return (size_t) 0;
-                case -1: __PYX_VERIFY_RETURN_INT(size_t, sdigit, (sdigit) (-(sdigit)digits[0]))
-                case  1: __PYX_VERIFY_RETURN_INT(size_t,  digit, +digits[0])
+                case  0: return (char) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(char, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(char,  digit, +digits[0])
                 case -2:
-                    if (8 * sizeof(size_t) - 1 > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) - 1 > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
-                            return (size_t) (((size_t)-1)*(((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(char, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) - 1 > 2 * PyLong_SHIFT) {
+                            return (char) (((char)-1)*(((((char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
                         }
                     }
                     break;
                 case 2:
-                    if (8 * sizeof(size_t) > 1 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) > 1 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
-                            return (size_t) ((((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) - 1 > 2 * PyLong_SHIFT) {
+                            return (char) ((((((char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
                         }
                     }
                     break;
                 case -3:
-                    if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) - 1 > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
-                            return (size_t) (((size_t)-1)*(((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(char, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) - 1 > 3 * PyLong_SHIFT) {
+                            return (char) (((char)-1)*(((((((char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
                         }
                     }
                     break;
                 case 3:
-                    if (8 * sizeof(size_t) > 2 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) > 2 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
-                            return (size_t) ((((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) - 1 > 3 * PyLong_SHIFT) {
+                            return (char) ((((((((char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
                         }
                     }
                     break;
                 case -4:
-                    if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) - 1 > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) - 1 > 4 * PyLong_SHIFT) {
-                            return (size_t) (((size_t)-1)*(((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(char, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) - 1 > 4 * PyLong_SHIFT) {
+                            return (char) (((char)-1)*(((((((((char)digits[3]) << PyLong_SHIFT) | (char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
                         }
                     }
                     break;
                 case 4:
-                    if (8 * sizeof(size_t) > 3 * PyLong_SHIFT) {
+                    if (8 * sizeof(char) > 3 * PyLong_SHIFT) {
                         if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(size_t) - 1 > 4 * PyLong_SHIFT) {
-                            return (size_t) ((((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                            __PYX_VERIFY_RETURN_INT(char, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(char) - 1 > 4 * PyLong_SHIFT) {
+                            return (char) ((((((((((char)digits[3]) << PyLong_SHIFT) | (char)digits[2]) << PyLong_SHIFT) | (char)digits[1]) << PyLong_SHIFT) | (char)digits[0])));
                         }
                     }
                     break;
             }
 #endif
-            if (sizeof(size_t) <= sizeof(long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(size_t, long, PyLong_AsLong(x))
+            if (sizeof(char) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(char, long, PyLong_AsLong(x))
 #ifdef HAVE_LONG_LONG
-            } else if (sizeof(size_t) <= sizeof(PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(size_t, PY_LONG_LONG, PyLong_AsLongLong(x))
+            } else if (sizeof(char) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(char, PY_LONG_LONG, PyLong_AsLongLong(x))
 #endif
             }
         }
@@ -7701,7 +10596,7 @@ static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
             PyErr_SetString(PyExc_RuntimeError,
                             "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
 #else
-            size_t val;
+            char val;
             PyObject *v = __Pyx_PyNumber_IntOrLong(x);
  #if PY_MAJOR_VERSION < 3
             if (likely(v) && !PyLong_Check(v)) {
@@ -7721,24 +10616,24 @@ static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
                     return val;
             }
 #endif
-            return (size_t) -1;
+            return (char) -1;
         }
     } else {
-        size_t val;
+        char val;
         PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
-        if (!tmp) return (size_t) -1;
-        val = __Pyx_PyInt_As_size_t(tmp);
+        if (!tmp) return (char) -1;
+        val = __Pyx_PyInt_As_char(tmp);
         Py_DECREF(tmp);
         return val;
     }
 raise_overflow:
     PyErr_SetString(PyExc_OverflowError,
-        "value too large to convert to size_t");
-    return (size_t) -1;
+        "value too large to convert to char");
+    return (char) -1;
 raise_neg_overflow:
     PyErr_SetString(PyExc_OverflowError,
-        "can't convert negative value to size_t");
-    return (size_t) -1;
+        "can't convert negative value to char");
+    return (char) -1;
 }
 
 /* CIntToPy */
@@ -7817,44 +10712,6 @@ static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
     }
 }
 
-/* CIntToPy */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wconversion"
-#endif
-    const int neg_one = (int) -1, const_zero = (int) 0;
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic pop
-#endif
-    const int is_unsigned = neg_one > const_zero;
-    if (is_unsigned) {
-        if (sizeof(int) < sizeof(long)) {
-            return PyInt_FromLong((long) value);
-        } else if (sizeof(int) <= sizeof(unsigned long)) {
-            return PyLong_FromUnsignedLong((unsigned long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
-            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
-#endif
-        }
-    } else {
-        if (sizeof(int) <= sizeof(long)) {
-            return PyInt_FromLong((long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
-            return PyLong_FromLongLong((PY_LONG_LONG) value);
-#endif
-        }
-    }
-    {
-        int one = 1; int little = (int)*(unsigned char *)&one;
-        unsigned char *bytes = (unsigned char *)&value;
-        return _PyLong_FromByteArray(bytes, sizeof(int),
-                                     little, !is_unsigned);
-    }
-}
-
 /* CIntFromPy */
 static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
@@ -8247,106 +11104,6 @@ raise_neg_overflow:
     return (int) -1;
 }
 
-/* FastTypeChecks */
-#if CYTHON_COMPILING_IN_CPYTHON
-static int __Pyx_InBases(PyTypeObject *a, PyTypeObject *b) {
-    while (a) {
-        a = a->tp_base;
-        if (a == b)
-            return 1;
-    }
-    return b == &PyBaseObject_Type;
-}
-static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b) {
-    PyObject *mro;
-    if (a == b) return 1;
-    mro = a->tp_mro;
-    if (likely(mro)) {
-        Py_ssize_t i, n;
-        n = PyTuple_GET_SIZE(mro);
-        for (i = 0; i < n; i++) {
-            if (PyTuple_GET_ITEM(mro, i) == (PyObject *)b)
-                return 1;
-        }
-        return 0;
-    }
-    return __Pyx_InBases(a, b);
-}
-#if PY_MAJOR_VERSION == 2
-static int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject* exc_type2) {
-    PyObject *exception, *value, *tb;
-    int res;
-    __Pyx_PyThreadState_declare
-    __Pyx_PyThreadState_assign
-    __Pyx_ErrFetch(&exception, &value, &tb);
-    res = exc_type1 ? PyObject_IsSubclass(err, exc_type1) : 0;
-    if (unlikely(res == -1)) {
-        PyErr_WriteUnraisable(err);
-        res = 0;
-    }
-    if (!res) {
-        res = PyObject_IsSubclass(err, exc_type2);
-        if (unlikely(res == -1)) {
-            PyErr_WriteUnraisable(err);
-            res = 0;
-        }
-    }
-    __Pyx_ErrRestore(exception, value, tb);
-    return res;
-}
-#else
-static CYTHON_INLINE int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject *exc_type2) {
-    int res = exc_type1 ? __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type1) : 0;
-    if (!res) {
-        res = __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type2);
-    }
-    return res;
-}
-#endif
-static int __Pyx_PyErr_GivenExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
-    Py_ssize_t i, n;
-    assert(PyExceptionClass_Check(exc_type));
-    n = PyTuple_GET_SIZE(tuple);
-#if PY_MAJOR_VERSION >= 3
-    for (i=0; i<n; i++) {
-        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
-    }
-#endif
-    for (i=0; i<n; i++) {
-        PyObject *t = PyTuple_GET_ITEM(tuple, i);
-        #if PY_MAJOR_VERSION < 3
-        if (likely(exc_type == t)) return 1;
-        #endif
-        if (likely(PyExceptionClass_Check(t))) {
-            if (__Pyx_inner_PyErr_GivenExceptionMatches2(exc_type, NULL, t)) return 1;
-        } else {
-        }
-    }
-    return 0;
-}
-static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject* exc_type) {
-    if (likely(err == exc_type)) return 1;
-    if (likely(PyExceptionClass_Check(err))) {
-        if (likely(PyExceptionClass_Check(exc_type))) {
-            return __Pyx_inner_PyErr_GivenExceptionMatches2(err, NULL, exc_type);
-        } else if (likely(PyTuple_Check(exc_type))) {
-            return __Pyx_PyErr_GivenExceptionMatchesTuple(err, exc_type);
-        } else {
-        }
-    }
-    return PyErr_GivenExceptionMatches(err, exc_type);
-}
-static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *exc_type1, PyObject *exc_type2) {
-    assert(PyExceptionClass_Check(exc_type1));
-    assert(PyExceptionClass_Check(exc_type2));
-    if (likely(err == exc_type1 || err == exc_type2)) return 1;
-    if (likely(PyExceptionClass_Check(err))) {
-        return __Pyx_inner_PyErr_GivenExceptionMatches2(err, exc_type1, exc_type2);
-    }
-    return (PyErr_GivenExceptionMatches(err, exc_type1) || PyErr_GivenExceptionMatches(err, exc_type2));
-}
-#endif
-
 /* CheckBinaryVersion */
 static int __Pyx_check_binary_version(void) {
     char ctversion[5];
@@ -1,5 +1,7 @@
-import attr
-from fuzzysearch.common import Match
+from fuzzysearch.common import Match, clamp_index_range
+from fuzzysearch.instrumentation import report_event
+from libc.limits cimport UINT_MAX
+from libc.stdint cimport SIZE_MAX
 from libc.stdlib cimport malloc, free, realloc
 
 cdef extern from "memmem.h":
@@ -11,6 +13,7 @@ cdef extern from "memmem.h":
 __all__ = [
     'c_find_near_matches_generic_linear_programming',
     'c_find_near_matches_generic_ngrams',
+    'c_has_near_match_generic_linear_programming',
 ]
 
 
@@ -21,8 +24,36 @@ cdef struct GenericSearchCandidate:
 
 ALLOWED_TYPES = (bytes, bytearray)
 
+# marks candidates which were found to be dominated by another candidate
+cdef unsigned int DOMINATED = UINT_MAX
 
-def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params):
+
+class _EnoughMatches(Exception):
+    """Raised internally to stop searching once enough matches were found."""
+
+
+cdef const unsigned char *_get_equivalence_table(equivalences) except? NULL:
+    """Get a pointer to an EquivalenceTable's data, or NULL for None."""
+    if equivalences is None:
+        return NULL
+    cdef const char *table = equivalences.table
+    if len(equivalences.table) != 256 * 256:
+        raise ValueError('an equivalence table must be of length 256*256')
+    return <const unsigned char *> table
+
+
+cdef inline bint items_match(const unsigned char *table,
+                             char seq_item, char subseq_item):
+    if table is NULL:
+        return seq_item == subseq_item
+    return table[(<unsigned char> seq_item) << 8 | <unsigned char> subseq_item] != 0
+
+
+def c_find_near_matches_generic_linear_programming(subsequence, sequence, search_params,
+                                                   start_index=0, end_index=None,
+                                                   equivalences=None,
+                                                   max_candidates=None,
+                                                   merge_starts=False):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -32,6 +63,17 @@ def c_find_near_matches_generic_linear_programming(subsequence, sequence, search
     * the maximum allowed number of new characters inserted
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
+
+    Only sequence[start_index:end_index] is searched, but the indexes of the
+    matches are relative to the start of the entire sequence.
+
+    If an EquivalenceTable is given, items are compared according to it.
+
+    If the number of candidates kept exceeds max_candidates, the search is
+    abandoned and None is returned instead; see MAX_LP_CANDIDATES in
+    generic_search.py.  With merge_starts=True, candidates with different
+    starts are pruned together, which bounds their number, and only the
+    best match of every group of overlapping matches is sure to be found.
     """
     if not isinstance(sequence, ALLOWED_TYPES):
         raise TypeError('sequence is of invalid type %s' % type(subsequence))
@@ -42,19 +84,125 @@ def c_find_near_matches_generic_linear_programming(subsequence, sequence, search
         raise ValueError('Given subsequence is empty!')
 
     max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
+    start_index, end_index = clamp_index_range(sequence, start_index, end_index)
 
     cdef const char *c_subsequence = subsequence
     cdef const char *c_sequence = sequence
 
     return _c_find_near_matches_generic_linear_programming(
         c_subsequence, len(subsequence),
-        c_sequence, len(sequence),
+        c_sequence + <size_t> start_index, end_index - start_index,
+        max_substitutions if max_substitutions is not None else (1<<29),
+        max_insertions if max_insertions is not None else (1<<29),
+        max_deletions if max_deletions is not None else (1<<29),
+        max_l_dist if max_l_dist is not None else (1<<29),
+        0,
+        start_index,
+        _get_equivalence_table(equivalences),
+        SIZE_MAX if max_candidates is None else max_candidates,
+        merge_starts,
+    )
+
+def c_has_near_match_generic_linear_programming(subsequence, sequence, search_params,
+                                                start_index=0, end_index=None,
+                                                equivalences=None,
+                                                max_candidates=None):
+    """check whether there is any near-match of subsequence in sequence
+
+    This stops searching at the first match found.  See
+    c_find_near_matches_generic_linear_programming() regarding
+    max_candidates; if it is exceeded before a match is found, None is
+    returned.
+    """
+    if not isinstance(sequence, ALLOWED_TYPES):
+        raise TypeError('sequence is of invalid type %s' % type(subsequence))
+    if not isinstance(subsequence, ALLOWED_TYPES):
+        raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+
+    max_substitutions, max_insertions, max_deletions, max_l_dist = search_params.unpacked
+    start_index, end_index = clamp_index_range(sequence, start_index, end_index)
+
+    cdef const char *c_subsequence = subsequence
+    cdef const char *c_sequence = sequence
+
+    matches = _c_find_near_matches_generic_linear_programming(
+        c_subsequence, len(subsequence),
+        c_sequence + <size_t> start_index, end_index - start_index,
         max_substitutions if max_substitutions is not None else (1<<29),
         max_insertions if max_insertions is not None else (1<<29),
         max_deletions if max_deletions is not None else (1<<29),
         max_l_dist if max_l_dist is not None else (1<<29),
+        1,
+        start_index,
+        _get_equivalence_table(equivalences),
+        SIZE_MAX if max_candidates is None else max_candidates,
+        False,
+    )
+    return None if matches is None else bool(matches)
+
+cdef inline bint _dominates(const GenericSearchCandidate *cand1,
+                            const GenericSearchCandidate *cand2) nogil:
+    return (
+        cand1.start <= cand2.start and
+        cand1.l_dist <= cand2.l_dist and
+        cand1.n_subs <= cand2.n_subs and
+        cand1.n_ins <= cand2.n_ins and
+        cand1.n_dels <= cand2.n_dels
     )
 
+
+cdef inline void _add_candidate(GenericSearchCandidate cand,
+                                GenericSearchCandidate *candidates,
+                                size_t *n_candidates,
+                                Py_ssize_t *next_in_group,
+                                size_t *group_starts,
+                                Py_ssize_t *group_heads,
+                                bint merge_starts) nogil:
+    """Add a candidate, unless another candidate dominates it.
+
+    Of two candidates with the same start and subseq_index, if one has no
+    more edits of any kind than the other, it will always do at least as
+    well, so the other is redundant.  Candidates with the same subseq_index
+    and start are chained together via next_in_group, beginning at
+    group_heads[subseq_index]; group_starts[subseq_index] is the start of
+    the candidates in that chain, or SIZE_MAX if there are none.
+    Candidates made redundant by the new one are marked as DOMINATED.
+
+    With merge_starts, candidates with different starts are compared too;
+    see _prune_dominated_candidates() in generic_search.py.  All of the
+    candidates with each subseq_index are then in the same chain.
+    """
+    cdef size_t key = cand.subseq_index
+    cdef size_t group_start = 0 if merge_starts else cand.start
+    cdef Py_ssize_t i, prev_i = -1
+
+    if group_starts[key] == group_start:
+        i = group_heads[key]
+        while i != -1:
+            if _dominates(&candidates[i], &cand):
+                return
+            if _dominates(&cand, &candidates[i]):
+                candidates[i].l_dist = DOMINATED
+                if prev_i == -1:
+                    group_heads[key] = next_in_group[i]
+                else:
+                    next_in_group[prev_i] = next_in_group[i]
+            else:
+                prev_i = i
+            i = next_in_group[i]
+    else:
+        group_starts[key] = group_start
+        group_heads[key] = -1
+
+    candidates[n_candidates[0]] = cand
+    next_in_group[n_candidates[0]] = group_heads[key]
+    group_heads[key] = n_candidates[0]
+    n_candidates[0] += 1
+
+
 # The following MUST be a cdef, otherwise Cython copies the sequence and
 # subsequence strings, which means if they contain null bytes the data after
 # the first null byte will not be copied.
@@ -65,7 +213,20 @@ cdef _c_find_near_matches_generic_linear_programming(
         unsigned int max_insertions,
         unsigned int max_deletions,
         unsigned int max_l_dist,
+        size_t max_matches,
+        size_t index_offset,
+        const unsigned char *table,
+        size_t max_candidates,
+        bint merge_starts,
 ):
+    """Find matches; if max_matches isn't zero, stop after that many.
+
+    index_offset is added to the start and end indexes of the matches.
+    If table isn't NULL, it is used as an equivalence table.  If there
+    are ever more than max_candidates candidates, None is returned.  With
+    merge_starts, candidates with different starts are pruned together;
+    see _add_candidate().
+    """
     cdef unsigned int subseq_len_minus_one = subseq_len - 1
 
     cdef size_t alloc_size
@@ -75,20 +236,36 @@ cdef _c_find_near_matches_generic_linear_programming(
     cdef GenericSearchCandidate cand
     cdef size_t n_candidates = 0
     cdef size_t n_new_candidates = 0
-    cdef size_t n_cand
+    cdef size_t n_cand, n_kept
+    # for pruning dominated candidates; see _add_candidate()
+    cdef Py_ssize_t *next_in_group
+    cdef Py_ssize_t *_tmp_next_in_group
+    cdef size_t *group_starts
+    cdef Py_ssize_t *group_heads
 
     alloc_size = min(<size_t> 10, subseq_len * 3 + 1)
     candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
-    if candidates is NULL:
-        raise MemoryError()
     new_candidates = <GenericSearchCandidate *> malloc(alloc_size * sizeof(GenericSearchCandidate))
-    if candidates is NULL:
+    next_in_group = <Py_ssize_t *> malloc(alloc_size * sizeof(Py_ssize_t))
+    group_starts = <size_t *> malloc(subseq_len * sizeof(size_t))
+    group_heads = <Py_ssize_t *> malloc(subseq_len * sizeof(Py_ssize_t))
+    if candidates is NULL or new_candidates is NULL or next_in_group is NULL or \
+            group_starts is NULL or group_heads is NULL:
         free(candidates)
+        free(new_candidates)
+        free(next_in_group)
+        free(group_starts)
+        free(group_heads)
         raise MemoryError()
+    for n_cand in xrange(subseq_len):
+        group_starts[n_cand] = SIZE_MAX
 
     matches = []
     def add_match(start, end, dist):
-        matches.append(Match(start, end, dist, matched=sequence[start:end]))
+        matches.append(Match(start + index_offset, end + index_offset, dist,
+                             matched=sequence[start:end]))
+        if len(matches) == max_matches:
+            raise _EnoughMatches()
 
     cdef size_t index
     cdef char seq_char
@@ -110,21 +287,29 @@ cdef _c_find_near_matches_generic_linear_programming(
                     if _tmp is NULL:
                         raise MemoryError()
                     new_candidates = _tmp
+                    _tmp_next_in_group = <Py_ssize_t *>realloc(next_in_group, alloc_size * sizeof(Py_ssize_t))
+                    if _tmp_next_in_group is NULL:
+                        raise MemoryError()
+                    next_in_group = _tmp_next_in_group
                     have_realloced = True
 
                 # if this sequence char is the candidate's next expected char
-                if seq_char == subsequence[cand.subseq_index]:
+                if items_match(table, seq_char, subsequence[cand.subseq_index]):
                     # if reached the end of the subsequence, return a match
                     if cand.subseq_index == subseq_len_minus_one:
                         add_match(cand.start, index + 1, cand.l_dist)
                     # otherwise, update the candidate's subseq_index and keep it
                     else:
-                        new_candidates[n_new_candidates] = GenericSearchCandidate(
-                            cand.start, cand.subseq_index + 1,
-                            cand.l_dist, cand.n_subs,
-                            cand.n_ins, cand.n_dels,
+                        _add_candidate(
+                            GenericSearchCandidate(
+                                cand.start, cand.subseq_index + 1,
+                                cand.l_dist, cand.n_subs,
+                                cand.n_ins, cand.n_dels,
+                            ),
+                            new_candidates, &n_new_candidates,
+                            next_in_group, group_starts, group_heads,
+                            merge_starts,
                         )
-                        n_new_candidates += 1
 
                 # if this sequence char is *not* the candidate's next expected char
                 else:
@@ -136,32 +321,44 @@ cdef _c_find_near_matches_generic_linear_programming(
 
                     if cand.n_ins < max_insertions:
                         # add a candidate skipping a sequence char
-                        new_candidates[n_new_candidates] = GenericSearchCandidate(
-                            cand.start, cand.subseq_index,
-                            cand.l_dist + 1, cand.n_subs,
-                            cand.n_ins + 1, cand.n_dels,
+                        _add_candidate(
+                            GenericSearchCandidate(
+                                cand.start, cand.subseq_index,
+                                cand.l_dist + 1, cand.n_subs,
+                                cand.n_ins + 1, cand.n_dels,
+                            ),
+                            new_candidates, &n_new_candidates,
+                            next_in_group, group_starts, group_heads,
+                            merge_starts,
                         )
-                        n_new_candidates += 1
 
                     if cand.subseq_index + 1 < subseq_len:
                         if cand.n_subs < max_substitutions:
                             # add a candidate skipping both a sequence char and a
                             # subsequence char
-                            new_candidates[n_new_candidates] = GenericSearchCandidate(
-                                cand.start, cand.subseq_index + 1,
-                                cand.l_dist + 1, cand.n_subs + 1,
-                                cand.n_ins, cand.n_dels,
+                            _add_candidate(
+                                GenericSearchCandidate(
+                                    cand.start, cand.subseq_index + 1,
+                                    cand.l_dist + 1, cand.n_subs + 1,
+                                    cand.n_ins, cand.n_dels,
+                                ),
+                                new_candidates, &n_new_candidates,
+                                next_in_group, group_starts, group_heads,
+                                merge_starts,
                             )
-                            n_new_candidates += 1
                         elif cand.n_dels < max_deletions and cand.n_ins < max_insertions:
                             # add a candidate skipping both a sequence char and a
                             # subsequence char
-                            new_candidates[n_new_candidates] = GenericSearchCandidate(
-                                cand.start, cand.subseq_index + 1,
-                                cand.l_dist + 1, cand.n_subs,
-                                cand.n_ins + 1, cand.n_dels + 1,
+                            _add_candidate(
+                                GenericSearchCandidate(
+                                    cand.start, cand.subseq_index + 1,
+                                    cand.l_dist + 1, cand.n_subs,
+                                    cand.n_ins + 1, cand.n_dels + 1,
+                                ),
+                                new_candidates, &n_new_candidates,
+                                next_in_group, group_starts, group_heads,
+                                merge_starts,
                             )
-                            n_new_candidates += 1
                     else:
                         # cand.subseq_index == _subseq_len - 1
                         if (
@@ -183,7 +380,7 @@ cdef _c_find_near_matches_generic_linear_programming(
                         # otherwise, if skipping n_skipped sub-sequence chars
                         # reaches a sub-sequence char identical to this sequence
                         # char ...
-                        elif seq_char == subsequence[cand.subseq_index + n_skipped]:
+                        elif items_match(table, seq_char, subsequence[cand.subseq_index + n_skipped]):
                             # if this is the last char of the sub-sequence, yield
                             # a match
                             if cand.subseq_index + n_skipped + 1 == subseq_len:
@@ -191,17 +388,39 @@ cdef _c_find_near_matches_generic_linear_programming(
                             # otherwise add a candidate skipping n_skipped
                             # subsequence chars
                             else:
-                                new_candidates[n_new_candidates] = GenericSearchCandidate(
-                                    cand.start, cand.subseq_index + 1 + n_skipped,
-                                    cand.l_dist + n_skipped, cand.n_subs,
-                                    cand.n_ins, cand.n_dels + n_skipped,
+                                _add_candidate(
+                                    GenericSearchCandidate(
+                                        cand.start, cand.subseq_index + 1 + n_skipped,
+                                        cand.l_dist + n_skipped, cand.n_subs,
+                                        cand.n_ins, cand.n_dels + n_skipped,
+                                    ),
+                                    new_candidates, &n_new_candidates,
+                                    next_in_group, group_starts, group_heads,
+                                    merge_starts,
                                 )
-                                n_new_candidates += 1
                             break
                     # note: if the above loop ends without a break, that means that
                     # no candidate could be added / yielded by skipping sub-sequence
                     # chars
 
+            # drop the dominated candidates, and reset the groups for the
+            # next step
+            n_kept = 0
+            for n_cand in xrange(n_new_candidates):
+                group_starts[new_candidates[n_cand].subseq_index] = SIZE_MAX
+                if new_candidates[n_cand].l_dist != DOMINATED:
+                    new_candidates[n_kept] = new_candidates[n_cand]
+                    n_kept += 1
+            n_new_candidates = n_kept
+
+            if not merge_starts and n_new_candidates > max_candidates:
+                report_event('lp_candidates_limit',
+                             search='c_generic_linear_programming',
+                             index=index + index_offset,
+                             n_candidates=n_new_candidates,
+                             max_candidates=max_candidates)
+                return None
+
             # new_candidates = candidates; candidates = []
             _tmp = candidates
             candidates = new_candidates
@@ -226,15 +445,22 @@ cdef _c_find_near_matches_generic_linear_programming(
                cand.l_dist + n_skipped <= max_l_dist:
                 add_match(cand.start, index, cand.l_dist + n_skipped)
 
+    except _EnoughMatches:
+        pass
+
     finally:
         free(candidates)
         free(new_candidates)
+        free(next_in_group)
+        free(group_starts)
+        free(group_heads)
 
     return matches
 
 
 
-def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):
+def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params,
+                                       max_candidates=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -244,6 +470,10 @@ def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):
     * the maximum allowed number of new characters inserted
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
+
+    See c_find_near_matches_generic_linear_programming() regarding
+    max_candidates.  Windows of the sequence in which it is exceeded are
+    searched again with merge_starts=True.
     """
     if not isinstance(sequence, ALLOWED_TYPES):
         raise TypeError('sequence is of invalid type %s' % type(subsequence))
@@ -270,6 +500,8 @@ def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):
         c_max_substitutions + c_max_insertions + c_max_deletions,
     )
 
+    cdef size_t c_max_candidates = SIZE_MAX if max_candidates is None else max_candidates
+
     cdef const char* c_sequence = sequence
     cdef const char* c_subsequence = subsequence
 
@@ -277,14 +509,18 @@ def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):
     if ngram_len == 0:
         raise ValueError('the subsequence length must be greater than max_l_dist')
 
-    cdef int index, small_search_start_index
+    cdef Py_ssize_t window_start, window_end
+    cdef Py_ssize_t merged_start = -1, merged_end = -1
     cdef size_t ngram_start
 
     cdef char *match_ptr
     cdef int subseq_sum
 
-    matches = []
+    # find the windows of the sequence around the exact matches of n-grams
+    windows = []
     for ngram_start in xrange(0, _subseq_len - ngram_len + 1, ngram_len):
+        if ngram_start + ngram_len > _seq_len:
+            break
         subseq_sum = calc_sum(c_subsequence + ngram_start, ngram_len)
 
         match_ptr = <char *>simple_memmem_with_needle_sum(
@@ -295,27 +531,50 @@ def c_find_near_matches_generic_ngrams(subsequence, sequence, search_params):
             subseq_sum)
 
         while match_ptr != NULL:
-            small_search_start_index = (match_ptr - c_sequence) - ngram_start - c_max_l_dist
-            small_search_length = _subseq_len + (2 * c_max_l_dist)
-            if small_search_start_index < 0:
-                small_search_length += small_search_start_index
-                small_search_start_index = 0
-            if small_search_start_index + small_search_length > _seq_len:
-                small_search_length = _seq_len - small_search_start_index
-            # try to expand left and/or right according to n_ngram
-            for match in _c_find_near_matches_generic_linear_programming(
-                c_subsequence, _subseq_len,
-                c_sequence + small_search_start_index,
-                small_search_length,
-                c_max_substitutions, c_max_insertions, c_max_deletions, c_max_l_dist,
-            ):
-                matches.append(attr.evolve(match,
-                    start=match.start + small_search_start_index,
-                    end=match.end + small_search_start_index,
-                ))
+            window_start = (match_ptr - c_sequence) - <Py_ssize_t> ngram_start - c_max_l_dist
+            window_end = window_start + <Py_ssize_t> (_subseq_len + 2 * c_max_l_dist)
+            if window_start < 0:
+                window_start = 0
+            if window_end > <Py_ssize_t> _seq_len:
+                window_end = _seq_len
+            windows.append((window_start, window_end))
             match_ptr = <char *>simple_memmem_with_needle_sum(
                 <char *>match_ptr + 1, _seq_len - (match_ptr - c_sequence) - 1,
                 <char *>c_subsequence + ngram_start, ngram_len,
                 subseq_sum)
 
+    # merge overlapping windows, so that each is searched only once
+    windows.sort()
+    merged_windows = []
+    for window_start, window_end in windows:
+        if merged_end != -1 and window_start <= merged_end:
+            if window_end > merged_end:
+                merged_end = window_end
+            continue
+        if merged_end != -1:
+            merged_windows.append((merged_start, merged_end))
+        merged_start, merged_end = window_start, window_end
+    if merged_end != -1:
+        merged_windows.append((merged_start, merged_end))
+
+    # search the windows directly in the sequence
+    matches = []
+    for merged_start, merged_end in merged_windows:
+        window_matches = _c_find_near_matches_generic_linear_programming(
+            c_subsequence, _subseq_len,
+            c_sequence + merged_start, merged_end - merged_start,
+            c_max_substitutions, c_max_insertions, c_max_deletions, c_max_l_dist,
+            0, merged_start, NULL, c_max_candidates, False,
+        )
+        if window_matches is None:
+            # too many candidates; search the window again, pruning
+            # candidates with different starts together
+            window_matches = _c_find_near_matches_generic_linear_programming(
+                c_subsequence, _subseq_len,
+                c_sequence + merged_start, merged_end - merged_start,
+                c_max_substitutions, c_max_insertions, c_max_deletions, c_max_l_dist,
+                0, merged_start, NULL, SIZE_MAX, True,
+            )
+        matches.extend(window_matches)
+
     return matches
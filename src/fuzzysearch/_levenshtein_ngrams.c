@@ -906,6 +906,18 @@ static const char *__pyx_filename;
 static const char *__pyx_f[] = {
   "src/fuzzysearch/_levenshtein_ngrams.pyx",
 };
+/* NoFastGil.proto */
+#define __Pyx_PyGILState_Ensure PyGILState_Ensure
+#define __Pyx_PyGILState_Release PyGILState_Release
+#define __Pyx_FastGIL_Remember()
+#define __Pyx_FastGIL_Forget()
+#define __Pyx_FastGilFuncInit()
+
+/* ForceInitThreads.proto */
+#ifndef __PYX_FORCE_INIT_THREADS
+  #define __PYX_FORCE_INIT_THREADS 0
+#endif
+
 
 /*--- Type declarations ---*/
 
@@ -1179,6 +1191,30 @@ static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UIN
 #define __PYX_PY_DICT_LOOKUP_IF_MODIFIED(VAR, DICT, LOOKUP)  (VAR) = (LOOKUP);
 #endif
 
+/* GetModuleGlobalName.proto */
+#if CYTHON_USE_DICT_VERSIONS
+#define __Pyx_GetModuleGlobalName(var, name)  {\
+    static PY_UINT64_T __pyx_dict_version = 0;\
+    static PyObject *__pyx_dict_cached_value = NULL;\
+    (var) = (likely(__pyx_dict_version == __PYX_GET_DICT_VERSION(__pyx_d))) ?\
+        (likely(__pyx_dict_cached_value) ? __Pyx_NewRef(__pyx_dict_cached_value) : __Pyx_GetBuiltinName(name)) :\
+        __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
+}
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  {\
+    PY_UINT64_T __pyx_dict_version;\
+    PyObject *__pyx_dict_cached_value;\
+    (var) = __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
+}
+static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value);
+#else
+#define __Pyx_GetModuleGlobalName(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
+static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name);
+#endif
+
+/* RaiseException.proto */
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
+
 /* CLineInTraceback.proto */
 #ifdef CYTHON_CLINE_IN_TRACEBACK
 #define __Pyx_CLineForTraceback(tstate, c_line)  (((CYTHON_CLINE_IN_TRACEBACK)) ? c_line : 0)
@@ -1210,6 +1246,9 @@ static void __Pyx_AddTraceback(const char *funcname, int c_line,
 #define __Pyx_HAS_GCC_DIAGNOSTIC
 #endif
 
+/* CIntFromPy.proto */
+static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
+
 /* CIntToPy.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value);
 
@@ -1222,9 +1261,6 @@ static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *);
 /* CIntToPy.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
 
-/* CIntFromPy.proto */
-static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
-
 /* CIntFromPy.proto */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
 
@@ -1253,6 +1289,10 @@ static int __Pyx_InitStrings(__Pyx_StringTabEntry *t);
 /* Module declarations from 'libc.stdlib' */
 
 /* Module declarations from 'fuzzysearch._levenshtein_ngrams' */
+static int __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_short_strided(unsigned char const *, Py_ssize_t, Py_ssize_t, unsigned char const *, Py_ssize_t, Py_ssize_t, long, long *, long *, Py_ssize_t *); /*proto*/
+static int __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_long_strided(unsigned char const *, Py_ssize_t, Py_ssize_t, unsigned char const *, Py_ssize_t, Py_ssize_t, long, long *, long *, Py_ssize_t *); /*proto*/
+static CYTHON_INLINE long __pyx_f_11fuzzysearch_19_levenshtein_ngrams__min3(long, long, long); /*proto*/
+static CYTHON_INLINE int __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_strided(unsigned char const *, Py_ssize_t, Py_ssize_t, unsigned char const *, Py_ssize_t, Py_ssize_t, long, long *, long *, Py_ssize_t *); /*proto*/
 #define __Pyx_MODULE_NAME "fuzzysearch._levenshtein_ngrams"
 extern int __pyx_module_is_main_fuzzysearch___levenshtein_ngrams;
 int __pyx_module_is_main_fuzzysearch___levenshtein_ngrams = 0;
@@ -1261,6 +1301,9 @@ int __pyx_module_is_main_fuzzysearch___levenshtein_ngrams = 0;
 static PyObject *__pyx_builtin_MemoryError;
 static PyObject *__pyx_builtin_xrange;
 static PyObject *__pyx_builtin_enumerate;
+static PyObject *__pyx_builtin_range;
+static PyObject *__pyx_builtin_TypeError;
+static PyObject *__pyx_builtin_ValueError;
 static const char __pyx_k_a[] = "a";
 static const char __pyx_k_b[] = "b";
 static const char __pyx_k_c[] = "c";
@@ -1268,43 +1311,78 @@ static const char __pyx_k_all[] = "__all__";
 static const char __pyx_k_main[] = "__main__";
 static const char __pyx_k_name[] = "__name__";
 static const char __pyx_k_test[] = "__test__";
+static const char __pyx_k_found[] = "found";
+static const char __pyx_k_index[] = "index";
 static const char __pyx_k_range[] = "range";
 static const char __pyx_k_scores[] = "scores";
 static const char __pyx_k_xrange[] = "xrange";
 static const char __pyx_k_seq_idx[] = "seq_idx";
 static const char __pyx_k_seq_char[] = "seq_char";
 static const char __pyx_k_sequence[] = "sequence";
+static const char __pyx_k_TypeError[] = "TypeError";
+static const char __pyx_k_dist_left[] = "dist_left";
 static const char __pyx_k_enumerate[] = "enumerate";
 static const char __pyx_k_min_score[] = "min_score";
+static const char __pyx_k_ngram_end[] = "ngram_end";
+static const char __pyx_k_ngram_len[] = "ngram_len";
+static const char __pyx_k_range_end[] = "range_end";
 static const char __pyx_k_seq_index[] = "seq_index";
+static const char __pyx_k_ValueError[] = "ValueError";
+static const char __pyx_k_c_sequence[] = "c_sequence";
+static const char __pyx_k_dist_right[] = "dist_right";
 static const char __pyx_k_max_l_dist[] = "max_l_dist";
 static const char __pyx_k_subseq_idx[] = "subseq_idx";
 static const char __pyx_k_subseq_len[] = "subseq_len";
 static const char __pyx_k_MemoryError[] = "MemoryError";
+static const char __pyx_k_ngram_start[] = "ngram_start";
+static const char __pyx_k_range_start[] = "range_start";
 static const char __pyx_k_subsequence[] = "subsequence";
+static const char __pyx_k_left_seq_len[] = "left_seq_len";
 static const char __pyx_k_subseq_index[] = "subseq_index";
+static const char __pyx_k_ALLOWED_TYPES[] = "ALLOWED_TYPES";
 static const char __pyx_k_c_expand_long[] = "c_expand_long";
+static const char __pyx_k_c_subsequence[] = "c_subsequence";
 static const char __pyx_k_min_score_idx[] = "min_score_idx";
+static const char __pyx_k_right_seq_len[] = "right_seq_len";
 static const char __pyx_k_c_expand_short[] = "c_expand_short";
 static const char __pyx_k_max_good_score[] = "max_good_score";
+static const char __pyx_k_left_expand_size[] = "left_expand_size";
+static const char __pyx_k_right_expand_size[] = "right_expand_size";
 static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
 static const char __pyx_k_needle_idx_range_end[] = "needle_idx_range_end";
 static const char __pyx_k_min_intermediate_score[] = "min_intermediate_score";
 static const char __pyx_k_needle_idx_range_start[] = "needle_idx_range_start";
 static const char __pyx_k_new_needle_idx_range_end[] = "new_needle_idx_range_end";
 static const char __pyx_k_new_needle_idx_range_start[] = "new_needle_idx_range_start";
+static const char __pyx_k_sequence_is_of_invalid_type_s[] = "sequence is of invalid type %s";
+static const char __pyx_k_c_expand_ngram_match_byteslike[] = "c_expand_ngram_match_byteslike";
 static const char __pyx_k_fuzzysearch__levenshtein_ngrams[] = "fuzzysearch._levenshtein_ngrams";
+static const char __pyx_k_invalid_n_gram_match_or_index_ra[] = "invalid n-gram match or index range";
 static const char __pyx_k_src_fuzzysearch__levenshtein_ngr[] = "src/fuzzysearch/_levenshtein_ngrams.pyx";
+static const char __pyx_k_subsequence_is_of_invalid_type_s[] = "subsequence is of invalid type %s";
+static PyObject *__pyx_n_s_ALLOWED_TYPES;
 static PyObject *__pyx_n_s_MemoryError;
+static PyObject *__pyx_n_s_TypeError;
+static PyObject *__pyx_n_s_ValueError;
 static PyObject *__pyx_n_s_a;
 static PyObject *__pyx_n_s_all;
 static PyObject *__pyx_n_s_b;
 static PyObject *__pyx_n_s_c;
 static PyObject *__pyx_n_s_c_expand_long;
+static PyObject *__pyx_n_s_c_expand_ngram_match_byteslike;
 static PyObject *__pyx_n_s_c_expand_short;
+static PyObject *__pyx_n_s_c_sequence;
+static PyObject *__pyx_n_s_c_subsequence;
 static PyObject *__pyx_n_s_cline_in_traceback;
+static PyObject *__pyx_n_s_dist_left;
+static PyObject *__pyx_n_s_dist_right;
 static PyObject *__pyx_n_s_enumerate;
+static PyObject *__pyx_n_s_found;
 static PyObject *__pyx_n_s_fuzzysearch__levenshtein_ngrams;
+static PyObject *__pyx_n_s_index;
+static PyObject *__pyx_kp_s_invalid_n_gram_match_or_index_ra;
+static PyObject *__pyx_n_s_left_expand_size;
+static PyObject *__pyx_n_s_left_seq_len;
 static PyObject *__pyx_n_s_main;
 static PyObject *__pyx_n_s_max_good_score;
 static PyObject *__pyx_n_s_max_l_dist;
@@ -1316,29 +1394,42 @@ static PyObject *__pyx_n_s_needle_idx_range_end;
 static PyObject *__pyx_n_s_needle_idx_range_start;
 static PyObject *__pyx_n_s_new_needle_idx_range_end;
 static PyObject *__pyx_n_s_new_needle_idx_range_start;
+static PyObject *__pyx_n_s_ngram_end;
+static PyObject *__pyx_n_s_ngram_len;
+static PyObject *__pyx_n_s_ngram_start;
 static PyObject *__pyx_n_s_range;
+static PyObject *__pyx_n_s_range_end;
+static PyObject *__pyx_n_s_range_start;
+static PyObject *__pyx_n_s_right_expand_size;
+static PyObject *__pyx_n_s_right_seq_len;
 static PyObject *__pyx_n_s_scores;
 static PyObject *__pyx_n_s_seq_char;
 static PyObject *__pyx_n_s_seq_idx;
 static PyObject *__pyx_n_s_seq_index;
 static PyObject *__pyx_n_s_sequence;
+static PyObject *__pyx_kp_s_sequence_is_of_invalid_type_s;
 static PyObject *__pyx_kp_s_src_fuzzysearch__levenshtein_ngr;
 static PyObject *__pyx_n_s_subseq_idx;
 static PyObject *__pyx_n_s_subseq_index;
 static PyObject *__pyx_n_s_subseq_len;
 static PyObject *__pyx_n_s_subsequence;
+static PyObject *__pyx_kp_s_subsequence_is_of_invalid_type_s;
 static PyObject *__pyx_n_s_test;
 static PyObject *__pyx_n_s_xrange;
 static PyObject *__pyx_pf_11fuzzysearch_19_levenshtein_ngrams_c_expand_short(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_max_l_dist); /* proto */
 static PyObject *__pyx_pf_11fuzzysearch_19_levenshtein_ngrams_2c_expand_long(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, PyObject *__pyx_v_max_l_dist); /* proto */
+static PyObject *__pyx_pf_11fuzzysearch_19_levenshtein_ngrams_4c_expand_ngram_match_byteslike(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, Py_ssize_t __pyx_v_ngram_start, Py_ssize_t __pyx_v_ngram_end, Py_ssize_t __pyx_v_index, Py_ssize_t __pyx_v_range_start, Py_ssize_t __pyx_v_range_end, long __pyx_v_max_l_dist); /* proto */
 static PyObject *__pyx_int_0;
 static PyObject *__pyx_int_1;
 static PyObject *__pyx_tuple_;
 static PyObject *__pyx_tuple__2;
 static PyObject *__pyx_tuple__3;
-static PyObject *__pyx_tuple__5;
-static PyObject *__pyx_codeobj__4;
-static PyObject *__pyx_codeobj__6;
+static PyObject *__pyx_tuple__4;
+static PyObject *__pyx_tuple__6;
+static PyObject *__pyx_tuple__8;
+static PyObject *__pyx_codeobj__5;
+static PyObject *__pyx_codeobj__7;
+static PyObject *__pyx_codeobj__9;
 /* Late includes */
 
 /* "fuzzysearch/_levenshtein_ngrams.pyx":9
@@ -2946,6 +3037,8 @@ static PyObject *__pyx_pf_11fuzzysearch_19_levenshtein_ngrams_2c_expand_long(CYT
  * 
  *     finally:
  *         free(scores)             # <<<<<<<<<<<<<<
+ * 
+ * 
  */
   /*finally:*/ {
     __pyx_L8_error:;
@@ -3024,221 +3117,2104 @@ static PyObject *__pyx_pf_11fuzzysearch_19_levenshtein_ngrams_2c_expand_long(CYT
   return __pyx_r;
 }
 
-static PyMethodDef __pyx_methods[] = {
-  {0, 0, 0, 0}
-};
+/* "fuzzysearch/_levenshtein_ngrams.pyx":170
+ * # max_l_dist.  The scores array must have room for subseq_len items.
+ * 
+ * cdef int _expand_short_strided(             # <<<<<<<<<<<<<<
+ *         const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+ *         const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+ */
 
-#if PY_MAJOR_VERSION >= 3
-#if CYTHON_PEP489_MULTI_PHASE_INIT
-static PyObject* __pyx_pymod_create(PyObject *spec, PyModuleDef *def); /*proto*/
-static int __pyx_pymod_exec__levenshtein_ngrams(PyObject* module); /*proto*/
-static PyModuleDef_Slot __pyx_moduledef_slots[] = {
-  {Py_mod_create, (void*)__pyx_pymod_create},
-  {Py_mod_exec, (void*)__pyx_pymod_exec__levenshtein_ngrams},
-  {0, NULL}
-};
-#endif
+static int __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_short_strided(unsigned char const *__pyx_v_subseq, Py_ssize_t __pyx_v_subseq_step, Py_ssize_t __pyx_v_subseq_len, unsigned char const *__pyx_v_seq, Py_ssize_t __pyx_v_seq_step, Py_ssize_t __pyx_v_seq_len, long __pyx_v_max_l_dist, long *__pyx_v_scores, long *__pyx_v_dist, Py_ssize_t *__pyx_v_size) {
+  Py_ssize_t __pyx_v_subseq_index;
+  Py_ssize_t __pyx_v_seq_index;
+  long __pyx_v_a;
+  long __pyx_v_b;
+  long __pyx_v_c;
+  long __pyx_v_min_intermediate_score;
+  long __pyx_v_min_score;
+  Py_ssize_t __pyx_v_min_score_idx;
+  unsigned char __pyx_v_seq_char;
+  int __pyx_r;
+  int __pyx_t_1;
+  Py_ssize_t __pyx_t_2;
+  Py_ssize_t __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":177
+ *     cdef Py_ssize_t subseq_index, seq_index
+ *     cdef long a, b, c, min_intermediate_score
+ *     cdef long min_score = subseq_len             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t min_score_idx = -1
+ *     cdef unsigned char seq_char
+ */
+  __pyx_v_min_score = __pyx_v_subseq_len;
 
-static struct PyModuleDef __pyx_moduledef = {
-    PyModuleDef_HEAD_INIT,
-    "_levenshtein_ngrams",
-    0, /* m_doc */
-  #if CYTHON_PEP489_MULTI_PHASE_INIT
-    0, /* m_size */
-  #else
-    -1, /* m_size */
-  #endif
-    __pyx_methods /* m_methods */,
-  #if CYTHON_PEP489_MULTI_PHASE_INIT
-    __pyx_moduledef_slots, /* m_slots */
-  #else
-    NULL, /* m_reload */
-  #endif
-    NULL, /* m_traverse */
-    NULL, /* m_clear */
-    NULL /* m_free */
-};
-#endif
-#ifndef CYTHON_SMALL_CODE
-#if defined(__clang__)
-    #define CYTHON_SMALL_CODE
-#elif defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 3))
-    #define CYTHON_SMALL_CODE __attribute__((cold))
-#else
-    #define CYTHON_SMALL_CODE
-#endif
-#endif
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":178
+ *     cdef long a, b, c, min_intermediate_score
+ *     cdef long min_score = subseq_len
+ *     cdef Py_ssize_t min_score_idx = -1             # <<<<<<<<<<<<<<
+ *     cdef unsigned char seq_char
+ * 
+ */
+  __pyx_v_min_score_idx = -1L;
 
-static __Pyx_StringTabEntry __pyx_string_tab[] = {
-  {&__pyx_n_s_MemoryError, __pyx_k_MemoryError, sizeof(__pyx_k_MemoryError), 0, 0, 1, 1},
-  {&__pyx_n_s_a, __pyx_k_a, sizeof(__pyx_k_a), 0, 0, 1, 1},
-  {&__pyx_n_s_all, __pyx_k_all, sizeof(__pyx_k_all), 0, 0, 1, 1},
-  {&__pyx_n_s_b, __pyx_k_b, sizeof(__pyx_k_b), 0, 0, 1, 1},
-  {&__pyx_n_s_c, __pyx_k_c, sizeof(__pyx_k_c), 0, 0, 1, 1},
-  {&__pyx_n_s_c_expand_long, __pyx_k_c_expand_long, sizeof(__pyx_k_c_expand_long), 0, 0, 1, 1},
-  {&__pyx_n_s_c_expand_short, __pyx_k_c_expand_short, sizeof(__pyx_k_c_expand_short), 0, 0, 1, 1},
-  {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
-  {&__pyx_n_s_enumerate, __pyx_k_enumerate, sizeof(__pyx_k_enumerate), 0, 0, 1, 1},
-  {&__pyx_n_s_fuzzysearch__levenshtein_ngrams, __pyx_k_fuzzysearch__levenshtein_ngrams, sizeof(__pyx_k_fuzzysearch__levenshtein_ngrams), 0, 0, 1, 1},
-  {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
-  {&__pyx_n_s_max_good_score, __pyx_k_max_good_score, sizeof(__pyx_k_max_good_score), 0, 0, 1, 1},
-  {&__pyx_n_s_max_l_dist, __pyx_k_max_l_dist, sizeof(__pyx_k_max_l_dist), 0, 0, 1, 1},
-  {&__pyx_n_s_min_intermediate_score, __pyx_k_min_intermediate_score, sizeof(__pyx_k_min_intermediate_score), 0, 0, 1, 1},
-  {&__pyx_n_s_min_score, __pyx_k_min_score, sizeof(__pyx_k_min_score), 0, 0, 1, 1},
-  {&__pyx_n_s_min_score_idx, __pyx_k_min_score_idx, sizeof(__pyx_k_min_score_idx), 0, 0, 1, 1},
-  {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
-  {&__pyx_n_s_needle_idx_range_end, __pyx_k_needle_idx_range_end, sizeof(__pyx_k_needle_idx_range_end), 0, 0, 1, 1},
-  {&__pyx_n_s_needle_idx_range_start, __pyx_k_needle_idx_range_start, sizeof(__pyx_k_needle_idx_range_start), 0, 0, 1, 1},
-  {&__pyx_n_s_new_needle_idx_range_end, __pyx_k_new_needle_idx_range_end, sizeof(__pyx_k_new_needle_idx_range_end), 0, 0, 1, 1},
-  {&__pyx_n_s_new_needle_idx_range_start, __pyx_k_new_needle_idx_range_start, sizeof(__pyx_k_new_needle_idx_range_start), 0, 0, 1, 1},
-  {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
-  {&__pyx_n_s_scores, __pyx_k_scores, sizeof(__pyx_k_scores), 0, 0, 1, 1},
-  {&__pyx_n_s_seq_char, __pyx_k_seq_char, sizeof(__pyx_k_seq_char), 0, 0, 1, 1},
-  {&__pyx_n_s_seq_idx, __pyx_k_seq_idx, sizeof(__pyx_k_seq_idx), 0, 0, 1, 1},
-  {&__pyx_n_s_seq_index, __pyx_k_seq_index, sizeof(__pyx_k_seq_index), 0, 0, 1, 1},
-  {&__pyx_n_s_sequence, __pyx_k_sequence, sizeof(__pyx_k_sequence), 0, 0, 1, 1},
-  {&__pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_k_src_fuzzysearch__levenshtein_ngr, sizeof(__pyx_k_src_fuzzysearch__levenshtein_ngr), 0, 0, 1, 0},
-  {&__pyx_n_s_subseq_idx, __pyx_k_subseq_idx, sizeof(__pyx_k_subseq_idx), 0, 0, 1, 1},
-  {&__pyx_n_s_subseq_index, __pyx_k_subseq_index, sizeof(__pyx_k_subseq_index), 0, 0, 1, 1},
-  {&__pyx_n_s_subseq_len, __pyx_k_subseq_len, sizeof(__pyx_k_subseq_len), 0, 0, 1, 1},
-  {&__pyx_n_s_subsequence, __pyx_k_subsequence, sizeof(__pyx_k_subsequence), 0, 0, 1, 1},
-  {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
-  {&__pyx_n_s_xrange, __pyx_k_xrange, sizeof(__pyx_k_xrange), 0, 0, 1, 1},
-  {0, 0, 0, 0, 0, 0, 0}
-};
-static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
-  __pyx_builtin_MemoryError = __Pyx_GetBuiltinName(__pyx_n_s_MemoryError); if (!__pyx_builtin_MemoryError) __PYX_ERR(0, 42, __pyx_L1_error)
-  #if PY_MAJOR_VERSION >= 3
-  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_xrange) __PYX_ERR(0, 43, __pyx_L1_error)
-  #else
-  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_xrange); if (!__pyx_builtin_xrange) __PYX_ERR(0, 43, __pyx_L1_error)
-  #endif
-  __pyx_builtin_enumerate = __Pyx_GetBuiltinName(__pyx_n_s_enumerate); if (!__pyx_builtin_enumerate) __PYX_ERR(0, 47, __pyx_L1_error)
-  return 0;
-  __pyx_L1_error:;
-  return -1;
-}
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":181
+ *     cdef unsigned char seq_char
+ * 
+ *     if subseq_len == 0:             # <<<<<<<<<<<<<<
+ *         dist[0] = 0
+ *         size[0] = 0
+ */
+  __pyx_t_1 = ((__pyx_v_subseq_len == 0) != 0);
+  if (__pyx_t_1) {
 
-static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":182
+ * 
+ *     if subseq_len == 0:
+ *         dist[0] = 0             # <<<<<<<<<<<<<<
+ *         size[0] = 0
+ *         return 1
+ */
+    (__pyx_v_dist[0]) = 0;
 
-  /* "fuzzysearch/_levenshtein_ngrams.pyx":30
- *     cdef unsigned int subseq_len = len(subsequence)
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":183
  *     if subseq_len == 0:
- *         return (0, 0)             # <<<<<<<<<<<<<<
+ *         dist[0] = 0
+ *         size[0] = 0             # <<<<<<<<<<<<<<
+ *         return 1
  * 
- *     cdef size_t subseq_idx, seq_idx
  */
-  __pyx_tuple_ = PyTuple_Pack(2, __pyx_int_0, __pyx_int_0); if (unlikely(!__pyx_tuple_)) __PYX_ERR(0, 30, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple_);
-  __Pyx_GIVEREF(__pyx_tuple_);
+    (__pyx_v_size[0]) = 0;
 
-  /* "fuzzysearch/_levenshtein_ngrams.pyx":72
- *                 min_score_idx = seq_index + 1
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":184
+ *         dist[0] = 0
+ *         size[0] = 0
+ *         return 1             # <<<<<<<<<<<<<<
  * 
- *         return (min_score, min_score_idx) if min_score <= max_l_dist else (None, None)             # <<<<<<<<<<<<<<
+ *     # Initialize the scores array with values for just skipping sub-sequence
+ */
+    __pyx_r = 1;
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":181
+ *     cdef unsigned char seq_char
  * 
- *     finally:
+ *     if subseq_len == 0:             # <<<<<<<<<<<<<<
+ *         dist[0] = 0
+ *         size[0] = 0
  */
-  __pyx_tuple__2 = PyTuple_Pack(2, Py_None, Py_None); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(0, 72, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__2);
-  __Pyx_GIVEREF(__pyx_tuple__2);
+  }
 
-  /* "fuzzysearch/_levenshtein_ngrams.pyx":9
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":188
+ *     # Initialize the scores array with values for just skipping sub-sequence
+ *     # chars.
+ *     for subseq_index in range(subseq_len):             # <<<<<<<<<<<<<<
+ *         scores[subseq_index] = subseq_index + 1
  * 
+ */
+  __pyx_t_2 = __pyx_v_subseq_len;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_subseq_index = __pyx_t_4;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":189
+ *     # chars.
+ *     for subseq_index in range(subseq_len):
+ *         scores[subseq_index] = subseq_index + 1             # <<<<<<<<<<<<<<
  * 
- * def c_expand_short(subsequence, sequence, max_l_dist):             # <<<<<<<<<<<<<<
- *     """Straightforward implementation of partial match expansion."""
- *     # The following diagram shows the score calculation step.
+ *     for seq_index in range(seq_len):
  */
-  __pyx_tuple__3 = PyTuple_Pack(16, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_max_l_dist, __pyx_n_s_subseq_len, __pyx_n_s_subseq_idx, __pyx_n_s_seq_idx, __pyx_n_s_min_score, __pyx_n_s_min_score_idx, __pyx_n_s_min_intermediate_score, __pyx_n_s_a, __pyx_n_s_b, __pyx_n_s_c, __pyx_n_s_scores, __pyx_n_s_seq_index, __pyx_n_s_seq_char, __pyx_n_s_subseq_index); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(0, 9, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__3);
-  __Pyx_GIVEREF(__pyx_tuple__3);
-  __pyx_codeobj__4 = (PyObject*)__Pyx_PyCode_New(3, 0, 16, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__3, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_n_s_c_expand_short, 9, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__4)) __PYX_ERR(0, 9, __pyx_L1_error)
+    (__pyx_v_scores[__pyx_v_subseq_index]) = (__pyx_v_subseq_index + 1);
+  }
 
-  /* "fuzzysearch/_levenshtein_ngrams.pyx":78
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":191
+ *         scores[subseq_index] = subseq_index + 1
  * 
+ *     for seq_index in range(seq_len):             # <<<<<<<<<<<<<<
+ *         seq_char = seq[seq_index * seq_step]
+ *         # calculate scores, one for each character in the sub-sequence
+ */
+  __pyx_t_2 = __pyx_v_seq_len;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_seq_index = __pyx_t_4;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":192
  * 
- * def c_expand_long(subsequence, sequence, max_l_dist):             # <<<<<<<<<<<<<<
- *     """Partial match expansion, optimized for long sub-sequences."""
- *     # The additional optimization in this version is to limit the part of
+ *     for seq_index in range(seq_len):
+ *         seq_char = seq[seq_index * seq_step]             # <<<<<<<<<<<<<<
+ *         # calculate scores, one for each character in the sub-sequence
+ *         a = seq_index
  */
-  __pyx_tuple__5 = PyTuple_Pack(20, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_max_l_dist, __pyx_n_s_subseq_len, __pyx_n_s_subseq_idx, __pyx_n_s_seq_idx, __pyx_n_s_min_score, __pyx_n_s_min_score_idx, __pyx_n_s_a, __pyx_n_s_b, __pyx_n_s_c, __pyx_n_s_max_good_score, __pyx_n_s_new_needle_idx_range_start, __pyx_n_s_new_needle_idx_range_end, __pyx_n_s_scores, __pyx_n_s_needle_idx_range_start, __pyx_n_s_needle_idx_range_end, __pyx_n_s_seq_index, __pyx_n_s_seq_char, __pyx_n_s_subseq_index); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 78, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__5);
-  __Pyx_GIVEREF(__pyx_tuple__5);
-  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(3, 0, 20, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_n_s_c_expand_long, 78, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 78, __pyx_L1_error)
-  __Pyx_RefNannyFinishContext();
-  return 0;
-  __pyx_L1_error:;
-  __Pyx_RefNannyFinishContext();
-  return -1;
-}
+    __pyx_v_seq_char = (__pyx_v_seq[(__pyx_v_seq_index * __pyx_v_seq_step)]);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":194
+ *         seq_char = seq[seq_index * seq_step]
+ *         # calculate scores, one for each character in the sub-sequence
+ *         a = seq_index             # <<<<<<<<<<<<<<
+ *         c = a + 1
+ *         min_intermediate_score = subseq_len + seq_len
+ */
+    __pyx_v_a = __pyx_v_seq_index;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":195
+ *         # calculate scores, one for each character in the sub-sequence
+ *         a = seq_index
+ *         c = a + 1             # <<<<<<<<<<<<<<
+ *         min_intermediate_score = subseq_len + seq_len
+ *         for subseq_index in range(subseq_len):
+ */
+    __pyx_v_c = (__pyx_v_a + 1);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":196
+ *         a = seq_index
+ *         c = a + 1
+ *         min_intermediate_score = subseq_len + seq_len             # <<<<<<<<<<<<<<
+ *         for subseq_index in range(subseq_len):
+ *             b = scores[subseq_index]
+ */
+    __pyx_v_min_intermediate_score = (__pyx_v_subseq_len + __pyx_v_seq_len);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":197
+ *         c = a + 1
+ *         min_intermediate_score = subseq_len + seq_len
+ *         for subseq_index in range(subseq_len):             # <<<<<<<<<<<<<<
+ *             b = scores[subseq_index]
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+ */
+    __pyx_t_5 = __pyx_v_subseq_len;
+    __pyx_t_6 = __pyx_t_5;
+    for (__pyx_t_7 = 0; __pyx_t_7 < __pyx_t_6; __pyx_t_7+=1) {
+      __pyx_v_subseq_index = __pyx_t_7;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":198
+ *         min_intermediate_score = subseq_len + seq_len
+ *         for subseq_index in range(subseq_len):
+ *             b = scores[subseq_index]             # <<<<<<<<<<<<<<
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+ *                       b + 1, c + 1)
+ */
+      __pyx_v_b = (__pyx_v_scores[__pyx_v_subseq_index]);
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":199
+ *         for subseq_index in range(subseq_len):
+ *             b = scores[subseq_index]
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),             # <<<<<<<<<<<<<<
+ *                       b + 1, c + 1)
+ *             scores[subseq_index] = c
+ */
+      __pyx_v_c = __pyx_f_11fuzzysearch_19_levenshtein_ngrams__min3((__pyx_v_a + (__pyx_v_seq_char != (__pyx_v_subseq[(__pyx_v_subseq_index * __pyx_v_subseq_step)]))), (__pyx_v_b + 1), (__pyx_v_c + 1));
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":201
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+ *                       b + 1, c + 1)
+ *             scores[subseq_index] = c             # <<<<<<<<<<<<<<
+ *             a = b
+ *             if c < min_intermediate_score:
+ */
+      (__pyx_v_scores[__pyx_v_subseq_index]) = __pyx_v_c;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":202
+ *                       b + 1, c + 1)
+ *             scores[subseq_index] = c
+ *             a = b             # <<<<<<<<<<<<<<
+ *             if c < min_intermediate_score:
+ *                 min_intermediate_score = c
+ */
+      __pyx_v_a = __pyx_v_b;
 
-static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
-  if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error);
-  __pyx_int_0 = PyInt_FromLong(0); if (unlikely(!__pyx_int_0)) __PYX_ERR(0, 1, __pyx_L1_error)
-  __pyx_int_1 = PyInt_FromLong(1); if (unlikely(!__pyx_int_1)) __PYX_ERR(0, 1, __pyx_L1_error)
-  return 0;
-  __pyx_L1_error:;
-  return -1;
-}
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":203
+ *             scores[subseq_index] = c
+ *             a = b
+ *             if c < min_intermediate_score:             # <<<<<<<<<<<<<<
+ *                 min_intermediate_score = c
+ * 
+ */
+      __pyx_t_1 = ((__pyx_v_c < __pyx_v_min_intermediate_score) != 0);
+      if (__pyx_t_1) {
 
-static CYTHON_SMALL_CODE int __Pyx_modinit_global_init_code(void); /*proto*/
-static CYTHON_SMALL_CODE int __Pyx_modinit_variable_export_code(void); /*proto*/
-static CYTHON_SMALL_CODE int __Pyx_modinit_function_export_code(void); /*proto*/
-static CYTHON_SMALL_CODE int __Pyx_modinit_type_init_code(void); /*proto*/
-static CYTHON_SMALL_CODE int __Pyx_modinit_type_import_code(void); /*proto*/
-static CYTHON_SMALL_CODE int __Pyx_modinit_variable_import_code(void); /*proto*/
-static CYTHON_SMALL_CODE int __Pyx_modinit_function_import_code(void); /*proto*/
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":204
+ *             a = b
+ *             if c < min_intermediate_score:
+ *                 min_intermediate_score = c             # <<<<<<<<<<<<<<
+ * 
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ */
+        __pyx_v_min_intermediate_score = __pyx_v_c;
 
-static int __Pyx_modinit_global_init_code(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_modinit_global_init_code", 0);
-  /*--- Global init code ---*/
-  __Pyx_RefNannyFinishContext();
-  return 0;
-}
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":203
+ *             scores[subseq_index] = c
+ *             a = b
+ *             if c < min_intermediate_score:             # <<<<<<<<<<<<<<
+ *                 min_intermediate_score = c
+ * 
+ */
+      }
+    }
 
-static int __Pyx_modinit_variable_export_code(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_export_code", 0);
-  /*--- Variable export code ---*/
-  __Pyx_RefNannyFinishContext();
-  return 0;
-}
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":207
+ * 
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ *         if c <= min_score:             # <<<<<<<<<<<<<<
+ *             min_score = c
+ *             min_score_idx = seq_index
+ */
+    __pyx_t_1 = ((__pyx_v_c <= __pyx_v_min_score) != 0);
+    if (__pyx_t_1) {
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":208
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ *         if c <= min_score:
+ *             min_score = c             # <<<<<<<<<<<<<<
+ *             min_score_idx = seq_index
+ * 
+ */
+      __pyx_v_min_score = __pyx_v_c;
 
-static int __Pyx_modinit_function_export_code(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_modinit_function_export_code", 0);
-  /*--- Function export code ---*/
-  __Pyx_RefNannyFinishContext();
-  return 0;
-}
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":209
+ *         if c <= min_score:
+ *             min_score = c
+ *             min_score_idx = seq_index             # <<<<<<<<<<<<<<
+ * 
+ *         # bail early when it is impossible to find a better expansion
+ */
+      __pyx_v_min_score_idx = __pyx_v_seq_index;
 
-static int __Pyx_modinit_type_init_code(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
-  /*--- Type init code ---*/
-  __Pyx_RefNannyFinishContext();
-  return 0;
-}
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":207
+ * 
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ *         if c <= min_score:             # <<<<<<<<<<<<<<
+ *             min_score = c
+ *             min_score_idx = seq_index
+ */
+      goto __pyx_L11;
+    }
 
-static int __Pyx_modinit_type_import_code(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_modinit_type_import_code", 0);
-  /*--- Type import code ---*/
-  __Pyx_RefNannyFinishContext();
-  return 0;
-}
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":212
+ * 
+ *         # bail early when it is impossible to find a better expansion
+ *         elif min_intermediate_score >= min_score:             # <<<<<<<<<<<<<<
+ *             break
+ * 
+ */
+    __pyx_t_1 = ((__pyx_v_min_intermediate_score >= __pyx_v_min_score) != 0);
+    if (__pyx_t_1) {
 
-static int __Pyx_modinit_variable_import_code(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_import_code", 0);
-  /*--- Variable import code ---*/
-  __Pyx_RefNannyFinishContext();
-  return 0;
-}
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":213
+ *         # bail early when it is impossible to find a better expansion
+ *         elif min_intermediate_score >= min_score:
+ *             break             # <<<<<<<<<<<<<<
+ * 
+ *     if min_score > max_l_dist:
+ */
+      goto __pyx_L7_break;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":212
+ * 
+ *         # bail early when it is impossible to find a better expansion
+ *         elif min_intermediate_score >= min_score:             # <<<<<<<<<<<<<<
+ *             break
+ * 
+ */
+    }
+    __pyx_L11:;
+  }
+  __pyx_L7_break:;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":215
+ *             break
+ * 
+ *     if min_score > max_l_dist:             # <<<<<<<<<<<<<<
+ *         return 0
+ *     dist[0] = min_score
+ */
+  __pyx_t_1 = ((__pyx_v_min_score > __pyx_v_max_l_dist) != 0);
+  if (__pyx_t_1) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":216
+ * 
+ *     if min_score > max_l_dist:
+ *         return 0             # <<<<<<<<<<<<<<
+ *     dist[0] = min_score
+ *     size[0] = min_score_idx + 1
+ */
+    __pyx_r = 0;
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":215
+ *             break
+ * 
+ *     if min_score > max_l_dist:             # <<<<<<<<<<<<<<
+ *         return 0
+ *     dist[0] = min_score
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":217
+ *     if min_score > max_l_dist:
+ *         return 0
+ *     dist[0] = min_score             # <<<<<<<<<<<<<<
+ *     size[0] = min_score_idx + 1
+ *     return 1
+ */
+  (__pyx_v_dist[0]) = __pyx_v_min_score;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":218
+ *         return 0
+ *     dist[0] = min_score
+ *     size[0] = min_score_idx + 1             # <<<<<<<<<<<<<<
+ *     return 1
+ * 
+ */
+  (__pyx_v_size[0]) = (__pyx_v_min_score_idx + 1);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":219
+ *     dist[0] = min_score
+ *     size[0] = min_score_idx + 1
+ *     return 1             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = 1;
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":170
+ * # max_l_dist.  The scores array must have room for subseq_len items.
+ * 
+ * cdef int _expand_short_strided(             # <<<<<<<<<<<<<<
+ *         const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+ *         const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_levenshtein_ngrams.pyx":222
+ * 
+ * 
+ * cdef int _expand_long_strided(             # <<<<<<<<<<<<<<
+ *         const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+ *         const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+ */
+
+static int __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_long_strided(unsigned char const *__pyx_v_subseq, Py_ssize_t __pyx_v_subseq_step, Py_ssize_t __pyx_v_subseq_len, unsigned char const *__pyx_v_seq, Py_ssize_t __pyx_v_seq_step, Py_ssize_t __pyx_v_seq_len, long __pyx_v_max_l_dist, long *__pyx_v_scores, long *__pyx_v_dist, Py_ssize_t *__pyx_v_size) {
+  Py_ssize_t __pyx_v_subseq_index;
+  Py_ssize_t __pyx_v_seq_index;
+  long __pyx_v_a;
+  long __pyx_v_b;
+  long __pyx_v_c;
+  long __pyx_v_min_score;
+  Py_ssize_t __pyx_v_min_score_idx;
+  long __pyx_v_max_good_score;
+  Py_ssize_t __pyx_v_needle_idx_range_start;
+  Py_ssize_t __pyx_v_needle_idx_range_end;
+  Py_ssize_t __pyx_v_new_needle_idx_range_start;
+  Py_ssize_t __pyx_v_new_needle_idx_range_end;
+  unsigned char __pyx_v_seq_char;
+  int __pyx_r;
+  int __pyx_t_1;
+  Py_ssize_t __pyx_t_2;
+  Py_ssize_t __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  int __pyx_t_8;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":231
+ *     cdef Py_ssize_t subseq_index, seq_index
+ *     cdef long a, b, c
+ *     cdef long min_score = subseq_len             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t min_score_idx = -1
+ *     cdef long max_good_score = max_l_dist
+ */
+  __pyx_v_min_score = __pyx_v_subseq_len;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":232
+ *     cdef long a, b, c
+ *     cdef long min_score = subseq_len
+ *     cdef Py_ssize_t min_score_idx = -1             # <<<<<<<<<<<<<<
+ *     cdef long max_good_score = max_l_dist
+ *     cdef Py_ssize_t needle_idx_range_start, needle_idx_range_end
+ */
+  __pyx_v_min_score_idx = -1L;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":233
+ *     cdef long min_score = subseq_len
+ *     cdef Py_ssize_t min_score_idx = -1
+ *     cdef long max_good_score = max_l_dist             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t needle_idx_range_start, needle_idx_range_end
+ *     cdef Py_ssize_t new_needle_idx_range_start = 0
+ */
+  __pyx_v_max_good_score = __pyx_v_max_l_dist;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":235
+ *     cdef long max_good_score = max_l_dist
+ *     cdef Py_ssize_t needle_idx_range_start, needle_idx_range_end
+ *     cdef Py_ssize_t new_needle_idx_range_start = 0             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t new_needle_idx_range_end = subseq_len - 1
+ *     cdef unsigned char seq_char
+ */
+  __pyx_v_new_needle_idx_range_start = 0;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":236
+ *     cdef Py_ssize_t needle_idx_range_start, needle_idx_range_end
+ *     cdef Py_ssize_t new_needle_idx_range_start = 0
+ *     cdef Py_ssize_t new_needle_idx_range_end = subseq_len - 1             # <<<<<<<<<<<<<<
+ *     cdef unsigned char seq_char
+ * 
+ */
+  __pyx_v_new_needle_idx_range_end = (__pyx_v_subseq_len - 1);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":239
+ *     cdef unsigned char seq_char
+ * 
+ *     if subseq_len == 0:             # <<<<<<<<<<<<<<
+ *         dist[0] = 0
+ *         size[0] = 0
+ */
+  __pyx_t_1 = ((__pyx_v_subseq_len == 0) != 0);
+  if (__pyx_t_1) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":240
+ * 
+ *     if subseq_len == 0:
+ *         dist[0] = 0             # <<<<<<<<<<<<<<
+ *         size[0] = 0
+ *         return 1
+ */
+    (__pyx_v_dist[0]) = 0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":241
+ *     if subseq_len == 0:
+ *         dist[0] = 0
+ *         size[0] = 0             # <<<<<<<<<<<<<<
+ *         return 1
+ * 
+ */
+    (__pyx_v_size[0]) = 0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":242
+ *         dist[0] = 0
+ *         size[0] = 0
+ *         return 1             # <<<<<<<<<<<<<<
+ * 
+ *     # Initialize the scores array with values for just skipping sub-sequence
+ */
+    __pyx_r = 1;
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":239
+ *     cdef unsigned char seq_char
+ * 
+ *     if subseq_len == 0:             # <<<<<<<<<<<<<<
+ *         dist[0] = 0
+ *         size[0] = 0
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":246
+ *     # Initialize the scores array with values for just skipping sub-sequence
+ *     # chars.
+ *     for subseq_index in range(subseq_len):             # <<<<<<<<<<<<<<
+ *         scores[subseq_index] = subseq_index + 1
+ * 
+ */
+  __pyx_t_2 = __pyx_v_subseq_len;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_subseq_index = __pyx_t_4;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":247
+ *     # chars.
+ *     for subseq_index in range(subseq_len):
+ *         scores[subseq_index] = subseq_index + 1             # <<<<<<<<<<<<<<
+ * 
+ *     for seq_index in range(seq_len):
+ */
+    (__pyx_v_scores[__pyx_v_subseq_index]) = (__pyx_v_subseq_index + 1);
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":249
+ *         scores[subseq_index] = subseq_index + 1
+ * 
+ *     for seq_index in range(seq_len):             # <<<<<<<<<<<<<<
+ *         seq_char = seq[seq_index * seq_step]
+ *         # calculate scores, one for each character in the sub-sequence
+ */
+  __pyx_t_2 = __pyx_v_seq_len;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_seq_index = __pyx_t_4;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":250
+ * 
+ *     for seq_index in range(seq_len):
+ *         seq_char = seq[seq_index * seq_step]             # <<<<<<<<<<<<<<
+ *         # calculate scores, one for each character in the sub-sequence
+ *         needle_idx_range_start = new_needle_idx_range_start
+ */
+    __pyx_v_seq_char = (__pyx_v_seq[(__pyx_v_seq_index * __pyx_v_seq_step)]);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":252
+ *         seq_char = seq[seq_index * seq_step]
+ *         # calculate scores, one for each character in the sub-sequence
+ *         needle_idx_range_start = new_needle_idx_range_start             # <<<<<<<<<<<<<<
+ *         needle_idx_range_end = new_needle_idx_range_end + 1
+ *         if needle_idx_range_end > subseq_len:
+ */
+    __pyx_v_needle_idx_range_start = __pyx_v_new_needle_idx_range_start;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":253
+ *         # calculate scores, one for each character in the sub-sequence
+ *         needle_idx_range_start = new_needle_idx_range_start
+ *         needle_idx_range_end = new_needle_idx_range_end + 1             # <<<<<<<<<<<<<<
+ *         if needle_idx_range_end > subseq_len:
+ *             needle_idx_range_end = subseq_len
+ */
+    __pyx_v_needle_idx_range_end = (__pyx_v_new_needle_idx_range_end + 1);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":254
+ *         needle_idx_range_start = new_needle_idx_range_start
+ *         needle_idx_range_end = new_needle_idx_range_end + 1
+ *         if needle_idx_range_end > subseq_len:             # <<<<<<<<<<<<<<
+ *             needle_idx_range_end = subseq_len
+ * 
+ */
+    __pyx_t_1 = ((__pyx_v_needle_idx_range_end > __pyx_v_subseq_len) != 0);
+    if (__pyx_t_1) {
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":255
+ *         needle_idx_range_end = new_needle_idx_range_end + 1
+ *         if needle_idx_range_end > subseq_len:
+ *             needle_idx_range_end = subseq_len             # <<<<<<<<<<<<<<
+ * 
+ *         a = seq_index
+ */
+      __pyx_v_needle_idx_range_end = __pyx_v_subseq_len;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":254
+ *         needle_idx_range_start = new_needle_idx_range_start
+ *         needle_idx_range_end = new_needle_idx_range_end + 1
+ *         if needle_idx_range_end > subseq_len:             # <<<<<<<<<<<<<<
+ *             needle_idx_range_end = subseq_len
+ * 
+ */
+    }
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":257
+ *             needle_idx_range_end = subseq_len
+ * 
+ *         a = seq_index             # <<<<<<<<<<<<<<
+ *         c = a + 1
+ * 
+ */
+    __pyx_v_a = __pyx_v_seq_index;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":258
+ * 
+ *         a = seq_index
+ *         c = a + 1             # <<<<<<<<<<<<<<
+ * 
+ *         if c <= max_good_score:
+ */
+    __pyx_v_c = (__pyx_v_a + 1);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":260
+ *         c = a + 1
+ * 
+ *         if c <= max_good_score:             # <<<<<<<<<<<<<<
+ *             new_needle_idx_range_start = 0
+ *             new_needle_idx_range_end = 0
+ */
+    __pyx_t_1 = ((__pyx_v_c <= __pyx_v_max_good_score) != 0);
+    if (__pyx_t_1) {
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":261
+ * 
+ *         if c <= max_good_score:
+ *             new_needle_idx_range_start = 0             # <<<<<<<<<<<<<<
+ *             new_needle_idx_range_end = 0
+ *         else:
+ */
+      __pyx_v_new_needle_idx_range_start = 0;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":262
+ *         if c <= max_good_score:
+ *             new_needle_idx_range_start = 0
+ *             new_needle_idx_range_end = 0             # <<<<<<<<<<<<<<
+ *         else:
+ *             # -1 stands for no start having been found
+ */
+      __pyx_v_new_needle_idx_range_end = 0;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":260
+ *         c = a + 1
+ * 
+ *         if c <= max_good_score:             # <<<<<<<<<<<<<<
+ *             new_needle_idx_range_start = 0
+ *             new_needle_idx_range_end = 0
+ */
+      goto __pyx_L9;
+    }
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":265
+ *         else:
+ *             # -1 stands for no start having been found
+ *             new_needle_idx_range_start = -1             # <<<<<<<<<<<<<<
+ *             new_needle_idx_range_end = -1
+ * 
+ */
+    /*else*/ {
+      __pyx_v_new_needle_idx_range_start = -1L;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":266
+ *             # -1 stands for no start having been found
+ *             new_needle_idx_range_start = -1
+ *             new_needle_idx_range_end = -1             # <<<<<<<<<<<<<<
+ * 
+ *         for subseq_index in range(needle_idx_range_start, needle_idx_range_end):
+ */
+      __pyx_v_new_needle_idx_range_end = -1L;
+    }
+    __pyx_L9:;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":268
+ *             new_needle_idx_range_end = -1
+ * 
+ *         for subseq_index in range(needle_idx_range_start, needle_idx_range_end):             # <<<<<<<<<<<<<<
+ *             b = scores[subseq_index]
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+ */
+    __pyx_t_5 = __pyx_v_needle_idx_range_end;
+    __pyx_t_6 = __pyx_t_5;
+    for (__pyx_t_7 = __pyx_v_needle_idx_range_start; __pyx_t_7 < __pyx_t_6; __pyx_t_7+=1) {
+      __pyx_v_subseq_index = __pyx_t_7;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":269
+ * 
+ *         for subseq_index in range(needle_idx_range_start, needle_idx_range_end):
+ *             b = scores[subseq_index]             # <<<<<<<<<<<<<<
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+ *                       b + 1, c + 1)
+ */
+      __pyx_v_b = (__pyx_v_scores[__pyx_v_subseq_index]);
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":270
+ *         for subseq_index in range(needle_idx_range_start, needle_idx_range_end):
+ *             b = scores[subseq_index]
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),             # <<<<<<<<<<<<<<
+ *                       b + 1, c + 1)
+ *             scores[subseq_index] = c
+ */
+      __pyx_v_c = __pyx_f_11fuzzysearch_19_levenshtein_ngrams__min3((__pyx_v_a + (__pyx_v_seq_char != (__pyx_v_subseq[(__pyx_v_subseq_index * __pyx_v_subseq_step)]))), (__pyx_v_b + 1), (__pyx_v_c + 1));
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":272
+ *             c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+ *                       b + 1, c + 1)
+ *             scores[subseq_index] = c             # <<<<<<<<<<<<<<
+ *             a = b
+ * 
+ */
+      (__pyx_v_scores[__pyx_v_subseq_index]) = __pyx_v_c;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":273
+ *                       b + 1, c + 1)
+ *             scores[subseq_index] = c
+ *             a = b             # <<<<<<<<<<<<<<
+ * 
+ *             if c <= max_good_score:
+ */
+      __pyx_v_a = __pyx_v_b;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":275
+ *             a = b
+ * 
+ *             if c <= max_good_score:             # <<<<<<<<<<<<<<
+ *                 if new_needle_idx_range_start == -1:
+ *                     new_needle_idx_range_start = subseq_index
+ */
+      __pyx_t_1 = ((__pyx_v_c <= __pyx_v_max_good_score) != 0);
+      if (__pyx_t_1) {
+
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":276
+ * 
+ *             if c <= max_good_score:
+ *                 if new_needle_idx_range_start == -1:             # <<<<<<<<<<<<<<
+ *                     new_needle_idx_range_start = subseq_index
+ *                 if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:
+ */
+        __pyx_t_1 = ((__pyx_v_new_needle_idx_range_start == -1L) != 0);
+        if (__pyx_t_1) {
+
+          /* "fuzzysearch/_levenshtein_ngrams.pyx":277
+ *             if c <= max_good_score:
+ *                 if new_needle_idx_range_start == -1:
+ *                     new_needle_idx_range_start = subseq_index             # <<<<<<<<<<<<<<
+ *                 if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:
+ *                     new_needle_idx_range_end = subseq_index + 1 + (max_good_score - c)
+ */
+          __pyx_v_new_needle_idx_range_start = __pyx_v_subseq_index;
+
+          /* "fuzzysearch/_levenshtein_ngrams.pyx":276
+ * 
+ *             if c <= max_good_score:
+ *                 if new_needle_idx_range_start == -1:             # <<<<<<<<<<<<<<
+ *                     new_needle_idx_range_start = subseq_index
+ *                 if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:
+ */
+        }
+
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":278
+ *                 if new_needle_idx_range_start == -1:
+ *                     new_needle_idx_range_start = subseq_index
+ *                 if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:             # <<<<<<<<<<<<<<
+ *                     new_needle_idx_range_end = subseq_index + 1 + (max_good_score - c)
+ * 
+ */
+        __pyx_t_1 = ((((__pyx_v_subseq_index + 1) + (__pyx_v_max_good_score - __pyx_v_c)) > __pyx_v_new_needle_idx_range_end) != 0);
+        if (__pyx_t_1) {
+
+          /* "fuzzysearch/_levenshtein_ngrams.pyx":279
+ *                     new_needle_idx_range_start = subseq_index
+ *                 if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:
+ *                     new_needle_idx_range_end = subseq_index + 1 + (max_good_score - c)             # <<<<<<<<<<<<<<
+ * 
+ *         # bail early when it is impossible to find a better expansion
+ */
+          __pyx_v_new_needle_idx_range_end = ((__pyx_v_subseq_index + 1) + (__pyx_v_max_good_score - __pyx_v_c));
+
+          /* "fuzzysearch/_levenshtein_ngrams.pyx":278
+ *                 if new_needle_idx_range_start == -1:
+ *                     new_needle_idx_range_start = subseq_index
+ *                 if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:             # <<<<<<<<<<<<<<
+ *                     new_needle_idx_range_end = subseq_index + 1 + (max_good_score - c)
+ * 
+ */
+        }
+
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":275
+ *             a = b
+ * 
+ *             if c <= max_good_score:             # <<<<<<<<<<<<<<
+ *                 if new_needle_idx_range_start == -1:
+ *                     new_needle_idx_range_start = subseq_index
+ */
+      }
+    }
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":282
+ * 
+ *         # bail early when it is impossible to find a better expansion
+ *         if new_needle_idx_range_start == -1:             # <<<<<<<<<<<<<<
+ *             break
+ * 
+ */
+    __pyx_t_1 = ((__pyx_v_new_needle_idx_range_start == -1L) != 0);
+    if (__pyx_t_1) {
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":283
+ *         # bail early when it is impossible to find a better expansion
+ *         if new_needle_idx_range_start == -1:
+ *             break             # <<<<<<<<<<<<<<
+ * 
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ */
+      goto __pyx_L7_break;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":282
+ * 
+ *         # bail early when it is impossible to find a better expansion
+ *         if new_needle_idx_range_start == -1:             # <<<<<<<<<<<<<<
+ *             break
+ * 
+ */
+    }
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":286
+ * 
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ *         if needle_idx_range_end == subseq_len and c <= min_score:             # <<<<<<<<<<<<<<
+ *             min_score = c
+ *             min_score_idx = seq_index
+ */
+    __pyx_t_8 = ((__pyx_v_needle_idx_range_end == __pyx_v_subseq_len) != 0);
+    if (__pyx_t_8) {
+    } else {
+      __pyx_t_1 = __pyx_t_8;
+      goto __pyx_L17_bool_binop_done;
+    }
+    __pyx_t_8 = ((__pyx_v_c <= __pyx_v_min_score) != 0);
+    __pyx_t_1 = __pyx_t_8;
+    __pyx_L17_bool_binop_done:;
+    if (__pyx_t_1) {
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":287
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ *         if needle_idx_range_end == subseq_len and c <= min_score:
+ *             min_score = c             # <<<<<<<<<<<<<<
+ *             min_score_idx = seq_index
+ *             if min_score < max_good_score:
+ */
+      __pyx_v_min_score = __pyx_v_c;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":288
+ *         if needle_idx_range_end == subseq_len and c <= min_score:
+ *             min_score = c
+ *             min_score_idx = seq_index             # <<<<<<<<<<<<<<
+ *             if min_score < max_good_score:
+ *                 max_good_score = min_score
+ */
+      __pyx_v_min_score_idx = __pyx_v_seq_index;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":289
+ *             min_score = c
+ *             min_score_idx = seq_index
+ *             if min_score < max_good_score:             # <<<<<<<<<<<<<<
+ *                 max_good_score = min_score
+ * 
+ */
+      __pyx_t_1 = ((__pyx_v_min_score < __pyx_v_max_good_score) != 0);
+      if (__pyx_t_1) {
+
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":290
+ *             min_score_idx = seq_index
+ *             if min_score < max_good_score:
+ *                 max_good_score = min_score             # <<<<<<<<<<<<<<
+ * 
+ *     if min_score > max_l_dist:
+ */
+        __pyx_v_max_good_score = __pyx_v_min_score;
+
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":289
+ *             min_score = c
+ *             min_score_idx = seq_index
+ *             if min_score < max_good_score:             # <<<<<<<<<<<<<<
+ *                 max_good_score = min_score
+ * 
+ */
+      }
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":286
+ * 
+ *         # keep the minimum score found for matches of the entire sub-sequence
+ *         if needle_idx_range_end == subseq_len and c <= min_score:             # <<<<<<<<<<<<<<
+ *             min_score = c
+ *             min_score_idx = seq_index
+ */
+    }
+  }
+  __pyx_L7_break:;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":292
+ *                 max_good_score = min_score
+ * 
+ *     if min_score > max_l_dist:             # <<<<<<<<<<<<<<
+ *         return 0
+ *     dist[0] = min_score
+ */
+  __pyx_t_1 = ((__pyx_v_min_score > __pyx_v_max_l_dist) != 0);
+  if (__pyx_t_1) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":293
+ * 
+ *     if min_score > max_l_dist:
+ *         return 0             # <<<<<<<<<<<<<<
+ *     dist[0] = min_score
+ *     size[0] = min_score_idx + 1
+ */
+    __pyx_r = 0;
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":292
+ *                 max_good_score = min_score
+ * 
+ *     if min_score > max_l_dist:             # <<<<<<<<<<<<<<
+ *         return 0
+ *     dist[0] = min_score
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":294
+ *     if min_score > max_l_dist:
+ *         return 0
+ *     dist[0] = min_score             # <<<<<<<<<<<<<<
+ *     size[0] = min_score_idx + 1
+ *     return 1
+ */
+  (__pyx_v_dist[0]) = __pyx_v_min_score;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":295
+ *         return 0
+ *     dist[0] = min_score
+ *     size[0] = min_score_idx + 1             # <<<<<<<<<<<<<<
+ *     return 1
+ * 
+ */
+  (__pyx_v_size[0]) = (__pyx_v_min_score_idx + 1);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":296
+ *     dist[0] = min_score
+ *     size[0] = min_score_idx + 1
+ *     return 1             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = 1;
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":222
+ * 
+ * 
+ * cdef int _expand_long_strided(             # <<<<<<<<<<<<<<
+ *         const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+ *         const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_levenshtein_ngrams.pyx":299
+ * 
+ * 
+ * cdef inline long _min3(long x, long y, long z) nogil:             # <<<<<<<<<<<<<<
+ *     if y < x:
+ *         x = y
+ */
+
+static CYTHON_INLINE long __pyx_f_11fuzzysearch_19_levenshtein_ngrams__min3(long __pyx_v_x, long __pyx_v_y, long __pyx_v_z) {
+  long __pyx_r;
+  int __pyx_t_1;
+  long __pyx_t_2;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":300
+ * 
+ * cdef inline long _min3(long x, long y, long z) nogil:
+ *     if y < x:             # <<<<<<<<<<<<<<
+ *         x = y
+ *     return z if z < x else x
+ */
+  __pyx_t_1 = ((__pyx_v_y < __pyx_v_x) != 0);
+  if (__pyx_t_1) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":301
+ * cdef inline long _min3(long x, long y, long z) nogil:
+ *     if y < x:
+ *         x = y             # <<<<<<<<<<<<<<
+ *     return z if z < x else x
+ * 
+ */
+    __pyx_v_x = __pyx_v_y;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":300
+ * 
+ * cdef inline long _min3(long x, long y, long z) nogil:
+ *     if y < x:             # <<<<<<<<<<<<<<
+ *         x = y
+ *     return z if z < x else x
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":302
+ *     if y < x:
+ *         x = y
+ *     return z if z < x else x             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  if (((__pyx_v_z < __pyx_v_x) != 0)) {
+    __pyx_t_2 = __pyx_v_z;
+  } else {
+    __pyx_t_2 = __pyx_v_x;
+  }
+  __pyx_r = __pyx_t_2;
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":299
+ * 
+ * 
+ * cdef inline long _min3(long x, long y, long z) nogil:             # <<<<<<<<<<<<<<
+ *     if y < x:
+ *         x = y
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_levenshtein_ngrams.pyx":305
+ * 
+ * 
+ * cdef inline int _expand_strided(             # <<<<<<<<<<<<<<
+ *         const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+ *         const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+ */
+
+static CYTHON_INLINE int __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_strided(unsigned char const *__pyx_v_subseq, Py_ssize_t __pyx_v_subseq_step, Py_ssize_t __pyx_v_subseq_len, unsigned char const *__pyx_v_seq, Py_ssize_t __pyx_v_seq_step, Py_ssize_t __pyx_v_seq_len, long __pyx_v_max_l_dist, long *__pyx_v_scores, long *__pyx_v_dist, Py_ssize_t *__pyx_v_size) {
+  int __pyx_r;
+  int __pyx_t_1;
+  int __pyx_t_2;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":310
+ *         long max_l_dist, long *scores, long *dist, Py_ssize_t *size) nogil:
+ *     # the same choice of expander as _expand() in levenshtein_ngram.py
+ *     if subseq_len > max_l_dist * 2 and subseq_len > 10:             # <<<<<<<<<<<<<<
+ *         return _expand_long_strided(subseq, subseq_step, subseq_len,
+ *                                     seq, seq_step, seq_len,
+ */
+  __pyx_t_2 = ((__pyx_v_subseq_len > (__pyx_v_max_l_dist * 2)) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_2 = ((__pyx_v_subseq_len > 10) != 0);
+  __pyx_t_1 = __pyx_t_2;
+  __pyx_L4_bool_binop_done:;
+  if (__pyx_t_1) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":311
+ *     # the same choice of expander as _expand() in levenshtein_ngram.py
+ *     if subseq_len > max_l_dist * 2 and subseq_len > 10:
+ *         return _expand_long_strided(subseq, subseq_step, subseq_len,             # <<<<<<<<<<<<<<
+ *                                     seq, seq_step, seq_len,
+ *                                     max_l_dist, scores, dist, size)
+ */
+    __pyx_r = __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_long_strided(__pyx_v_subseq, __pyx_v_subseq_step, __pyx_v_subseq_len, __pyx_v_seq, __pyx_v_seq_step, __pyx_v_seq_len, __pyx_v_max_l_dist, __pyx_v_scores, __pyx_v_dist, __pyx_v_size);
+    goto __pyx_L0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":310
+ *         long max_l_dist, long *scores, long *dist, Py_ssize_t *size) nogil:
+ *     # the same choice of expander as _expand() in levenshtein_ngram.py
+ *     if subseq_len > max_l_dist * 2 and subseq_len > 10:             # <<<<<<<<<<<<<<
+ *         return _expand_long_strided(subseq, subseq_step, subseq_len,
+ *                                     seq, seq_step, seq_len,
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":314
+ *                                     seq, seq_step, seq_len,
+ *                                     max_l_dist, scores, dist, size)
+ *     return _expand_short_strided(subseq, subseq_step, subseq_len,             # <<<<<<<<<<<<<<
+ *                                  seq, seq_step, seq_len,
+ *                                  max_l_dist, scores, dist, size)
+ */
+  __pyx_r = __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_short_strided(__pyx_v_subseq, __pyx_v_subseq_step, __pyx_v_subseq_len, __pyx_v_seq, __pyx_v_seq_step, __pyx_v_seq_len, __pyx_v_max_l_dist, __pyx_v_scores, __pyx_v_dist, __pyx_v_size);
+  goto __pyx_L0;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":305
+ * 
+ * 
+ * cdef inline int _expand_strided(             # <<<<<<<<<<<<<<
+ *         const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+ *         const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "fuzzysearch/_levenshtein_ngrams.pyx":319
+ * 
+ * 
+ * def c_expand_ngram_match_byteslike(subsequence, sequence,             # <<<<<<<<<<<<<<
+ *                                    Py_ssize_t ngram_start, Py_ssize_t ngram_end,
+ *                                    Py_ssize_t index,
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_11fuzzysearch_19_levenshtein_ngrams_5c_expand_ngram_match_byteslike(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_11fuzzysearch_19_levenshtein_ngrams_4c_expand_ngram_match_byteslike[] = "Expand an exact match of an n-gram of the sub-sequence to both sides.\n\n    subsequence[ngram_start:ngram_end] must match exactly at\n    sequence[index:], and only sequence[range_start:range_end] is searched.\n\n    Returns a (start, end, dist) tuple, or None if there is no near-match.\n    ";
+static PyMethodDef __pyx_mdef_11fuzzysearch_19_levenshtein_ngrams_5c_expand_ngram_match_byteslike = {"c_expand_ngram_match_byteslike", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_11fuzzysearch_19_levenshtein_ngrams_5c_expand_ngram_match_byteslike, METH_VARARGS|METH_KEYWORDS, __pyx_doc_11fuzzysearch_19_levenshtein_ngrams_4c_expand_ngram_match_byteslike};
+static PyObject *__pyx_pw_11fuzzysearch_19_levenshtein_ngrams_5c_expand_ngram_match_byteslike(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_subsequence = 0;
+  PyObject *__pyx_v_sequence = 0;
+  Py_ssize_t __pyx_v_ngram_start;
+  Py_ssize_t __pyx_v_ngram_end;
+  Py_ssize_t __pyx_v_index;
+  Py_ssize_t __pyx_v_range_start;
+  Py_ssize_t __pyx_v_range_end;
+  long __pyx_v_max_l_dist;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("c_expand_ngram_match_byteslike (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_subsequence,&__pyx_n_s_sequence,&__pyx_n_s_ngram_start,&__pyx_n_s_ngram_end,&__pyx_n_s_index,&__pyx_n_s_range_start,&__pyx_n_s_range_end,&__pyx_n_s_max_l_dist,0};
+    PyObject* values[8] = {0,0,0,0,0,0,0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  8: values[7] = PyTuple_GET_ITEM(__pyx_args, 7);
+        CYTHON_FALLTHROUGH;
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_subsequence)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_sequence)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 1); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_ngram_start)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 2); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (likely((values[3] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_ngram_end)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 3); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  4:
+        if (likely((values[4] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_index)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 4); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  5:
+        if (likely((values[5] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_range_start)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 5); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  6:
+        if (likely((values[6] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_range_end)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 6); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  7:
+        if (likely((values[7] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_max_l_dist)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, 7); __PYX_ERR(0, 319, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_expand_ngram_match_byteslike") < 0)) __PYX_ERR(0, 319, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 8) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+      values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+      values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+      values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+      values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+      values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+      values[7] = PyTuple_GET_ITEM(__pyx_args, 7);
+    }
+    __pyx_v_subsequence = values[0];
+    __pyx_v_sequence = values[1];
+    __pyx_v_ngram_start = __Pyx_PyIndex_AsSsize_t(values[2]); if (unlikely((__pyx_v_ngram_start == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 320, __pyx_L3_error)
+    __pyx_v_ngram_end = __Pyx_PyIndex_AsSsize_t(values[3]); if (unlikely((__pyx_v_ngram_end == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 320, __pyx_L3_error)
+    __pyx_v_index = __Pyx_PyIndex_AsSsize_t(values[4]); if (unlikely((__pyx_v_index == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 321, __pyx_L3_error)
+    __pyx_v_range_start = __Pyx_PyIndex_AsSsize_t(values[5]); if (unlikely((__pyx_v_range_start == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 322, __pyx_L3_error)
+    __pyx_v_range_end = __Pyx_PyIndex_AsSsize_t(values[6]); if (unlikely((__pyx_v_range_end == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 322, __pyx_L3_error)
+    __pyx_v_max_l_dist = __Pyx_PyInt_As_long(values[7]); if (unlikely((__pyx_v_max_l_dist == (long)-1) && PyErr_Occurred())) __PYX_ERR(0, 323, __pyx_L3_error)
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("c_expand_ngram_match_byteslike", 1, 8, 8, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 319, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("fuzzysearch._levenshtein_ngrams.c_expand_ngram_match_byteslike", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_11fuzzysearch_19_levenshtein_ngrams_4c_expand_ngram_match_byteslike(__pyx_self, __pyx_v_subsequence, __pyx_v_sequence, __pyx_v_ngram_start, __pyx_v_ngram_end, __pyx_v_index, __pyx_v_range_start, __pyx_v_range_end, __pyx_v_max_l_dist);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_11fuzzysearch_19_levenshtein_ngrams_4c_expand_ngram_match_byteslike(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_subsequence, PyObject *__pyx_v_sequence, Py_ssize_t __pyx_v_ngram_start, Py_ssize_t __pyx_v_ngram_end, Py_ssize_t __pyx_v_index, Py_ssize_t __pyx_v_range_start, Py_ssize_t __pyx_v_range_end, long __pyx_v_max_l_dist) {
+  unsigned char const *__pyx_v_c_subsequence;
+  unsigned char const *__pyx_v_c_sequence;
+  Py_ssize_t __pyx_v_subseq_len;
+  Py_ssize_t __pyx_v_ngram_len;
+  Py_ssize_t __pyx_v_right_seq_len;
+  Py_ssize_t __pyx_v_left_seq_len;
+  long __pyx_v_dist_right;
+  long __pyx_v_dist_left;
+  Py_ssize_t __pyx_v_right_expand_size;
+  Py_ssize_t __pyx_v_left_expand_size;
+  int __pyx_v_found;
+  long *__pyx_v_scores;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  unsigned char const *__pyx_t_5;
+  unsigned char const *__pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  int __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  Py_ssize_t __pyx_t_10;
+  long __pyx_t_11;
+  PyObject *__pyx_t_12 = NULL;
+  PyObject *__pyx_t_13 = NULL;
+  int __pyx_t_14;
+  int __pyx_t_15;
+  char const *__pyx_t_16;
+  PyObject *__pyx_t_17 = NULL;
+  PyObject *__pyx_t_18 = NULL;
+  PyObject *__pyx_t_19 = NULL;
+  PyObject *__pyx_t_20 = NULL;
+  PyObject *__pyx_t_21 = NULL;
+  PyObject *__pyx_t_22 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("c_expand_ngram_match_byteslike", 0);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":331
+ *     Returns a (start, end, dist) tuple, or None if there is no near-match.
+ *     """
+ *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('sequence is of invalid type %s' % type(sequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 331, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = PyObject_IsInstance(__pyx_v_sequence, __pyx_t_1); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 331, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_3 = ((!(__pyx_t_2 != 0)) != 0);
+  if (unlikely(__pyx_t_3)) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":332
+ *     """
+ *     if not isinstance(sequence, ALLOWED_TYPES):
+ *         raise TypeError('sequence is of invalid type %s' % type(sequence))             # <<<<<<<<<<<<<<
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ */
+    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_sequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_sequence))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 332, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __pyx_t_4 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 332, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __Pyx_Raise(__pyx_t_4, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __PYX_ERR(0, 332, __pyx_L1_error)
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":331
+ *     Returns a (start, end, dist) tuple, or None if there is no near-match.
+ *     """
+ *     if not isinstance(sequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('sequence is of invalid type %s' % type(sequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":333
+ *     if not isinstance(sequence, ALLOWED_TYPES):
+ *         raise TypeError('sequence is of invalid type %s' % type(sequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ALLOWED_TYPES); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 333, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_3 = PyObject_IsInstance(__pyx_v_subsequence, __pyx_t_4); if (unlikely(__pyx_t_3 == ((int)-1))) __PYX_ERR(0, 333, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_2 = ((!(__pyx_t_3 != 0)) != 0);
+  if (unlikely(__pyx_t_2)) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":334
+ *         raise TypeError('sequence is of invalid type %s' % type(sequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))             # <<<<<<<<<<<<<<
+ * 
+ *     cdef const unsigned char *c_subsequence = subsequence
+ */
+    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_subsequence_is_of_invalid_type_s, ((PyObject *)Py_TYPE(__pyx_v_subsequence))); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 334, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_TypeError, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 334, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __PYX_ERR(0, 334, __pyx_L1_error)
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":333
+ *     if not isinstance(sequence, ALLOWED_TYPES):
+ *         raise TypeError('sequence is of invalid type %s' % type(sequence))
+ *     if not isinstance(subsequence, ALLOWED_TYPES):             # <<<<<<<<<<<<<<
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":336
+ *         raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+ * 
+ *     cdef const unsigned char *c_subsequence = subsequence             # <<<<<<<<<<<<<<
+ *     cdef const unsigned char *c_sequence = sequence
+ *     cdef Py_ssize_t subseq_len = len(subsequence)
+ */
+  __pyx_t_5 = __Pyx_PyObject_AsUString(__pyx_v_subsequence); if (unlikely((!__pyx_t_5) && PyErr_Occurred())) __PYX_ERR(0, 336, __pyx_L1_error)
+  __pyx_v_c_subsequence = __pyx_t_5;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":337
+ * 
+ *     cdef const unsigned char *c_subsequence = subsequence
+ *     cdef const unsigned char *c_sequence = sequence             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t subseq_len = len(subsequence)
+ *     cdef Py_ssize_t ngram_len = ngram_end - ngram_start
+ */
+  __pyx_t_6 = __Pyx_PyObject_AsUString(__pyx_v_sequence); if (unlikely((!__pyx_t_6) && PyErr_Occurred())) __PYX_ERR(0, 337, __pyx_L1_error)
+  __pyx_v_c_sequence = __pyx_t_6;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":338
+ *     cdef const unsigned char *c_subsequence = subsequence
+ *     cdef const unsigned char *c_sequence = sequence
+ *     cdef Py_ssize_t subseq_len = len(subsequence)             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t ngram_len = ngram_end - ngram_start
+ *     cdef Py_ssize_t right_seq_len, left_seq_len
+ */
+  __pyx_t_7 = PyObject_Length(__pyx_v_subsequence); if (unlikely(__pyx_t_7 == ((Py_ssize_t)-1))) __PYX_ERR(0, 338, __pyx_L1_error)
+  __pyx_v_subseq_len = __pyx_t_7;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":339
+ *     cdef const unsigned char *c_sequence = sequence
+ *     cdef Py_ssize_t subseq_len = len(subsequence)
+ *     cdef Py_ssize_t ngram_len = ngram_end - ngram_start             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t right_seq_len, left_seq_len
+ *     cdef long dist_right, dist_left
+ */
+  __pyx_v_ngram_len = (__pyx_v_ngram_end - __pyx_v_ngram_start);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":345
+ *     cdef int found
+ * 
+ *     if not (0 <= ngram_start <= ngram_end <= subseq_len and             # <<<<<<<<<<<<<<
+ *             0 <= range_start <= index and
+ *             index + ngram_len <= range_end <= len(sequence)):
+ */
+  __pyx_t_3 = (0 <= __pyx_v_ngram_start);
+  if (__pyx_t_3) {
+    __pyx_t_3 = (__pyx_v_ngram_start <= __pyx_v_ngram_end);
+    if (__pyx_t_3) {
+      __pyx_t_3 = (__pyx_v_ngram_end <= __pyx_v_subseq_len);
+    }
+  }
+  __pyx_t_8 = (__pyx_t_3 != 0);
+  if (__pyx_t_8) {
+  } else {
+    __pyx_t_2 = __pyx_t_8;
+    goto __pyx_L6_bool_binop_done;
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":346
+ * 
+ *     if not (0 <= ngram_start <= ngram_end <= subseq_len and
+ *             0 <= range_start <= index and             # <<<<<<<<<<<<<<
+ *             index + ngram_len <= range_end <= len(sequence)):
+ *         raise ValueError('invalid n-gram match or index range')
+ */
+  __pyx_t_8 = (0 <= __pyx_v_range_start);
+  if (__pyx_t_8) {
+    __pyx_t_8 = (__pyx_v_range_start <= __pyx_v_index);
+  }
+  __pyx_t_3 = (__pyx_t_8 != 0);
+  if (__pyx_t_3) {
+  } else {
+    __pyx_t_2 = __pyx_t_3;
+    goto __pyx_L6_bool_binop_done;
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":347
+ *     if not (0 <= ngram_start <= ngram_end <= subseq_len and
+ *             0 <= range_start <= index and
+ *             index + ngram_len <= range_end <= len(sequence)):             # <<<<<<<<<<<<<<
+ *         raise ValueError('invalid n-gram match or index range')
+ * 
+ */
+  __pyx_t_3 = ((__pyx_v_index + __pyx_v_ngram_len) <= __pyx_v_range_end);
+  if (__pyx_t_3) {
+    __pyx_t_7 = PyObject_Length(__pyx_v_sequence); if (unlikely(__pyx_t_7 == ((Py_ssize_t)-1))) __PYX_ERR(0, 347, __pyx_L1_error)
+    __pyx_t_3 = (__pyx_v_range_end <= __pyx_t_7);
+  }
+  __pyx_t_8 = (__pyx_t_3 != 0);
+  __pyx_t_2 = __pyx_t_8;
+  __pyx_L6_bool_binop_done:;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":345
+ *     cdef int found
+ * 
+ *     if not (0 <= ngram_start <= ngram_end <= subseq_len and             # <<<<<<<<<<<<<<
+ *             0 <= range_start <= index and
+ *             index + ngram_len <= range_end <= len(sequence)):
+ */
+  __pyx_t_8 = ((!__pyx_t_2) != 0);
+  if (unlikely(__pyx_t_8)) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":348
+ *             0 <= range_start <= index and
+ *             index + ngram_len <= range_end <= len(sequence)):
+ *         raise ValueError('invalid n-gram match or index range')             # <<<<<<<<<<<<<<
+ * 
+ *     # the right expansion may extend until max_l_dist items past the end
+ */
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_ValueError, __pyx_tuple__3, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 348, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __PYX_ERR(0, 348, __pyx_L1_error)
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":345
+ *     cdef int found
+ * 
+ *     if not (0 <= ngram_start <= ngram_end <= subseq_len and             # <<<<<<<<<<<<<<
+ *             0 <= range_start <= index and
+ *             index + ngram_len <= range_end <= len(sequence)):
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":352
+ *     # the right expansion may extend until max_l_dist items past the end
+ *     # of the sub-sequence
+ *     right_seq_len = min(range_end, index - ngram_start + subseq_len + max_l_dist) - (index + ngram_len)             # <<<<<<<<<<<<<<
+ *     if right_seq_len < 0:
+ *         right_seq_len = 0
+ */
+  __pyx_t_7 = (((__pyx_v_index - __pyx_v_ngram_start) + __pyx_v_subseq_len) + __pyx_v_max_l_dist);
+  __pyx_t_9 = __pyx_v_range_end;
+  if (((__pyx_t_7 < __pyx_t_9) != 0)) {
+    __pyx_t_10 = __pyx_t_7;
+  } else {
+    __pyx_t_10 = __pyx_t_9;
+  }
+  __pyx_v_right_seq_len = (__pyx_t_10 - (__pyx_v_index + __pyx_v_ngram_len));
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":353
+ *     # of the sub-sequence
+ *     right_seq_len = min(range_end, index - ngram_start + subseq_len + max_l_dist) - (index + ngram_len)
+ *     if right_seq_len < 0:             # <<<<<<<<<<<<<<
+ *         right_seq_len = 0
+ * 
+ */
+  __pyx_t_8 = ((__pyx_v_right_seq_len < 0) != 0);
+  if (__pyx_t_8) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":354
+ *     right_seq_len = min(range_end, index - ngram_start + subseq_len + max_l_dist) - (index + ngram_len)
+ *     if right_seq_len < 0:
+ *         right_seq_len = 0             # <<<<<<<<<<<<<<
+ * 
+ *     cdef long *scores = <long *> malloc(max(subseq_len, 1) * sizeof(long))
+ */
+    __pyx_v_right_seq_len = 0;
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":353
+ *     # of the sub-sequence
+ *     right_seq_len = min(range_end, index - ngram_start + subseq_len + max_l_dist) - (index + ngram_len)
+ *     if right_seq_len < 0:             # <<<<<<<<<<<<<<
+ *         right_seq_len = 0
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":356
+ *         right_seq_len = 0
+ * 
+ *     cdef long *scores = <long *> malloc(max(subseq_len, 1) * sizeof(long))             # <<<<<<<<<<<<<<
+ *     if scores is NULL:
+ *         raise MemoryError()
+ */
+  __pyx_t_11 = 1;
+  __pyx_t_10 = __pyx_v_subseq_len;
+  if (((__pyx_t_11 > __pyx_t_10) != 0)) {
+    __pyx_t_7 = __pyx_t_11;
+  } else {
+    __pyx_t_7 = __pyx_t_10;
+  }
+  __pyx_v_scores = ((long *)malloc((__pyx_t_7 * (sizeof(long)))));
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":357
+ * 
+ *     cdef long *scores = <long *> malloc(max(subseq_len, 1) * sizeof(long))
+ *     if scores is NULL:             # <<<<<<<<<<<<<<
+ *         raise MemoryError()
+ * 
+ */
+  __pyx_t_8 = ((__pyx_v_scores == NULL) != 0);
+  if (unlikely(__pyx_t_8)) {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":358
+ *     cdef long *scores = <long *> malloc(max(subseq_len, 1) * sizeof(long))
+ *     if scores is NULL:
+ *         raise MemoryError()             # <<<<<<<<<<<<<<
+ * 
+ *     try:
+ */
+    PyErr_NoMemory(); __PYX_ERR(0, 358, __pyx_L1_error)
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":357
+ * 
+ *     cdef long *scores = <long *> malloc(max(subseq_len, 1) * sizeof(long))
+ *     if scores is NULL:             # <<<<<<<<<<<<<<
+ *         raise MemoryError()
+ * 
+ */
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":360
+ *         raise MemoryError()
+ * 
+ *     try:             # <<<<<<<<<<<<<<
+ *         with nogil:
+ *             found = _expand_strided(
+ */
+  /*try:*/ {
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":361
+ * 
+ *     try:
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             found = _expand_strided(
+ *                 c_subsequence + ngram_end, 1, subseq_len - ngram_end,
+ */
+    {
+        #ifdef WITH_THREAD
+        PyThreadState *_save;
+        Py_UNBLOCK_THREADS
+        __Pyx_FastGIL_Remember();
+        #endif
+        /*try:*/ {
+
+          /* "fuzzysearch/_levenshtein_ngrams.pyx":362
+ *     try:
+ *         with nogil:
+ *             found = _expand_strided(             # <<<<<<<<<<<<<<
+ *                 c_subsequence + ngram_end, 1, subseq_len - ngram_end,
+ *                 c_sequence + index + ngram_len, 1, right_seq_len,
+ */
+          __pyx_v_found = __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_strided((__pyx_v_c_subsequence + __pyx_v_ngram_end), 1, (__pyx_v_subseq_len - __pyx_v_ngram_end), ((__pyx_v_c_sequence + __pyx_v_index) + __pyx_v_ngram_len), 1, __pyx_v_right_seq_len, __pyx_v_max_l_dist, __pyx_v_scores, (&__pyx_v_dist_right), (&__pyx_v_right_expand_size));
+
+          /* "fuzzysearch/_levenshtein_ngrams.pyx":367
+ *                 max_l_dist, scores, &dist_right, &right_expand_size,
+ *             )
+ *             if found:             # <<<<<<<<<<<<<<
+ *                 # scan backwards from just before the n-gram's match
+ *                 left_seq_len = index - max(range_start, index - ngram_start - (max_l_dist - dist_right))
+ */
+          __pyx_t_8 = (__pyx_v_found != 0);
+          if (__pyx_t_8) {
+
+            /* "fuzzysearch/_levenshtein_ngrams.pyx":369
+ *             if found:
+ *                 # scan backwards from just before the n-gram's match
+ *                 left_seq_len = index - max(range_start, index - ngram_start - (max_l_dist - dist_right))             # <<<<<<<<<<<<<<
+ *                 found = _expand_strided(
+ *                     c_subsequence + ngram_start - 1, -1, ngram_start,
+ */
+            __pyx_t_7 = ((__pyx_v_index - __pyx_v_ngram_start) - (__pyx_v_max_l_dist - __pyx_v_dist_right));
+            __pyx_t_10 = __pyx_v_range_start;
+            if (((__pyx_t_7 > __pyx_t_10) != 0)) {
+              __pyx_t_9 = __pyx_t_7;
+            } else {
+              __pyx_t_9 = __pyx_t_10;
+            }
+            __pyx_v_left_seq_len = (__pyx_v_index - __pyx_t_9);
+
+            /* "fuzzysearch/_levenshtein_ngrams.pyx":370
+ *                 # scan backwards from just before the n-gram's match
+ *                 left_seq_len = index - max(range_start, index - ngram_start - (max_l_dist - dist_right))
+ *                 found = _expand_strided(             # <<<<<<<<<<<<<<
+ *                     c_subsequence + ngram_start - 1, -1, ngram_start,
+ *                     c_sequence + index - 1, -1, left_seq_len,
+ */
+            __pyx_v_found = __pyx_f_11fuzzysearch_19_levenshtein_ngrams__expand_strided(((__pyx_v_c_subsequence + __pyx_v_ngram_start) - 1), -1L, __pyx_v_ngram_start, ((__pyx_v_c_sequence + __pyx_v_index) - 1), -1L, __pyx_v_left_seq_len, (__pyx_v_max_l_dist - __pyx_v_dist_right), __pyx_v_scores, (&__pyx_v_dist_left), (&__pyx_v_left_expand_size));
+
+            /* "fuzzysearch/_levenshtein_ngrams.pyx":367
+ *                 max_l_dist, scores, &dist_right, &right_expand_size,
+ *             )
+ *             if found:             # <<<<<<<<<<<<<<
+ *                 # scan backwards from just before the n-gram's match
+ *                 left_seq_len = index - max(range_start, index - ngram_start - (max_l_dist - dist_right))
+ */
+          }
+        }
+
+        /* "fuzzysearch/_levenshtein_ngrams.pyx":361
+ * 
+ *     try:
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             found = _expand_strided(
+ *                 c_subsequence + ngram_end, 1, subseq_len - ngram_end,
+ */
+        /*finally:*/ {
+          /*normal exit:*/{
+            #ifdef WITH_THREAD
+            __Pyx_FastGIL_Forget();
+            Py_BLOCK_THREADS
+            #endif
+            goto __pyx_L16;
+          }
+          __pyx_L16:;
+        }
+    }
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":375
+ *                     max_l_dist - dist_right, scores, &dist_left, &left_expand_size,
+ *                 )
+ *         if not found:             # <<<<<<<<<<<<<<
+ *             return None
+ *         return (index - left_expand_size,
+ */
+    __pyx_t_8 = ((!(__pyx_v_found != 0)) != 0);
+    if (__pyx_t_8) {
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":376
+ *                 )
+ *         if not found:
+ *             return None             # <<<<<<<<<<<<<<
+ *         return (index - left_expand_size,
+ *                 index + ngram_len + right_expand_size,
+ */
+      __Pyx_XDECREF(__pyx_r);
+      __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+      goto __pyx_L11_return;
+
+      /* "fuzzysearch/_levenshtein_ngrams.pyx":375
+ *                     max_l_dist - dist_right, scores, &dist_left, &left_expand_size,
+ *                 )
+ *         if not found:             # <<<<<<<<<<<<<<
+ *             return None
+ *         return (index - left_expand_size,
+ */
+    }
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":377
+ *         if not found:
+ *             return None
+ *         return (index - left_expand_size,             # <<<<<<<<<<<<<<
+ *                 index + ngram_len + right_expand_size,
+ *                 dist_left + dist_right)
+ */
+    __Pyx_XDECREF(__pyx_r);
+    __pyx_t_1 = PyInt_FromSsize_t((__pyx_v_index - __pyx_v_left_expand_size)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 377, __pyx_L12_error)
+    __Pyx_GOTREF(__pyx_t_1);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":378
+ *             return None
+ *         return (index - left_expand_size,
+ *                 index + ngram_len + right_expand_size,             # <<<<<<<<<<<<<<
+ *                 dist_left + dist_right)
+ * 
+ */
+    __pyx_t_4 = PyInt_FromSsize_t(((__pyx_v_index + __pyx_v_ngram_len) + __pyx_v_right_expand_size)); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 378, __pyx_L12_error)
+    __Pyx_GOTREF(__pyx_t_4);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":379
+ *         return (index - left_expand_size,
+ *                 index + ngram_len + right_expand_size,
+ *                 dist_left + dist_right)             # <<<<<<<<<<<<<<
+ * 
+ *     finally:
+ */
+    __pyx_t_12 = __Pyx_PyInt_From_long((__pyx_v_dist_left + __pyx_v_dist_right)); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 379, __pyx_L12_error)
+    __Pyx_GOTREF(__pyx_t_12);
+
+    /* "fuzzysearch/_levenshtein_ngrams.pyx":377
+ *         if not found:
+ *             return None
+ *         return (index - left_expand_size,             # <<<<<<<<<<<<<<
+ *                 index + ngram_len + right_expand_size,
+ *                 dist_left + dist_right)
+ */
+    __pyx_t_13 = PyTuple_New(3); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 377, __pyx_L12_error)
+    __Pyx_GOTREF(__pyx_t_13);
+    __Pyx_GIVEREF(__pyx_t_1);
+    PyTuple_SET_ITEM(__pyx_t_13, 0, __pyx_t_1);
+    __Pyx_GIVEREF(__pyx_t_4);
+    PyTuple_SET_ITEM(__pyx_t_13, 1, __pyx_t_4);
+    __Pyx_GIVEREF(__pyx_t_12);
+    PyTuple_SET_ITEM(__pyx_t_13, 2, __pyx_t_12);
+    __pyx_t_1 = 0;
+    __pyx_t_4 = 0;
+    __pyx_t_12 = 0;
+    __pyx_r = __pyx_t_13;
+    __pyx_t_13 = 0;
+    goto __pyx_L11_return;
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":382
+ * 
+ *     finally:
+ *         free(scores)             # <<<<<<<<<<<<<<
+ */
+  /*finally:*/ {
+    __pyx_L12_error:;
+    /*exception exit:*/{
+      __Pyx_PyThreadState_declare
+      __Pyx_PyThreadState_assign
+      __pyx_t_17 = 0; __pyx_t_18 = 0; __pyx_t_19 = 0; __pyx_t_20 = 0; __pyx_t_21 = 0; __pyx_t_22 = 0;
+      __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+      __Pyx_XDECREF(__pyx_t_12); __pyx_t_12 = 0;
+      __Pyx_XDECREF(__pyx_t_13); __pyx_t_13 = 0;
+      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_20, &__pyx_t_21, &__pyx_t_22);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_17, &__pyx_t_18, &__pyx_t_19) < 0)) __Pyx_ErrFetch(&__pyx_t_17, &__pyx_t_18, &__pyx_t_19);
+      __Pyx_XGOTREF(__pyx_t_17);
+      __Pyx_XGOTREF(__pyx_t_18);
+      __Pyx_XGOTREF(__pyx_t_19);
+      __Pyx_XGOTREF(__pyx_t_20);
+      __Pyx_XGOTREF(__pyx_t_21);
+      __Pyx_XGOTREF(__pyx_t_22);
+      __pyx_t_14 = __pyx_lineno; __pyx_t_15 = __pyx_clineno; __pyx_t_16 = __pyx_filename;
+      {
+        free(__pyx_v_scores);
+      }
+      if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_20);
+        __Pyx_XGIVEREF(__pyx_t_21);
+        __Pyx_XGIVEREF(__pyx_t_22);
+        __Pyx_ExceptionReset(__pyx_t_20, __pyx_t_21, __pyx_t_22);
+      }
+      __Pyx_XGIVEREF(__pyx_t_17);
+      __Pyx_XGIVEREF(__pyx_t_18);
+      __Pyx_XGIVEREF(__pyx_t_19);
+      __Pyx_ErrRestore(__pyx_t_17, __pyx_t_18, __pyx_t_19);
+      __pyx_t_17 = 0; __pyx_t_18 = 0; __pyx_t_19 = 0; __pyx_t_20 = 0; __pyx_t_21 = 0; __pyx_t_22 = 0;
+      __pyx_lineno = __pyx_t_14; __pyx_clineno = __pyx_t_15; __pyx_filename = __pyx_t_16;
+      goto __pyx_L1_error;
+    }
+    __pyx_L11_return: {
+      __pyx_t_22 = __pyx_r;
+      __pyx_r = 0;
+      free(__pyx_v_scores);
+      __pyx_r = __pyx_t_22;
+      __pyx_t_22 = 0;
+      goto __pyx_L0;
+    }
+  }
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":319
+ * 
+ * 
+ * def c_expand_ngram_match_byteslike(subsequence, sequence,             # <<<<<<<<<<<<<<
+ *                                    Py_ssize_t ngram_start, Py_ssize_t ngram_end,
+ *                                    Py_ssize_t index,
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_12);
+  __Pyx_XDECREF(__pyx_t_13);
+  __Pyx_AddTraceback("fuzzysearch._levenshtein_ngrams.c_expand_ngram_match_byteslike", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyMethodDef __pyx_methods[] = {
+  {0, 0, 0, 0}
+};
+
+#if PY_MAJOR_VERSION >= 3
+#if CYTHON_PEP489_MULTI_PHASE_INIT
+static PyObject* __pyx_pymod_create(PyObject *spec, PyModuleDef *def); /*proto*/
+static int __pyx_pymod_exec__levenshtein_ngrams(PyObject* module); /*proto*/
+static PyModuleDef_Slot __pyx_moduledef_slots[] = {
+  {Py_mod_create, (void*)__pyx_pymod_create},
+  {Py_mod_exec, (void*)__pyx_pymod_exec__levenshtein_ngrams},
+  {0, NULL}
+};
+#endif
+
+static struct PyModuleDef __pyx_moduledef = {
+    PyModuleDef_HEAD_INIT,
+    "_levenshtein_ngrams",
+    0, /* m_doc */
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+    0, /* m_size */
+  #else
+    -1, /* m_size */
+  #endif
+    __pyx_methods /* m_methods */,
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+    __pyx_moduledef_slots, /* m_slots */
+  #else
+    NULL, /* m_reload */
+  #endif
+    NULL, /* m_traverse */
+    NULL, /* m_clear */
+    NULL /* m_free */
+};
+#endif
+#ifndef CYTHON_SMALL_CODE
+#if defined(__clang__)
+    #define CYTHON_SMALL_CODE
+#elif defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 3))
+    #define CYTHON_SMALL_CODE __attribute__((cold))
+#else
+    #define CYTHON_SMALL_CODE
+#endif
+#endif
+
+static __Pyx_StringTabEntry __pyx_string_tab[] = {
+  {&__pyx_n_s_ALLOWED_TYPES, __pyx_k_ALLOWED_TYPES, sizeof(__pyx_k_ALLOWED_TYPES), 0, 0, 1, 1},
+  {&__pyx_n_s_MemoryError, __pyx_k_MemoryError, sizeof(__pyx_k_MemoryError), 0, 0, 1, 1},
+  {&__pyx_n_s_TypeError, __pyx_k_TypeError, sizeof(__pyx_k_TypeError), 0, 0, 1, 1},
+  {&__pyx_n_s_ValueError, __pyx_k_ValueError, sizeof(__pyx_k_ValueError), 0, 0, 1, 1},
+  {&__pyx_n_s_a, __pyx_k_a, sizeof(__pyx_k_a), 0, 0, 1, 1},
+  {&__pyx_n_s_all, __pyx_k_all, sizeof(__pyx_k_all), 0, 0, 1, 1},
+  {&__pyx_n_s_b, __pyx_k_b, sizeof(__pyx_k_b), 0, 0, 1, 1},
+  {&__pyx_n_s_c, __pyx_k_c, sizeof(__pyx_k_c), 0, 0, 1, 1},
+  {&__pyx_n_s_c_expand_long, __pyx_k_c_expand_long, sizeof(__pyx_k_c_expand_long), 0, 0, 1, 1},
+  {&__pyx_n_s_c_expand_ngram_match_byteslike, __pyx_k_c_expand_ngram_match_byteslike, sizeof(__pyx_k_c_expand_ngram_match_byteslike), 0, 0, 1, 1},
+  {&__pyx_n_s_c_expand_short, __pyx_k_c_expand_short, sizeof(__pyx_k_c_expand_short), 0, 0, 1, 1},
+  {&__pyx_n_s_c_sequence, __pyx_k_c_sequence, sizeof(__pyx_k_c_sequence), 0, 0, 1, 1},
+  {&__pyx_n_s_c_subsequence, __pyx_k_c_subsequence, sizeof(__pyx_k_c_subsequence), 0, 0, 1, 1},
+  {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
+  {&__pyx_n_s_dist_left, __pyx_k_dist_left, sizeof(__pyx_k_dist_left), 0, 0, 1, 1},
+  {&__pyx_n_s_dist_right, __pyx_k_dist_right, sizeof(__pyx_k_dist_right), 0, 0, 1, 1},
+  {&__pyx_n_s_enumerate, __pyx_k_enumerate, sizeof(__pyx_k_enumerate), 0, 0, 1, 1},
+  {&__pyx_n_s_found, __pyx_k_found, sizeof(__pyx_k_found), 0, 0, 1, 1},
+  {&__pyx_n_s_fuzzysearch__levenshtein_ngrams, __pyx_k_fuzzysearch__levenshtein_ngrams, sizeof(__pyx_k_fuzzysearch__levenshtein_ngrams), 0, 0, 1, 1},
+  {&__pyx_n_s_index, __pyx_k_index, sizeof(__pyx_k_index), 0, 0, 1, 1},
+  {&__pyx_kp_s_invalid_n_gram_match_or_index_ra, __pyx_k_invalid_n_gram_match_or_index_ra, sizeof(__pyx_k_invalid_n_gram_match_or_index_ra), 0, 0, 1, 0},
+  {&__pyx_n_s_left_expand_size, __pyx_k_left_expand_size, sizeof(__pyx_k_left_expand_size), 0, 0, 1, 1},
+  {&__pyx_n_s_left_seq_len, __pyx_k_left_seq_len, sizeof(__pyx_k_left_seq_len), 0, 0, 1, 1},
+  {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
+  {&__pyx_n_s_max_good_score, __pyx_k_max_good_score, sizeof(__pyx_k_max_good_score), 0, 0, 1, 1},
+  {&__pyx_n_s_max_l_dist, __pyx_k_max_l_dist, sizeof(__pyx_k_max_l_dist), 0, 0, 1, 1},
+  {&__pyx_n_s_min_intermediate_score, __pyx_k_min_intermediate_score, sizeof(__pyx_k_min_intermediate_score), 0, 0, 1, 1},
+  {&__pyx_n_s_min_score, __pyx_k_min_score, sizeof(__pyx_k_min_score), 0, 0, 1, 1},
+  {&__pyx_n_s_min_score_idx, __pyx_k_min_score_idx, sizeof(__pyx_k_min_score_idx), 0, 0, 1, 1},
+  {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
+  {&__pyx_n_s_needle_idx_range_end, __pyx_k_needle_idx_range_end, sizeof(__pyx_k_needle_idx_range_end), 0, 0, 1, 1},
+  {&__pyx_n_s_needle_idx_range_start, __pyx_k_needle_idx_range_start, sizeof(__pyx_k_needle_idx_range_start), 0, 0, 1, 1},
+  {&__pyx_n_s_new_needle_idx_range_end, __pyx_k_new_needle_idx_range_end, sizeof(__pyx_k_new_needle_idx_range_end), 0, 0, 1, 1},
+  {&__pyx_n_s_new_needle_idx_range_start, __pyx_k_new_needle_idx_range_start, sizeof(__pyx_k_new_needle_idx_range_start), 0, 0, 1, 1},
+  {&__pyx_n_s_ngram_end, __pyx_k_ngram_end, sizeof(__pyx_k_ngram_end), 0, 0, 1, 1},
+  {&__pyx_n_s_ngram_len, __pyx_k_ngram_len, sizeof(__pyx_k_ngram_len), 0, 0, 1, 1},
+  {&__pyx_n_s_ngram_start, __pyx_k_ngram_start, sizeof(__pyx_k_ngram_start), 0, 0, 1, 1},
+  {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
+  {&__pyx_n_s_range_end, __pyx_k_range_end, sizeof(__pyx_k_range_end), 0, 0, 1, 1},
+  {&__pyx_n_s_range_start, __pyx_k_range_start, sizeof(__pyx_k_range_start), 0, 0, 1, 1},
+  {&__pyx_n_s_right_expand_size, __pyx_k_right_expand_size, sizeof(__pyx_k_right_expand_size), 0, 0, 1, 1},
+  {&__pyx_n_s_right_seq_len, __pyx_k_right_seq_len, sizeof(__pyx_k_right_seq_len), 0, 0, 1, 1},
+  {&__pyx_n_s_scores, __pyx_k_scores, sizeof(__pyx_k_scores), 0, 0, 1, 1},
+  {&__pyx_n_s_seq_char, __pyx_k_seq_char, sizeof(__pyx_k_seq_char), 0, 0, 1, 1},
+  {&__pyx_n_s_seq_idx, __pyx_k_seq_idx, sizeof(__pyx_k_seq_idx), 0, 0, 1, 1},
+  {&__pyx_n_s_seq_index, __pyx_k_seq_index, sizeof(__pyx_k_seq_index), 0, 0, 1, 1},
+  {&__pyx_n_s_sequence, __pyx_k_sequence, sizeof(__pyx_k_sequence), 0, 0, 1, 1},
+  {&__pyx_kp_s_sequence_is_of_invalid_type_s, __pyx_k_sequence_is_of_invalid_type_s, sizeof(__pyx_k_sequence_is_of_invalid_type_s), 0, 0, 1, 0},
+  {&__pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_k_src_fuzzysearch__levenshtein_ngr, sizeof(__pyx_k_src_fuzzysearch__levenshtein_ngr), 0, 0, 1, 0},
+  {&__pyx_n_s_subseq_idx, __pyx_k_subseq_idx, sizeof(__pyx_k_subseq_idx), 0, 0, 1, 1},
+  {&__pyx_n_s_subseq_index, __pyx_k_subseq_index, sizeof(__pyx_k_subseq_index), 0, 0, 1, 1},
+  {&__pyx_n_s_subseq_len, __pyx_k_subseq_len, sizeof(__pyx_k_subseq_len), 0, 0, 1, 1},
+  {&__pyx_n_s_subsequence, __pyx_k_subsequence, sizeof(__pyx_k_subsequence), 0, 0, 1, 1},
+  {&__pyx_kp_s_subsequence_is_of_invalid_type_s, __pyx_k_subsequence_is_of_invalid_type_s, sizeof(__pyx_k_subsequence_is_of_invalid_type_s), 0, 0, 1, 0},
+  {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
+  {&__pyx_n_s_xrange, __pyx_k_xrange, sizeof(__pyx_k_xrange), 0, 0, 1, 1},
+  {0, 0, 0, 0, 0, 0, 0}
+};
+static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
+  __pyx_builtin_MemoryError = __Pyx_GetBuiltinName(__pyx_n_s_MemoryError); if (!__pyx_builtin_MemoryError) __PYX_ERR(0, 42, __pyx_L1_error)
+  #if PY_MAJOR_VERSION >= 3
+  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_xrange) __PYX_ERR(0, 43, __pyx_L1_error)
+  #else
+  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_xrange); if (!__pyx_builtin_xrange) __PYX_ERR(0, 43, __pyx_L1_error)
+  #endif
+  __pyx_builtin_enumerate = __Pyx_GetBuiltinName(__pyx_n_s_enumerate); if (!__pyx_builtin_enumerate) __PYX_ERR(0, 47, __pyx_L1_error)
+  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 188, __pyx_L1_error)
+  __pyx_builtin_TypeError = __Pyx_GetBuiltinName(__pyx_n_s_TypeError); if (!__pyx_builtin_TypeError) __PYX_ERR(0, 332, __pyx_L1_error)
+  __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(0, 348, __pyx_L1_error)
+  return 0;
+  __pyx_L1_error:;
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":30
+ *     cdef unsigned int subseq_len = len(subsequence)
+ *     if subseq_len == 0:
+ *         return (0, 0)             # <<<<<<<<<<<<<<
+ * 
+ *     cdef size_t subseq_idx, seq_idx
+ */
+  __pyx_tuple_ = PyTuple_Pack(2, __pyx_int_0, __pyx_int_0); if (unlikely(!__pyx_tuple_)) __PYX_ERR(0, 30, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple_);
+  __Pyx_GIVEREF(__pyx_tuple_);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":72
+ *                 min_score_idx = seq_index + 1
+ * 
+ *         return (min_score, min_score_idx) if min_score <= max_l_dist else (None, None)             # <<<<<<<<<<<<<<
+ * 
+ *     finally:
+ */
+  __pyx_tuple__2 = PyTuple_Pack(2, Py_None, Py_None); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(0, 72, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__2);
+  __Pyx_GIVEREF(__pyx_tuple__2);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":348
+ *             0 <= range_start <= index and
+ *             index + ngram_len <= range_end <= len(sequence)):
+ *         raise ValueError('invalid n-gram match or index range')             # <<<<<<<<<<<<<<
+ * 
+ *     # the right expansion may extend until max_l_dist items past the end
+ */
+  __pyx_tuple__3 = PyTuple_Pack(1, __pyx_kp_s_invalid_n_gram_match_or_index_ra); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(0, 348, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__3);
+  __Pyx_GIVEREF(__pyx_tuple__3);
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":9
+ * 
+ * 
+ * def c_expand_short(subsequence, sequence, max_l_dist):             # <<<<<<<<<<<<<<
+ *     """Straightforward implementation of partial match expansion."""
+ *     # The following diagram shows the score calculation step.
+ */
+  __pyx_tuple__4 = PyTuple_Pack(16, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_max_l_dist, __pyx_n_s_subseq_len, __pyx_n_s_subseq_idx, __pyx_n_s_seq_idx, __pyx_n_s_min_score, __pyx_n_s_min_score_idx, __pyx_n_s_min_intermediate_score, __pyx_n_s_a, __pyx_n_s_b, __pyx_n_s_c, __pyx_n_s_scores, __pyx_n_s_seq_index, __pyx_n_s_seq_char, __pyx_n_s_subseq_index); if (unlikely(!__pyx_tuple__4)) __PYX_ERR(0, 9, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__4);
+  __Pyx_GIVEREF(__pyx_tuple__4);
+  __pyx_codeobj__5 = (PyObject*)__Pyx_PyCode_New(3, 0, 16, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__4, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_n_s_c_expand_short, 9, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__5)) __PYX_ERR(0, 9, __pyx_L1_error)
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":78
+ * 
+ * 
+ * def c_expand_long(subsequence, sequence, max_l_dist):             # <<<<<<<<<<<<<<
+ *     """Partial match expansion, optimized for long sub-sequences."""
+ *     # The additional optimization in this version is to limit the part of
+ */
+  __pyx_tuple__6 = PyTuple_Pack(20, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_max_l_dist, __pyx_n_s_subseq_len, __pyx_n_s_subseq_idx, __pyx_n_s_seq_idx, __pyx_n_s_min_score, __pyx_n_s_min_score_idx, __pyx_n_s_a, __pyx_n_s_b, __pyx_n_s_c, __pyx_n_s_max_good_score, __pyx_n_s_new_needle_idx_range_start, __pyx_n_s_new_needle_idx_range_end, __pyx_n_s_scores, __pyx_n_s_needle_idx_range_start, __pyx_n_s_needle_idx_range_end, __pyx_n_s_seq_index, __pyx_n_s_seq_char, __pyx_n_s_subseq_index); if (unlikely(!__pyx_tuple__6)) __PYX_ERR(0, 78, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__6);
+  __Pyx_GIVEREF(__pyx_tuple__6);
+  __pyx_codeobj__7 = (PyObject*)__Pyx_PyCode_New(3, 0, 20, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__6, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_n_s_c_expand_long, 78, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__7)) __PYX_ERR(0, 78, __pyx_L1_error)
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":319
+ * 
+ * 
+ * def c_expand_ngram_match_byteslike(subsequence, sequence,             # <<<<<<<<<<<<<<
+ *                                    Py_ssize_t ngram_start, Py_ssize_t ngram_end,
+ *                                    Py_ssize_t index,
+ */
+  __pyx_tuple__8 = PyTuple_Pack(20, __pyx_n_s_subsequence, __pyx_n_s_sequence, __pyx_n_s_ngram_start, __pyx_n_s_ngram_end, __pyx_n_s_index, __pyx_n_s_range_start, __pyx_n_s_range_end, __pyx_n_s_max_l_dist, __pyx_n_s_c_subsequence, __pyx_n_s_c_sequence, __pyx_n_s_subseq_len, __pyx_n_s_ngram_len, __pyx_n_s_right_seq_len, __pyx_n_s_left_seq_len, __pyx_n_s_dist_right, __pyx_n_s_dist_left, __pyx_n_s_right_expand_size, __pyx_n_s_left_expand_size, __pyx_n_s_found, __pyx_n_s_scores); if (unlikely(!__pyx_tuple__8)) __PYX_ERR(0, 319, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__8);
+  __Pyx_GIVEREF(__pyx_tuple__8);
+  __pyx_codeobj__9 = (PyObject*)__Pyx_PyCode_New(8, 0, 20, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__8, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_src_fuzzysearch__levenshtein_ngr, __pyx_n_s_c_expand_ngram_match_byteslike, 319, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__9)) __PYX_ERR(0, 319, __pyx_L1_error)
+  __Pyx_RefNannyFinishContext();
+  return 0;
+  __pyx_L1_error:;
+  __Pyx_RefNannyFinishContext();
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
+  if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error);
+  __pyx_int_0 = PyInt_FromLong(0); if (unlikely(!__pyx_int_0)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_int_1 = PyInt_FromLong(1); if (unlikely(!__pyx_int_1)) __PYX_ERR(0, 1, __pyx_L1_error)
+  return 0;
+  __pyx_L1_error:;
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_modinit_global_init_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_variable_export_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_function_export_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_type_init_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_type_import_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_variable_import_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_function_import_code(void); /*proto*/
+
+static int __Pyx_modinit_global_init_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_global_init_code", 0);
+  /*--- Global init code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_variable_export_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_export_code", 0);
+  /*--- Variable export code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_function_export_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_function_export_code", 0);
+  /*--- Function export code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_type_init_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
+  /*--- Type init code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_type_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_type_import_code", 0);
+  /*--- Type import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_variable_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_import_code", 0);
+  /*--- Variable import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
 
 static int __Pyx_modinit_function_import_code(void) {
   __Pyx_RefNannyDeclarations
@@ -3452,10 +5428,10 @@ if (!__Pyx_RefNanny) {
  * 
  * 
  * __all__ = [             # <<<<<<<<<<<<<<
- *     'c_expand_short', 'c_expand_long'
+ *     'c_expand_short', 'c_expand_long', 'c_expand_ngram_match_byteslike',
  * ]
  */
-  __pyx_t_1 = PyList_New(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 4, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 4, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_c_expand_short);
   __Pyx_GIVEREF(__pyx_n_s_c_expand_short);
@@ -3463,6 +5439,9 @@ if (!__Pyx_RefNanny) {
   __Pyx_INCREF(__pyx_n_s_c_expand_long);
   __Pyx_GIVEREF(__pyx_n_s_c_expand_long);
   PyList_SET_ITEM(__pyx_t_1, 1, __pyx_n_s_c_expand_long);
+  __Pyx_INCREF(__pyx_n_s_c_expand_ngram_match_byteslike);
+  __Pyx_GIVEREF(__pyx_n_s_c_expand_ngram_match_byteslike);
+  PyList_SET_ITEM(__pyx_t_1, 2, __pyx_n_s_c_expand_ngram_match_byteslike);
   if (PyDict_SetItem(__pyx_d, __pyx_n_s_all, __pyx_t_1) < 0) __PYX_ERR(0, 4, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
@@ -3490,6 +5469,36 @@ if (!__Pyx_RefNanny) {
   if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_expand_long, __pyx_t_1) < 0) __PYX_ERR(0, 78, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":158
+ * 
+ * 
+ * ALLOWED_TYPES = (bytes, bytearray)             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_t_1 = PyTuple_New(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 158, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_INCREF(((PyObject *)(&PyBytes_Type)));
+  __Pyx_GIVEREF(((PyObject *)(&PyBytes_Type)));
+  PyTuple_SET_ITEM(__pyx_t_1, 0, ((PyObject *)(&PyBytes_Type)));
+  __Pyx_INCREF(((PyObject *)(&PyByteArray_Type)));
+  __Pyx_GIVEREF(((PyObject *)(&PyByteArray_Type)));
+  PyTuple_SET_ITEM(__pyx_t_1, 1, ((PyObject *)(&PyByteArray_Type)));
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ALLOWED_TYPES, __pyx_t_1) < 0) __PYX_ERR(0, 158, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "fuzzysearch/_levenshtein_ngrams.pyx":319
+ * 
+ * 
+ * def c_expand_ngram_match_byteslike(subsequence, sequence,             # <<<<<<<<<<<<<<
+ *                                    Py_ssize_t ngram_start, Py_ssize_t ngram_end,
+ *                                    Py_ssize_t index,
+ */
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_11fuzzysearch_19_levenshtein_ngrams_5c_expand_ngram_match_byteslike, NULL, __pyx_n_s_fuzzysearch__levenshtein_ngrams); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 319, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_expand_ngram_match_byteslike, __pyx_t_1) < 0) __PYX_ERR(0, 319, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
   /* "fuzzysearch/_levenshtein_ngrams.pyx":1
  * from libc.stdlib cimport malloc, free             # <<<<<<<<<<<<<<
  * 
@@ -4362,30 +6371,224 @@ static PyObject *__Pyx_PyObject_GetItem(PyObject *obj, PyObject* key) {
     return __Pyx_PyObject_GetIndex(obj, key);
 }
 #endif
-
-/* PyDictVersioning */
-#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS
-static CYTHON_INLINE PY_UINT64_T __Pyx_get_tp_dict_version(PyObject *obj) {
-    PyObject *dict = Py_TYPE(obj)->tp_dict;
-    return likely(dict) ? __PYX_GET_DICT_VERSION(dict) : 0;
+
+/* PyDictVersioning */
+#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_tp_dict_version(PyObject *obj) {
+    PyObject *dict = Py_TYPE(obj)->tp_dict;
+    return likely(dict) ? __PYX_GET_DICT_VERSION(dict) : 0;
+}
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_object_dict_version(PyObject *obj) {
+    PyObject **dictptr = NULL;
+    Py_ssize_t offset = Py_TYPE(obj)->tp_dictoffset;
+    if (offset) {
+#if CYTHON_COMPILING_IN_CPYTHON
+        dictptr = (likely(offset > 0)) ? (PyObject **) ((char *)obj + offset) : _PyObject_GetDictPtr(obj);
+#else
+        dictptr = _PyObject_GetDictPtr(obj);
+#endif
+    }
+    return (dictptr && *dictptr) ? __PYX_GET_DICT_VERSION(*dictptr) : 0;
+}
+static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UINT64_T tp_dict_version, PY_UINT64_T obj_dict_version) {
+    PyObject *dict = Py_TYPE(obj)->tp_dict;
+    if (unlikely(!dict) || unlikely(tp_dict_version != __PYX_GET_DICT_VERSION(dict)))
+        return 0;
+    return obj_dict_version == __Pyx_get_object_dict_version(obj);
+}
+#endif
+
+/* GetModuleGlobalName */
+#if CYTHON_USE_DICT_VERSIONS
+static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value)
+#else
+static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name)
+#endif
+{
+    PyObject *result;
+#if !CYTHON_AVOID_BORROWED_REFS
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x030500A1
+    result = _PyDict_GetItem_KnownHash(__pyx_d, name, ((PyASCIIObject *) name)->hash);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    } else if (unlikely(PyErr_Occurred())) {
+        return NULL;
+    }
+#else
+    result = PyDict_GetItem(__pyx_d, name);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    }
+#endif
+#else
+    result = PyObject_GetItem(__pyx_d, name);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    }
+    PyErr_Clear();
+#endif
+    return __Pyx_GetBuiltinName(name);
+}
+
+/* RaiseException */
+#if PY_MAJOR_VERSION < 3
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb,
+                        CYTHON_UNUSED PyObject *cause) {
+    __Pyx_PyThreadState_declare
+    Py_XINCREF(type);
+    if (!value || value == Py_None)
+        value = NULL;
+    else
+        Py_INCREF(value);
+    if (!tb || tb == Py_None)
+        tb = NULL;
+    else {
+        Py_INCREF(tb);
+        if (!PyTraceBack_Check(tb)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: arg 3 must be a traceback or None");
+            goto raise_error;
+        }
+    }
+    if (PyType_Check(type)) {
+#if CYTHON_COMPILING_IN_PYPY
+        if (!value) {
+            Py_INCREF(Py_None);
+            value = Py_None;
+        }
+#endif
+        PyErr_NormalizeException(&type, &value, &tb);
+    } else {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto raise_error;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(type);
+        Py_INCREF(type);
+        if (!PyType_IsSubtype((PyTypeObject *)type, (PyTypeObject *)PyExc_BaseException)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: exception class must be a subclass of BaseException");
+            goto raise_error;
+        }
+    }
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrRestore(type, value, tb);
+    return;
+raise_error:
+    Py_XDECREF(value);
+    Py_XDECREF(type);
+    Py_XDECREF(tb);
+    return;
 }
-static CYTHON_INLINE PY_UINT64_T __Pyx_get_object_dict_version(PyObject *obj) {
-    PyObject **dictptr = NULL;
-    Py_ssize_t offset = Py_TYPE(obj)->tp_dictoffset;
-    if (offset) {
-#if CYTHON_COMPILING_IN_CPYTHON
-        dictptr = (likely(offset > 0)) ? (PyObject **) ((char *)obj + offset) : _PyObject_GetDictPtr(obj);
 #else
-        dictptr = _PyObject_GetDictPtr(obj);
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
+    PyObject* owned_instance = NULL;
+    if (tb == Py_None) {
+        tb = 0;
+    } else if (tb && !PyTraceBack_Check(tb)) {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: arg 3 must be a traceback or None");
+        goto bad;
+    }
+    if (value == Py_None)
+        value = 0;
+    if (PyExceptionInstance_Check(type)) {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto bad;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(value);
+    } else if (PyExceptionClass_Check(type)) {
+        PyObject *instance_class = NULL;
+        if (value && PyExceptionInstance_Check(value)) {
+            instance_class = (PyObject*) Py_TYPE(value);
+            if (instance_class != type) {
+                int is_subclass = PyObject_IsSubclass(instance_class, type);
+                if (!is_subclass) {
+                    instance_class = NULL;
+                } else if (unlikely(is_subclass == -1)) {
+                    goto bad;
+                } else {
+                    type = instance_class;
+                }
+            }
+        }
+        if (!instance_class) {
+            PyObject *args;
+            if (!value)
+                args = PyTuple_New(0);
+            else if (PyTuple_Check(value)) {
+                Py_INCREF(value);
+                args = value;
+            } else
+                args = PyTuple_Pack(1, value);
+            if (!args)
+                goto bad;
+            owned_instance = PyObject_Call(type, args, NULL);
+            Py_DECREF(args);
+            if (!owned_instance)
+                goto bad;
+            value = owned_instance;
+            if (!PyExceptionInstance_Check(value)) {
+                PyErr_Format(PyExc_TypeError,
+                             "calling %R should have returned an instance of "
+                             "BaseException, not %R",
+                             type, Py_TYPE(value));
+                goto bad;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: exception class must be a subclass of BaseException");
+        goto bad;
+    }
+    if (cause) {
+        PyObject *fixed_cause;
+        if (cause == Py_None) {
+            fixed_cause = NULL;
+        } else if (PyExceptionClass_Check(cause)) {
+            fixed_cause = PyObject_CallObject(cause, NULL);
+            if (fixed_cause == NULL)
+                goto bad;
+        } else if (PyExceptionInstance_Check(cause)) {
+            fixed_cause = cause;
+            Py_INCREF(fixed_cause);
+        } else {
+            PyErr_SetString(PyExc_TypeError,
+                            "exception causes must derive from "
+                            "BaseException");
+            goto bad;
+        }
+        PyException_SetCause(value, fixed_cause);
+    }
+    PyErr_SetObject(type, value);
+    if (tb) {
+#if CYTHON_COMPILING_IN_PYPY
+        PyObject *tmp_type, *tmp_value, *tmp_tb;
+        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
+        Py_INCREF(tb);
+        PyErr_Restore(tmp_type, tmp_value, tb);
+        Py_XDECREF(tmp_tb);
+#else
+        PyThreadState *tstate = __Pyx_PyThreadState_Current;
+        PyObject* tmp_tb = tstate->curexc_traceback;
+        if (tb != tmp_tb) {
+            Py_INCREF(tb);
+            tstate->curexc_traceback = tb;
+            Py_XDECREF(tmp_tb);
+        }
 #endif
     }
-    return (dictptr && *dictptr) ? __PYX_GET_DICT_VERSION(*dictptr) : 0;
-}
-static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UINT64_T tp_dict_version, PY_UINT64_T obj_dict_version) {
-    PyObject *dict = Py_TYPE(obj)->tp_dict;
-    if (unlikely(!dict) || unlikely(tp_dict_version != __PYX_GET_DICT_VERSION(dict)))
-        return 0;
-    return obj_dict_version == __Pyx_get_object_dict_version(obj);
+bad:
+    Py_XDECREF(owned_instance);
+    return;
 }
 #endif
 
@@ -4601,45 +6804,241 @@ static void __Pyx_AddTraceback(const char *funcname, int c_line,
             Py_XDECREF(ptraceback);
             goto bad;
         }
-        __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
-        __pyx_insert_code_object(c_line ? -c_line : py_line, py_code);
+        __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
+        __pyx_insert_code_object(c_line ? -c_line : py_line, py_code);
+    }
+    py_frame = PyFrame_New(
+        tstate,            /*PyThreadState *tstate,*/
+        py_code,           /*PyCodeObject *code,*/
+        __pyx_d,    /*PyObject *globals,*/
+        0                  /*PyObject *locals*/
+    );
+    if (!py_frame) goto bad;
+    __Pyx_PyFrame_SetLineNumber(py_frame, py_line);
+    PyTraceBack_Here(py_frame);
+bad:
+    Py_XDECREF(py_code);
+    Py_XDECREF(py_frame);
+}
+
+/* CIntFromPyVerify */
+#define __PYX_VERIFY_RETURN_INT(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 0)
+#define __PYX_VERIFY_RETURN_INT_EXC(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 1)
+#define __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, exc)\
+    {\
+        func_type value = func_value;\
+        if (sizeof(target_type) < sizeof(func_type)) {\
+            if (unlikely(value != (func_type) (target_type) value)) {\
+                func_type zero = 0;\
+                if (exc && unlikely(value == (func_type)-1 && PyErr_Occurred()))\
+                    return (target_type) -1;\
+                if (is_unsigned && unlikely(value < zero))\
+                    goto raise_neg_overflow;\
+                else\
+                    goto raise_overflow;\
+            }\
+        }\
+        return (target_type) value;\
+    }
+
+/* CIntFromPy */
+static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(long) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(long, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (long) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (long) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(long, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 2 * PyLong_SHIFT) {
+                            return (long) (((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 3 * PyLong_SHIFT) {
+                            return (long) (((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 4 * PyLong_SHIFT) {
+                            return (long) (((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (long) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(long) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (long) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(long, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(long,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(long) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                            return (long) ((((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                            return (long) ((((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                            return (long) ((((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(long) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            long val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (long) -1;
+        }
+    } else {
+        long val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (long) -1;
+        val = __Pyx_PyInt_As_long(tmp);
+        Py_DECREF(tmp);
+        return val;
     }
-    py_frame = PyFrame_New(
-        tstate,            /*PyThreadState *tstate,*/
-        py_code,           /*PyCodeObject *code,*/
-        __pyx_d,    /*PyObject *globals,*/
-        0                  /*PyObject *locals*/
-    );
-    if (!py_frame) goto bad;
-    __Pyx_PyFrame_SetLineNumber(py_frame, py_line);
-    PyTraceBack_Here(py_frame);
-bad:
-    Py_XDECREF(py_code);
-    Py_XDECREF(py_frame);
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to long");
+    return (long) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to long");
+    return (long) -1;
 }
 
-/* CIntFromPyVerify */
-#define __PYX_VERIFY_RETURN_INT(target_type, func_type, func_value)\
-    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 0)
-#define __PYX_VERIFY_RETURN_INT_EXC(target_type, func_type, func_value)\
-    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 1)
-#define __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, exc)\
-    {\
-        func_type value = func_value;\
-        if (sizeof(target_type) < sizeof(func_type)) {\
-            if (unlikely(value != (func_type) (target_type) value)) {\
-                func_type zero = 0;\
-                if (exc && unlikely(value == (func_type)-1 && PyErr_Occurred()))\
-                    return (target_type) -1;\
-                if (is_unsigned && unlikely(value < zero))\
-                    goto raise_neg_overflow;\
-                else\
-                    goto raise_overflow;\
-            }\
-        }\
-        return (target_type) value;\
-    }
-
 /* CIntToPy */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
@@ -5108,202 +7507,6 @@ static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
     }
 }
 
-/* CIntFromPy */
-static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wconversion"
-#endif
-    const long neg_one = (long) -1, const_zero = (long) 0;
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic pop
-#endif
-    const int is_unsigned = neg_one > const_zero;
-#if PY_MAJOR_VERSION < 3
-    if (likely(PyInt_Check(x))) {
-        if (sizeof(long) < sizeof(long)) {
-            __PYX_VERIFY_RETURN_INT(long, long, PyInt_AS_LONG(x))
-        } else {
-            long val = PyInt_AS_LONG(x);
-            if (is_unsigned && unlikely(val < 0)) {
-                goto raise_neg_overflow;
-            }
-            return (long) val;
-        }
-    } else
-#endif
-    if (likely(PyLong_Check(x))) {
-        if (is_unsigned) {
-#if CYTHON_USE_PYLONG_INTERNALS
-            const digit* digits = ((PyLongObject*)x)->ob_digit;
-            switch (Py_SIZE(x)) {
-                case  0: return (long) 0;
-                case  1: __PYX_VERIFY_RETURN_INT(long, digit, digits[0])
-                case 2:
-                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) >= 2 * PyLong_SHIFT) {
-                            return (long) (((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
-                        }
-                    }
-                    break;
-                case 3:
-                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) >= 3 * PyLong_SHIFT) {
-                            return (long) (((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
-                        }
-                    }
-                    break;
-                case 4:
-                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) >= 4 * PyLong_SHIFT) {
-                            return (long) (((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
-                        }
-                    }
-                    break;
-            }
-#endif
-#if CYTHON_COMPILING_IN_CPYTHON
-            if (unlikely(Py_SIZE(x) < 0)) {
-                goto raise_neg_overflow;
-            }
-#else
-            {
-                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
-                if (unlikely(result < 0))
-                    return (long) -1;
-                if (unlikely(result == 1))
-                    goto raise_neg_overflow;
-            }
-#endif
-            if (sizeof(long) <= sizeof(unsigned long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned long, PyLong_AsUnsignedLong(x))
-#ifdef HAVE_LONG_LONG
-            } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
-#endif
-            }
-        } else {
-#if CYTHON_USE_PYLONG_INTERNALS
-            const digit* digits = ((PyLongObject*)x)->ob_digit;
-            switch (Py_SIZE(x)) {
-                case  0: return (long) 0;
-                case -1: __PYX_VERIFY_RETURN_INT(long, sdigit, (sdigit) (-(sdigit)digits[0]))
-                case  1: __PYX_VERIFY_RETURN_INT(long,  digit, +digits[0])
-                case -2:
-                    if (8 * sizeof(long) - 1 > 1 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
-                            return (long) (((long)-1)*(((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
-                        }
-                    }
-                    break;
-                case 2:
-                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
-                            return (long) ((((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
-                        }
-                    }
-                    break;
-                case -3:
-                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
-                            return (long) (((long)-1)*(((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
-                        }
-                    }
-                    break;
-                case 3:
-                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
-                            return (long) ((((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
-                        }
-                    }
-                    break;
-                case -4:
-                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
-                            return (long) (((long)-1)*(((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
-                        }
-                    }
-                    break;
-                case 4:
-                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
-                            return (long) ((((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
-                        }
-                    }
-                    break;
-            }
-#endif
-            if (sizeof(long) <= sizeof(long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(long, long, PyLong_AsLong(x))
-#ifdef HAVE_LONG_LONG
-            } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(long, PY_LONG_LONG, PyLong_AsLongLong(x))
-#endif
-            }
-        }
-        {
-#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
-            PyErr_SetString(PyExc_RuntimeError,
-                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
-#else
-            long val;
-            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
- #if PY_MAJOR_VERSION < 3
-            if (likely(v) && !PyLong_Check(v)) {
-                PyObject *tmp = v;
-                v = PyNumber_Long(tmp);
-                Py_DECREF(tmp);
-            }
- #endif
-            if (likely(v)) {
-                int one = 1; int is_little = (int)*(unsigned char *)&one;
-                unsigned char *bytes = (unsigned char *)&val;
-                int ret = _PyLong_AsByteArray((PyLongObject *)v,
-                                              bytes, sizeof(val),
-                                              is_little, !is_unsigned);
-                Py_DECREF(v);
-                if (likely(!ret))
-                    return val;
-            }
-#endif
-            return (long) -1;
-        }
-    } else {
-        long val;
-        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
-        if (!tmp) return (long) -1;
-        val = __Pyx_PyInt_As_long(tmp);
-        Py_DECREF(tmp);
-        return val;
-    }
-raise_overflow:
-    PyErr_SetString(PyExc_OverflowError,
-        "value too large to convert to long");
-    return (long) -1;
-raise_neg_overflow:
-    PyErr_SetString(PyExc_OverflowError,
-        "can't convert negative value to long");
-    return (long) -1;
-}
-
 /* CIntFromPy */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
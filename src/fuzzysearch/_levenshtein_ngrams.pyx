@@ -2,7 +2,7 @@ from libc.stdlib cimport malloc, free
 
 
 __all__ = [
-    'c_expand_short', 'c_expand_long'
+    'c_expand_short', 'c_expand_long', 'c_expand_ngram_match_byteslike',
 ]
 
 
@@ -152,3 +152,231 @@ def c_expand_long(subsequence, sequence, max_l_dist):
 
     finally:
         free(scores)
+
+
+
+ALLOWED_TYPES = (bytes, bytearray)
+
+
+# The following expanders work directly on buffers.  Each of the sequences
+# is given as a pointer to its first item and a step of 1 or -1, so that the
+# parts of the sequence and sub-sequence before an exact match of an n-gram
+# can be scanned backwards in place, rather than making reversed copies.
+#
+# The distance and size of the expansion found are written to *dist and
+# *size, and the return value is zero if there is no expansion within
+# max_l_dist.  The scores array must have room for subseq_len items.
+
+cdef int _expand_short_strided(
+        const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+        const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+        long max_l_dist, long *scores, long *dist, Py_ssize_t *size) nogil:
+    """Straightforward implementation of partial match expansion."""
+    cdef Py_ssize_t subseq_index, seq_index
+    cdef long a, b, c, min_intermediate_score
+    cdef long min_score = subseq_len
+    cdef Py_ssize_t min_score_idx = -1
+    cdef unsigned char seq_char
+
+    if subseq_len == 0:
+        dist[0] = 0
+        size[0] = 0
+        return 1
+
+    # Initialize the scores array with values for just skipping sub-sequence
+    # chars.
+    for subseq_index in range(subseq_len):
+        scores[subseq_index] = subseq_index + 1
+
+    for seq_index in range(seq_len):
+        seq_char = seq[seq_index * seq_step]
+        # calculate scores, one for each character in the sub-sequence
+        a = seq_index
+        c = a + 1
+        min_intermediate_score = subseq_len + seq_len
+        for subseq_index in range(subseq_len):
+            b = scores[subseq_index]
+            c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+                      b + 1, c + 1)
+            scores[subseq_index] = c
+            a = b
+            if c < min_intermediate_score:
+                min_intermediate_score = c
+
+        # keep the minimum score found for matches of the entire sub-sequence
+        if c <= min_score:
+            min_score = c
+            min_score_idx = seq_index
+
+        # bail early when it is impossible to find a better expansion
+        elif min_intermediate_score >= min_score:
+            break
+
+    if min_score > max_l_dist:
+        return 0
+    dist[0] = min_score
+    size[0] = min_score_idx + 1
+    return 1
+
+
+cdef int _expand_long_strided(
+        const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+        const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+        long max_l_dist, long *scores, long *dist, Py_ssize_t *size) nogil:
+    """Partial match expansion, optimized for long sub-sequences."""
+    # See _py_expand_long() in levenshtein_ngram.py for an explanation of
+    # the limited range of the sub-sequence inspected for each item.
+    cdef Py_ssize_t subseq_index, seq_index
+    cdef long a, b, c
+    cdef long min_score = subseq_len
+    cdef Py_ssize_t min_score_idx = -1
+    cdef long max_good_score = max_l_dist
+    cdef Py_ssize_t needle_idx_range_start, needle_idx_range_end
+    cdef Py_ssize_t new_needle_idx_range_start = 0
+    cdef Py_ssize_t new_needle_idx_range_end = subseq_len - 1
+    cdef unsigned char seq_char
+
+    if subseq_len == 0:
+        dist[0] = 0
+        size[0] = 0
+        return 1
+
+    # Initialize the scores array with values for just skipping sub-sequence
+    # chars.
+    for subseq_index in range(subseq_len):
+        scores[subseq_index] = subseq_index + 1
+
+    for seq_index in range(seq_len):
+        seq_char = seq[seq_index * seq_step]
+        # calculate scores, one for each character in the sub-sequence
+        needle_idx_range_start = new_needle_idx_range_start
+        needle_idx_range_end = new_needle_idx_range_end + 1
+        if needle_idx_range_end > subseq_len:
+            needle_idx_range_end = subseq_len
+
+        a = seq_index
+        c = a + 1
+
+        if c <= max_good_score:
+            new_needle_idx_range_start = 0
+            new_needle_idx_range_end = 0
+        else:
+            # -1 stands for no start having been found
+            new_needle_idx_range_start = -1
+            new_needle_idx_range_end = -1
+
+        for subseq_index in range(needle_idx_range_start, needle_idx_range_end):
+            b = scores[subseq_index]
+            c = _min3(a + (seq_char != subseq[subseq_index * subseq_step]),
+                      b + 1, c + 1)
+            scores[subseq_index] = c
+            a = b
+
+            if c <= max_good_score:
+                if new_needle_idx_range_start == -1:
+                    new_needle_idx_range_start = subseq_index
+                if subseq_index + 1 + (max_good_score - c) > new_needle_idx_range_end:
+                    new_needle_idx_range_end = subseq_index + 1 + (max_good_score - c)
+
+        # bail early when it is impossible to find a better expansion
+        if new_needle_idx_range_start == -1:
+            break
+
+        # keep the minimum score found for matches of the entire sub-sequence
+        if needle_idx_range_end == subseq_len and c <= min_score:
+            min_score = c
+            min_score_idx = seq_index
+            if min_score < max_good_score:
+                max_good_score = min_score
+
+    if min_score > max_l_dist:
+        return 0
+    dist[0] = min_score
+    size[0] = min_score_idx + 1
+    return 1
+
+
+cdef inline long _min3(long x, long y, long z) nogil:
+    if y < x:
+        x = y
+    return z if z < x else x
+
+
+cdef inline int _expand_strided(
+        const unsigned char *subseq, Py_ssize_t subseq_step, Py_ssize_t subseq_len,
+        const unsigned char *seq, Py_ssize_t seq_step, Py_ssize_t seq_len,
+        long max_l_dist, long *scores, long *dist, Py_ssize_t *size) nogil:
+    # the same choice of expander as _expand() in levenshtein_ngram.py
+    if subseq_len > max_l_dist * 2 and subseq_len > 10:
+        return _expand_long_strided(subseq, subseq_step, subseq_len,
+                                    seq, seq_step, seq_len,
+                                    max_l_dist, scores, dist, size)
+    return _expand_short_strided(subseq, subseq_step, subseq_len,
+                                 seq, seq_step, seq_len,
+                                 max_l_dist, scores, dist, size)
+
+
+def c_expand_ngram_match_byteslike(subsequence, sequence,
+                                   Py_ssize_t ngram_start, Py_ssize_t ngram_end,
+                                   Py_ssize_t index,
+                                   Py_ssize_t range_start, Py_ssize_t range_end,
+                                   long max_l_dist):
+    """Expand an exact match of an n-gram of the sub-sequence to both sides.
+
+    subsequence[ngram_start:ngram_end] must match exactly at
+    sequence[index:], and only sequence[range_start:range_end] is searched.
+
+    Returns a (start, end, dist) tuple, or None if there is no near-match.
+    """
+    if not isinstance(sequence, ALLOWED_TYPES):
+        raise TypeError('sequence is of invalid type %s' % type(sequence))
+    if not isinstance(subsequence, ALLOWED_TYPES):
+        raise TypeError('subsequence is of invalid type %s' % type(subsequence))
+
+    cdef const unsigned char *c_subsequence = subsequence
+    cdef const unsigned char *c_sequence = sequence
+    cdef Py_ssize_t subseq_len = len(subsequence)
+    cdef Py_ssize_t ngram_len = ngram_end - ngram_start
+    cdef Py_ssize_t right_seq_len, left_seq_len
+    cdef long dist_right, dist_left
+    cdef Py_ssize_t right_expand_size, left_expand_size
+    cdef int found
+
+    if not (0 <= ngram_start <= ngram_end <= subseq_len and
+            0 <= range_start <= index and
+            index + ngram_len <= range_end <= len(sequence)):
+        raise ValueError('invalid n-gram match or index range')
+
+    # the right expansion may extend until max_l_dist items past the end
+    # of the sub-sequence
+    right_seq_len = min(range_end, index - ngram_start + subseq_len + max_l_dist) - (index + ngram_len)
+    if right_seq_len < 0:
+        right_seq_len = 0
+
+    cdef long *scores = <long *> malloc(max(subseq_len, 1) * sizeof(long))
+    if scores is NULL:
+        raise MemoryError()
+
+    try:
+        with nogil:
+            found = _expand_strided(
+                c_subsequence + ngram_end, 1, subseq_len - ngram_end,
+                c_sequence + index + ngram_len, 1, right_seq_len,
+                max_l_dist, scores, &dist_right, &right_expand_size,
+            )
+            if found:
+                # scan backwards from just before the n-gram's match
+                left_seq_len = index - max(range_start, index - ngram_start - (max_l_dist - dist_right))
+                found = _expand_strided(
+                    c_subsequence + ngram_start - 1, -1, ngram_start,
+                    c_sequence + index - 1, -1, left_seq_len,
+                    max_l_dist - dist_right, scores, &dist_left, &left_expand_size,
+                )
+        if not found:
+            return None
+        return (index - left_expand_size,
+                index + ngram_len + right_expand_size,
+                dist_left + dist_right)
+
+    finally:
+        free(scores)
@@ -1,9 +1,28 @@
 #include "src/fuzzysearch/_c_ext_base.h"
+#include "src/fuzzysearch/hamming.h"
+
+
+/* count the differences, stopping once max_differences have been found;
+   the vectorized implementations are used when there is no equivalence
+   table */
+static Py_ssize_t
+count_differences(const char *subseq, const char *seq, Py_ssize_t len,
+                  Py_ssize_t max_differences, const unsigned char *table) {
+    Py_ssize_t n_differences = 0;
+    if (table == NULL) {
+        return (Py_ssize_t) count_differences_with_maximum(
+            subseq, seq, (size_t) len, (size_t) max_differences);
+    }
+    while (len-- && n_differences < max_differences) {
+        n_differences += !ITEMS_MATCH(table, *seq++, *subseq++);
+    }
+    return n_differences;
+}
 
 
 #define DECLARE_VARS int found = 0
 #define PREPARE
-#define OUTPUT_VALUE(x) found = 1; break
+#define OUTPUT_VALUE(x, dist) found = 1; break
 #define RETURN_AT_END if (found) { Py_RETURN_TRUE; } else { Py_RETURN_FALSE; }
 #define FUNCTION_NAME substitutions_only_has_near_matches_lp_byteslike
 #include "src/fuzzysearch/_substitutions_only_lp_template.h"
@@ -24,7 +43,7 @@
     results = PyList_New(0); \
     if (unlikely(!results))  \
         goto error;
-#define OUTPUT_VALUE(x) do {                                           \
+#define OUTPUT_VALUE(x, dist) do {                                     \
     next_result = PyLong_FromSsize_t((x));                             \
     if (unlikely(next_result == NULL)) {                               \
         Py_DECREF(results);                                            \
@@ -50,6 +69,44 @@
 #undef DECLARE_VARS
 
 
+#define DECLARE_VARS                          \
+    int64_column starts = {NULL, 0, 0};       \
+    int64_column dists = {NULL, 0, 0};        \
+    PyObject *starts_bytes, *dists_bytes
+#define PREPARE
+#define OUTPUT_VALUE(x, dist) do {                                     \
+    if (unlikely(int64_column_append(&starts, (x)) == -1 ||            \
+                 int64_column_append(&dists, (dist)) == -1)) {         \
+        free(starts.data);                                             \
+        free(dists.data);                                              \
+        PyErr_NoMemory();                                              \
+        goto error;                                                    \
+    }                                                                  \
+} while(0)
+#define RETURN_AT_END do {                                             \
+    starts_bytes = int64_column_to_bytes(&starts);                     \
+    dists_bytes = int64_column_to_bytes(&dists);                       \
+    free(starts.data);                                                 \
+    free(dists.data);                                                  \
+    if (unlikely(starts_bytes == NULL || dists_bytes == NULL)) {       \
+        Py_XDECREF(starts_bytes);                                      \
+        Py_XDECREF(dists_bytes);                                       \
+        return NULL;                                                   \
+    }                                                                  \
+    return Py_BuildValue("(NN)", starts_bytes, dists_bytes);           \
+} while(0)
+#define FUNCTION_NAME substitutions_only_find_near_matches_lp_columns_byteslike
+#include "src/fuzzysearch/_substitutions_only_lp_template.h"
+#undef FUNCTION_NAME
+#define FUNCTION_NAME substitutions_only_find_near_matches_ngrams_columns_byteslike
+#include "src/fuzzysearch/_substitutions_only_ngrams_template.h"
+#undef FUNCTION_NAME
+#undef RETURN_AT_END
+#undef OUTPUT_VALUE
+#undef PREPARE
+#undef DECLARE_VARS
+
+
 static PyMethodDef substitutions_only_methods[] = {
     {"substitutions_only_find_near_matches_lp_byteslike",
      substitutions_only_find_near_matches_lp_byteslike,
@@ -59,6 +116,14 @@ static PyMethodDef substitutions_only_methods[] = {
      substitutions_only_find_near_matches_ngrams_byteslike,
      METH_VARARGS,
      "DOCSTRING."},
+    {"substitutions_only_find_near_matches_lp_columns_byteslike",
+     substitutions_only_find_near_matches_lp_columns_byteslike,
+     METH_VARARGS,
+     "DOCSTRING."},
+    {"substitutions_only_find_near_matches_ngrams_columns_byteslike",
+     substitutions_only_find_near_matches_ngrams_columns_byteslike,
+     METH_VARARGS,
+     "DOCSTRING."},
     {"substitutions_only_has_near_matches_lp_byteslike",
      substitutions_only_has_near_matches_lp_byteslike,
      METH_VARARGS,
@@ -1,6 +1,7 @@
 #define RELEASE_BUFFERS \
     PyBuffer_Release(&subseq_pybuf); \
-    PyBuffer_Release(&seq_pybuf)
+    PyBuffer_Release(&seq_pybuf); \
+    PyBuffer_Release(&table_pybuf)
 
 
 static PyObject *
@@ -9,27 +10,36 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
     /* input params */
     Py_buffer subseq_pybuf, seq_pybuf;
     int max_substitutions;
+    Py_ssize_t start_index = 0, end_index = -1;
+    Py_buffer table_pybuf = {0};
 
     const char *subsequence;
     const char *sequence;
     Py_ssize_t subseq_len, seq_len;
-    int *sub_counts = NULL;
-    Py_ssize_t seq_idx, subseq_idx, count_idx;
+    const unsigned char *table;
+    Py_ssize_t seq_idx, n_differences;
 
     DECLARE_VARS;
 
-    const char* argspec = "y*y*i";
+    const char* argspec = "y*y*i|nnz*";
 
     if (unlikely(!PyArg_ParseTuple(
         args,
         argspec,
         &subseq_pybuf,
         &seq_pybuf,
-        &max_substitutions
+        &max_substitutions,
+        &start_index,
+        &end_index,
+        &table_pybuf
     ))) {
         return NULL;
     }
 
+    if (unlikely(get_equivalence_table(&table_pybuf, &table) == -1)) {
+        goto error;
+    }
+
     if (unlikely(max_substitutions < 0)) {
         PyErr_SetString(PyExc_ValueError, "max_l_dist must be non-negative");
         goto error;
@@ -53,6 +63,13 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
         goto error;
     }
 
+    /* only search sequence[start_index:end_index]; OUTPUT_VALUE() is given
+       indexes relative to the start of the entire sequence */
+    if (unlikely(restrict_to_index_range(&sequence, &seq_len,
+                                         &start_index, end_index) == -1)) {
+        goto error;
+    }
+
     if (unlikely(subseq_len == 0)) {
         PyErr_SetString(PyExc_ValueError, "subsequence must not be empty");
         goto error;
@@ -67,43 +84,28 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
 
     if (unlikely(max_substitutions >= subseq_len)) {
         for (seq_idx = 0; seq_idx <= seq_len - subseq_len; ++seq_idx) {
-            OUTPUT_VALUE(seq_idx);
+            OUTPUT_VALUE(start_index + seq_idx,
+                         count_differences(subsequence, sequence + seq_idx,
+                                           subseq_len, subseq_len, table));
         }
         RELEASE_BUFFERS;
         RETURN_AT_END;
     }
 
-    sub_counts = (int *) malloc (sizeof(int) * subseq_len);
-    if (sub_counts == NULL) {
-        RELEASE_BUFFERS;
-        return PyErr_NoMemory();
-    }
-
-    for (seq_idx = 0; seq_idx < subseq_len - 1; ++seq_idx) {
-        sub_counts[seq_idx] = 0;
-        for (subseq_idx = 0; subseq_idx <= seq_idx; ++subseq_idx) {
-            sub_counts[seq_idx - subseq_idx] +=
-                subsequence[subseq_idx] != sequence[seq_idx];
-        }
-    }
-    sub_counts[seq_idx] = 0;
-
-    for (seq_idx = subseq_len-1; seq_idx < seq_len;) {
-        for (subseq_idx = 0; subseq_idx < subseq_len; ++subseq_idx) {
-            sub_counts[(seq_idx - subseq_idx) % subseq_len] +=
-                subsequence[subseq_idx] != sequence[seq_idx];
-        }
-
-        ++seq_idx;
-        count_idx = seq_idx % subseq_len;
-
-        if (sub_counts[count_idx] <= max_substitutions) {
-            OUTPUT_VALUE(seq_idx - subseq_len);
+    /* Compare the subsequence at every position, stopping as soon as more
+       than max_substitutions differences are found.  Without an equivalence
+       table, this compares many items at once with SIMD instructions when
+       they are available, which is much faster than updating a running count
+       for every position in each step. */
+    for (seq_idx = 0; seq_idx <= seq_len - subseq_len; ++seq_idx) {
+        n_differences = count_differences(subsequence, sequence + seq_idx,
+                                          subseq_len, max_substitutions + 1,
+                                          table);
+        if (n_differences <= max_substitutions) {
+            OUTPUT_VALUE(start_index + seq_idx, n_differences);
         }
-        sub_counts[count_idx] = 0;
     }
 
-    free(sub_counts);
     RELEASE_BUFFERS;
     RETURN_AT_END;
 
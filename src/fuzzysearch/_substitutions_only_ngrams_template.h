@@ -1,5 +1,6 @@
 #include "src/fuzzysearch/_c_ext_base.h"
 #include "src/fuzzysearch/memmem.h"
+#include <string.h>
 
 
 #define RELEASE_BUFFERS \
@@ -13,25 +14,29 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
     /* input params */
     Py_buffer subseq_pybuf, seq_pybuf;
     int max_substitutions;
+    Py_ssize_t start_index = 0, end_index = -1;
 
     const char *subsequence;
     const char *sequence;
     Py_ssize_t subseq_len, seq_len;
     Py_ssize_t ngram_len, ngram_start, subseq_len_after_ngram;
-    const char *match_ptr, *seq_ptr, *subseq_ptr, *subseq_end;
+    Py_ssize_t other_ngram_start;
+    const char *match_ptr, *candidate;
     int subseq_sum;
-    int n_differences;
+    Py_ssize_t n_differences;
 
     DECLARE_VARS;
 
-    const char* argspec = "y*y*i";
+    const char* argspec = "y*y*i|nn";
 
     if (unlikely(!PyArg_ParseTuple(
         args,
         argspec,
         &subseq_pybuf,
         &seq_pybuf,
-        &max_substitutions
+        &max_substitutions,
+        &start_index,
+        &end_index
     ))) {
         return NULL;
     }
@@ -59,6 +64,13 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
         goto error;
     }
 
+    /* only search sequence[start_index:end_index]; OUTPUT_VALUE() is given
+       indexes relative to the start of the entire sequence */
+    if (unlikely(restrict_to_index_range(&sequence, &seq_len,
+                                         &start_index, end_index) == -1)) {
+        goto error;
+    }
+
     /* this is required because simple_memmem_with_needle_sum() returns the
        haystack if the needle is empty */
     if (unlikely(subseq_len == 0)) {
@@ -69,6 +81,7 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
     PREPARE;
 
     if (unlikely(seq_len < subseq_len)) {
+        RELEASE_BUFFERS;
         RETURN_AT_END;
     }
 
@@ -82,14 +95,25 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
          *                                                *
          * So the sub-sequence may be found at any index. */
         for (ngram_start = 0; ngram_start + subseq_len <= seq_len; ngram_start++) {
-            OUTPUT_VALUE(ngram_start);
+            OUTPUT_VALUE(start_index + ngram_start,
+                         count_differences(subsequence, sequence + ngram_start,
+                                           subseq_len, subseq_len, NULL));
         }
+        RELEASE_BUFFERS;
         RETURN_AT_END;
     }
 
-    subseq_end = subsequence + subseq_len;
-
-    for (ngram_start = 0; ngram_start + ngram_len <= subseq_len; ngram_start += ngram_len) {
+    /* At least one of the first max_substitutions + 1 n-grams must match
+       exactly, so it is enough to search for those.  Each place is only
+       handled for the first n-gram found there, so that it is compared and
+       output only once. */
+
+    /* OUTPUT_VALUE() may stop the search by breaking out of the inner loop,
+       leaving match_ptr non-NULL. */
+    match_ptr = NULL;
+    for (ngram_start = 0;
+         ngram_start <= max_substitutions * ngram_len && match_ptr == NULL;
+         ngram_start += ngram_len) {
         subseq_len_after_ngram = subseq_len - (ngram_start + ngram_len);
 
         subseq_sum = calc_sum(subsequence + ngram_start, ngram_len);
@@ -101,23 +125,27 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
                                   subseq_sum);
 
         while (match_ptr != NULL) {
-            n_differences = max_substitutions + 1;
-
-            subseq_ptr = subsequence + ngram_start;
-            seq_ptr = match_ptr;
-            while (subseq_ptr != subsequence && n_differences) {
-                n_differences -= *(--subseq_ptr) != *(--seq_ptr);
-            }
-
-            if (n_differences) {
-                subseq_ptr = subseq_end - subseq_len_after_ngram;
-                seq_ptr = match_ptr + ngram_len;
-                while (subseq_ptr != subseq_end && n_differences) {
-                    n_differences -= (*subseq_ptr++) != (*seq_ptr++);
+            candidate = match_ptr - ngram_start;
+
+            /* if an earlier n-gram also matches here, this place has already
+               been handled when searching for that n-gram */
+            for (other_ngram_start = 0;
+                 other_ngram_start < ngram_start;
+                 other_ngram_start += ngram_len) {
+                if (memcmp(candidate + other_ngram_start,
+                           subsequence + other_ngram_start,
+                           ngram_len) == 0) {
+                    break;
                 }
+            }
 
-                if (n_differences) {
-                    OUTPUT_VALUE(match_ptr - ngram_start - sequence);
+            if (other_ngram_start == ngram_start) {
+                n_differences = count_differences(
+                    subsequence, candidate, subseq_len,
+                    max_substitutions + 1, NULL);
+                if (n_differences <= max_substitutions) {
+                    OUTPUT_VALUE(start_index + (candidate - sequence),
+                                 n_differences);
                 }
             }
 
@@ -130,6 +158,7 @@ FUNCTION_NAME(PyObject *self, PyObject *args)
         }
     }
 
+    RELEASE_BUFFERS;
     RETURN_AT_END;
 
 error:
@@ -0,0 +1,175 @@
+"""filtering with a bit-parallel Levenshtein distance computation
+
+Myers' bit-vector algorithm computes, for every position in the sequence,
+the smallest Levenshtein distance between the subsequence and any part of
+the sequence ending there.  Each column of the dynamic programming matrix
+is kept as two bit-vectors of +1 and -1 differences between adjacent cells,
+which are updated for every sequence item with a constant number of bitwise
+and arithmetic operations.  With subsequences of up to 64 items, which fit
+into a machine word, this is very fast.
+
+Any near-match allowing at most max_l_dist substitutions, insertions and
+deletions ends where this distance is at most max_l_dist.  The searches
+which enforce separate limits on each kind of edit can therefore be limited
+to the parts of the sequence just before such positions.
+"""
+from functools import wraps
+
+from fuzzysearch.common import clamp_index_range, SubsequenceIndexes
+
+__all__ = [
+    'find_candidate_regions',
+    'is_expected_faster',
+    'levenshtein_distances',
+]
+
+
+def levenshtein_distances(subsequence, sequence, start_index=0,
+                          end_index=None, equivalences=None):
+    """Find the best Levenshtein distance for each end in the sequence.
+
+    Yields a (end, dist) pair for each end index in
+    sequence[start_index:end_index], where dist is the smallest Levenshtein
+    distance between the subsequence and any part of the sequence ending
+    just before end.  Only parts starting at start_index or later are
+    considered.
+    """
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    subseq_len = len(subsequence)
+    char_indexes_in_subsequence = SubsequenceIndexes(subsequence,
+                                                     equivalences)
+    # the bit-vectors of the subsequence items each sequence item matches
+    match_masks = {}
+    mask = (1 << subseq_len) - 1
+    last_bit = 1 << (subseq_len - 1)
+
+    # the +1 and -1 vertical differences, initially all +1
+    plus_vertical = mask
+    minus_vertical = 0
+    dist = subseq_len
+    for index in range(start_index, end_index):
+        char = sequence[index]
+        eq = match_masks.get(char)
+        if eq is None:
+            eq = sum(1 << i for i in char_indexes_in_subsequence[char])
+            match_masks[char] = eq
+
+        xv = eq | minus_vertical
+        xh = ((((eq & plus_vertical) + plus_vertical) & mask)
+              ^ plus_vertical) | eq
+        plus_horizontal = minus_vertical | (~(xh | plus_vertical) & mask)
+        minus_horizontal = plus_vertical & xh
+        if plus_horizontal & last_bit:
+            dist += 1
+        elif minus_horizontal & last_bit:
+            dist -= 1
+        # a match may start anywhere, so the first row is all zeros and
+        # there is no horizontal difference to shift in
+        plus_horizontal = (plus_horizontal << 1) & mask
+        minus_horizontal = (minus_horizontal << 1) & mask
+        plus_vertical = minus_horizontal | (~(xv | plus_horizontal) & mask)
+        minus_vertical = plus_horizontal & xv
+
+        yield index + 1, dist
+
+
+def find_candidate_regions(subsequence, sequence, max_l_dist,
+                           max_insertions=None,
+                           start_index=0, end_index=None, equivalences=None):
+    """Find the parts of the sequence which may contain near-matches.
+
+    max_insertions limits the lengths of the near-matches, and defaults to
+    max_l_dist.
+
+    Returns a sorted list of non-overlapping (start, end) pairs, such that
+    every near-match in sequence[start_index:end_index] within the given
+    Levenshtein distance is entirely within one of them.  If the filter
+    isn't usable, since a near-match could be empty, None is returned
+    instead.
+    """
+    subseq_len = len(subsequence)
+    if subseq_len <= max_l_dist:
+        return None
+    if max_insertions is None:
+        max_insertions = max_l_dist
+    window_len = subseq_len + min(max_insertions, max_l_dist)
+
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    return _find_candidate_regions(subsequence, sequence, max_l_dist,
+                                   window_len, start_index, end_index,
+                                   equivalences)
+
+
+def _find_candidate_regions(subsequence, sequence, max_l_dist, window_len,
+                            start_index, end_index, equivalences):
+    regions = []
+    region_start = region_end = None
+    for end, dist in levenshtein_distances(subsequence, sequence,
+                                           start_index, end_index,
+                                           equivalences):
+        if dist <= max_l_dist:
+            window_start = max(start_index, end - window_len)
+            if region_end is not None and window_start <= region_end:
+                region_end = end
+            else:
+                if region_end is not None:
+                    regions.append((region_start, region_end))
+                region_start, region_end = window_start, end
+
+    if region_end is not None:
+        regions.append((region_start, region_end))
+    return regions
+
+
+def is_expected_faster(subsequence, max_l_dist, equivalences=None):
+    """Check whether filtering is expected to speed up a generic search.
+
+    The generic search otherwise either searches for exact matches of
+    n-grams of the subsequence, or uses the much slower q-gram filter when
+    these n-grams would be too short.  Searching for n-grams of more than
+    five items is fast, since they rarely match by chance, so filtering is
+    only preferred with shorter ones, and the C implementation is needed for
+    it to be faster with n-grams of three or more items.
+    """
+    subseq_len = len(subsequence)
+    if subseq_len <= max_l_dist:
+        return False
+    # the n-gram search can't honor an equivalence table, so the generic
+    # search would otherwise use the linear programming search throughout
+    if equivalences is not None:
+        return True
+    ngram_len = subseq_len // (max_l_dist + 1)
+    return ngram_len < 3 or (ngram_len <= 5 and _uses_c_extension(subsequence))
+
+
+try:
+    from fuzzysearch._common import find_bit_parallel_regions_byteslike
+except ImportError:
+    def _uses_c_extension(subsequence):
+        return False
+else:
+    def _uses_c_extension(subsequence):
+        return (isinstance(subsequence, (bytes, bytearray))
+                and len(subsequence) <= 64)
+
+    _py_find_candidate_regions = _find_candidate_regions
+
+    @wraps(_py_find_candidate_regions)
+    def _find_candidate_regions(subsequence, sequence, max_l_dist,
+                                window_len, start_index, end_index,
+                                equivalences):
+        # the C implementation only supports subsequences which fit into a
+        # 64-bit word
+        if len(subsequence) <= 64:
+            try:
+                return find_bit_parallel_regions_byteslike(
+                    subsequence, sequence, max_l_dist, window_len,
+                    start_index, end_index,
+                    equivalences.table if equivalences is not None else None)
+            except (TypeError, UnicodeEncodeError):
+                pass
+        return _py_find_candidate_regions(subsequence, sequence, max_l_dist,
+                                          window_len, start_index, end_index,
+                                          equivalences)
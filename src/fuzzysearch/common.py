@@ -1,14 +1,21 @@
+from array import array
+from bisect import bisect_left, bisect_right
 from functools import wraps
+from operator import eq
 from typing import TypeVar
 
 from attr import attrs, attrib
 
 
 __all__ = [
-    'Match', 'LevenshteinSearchParams',
+    'Match', 'StrandedMatch', 'MatchArray', 'LevenshteinSearchParams',
     'count_differences_with_maximum',
     'group_matches', 'get_best_match_in_group',
     'consolidate_overlapping_matches',
+    'count_overlapping_match_groups',
+    'clamp_index_range',
+    'reverse_complement',
+    'EquivalenceTable', 'SubsequenceIndexes',
 ]
 
 
@@ -32,6 +39,58 @@ class Match(object):
                 raise ValueError('matched must be supplied')
 
 
+@attrs(frozen=True, slots=True)
+class StrandedMatch(Match):
+    """A match on either the forward ('+') or reverse ('-') DNA strand.
+
+    The start and end indexes are always relative to the forward strand.
+    """
+    strand = attrib()
+
+    if __debug__:
+        def __attrs_post_init__(self):
+            Match.__attrs_post_init__(self)
+            if self.strand not in ('+', '-'):
+                raise ValueError("strand must be either '+' or '-'")
+
+
+def _int64_array(values=()):
+    return array('q', values)
+
+
+@attrs(frozen=True, slots=True)
+class MatchArray(object):
+    """Columnar ("struct-of-arrays") representation of a list of matches.
+
+    The starts, ends and distances of the matches are kept in separate
+    array.array('q') objects, which support the buffer protocol.  They may
+    therefore be wrapped without copying, e.g. with memoryview() or
+    numpy.frombuffer(match_array.starts, dtype=numpy.int64).
+    """
+    starts = attrib(factory=_int64_array)
+    ends = attrib(factory=_int64_array)
+    dists = attrib(factory=_int64_array)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_matches(cls, matches):
+        starts, ends, dists = _int64_array(), _int64_array(), _int64_array()
+        for match in matches:
+            starts.append(match.start)
+            ends.append(match.end)
+            dists.append(match.dist)
+        return cls(starts, ends, dists)
+
+    def to_matches(self, sequence):
+        """Create a list of Match objects, given the searched sequence."""
+        return [
+            Match(start, end, dist, matched=sequence[start:end])
+            for (start, end, dist) in zip(self.starts, self.ends, self.dists)
+        ]
+
+
 @attrs(frozen=True, slots=True)
 class LevenshteinSearchParams(object):
     """Parameter data-class for Levenshtein-distance fuzzy searches."""
@@ -116,8 +175,155 @@ class LevenshteinSearchParams(object):
             )
 
 
-def count_differences_with_maximum(sequence1, sequence2, max_differences):
+_DNA_COMPLEMENTS = 'ACGTUNRYSWKMBDHV', 'TGCAANYRSWMKVHDB'
+_DNA_COMPLEMENTS = (
+    _DNA_COMPLEMENTS[0] + _DNA_COMPLEMENTS[0].lower(),
+    _DNA_COMPLEMENTS[1] + _DNA_COMPLEMENTS[1].lower(),
+)
+_DNA_COMPLEMENT_TABLE_STR = str.maketrans(*_DNA_COMPLEMENTS)
+_DNA_COMPLEMENT_TABLE_BYTES = bytes.maketrans(
+    *(chars.encode('ascii') for chars in _DNA_COMPLEMENTS))
+
+
+def reverse_complement(sequence):
+    """Get the reverse complement of a DNA sequence.
+
+    The sequence may be a str, bytes or bytearray object, and may contain the
+    IUPAC nucleotide codes, in upper or lower case.
+    """
+    if isinstance(sequence, str):
+        if not set(sequence).issubset(_DNA_COMPLEMENTS[0]):
+            raise ValueError('sequence must contain only DNA nucleotide codes')
+        return sequence.translate(_DNA_COMPLEMENT_TABLE_STR)[::-1]
+    elif isinstance(sequence, (bytes, bytearray)):
+        if sequence.translate(None, _DNA_COMPLEMENTS[0].encode('ascii')):
+            raise ValueError('sequence must contain only DNA nucleotide codes')
+        return sequence.translate(_DNA_COMPLEMENT_TABLE_BYTES)[::-1]
+    raise TypeError('sequence must be a str, bytes or bytearray object')
+
+
+def _item_code(item):
+    """Get the byte value of a sequence item, or None if it has none."""
+    if isinstance(item, int):
+        return item if 0 <= item < 256 else None
+    if isinstance(item, str) and len(item) == 1 and ord(item) < 256:
+        return ord(item)
+    return None
+
+
+@attrs(frozen=True, slots=True)
+class EquivalenceTable(object):
+    """Defines which items are considered equal when searching.
+
+    table is a bytes object of length 256*256, where table[a * 256 + b] is
+    non-zero if items with the byte values a and b match.  The items of str
+    sequences are compared by their ordinals; other items, e.g. characters
+    with ordinals above 255, only match items equal to them.
+
+    Use one of the class methods to create a table rather than building
+    one directly.
+    """
+    table = attrib(converter=bytes)
+
+    def __attrs_post_init__(self):
+        if len(self.table) != 256 * 256:
+            raise ValueError('table must be of length 256*256')
+
+    @classmethod
+    def from_classes(cls, classes):
+        """Create a table where items in the same class match.
+
+        classes must be a sequence of 256 class labels, one per byte value.
+        """
+        if len(classes) != 256:
+            raise ValueError('classes must be of length 256')
+        return cls(
+            classes[a] == classes[b]
+            for a in range(256)
+            for b in range(256)
+        )
+
+    @classmethod
+    def from_masks(cls, masks):
+        """Create a table where items with overlapping bit-masks match.
+
+        masks must be a sequence of 256 integer bit-masks, one per byte value.
+        Unlike with from_classes(), this allows wildcards which match several
+        items that don't match each other.
+        """
+        if len(masks) != 256:
+            raise ValueError('masks must be of length 256')
+        return cls(
+            (masks[a] & masks[b]) != 0
+            for a in range(256)
+            for b in range(256)
+        )
+
+    @classmethod
+    def case_insensitive(cls):
+        """Create a table where ASCII letters match regardless of case."""
+        return cls.from_classes(bytes(range(256)).lower())
+
+    @classmethod
+    def dna_iupac(cls):
+        """Create a table for DNA with the IUPAC nucleotide codes.
+
+        Each code matches the nucleotides it stands for, regardless of case,
+        e.g. 'N' matches any nucleotide and 'R' matches 'A' and 'G'.
+        """
+        # byte values without a nucleotide meaning only match themselves
+        masks = [1 << (4 + byte_value) for byte_value in range(256)]
+        nucleotides = 'ACGT'
+        for code, meaning in [
+            ('A', 'A'), ('C', 'C'), ('G', 'G'), ('T', 'T'), ('U', 'T'),
+            ('R', 'AG'), ('Y', 'CT'), ('S', 'CG'), ('W', 'AT'), ('K', 'GT'),
+            ('M', 'AC'), ('B', 'CGT'), ('D', 'AGT'), ('H', 'ACT'),
+            ('V', 'ACG'), ('N', 'ACGT'),
+        ]:
+            mask = sum(1 << nucleotides.index(char) for char in meaning)
+            masks[ord(code)] = masks[ord(code.lower())] = mask
+        return cls.from_masks(masks)
+
+    def items_match(self, item1, item2):
+        code1, code2 = _item_code(item1), _item_code(item2)
+        if code1 is None or code2 is None:
+            return item1 == item2
+        return self.table[code1 << 8 | code2] != 0
+
+
+class SubsequenceIndexes(dict):
+    """Maps items to the indexes of the items in a subsequence they match.
+
+    The indexes are computed lazily for each item, and cached.  This allows
+    the search implementations to honor an EquivalenceTable without
+    comparing items directly.
+    """
+    def __init__(self, subsequence, equivalences=None):
+        super(SubsequenceIndexes, self).__init__()
+        self._subsequence = subsequence
+        self._items_match = \
+            equivalences.items_match if equivalences is not None else eq
+
+    def __missing__(self, item):
+        indexes = frozenset(
+            index for (index, subseq_item) in enumerate(self._subsequence)
+            if self._items_match(item, subseq_item)
+        )
+        self[item] = indexes
+        return indexes
+
+
+def count_differences_with_maximum(sequence1, sequence2, max_differences,
+                                   equivalences=None):
     n_different = 0
+    if equivalences is not None:
+        for item1, item2 in zip(sequence1, sequence2):
+            if not equivalences.items_match(item1, item2):
+                n_different += 1
+                if n_different == max_differences:
+                    return n_different
+        return n_different
+
     for item1, item2 in zip(sequence1, sequence2):
         if item1 != item2:
             n_different += 1
@@ -132,14 +338,19 @@ except ImportError:
 else:
     _count_differences_with_maximum = count_differences_with_maximum
     @wraps(_count_differences_with_maximum)
-    def count_differences_with_maximum(sequence1, sequence2, max_differences):
+    def count_differences_with_maximum(sequence1, sequence2, max_differences,
+                                       equivalences=None):
         try:
+            if equivalences is not None:
+                return count_differences_with_maximum_byteslike(
+                    sequence1, sequence2, max_differences, equivalences.table)
             return count_differences_with_maximum_byteslike(sequence1,
                                                             sequence2,
                                                             max_differences)
         except TypeError:
             return _count_differences_with_maximum(sequence1, sequence2,
-                                                   max_differences)
+                                                   max_differences,
+                                                   equivalences)
 
 
 class GroupOfMatches(object):
@@ -178,8 +389,14 @@ def group_matches(matches):
 
 
 def get_best_match_in_group(group):
-    """Get the longest match of those with the smallest distance."""
-    return min(group, key=lambda match: (match.dist, -(match.end - match.start)))
+    """Get the longest match of those with the smallest distance.
+
+    Of several such matches, the one which starts first is chosen, so that
+    the result doesn't depend on the order of the matches in the group.
+    """
+    return min(group, key=lambda match: (match.dist,
+                                         -(match.end - match.start),
+                                         match.start))
 
 
 def consolidate_overlapping_matches(matches):
@@ -189,10 +406,43 @@ def consolidate_overlapping_matches(matches):
     return sorted(best_matches)
 
 
+def count_overlapping_match_groups(matches):
+    """Count the groups of overlapping matches.
+
+    This is equivalent to len(consolidate_overlapping_matches(matches)), but
+    only keeps the start and end of each group rather than all of the matches.
+    """
+    # The groups are kept sorted and non-overlapping, so both their starts
+    # and their ends are in non-decreasing order.
+    group_starts = []
+    group_ends = []
+    for match in matches:
+        start, end = match.start, match.end
+        # find the groups which overlap this match, i.e. those with
+        # group_start < end and group_end > start
+        first = bisect_right(group_ends, start)
+        last = bisect_left(group_starts, end, first)
+        if first < last:
+            start = min(start, group_starts[first])
+            end = max(end, group_ends[last - 1])
+        group_starts[first:last] = [start]
+        group_ends[first:last] = [end]
+    return len(group_starts)
+
+
 class FuzzySearchBase(object):
     """Abstract base class for fuzzy search classes"""
     @classmethod
-    def search(cls, subsequence, sequence, search_params):
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
+        """Search for matches within sequence[start_index:end_index].
+
+        The indexes of the returned matches are relative to the start of the
+        entire sequence.  If an EquivalenceTable is given, items are compared
+        according to it.  If a SequenceProfile is given as seed_profile,
+        n-gram searches choose their n-grams according to it.
+        """
         raise NotImplementedError
 
     @classmethod
@@ -204,6 +454,44 @@ class FuzzySearchBase(object):
         else:
             return matches
 
+    @classmethod
+    def has_match(cls, subsequence, sequence, search_params,
+                  start_index=0, end_index=None, equivalences=None,
+                  seed_profile=None):
+        """Check whether there is at least one match.
+
+        Sub-classes should override this if they can stop searching at the
+        first match more efficiently.
+        """
+        for _match in cls.search(subsequence, sequence, search_params,
+                                 start_index, end_index, equivalences,
+                                 seed_profile):
+            return True
+        return False
+
+    @classmethod
+    def count_matches(cls, subsequence, sequence, search_params,
+                      start_index=0, end_index=None, equivalences=None):
+        """Count the consolidated matches.
+
+        Sub-classes should override this if they can count the matches
+        without creating and consolidating all of them.
+        """
+        matches = cls.search(subsequence, sequence, search_params,
+                             start_index, end_index, equivalences)
+        return len(cls.consolidate_matches(matches))
+
+    @classmethod
+    def search_columns(cls, subsequence, sequence, search_params,
+                       start_index=0, end_index=None, equivalences=None):
+        """Search, returning the consolidated matches as a MatchArray.
+
+        Sub-classes may override this to avoid creating Match objects.
+        """
+        matches = cls.search(subsequence, sequence, search_params,
+                             start_index, end_index, equivalences)
+        return MatchArray.from_matches(cls.consolidate_matches(matches))
+
     @classmethod
     def extra_items_for_chunked_search(cls, subsequence, search_params):
         raise NotImplementedError
@@ -214,3 +502,17 @@ T = TypeVar('T')
 
 def clamp(value: T, min_value: T, max_value: T) -> T:
     return max(min_value, min(value, max_value))
+
+
+def clamp_index_range(sequence, start_index=0, end_index=None):
+    """Clamp a range of indexes to fit within the given sequence.
+
+    end_index=None means the end of the sequence.  Returns a
+    (start_index, end_index) tuple, with start_index <= end_index.
+    """
+    if end_index is None:
+        end_index = len(sequence)
+    start_index = clamp(start_index, min_value=0, max_value=len(sequence))
+    end_index = clamp(end_index, min_value=start_index,
+                      max_value=len(sequence))
+    return start_index, end_index
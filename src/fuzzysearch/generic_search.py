@@ -1,18 +1,30 @@
+import heapq
 from collections import namedtuple
 from functools import wraps
 
-import attr
-
+from fuzzysearch.bit_parallel import \
+    find_candidate_regions as find_bit_parallel_candidate_regions
 from fuzzysearch.common import FuzzySearchBase, Match, \
-    consolidate_overlapping_matches
-from fuzzysearch.search_exact import search_exact
+    consolidate_overlapping_matches, count_overlapping_match_groups, \
+    clamp_index_range, SubsequenceIndexes
+from fuzzysearch.instrumentation import report_event
+from fuzzysearch.qgram_filter import find_candidate_regions
+from fuzzysearch.search_exact import search_exact, search_exact_lazily, \
+    has_exact_match
+from fuzzysearch.seed_planner import equal_seeds, choose_seeds
 
 
 __all__ = [
     'find_near_matches_generic',
+    'find_near_matches_generic_bit_parallel',
     'find_near_matches_generic_linear_programming',
     'find_near_matches_generic_ngrams',
+    'find_near_matches_generic_qgram_filtered',
+    'has_near_match_generic',
+    'has_near_match_generic_bit_parallel',
+    'has_near_match_generic_linear_programming',
     'has_near_match_generic_ngrams',
+    'has_near_match_generic_qgram_filtered',
 ]
 
 
@@ -22,7 +34,10 @@ GenericSearchCandidate = namedtuple(
 )
 
 
-def find_near_matches_generic(subsequence, sequence, search_params):
+def find_near_matches_generic(subsequence, sequence, search_params,
+                              start_index=0, end_index=None,
+                              equivalences=None, seed_profile=None,
+                              max_lp_candidates=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -32,38 +47,151 @@ def find_near_matches_generic(subsequence, sequence, search_params):
     * the maximum allowed number of new characters inserted
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
+
+    Only sequence[start_index:end_index] is searched, but the indexes of the
+    matches are relative to the start of the entire sequence.
+
+    If an EquivalenceTable is given, items are compared according to it.
+
+    If a fuzzysearch.seed_planner.SequenceProfile is given as seed_profile,
+    the parts of the subsequence used by the n-gram search are chosen
+    according to it.
+
+    max_lp_candidates is passed on to the linear programming search as
+    max_candidates; see find_near_matches_generic_linear_programming().
     """
     if not subsequence:
         raise ValueError('Given subsequence is empty!')
 
+    # the exact and n-gram searches can't honor an equivalence table
+    if equivalences is not None:
+        return find_near_matches_generic_linear_programming(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences, max_lp_candidates)
+
     # if the limitations are so strict that only exact matches are allowed,
     # use search_exact()
-    if search_params.max_l_dist == 0:
+    elif search_params.max_l_dist == 0:
         return [
-            Match(start_index, start_index + len(subsequence), 0,
-                  matched=sequence[start_index:start_index + len(subsequence)])
-            for start_index in search_exact(subsequence, sequence)
+            Match(index, index + len(subsequence), 0,
+                  matched=sequence[index:index + len(subsequence)])
+            for index in search_exact(subsequence, sequence,
+                                      start_index, end_index)
         ]
 
     # if the n-gram length would be at least 3, use the n-gram search method
     elif len(subsequence) // (search_params.max_l_dist + 1) >= 3:
-        return find_near_matches_generic_ngrams(subsequence, sequence, search_params)
+        return find_near_matches_generic_ngrams(
+            subsequence, sequence, search_params, start_index, end_index,
+            choose_seeds(subsequence, search_params.max_l_dist, seed_profile),
+            max_lp_candidates,
+        )
 
-    # use the linear programming search method
+    # use the linear programming search method, on the parts of the
+    # sequence passing the q-gram filter
     else:
-        return find_near_matches_generic_linear_programming(subsequence, sequence, search_params)
+        return find_near_matches_generic_qgram_filtered(
+            subsequence, sequence, search_params, start_index, end_index,
+            max_lp_candidates)
 
 
-def _find_near_matches_generic_linear_programming(subsequence, sequence, search_params):
-    """search for near-matches of subsequence in sequence
+def has_near_match_generic(subsequence, sequence, search_params,
+                           start_index=0, end_index=None,
+                           equivalences=None, seed_profile=None,
+                           max_lp_candidates=None):
+    """check whether there is any near-match of subsequence in sequence
 
-    This searches for near-matches, where the nearly-matching parts of the
-    sequence must meet the following limitations (relative to the subsequence):
+    This chooses a suitable fuzzy search implementation according to the given
+    parameters, and stops searching at the first match found.
+    """
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
 
-    * the maximum allowed number of character substitutions
-    * the maximum allowed number of new characters inserted
-    * and the maximum allowed number of character deletions
-    * the total number of substitutions, insertions and deletions
+    # the exact and n-gram searches can't honor an equivalence table
+    if equivalences is not None:
+        return has_near_match_generic_linear_programming(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences, max_lp_candidates)
+
+    elif search_params.max_l_dist == 0:
+        return has_exact_match(subsequence, sequence, start_index, end_index)
+
+    elif len(subsequence) // (search_params.max_l_dist + 1) >= 3:
+        return has_near_match_generic_ngrams(
+            subsequence, sequence, search_params, start_index, end_index,
+            choose_seeds(subsequence, search_params.max_l_dist, seed_profile),
+            max_lp_candidates,
+        )
+
+    else:
+        return has_near_match_generic_qgram_filtered(
+            subsequence, sequence, search_params, start_index, end_index,
+            max_lp_candidates)
+
+
+# By default, the linear programming searches keep at most this many
+# candidates at once.  Beyond this, the part of the sequence being searched
+# is handed over to _find_near_matches_generic_bounded(), where the number
+# of candidates is bounded by the lengths of the subsequence and the limits
+# on the numbers of edits, rather than also growing with the number of
+# possible starts of matches.  See _prune_dominated_candidates().
+MAX_LP_CANDIDATES = 100000
+
+
+class _TooManyCandidates(Exception):
+    pass
+
+
+def _candidate_dominates(cand1, cand2):
+    return (
+        cand1.start <= cand2.start and
+        cand1.l_dist <= cand2.l_dist and
+        cand1.n_subs <= cand2.n_subs and
+        cand1.n_ins <= cand2.n_ins and
+        cand1.n_dels <= cand2.n_dels
+    )
+
+
+def _prune_dominated_candidates(candidates, merge_starts=False):
+    """Remove candidates which can't do better than another candidate.
+
+    Of two candidates with the same start and subseq_index, if one has no
+    more edits of any kind than the other, it will always do at least as
+    well, so the other is redundant.  Without this, the number of candidates
+    grows quickly for larger values of max_l_dist.
+
+    With merge_starts=True, candidates with different starts are compared
+    too, and a candidate is also redundant if another one with an earlier
+    start is otherwise at least as good.  The matches it would have found
+    are then inside longer and at least as close matches, so the best
+    match of each group of overlapping matches is still found.
+    """
+    by_position = {}
+    for cand in candidates:
+        if merge_starts:
+            key = cand.subseq_index
+        else:
+            key = (cand.start, cand.subseq_index)
+        others = by_position.get(key)
+        if others is None:
+            by_position[key] = [cand]
+            continue
+        if any(_candidate_dominates(other, cand) for other in others):
+            continue
+        others[:] = [other for other in others
+                     if not _candidate_dominates(cand, other)]
+        others.append(cand)
+    return [cand for others in by_position.values() for cand in others]
+
+
+def _search_linear_programming(subsequence, sequence, search_params,
+                               start_index, end_index, equivalences,
+                               max_candidates=None, merge_starts=False):
+    """Find matches with the linear programming search.
+
+    If more than max_candidates candidates are ever kept, _TooManyCandidates
+    is raised.  With merge_starts=True, candidates with different starts
+    are pruned together; see _prune_dominated_candidates().
     """
     if not subsequence:
         raise ValueError('Given subsequence is empty!')
@@ -72,18 +200,26 @@ def _find_near_matches_generic_linear_programming(subsequence, sequence, search_
 
     # optimization: prepare some often used things in advance
     subseq_len = len(subsequence)
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    char_indexes_in_subsequence = SubsequenceIndexes(subsequence,
+                                                     equivalences)
 
     def make_match(start, end, dist):
         return Match(start, end, dist, matched=sequence[start:end])
 
     candidates = []
-    for index, char in enumerate(sequence):
+    # sequence items are accessed by index, rather than with islice(), which
+    # would have to skip over all of the items before start_index
+    for index in range(start_index, end_index):
+        char = sequence[index]
         candidates.append(GenericSearchCandidate(index, 0, 0, 0, 0, 0))
         new_candidates = []
+        char_indexes = char_indexes_in_subsequence[char]
 
         for cand in candidates:
             # if this sequence char is the candidate's next expected char
-            if char == subsequence[cand.subseq_index]:
+            if cand.subseq_index in char_indexes:
                 # if reached the end of the subsequence, return a match
                 if cand.subseq_index + 1 == subseq_len:
                     yield make_match(cand.start, index + 1, cand.l_dist)
@@ -148,7 +284,7 @@ def _find_near_matches_generic_linear_programming(subsequence, sequence, search_
                     # otherwise, if skipping n_skipped sub-sequence chars
                     # reaches a sub-sequence char identical to this sequence
                     # char ...
-                    elif subsequence[cand.subseq_index + n_skipped] == char:
+                    elif cand.subseq_index + n_skipped in char_indexes:
                         # if this is the last char of the sub-sequence, yield
                         # a match
                         if cand.subseq_index + n_skipped + 1 == subseq_len:
@@ -167,35 +303,303 @@ def _find_near_matches_generic_linear_programming(subsequence, sequence, search_
                 # no candidate could be added / yielded by skipping sub-sequence
                 # chars
 
+        if len(new_candidates) > 1:
+            new_candidates = _prune_dominated_candidates(new_candidates,
+                                                         merge_starts)
+            if max_candidates is not None and \
+                    len(new_candidates) > max_candidates:
+                report_event('lp_candidates_limit',
+                             search='generic_linear_programming',
+                             index=index, n_candidates=len(new_candidates),
+                             max_candidates=max_candidates)
+                raise _TooManyCandidates()
         candidates = new_candidates
 
     for cand in candidates:
-        # note: index + 1 == length(sequence)
         n_skipped = subseq_len - cand.subseq_index
         if cand.n_dels + n_skipped <= max_deletions and \
            cand.l_dist + n_skipped <= max_l_dist:
-            yield make_match(cand.start, index + 1, cand.l_dist + n_skipped)
+            yield make_match(cand.start, end_index, cand.l_dist + n_skipped)
+
+
+def _find_near_matches_generic_linear_programming(subsequence, sequence,
+                                                  search_params,
+                                                  start_index=0,
+                                                  end_index=None,
+                                                  equivalences=None,
+                                                  max_candidates=None):
+    """search for near-matches of subsequence in sequence
+
+    This searches for near-matches, where the nearly-matching parts of the
+    sequence must meet the following limitations (relative to the subsequence):
+
+    * the maximum allowed number of character substitutions
+    * the maximum allowed number of new characters inserted
+    * and the maximum allowed number of character deletions
+    * the total number of substitutions, insertions and deletions
+
+    If more than max_candidates candidates (by default MAX_LP_CANDIDATES)
+    would be kept at once, the search is done with
+    _find_near_matches_generic_bounded() instead, which only finds the best
+    match of every group of overlapping matches for sure.  The matches are
+    therefore only yielded once the search is done.
+    """
+    if max_candidates is None:
+        max_candidates = MAX_LP_CANDIDATES
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    try:
+        matches = list(_search_linear_programming(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences, max_candidates))
+    except _TooManyCandidates:
+        matches = _find_near_matches_generic_bounded(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences)
+    for match in matches:
+        yield match
+
+
+def _has_near_match_generic_linear_programming(subsequence, sequence,
+                                               search_params,
+                                               start_index=0, end_index=None,
+                                               equivalences=None,
+                                               max_candidates=None):
+    """check whether there is any near-match of subsequence in sequence
+
+    This stops searching at the first match found.  See
+    _find_near_matches_generic_linear_programming() regarding
+    max_candidates.
+    """
+    if max_candidates is None:
+        max_candidates = MAX_LP_CANDIDATES
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    try:
+        for match in _search_linear_programming(
+                subsequence, sequence, search_params, start_index, end_index,
+                equivalences, max_candidates):
+            return True
+    except _TooManyCandidates:
+        return _has_near_match_generic_bounded(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences)
+    return False
+
+
+def _find_near_matches_generic_bounded(subsequence, sequence, search_params,
+                                       start_index, end_index, equivalences):
+    """search for near-matches of subsequence in sequence, in bounded memory
+
+    This is what the linear programming searches fall back to when they
+    would keep too many candidates.  Like
+    find_near_matches_generic_bit_parallel(), it only searches the parts of
+    the sequence where the bit-parallel filter finds that near-matches may
+    be.  There, candidates with different starts are pruned together, so
+    that their number is bounded by the length of the subsequence and the
+    limits on the numbers of edits.  The best match of every group of
+    overlapping matches is still found.
+    """
+    for region_start, region_end in _get_bit_parallel_candidate_regions(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences):
+        for match in _search_linear_programming_bounded(
+                subsequence, sequence, search_params,
+                region_start, region_end, equivalences):
+            yield match
+
+
+def _has_near_match_generic_bounded(subsequence, sequence, search_params,
+                                    start_index, end_index, equivalences):
+    for match in _find_near_matches_generic_bounded(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences):
+        return True
+    return False
 
 
 try:
     from fuzzysearch._generic_search import \
-        c_find_near_matches_generic_linear_programming as c_fnm_generic_lp
+        c_find_near_matches_generic_linear_programming as c_fnm_generic_lp, \
+        c_has_near_match_generic_linear_programming as c_hnm_generic_lp
 except ImportError:
     find_near_matches_generic_linear_programming = \
         _find_near_matches_generic_linear_programming
+    has_near_match_generic_linear_programming = \
+        _has_near_match_generic_linear_programming
+
+    def _search_linear_programming_bounded(subsequence, sequence,
+                                           search_params, start_index,
+                                           end_index, equivalences):
+        return _search_linear_programming(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences, merge_starts=True)
 else:
     @wraps(_find_near_matches_generic_linear_programming)
-    def find_near_matches_generic_linear_programming(subsequence, sequence, search_params):
+    def find_near_matches_generic_linear_programming(subsequence, sequence,
+                                                     search_params,
+                                                     start_index=0,
+                                                     end_index=None,
+                                                     equivalences=None,
+                                                     max_candidates=None):
+        if max_candidates is None:
+            max_candidates = MAX_LP_CANDIDATES
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
         try:
-            for match in c_fnm_generic_lp(subsequence, sequence, search_params):
-                yield match
+            matches = c_fnm_generic_lp(subsequence, sequence, search_params,
+                                       start_index, end_index, equivalences,
+                                       max_candidates)
         except (TypeError, UnicodeEncodeError):
-            for match in _find_near_matches_generic_linear_programming(
-                    subsequence, sequence, search_params):
-                yield match
+            matches = _find_near_matches_generic_linear_programming(
+                subsequence, sequence, search_params, start_index, end_index,
+                equivalences, max_candidates)
+        else:
+            if matches is None:
+                matches = _find_near_matches_generic_bounded(
+                    subsequence, sequence, search_params,
+                    start_index, end_index, equivalences)
+        for match in matches:
+            yield match
+
+    @wraps(_has_near_match_generic_linear_programming)
+    def has_near_match_generic_linear_programming(subsequence, sequence,
+                                                  search_params,
+                                                  start_index=0,
+                                                  end_index=None,
+                                                  equivalences=None,
+                                                  max_candidates=None):
+        if max_candidates is None:
+            max_candidates = MAX_LP_CANDIDATES
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
+        try:
+            has_match = c_hnm_generic_lp(subsequence, sequence, search_params,
+                                         start_index, end_index, equivalences,
+                                         max_candidates)
+        except (TypeError, UnicodeEncodeError):
+            return _has_near_match_generic_linear_programming(
+                subsequence, sequence, search_params, start_index, end_index,
+                equivalences, max_candidates)
+        if has_match is None:
+            return _has_near_match_generic_bounded(
+                subsequence, sequence, search_params, start_index, end_index,
+                equivalences)
+        return has_match
+
+    def _search_linear_programming_bounded(subsequence, sequence,
+                                           search_params, start_index,
+                                           end_index, equivalences):
+        try:
+            return c_fnm_generic_lp(subsequence, sequence, search_params,
+                                    start_index, end_index, equivalences,
+                                    merge_starts=True)
+        except (TypeError, UnicodeEncodeError):
+            return _search_linear_programming(
+                subsequence, sequence, search_params, start_index, end_index,
+                equivalences, merge_starts=True)
+
+
+def _get_candidate_regions(subsequence, sequence, search_params,
+                           start_index, end_index):
+    regions = find_candidate_regions(subsequence, sequence,
+                                     search_params.max_l_dist,
+                                     search_params.max_insertions,
+                                     start_index, end_index)
+    if regions is None:
+        return [(start_index, end_index)]
+    return regions
+
+
+def find_near_matches_generic_qgram_filtered(subsequence, sequence,
+                                             search_params,
+                                             start_index=0, end_index=None,
+                                             max_lp_candidates=None):
+    """search for near-matches of subsequence in sequence
+
+    This uses the linear programming search, but only on the parts of the
+    sequence which pass the q-gram counting filter; see
+    fuzzysearch.qgram_filter.
+    """
+    for region_start, region_end in _get_candidate_regions(
+            subsequence, sequence, search_params, start_index, end_index):
+        for match in find_near_matches_generic_linear_programming(
+                subsequence, sequence, search_params,
+                region_start, region_end,
+                max_candidates=max_lp_candidates):
+            yield match
+
 
+def has_near_match_generic_qgram_filtered(subsequence, sequence, search_params,
+                                          start_index=0, end_index=None,
+                                          max_lp_candidates=None):
+    """check whether there is any near-match of subsequence in sequence
 
-def find_near_matches_generic_ngrams(subsequence, sequence, search_params):
+    See find_near_matches_generic_qgram_filtered().
+    """
+    return any(
+        has_near_match_generic_linear_programming(
+            subsequence, sequence, search_params, region_start, region_end,
+            max_candidates=max_lp_candidates)
+        for region_start, region_end in _get_candidate_regions(
+            subsequence, sequence, search_params, start_index, end_index)
+    )
+
+
+def _get_bit_parallel_candidate_regions(subsequence, sequence, search_params,
+                                        start_index, end_index, equivalences):
+    regions = find_bit_parallel_candidate_regions(
+        subsequence, sequence, search_params.max_l_dist,
+        search_params.max_insertions, start_index, end_index, equivalences)
+    if regions is None:
+        return [(start_index, end_index)]
+    return regions
+
+
+def find_near_matches_generic_bit_parallel(subsequence, sequence,
+                                           search_params,
+                                           start_index=0, end_index=None,
+                                           equivalences=None,
+                                           max_lp_candidates=None):
+    """search for near-matches of subsequence in sequence
+
+    This uses the linear programming search, but only on the parts of the
+    sequence just before where a near-match within the maximum Levenshtein
+    distance could end, as found by a bit-parallel computation of the
+    Levenshtein distances; see fuzzysearch.bit_parallel.  The linear
+    programming search then applies the separate limits on the numbers of
+    substitutions, insertions and deletions.
+    """
+    for region_start, region_end in _get_bit_parallel_candidate_regions(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences):
+        for match in find_near_matches_generic_linear_programming(
+                subsequence, sequence, search_params,
+                region_start, region_end, equivalences, max_lp_candidates):
+            yield match
+
+
+def has_near_match_generic_bit_parallel(subsequence, sequence, search_params,
+                                        start_index=0, end_index=None,
+                                        equivalences=None,
+                                        max_lp_candidates=None):
+    """check whether there is any near-match of subsequence in sequence
+
+    See find_near_matches_generic_bit_parallel().
+    """
+    return any(
+        has_near_match_generic_linear_programming(
+            subsequence, sequence, search_params, region_start, region_end,
+            equivalences, max_lp_candidates)
+        for region_start, region_end in _get_bit_parallel_candidate_regions(
+            subsequence, sequence, search_params, start_index, end_index,
+            equivalences)
+    )
+
+
+def find_near_matches_generic_ngrams(subsequence, sequence, search_params,
+                                     start_index=0, end_index=None,
+                                     seeds=None, max_lp_candidates=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -205,6 +609,10 @@ def find_near_matches_generic_ngrams(subsequence, sequence, search_params):
     * the maximum allowed number of new characters inserted
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
+
+    seeds may be given as a list of at least max_l_dist + 1 non-overlapping
+    (start, end) parts of the subsequence to search for exactly.  By
+    default, the subsequence is split into equal parts.
     """
     if not subsequence:
         raise ValueError('Given subsequence is empty!')
@@ -213,31 +621,66 @@ def find_near_matches_generic_ngrams(subsequence, sequence, search_params):
 
     # optimization: prepare some often used things in advance
     subseq_len = len(subsequence)
-    seq_len = len(sequence)
-
-    ngram_len = subseq_len // (max_l_dist + 1)
-    if ngram_len == 0:
-        raise ValueError('the subsequence length must be greater than max_l_dist')
-
-    for ngram_start in range(0, subseq_len - ngram_len + 1, ngram_len):
-        ngram_end = ngram_start + ngram_len
-        start_index = max(0, ngram_start - max_l_dist)
-        end_index = min(seq_len, seq_len - subseq_len + ngram_end + max_l_dist)
-        if end_index <= start_index:
+    # only sequence[range_start:range_end] is searched
+    range_start, range_end = clamp_index_range(sequence, start_index,
+                                               end_index)
+
+    if seeds is None:
+        ngram_len = subseq_len // (max_l_dist + 1)
+        if ngram_len == 0:
+            raise ValueError(
+                'the subsequence length must be greater than max_l_dist')
+        seeds = equal_seeds(subseq_len, ngram_len)
+
+    # Each exact match of a seed gives a window of the sequence which could
+    # contain a near-match.  The exact matches of every seed are found in
+    # order, so merging them gives the windows in order, and overlapping
+    # windows can be merged and searched together.
+    subseq_starts = heapq.merge(*[
+        _find_seed_alignments(subsequence, sequence, ngram_start, ngram_end,
+                              max_l_dist, range_start, range_end)
+        for ngram_start, ngram_end in seeds
+    ])
+    window_start = window_end = None
+    for subseq_start in subseq_starts:
+        next_window_start = max(range_start, subseq_start - max_l_dist)
+        if window_end is not None and next_window_start <= window_end:
+            window_end = min(range_end,
+                             subseq_start + subseq_len + max_l_dist)
             continue
-        for index in search_exact(subsequence[ngram_start:ngram_end], sequence, start_index, end_index):
-            # try to expand left and/or right according to n_ngram
+        if window_end is not None:
             for match in find_near_matches_generic_linear_programming(
-                subsequence, sequence[max(0, index - ngram_start - max_l_dist):index - ngram_start + subseq_len + max_l_dist],
-                search_params,
-            ):
-                yield attr.evolve(match,
-                    start=match.start + max(0, index - ngram_start - max_l_dist),
-                    end=match.end + max(0, index - ngram_start - max_l_dist),
-                )
+                    subsequence, sequence, search_params,
+                    window_start, window_end,
+                    max_candidates=max_lp_candidates):
+                yield match
+        window_start = next_window_start
+        window_end = min(range_end, subseq_start + subseq_len + max_l_dist)
+
+    if window_end is not None:
+        for match in find_near_matches_generic_linear_programming(
+                subsequence, sequence, search_params,
+                window_start, window_end, max_candidates=max_lp_candidates):
+            yield match
+
+
+def _find_seed_alignments(subsequence, sequence, ngram_start, ngram_end,
+                          max_l_dist, range_start, range_end,
+                          exact_search=search_exact):
+    """Find where the subsequence would start for each match of a seed."""
+    start_index = max(range_start, range_start + ngram_start - max_l_dist)
+    end_index = min(range_end,
+                    range_end - len(subsequence) + ngram_end + max_l_dist)
+    if end_index <= start_index:
+        return
+    for index in exact_search(subsequence[ngram_start:ngram_end], sequence,
+                              start_index, end_index):
+        yield index - ngram_start
 
 
-def has_near_match_generic_ngrams(subsequence, sequence, search_params):
+def has_near_match_generic_ngrams(subsequence, sequence, search_params,
+                                  start_index=0, end_index=None, seeds=None,
+                                  max_lp_candidates=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -247,23 +690,94 @@ def has_near_match_generic_ngrams(subsequence, sequence, search_params):
     * the maximum allowed number of new characters inserted
     * and the maximum allowed number of character deletions
     * the total number of substitutions, insertions and deletions
+
+    This stops scanning the sequence as soon as the window around an exact
+    match of a seed is found to contain a near-match.
+
+    See find_near_matches_generic_ngrams() regarding seeds.
     """
-    for match in find_near_matches_generic_ngrams(subsequence, sequence, search_params):
-        return True
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+
+    max_l_dist = search_params.max_l_dist
+
+    subseq_len = len(subsequence)
+    range_start, range_end = clamp_index_range(sequence, start_index,
+                                               end_index)
+
+    if seeds is None:
+        ngram_len = subseq_len // (max_l_dist + 1)
+        if ngram_len == 0:
+            raise ValueError(
+                'the subsequence length must be greater than max_l_dist')
+        seeds = equal_seeds(subseq_len, ngram_len)
+
+    # Unlike find_near_matches_generic_ngrams(), each window is searched as
+    # soon as it is found, rather than once all overlapping windows have
+    # been merged.  Windows are found in order, so a window ending no later
+    # than the previous one is contained in it and is skipped.
+    subseq_starts = heapq.merge(*[
+        _find_seed_alignments(subsequence, sequence, ngram_start, ngram_end,
+                              max_l_dist, range_start, range_end,
+                              search_exact_lazily)
+        for ngram_start, ngram_end in seeds
+    ])
+    prev_window_end = None
+    for subseq_start in subseq_starts:
+        window_end = min(range_end, subseq_start + subseq_len + max_l_dist)
+        if prev_window_end is not None and window_end <= prev_window_end:
+            continue
+        if has_near_match_generic_linear_programming(
+                subsequence, sequence, search_params,
+                max(range_start, subseq_start - max_l_dist), window_end,
+                max_candidates=max_lp_candidates):
+            return True
+        prev_window_end = window_end
+
     return False
 
 
+def with_max_lp_candidates(search_class, max_lp_candidates):
+    """Make a sub-class of search_class with the given max_lp_candidates."""
+    return type(search_class.__name__, (search_class,),
+                {'max_lp_candidates': max_lp_candidates})
+
+
 class GenericSearch(FuzzySearchBase):
+    # the limit on the number of candidates kept by the linear programming
+    # search; None for MAX_LP_CANDIDATES
+    max_lp_candidates = None
+
     @classmethod
-    def search(cls, subsequence, sequence, search_params):
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
         for match in find_near_matches_generic(subsequence, sequence,
-                                               search_params):
+                                               search_params,
+                                               start_index, end_index,
+                                               equivalences, seed_profile,
+                                               cls.max_lp_candidates):
             yield match
 
+    @classmethod
+    def has_match(cls, subsequence, sequence, search_params,
+                  start_index=0, end_index=None, equivalences=None,
+                  seed_profile=None):
+        return has_near_match_generic(subsequence, sequence, search_params,
+                                      start_index, end_index, equivalences,
+                                      seed_profile, cls.max_lp_candidates)
+
     @classmethod
     def consolidate_matches(cls, matches):
         return consolidate_overlapping_matches(matches)
 
+    @classmethod
+    def count_matches(cls, subsequence, sequence, search_params,
+                      start_index=0, end_index=None, equivalences=None):
+        matches = cls.search(subsequence, sequence, search_params,
+                             start_index, end_index, equivalences)
+        return count_overlapping_match_groups(matches)
+
     @classmethod
     def extra_items_for_chunked_search(cls, subsequence, search_params):
         return max(
@@ -271,3 +785,31 @@ class GenericSearch(FuzzySearchBase):
                         search_params.max_insertions]
             if x is not None
         )
+
+
+class BitParallelSearch(GenericSearch):
+    """Like GenericSearch, but always filtering with the bit-parallel
+    Levenshtein distances; see find_near_matches_generic_bit_parallel().
+    """
+    @classmethod
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
+        if not subsequence:
+            raise ValueError('Given subsequence is empty!')
+        for match in find_near_matches_generic_bit_parallel(
+                subsequence, sequence, search_params,
+                start_index, end_index, equivalences,
+                cls.max_lp_candidates):
+            yield match
+
+    @classmethod
+    def has_match(cls, subsequence, sequence, search_params,
+                  start_index=0, end_index=None, equivalences=None,
+                  seed_profile=None):
+        if not subsequence:
+            raise ValueError('Given subsequence is empty!')
+        return has_near_match_generic_bit_parallel(
+            subsequence, sequence, search_params,
+            start_index, end_index, equivalences,
+            cls.max_lp_candidates)
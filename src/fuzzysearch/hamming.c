@@ -0,0 +1,90 @@
+#include "src/fuzzysearch/hamming.h"
+
+
+size_t scalar_count_differences_with_maximum(const char *seq1,
+                                             const char *seq2,
+                                             size_t len,
+                                             size_t max_differences)
+{
+    size_t n_differences = 0;
+    while (len-- && n_differences < max_differences) {
+        n_differences += *seq1++ != *seq2++;
+    }
+    return n_differences;
+}
+
+
+#ifdef X86_SIMD
+
+/* The SIMD implementations compare a block of items at once, and count the
+   differing ones in the resulting bit mask.  Items after the last full
+   block are compared by the next narrower implementation. */
+
+size_t sse2_count_differences_with_maximum(const char *seq1,
+                                           const char *seq2,
+                                           size_t len,
+                                           size_t max_differences)
+{
+    size_t n_differences = 0;
+    size_t i;
+    unsigned int mask;
+
+    for (i = 0; i + 16 <= len; i += 16) {
+        mask = (unsigned int) _mm_movemask_epi8(_mm_cmpeq_epi8(
+            _mm_loadu_si128((const __m128i *) (seq1 + i)),
+            _mm_loadu_si128((const __m128i *) (seq2 + i))));
+        n_differences += 16 - __builtin_popcount(mask);
+        if (n_differences >= max_differences) {
+            return max_differences;
+        }
+    }
+
+    return n_differences + scalar_count_differences_with_maximum(
+        seq1 + i, seq2 + i, len - i, max_differences - n_differences);
+}
+
+__attribute__((target("avx2,popcnt")))
+size_t avx2_count_differences_with_maximum(const char *seq1,
+                                           const char *seq2,
+                                           size_t len,
+                                           size_t max_differences)
+{
+    size_t n_differences = 0;
+    size_t i;
+    unsigned int mask;
+
+    for (i = 0; i + 32 <= len; i += 32) {
+        mask = (unsigned int) _mm256_movemask_epi8(_mm256_cmpeq_epi8(
+            _mm256_loadu_si256((const __m256i *) (seq1 + i)),
+            _mm256_loadu_si256((const __m256i *) (seq2 + i))));
+        n_differences += 32 - __builtin_popcount(mask);
+        if (n_differences >= max_differences) {
+            return max_differences;
+        }
+    }
+
+    return n_differences + sse2_count_differences_with_maximum(
+        seq1 + i, seq2 + i, len - i, max_differences - n_differences);
+}
+#endif /* X86_SIMD */
+
+/* The fastest implementation supported by the CPU, chosen on first use. */
+static count_differences_with_maximum_func
+count_differences_with_maximum_impl = NULL;
+
+size_t count_differences_with_maximum(const char *seq1, const char *seq2,
+                                      size_t len, size_t max_differences)
+{
+    if (count_differences_with_maximum_impl == NULL) {
+#ifdef X86_SIMD
+        count_differences_with_maximum_impl = cpu_supports_avx2() ?
+            avx2_count_differences_with_maximum :
+            sse2_count_differences_with_maximum;
+#else
+        count_differences_with_maximum_impl =
+            scalar_count_differences_with_maximum;
+#endif
+    }
+    return count_differences_with_maximum_impl(seq1, seq2, len,
+                                               max_differences);
+}
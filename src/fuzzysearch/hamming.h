@@ -0,0 +1,35 @@
+#ifndef HAMMING_H
+#define HAMMING_H
+
+#include <stddef.h>
+#include "src/fuzzysearch/simd.h"
+
+/* Count the positions where two sequences of length len differ, stopping
+   once max_differences are found.  Returns the number of differences, or
+   max_differences if there are more.  Uses the fastest implementation
+   supported by the CPU. */
+size_t count_differences_with_maximum(const char *seq1, const char *seq2,
+                                      size_t len, size_t max_differences);
+
+typedef size_t (*count_differences_with_maximum_func)(
+    const char *seq1, const char *seq2, size_t len, size_t max_differences);
+
+/* The implementations of count_differences_with_maximum().  The SIMD ones
+   only check whether the maximum has been reached once per block of 16 or
+   32 items. */
+size_t scalar_count_differences_with_maximum(const char *seq1,
+                                             const char *seq2,
+                                             size_t len,
+                                             size_t max_differences);
+#ifdef X86_SIMD
+size_t sse2_count_differences_with_maximum(const char *seq1,
+                                           const char *seq2,
+                                           size_t len,
+                                           size_t max_differences);
+size_t avx2_count_differences_with_maximum(const char *seq1,
+                                           const char *seq2,
+                                           size_t len,
+                                           size_t max_differences);
+#endif
+
+#endif /* HAMMING_H */
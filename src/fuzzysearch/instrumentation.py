@@ -0,0 +1,40 @@
+"""hooks for observing decisions made internally while searching
+
+Some searches change their strategy while running, e.g. to limit their
+memory use.  Such events are reported to the functions registered with
+add_hook(), which can be used for logging or collecting metrics.
+"""
+
+__all__ = [
+    'add_hook',
+    'remove_hook',
+    'report_event',
+]
+
+
+_hooks = []
+
+
+def add_hook(hook):
+    """Register a function to be called for every reported event.
+
+    The hook is called as hook(event, details), where event is a string
+    naming the event and details is a dict with additional information.
+    """
+    if not callable(hook):
+        raise TypeError('hook must be callable')
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Unregister a function registered with add_hook()."""
+    try:
+        _hooks.remove(hook)
+    except ValueError:
+        raise ValueError('hook is not registered')
+
+
+def report_event(event, **details):
+    """Call all of the registered hooks for an event."""
+    for hook in list(_hooks):
+        hook(event, details)
@@ -1,17 +1,34 @@
 from collections import namedtuple
 
 from fuzzysearch.common import FuzzySearchBase, Match, \
-    consolidate_overlapping_matches
-from fuzzysearch.levenshtein_ngram import find_near_matches_levenshtein_ngrams
-from fuzzysearch.search_exact import search_exact
+    consolidate_overlapping_matches, count_overlapping_match_groups, \
+    clamp_index_range, SubsequenceIndexes
+from fuzzysearch.levenshtein_neighborhood import \
+    find_neighborhood_regions, has_near_match_levenshtein_neighborhood
+from fuzzysearch.levenshtein_ngram import \
+    find_near_matches_levenshtein_ngrams, has_near_match_levenshtein_ngrams
+from fuzzysearch.qgram_filter import find_candidate_regions
+from fuzzysearch.search_exact import search_exact, has_exact_match
+from fuzzysearch.seed_planner import choose_seeds
 
 
-def find_near_matches_levenshtein(subsequence, sequence, max_l_dist):
+def find_near_matches_levenshtein(subsequence, sequence, max_l_dist,
+                                  start_index=0, end_index=None,
+                                  equivalences=None, seed_profile=None):
     """Find near-matches of the subsequence in the sequence.
 
     This chooses a suitable fuzzy search implementation according to the given
     parameters.
 
+    Only sequence[start_index:end_index] is searched, but the indexes of the
+    matches are relative to the start of the entire sequence.
+
+    If an EquivalenceTable is given, items are compared according to it.
+
+    If a fuzzysearch.seed_planner.SequenceProfile is given as seed_profile,
+    the parts of the subsequence used by the n-gram search are chosen
+    according to it.
+
     Returns a list of fuzzysearch.Match objects describing the matching parts
     of the sequence.
     """
@@ -20,60 +37,174 @@ def find_near_matches_levenshtein(subsequence, sequence, max_l_dist):
     if max_l_dist < 0:
         raise ValueError('Maximum Levenshtein distance must be >= 0!')
 
-    if max_l_dist == 0:
+    # the exact and n-gram searches can't honor an equivalence table
+    if equivalences is not None:
+        return find_near_matches_levenshtein_linear_programming(
+            subsequence, sequence, max_l_dist, start_index, end_index,
+            equivalences)
+
+    elif max_l_dist == 0:
         return [
-            Match(start_index, start_index + len(subsequence), 0,
-                  sequence[start_index:start_index + len(subsequence)])
-            for start_index in search_exact(subsequence, sequence)
+            Match(index, index + len(subsequence), 0,
+                  sequence[index:index + len(subsequence)])
+            for index in search_exact(subsequence, sequence,
+                                      start_index, end_index)
         ]
 
     elif len(subsequence) // (max_l_dist + 1) >= 3:
-        return find_near_matches_levenshtein_ngrams(subsequence,
-                                                    sequence,
-                                                    max_l_dist)
+        return find_near_matches_levenshtein_ngrams(
+            subsequence, sequence, max_l_dist, start_index, end_index,
+            choose_seeds(subsequence, max_l_dist, seed_profile),
+        )
+
+    # for short subsequences, scan for their entire edit neighborhood, if
+    # it is small enough, and search only where it is found
+    if max_l_dist < len(subsequence):
+        regions = find_neighborhood_regions(
+            subsequence, sequence, max_l_dist, start_index, end_index)
+        if regions is not None:
+            return list(_find_near_matches_in_regions(
+                subsequence, sequence, max_l_dist, regions, end_index))
+
+    return find_near_matches_levenshtein_qgram_filtered(subsequence,
+                                                        sequence,
+                                                        max_l_dist,
+                                                        start_index,
+                                                        end_index)
+
+
+def has_near_match_levenshtein(subsequence, sequence, max_l_dist,
+                               start_index=0, end_index=None,
+                               equivalences=None, seed_profile=None):
+    """Check whether the sequence contains any near-match of the subsequence.
+
+    This chooses a suitable fuzzy search implementation according to the given
+    parameters, and stops searching at the first match found.
+    """
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+    if max_l_dist < 0:
+        raise ValueError('Maximum Levenshtein distance must be >= 0!')
+
+    # the exact and n-gram searches can't honor an equivalence table
+    if equivalences is not None:
+        matches = find_near_matches_levenshtein_linear_programming(
+            subsequence, sequence, max_l_dist, start_index, end_index,
+            equivalences)
+
+    elif max_l_dist == 0:
+        return has_exact_match(subsequence, sequence, start_index, end_index)
+
+    elif len(subsequence) // (max_l_dist + 1) >= 3:
+        return has_near_match_levenshtein_ngrams(
+            subsequence, sequence, max_l_dist, start_index, end_index,
+            choose_seeds(subsequence, max_l_dist, seed_profile),
+        )
 
     else:
-        return find_near_matches_levenshtein_linear_programming(subsequence,
-                                                                sequence,
-                                                                max_l_dist)
+        has_match = None
+        if max_l_dist < len(subsequence):
+            has_match = has_near_match_levenshtein_neighborhood(
+                subsequence, sequence, max_l_dist, start_index, end_index)
+        if has_match is not None:
+            return has_match
+        matches = find_near_matches_levenshtein_qgram_filtered(
+            subsequence, sequence, max_l_dist, start_index, end_index)
 
+    for _match in matches:
+        return True
+    return False
 
-Candidate = namedtuple('Candidate', ['start', 'subseq_index', 'dist'])
 
+def find_near_matches_levenshtein_qgram_filtered(subsequence, sequence,
+                                                 max_l_dist,
+                                                 start_index=0,
+                                                 end_index=None):
+    """Find near-matches using the linear programming search, only searching
+    the parts of the sequence which pass the q-gram counting filter.
+
+    See fuzzysearch.qgram_filter.  If the filter isn't usable, the entire
+    sequence is searched.
+    """
+    regions = find_candidate_regions(subsequence, sequence, max_l_dist,
+                                     start_index=start_index,
+                                     end_index=end_index)
+    if regions is None:
+        return find_near_matches_levenshtein_linear_programming(
+            subsequence, sequence, max_l_dist, start_index, end_index)
+    return _find_near_matches_in_regions(subsequence, sequence, max_l_dist,
+                                         regions, end_index)
+
+
+def _find_near_matches_in_regions(subsequence, sequence, max_l_dist,
+                                  regions, end_index=None):
+    """Search the regions of the sequence with the linear programming search.
+
+    Every near-match must be entirely within one of the regions.  The
+    matches found are the same as those found when searching up to
+    end_index at once.
+    """
+    _start_index, end_index = clamp_index_range(sequence, 0, end_index)
+    for region_start, region_end in regions:
+        if region_end >= end_index:
+            for match in find_near_matches_levenshtein_linear_programming(
+                    subsequence, sequence, max_l_dist,
+                    region_start, region_end):
+                yield match
+            continue
+
+        # The search reports the candidates left at the end of the searched
+        # range as matches, which a search continuing past it wouldn't do.
+        # Searching one more item and dropping matches ending after the
+        # region avoids that, since no near-match ends there.
+        for match in find_near_matches_levenshtein_linear_programming(
+                subsequence, sequence, max_l_dist,
+                region_start, region_end + 1):
+            if match.end <= region_end:
+                yield match
 
-def make_char2first_subseq_index(subsequence, max_l_dist):
-    return dict(
-        (char, index)
-        for (index, char) in
-        reversed(list(enumerate(subsequence[:max_l_dist + 1])))
-    )
+
+Candidate = namedtuple('Candidate', ['start', 'subseq_index', 'dist'])
 
 
 def find_near_matches_levenshtein_linear_programming(subsequence, sequence,
-                                                     max_l_dist):
+                                                     max_l_dist,
+                                                     start_index=0,
+                                                     end_index=None,
+                                                     equivalences=None):
     if not subsequence:
         raise ValueError('Given subsequence is empty!')
 
     subseq_len = len(subsequence)
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
 
     def make_match(start, end, dist):
         return Match(start, end, dist, matched=sequence[start:end])
 
     if max_l_dist >= subseq_len:
-        for index in range(len(sequence) + 1):
+        for index in range(start_index, end_index + 1):
             yield make_match(index, index, subseq_len)
         return
 
-    # optimization: prepare some often used things in advance
-    char2first_subseq_index = make_char2first_subseq_index(subsequence,
-                                                           max_l_dist)
+    # optimization: prepare quick lookups of where each sequence item
+    # matches the subsequence, and its first `max_l_dist + 1` items
+    char_indexes_in_subsequence = SubsequenceIndexes(subsequence,
+                                                     equivalences)
+    char_indexes_in_subseq_start = SubsequenceIndexes(
+        subsequence[:max_l_dist + 1], equivalences)
 
     candidates = []
-    for index, char in enumerate(sequence):
+    # sequence items are accessed by index, rather than with islice(), which
+    # would have to skip over all of the items before start_index
+    for index in range(start_index, end_index):
+        char = sequence[index]
         new_candidates = []
+        char_indexes = char_indexes_in_subsequence[char]
 
-        idx_in_subseq = char2first_subseq_index.get(char, None)
-        if idx_in_subseq is not None:
+        start_indexes = char_indexes_in_subseq_start[char]
+        if start_indexes:
+            idx_in_subseq = min(start_indexes)
             if idx_in_subseq + 1 == subseq_len:
                 yield make_match(index, index + 1, idx_in_subseq)
             else:
@@ -81,7 +212,7 @@ def find_near_matches_levenshtein_linear_programming(subsequence, sequence,
 
         for cand in candidates:
             # if this sequence char is the candidate's next expected char
-            if subsequence[cand.subseq_index] == char:
+            if cand.subseq_index in char_indexes:
                 # if reached the end of the subsequence, return a match
                 if cand.subseq_index + 1 == subseq_len:
                     yield make_match(cand.start, index + 1, cand.dist)
@@ -102,7 +233,8 @@ def find_near_matches_levenshtein_linear_programming(subsequence, sequence,
                 # add a candidate skipping a sequence char
                 new_candidates.append(cand._replace(dist=cand.dist + 1))
 
-                if index + 1 < len(sequence) and cand.subseq_index + 1 < subseq_len:
+                if index + 1 < end_index and \
+                        cand.subseq_index + 1 < subseq_len:
                     # add a candidate skipping both a sequence char and a
                     # subsequence char
                     new_candidates.append(cand._replace(
@@ -122,7 +254,7 @@ def find_near_matches_levenshtein_linear_programming(subsequence, sequence,
                     # reaches a sub-sequence char identical to this sequence
                     # char, add a candidate skipping n_skipped sub-sequence
                     # chars
-                    elif subsequence[cand.subseq_index + n_skipped] == char:
+                    elif cand.subseq_index + n_skipped in char_indexes:
                         # if this is the last char of the sub-sequence, yield
                         # a match
                         if cand.subseq_index + n_skipped + 1 == subseq_len:
@@ -140,25 +272,58 @@ def find_near_matches_levenshtein_linear_programming(subsequence, sequence,
                 # no candidate could be added / yielded by skipping sub-sequence
                 # chars
 
+        # Of several candidates with the same start and subseq_index, the
+        # one with the smallest distance will always do at least as well
+        # as the others, so only it is kept.  Without this, the number of
+        # candidates grows quickly for larger values of max_l_dist.
+        if len(new_candidates) > 1:
+            best_candidates = {}
+            for cand in new_candidates:
+                key = (cand.start, cand.subseq_index)
+                best = best_candidates.get(key)
+                if best is None or cand.dist < best.dist:
+                    best_candidates[key] = cand
+            new_candidates = list(best_candidates.values())
         candidates = new_candidates
 
     for cand in candidates:
         dist = cand.dist + subseq_len - cand.subseq_index
         if dist <= max_l_dist:
-            yield make_match(cand.start, len(sequence), dist)
+            yield make_match(cand.start, end_index, dist)
 
 
 class LevenshteinSearch(FuzzySearchBase):
     @classmethod
-    def search(cls, subsequence, sequence, search_params):
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
         for match in find_near_matches_levenshtein(subsequence, sequence,
-                                                   search_params.max_l_dist):
+                                                   search_params.max_l_dist,
+                                                   start_index, end_index,
+                                                   equivalences,
+                                                   seed_profile):
             yield match
 
+    @classmethod
+    def has_match(cls, subsequence, sequence, search_params,
+                  start_index=0, end_index=None, equivalences=None,
+                  seed_profile=None):
+        return has_near_match_levenshtein(subsequence, sequence,
+                                          search_params.max_l_dist,
+                                          start_index, end_index,
+                                          equivalences, seed_profile)
+
     @classmethod
     def consolidate_matches(cls, matches):
         return consolidate_overlapping_matches(matches)
 
+    @classmethod
+    def count_matches(cls, subsequence, sequence, search_params,
+                      start_index=0, end_index=None, equivalences=None):
+        matches = cls.search(subsequence, sequence, search_params,
+                             start_index, end_index, equivalences)
+        return count_overlapping_match_groups(matches)
+
     @classmethod
     def extra_items_for_chunked_search(cls, subsequence, search_params):
         return search_params.max_l_dist
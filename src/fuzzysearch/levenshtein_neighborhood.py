@@ -0,0 +1,245 @@
+"""fuzzy searching by scanning for the edit neighborhood of a subsequence
+
+For short subsequences and small alphabets, the set of all sequences within a
+small Levenshtein distance of the subsequence, its "edit neighborhood", is
+small.  Scanning for all of these at once with a single regular expression is
+then much faster than the linear programming search, which is otherwise used
+when the subsequence is too short for the n-gram search.
+"""
+import re
+from functools import lru_cache
+
+from fuzzysearch.common import Match, clamp_index_range
+
+__all__ = [
+    'edit_neighborhood',
+    'find_near_matches_levenshtein_neighborhood',
+    'find_neighborhood_regions',
+    'has_near_match_levenshtein_neighborhood',
+]
+
+
+# edit neighborhoods larger than this aren't used for searching, since
+# building and scanning for them would be slower than other search methods
+MAX_NEIGHBORHOOD_SIZE = 5000
+
+
+def edit_neighborhood(subsequence, max_l_dist, alphabet,
+                      max_size=None):
+    """Get all sequences within max_l_dist of the subsequence.
+
+    The sequences are made of the subsequence's items and those in alphabet.
+    Returns a dict mapping each sequence, as a tuple, to its Levenshtein
+    distance from the subsequence.  If max_size is given and the
+    neighborhood would be larger, None is returned instead.
+    """
+    subsequence = tuple(subsequence)
+    alphabet = sorted(set(alphabet) | set(subsequence))
+
+    distances = {subsequence: 0}
+    # Each sequence first reached after n single-item edits is at a
+    # distance of exactly n.
+    level = [subsequence]
+    for dist in range(1, max_l_dist + 1):
+        next_level = []
+        for neighbor in level:
+            for edited in _single_edits(neighbor, alphabet):
+                if edited not in distances:
+                    distances[edited] = dist
+                    next_level.append(edited)
+            if max_size is not None and len(distances) > max_size:
+                return None
+        level = next_level
+    return distances
+
+
+def _single_edits(items, alphabet):
+    for index in range(len(items) + 1):
+        prefix, suffix = items[:index], items[index:]
+        for item in alphabet:
+            # insertion
+            yield prefix + (item,) + suffix
+            # substitution
+            if suffix and suffix[0] != item:
+                yield prefix + (item,) + suffix[1:]
+        # deletion
+        if suffix:
+            yield prefix + suffix[1:]
+
+
+def _trie_pattern(neighbors, escape):
+    """Build a regular expression pattern matching any of the neighbors.
+
+    The alternatives are arranged as a trie, so that at each position the
+    regular expression engine needs to check at most one alternative per
+    item.
+    """
+    trie = {}
+    for neighbor in neighbors:
+        node = trie
+        for item in neighbor:
+            node = node.setdefault(item, {})
+        node[None] = {}
+
+    def node_pattern(node):
+        alternatives = [
+            escape(item) + node_pattern(child)
+            for item, child in node.items()
+            if item is not None
+        ]
+        if not alternatives:
+            return ''
+        pattern = '(?:' + '|'.join(alternatives) + ')'
+        return pattern + '?' if None in node else pattern
+
+    return node_pattern(trie)
+
+
+@lru_cache(maxsize=64)
+def _compile_neighborhood(subsequence, max_l_dist, alphabet):
+    """Prepare to scan for the edit neighborhood of the subsequence.
+
+    Returns a (compiled_regexp, distances, lengths) tuple, or None if the
+    neighborhood is too large.  This is cached, so that repeated searches
+    for the same subsequence only do this once.
+    """
+    distances = edit_neighborhood(subsequence, max_l_dist, alphabet,
+                                  max_size=MAX_NEIGHBORHOOD_SIZE)
+    if distances is None:
+        return None
+
+    if isinstance(subsequence, str):
+        join = ''.join
+        pattern = '(?=%s)' % _trie_pattern(distances, re.escape)
+    else:
+        join = bytes
+        # bytes are escaped as latin-1 characters, which map to single bytes
+        pattern = '(?=%s)' % _trie_pattern(
+            distances, lambda item: re.escape(chr(item)))
+        pattern = pattern.encode('latin-1')
+    # the zero-width lookahead finds the neighbors' start indexes without
+    # consuming any items, so that overlapping occurrences are found too
+    regexp = re.compile(pattern)
+
+    distances = {join(neighbor): dist for neighbor, dist in distances.items()}
+    lengths = sorted({len(neighbor) for neighbor in distances})
+    return regexp, distances, lengths
+
+
+def _prepare(subsequence, sequence, max_l_dist):
+    if isinstance(sequence, str):
+        if not isinstance(subsequence, str):
+            return None
+    elif isinstance(sequence, (bytes, bytearray)):
+        if not isinstance(subsequence, (bytes, bytearray)):
+            return None
+        subsequence = bytes(subsequence)
+    else:
+        return None
+
+    return _compile_neighborhood(subsequence, max_l_dist,
+                                 frozenset(sequence))
+
+
+def _search(compiled, sequence, start_index, end_index):
+    regexp, distances, lengths = compiled
+    # bytearray slices are unhashable, so they are looked up as bytes
+    key = bytes if isinstance(sequence, bytearray) else None
+    for regexp_match in regexp.finditer(sequence, start_index, end_index):
+        start = regexp_match.start()
+        for length in lengths:
+            if start + length > end_index:
+                break
+            matched = sequence[start:start + length]
+            dist = distances.get(matched if key is None else key(matched))
+            if dist is not None:
+                yield Match(start, start + length, dist, matched)
+
+
+def find_near_matches_levenshtein_neighborhood(subsequence, sequence,
+                                               max_l_dist,
+                                               start_index=0, end_index=None):
+    """Find near-matches by scanning for the subsequence's edit neighborhood.
+
+    Only str, bytes and bytearray sequences are supported, and the
+    neighborhood of the subsequence must be small enough, up to
+    MAX_NEIGHBORHOOD_SIZE.  Otherwise, None is returned.  This allows callers
+    to fall back to a different search method.
+
+    Returns a list of Match objects, including all overlapping matches.
+    """
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+    if not 0 <= max_l_dist < len(subsequence):
+        raise ValueError('max_l_dist must be between 0 and '
+                         'len(subsequence) - 1')
+
+    compiled = _prepare(subsequence, sequence, max_l_dist)
+    if compiled is None:
+        return None
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    return list(_search(compiled, sequence, start_index, end_index))
+
+
+def find_neighborhood_regions(subsequence, sequence, max_l_dist,
+                              start_index=0, end_index=None):
+    """Find the parts of the sequence containing near-matches.
+
+    The parts of the sequence matching any of the subsequence's edit
+    neighbors are merged where they overlap.
+
+    Returns a sorted list of non-overlapping (start, end) pairs, such that
+    every near-match in sequence[start_index:end_index] is entirely within
+    one of them.  Returns None when the neighborhood can't be used, as with
+    find_near_matches_levenshtein_neighborhood().
+    """
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+    if not 0 <= max_l_dist < len(subsequence):
+        raise ValueError('max_l_dist must be between 0 and '
+                         'len(subsequence) - 1')
+
+    compiled = _prepare(subsequence, sequence, max_l_dist)
+    if compiled is None:
+        return None
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+
+    regions = []
+    region_start = region_end = None
+    # the matches are found in order of their start indexes
+    for match in _search(compiled, sequence, start_index, end_index):
+        if region_end is not None and match.start < region_end:
+            region_end = max(region_end, match.end)
+        else:
+            if region_end is not None:
+                regions.append((region_start, region_end))
+            region_start, region_end = match.start, match.end
+    if region_end is not None:
+        regions.append((region_start, region_end))
+    return regions
+
+
+def has_near_match_levenshtein_neighborhood(subsequence, sequence,
+                                            max_l_dist,
+                                            start_index=0, end_index=None):
+    """Check for a near-match by scanning for the edit neighborhood.
+
+    Returns None when the neighborhood can't be used, as with
+    find_near_matches_levenshtein_neighborhood().
+    """
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+    if not 0 <= max_l_dist < len(subsequence):
+        raise ValueError('max_l_dist must be between 0 and '
+                         'len(subsequence) - 1')
+
+    compiled = _prepare(subsequence, sequence, max_l_dist)
+    if compiled is None:
+        return None
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    for _match in _search(compiled, sequence, start_index, end_index):
+        return True
+    return False
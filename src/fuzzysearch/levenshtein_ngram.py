@@ -1,8 +1,14 @@
-from fuzzysearch.common import Match
-from fuzzysearch.search_exact import search_exact
+from functools import wraps
 
+from fuzzysearch.common import Match, clamp_index_range
+from fuzzysearch.search_exact import search_exact, search_exact_lazily
+from fuzzysearch.seed_planner import equal_seeds
 
-__all__ = ['find_near_matches_levenshtein_ngrams']
+
+__all__ = [
+    'find_near_matches_levenshtein_ngrams',
+    'has_near_match_levenshtein_ngrams',
+]
 
 
 def _expand(subsequence, sequence, max_l_dist):
@@ -143,10 +149,45 @@ def _py_expand_long(subsequence, sequence, max_l_dist):
     return (min_score, min_score_idx + 1) if min_score <= max_l_dist else (None, None)
 
 
+def _expand_ngram_match(subsequence, sequence, ngram_start, ngram_end,
+                        index, range_start, range_end, max_l_dist):
+    """Expand an exact match of an n-gram of the sub-sequence to both sides.
+
+    subsequence[ngram_start:ngram_end] must match exactly at
+    sequence[index:], and only sequence[range_start:range_end] is searched.
+
+    Returns a (start, end, dist) tuple, or None if there is no near-match.
+    """
+    ngram_len = ngram_end - ngram_start
+    right_end = min(range_end,
+                    index - ngram_start + len(subsequence) + max_l_dist)
+    dist_right, right_expand_size = _expand(
+        subsequence[ngram_end:],
+        sequence[index + ngram_len:right_end],
+        max_l_dist,
+    )
+    if dist_right is None:
+        return None
+    left_start = max(range_start,
+                     index - ngram_start - (max_l_dist - dist_right))
+    dist_left, left_expand_size = _expand(
+        subsequence[:ngram_start][::-1],
+        sequence[left_start:index][::-1],
+        max_l_dist - dist_right,
+    )
+    if dist_left is None:
+        return None
+    assert dist_left + dist_right <= max_l_dist
+    return (index - left_expand_size,
+            index + ngram_len + right_expand_size,
+            dist_left + dist_right)
+
+
 try:
     from fuzzysearch._levenshtein_ngrams import (
         c_expand_short as _c_expand_short,
         c_expand_long as _c_expand_long,
+        c_expand_ngram_match_byteslike as _c_expand_ngram_match_byteslike,
     )
 except ImportError:
     _expand_short = _py_expand_short
@@ -155,44 +196,120 @@ else:
     _expand_short = _c_expand_short
     _expand_long = _c_expand_long
 
-
-def find_near_matches_levenshtein_ngrams(subsequence, sequence, max_l_dist):
+    _py_expand_ngram_match = _expand_ngram_match
+
+    @wraps(_py_expand_ngram_match)
+    def _expand_ngram_match(subsequence, sequence, ngram_start, ngram_end,
+                            index, range_start, range_end, max_l_dist):
+        # the C implementation scans both sides of the n-gram's match in
+        # place, without copying or reversing parts of the sequences
+        try:
+            return _c_expand_ngram_match_byteslike(
+                subsequence, sequence, ngram_start, ngram_end,
+                index, range_start, range_end, max_l_dist)
+        except TypeError:
+            return _py_expand_ngram_match(
+                subsequence, sequence, ngram_start, ngram_end,
+                index, range_start, range_end, max_l_dist)
+
+
+def find_near_matches_levenshtein_ngrams(subsequence, sequence, max_l_dist,
+                                         start_index=0, end_index=None,
+                                         seeds=None):
+    """Find near-matches by expanding exact matches of n-grams.
+
+    seeds may be given as a list of at least max_l_dist + 1 non-overlapping
+    (start, end) parts of the subsequence to search for exactly, e.g. as
+    chosen by fuzzysearch.seed_planner.plan_seeds().  By default, the
+    subsequence is split into equal parts.
+    """
     subseq_len = len(subsequence)
-    seq_len = len(sequence)
+    # only sequence[range_start:range_end] is searched
+    range_start, range_end = clamp_index_range(sequence, start_index,
+                                               end_index)
 
-    ngram_len = subseq_len // (max_l_dist + 1)
-    if ngram_len == 0:
-        raise ValueError('the subsequence length must be greater than max_l_dist')
+    if seeds is None:
+        ngram_len = subseq_len // (max_l_dist + 1)
+        if ngram_len == 0:
+            raise ValueError(
+                'the subsequence length must be greater than max_l_dist')
+        seeds = equal_seeds(subseq_len, ngram_len)
 
     def make_match(start, end, dist):
         return Match(start, end, dist, matched=sequence[start:end])
 
-    for ngram_start in range(0, subseq_len - ngram_len + 1, ngram_len):
-        ngram_end = ngram_start + ngram_len
-        subseq_before_reversed = subsequence[:ngram_start][::-1]
-        subseq_after = subsequence[ngram_end:]
-        start_index = max(0, ngram_start - max_l_dist)
-        end_index = min(seq_len, seq_len - subseq_len + ngram_end + max_l_dist)
+    prev_ngram_start = None
+    for ngram_start, ngram_end in sorted(seeds):
+        start_index = max(range_start, range_start + ngram_start - max_l_dist)
+        end_index = min(range_end,
+                        range_end - subseq_len + ngram_end + max_l_dist)
         for index in search_exact(subsequence[ngram_start:ngram_end], sequence, start_index, end_index):
+            # If the previous n-gram and everything up to this one also
+            # match exactly here, expanding from the previous n-gram has
+            # already found a match which is at least as close, so skip
+            # expanding again.  Near-exact matches are otherwise expanded
+            # once for every n-gram.
+            if prev_ngram_start is not None:
+                prev_index = index - ngram_start + prev_ngram_start
+                if prev_index >= range_start and \
+                        sequence[prev_index:index] == \
+                        subsequence[prev_ngram_start:ngram_start]:
+                    continue
+
             # try to expand left and/or right according to n_ngram
-            dist_right, right_expand_size = _expand(
-                subseq_after,
-                sequence[index + ngram_len:index - ngram_start + subseq_len + max_l_dist],
-                max_l_dist,
-            )
-            if dist_right is None:
-                continue
-            dist_left, left_expand_size = _expand(
-                subseq_before_reversed,
-                sequence[max(0, index - ngram_start - (max_l_dist - dist_right)):index][::-1],
-                max_l_dist - dist_right,
+            expanded = _expand_ngram_match(
+                subsequence, sequence, ngram_start, ngram_end,
+                index, range_start, range_end, max_l_dist,
             )
-            if dist_left is None:
+            if expanded is None:
                 continue
-            assert dist_left + dist_right <= max_l_dist
+            yield make_match(*expanded)
 
-            yield make_match(
-                start=index - left_expand_size,
-                end=index + ngram_len + right_expand_size,
-                dist=dist_left + dist_right,
-            )
+        prev_ngram_start = ngram_start
+
+
+def has_near_match_levenshtein_ngrams(subsequence, sequence, max_l_dist,
+                                      start_index=0, end_index=None,
+                                      seeds=None):
+    """Check whether there is any near-match, by expanding n-gram matches.
+
+    This stops scanning the sequence as soon as the first exact match of an
+    n-gram is expanded into a near-match.
+
+    See find_near_matches_levenshtein_ngrams() regarding seeds.
+    """
+    subseq_len = len(subsequence)
+    range_start, range_end = clamp_index_range(sequence, start_index,
+                                               end_index)
+
+    if seeds is None:
+        ngram_len = subseq_len // (max_l_dist + 1)
+        if ngram_len == 0:
+            raise ValueError(
+                'the subsequence length must be greater than max_l_dist')
+        seeds = equal_seeds(subseq_len, ngram_len)
+
+    prev_ngram_start = None
+    for ngram_start, ngram_end in sorted(seeds):
+        start_index = max(range_start, range_start + ngram_start - max_l_dist)
+        end_index = min(range_end,
+                        range_end - subseq_len + ngram_end + max_l_dist)
+        for index in search_exact_lazily(subsequence[ngram_start:ngram_end],
+                                         sequence, start_index, end_index):
+            # expanding from the previous n-gram has already failed here
+            if prev_ngram_start is not None:
+                prev_index = index - ngram_start + prev_ngram_start
+                if prev_index >= range_start and \
+                        sequence[prev_index:index] == \
+                        subsequence[prev_ngram_start:ngram_start]:
+                    continue
+
+            if _expand_ngram_match(
+                subsequence, sequence, ngram_start, ngram_end,
+                index, range_start, range_end, max_l_dist,
+            ) is not None:
+                return True
+
+        prev_ngram_start = ngram_start
+
+    return False
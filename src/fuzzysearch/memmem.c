@@ -89,7 +89,7 @@ char *simple_memmem(const char *haystack, size_t haystacklen,
     return NULL;
 }
 
-char *simple_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+char *scalar_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
                                     const char *needle, size_t needlelen,
                                     int needle_sum)
 {
@@ -158,3 +158,118 @@ char *simple_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
 
     return NULL;
 }
+
+
+#ifdef X86_SIMD
+
+/* The SIMD implementations compare the first two items and the last item
+   of the needle against many positions in the haystack at once, using
+   broadcast copies of these items.  The rest of the needle is only compared
+   at positions where all three of them match.  Positions too close to the
+   end of the haystack for a full block are handled by the next narrower
+   implementation. */
+
+/* Compare the rest of the needle at a position where its first two items
+   and its last item match. */
+#define REST_OF_NEEDLE_MATCHES(haystack_ptr, needle, needlelen)          \
+    ((needlelen) <= 3 ||                                                 \
+     memcmp((haystack_ptr) + 2, (needle) + 2, (needlelen) - 3) == 0)
+
+char *sse2_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+                                  const char *needle, size_t needlelen,
+                                  int needle_sum)
+{
+    __m128i first, second, last;
+    unsigned int mask;
+    size_t i, bit;
+
+    if (needlelen < 2 || haystacklen < needlelen + 15) {
+        return scalar_memmem_with_needle_sum(haystack, haystacklen,
+                                             needle, needlelen, needle_sum);
+    }
+
+    first = _mm_set1_epi8(needle[0]);
+    second = _mm_set1_epi8(needle[1]);
+    last = _mm_set1_epi8(needle[needlelen - 1]);
+    for (i = 0; i + needlelen + 15 <= haystacklen; i += 16) {
+        mask = (unsigned int) _mm_movemask_epi8(_mm_and_si128(
+            _mm_and_si128(
+                _mm_cmpeq_epi8(first, _mm_loadu_si128(
+                    (const __m128i *) (haystack + i))),
+                _mm_cmpeq_epi8(second, _mm_loadu_si128(
+                    (const __m128i *) (haystack + i + 1)))),
+            _mm_cmpeq_epi8(last, _mm_loadu_si128(
+                (const __m128i *) (haystack + i + needlelen - 1)))));
+        while (mask != 0) {
+            bit = (size_t) __builtin_ctz(mask);
+            if (REST_OF_NEEDLE_MATCHES(haystack + i + bit,
+                                       needle, needlelen)) {
+                return (char *) (haystack + i + bit);
+            }
+            mask &= mask - 1;
+        }
+    }
+
+    return scalar_memmem_with_needle_sum(haystack + i, haystacklen - i,
+                                         needle, needlelen, needle_sum);
+}
+
+__attribute__((target("avx2")))
+char *avx2_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+                                  const char *needle, size_t needlelen,
+                                  int needle_sum)
+{
+    __m256i first, second, last;
+    unsigned int mask;
+    size_t i, bit;
+
+    if (needlelen < 2 || haystacklen < needlelen + 31) {
+        return sse2_memmem_with_needle_sum(haystack, haystacklen,
+                                           needle, needlelen, needle_sum);
+    }
+
+    first = _mm256_set1_epi8(needle[0]);
+    second = _mm256_set1_epi8(needle[1]);
+    last = _mm256_set1_epi8(needle[needlelen - 1]);
+    for (i = 0; i + needlelen + 31 <= haystacklen; i += 32) {
+        mask = (unsigned int) _mm256_movemask_epi8(_mm256_and_si256(
+            _mm256_and_si256(
+                _mm256_cmpeq_epi8(first, _mm256_loadu_si256(
+                    (const __m256i *) (haystack + i))),
+                _mm256_cmpeq_epi8(second, _mm256_loadu_si256(
+                    (const __m256i *) (haystack + i + 1)))),
+            _mm256_cmpeq_epi8(last, _mm256_loadu_si256(
+                (const __m256i *) (haystack + i + needlelen - 1)))));
+        while (mask != 0) {
+            bit = (size_t) __builtin_ctz(mask);
+            if (REST_OF_NEEDLE_MATCHES(haystack + i + bit,
+                                       needle, needlelen)) {
+                return (char *) (haystack + i + bit);
+            }
+            mask &= mask - 1;
+        }
+    }
+
+    return sse2_memmem_with_needle_sum(haystack + i, haystacklen - i,
+                                       needle, needlelen, needle_sum);
+}
+#endif /* X86_SIMD */
+
+/* The fastest implementation supported by the CPU, chosen on first use. */
+static memmem_with_needle_sum_func memmem_with_needle_sum_impl = NULL;
+
+char *simple_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+                                    const char *needle, size_t needlelen,
+                                    int needle_sum)
+{
+    if (memmem_with_needle_sum_impl == NULL) {
+#ifdef X86_SIMD
+        memmem_with_needle_sum_impl = cpu_supports_avx2() ?
+            avx2_memmem_with_needle_sum : sse2_memmem_with_needle_sum;
+#else
+        memmem_with_needle_sum_impl = scalar_memmem_with_needle_sum;
+#endif
+    }
+    return memmem_with_needle_sum_impl(haystack, haystacklen,
+                                       needle, needlelen, needle_sum);
+}
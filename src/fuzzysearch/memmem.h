@@ -2,14 +2,39 @@
 #define MEMMEM_H
 
 #include <stddef.h>
+#include "src/fuzzysearch/simd.h"
 
 int calc_sum(const char *sequence, size_t sequence_len);
 
 char *simple_memmem(const char *haystack, size_t haystacklen,
                     const char *needle, size_t needlelen);
 
+/* Find the first occurrence of needle in haystack, using the fastest
+   implementation supported by the CPU.  needle_sum must be
+   calc_sum(needle, needlelen). */
 char *simple_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
                                     const char *needle, size_t needlelen,
                                     int needle_sum);
 
+typedef char *(*memmem_with_needle_sum_func)(const char *haystack,
+                                             size_t haystacklen,
+                                             const char *needle,
+                                             size_t needlelen,
+                                             int needle_sum);
+
+/* The implementations of simple_memmem_with_needle_sum().  The scalar one
+   uses a rolling sum of the haystack's items, only comparing the items
+   where it equals the needle's sum. */
+char *scalar_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+                                    const char *needle, size_t needlelen,
+                                    int needle_sum);
+#ifdef X86_SIMD
+char *sse2_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+                                  const char *needle, size_t needlelen,
+                                  int needle_sum);
+char *avx2_memmem_with_needle_sum(const char *haystack, size_t haystacklen,
+                                  const char *needle, size_t needlelen,
+                                  int needle_sum);
+#endif
+
 #endif /* MEMMEM_H */
@@ -0,0 +1,30 @@
+"""fuzzy searching allowing subsitutions and deletions, but no insertions"""
+
+__all__ = [
+    'find_near_matches_no_insertions_ngrams',
+    'NoInsertionsSearch',
+]
+
+from fuzzysearch.single_indel_type import DELETIONS, \
+    SingleIndelTypeSearch, find_near_matches_ngrams
+
+
+def find_near_matches_no_insertions_ngrams(subsequence, sequence,
+                                           search_params,
+                                           start_index=0, end_index=None):
+    """search for near-matches of subsequence in sequence
+
+    This searches for near-matches, where the nearly-matching parts of the
+    sequence must meet the following limitations (relative to the subsequence):
+
+    * the maximum allowed number of character substitutions
+    * no insertions are allowed
+    * the maximum allowed number of character deletions
+    * the total number of substitutions, insertions and deletions
+    """
+    return find_near_matches_ngrams(subsequence, sequence, search_params,
+                                    DELETIONS, start_index, end_index)
+
+
+class NoInsertionsSearch(SingleIndelTypeSearch):
+    edit_type = DELETIONS
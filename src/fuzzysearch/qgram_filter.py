@@ -0,0 +1,129 @@
+"""filtering by counting shared q-grams
+
+When the maximum number of errors is large compared with the length of the
+subsequence, the n-gram searches' exactly-matched parts would be too short
+to be useful, and the linear programming searches are used instead.  These
+examine every item of the sequence, which is slow.
+
+The q-gram lemma allows quickly ruling out most of the sequence beforehand:
+a part of the sequence within k edits of a subsequence of length m shares at
+least m - q + 1 - k * q of the subsequence's q-grams, since each edit can
+affect at most q of them.  Any part of the sequence containing a near-match
+is thus within a window of the maximal match length sharing at least that
+many q-grams with the subsequence.  Only windows passing this threshold need
+to be searched.
+"""
+from collections import Counter, deque
+from functools import wraps
+from itertools import islice
+
+from fuzzysearch.common import clamp_index_range
+
+__all__ = [
+    'qgram_threshold',
+    'find_candidate_regions',
+]
+
+
+def qgram_threshold(subseq_len, max_l_dist, q):
+    """The minimum number of q-grams shared with any near-match.
+
+    A result of zero or less means that the filter can't rule anything out.
+    """
+    return subseq_len - q + 1 - max_l_dist * q
+
+
+def find_candidate_regions(subsequence, sequence, max_l_dist,
+                           max_insertions=None,
+                           start_index=0, end_index=None):
+    """Find the parts of the sequence which may contain near-matches.
+
+    The q-gram length is chosen as the longest for which the filter is
+    usable, i.e. len(subsequence) // (max_l_dist + 1).  max_insertions
+    limits the length of the near-matches, and defaults to max_l_dist.
+
+    Returns a sorted list of non-overlapping (start, end) pairs, such that
+    every near-match in sequence[start_index:end_index] is entirely within
+    one of them.  If the filter isn't usable, None is returned instead.
+    """
+    subseq_len = len(subsequence)
+    q = subseq_len // (max_l_dist + 1)
+    if q == 0:
+        return None
+    if max_insertions is None:
+        max_insertions = max_l_dist
+    window_len = subseq_len + min(max_insertions, max_l_dist)
+
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+    return _find_candidate_regions(subsequence, sequence, q,
+                                   qgram_threshold(subseq_len, max_l_dist, q),
+                                   window_len, start_index, end_index)
+
+
+def _qgrams(sequence, q, start_index=0, end_index=None):
+    return zip(*[
+        islice(sequence, start_index + offset, end_index)
+        for offset in range(q)
+    ])
+
+
+def _find_candidate_regions(subsequence, sequence, q, threshold, window_len,
+                            start_index, end_index):
+    subseq_counts = Counter(_qgrams(subsequence, q))
+    window_counts = Counter()
+    # the q-grams starting in the current window
+    window_qgrams = deque()
+    max_window_qgrams = window_len - q + 1
+    n_shared = 0
+
+    regions = []
+    region_start = region_end = None
+    for index, qgram in enumerate(_qgrams(sequence, q,
+                                          start_index, end_index),
+                                  start_index):
+        if len(window_qgrams) == max_window_qgrams:
+            removed = window_qgrams.popleft()
+            window_counts[removed] -= 1
+            if window_counts[removed] < subseq_counts[removed]:
+                n_shared -= 1
+        window_qgrams.append(qgram)
+        if window_counts[qgram] < subseq_counts[qgram]:
+            n_shared += 1
+        window_counts[qgram] += 1
+
+        if n_shared >= threshold:
+            window_start = max(start_index, index + q - window_len)
+            if region_end is not None and window_start <= region_end:
+                region_end = index + q
+            else:
+                if region_end is not None:
+                    regions.append((region_start, region_end))
+                region_start, region_end = window_start, index + q
+
+    if region_end is not None:
+        regions.append((region_start, region_end))
+    return regions
+
+
+try:
+    from fuzzysearch._common import find_candidate_regions_byteslike
+except ImportError:
+    pass
+else:
+    _py_find_candidate_regions = _find_candidate_regions
+
+    @wraps(_py_find_candidate_regions)
+    def _find_candidate_regions(subsequence, sequence, q, threshold,
+                                window_len, start_index, end_index):
+        # the C implementation only supports q-grams of up to two bytes
+        if q <= 2:
+            try:
+                return find_candidate_regions_byteslike(
+                    subsequence, sequence, q, threshold, window_len,
+                    start_index, end_index)
+            except TypeError:
+                pass
+        return _py_find_candidate_regions(subsequence, sequence, q,
+                                          threshold, window_len,
+                                          start_index, end_index)
@@ -1,9 +1,12 @@
+from array import array
 from functools import wraps
 
-from fuzzysearch.common import FuzzySearchBase, Match, clamp
+from fuzzysearch.common import FuzzySearchBase, Match, MatchArray, \
+    clamp_index_range
 
 __all__ = [
     'search_exact',
+    'has_exact_match',
     'ExactSearch',
 ]
 
@@ -23,11 +26,8 @@ def search_exact(subsequence, sequence, start_index=0, end_index=None):
     if not subsequence:
         raise ValueError('subsequence must not be empty')
 
-    if end_index is None:
-        end_index = len(sequence)
-
-    start_index = clamp(start_index, min_value=0, max_value=len(sequence))
-    end_index = clamp(end_index, min_value=start_index, max_value=len(sequence))
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
 
     if isinstance(sequence, CLASSES_WITH_FIND):
         def find_in_index_range(start_index):
@@ -56,6 +56,12 @@ def search_exact(subsequence, sequence, start_index=0, end_index=None):
         index = find_in_index_range(index + 1)
 
 
+# search_exact() may be replaced below by a C implementation which finds all
+# of the matches at once; this finds them a few at a time, for searches which
+# can stop at the first match.
+search_exact_lazily = search_exact
+
+
 try:
     from fuzzysearch._common import search_exact_byteslike
 except ImportError:
@@ -64,11 +70,8 @@ else:
     _search_exact = search_exact
     @wraps(_search_exact)
     def search_exact(subsequence, sequence, start_index=0, end_index=None):
-        if end_index is None:
-            end_index = len(sequence)
-
-        start_index = clamp(start_index, min_value=0, max_value=len(sequence))
-        end_index = clamp(end_index, min_value=start_index, max_value=len(sequence))
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
 
         try:
             return search_exact_byteslike(subsequence, sequence,
@@ -76,14 +79,93 @@ else:
         except (TypeError, UnicodeEncodeError):
             return _search_exact(subsequence, sequence, start_index, end_index)
 
+    _py_search_exact_lazily = search_exact_lazily
+    @wraps(_py_search_exact_lazily)
+    def search_exact_lazily(subsequence, sequence,
+                            start_index=0, end_index=None):
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
+
+        # find the matches in batches of growing sizes, so that stopping at
+        # the first match is quick, and scanning for many is still cheap
+        max_matches = 1
+        try:
+            indexes = search_exact_byteslike(subsequence, sequence,
+                                             start_index, end_index,
+                                             max_matches)
+        except (TypeError, UnicodeEncodeError):
+            for index in _py_search_exact_lazily(subsequence, sequence,
+                                                 start_index, end_index):
+                yield index
+            return
+        while indexes:
+            for index in indexes:
+                yield index
+            if len(indexes) < max_matches:
+                return
+            max_matches = min(max_matches * 2, 1024)
+            indexes = search_exact_byteslike(subsequence, sequence,
+                                             indexes[-1] + 1, end_index,
+                                             max_matches)
+
+
+def has_exact_match(subsequence, sequence, start_index=0, end_index=None):
+    """Check whether the subsequence appears anywhere in the sequence.
+
+    Unlike search_exact(), this stops searching at the first match found.
+    """
+    if not subsequence:
+        raise ValueError('subsequence must not be empty')
+
+    if isinstance(sequence, CLASSES_WITH_FIND):
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
+        return sequence.find(subsequence, start_index, end_index) != -1
+    for _index in search_exact(subsequence, sequence, start_index, end_index):
+        return True
+    return False
+
+
+def _check_no_equivalences(equivalences):
+    if equivalences is not None:
+        raise ValueError('exact searching does not support equivalence tables')
+
 
 class ExactSearch(FuzzySearchBase):
     @classmethod
-    def search(cls, subsequence, sequence, search_params):
-        for index in search_exact(subsequence, sequence):
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
+        _check_no_equivalences(equivalences)
+        for index in search_exact(subsequence, sequence,
+                                  start_index, end_index):
             yield Match(index, index + len(subsequence), 0,
                         sequence[index:index + len(subsequence)])
 
+    @classmethod
+    def has_match(cls, subsequence, sequence, search_params,
+                  start_index=0, end_index=None, equivalences=None,
+                  seed_profile=None):
+        _check_no_equivalences(equivalences)
+        return has_exact_match(subsequence, sequence, start_index, end_index)
+
+    @classmethod
+    def count_matches(cls, subsequence, sequence, search_params,
+                      start_index=0, end_index=None, equivalences=None):
+        _check_no_equivalences(equivalences)
+        return sum(1 for _index in search_exact(subsequence, sequence,
+                                                start_index, end_index))
+
+    @classmethod
+    def search_columns(cls, subsequence, sequence, search_params,
+                       start_index=0, end_index=None, equivalences=None):
+        _check_no_equivalences(equivalences)
+        starts = array('q', search_exact(subsequence, sequence,
+                                         start_index, end_index))
+        ends = array('q', map(len(subsequence).__add__, starts))
+        dists = array('q', bytes(starts.itemsize * len(starts)))
+        return MatchArray(starts, ends, dists)
+
     @classmethod
     def extra_items_for_chunked_search(cls, subsequence, search_params):
         return 0
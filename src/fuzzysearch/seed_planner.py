@@ -0,0 +1,185 @@
+"""choosing the exactly-matched parts ("seeds") of n-gram searches
+
+The n-gram searches rely on the pigeonhole principle: if a part of the
+sequence is within k edits of the subsequence, then at least one of any k+1
+non-overlapping parts of the subsequence appears in it exactly.  By default,
+the subsequence is split into k+1 or more equal parts.  For low-complexity
+subsequences or sequences, some of these may appear very often in the
+sequence, making the search slow.
+
+The seed planner instead chooses the k+1 parts with the lowest expected
+number of appearances in the sequence, estimated using the frequencies of
+short q-grams in a sample of the sequence or of a similar sequence.
+"""
+from collections import Counter
+
+from attr import attrs, attrib
+
+__all__ = [
+    'SequenceProfile',
+    'plan_seeds',
+    'equal_seeds',
+    'choose_seeds',
+    'any_seed_matches_at',
+]
+
+
+@attrs(frozen=True, slots=True)
+class SequenceProfile(object):
+    """The frequencies of the q-grams in a sequence.
+
+    counts[n] is a Counter of the n-grams for each n from 1 to q, as tuples
+    of items, and counts[0] holds the total number of items under the key
+    ().  Use from_sequence() to create a profile.
+    """
+    q = attrib()
+    counts = attrib()
+
+    @classmethod
+    def from_sequence(cls, sequence, q=3, sample_size=2**16, n_blocks=16):
+        """Create a profile from a sequence, or from a sample of it.
+
+        If the sequence is longer than sample_size, only n_blocks evenly
+        spaced blocks of it, of sample_size items overall, are counted.
+        """
+        if not (isinstance(q, int) and q > 0):
+            raise TypeError('q must be a positive integer')
+        if len(sequence) <= sample_size:
+            blocks = [sequence]
+        else:
+            block_len = max(q, sample_size // n_blocks)
+            step = (len(sequence) - block_len) // max(1, n_blocks - 1)
+            blocks = [
+                sequence[block_start:block_start + block_len]
+                for block_start in range(0, len(sequence) - block_len + 1,
+                                         step)
+            ][:n_blocks]
+
+        counts = [Counter({(): sum(map(len, blocks))})]
+        counts.extend(Counter() for _n in range(q))
+        for block in blocks:
+            for n in range(1, q + 1):
+                counts[n].update(zip(*[block[i:] for i in range(n)]))
+        return cls(q, counts)
+
+    def conditional_probability(self, ngram):
+        """Estimate the probability of ngram[-1] following ngram[:-1].
+
+        ngram must be a tuple of at most q items.  Add-one smoothing is
+        used, so that unseen n-grams aren't considered impossible.
+        """
+        alphabet_size = len(self.counts[1]) + 1
+        return (
+            (self.counts[len(ngram)][ngram] + 1) /
+            (self.counts[len(ngram) - 1][ngram[:-1]] + alphabet_size)
+        )
+
+    def probability(self, items):
+        """Estimate the probability of items appearing at a given index.
+
+        This uses a Markov model of order q-1.
+        """
+        items = tuple(items)
+        probability = 1.0
+        for index in range(len(items)):
+            probability *= self.conditional_probability(
+                items[max(0, index + 1 - self.q):index + 1])
+        return probability
+
+
+def equal_seeds(subseq_len, ngram_len):
+    """Split a subsequence into consecutive seeds of equal length.
+
+    This is the default used by the n-gram searches.  Any items which
+    remain at the end of the subsequence are not included in any seed.
+    """
+    return [
+        (ngram_start, ngram_start + ngram_len)
+        for ngram_start in range(0, subseq_len - ngram_len + 1, ngram_len)
+    ]
+
+
+def plan_seeds(subsequence, n_seeds, profile, max_seed_len=None):
+    """Choose non-overlapping seeds with the lowest expected appearances.
+
+    Returns a sorted list of n_seeds (start, end) pairs of indexes into the
+    subsequence.  The sum of the seeds' probabilities according to the
+    profile is minimized, with each seed at most max_seed_len items long.
+    """
+    subseq_len = len(subsequence)
+    if not (isinstance(n_seeds, int) and n_seeds > 0):
+        raise TypeError('n_seeds must be a positive integer')
+    if n_seeds > subseq_len:
+        raise ValueError('n_seeds must be no larger than len(subsequence)')
+    if max_seed_len is None:
+        # longer seeds are hardly ever much less likely, but they make
+        # planning slower
+        max_seed_len = max(1, min(subseq_len // n_seeds * 2, 64))
+
+    items = tuple(subsequence)
+    # costs[start][length - 1] is the probability of the seed
+    # items[start:start + length], calculated incrementally
+    costs = []
+    for start in range(subseq_len):
+        seed_costs = []
+        probability = 1.0
+        for seed_end in range(start + 1,
+                              min(subseq_len, start + max_seed_len) + 1):
+            probability *= profile.conditional_probability(
+                items[max(start, seed_end - profile.q):seed_end])
+            seed_costs.append(probability)
+        costs.append(seed_costs)
+
+    # best[n][index] is the lowest total cost of n seeds within
+    # items[:index], and choices[n][index] is the last of those seeds
+    infinity = float('inf')
+    best = [[0.0] * (subseq_len + 1)] + \
+        [[infinity] * (subseq_len + 1) for _n in range(n_seeds)]
+    choices = [[None] * (subseq_len + 1) for _n in range(n_seeds + 1)]
+    for n in range(1, n_seeds + 1):
+        for index in range(1, subseq_len + 1):
+            # skip the item before index
+            best[n][index] = best[n][index - 1]
+            choices[n][index] = choices[n][index - 1]
+            # or end a seed at index
+            for start in range(max(0, index - max_seed_len), index):
+                cost = best[n - 1][start] + costs[start][index - start - 1]
+                if cost < best[n][index]:
+                    best[n][index] = cost
+                    choices[n][index] = (start, index)
+
+    seeds = []
+    index = subseq_len
+    for n in range(n_seeds, 0, -1):
+        start, end = choices[n][index]
+        seeds.append((start, end))
+        index = start
+    return seeds[::-1]
+
+
+def choose_seeds(subsequence, max_errors, seed_profile):
+    """Choose the seeds for an n-gram search allowing up to max_errors.
+
+    Returns None if seed_profile is None, meaning that the search's default
+    seeds should be used.
+    """
+    if seed_profile is None:
+        return None
+    return plan_seeds(subsequence, max_errors + 1, seed_profile)
+
+
+def any_seed_matches_at(subsequence, sequence, seeds, subseq_start,
+                        range_start=0):
+    """Check whether any of the seeds match exactly at a given alignment.
+
+    The alignment is given by subseq_start, the index in the sequence where
+    the subsequence would begin.  Seeds which would begin before
+    range_start are ignored, since they aren't searched for there.
+    """
+    for seed_start, seed_end in seeds:
+        seq_start = subseq_start + seed_start
+        if seq_start >= range_start and \
+                sequence[seq_start:subseq_start + seed_end] == \
+                subsequence[seed_start:seed_end]:
+            return True
+    return False
@@ -0,0 +1,17 @@
+#ifndef SIMD_H
+#define SIMD_H
+
+/* SSE2 is always available on x86-64; AVX2 is detected at runtime.  Other
+   platforms and compilers only use the scalar implementations. */
+#if (defined(__x86_64__) || defined(__amd64__)) && \
+    (defined(__GNUC__) || defined(__clang__))
+#define X86_SIMD
+#include <immintrin.h>
+
+static inline int cpu_supports_avx2(void) {
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("avx2") != 0;
+}
+#endif
+
+#endif /* SIMD_H */
@@ -0,0 +1,354 @@
+"""n-gram searches allowing substitutions and only one kind of indel
+
+The searches which don't allow deletions and those which don't allow
+insertions work the same way: the subsequence is split into n-grams, more
+than the maximum number of edits, so that at least one of them must appear
+unchanged in any near-match.  Each n-gram is searched for exactly, and
+wherever it is found, the parts of the subsequence before and after it are
+matched to the sequence around it, allowing substitutions and the given kind
+of indel.
+
+edit_type is INSERTIONS when only insertions are allowed, or DELETIONS when
+only deletions are allowed.
+"""
+import array
+from functools import wraps
+
+from fuzzysearch.common import FuzzySearchBase, Match, clamp_index_range, \
+    consolidate_overlapping_matches, count_overlapping_match_groups
+from fuzzysearch.generic_search import GenericSearch, \
+    with_max_lp_candidates
+from fuzzysearch.search_exact import search_exact
+
+__all__ = [
+    'INSERTIONS',
+    'DELETIONS',
+    'expand_insertions',
+    'expand_deletions',
+    'choose_ngram_len',
+    'is_expected_faster',
+    'find_near_matches_ngrams',
+    'SingleIndelTypeSearch',
+]
+
+
+INSERTIONS = 'insertions'
+DELETIONS = 'deletions'
+
+
+def _check_edit_type(edit_type):
+    if edit_type not in (INSERTIONS, DELETIONS):
+        raise ValueError('edit_type must be either %r or %r' %
+                         (INSERTIONS, DELETIONS))
+
+
+def expand_insertions(subsequence, sequence, max_substitutions,
+                      max_insertions, max_l_dist):
+    """Find the ways of matching the subsequence to a prefix of the sequence.
+
+    Returns a list of (n_subs, n_ins) pairs within the given limits, with the
+    minimal number of substitutions for each number of insertions, sorted by
+    increasing number of insertions.
+    """
+    # insertions can't take the match beyond the end of the sequence
+    max_insertions = min(max_insertions, len(sequence) - len(subsequence))
+    if max_insertions < 0:
+        return []
+
+    # Calculate the minimum number of substitutions required for each number
+    # of insertions between 0 and max_insertions.
+    #
+    # This is done using a "dynamic programming" algorithm.
+    n_subs = array.array('L', [0] * (max_insertions + 1))
+    for subseq_index, char in enumerate(subsequence):
+        n_subs[0] += (char != sequence[subseq_index])
+        for n_ins in range(1, max_insertions + 1):
+            n_subs[n_ins] = min(
+                n_subs[n_ins] + (char != sequence[subseq_index + n_ins]),
+                n_subs[n_ins - 1]
+            )
+        # n_subs[max_insertions] is the smallest, and these never decrease
+        if n_subs[max_insertions] > max_substitutions:
+            return []
+
+    return [
+        (_n_subs, _n_ins) for (_n_ins, _n_subs) in enumerate(n_subs)
+        if _n_subs <= max_substitutions
+        and _n_ins + _n_subs <= max_l_dist
+    ]
+
+
+def expand_deletions(subsequence, sequence, max_substitutions,
+                     max_deletions, max_l_dist):
+    """Find the ways of matching the subsequence to a prefix of the sequence.
+
+    Returns a list of (n_subs, n_dels) pairs within the given limits, with the
+    minimal number of substitutions for each number of deletions, sorted by
+    increasing number of deletions.
+    """
+    subseq_len = len(subsequence)
+    max_deletions = min(max_deletions, subseq_len)
+
+    # Calculate the minimum number of substitutions required for each number
+    # of deletions between 0 and max_deletions, where n_dels deletions match
+    # the subsequence to the first len(subsequence) - n_dels sequence items.
+    #
+    # This is done using a "dynamic programming" algorithm, going over the
+    # sequence's items.  After processing the item at seq_index, n_subs[n_dels]
+    # is the minimum for matching the items up to and including it to the
+    # first seq_index + n_dels + 1 subsequence items.
+    n_subs = array.array('L', [0] * (max_deletions + 1))
+    final_n_subs = [None] * (max_deletions + 1)
+    if max_deletions == subseq_len:
+        final_n_subs[max_deletions] = 0
+    for seq_index in range(min(len(sequence), subseq_len)):
+        char = sequence[seq_index]
+        # with more deletions, the subsequence would already be exhausted
+        last_n_dels = min(max_deletions, subseq_len - seq_index - 1)
+        n_subs[0] += (char != subsequence[seq_index])
+        for n_dels in range(1, last_n_dels + 1):
+            n_subs[n_dels] = min(
+                n_subs[n_dels] + (char != subsequence[seq_index + n_dels]),
+                n_subs[n_dels - 1]
+            )
+        if last_n_dels == subseq_len - seq_index - 1:
+            final_n_subs[last_n_dels] = n_subs[last_n_dels]
+        # n_subs[last_n_dels] is the smallest, and these never decrease
+        if n_subs[last_n_dels] > max_substitutions:
+            break
+
+    return [
+        (_n_subs, _n_dels) for (_n_dels, _n_subs) in enumerate(final_n_subs)
+        if _n_subs is not None
+        and _n_subs <= max_substitutions
+        and _n_dels + _n_subs <= max_l_dist
+    ]
+
+
+def choose_ngram_len(subseq_len, max_substitutions, max_indels, max_l_dist):
+    """Choose the length of the n-grams to split the subsequence into.
+
+    max_indels is the maximum number of insertions or deletions, whichever
+    are allowed.  Returns 0 if the subsequence is too short to be split.
+    """
+    # at most this many of the n-grams may include an edit
+    max_edits = min(max_substitutions + max_indels, max_l_dist)
+    return subseq_len // (max_edits + 1)
+
+
+def is_expected_faster(subsequence, max_substitutions, max_indels,
+                       max_l_dist, equivalences=None):
+    """Check whether an n-gram search is expected to beat a generic search.
+
+    Searching for n-grams shorter than three items is slow, since they
+    match by chance at very many places.  The n-gram search can't honor an
+    equivalence table.
+    """
+    return equivalences is None and choose_ngram_len(
+        len(subsequence), max_substitutions, max_indels, max_l_dist) >= 3
+
+
+def find_near_matches_ngrams(subsequence, sequence, search_params, edit_type,
+                             start_index=0, end_index=None):
+    """search for near-matches of subsequence in sequence
+
+    This searches for near-matches, where the nearly-matching parts of the
+    sequence must meet the following limitations (relative to the subsequence):
+
+    * the maximum allowed number of character substitutions
+    * the maximum allowed number of insertions or deletions, according to
+      edit_type; the other kind of indel is not allowed
+    * the total number of substitutions, insertions and deletions
+    """
+    _check_edit_type(edit_type)
+    if not subsequence:
+        raise ValueError('Given subsequence is empty!')
+
+    max_substitutions, max_insertions, max_deletions, max_l_dist = \
+        search_params.unpacked
+    max_indels = max_insertions if edit_type == INSERTIONS else max_deletions
+
+    max_substitutions = min(max_substitutions, max_l_dist)
+    max_indels = min(max_indels, max_l_dist)
+
+    ngram_len = choose_ngram_len(len(subsequence), max_substitutions,
+                                 max_indels, max_l_dist)
+    if ngram_len == 0:
+        raise ValueError(
+            "The subsequence's length must be greater than max_subs + %s!" %
+            ('max_ins' if edit_type == INSERTIONS else 'max_dels')
+        )
+
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
+
+    alignments = _find_alignments(subsequence, sequence, ngram_len,
+                                  max_substitutions, max_indels, max_l_dist,
+                                  start_index, end_index, edit_type)
+
+    return [
+        Match(start, end, dist, matched=sequence[start:end])
+        for (start, end, dist) in sorted(set(alignments))
+    ]
+
+
+def _find_alignments(subsequence, sequence, ngram_len,
+                     max_substitutions, max_indels, max_l_dist,
+                     start_index, end_index, edit_type):
+    """Find the near-matches as (start, end, dist) tuples.
+
+    The same near-match may be found via several n-grams, and is then
+    included once for each of them.
+    """
+    subseq_len = len(subsequence)
+    if edit_type == INSERTIONS:
+        expand = expand_insertions
+        # insertions make the match longer than the subsequence
+        indel_sign = 1
+    else:
+        expand = expand_deletions
+        indel_sign = -1
+    alignments = []
+
+    for ngram_start in range(0, subseq_len - ngram_len + 1, ngram_len):
+        ngram_end = ngram_start + ngram_len
+        subseq_before_reversed = subsequence[:ngram_start][::-1]
+        subseq_after = subsequence[ngram_end:]
+
+        if edit_type == INSERTIONS:
+            # insertions may only move the n-gram further from the match's
+            # start
+            search_start = start_index + ngram_start
+            search_end = end_index - len(subseq_after)
+        else:
+            # deletions may only move the n-gram closer to the match's start
+            search_start = max(start_index,
+                               start_index + ngram_start - max_indels)
+            search_end = min(end_index,
+                             end_index - len(subseq_after) + max_indels)
+        if search_end - search_start < ngram_len:
+            continue
+
+        for index in search_exact(subsequence[ngram_start:ngram_end],
+                                  sequence, search_start, search_end):
+            seq_after = sequence[
+                index + ngram_len:
+                min(end_index, index + ngram_len + len(subseq_after) +
+                    (max_indels if edit_type == INSERTIONS else 0))
+            ]
+            # all of the ways of matching are needed, not just the best,
+            # since e.g. anchored searches filter the matches by position
+            matches_after = expand(subseq_after, seq_after,
+                                   max_substitutions, max_indels, max_l_dist)
+            if not matches_after:
+                continue
+
+            _max_substitutions = \
+                max_substitutions - min(m[0] for m in matches_after)
+            _max_indels = max_indels - min(m[1] for m in matches_after)
+            _max_l_dist = max_l_dist - min(m[0] + m[1] for m in matches_after)
+            seq_before = sequence[
+                max(start_index,
+                    index - ngram_start -
+                    (_max_indels if edit_type == INSERTIONS else 0)):
+                index
+            ]
+            matches_before = expand(
+                subseq_before_reversed, seq_before[::-1],
+                _max_substitutions, _max_indels, _max_l_dist,
+            )
+
+            for (subs_before, indels_before) in matches_before:
+                for (subs_after, indels_after) in matches_after:
+                    n_subs = subs_before + subs_after
+                    n_indels = indels_before + indels_after
+                    if (
+                            n_subs <= max_substitutions and
+                            n_indels <= max_indels and
+                            n_subs + n_indels <= max_l_dist
+                    ):
+                        alignments.append((
+                            index - ngram_start - indel_sign * indels_before,
+                            index + ngram_len + len(subseq_after) +
+                            indel_sign * indels_after,
+                            n_subs + n_indels,
+                        ))
+
+    return alignments
+
+
+try:
+    from fuzzysearch._common import find_no_deletions_alignments_byteslike, \
+        find_no_insertions_alignments_byteslike
+except ImportError:
+    pass
+else:
+    _py_find_alignments = _find_alignments
+
+    @wraps(_py_find_alignments)
+    def _find_alignments(subsequence, sequence, ngram_len,
+                         max_substitutions, max_indels, max_l_dist,
+                         start_index, end_index, edit_type):
+        if edit_type == INSERTIONS:
+            find_alignments_byteslike = find_no_deletions_alignments_byteslike
+        else:
+            find_alignments_byteslike = find_no_insertions_alignments_byteslike
+        try:
+            return find_alignments_byteslike(
+                subsequence, sequence, ngram_len,
+                max_substitutions, max_indels, max_l_dist,
+                start_index, end_index)
+        except (TypeError, UnicodeEncodeError):
+            return _py_find_alignments(subsequence, sequence, ngram_len,
+                                       max_substitutions, max_indels,
+                                       max_l_dist, start_index, end_index,
+                                       edit_type)
+
+
+class SingleIndelTypeSearch(FuzzySearchBase):
+    """Base class for the searches allowing only one kind of indel.
+
+    Sub-classes set edit_type.
+    """
+    edit_type = None
+    # see GenericSearch.max_lp_candidates
+    max_lp_candidates = None
+
+    @classmethod
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
+        # equivalence tables and subsequences too short to be split into
+        # long enough n-grams are handled by the generic search
+        max_substitutions, max_insertions, max_deletions, max_l_dist = \
+            search_params.unpacked
+        max_indels = \
+            max_insertions if cls.edit_type == INSERTIONS else max_deletions
+        if is_expected_faster(subsequence, max_substitutions, max_indels,
+                              max_l_dist, equivalences):
+            return find_near_matches_ngrams(subsequence, sequence,
+                                            search_params, cls.edit_type,
+                                            start_index, end_index)
+        generic_search = GenericSearch
+        if cls.max_lp_candidates is not None:
+            generic_search = with_max_lp_candidates(GenericSearch,
+                                                    cls.max_lp_candidates)
+        return generic_search.search(subsequence, sequence, search_params,
+                                     start_index, end_index, equivalences,
+                                     seed_profile)
+
+    @classmethod
+    def consolidate_matches(cls, matches):
+        return consolidate_overlapping_matches(matches)
+
+    @classmethod
+    def count_matches(cls, subsequence, sequence, search_params,
+                      start_index=0, end_index=None, equivalences=None):
+        matches = cls.search(subsequence, sequence, search_params,
+                             start_index, end_index, equivalences)
+        return count_overlapping_match_groups(matches)
+
+    @classmethod
+    def extra_items_for_chunked_search(cls, subsequence, search_params):
+        return GenericSearch.extra_items_for_chunked_search(subsequence,
+                                                            search_params)
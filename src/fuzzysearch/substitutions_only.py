@@ -1,10 +1,13 @@
-from collections import deque, defaultdict
+from array import array
+from collections import deque
 from itertools import islice
 from functools import wraps
 
-from fuzzysearch.common import FuzzySearchBase, Match, \
-    count_differences_with_maximum, get_best_match_in_group, group_matches
-from fuzzysearch.search_exact import search_exact
+from fuzzysearch.common import FuzzySearchBase, Match, MatchArray, \
+    count_differences_with_maximum, clamp_index_range, SubsequenceIndexes
+from fuzzysearch.search_exact import search_exact, has_exact_match
+from fuzzysearch.seed_planner import equal_seeds, choose_seeds, \
+    any_seed_matches_at
 
 
 def _check_arguments(subsequence, sequence, max_substitutions):
@@ -15,56 +18,103 @@ def _check_arguments(subsequence, sequence, max_substitutions):
         raise ValueError('Maximum number of substitutions must be >= 0!')
 
 
-def has_near_match_substitutions(subsequence, sequence, max_substitutions):
+def has_near_match_substitutions(subsequence, sequence, max_substitutions,
+                                 start_index=0, end_index=None,
+                                 equivalences=None, seed_profile=None):
     _check_arguments(subsequence, sequence, max_substitutions)
 
-    if max_substitutions == 0:
-        for start_index in search_exact(subsequence, sequence):
-            return True
-        return False
+    # the exact and n-gram searches can't honor an equivalence table
+    if equivalences is not None:
+        return has_near_match_substitutions_lp(
+            subsequence, sequence, max_substitutions, start_index, end_index,
+            equivalences,
+        )
+
+    elif max_substitutions == 0:
+        return has_exact_match(subsequence, sequence, start_index, end_index)
 
     elif len(subsequence) // (max_substitutions + 1) >= 3:
         return has_near_match_substitutions_ngrams(
-            subsequence, sequence, max_substitutions,
+            subsequence, sequence, max_substitutions, start_index, end_index,
+            choose_seeds(subsequence, max_substitutions, seed_profile),
         )
 
     else:
         return has_near_match_substitutions_lp(
-            subsequence, sequence, max_substitutions,
+            subsequence, sequence, max_substitutions, start_index, end_index,
         )
 
 
-def find_near_matches_substitutions(subsequence, sequence, max_substitutions):
+def find_near_matches_substitutions(subsequence, sequence, max_substitutions,
+                                    start_index=0, end_index=None,
+                                    equivalences=None, seed_profile=None):
     """Find near-matches of the subsequence in the sequence.
 
     This chooses a suitable fuzzy search implementation according to the given
     parameters.
 
+    Only sequence[start_index:end_index] is searched, but the indexes of the
+    matches are relative to the start of the entire sequence.
+
+    If an EquivalenceTable is given, items are compared according to it.
+
+    If a fuzzysearch.seed_planner.SequenceProfile is given as seed_profile,
+    the parts of the subsequence used by the n-gram search are chosen
+    according to it.
+
     Returns a list of fuzzysearch.Match objects describing the matching parts
     of the sequence.
     """
     _check_arguments(subsequence, sequence, max_substitutions)
 
-    if max_substitutions == 0:
+    # the exact and n-gram searches can't honor an equivalence table
+    if equivalences is not None:
+        return find_near_matches_substitutions_lp(
+            subsequence, sequence, max_substitutions, start_index, end_index,
+            equivalences,
+        )
+
+    elif max_substitutions == 0:
         return [
-            Match(start_index, start_index + len(subsequence), 0,
-                  sequence[start_index:start_index + len(subsequence)])
-            for start_index in search_exact(subsequence, sequence)
+            Match(index, index + len(subsequence), 0,
+                  sequence[index:index + len(subsequence)])
+            for index in search_exact(subsequence, sequence,
+                                      start_index, end_index)
         ]
 
     elif len(subsequence) // (max_substitutions + 1) >= 3:
         return find_near_matches_substitutions_ngrams(
-            subsequence, sequence, max_substitutions,
+            subsequence, sequence, max_substitutions, start_index, end_index,
+            choose_seeds(subsequence, max_substitutions, seed_profile),
         )
 
     else:
         return find_near_matches_substitutions_lp(
-            subsequence, sequence, max_substitutions,
+            subsequence, sequence, max_substitutions, start_index, end_index,
         )
 
 
+def find_near_matches_substitutions_columns(subsequence, sequence,
+                                            max_substitutions,
+                                            start_index=0, end_index=None,
+                                            equivalences=None):
+    """Find near-matches of the subsequence in the sequence.
+
+    This is the same as find_near_matches_substitutions(), but returns a
+    fuzzysearch.common.MatchArray rather than a list of Match objects.
+    """
+    return MatchArray.from_matches(
+        find_near_matches_substitutions(subsequence, sequence,
+                                        max_substitutions,
+                                        start_index, end_index,
+                                        equivalences)
+    )
+
+
 def find_near_matches_substitutions_lp(subsequence, sequence,
-                                       max_substitutions):
+                                       max_substitutions,
+                                       start_index=0, end_index=None,
+                                       equivalences=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -76,27 +126,33 @@ def find_near_matches_substitutions_lp(subsequence, sequence,
     _check_arguments(subsequence, sequence, max_substitutions)
 
     return list(_find_near_matches_substitutions_lp(subsequence, sequence,
-                                                    max_substitutions))
+                                                    max_substitutions,
+                                                    start_index, end_index,
+                                                    equivalences))
 
 
 def _find_near_matches_substitutions_lp(subsequence, sequence,
-                                        max_substitutions):
+                                        max_substitutions,
+                                        start_index=0, end_index=None,
+                                        equivalences=None):
     # simple optimization: prepare some often used things in advance
     _SUBSEQ_LEN = len(subsequence)
     _SUBSEQ_LEN_MINUS_ONE = _SUBSEQ_LEN - 1
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
 
     def make_match(start, end, dist):
         return Match(start, end, dist, matched=sequence[start:end])
 
     # prepare quick lookup of where a character appears in the subsequence
-    char_indexes_in_subsequence = defaultdict(list)
-    for (index, char) in enumerate(subsequence):
-        char_indexes_in_subsequence[char].append(index)
+    char_indexes_in_subsequence = SubsequenceIndexes(subsequence,
+                                                     equivalences)
 
     # we'll iterate over the sequence once, but the iteration is split into two
     # for loops; therefore we prepare an iterator in advance which will be used
     # in both of the loops
-    sequence_enum_iter = enumerate(sequence)
+    sequence_enum_iter = enumerate(islice(sequence, start_index, end_index),
+                                   start_index)
 
     # We'll count the number of matching characters assuming various attempted
     # alignments of the subsequence to the sequence. At any point in the
@@ -108,7 +164,8 @@ def _find_near_matches_substitutions_lp(subsequence, sequence,
     # the sequence. No possible matches in this step!
     candidates = deque([0], maxlen=_SUBSEQ_LEN)
     for (index, char) in islice(sequence_enum_iter, _SUBSEQ_LEN_MINUS_ONE):
-        for subseq_index in [idx for idx in char_indexes_in_subsequence[char] if idx <= index]:
+        for subseq_index in [idx for idx in char_indexes_in_subsequence[char]
+                             if idx <= index - start_index]:
             candidates[subseq_index] += 1
         candidates.appendleft(0)
 
@@ -136,17 +193,23 @@ def _find_near_matches_substitutions_lp(subsequence, sequence,
             )
 
 
-def has_near_match_substitutions_lp(subsequence, sequence, max_substitutions):
+def has_near_match_substitutions_lp(subsequence, sequence, max_substitutions,
+                                    start_index=0, end_index=None,
+                                    equivalences=None):
     _check_arguments(subsequence, sequence, max_substitutions)
 
     for match in _find_near_matches_substitutions_lp(subsequence, sequence,
-                                                     max_substitutions):
+                                                     max_substitutions,
+                                                     start_index, end_index,
+                                                     equivalences):
         return True
     return False
 
 
 def find_near_matches_substitutions_ngrams(subsequence, sequence,
-                                           max_substitutions):
+                                           max_substitutions,
+                                           start_index=0, end_index=None,
+                                           seeds=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -154,41 +217,60 @@ def find_near_matches_substitutions_ngrams(subsequence, sequence,
 
     * the number of character substitutions must be less than max_substitutions
     * no deletions or insertions are allowed
+
+    seeds may be given as a list of at least max_substitutions + 1
+    non-overlapping (start, end) parts of the subsequence to search for
+    exactly.  By default, the subsequence is split into equal parts.
+
+    All of the matches are returned, including overlapping ones, ordered by
+    their start indexes.
     """
     _check_arguments(subsequence, sequence, max_substitutions)
 
-    match_starts = set()
-    matches = []
-    for match in _find_near_matches_substitutions_ngrams(subsequence, sequence,
-                                                         max_substitutions):
-        if match.start not in match_starts:
-            match_starts.add(match.start)
-            matches.append(match)
+    matches = list(_find_near_matches_substitutions_ngrams(subsequence,
+                                                           sequence,
+                                                           max_substitutions,
+                                                           start_index,
+                                                           end_index, seeds))
     return sorted(matches, key=lambda match: match.start)
 
 
 def _find_near_matches_substitutions_ngrams(subsequence, sequence,
-                                            max_substitutions):
+                                            max_substitutions,
+                                            start_index=0, end_index=None,
+                                            seeds=None):
     subseq_len = len(subsequence)
-    seq_len = len(sequence)
+    start_index, end_index = clamp_index_range(sequence, start_index,
+                                               end_index)
 
     def make_match(start, end, dist):
         return Match(start, end, dist, matched=sequence[start:end])
 
-    ngram_len = subseq_len // (max_substitutions + 1)
-    if ngram_len == 0:
-        raise ValueError(
-            "The subsequence's length must be greater than max_substitutions!"
-        )
+    if seeds is None:
+        ngram_len = subseq_len // (max_substitutions + 1)
+        if ngram_len == 0:
+            raise ValueError(
+                "The subsequence's length must be greater than "
+                "max_substitutions!"
+            )
+        seeds = equal_seeds(subseq_len, ngram_len)
 
-    for ngram_start in range(0, len(subsequence) - ngram_len + 1, ngram_len):
-        ngram_end = ngram_start + ngram_len
+    seeds = sorted(seeds)
+    for seed_index, (ngram_start, ngram_end) in enumerate(seeds):
+        ngram_len = ngram_end - ngram_start
         subseq_before = subsequence[:ngram_start]
         subseq_after = subsequence[ngram_end:]
         for index in search_exact(
                 subsequence[ngram_start:ngram_end], sequence,
-                ngram_start, seq_len - (subseq_len - ngram_end),
+                start_index + ngram_start,
+                end_index - (subseq_len - ngram_end),
         ):
+            # each place is only checked once, for the first n-gram found
+            # there
+            if any_seed_matches_at(subsequence, sequence, seeds[:seed_index],
+                                   index - ngram_start):
+                continue
+
             n_substitutions = 0
             seq_before = sequence[index - ngram_start:index]
             if subseq_before != seq_before:
@@ -216,7 +298,9 @@ def _find_near_matches_substitutions_ngrams(subsequence, sequence,
 
 
 def has_near_match_substitutions_ngrams(subsequence, sequence,
-                                        max_substitutions):
+                                        max_substitutions,
+                                        start_index=0, end_index=None,
+                                        seeds=None):
     """search for near-matches of subsequence in sequence
 
     This searches for near-matches, where the nearly-matching parts of the
@@ -224,46 +308,136 @@ def has_near_match_substitutions_ngrams(subsequence, sequence,
 
     * the number of character substitutions must be less than max_substitutions
     * no deletions or insertions are allowed
+
+    See find_near_matches_substitutions_ngrams() regarding seeds.
     """
     _check_arguments(subsequence, sequence, max_substitutions)
 
     for match in _find_near_matches_substitutions_ngrams(subsequence, sequence,
-                                                         max_substitutions):
+                                                         max_substitutions,
+                                                         start_index,
+                                                         end_index, seeds):
         return True
     return False
 
 
+def _int64_array_from_bytes(data):
+    result = array('q')
+    result.frombytes(data)
+    return result
+
+
+def _sorted_by_start(starts, dists):
+    sorted_starts, sorted_dists = array('q'), array('q')
+    for start, dist in sorted(zip(starts, dists)):
+        sorted_starts.append(start)
+        sorted_dists.append(dist)
+    return sorted_starts, sorted_dists
+
+
 try:
     from fuzzysearch._substitutions_only import \
+        substitutions_only_has_near_matches_lp_byteslike, \
         substitutions_only_has_near_matches_ngrams_byteslike, \
         substitutions_only_find_near_matches_ngrams_byteslike as \
-            _subs_only_fnm_ngram_byteslike
+            _subs_only_fnm_ngram_byteslike, \
+        substitutions_only_find_near_matches_lp_columns_byteslike as \
+            _subs_only_fnm_lp_columns_byteslike, \
+        substitutions_only_find_near_matches_ngrams_columns_byteslike as \
+            _subs_only_fnm_ngram_columns_byteslike
 except ImportError:
     pass
 else:
+    py_has_near_match_substitutions_lp = has_near_match_substitutions_lp
+    @wraps(py_has_near_match_substitutions_lp)
+    def has_near_match_substitutions_lp(subsequence, sequence,
+                                        max_substitutions,
+                                        start_index=0, end_index=None,
+                                        equivalences=None):
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
+        try:
+            return substitutions_only_has_near_matches_lp_byteslike(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index,
+                equivalences.table if equivalences is not None else None)
+        except (TypeError, UnicodeEncodeError):
+            return py_has_near_match_substitutions_lp(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index, equivalences)
+
+    py_find_near_matches_substitutions_lp = find_near_matches_substitutions_lp
+    @wraps(py_find_near_matches_substitutions_lp)
+    def find_near_matches_substitutions_lp(subsequence, sequence,
+                                           max_substitutions,
+                                           start_index=0, end_index=None,
+                                           equivalences=None):
+        _check_arguments(subsequence, sequence, max_substitutions)
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
+        try:
+            results = _subs_only_fnm_lp_columns_byteslike(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index,
+                equivalences.table if equivalences is not None else None)
+        except (TypeError, UnicodeEncodeError):
+            return py_find_near_matches_substitutions_lp(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index, equivalences)
+
+        starts, dists = map(_int64_array_from_bytes, results)
+        subseq_len = len(subsequence)
+        return [
+            Match(start, start + subseq_len, dist,
+                  matched=sequence[start:start + subseq_len])
+            for start, dist in zip(starts, dists)
+        ]
+
     py_has_near_match_substitutions_ngrams = has_near_match_substitutions_ngrams
     @wraps(py_has_near_match_substitutions_ngrams)
     def has_near_match_substitutions_ngrams(subsequence, sequence,
-                                            max_substitutions):
+                                            max_substitutions,
+                                            start_index=0, end_index=None,
+                                            seeds=None):
+        # the C implementation always uses equal seeds
+        if seeds is not None:
+            return py_has_near_match_substitutions_ngrams(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index, seeds)
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
         try:
             return substitutions_only_has_near_matches_ngrams_byteslike(
-                subsequence, sequence, max_substitutions)
+                subsequence, sequence, max_substitutions,
+                start_index, end_index)
         except (TypeError, UnicodeEncodeError):
             return py_has_near_match_substitutions_ngrams(
-                subsequence, sequence, max_substitutions)
+                subsequence, sequence, max_substitutions,
+                start_index, end_index)
 
     py_find_near_matches_substitutions_ngrams = \
         find_near_matches_substitutions_ngrams
     @wraps(py_find_near_matches_substitutions_ngrams)
     def find_near_matches_substitutions_ngrams(subsequence, sequence,
-                                               max_substitutions):
+                                               max_substitutions,
+                                               start_index=0, end_index=None,
+                                               seeds=None):
+        # the C implementation always uses equal seeds
+        if seeds is not None:
+            return py_find_near_matches_substitutions_ngrams(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index, seeds)
+
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
         try:
             results = _subs_only_fnm_ngram_byteslike(
-                subsequence, sequence, max_substitutions)
+                subsequence, sequence, max_substitutions,
+                start_index, end_index)
         except (TypeError, UnicodeEncodeError):
             pass
         else:
-            matches = [
+            return [
                 Match(
                     index,
                     index + len(subsequence),
@@ -274,27 +448,98 @@ else:
                     ),
                     matched=sequence[index:index + len(subsequence)],
                 )
-                for index in results
-            ]
-            return [
-                get_best_match_in_group(group)
-                for group in group_matches(matches)
+                for index in sorted(results)
             ]
 
         return py_find_near_matches_substitutions_ngrams(
-            subsequence, sequence, max_substitutions)
+            subsequence, sequence, max_substitutions, start_index, end_index)
+
+    py_find_near_matches_substitutions_columns = \
+        find_near_matches_substitutions_columns
+    @wraps(py_find_near_matches_substitutions_columns)
+    def find_near_matches_substitutions_columns(subsequence, sequence,
+                                                max_substitutions,
+                                                start_index=0, end_index=None,
+                                                equivalences=None):
+        _check_arguments(subsequence, sequence, max_substitutions)
+        start_index, end_index = clamp_index_range(sequence, start_index,
+                                                   end_index)
+
+        # the n-gram search can't honor an equivalence table
+        use_ngrams = (
+            equivalences is None and
+            len(subsequence) // (max_substitutions + 1) >= 3
+        )
+        try:
+            if use_ngrams:
+                results = _subs_only_fnm_ngram_columns_byteslike(
+                    subsequence, sequence, max_substitutions,
+                    start_index, end_index)
+            else:
+                results = _subs_only_fnm_lp_columns_byteslike(
+                    subsequence, sequence, max_substitutions,
+                    start_index, end_index,
+                    equivalences.table if equivalences is not None else None)
+        except (TypeError, UnicodeEncodeError):
+            return py_find_near_matches_substitutions_columns(
+                subsequence, sequence, max_substitutions,
+                start_index, end_index, equivalences)
+
+        starts, dists = map(_int64_array_from_bytes, results)
+        # the n-gram search finds the matches in order of the n-grams
+        if use_ngrams:
+            starts, dists = _sorted_by_start(starts, dists)
+        ends = array('q', map(len(subsequence).__add__, starts))
+        return MatchArray(starts, ends, dists)
 
 
 class SubstitutionsOnlySearch(FuzzySearchBase):
     @classmethod
-    def search(cls, subsequence, sequence, search_params):
+    def search(cls, subsequence, sequence, search_params,
+               start_index=0, end_index=None, equivalences=None,
+               seed_profile=None):
         actual_max_subs = min(
             x for x in [search_params.max_l_dist,
                         search_params.max_substitutions]
             if x is not None
         )
         return find_near_matches_substitutions(subsequence, sequence,
-                                               actual_max_subs)
+                                               actual_max_subs,
+                                               start_index, end_index,
+                                               equivalences, seed_profile)
+
+    @classmethod
+    def has_match(cls, subsequence, sequence, search_params,
+                  start_index=0, end_index=None, equivalences=None,
+                  seed_profile=None):
+        actual_max_subs = min(
+            x for x in [search_params.max_l_dist,
+                        search_params.max_substitutions]
+            if x is not None
+        )
+        return has_near_match_substitutions(subsequence, sequence,
+                                            actual_max_subs,
+                                            start_index, end_index,
+                                            equivalences, seed_profile)
+
+    @classmethod
+    def count_matches(cls, subsequence, sequence, search_params,
+                      start_index=0, end_index=None, equivalences=None):
+        return len(cls.search_columns(subsequence, sequence, search_params,
+                                      start_index, end_index, equivalences))
+
+    @classmethod
+    def search_columns(cls, subsequence, sequence, search_params,
+                       start_index=0, end_index=None, equivalences=None):
+        actual_max_subs = min(
+            x for x in [search_params.max_l_dist,
+                        search_params.max_substitutions]
+            if x is not None
+        )
+        return find_near_matches_substitutions_columns(subsequence, sequence,
+                                                       actual_max_subs,
+                                                       start_index, end_index,
+                                                       equivalences)
 
     @classmethod
     def extra_items_for_chunked_search(cls, subsequence, search_params):
@@ -0,0 +1,230 @@
+import random
+import unittest
+
+from fuzzysearch.common import LevenshteinSearchParams, EquivalenceTable, \
+    consolidate_overlapping_matches
+from fuzzysearch.generic_search import BitParallelSearch, \
+    find_near_matches_generic_linear_programming as fnm_generic_lp, \
+    find_near_matches_generic_bit_parallel as fnm_generic_bit_parallel, \
+    has_near_match_generic_bit_parallel as hnm_generic_bit_parallel
+from fuzzysearch.levenshtein import \
+    find_near_matches_levenshtein_linear_programming as fnm_levenshtein_lp
+import fuzzysearch.bit_parallel
+from fuzzysearch.bit_parallel import find_candidate_regions, \
+    is_expected_faster, levenshtein_distances
+
+from tests.test_generic_search import TestGenericSearchLp, \
+    TestHasNearMatchGenericBase
+from tests.utils import search_in_index_range
+
+
+def _levenshtein_distances_dp(subsequence, sequence):
+    # a straightforward dynamic programming computation, for comparison
+    column = list(range(len(subsequence) + 1))
+    for index, char in enumerate(sequence):
+        prev_column, column = column, [0]
+        for subseq_index, subseq_char in enumerate(subsequence):
+            column.append(min(
+                prev_column[subseq_index] + (char != subseq_char),
+                prev_column[subseq_index + 1] + 1,
+                column[subseq_index] + 1,
+            ))
+        yield index + 1, column[-1]
+
+
+class TestLevenshteinDistances(unittest.TestCase):
+    def test_empty_sequence(self):
+        self.assertEqual(list(levenshtein_distances('abc', '')), [])
+
+    def test_exact_match(self):
+        self.assertEqual(
+            list(levenshtein_distances('abc', 'xabcx')),
+            [(1, 3), (2, 2), (3, 1), (4, 0), (5, 1)],
+        )
+
+    def test_index_range(self):
+        self.assertEqual(
+            list(levenshtein_distances('abc', 'abcabc', 1, 5)),
+            [(2, 2), (3, 1), (4, 2), (5, 1)],
+        )
+
+    def test_equivalences(self):
+        self.assertEqual(
+            list(levenshtein_distances(
+                'abc', 'xABCx',
+                equivalences=EquivalenceTable.case_insensitive())),
+            [(1, 3), (2, 2), (3, 1), (4, 0), (5, 1)],
+        )
+
+    def test_same_as_dp(self):
+        rng = random.Random(40)
+        for _i in range(200):
+            alphabet = rng.choice(['ab', 'ACGT', 'abcdefghijklmnopqrstuvwxyz'])
+            subsequence = ''.join(
+                rng.choice(alphabet) for _j in range(rng.randint(1, 70)))
+            sequence = ''.join(
+                rng.choice(alphabet) for _j in range(rng.randint(0, 100)))
+            self.assertEqual(
+                list(levenshtein_distances(subsequence, sequence)),
+                list(_levenshtein_distances_dp(subsequence, sequence)),
+            )
+
+
+class TestFindCandidateRegions(unittest.TestCase):
+    def test_unusable(self):
+        self.assertIsNone(find_candidate_regions('abc', 'xxabcxx', 3))
+        self.assertIsNone(find_candidate_regions('abc', 'xxabcxx', 5))
+
+    def test_empty_sequence(self):
+        self.assertEqual(find_candidate_regions('abc', '', 1), [])
+
+    def test_no_candidates(self):
+        self.assertEqual(find_candidate_regions('abcd', 'x' * 100, 1), [])
+        self.assertEqual(find_candidate_regions(b'abcd', b'x' * 100, 1), [])
+
+    def test_exact_match(self):
+        sequence = 'x' * 20 + 'abcd' + 'x' * 20
+        self.assertEqual(find_candidate_regions('abcd', sequence, 0),
+                         [(20, 24)])
+        self.assertEqual(find_candidate_regions('abcd', sequence, 1),
+                         [(18, 25)])
+        self.assertEqual(find_candidate_regions('abcd', sequence, 1,
+                                                max_insertions=0),
+                         [(19, 25)])
+
+    def test_index_range(self):
+        sequence = 'abcd' * 10
+        self.assertEqual(
+            find_candidate_regions('abcd', sequence, 1,
+                                   start_index=5, end_index=30),
+            [(5, 29)],
+        )
+
+    def test_contains_all_matches(self):
+        rng = random.Random(40)
+        for _i in range(200):
+            alphabet = rng.choice(['ab', 'ACGT', 'abcdefghijklmnopqrstuvwxyz'])
+            subsequence = ''.join(
+                rng.choice(alphabet) for _j in range(rng.randint(1, 70)))
+            sequence = ''.join(
+                rng.choice(alphabet) for _j in range(rng.randint(0, 100)))
+            max_l_dist = rng.randint(0, min(len(subsequence) - 1, 5))
+            start_index = rng.randint(0, 10)
+            end_index = rng.randint(start_index, 110)
+
+            regions = find_candidate_regions(subsequence, sequence,
+                                             max_l_dist,
+                                             start_index=start_index,
+                                             end_index=end_index)
+            for (_start1, end1), (start2, _end2) in zip(regions, regions[1:]):
+                self.assertLess(end1, start2)
+            for match in fnm_levenshtein_lp(subsequence, sequence,
+                                            max_l_dist,
+                                            start_index, end_index):
+                self.assertTrue(
+                    any(region_start <= match.start and
+                        match.end <= region_end
+                        for region_start, region_end in regions),
+                    (subsequence, sequence, max_l_dist, match, regions),
+                )
+
+            # the results must be the same with and without the C extension
+            if hasattr(fuzzysearch.bit_parallel,
+                       '_py_find_candidate_regions'):
+                args = (subsequence.encode('ascii'),
+                        sequence.encode('ascii'), max_l_dist,
+                        len(subsequence) + max_l_dist,
+                        0, len(sequence))
+                for equivalences in [None,
+                                     EquivalenceTable.case_insensitive()]:
+                    self.assertEqual(
+                        fuzzysearch.bit_parallel._find_candidate_regions(
+                            *args, equivalences=equivalences),
+                        fuzzysearch.bit_parallel._py_find_candidate_regions(
+                            *args, equivalences=equivalences),
+                    )
+
+
+class TestIsExpectedFaster(unittest.TestCase):
+    def test_unusable(self):
+        self.assertFalse(is_expected_faster('abc', 3))
+        self.assertFalse(is_expected_faster(
+            'abc', 3, EquivalenceTable.case_insensitive()))
+
+    def test_short_ngrams(self):
+        self.assertTrue(is_expected_faster('abcdef', 2))
+        self.assertTrue(is_expected_faster(b'abcdef', 2))
+
+    def test_long_ngrams(self):
+        self.assertFalse(is_expected_faster('a' * 24, 2))
+        self.assertFalse(is_expected_faster(b'a' * 24, 2))
+
+    def test_equivalences(self):
+        self.assertTrue(is_expected_faster(
+            'a' * 24, 2, EquivalenceTable.case_insensitive()))
+
+
+class TestGenericSearchBitParallel(TestGenericSearchLp):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return list(
+            fnm_generic_bit_parallel(pattern, sequence, search_params)
+        )
+
+    def test_same_as_lp(self):
+        rng = random.Random(40)
+        for _i in range(100):
+            subsequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(1, 10)))
+            sequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(0, 100)))
+            search_params = LevenshteinSearchParams(
+                *[rng.randint(0, len(subsequence) - 1) for _j in range(4)])
+            self.assertEqual(
+                list(fnm_generic_bit_parallel(subsequence, sequence,
+                                              search_params)),
+                list(fnm_generic_lp(subsequence, sequence, search_params)),
+            )
+
+    def test_equivalences(self):
+        search_params = LevenshteinSearchParams(3, 1, 1, None)
+        equivalences = EquivalenceTable.case_insensitive()
+        sequence = 'xxxxxABxDEFxxxxxxabcdefxxxxx'
+        self.assertEqual(
+            consolidate_overlapping_matches(fnm_generic_bit_parallel(
+                'abcdef', sequence, search_params,
+                equivalences=equivalences)),
+            consolidate_overlapping_matches(fnm_generic_lp(
+                'abcdef', sequence, search_params,
+                equivalences=equivalences)),
+        )
+
+
+class TestGenericSearchBitParallelIndexRange(TestGenericSearchBitParallel):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return search_in_index_range(
+            fnm_generic_bit_parallel, pattern, sequence, search_params,
+        )
+
+
+class TestHasNearMatchGenericBitParallel(TestHasNearMatchGenericBase,
+                                         unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        return hnm_generic_bit_parallel(
+            pattern, sequence,
+            LevenshteinSearchParams(max_subs, max_ins, max_dels, max_l_dist))
+
+
+class TestBitParallelSearch(unittest.TestCase):
+    def test_empty_subsequence(self):
+        search_params = LevenshteinSearchParams(1, 1, 1, 2)
+        with self.assertRaises(ValueError):
+            list(BitParallelSearch.search('', 'abc', search_params))
+        with self.assertRaises(ValueError):
+            BitParallelSearch.has_match('', 'abc', search_params)
@@ -1,7 +1,11 @@
 import unittest
 
-from fuzzysearch.common import Match, group_matches, GroupOfMatches, \
-    count_differences_with_maximum
+import random
+
+from fuzzysearch.common import Match, MatchArray, group_matches, \
+    GroupOfMatches, count_differences_with_maximum, \
+    consolidate_overlapping_matches, count_overlapping_match_groups, \
+    StrandedMatch, reverse_complement, EquivalenceTable, SubsequenceIndexes
 from tests.compat import b
 
 
@@ -37,6 +41,191 @@ class TestGroupMatches(unittest.TestCase):
         )
 
 
+class TestCountOverlappingMatchGroups(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(count_overlapping_match_groups([]), 0)
+
+    def test_separate(self):
+        matches = [
+            Match(start=19, end=29, dist=1, matched='x'*10),
+            Match(start=42, end=52, dist=1, matched='x'*10),
+            Match(start=99, end=109, dist=0, matched='x'*10),
+        ]
+        self.assertEqual(count_overlapping_match_groups(matches), 3)
+        self.assertEqual(count_overlapping_match_groups(matches[::-1]), 3)
+
+    def test_adjacent(self):
+        matches = [Match(0, 5, 0, 'x'*5), Match(5, 10, 0, 'x'*5)]
+        self.assertEqual(count_overlapping_match_groups(matches), 2)
+
+    def test_bridging_match(self):
+        matches = [
+            Match(0, 5, 0, 'x'*5),
+            Match(10, 15, 0, 'x'*5),
+            Match(20, 25, 0, 'x'*5),
+            Match(4, 21, 1, 'x'*17),
+        ]
+        self.assertEqual(count_overlapping_match_groups(matches), 1)
+
+    def test_same_as_consolidate(self):
+        rand = random.Random(0)
+        for _i in range(200):
+            matches = []
+            for _j in range(rand.randint(0, 20)):
+                start = rand.randint(0, 50)
+                end = start + rand.randint(0, 6)
+                matches.append(Match(start, end, rand.randint(0, 2), 'x'))
+            self.assertEqual(
+                count_overlapping_match_groups(matches),
+                len(consolidate_overlapping_matches(matches)),
+                matches,
+            )
+
+
+class TestMatchArray(unittest.TestCase):
+    def test_empty(self):
+        match_array = MatchArray()
+        self.assertEqual(len(match_array), 0)
+        self.assertEqual(match_array.to_matches('text'), [])
+        self.assertEqual(MatchArray.from_matches([]), match_array)
+
+    def test_round_trip(self):
+        sequence = '---PATERN---PATTERN---'
+        matches = [
+            Match(start=3, end=9, dist=1, matched='PATERN'),
+            Match(start=12, end=19, dist=0, matched='PATTERN'),
+        ]
+        match_array = MatchArray.from_matches(matches)
+        self.assertEqual(len(match_array), 2)
+        self.assertEqual(list(match_array.starts), [3, 12])
+        self.assertEqual(list(match_array.ends), [9, 19])
+        self.assertEqual(list(match_array.dists), [1, 0])
+        self.assertEqual(match_array.to_matches(sequence), matches)
+
+    def test_buffer_protocol(self):
+        match_array = MatchArray.from_matches([Match(3, 9, 1, 'PATERN')])
+        view = memoryview(match_array.starts)
+        self.assertEqual(view.itemsize, 8)
+        self.assertEqual(view.tolist(), [3])
+
+
+class TestStrandedMatch(unittest.TestCase):
+    def test_strand(self):
+        match = StrandedMatch(3, 9, 1, 'PATERN', '-')
+        self.assertEqual(match.strand, '-')
+        self.assertNotEqual(match, StrandedMatch(3, 9, 1, 'PATERN', '+'))
+        self.assertIsInstance(match, Match)
+
+    def test_invalid_strand(self):
+        if not __debug__:
+            raise self.skipTest('validation is skipped with -O')
+        with self.assertRaises(ValueError):
+            StrandedMatch(3, 9, 1, 'PATERN', 'x')
+
+
+class TestReverseComplement(unittest.TestCase):
+    def test_str(self):
+        self.assertEqual(reverse_complement(''), '')
+        self.assertEqual(reverse_complement('GATTACA'), 'TGTAATC')
+        self.assertEqual(reverse_complement('gattaca'), 'tgtaatc')
+        self.assertEqual(reverse_complement('ACGTN'), 'NACGT')
+        self.assertEqual(reverse_complement('RYKMBV'), 'BVKMRY')
+
+    def test_byteslike(self):
+        self.assertEqual(reverse_complement(b('GATTACA')), b('TGTAATC'))
+        self.assertEqual(reverse_complement(bytearray(b('GATTACA'))),
+                         bytearray(b('TGTAATC')))
+
+    def test_involution(self):
+        rand = random.Random(0)
+        sequence = ''.join(rand.choice('ACGTNacgtn') for _i in range(100))
+        self.assertEqual(reverse_complement(reverse_complement(sequence)),
+                         sequence)
+
+    def test_invalid_sequence(self):
+        with self.assertRaises(ValueError):
+            reverse_complement('PATTERN')
+        with self.assertRaises(ValueError):
+            reverse_complement(b('ACGT-'))
+        with self.assertRaises(TypeError):
+            reverse_complement(['A', 'C'])
+
+
+class TestEquivalenceTable(unittest.TestCase):
+    def test_invalid_table_length(self):
+        with self.assertRaises(ValueError):
+            EquivalenceTable(b('\x01') * 256)
+        with self.assertRaises(ValueError):
+            EquivalenceTable.from_classes(range(255))
+        with self.assertRaises(ValueError):
+            EquivalenceTable.from_masks([1] * 257)
+
+    def test_from_classes(self):
+        classes = list(range(256))
+        classes[ord('x')] = classes[ord('y')] = classes[ord('z')] = -1
+        equivalences = EquivalenceTable.from_classes(classes)
+        self.assertTrue(equivalences.items_match('x', 'z'))
+        self.assertTrue(equivalences.items_match(ord('y'), ord('x')))
+        self.assertTrue(equivalences.items_match('a', 'a'))
+        self.assertFalse(equivalences.items_match('a', 'x'))
+
+    def test_from_masks(self):
+        masks = [1 << 8] * 256
+        masks[ord('a')] = 1
+        masks[ord('b')] = 2
+        masks[ord('?')] = 3
+        equivalences = EquivalenceTable.from_masks(masks)
+        self.assertTrue(equivalences.items_match('?', 'a'))
+        self.assertTrue(equivalences.items_match('b', '?'))
+        self.assertFalse(equivalences.items_match('a', 'b'))
+
+    def test_case_insensitive(self):
+        equivalences = EquivalenceTable.case_insensitive()
+        self.assertTrue(equivalences.items_match('a', 'A'))
+        self.assertTrue(equivalences.items_match('Z', 'z'))
+        self.assertTrue(equivalences.items_match('1', '1'))
+        self.assertFalse(equivalences.items_match('a', 'b'))
+        self.assertFalse(equivalences.items_match('@', '`'))
+
+    def test_dna_iupac(self):
+        equivalences = EquivalenceTable.dna_iupac()
+        for nucleotide in 'ACGTacgt':
+            self.assertTrue(equivalences.items_match(nucleotide, 'N'))
+            self.assertTrue(equivalences.items_match('n', nucleotide))
+        self.assertTrue(equivalences.items_match('A', 'R'))
+        self.assertTrue(equivalences.items_match('G', 'R'))
+        self.assertFalse(equivalences.items_match('C', 'R'))
+        self.assertTrue(equivalences.items_match('U', 't'))
+        self.assertTrue(equivalences.items_match('R', 'S'))
+        self.assertFalse(equivalences.items_match('R', 'Y'))
+        self.assertFalse(equivalences.items_match('A', 'C'))
+        self.assertTrue(equivalences.items_match('-', '-'))
+        self.assertFalse(equivalences.items_match('-', 'N'))
+
+    def test_non_byte_items(self):
+        equivalences = EquivalenceTable.case_insensitive()
+        self.assertTrue(equivalences.items_match('\u05d0', '\u05d0'))
+        self.assertFalse(equivalences.items_match('\u05d0', 'a'))
+        self.assertTrue(equivalences.items_match(1000, 1000))
+        self.assertFalse(equivalences.items_match(1000 + ord('a'), 'a'))
+        self.assertTrue(equivalences.items_match(('a',), ('a',)))
+
+
+class TestSubsequenceIndexes(unittest.TestCase):
+    def test_without_equivalences(self):
+        indexes = SubsequenceIndexes('abcab')
+        self.assertEqual(indexes['a'], frozenset([0, 3]))
+        self.assertEqual(indexes['c'], frozenset([2]))
+        self.assertEqual(indexes['A'], frozenset())
+
+    def test_with_equivalences(self):
+        indexes = SubsequenceIndexes('abcAb',
+                                     EquivalenceTable.case_insensitive())
+        self.assertEqual(indexes['a'], frozenset([0, 3]))
+        self.assertEqual(indexes['B'], frozenset([1, 4]))
+        self.assertEqual(indexes['d'], frozenset())
+
+
 class TestCountDifferencesWithMaximumBase(object):
     def count_diffs(self, seq1, seq2, max_diffs):
         raise NotImplementedError
@@ -93,13 +282,101 @@ class TestCountDifferencesWithMaximum(TestCountDifferencesWithMaximumBase,
         return count_differences_with_maximum(seq1, seq2, max_diffs)
 
 
+class TestCountDifferencesWithMaximumWithEquivalences(
+        TestCountDifferencesWithMaximumBase, unittest.TestCase):
+    def count_diffs(self, seq1, seq2, max_diffs):
+        return count_differences_with_maximum(
+            seq1, seq2, max_diffs,
+            equivalences=EquivalenceTable.from_classes(range(256)),
+        )
+
+    def test_case_insensitive(self):
+        self.assertEqual(
+            count_differences_with_maximum(
+                'aBcDe', 'AbCdX', 5,
+                equivalences=EquivalenceTable.case_insensitive(),
+            ),
+            1,
+        )
+
+
 try:
-    from fuzzysearch._common import count_differences_with_maximum_byteslike
+    from fuzzysearch._common import count_differences_with_maximum_byteslike, \
+        available_implementations
 except ImportError:
     pass
 else:
+    class TestCountDifferencesWithMaximumByteslikeBase(
+            TestCountDifferencesWithMaximumBase):
+        implementation = None
+
+        def setUp(self):
+            if (self.implementation is not None and
+                    self.implementation not in available_implementations()):
+                self.skipTest('%s is not supported by the CPU' %
+                              self.implementation)
+
+        def count_diffs(self, seq1, seq2, max_diffs):
+            return count_differences_with_maximum_byteslike(
+                b(seq1), b(seq2), max_diffs, None, self.implementation)
+
+        def test_long_sequences(self):
+            rng = random.Random(40)
+            for _i in range(1000):
+                alphabet = rng.choice([b'ab', b'ACGT', bytes(range(256))])
+                length = rng.randint(0, 300)
+                seq1 = bytes(rng.choice(alphabet) for _j in range(length))
+                # mostly similar sequences, so that the maximum is often
+                # not reached
+                seq2 = bytes(
+                    c if rng.random() < 0.9 else rng.choice(alphabet)
+                    for c in seq1
+                )
+                max_diffs = rng.randint(0, length + 1)
+                self.assertEqual(
+                    count_differences_with_maximum_byteslike(
+                        seq1, seq2, max_diffs, None, self.implementation),
+                    min(sum(c1 != c2 for c1, c2 in zip(seq1, seq2)),
+                        max_diffs),
+                )
+
     class TestCountDifferencesWithMaximumByteslike(
+            TestCountDifferencesWithMaximumByteslikeBase, unittest.TestCase):
+        def test_unsupported_implementation(self):
+            with self.assertRaises(ValueError):
+                count_differences_with_maximum_byteslike(
+                    b('abc'), b('abc'), 1, None, 'nonexistent')
+
+    class TestCountDifferencesWithMaximumByteslikeScalar(
+            TestCountDifferencesWithMaximumByteslikeBase, unittest.TestCase):
+        implementation = 'scalar'
+
+    class TestCountDifferencesWithMaximumByteslikeSse2(
+            TestCountDifferencesWithMaximumByteslikeBase, unittest.TestCase):
+        implementation = 'sse2'
+
+    class TestCountDifferencesWithMaximumByteslikeAvx2(
+            TestCountDifferencesWithMaximumByteslikeBase, unittest.TestCase):
+        implementation = 'avx2'
+
+    class TestCountDifferencesWithMaximumByteslikeWithEquivalences(
             TestCountDifferencesWithMaximumBase, unittest.TestCase):
         def count_diffs(self, seq1, seq2, max_diffs):
-            return count_differences_with_maximum_byteslike(b(seq1), b(seq2),
-                                                            max_diffs)
+            return count_differences_with_maximum_byteslike(
+                b(seq1), b(seq2), max_diffs,
+                EquivalenceTable.from_classes(range(256)).table,
+            )
+
+        def test_case_insensitive(self):
+            self.assertEqual(
+                count_differences_with_maximum_byteslike(
+                    b('aBcDe'), b('AbCdX'), 5,
+                    EquivalenceTable.case_insensitive().table,
+                ),
+                1,
+            )
+
+        def test_invalid_table(self):
+            with self.assertRaises(ValueError):
+                count_differences_with_maximum_byteslike(
+                    b('abc'), b('abc'), 1, b('\x01') * 256)
@@ -1,12 +1,20 @@
+import random
 import unittest
 import unittest.mock
 
 from tests.test_search_exact import TestSearchExactBase
-from tests.test_substitutions_only import TestSubstitionsOnlyBase
+from tests.test_substitutions_only import TestSubstitionsOnlyBase, \
+    TestHasNearMatchSubstitionsOnlyBase
 from tests.test_levenshtein import TestFindNearMatchesLevenshteinBase
+from tests.utils import search_in_index_range
 
-from fuzzysearch import find_near_matches, Match
+from fuzzysearch import find_near_matches, has_near_match, \
+    find_near_matches_in_regions, find_near_match_pairs, \
+    count_near_matches, find_best_matches, \
+    Match, MatchArray, StrandedMatch, reverse_complement, EquivalenceTable, \
+    SequenceProfile
 from fuzzysearch.common import FuzzySearchBase
+from fuzzysearch.levenshtein import LevenshteinSearch
 
 
 class MockSearchClassFailsUnlessDefined(FuzzySearchBase):
@@ -34,8 +42,14 @@ class TestFindNearMatches(unittest.TestCase):
             MockSearchClassFailsUnlessDefined()
         self.mock_find_near_matches_substitutions = \
             MockSearchClassFailsUnlessDefined()
+        self.mock_find_near_matches_no_deletions = \
+            MockSearchClassFailsUnlessDefined()
+        self.mock_find_near_matches_no_insertions = \
+            MockSearchClassFailsUnlessDefined()
         self.mock_find_near_matches_generic = \
             MockSearchClassFailsUnlessDefined()
+        self.mock_find_near_matches_bit_parallel = \
+            MockSearchClassFailsUnlessDefined()
 
         patcher = unittest.mock.patch.multiple(
             'fuzzysearch',
@@ -44,8 +58,14 @@ class TestFindNearMatches(unittest.TestCase):
                 self.mock_find_near_matches_levenshtein,
             SubstitutionsOnlySearch=
                 self.mock_find_near_matches_substitutions,
+            NoDeletionsSearch=
+                self.mock_find_near_matches_no_deletions,
+            NoInsertionsSearch=
+                self.mock_find_near_matches_no_insertions,
             GenericSearch=
                 self.mock_find_near_matches_generic,
+            BitParallelSearch=
+                self.mock_find_near_matches_bit_parallel,
         )
         self.addCleanup(patcher.stop)
         patcher.start()
@@ -175,6 +195,90 @@ class TestFindNearMatches(unittest.TestCase):
             2,
         )
 
+    def test_no_deletions(self):
+        self.patch_concrete_search_classes()
+        self.mock_find_near_matches_no_deletions.return_value = \
+            [Match(42, 43, 0, 'x')]
+
+        self.assertEqual(
+            find_near_matches('abcdefghi', 'abcdefghi', 1, 1, 0),
+            [Match(42, 43, 0, 'x')],
+        )
+        self.assertEqual(
+            find_near_matches('abcdefghi', 'abcdefghi', 2, 1, 0, 2),
+            [Match(42, 43, 0, 'x')],
+        )
+        self.assertEqual(
+            self.mock_find_near_matches_no_deletions.call_count,
+            2,
+        )
+
+    def test_no_deletions_short_ngrams(self):
+        # n-grams of fewer than three items would match almost everywhere,
+        # so the generic search is used instead
+        self.patch_concrete_search_classes()
+        self.mock_find_near_matches_generic.return_value = \
+            [Match(42, 43, 0, 'x')]
+        self.mock_find_near_matches_bit_parallel.return_value = \
+            [Match(42, 43, 0, 'x')]
+
+        for subsequence in ['ab', 'abcdefgh']:
+            self.assertEqual(
+                find_near_matches(subsequence, subsequence, 1, 1, 0),
+                [Match(42, 43, 0, 'x')],
+            )
+        self.assertEqual(
+            self.mock_find_near_matches_no_deletions.call_count,
+            0,
+        )
+        self.assertEqual(
+            self.mock_find_near_matches_generic.call_count +
+            self.mock_find_near_matches_bit_parallel.call_count,
+            2,
+        )
+
+    def test_no_insertions(self):
+        self.patch_concrete_search_classes()
+        self.mock_find_near_matches_no_insertions.return_value = \
+            [Match(42, 43, 0, 'x')]
+
+        self.assertEqual(
+            find_near_matches('abcdefghi', 'abcdefghi', 1, 0, 1),
+            [Match(42, 43, 0, 'x')],
+        )
+        self.assertEqual(
+            find_near_matches('abcdefghi', 'abcdefghi', 2, 0, 1, 2),
+            [Match(42, 43, 0, 'x')],
+        )
+        self.assertEqual(
+            self.mock_find_near_matches_no_insertions.call_count,
+            2,
+        )
+
+    def test_no_insertions_short_ngrams(self):
+        # n-grams of fewer than three items would match almost everywhere,
+        # so the generic search is used instead
+        self.patch_concrete_search_classes()
+        self.mock_find_near_matches_generic.return_value = \
+            [Match(42, 43, 0, 'x')]
+        self.mock_find_near_matches_bit_parallel.return_value = \
+            [Match(42, 43, 0, 'x')]
+
+        for subsequence in ['ab', 'abcdefgh']:
+            self.assertEqual(
+                find_near_matches(subsequence, subsequence, 1, 0, 1),
+                [Match(42, 43, 0, 'x')],
+            )
+        self.assertEqual(
+            self.mock_find_near_matches_no_insertions.call_count,
+            0,
+        )
+        self.assertEqual(
+            self.mock_find_near_matches_generic.call_count +
+            self.mock_find_near_matches_bit_parallel.call_count,
+            2,
+        )
+
     def test_generic(self):
         self.patch_concrete_search_classes()
         self.mock_find_near_matches_generic.return_value = \
@@ -198,6 +302,68 @@ class TestFindNearMatches(unittest.TestCase):
             2,
         )
 
+    def test_bit_parallel(self):
+        self.patch_concrete_search_classes()
+        self.mock_find_near_matches_generic.return_value = \
+            [Match(42, 48, 0, 'x')]
+        self.mock_find_near_matches_bit_parallel.return_value = \
+            [Match(42, 48, 0, 'x')]
+
+        # n-grams too short for the n-gram search
+        self.assertEqual(
+            find_near_matches('abcdef', 'abcdef', 3, 1, 1),
+            [Match(42, 48, 0, 'x')],
+        )
+        # equivalence tables aren't supported by the n-gram search
+        self.assertEqual(
+            find_near_matches(
+                'a' * 24, 'a' * 24, 1, 1, 1,
+                equivalences=EquivalenceTable.case_insensitive()),
+            [Match(42, 48, 0, 'x')],
+        )
+        self.assertEqual(
+            self.mock_find_near_matches_bit_parallel.call_count,
+            2,
+        )
+
+        # long n-grams are searched for instead
+        self.assertEqual(
+            find_near_matches('a' * 24, 'a' * 24, 1, 1, 1),
+            [Match(42, 48, 0, 'x')],
+        )
+        self.assertEqual(
+            self.mock_find_near_matches_generic.call_count,
+            1,
+        )
+
+    def test_invalid_result_format(self):
+        with self.assertRaises(ValueError):
+            find_near_matches('a', 'a', max_l_dist=0, result_format='rows')
+
+    def test_columns_result_format(self):
+        result = find_near_matches('PATTERN', '---PATERN---PATTERN---',
+                                   max_l_dist=1, result_format='columns')
+        self.assertIsInstance(result, MatchArray)
+        self.assertEqual(list(result.starts), [3, 12])
+        self.assertEqual(list(result.ends), [9, 19])
+        self.assertEqual(list(result.dists), [1, 0])
+        self.assertEqual(memoryview(result.starts).format, 'q')
+
+    def test_columns_result_format_with_ties(self):
+        # many overlapping matches with equal distances and lengths
+        for subsequence, sequence in [
+            (b'AAAAAA', b'A' * 51),
+            (b'ACACAC', b'AC' * 30),
+            (b'AAAAAAAAA', b'AAAAT' * 20),
+        ]:
+            for max_subs in [0, 1, 2]:
+                kwargs = dict(max_substitutions=max_subs,
+                              max_insertions=0, max_deletions=0)
+                matches = find_near_matches(subsequence, sequence, **kwargs)
+                result = find_near_matches(subsequence, sequence,
+                                           result_format='columns', **kwargs)
+                self.assertEqual(result.to_matches(sequence), matches)
+
 
 class TestFindNearMatchesAsLevenshtein(TestFindNearMatchesLevenshteinBase,
                                        unittest.TestCase):
@@ -205,6 +371,45 @@ class TestFindNearMatchesAsLevenshtein(TestFindNearMatchesLevenshteinBase,
         return find_near_matches(subsequence, sequence, max_l_dist=max_l_dist)
 
 
+class TestFindNearMatchesAsLevenshteinColumns(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return find_near_matches(
+            subsequence, sequence, max_l_dist=max_l_dist,
+            result_format='columns',
+        ).to_matches(sequence)
+
+
+class TestFindNearMatchesAsLevenshteinMaxMatches(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return find_near_matches(subsequence, sequence,
+                                 max_l_dist=max_l_dist, max_matches=100)
+
+
+class TestFindNearMatchesIndexRangeAsLevenshtein(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return search_in_index_range(
+            lambda subseq, seq, start_index, end_index: find_near_matches(
+                subseq, seq, max_l_dist=max_l_dist,
+                start_index=start_index, end_index=end_index),
+            subsequence, sequence)
+
+
+class TestFindNearMatchesInRegionsAsLevenshtein(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return search_in_index_range(
+            lambda subseq, seq, start_index, end_index:
+                find_near_matches_in_regions(
+                    subseq, seq,
+                    [(start_index, (start_index + end_index) // 2),
+                     ((start_index + end_index) // 2, end_index)],
+                    max_l_dist=max_l_dist),
+            subsequence, sequence)
+
+
 class TestFindNearMatchesAsSearchExact(TestSearchExactBase,
                                        unittest.TestCase):
     def search(self, subsequence, sequence, start_index=0, end_index=None):
@@ -233,6 +438,33 @@ class TestFindNearMatchesAsSubstitutionsOnly(TestSubstitionsOnlyBase,
         return self.assertEqual(search_results, expected_outcomes, *args, **kwargs)
 
 
+class TestFindNearMatchesAsSubstitutionsOnlyColumns(TestSubstitionsOnlyBase,
+                                                    unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        return find_near_matches(
+            subsequence, sequence,
+            max_insertions=0, max_deletions=0, max_substitutions=max_subs,
+            result_format='columns',
+        ).to_matches(sequence)
+
+    def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+        return self.assertEqual(search_results, expected_outcomes, *args, **kwargs)
+
+
+class TestFindNearMatchesIndexRangeAsSubstitutionsOnly(TestSubstitionsOnlyBase,
+                                                       unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        return search_in_index_range(
+            lambda subseq, seq, start_index, end_index: find_near_matches(
+                subseq, seq,
+                max_insertions=0, max_deletions=0, max_substitutions=max_subs,
+                start_index=start_index, end_index=end_index),
+            subsequence, sequence)
+
+    def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+        return self.assertEqual(search_results, expected_outcomes, *args, **kwargs)
+
+
 from tests.test_generic_search import TestGenericSearch
 class TestFindNearMatchesAsGeneric(TestGenericSearch,
                                    unittest.TestCase):
@@ -240,4 +472,1228 @@ class TestFindNearMatchesAsGeneric(TestGenericSearch,
                max_l_dist=None):
         return find_near_matches(pattern, sequence,
                                  max_subs, max_ins, max_dels, max_l_dist)
+
+
+class TestFindNearMatchesAsGenericMaxMatches(TestGenericSearch,
+                                             unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        return find_near_matches(pattern, sequence,
+                                 max_subs, max_ins, max_dels, max_l_dist,
+                                 max_matches=100)
+
+
+class TestFindNearMatchesIndexRangeAsGeneric(TestGenericSearch,
+                                             unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        return search_in_index_range(
+            lambda subseq, seq, start_index, end_index: find_near_matches(
+                subseq, seq, max_subs, max_ins, max_dels, max_l_dist,
+                start_index=start_index, end_index=end_index),
+            pattern, sequence)
 del TestGenericSearch
+
+
+class TestHasNearMatch(unittest.TestCase):
+    def test_no_limitations(self):
+        with self.assertRaises(Exception):
+            has_near_match('a', 'a')
+
+    def test_uses_chosen_search_class(self):
+        for (max_subs, max_ins, max_dels, max_l_dist, class_name) in [
+            (None, None, None, 0, 'ExactSearch'),
+            (1, 0, 0, None, 'SubstitutionsOnlySearch'),
+            (None, None, None, 1, 'LevenshteinSearch'),
+            (1, 1, 0, None, 'NoDeletionsSearch'),
+            (1, 0, 1, None, 'NoInsertionsSearch'),
+            (1, 1, 1, None, 'GenericSearch'),
+        ]:
+            with self.subTest(class_name=class_name):
+                with unittest.mock.patch(
+                        'fuzzysearch.%s.has_match' % class_name,
+                        return_value=True) as mock_has_match:
+                    self.assertTrue(has_near_match(
+                        'a' * 12, 'a' * 12,
+                        max_subs, max_ins, max_dels, max_l_dist))
+                self.assertEqual(mock_has_match.call_count, 1)
+
+        with unittest.mock.patch(
+                'fuzzysearch.BitParallelSearch.has_match',
+                return_value=True) as mock_has_match:
+            self.assertTrue(has_near_match('abcdef', 'abcdef', 1, 1, 1))
+        self.assertEqual(mock_has_match.call_count, 1)
+
+
+class TestHasNearMatchAsLevenshtein(TestFindNearMatchesLevenshteinBase,
+                                    unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return has_near_match(subsequence, sequence, max_l_dist=max_l_dist)
+
+    def assertEqual(self, actual_value, expected_value, *args, **kwargs):
+        return super(TestHasNearMatchAsLevenshtein, self).assertEqual(
+            actual_value, bool(expected_value), *args, **kwargs)
+
+    def test_all_different(self):
+        self.assertFalse(self.search('AAAA', 'ZZZZ', max_l_dist=3))
+        self.assertTrue(self.search('AAAA', 'ZZZZ', max_l_dist=4))
+
+
+class TestHasNearMatchAsSubstitutionsOnly(TestHasNearMatchSubstitionsOnlyBase,
+                                          unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        return has_near_match(subsequence, sequence,
+                              max_insertions=0, max_deletions=0,
+                              max_substitutions=max_subs)
+
+
+from tests.test_generic_search import TestHasNearMatchGenericBase
+class TestHasNearMatchAsGeneric(TestHasNearMatchGenericBase,
+                                unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        return has_near_match(pattern, sequence,
+                              max_subs, max_ins, max_dels, max_l_dist)
+del TestHasNearMatchGenericBase
+
+
+class TestCountNearMatches(unittest.TestCase):
+    def test_no_limitations(self):
+        with self.assertRaises(Exception):
+            count_near_matches('a', 'a')
+
+    def test_uses_chosen_search_class(self):
+        for (max_subs, max_ins, max_dels, max_l_dist, class_name) in [
+            (None, None, None, 0, 'ExactSearch'),
+            (1, 0, 0, None, 'SubstitutionsOnlySearch'),
+            (None, None, None, 1, 'LevenshteinSearch'),
+            (1, 1, 0, None, 'NoDeletionsSearch'),
+            (1, 0, 1, None, 'NoInsertionsSearch'),
+            (1, 1, 1, None, 'GenericSearch'),
+        ]:
+            with self.subTest(class_name=class_name):
+                with unittest.mock.patch(
+                        'fuzzysearch.%s.count_matches' % class_name,
+                        return_value=7) as mock_count_matches:
+                    self.assertEqual(count_near_matches(
+                        'a' * 12, 'a' * 12,
+                        max_subs, max_ins, max_dels, max_l_dist), 7)
+                self.assertEqual(mock_count_matches.call_count, 1)
+
+        with unittest.mock.patch(
+                'fuzzysearch.BitParallelSearch.count_matches',
+                return_value=7) as mock_count_matches:
+            self.assertEqual(
+                count_near_matches('abcdef', 'abcdef', 1, 1, 1), 7)
+        self.assertEqual(mock_count_matches.call_count, 1)
+
+    def test_same_as_find_near_matches(self):
+        sequence = 'TGCACTGTAGGGATAACAAT' * 5 + 'GACTGTAGGATAACA'
+        for subsequence in ['GGATAAC', 'GACTGTAG', 'TAA', 'GTAGGATACA']:
+            for (max_subs, max_ins, max_dels, max_l_dist) in [
+                (None, None, None, 0),
+                (1, 0, 0, None),
+                (2, 0, 0, None),
+                (None, None, None, 1),
+                (None, None, None, 2),
+                (1, 1, 0, None),
+                (1, 0, 1, None),
+                (0, 2, 1, 2),
+            ]:
+                with self.subTest(subsequence=subsequence,
+                                  max_subs=max_subs, max_ins=max_ins,
+                                  max_dels=max_dels, max_l_dist=max_l_dist):
+                    self.assertEqual(
+                        count_near_matches(subsequence, sequence, max_subs,
+                                           max_ins, max_dels, max_l_dist),
+                        len(find_near_matches(subsequence, sequence, max_subs,
+                                              max_ins, max_dels, max_l_dist)),
+                    )
+
+
+class TestCountNearMatchesAsLevenshtein(TestFindNearMatchesLevenshteinBase,
+                                        unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return count_near_matches(subsequence, sequence, max_l_dist=max_l_dist)
+
+    def assertEqual(self, actual_value, expected_value, *args, **kwargs):
+        return super(TestCountNearMatchesAsLevenshtein, self).assertEqual(
+            actual_value, len(expected_value), *args, **kwargs)
+
+    def test_all_different(self):
+        self.assertEqual(self.search('AAAA', 'ZZZZ', max_l_dist=3), [])
+        self.assertGreater(self.search('AAAA', 'ZZZZ', max_l_dist=4), 0)
+
+
+class TestFindBestMatches(unittest.TestCase):
+    def test_invalid_params(self):
+        for max_l_dist, k in [(None, 1), (-1, 1), (1, 0), (1, -1), (1, 1.5)]:
+            with self.subTest(max_l_dist=max_l_dist, k=k):
+                with self.assertRaises((TypeError, ValueError)):
+                    find_best_matches('PATTERN', '---PATTERN---',
+                                      max_l_dist, k)
+
+    def test_no_matches(self):
+        self.assertEqual(find_best_matches('PATTERN', '-' * 20, 2), [])
+
+    def test_exact_match_found_first(self):
+        sequence = '---PATERN---PATTERN---'
+        with unittest.mock.patch(
+                'fuzzysearch.LevenshteinSearch.search') as mock_search:
+            self.assertEqual(
+                find_best_matches('PATTERN', sequence, max_l_dist=2),
+                [Match(start=12, end=19, dist=0, matched='PATTERN')],
+            )
+        self.assertEqual(mock_search.call_count, 0)
+
+    def test_stops_at_minimal_distance(self):
+        sequence = '---PATERN---PATTERM---PATTTERN---'
+        with unittest.mock.patch(
+                'fuzzysearch.LevenshteinSearch.search',
+                wraps=LevenshteinSearch.search) as mock_search:
+            self.assertEqual(
+                find_best_matches('PATTERN', sequence, max_l_dist=3, k=2),
+                [Match(start=3, end=9, dist=1, matched='PATERN'),
+                 Match(start=12, end=19, dist=1, matched='PATTERM')],
+            )
+        self.assertEqual(mock_search.call_count, 1)
+
+    def test_k_larger_than_number_of_matches(self):
+        sequence = '---PATERN---PATTERN---'
+        self.assertEqual(
+            find_best_matches('PATTERN', sequence, max_l_dist=1, k=5),
+            [Match(start=12, end=19, dist=0, matched='PATTERN'),
+             Match(start=3, end=9, dist=1, matched='PATERN')],
+        )
+
+    def test_same_as_sorted_find_near_matches(self):
+        sequence = 'TGCACTGTAGGGATAACAATGACTGTAGGATAACA'
+        for subsequence in ['GGATAAC', 'GACTGTAG', 'GTAGGATACA']:
+            for max_l_dist in range(4):
+                for k in [1, 2, 3]:
+                    with self.subTest(subsequence=subsequence,
+                                      max_l_dist=max_l_dist, k=k):
+                        best_matches = find_best_matches(
+                            subsequence, sequence, max_l_dist, k)
+                        self.assertLessEqual(len(best_matches), k)
+                        all_matches = find_near_matches(
+                            subsequence, sequence, max_l_dist=max_l_dist)
+                        best_dists = sorted(m.dist for m in all_matches)
+                        self.assertEqual(
+                            [m.dist for m in best_matches],
+                            best_dists[:len(best_matches)],
+                        )
+
+
+class TestMaxMatches(unittest.TestCase):
+    def test_invalid_max_matches(self):
+        for max_matches in [0, -1, 1.5, '1']:
+            with self.subTest(max_matches=max_matches):
+                with self.assertRaises(TypeError):
+                    find_near_matches('PATTERN', '---PATTERN---',
+                                      max_l_dist=1, max_matches=max_matches)
+
+    def test_same_as_slicing_results(self):
+        rand = random.Random(0)
+        sequence = ''.join(rand.choice('ACGT') for _i in range(6000))
+        for subsequence in ['GGATAAC', 'GACTGTAG', 'TAAGC']:
+            for (max_subs, max_ins, max_dels, max_l_dist) in [
+                (None, None, None, 0),
+                (1, 0, 0, None),
+                (None, None, None, 1),
+                (1, 1, 0, None),
+            ]:
+                all_matches = find_near_matches(subsequence, sequence,
+                                                max_subs, max_ins, max_dels,
+                                                max_l_dist)
+                for max_matches in sorted({1, 2, 10, len(all_matches) or 1,
+                                           len(all_matches) + 1}):
+                    with self.subTest(subsequence=subsequence,
+                                      max_subs=max_subs, max_ins=max_ins,
+                                      max_dels=max_dels, max_l_dist=max_l_dist,
+                                      max_matches=max_matches):
+                        self.assertEqual(
+                            find_near_matches(subsequence, sequence,
+                                              max_subs, max_ins, max_dels,
+                                              max_l_dist,
+                                              max_matches=max_matches),
+                            all_matches[:max_matches],
+                        )
+
+    def test_stops_early(self):
+        sequence = '---PATERN---' + '-' * 10**6
+        with unittest.mock.patch(
+                'fuzzysearch.LevenshteinSearch.search',
+                wraps=LevenshteinSearch.search) as mock_search:
+            self.assertEqual(
+                find_near_matches('PATTERN', sequence, max_l_dist=1,
+                                  max_matches=1),
+                [Match(start=3, end=9, dist=1, matched='PATERN')],
+            )
+        self.assertEqual(mock_search.call_count, 1)
+        start_index, end_index = mock_search.call_args[0][3:5]
+        self.assertLess(end_index - start_index, len(sequence))
+
+    def test_columns_result_format(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', '---PATERN---PATTERN---',
+                              max_l_dist=1, max_matches=1,
+                              result_format='columns'),
+            MatchArray.from_matches([Match(3, 9, 1, 'PATERN')]),
+        )
+
+
+class TestMaxLpCandidates(unittest.TestCase):
+    def test_invalid_max_lp_candidates(self):
+        for max_lp_candidates in [0, -1, 1.5, '1']:
+            with self.subTest(max_lp_candidates=max_lp_candidates):
+                with self.assertRaises(TypeError):
+                    find_near_matches('PATTERN', '---PATTERN---',
+                                      max_l_dist=1,
+                                      max_lp_candidates=max_lp_candidates)
+
+    def test_search_class(self):
+        import fuzzysearch
+        from fuzzysearch.common import LevenshteinSearchParams
+        for search_params, expected_class in [
+            (LevenshteinSearchParams(1, 1, 1, 2), fuzzysearch.GenericSearch),
+            (LevenshteinSearchParams(1, 1, 0, 2),
+             fuzzysearch.NoDeletionsSearch),
+            (LevenshteinSearchParams(None, None, None, 1),
+             fuzzysearch.LevenshteinSearch),
+        ]:
+            self.assertIs(fuzzysearch.choose_search_class(search_params),
+                          expected_class)
+            search_class = fuzzysearch.choose_search_class(
+                search_params, max_lp_candidates=10)
+            if hasattr(expected_class, 'max_lp_candidates'):
+                self.assertTrue(issubclass(search_class, expected_class))
+                self.assertEqual(search_class.max_lp_candidates, 10)
+            else:
+                self.assertIs(search_class, expected_class)
+
+    def test_same_best_matches(self):
+        from fuzzysearch.instrumentation import add_hook, remove_hook
+        events = []
+
+        def hook(event, details):
+            events.append(event)
+        add_hook(hook)
+        self.addCleanup(remove_hook, hook)
+
+        rand = random.Random(46)
+        sequence = ''.join(rand.choice('ACGT') for _i in range(1000))
+        for subsequence in ['GGATAAC', 'GACTGTAGCATG', 'TAAG']:
+            for limits in [(1, 1, 1, 2), (1, 2, 0, 2), (2, 0, 2, 2)]:
+                with self.subTest(subsequence=subsequence, limits=limits):
+                    expected = find_near_matches(subsequence, sequence,
+                                                 *limits)
+                    del events[:]
+                    matches = find_near_matches(subsequence, sequence,
+                                                *limits, max_lp_candidates=1)
+                    # the n-gram searches allowing only one kind of indel
+                    # don't use the linear programming search
+                    if len(subsequence) < 12 or 0 not in limits:
+                        self.assertIn('lp_candidates_limit', events)
+                    # equally good matches in a group may be chosen
+                    # differently
+                    self.assertEqual(
+                        [(match.dist, match.end - match.start)
+                         for match in matches],
+                        [(match.dist, match.end - match.start)
+                         for match in expected],
+                    )
+                    self.assertEqual(
+                        count_near_matches(subsequence, sequence, *limits,
+                                           max_lp_candidates=1),
+                        len(expected),
+                    )
+                    self.assertEqual(
+                        has_near_match(subsequence, sequence, *limits,
+                                       max_lp_candidates=1),
+                        bool(expected),
+                    )
+
+
+class TestIndexRange(unittest.TestCase):
+    def test_default_is_whole_sequence(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', '---PATERN---', max_l_dist=1,
+                              start_index=0, end_index=None),
+            find_near_matches('PATTERN', '---PATERN---', max_l_dist=1),
+        )
+
+    def test_absolute_indexes(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', 'PATTERN---PATERN---PATTERN',
+                              max_l_dist=1, start_index=5, end_index=20),
+            [Match(start=10, end=16, dist=1, matched='PATERN')],
+        )
+
+    def test_partial_match_at_range_edges(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', '--PATTERN--',
+                              max_l_dist=1, start_index=3),
+            [Match(start=3, end=9, dist=1, matched='ATTERN')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', '--PATTERN--',
+                              max_l_dist=1, end_index=8),
+            [Match(start=2, end=8, dist=1, matched='PATTER')],
+        )
+
+    def test_out_of_bounds_indexes_are_clamped(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', '---PATTERN---', max_l_dist=0,
+                              start_index=-5, end_index=100),
+            [Match(start=3, end=10, dist=0, matched='PATTERN')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', '---PATTERN---', max_l_dist=0,
+                              start_index=8, end_index=2),
+            [],
+        )
+
+    def test_has_and_count(self):
+        sequence = 'PATTERN---PATERN---PATTERN'
+        self.assertTrue(has_near_match('PATTERN', sequence, max_l_dist=1,
+                                       start_index=5, end_index=20))
+        self.assertFalse(has_near_match('PATTERN', sequence, max_l_dist=0,
+                                        start_index=5, end_index=20))
+        self.assertEqual(count_near_matches('PATTERN', sequence, max_l_dist=1,
+                                            start_index=5, end_index=20), 1)
+        self.assertEqual(count_near_matches('PATTERN', sequence, max_l_dist=1,
+                                            start_index=5), 2)
+
+    def test_with_max_matches(self):
+        sequence = 'PATTERN---' * 100
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=1,
+                              start_index=500, max_matches=2),
+            [Match(start=500, end=507, dist=0, matched='PATTERN'),
+             Match(start=510, end=517, dist=0, matched='PATTERN')],
+        )
+
+
+class TestFindNearMatchesInRegions(unittest.TestCase):
+    def test_empty_regions(self):
+        self.assertEqual(
+            find_near_matches_in_regions('PATTERN', '---PATTERN---', [],
+                                         max_l_dist=1),
+            [],
+        )
+        self.assertEqual(
+            find_near_matches_in_regions('PATTERN', '---PATTERN---',
+                                         [(3, 3), (20, 30)], max_l_dist=1),
+            [],
+        )
+
+    def test_only_matches_within_regions(self):
+        sequence = 'PATTERN---PATERN---PATTERN---PATTRN'
+        self.assertEqual(
+            find_near_matches_in_regions('PATTERN', sequence,
+                                         [(29, 35), (8, 18)], max_l_dist=1),
+            [Match(start=10, end=16, dist=1, matched='PATERN'),
+             Match(start=29, end=35, dist=1, matched='PATTRN')],
+        )
+
+    def test_overlapping_regions_are_merged(self):
+        sequence = '---PATTERN---'
+        expected = [Match(start=3, end=10, dist=0, matched='PATTERN')]
+        for regions in [
+            [(0, 7), (5, 13)],
+            [(5, 13), (0, 7)],
+            [(0, 6), (6, 13)],
+            [(2, 8), (0, 5), (7, 11)],
+        ]:
+            with self.subTest(regions=regions):
+                self.assertEqual(
+                    find_near_matches_in_regions('PATTERN', sequence, regions,
+                                                 max_l_dist=0),
+                    expected,
+                )
+
+    def test_matches_dont_span_separate_regions(self):
+        self.assertEqual(
+            find_near_matches_in_regions('PATTERN', '---PATTERN---',
+                                         [(0, 6), (7, 13)], max_l_dist=0),
+            [],
+        )
+
+    def test_same_as_find_near_matches_with_index_range(self):
+        rand = random.Random(0)
+        sequence = ''.join(rand.choice('ACGT') for _i in range(2000))
+        regions = [(100, 300), (250, 400), (1000, 1500), (1800, 2500)]
+        merged_regions = [(100, 400), (1000, 1500), (1800, 2000)]
+        for (max_subs, max_ins, max_dels, max_l_dist) in [
+            (None, None, None, 0),
+            (1, 0, 0, None),
+            (None, None, None, 1),
+            (1, 1, 0, None),
+        ]:
+            with self.subTest(max_subs=max_subs, max_ins=max_ins,
+                              max_dels=max_dels, max_l_dist=max_l_dist):
+                self.assertEqual(
+                    find_near_matches_in_regions('GGATAAC', sequence, regions,
+                                                 max_subs, max_ins, max_dels,
+                                                 max_l_dist),
+                    [
+                        match
+                        for start_index, end_index in merged_regions
+                        for match in find_near_matches(
+                            'GGATAAC', sequence,
+                            max_subs, max_ins, max_dels, max_l_dist,
+                            start_index=start_index, end_index=end_index,
+                        )
+                    ],
+                )
+
+    def test_invalid_regions(self):
+        with self.assertRaises(ValueError):
+            find_near_matches_in_regions('PATTERN', '---PATTERN---',
+                                         [(5, 2)], max_l_dist=1)
+        with self.assertRaises(TypeError):
+            find_near_matches_in_regions('PATTERN', '---PATTERN---',
+                                         [(0, 5.0)], max_l_dist=1)
+        with self.assertRaises(ValueError):
+            find_near_matches_in_regions('PATTERN', '---PATTERN---',
+                                         [(0, 1, 2)], max_l_dist=1)
+
+
+class TestAnchoredSearch(unittest.TestCase):
+    def test_invalid_anchor(self):
+        with self.assertRaises(ValueError):
+            find_near_matches('PATTERN', 'PATTERN---', max_l_dist=1,
+                              anchor='middle')
+        for anchor_window in [0, -1, 1.5]:
+            with self.subTest(anchor_window=anchor_window):
+                with self.assertRaises(TypeError):
+                    find_near_matches('PATTERN', 'PATTERN---', max_l_dist=1,
+                                      anchor='start',
+                                      anchor_window=anchor_window)
+
+    def test_prefix_and_suffix(self):
+        sequence = 'PATERN---PATTERN---PATTERM'
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=1,
+                              anchor='start'),
+            [Match(start=0, end=6, dist=1, matched='PATERN')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=1,
+                              anchor='end'),
+            [Match(start=19, end=26, dist=1, matched='PATTERM')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=1,
+                              anchor='both'),
+            [],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', 'PATERN', max_l_dist=1,
+                              anchor='both'),
+            [Match(start=0, end=6, dist=1, matched='PATERN')],
+        )
+
+    def test_anchor_window(self):
+        sequence = '--PATTERN---PATTERN--'
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=0,
+                              anchor='start', anchor_window=2),
+            [],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=0,
+                              anchor='start', anchor_window=3),
+            [Match(start=2, end=9, dist=0, matched='PATTERN')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=0,
+                              anchor='end', anchor_window=3),
+            [Match(start=12, end=19, dist=0, matched='PATTERN')],
+        )
+
+    def test_anchored_match_is_chosen_from_its_group(self):
+        # the best match overall starts at index 1, outside the window
+        self.assertEqual(
+            find_near_matches('PATTERN', 'XPATTERN', max_substitutions=1,
+                              max_insertions=1, max_deletions=0,
+                              anchor='start'),
+            [Match(start=0, end=8, dist=1, matched='XPATTERN')],
+        )
+
+    def test_index_range(self):
+        sequence = 'PATTERN---PATTERN---PATTERN'
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=0,
+                              anchor='start', start_index=10),
+            [Match(start=10, end=17, dist=0, matched='PATTERN')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', sequence, max_l_dist=0,
+                              anchor='end', end_index=17),
+            [Match(start=10, end=17, dist=0, matched='PATTERN')],
+        )
+
+    def test_random_sequences(self):
+        rand = random.Random(0)
+        for _i in range(10):
+            sequence = ''.join(rand.choice('ACGT') for _j in range(200))
+            for (max_subs, max_ins, max_dels, max_l_dist) in [
+                (None, None, None, 0),
+                (1, 0, 0, None),
+                (None, None, None, 2),
+                (1, 2, 0, None),
+            ]:
+                all_matches = find_near_matches('GACTGTAG', sequence,
+                                                max_subs, max_ins, max_dels,
+                                                max_l_dist)
+                for anchor, anchor_window in [
+                    ('start', 1), ('start', 50), ('end', 1), ('end', 50),
+                    ('both', 150), ('both', 200),
+                ]:
+                    def is_anchored(match):
+                        return (
+                            (anchor == 'end' or
+                             match.start < anchor_window) and
+                            (anchor == 'start' or
+                             match.end > len(sequence) - anchor_window)
+                        )
+
+                    with self.subTest(max_subs=max_subs, max_ins=max_ins,
+                                      max_dels=max_dels, max_l_dist=max_l_dist,
+                                      anchor=anchor,
+                                      anchor_window=anchor_window):
+                        matches = find_near_matches(
+                            'GACTGTAG', sequence,
+                            max_subs, max_ins, max_dels, max_l_dist,
+                            anchor=anchor, anchor_window=anchor_window)
+                        self.assertTrue(all(map(is_anchored, matches)))
+                        # anchored matches found by a full search must also
+                        # be found, or overlapped by at least as good a match
+                        for match in filter(is_anchored, all_matches):
+                            self.assertTrue(any(
+                                anchored_match.start < match.end and
+                                match.start < anchored_match.end and
+                                anchored_match.dist <= match.dist
+                                for anchored_match in matches
+                            ))
+                        self.assertEqual(
+                            find_near_matches('GACTGTAG', sequence,
+                                              max_subs, max_ins, max_dels,
+                                              max_l_dist, anchor=anchor,
+                                              anchor_window=anchor_window,
+                                              max_matches=1),
+                            matches[:1],
+                        )
+
+
+class TestBothStrands(unittest.TestCase):
+    def test_strand_tagged_matches(self):
+        self.assertEqual(
+            find_near_matches('GGATC', 'AAGGATCCAGATTCC', max_l_dist=1,
+                              both_strands=True),
+            [StrandedMatch(2, 7, 0, 'GGATC', '+'),
+             StrandedMatch(3, 8, 0, 'GATCC', '-'),
+             StrandedMatch(9, 15, 1, 'GATTCC', '-')],
+        )
+
+    def test_palindromic_subsequence(self):
+        self.assertEqual(
+            find_near_matches('GATC', 'AAGATCA', max_l_dist=0,
+                              both_strands=True),
+            [StrandedMatch(2, 6, 0, 'GATC', '+'),
+             StrandedMatch(2, 6, 0, 'GATC', '-')],
+        )
+
+    def test_same_as_searching_separately(self):
+        rand = random.Random(0)
+        sequence = ''.join(rand.choice('ACGT') for _i in range(2000))
+        subsequence = 'GGATAAC'
+        for (max_subs, max_ins, max_dels, max_l_dist) in [
+            (None, None, None, 0),
+            (1, 0, 0, None),
+            (None, None, None, 1),
+            (1, 1, 0, None),
+        ]:
+            with self.subTest(max_subs=max_subs, max_ins=max_ins,
+                              max_dels=max_dels, max_l_dist=max_l_dist):
+                matches = find_near_matches(subsequence, sequence,
+                                            max_subs, max_ins, max_dels,
+                                            max_l_dist, both_strands=True)
+                self.assertEqual(
+                    [match for match in matches if match.strand == '+'],
+                    [
+                        StrandedMatch(match.start, match.end, match.dist,
+                                      match.matched, '+')
+                        for match in find_near_matches(
+                            subsequence, sequence,
+                            max_subs, max_ins, max_dels, max_l_dist,
+                        )
+                    ],
+                )
+                self.assertEqual(
+                    [match for match in matches if match.strand == '-'],
+                    [
+                        StrandedMatch(match.start, match.end, match.dist,
+                                      match.matched, '-')
+                        for match in find_near_matches(
+                            reverse_complement(subsequence), sequence,
+                            max_subs, max_ins, max_dels, max_l_dist,
+                        )
+                    ],
+                )
+                self.assertEqual(
+                    [match.start for match in matches],
+                    sorted(match.start for match in matches),
+                )
+                self.assertEqual(
+                    find_near_matches(subsequence, sequence,
+                                      max_subs, max_ins, max_dels, max_l_dist,
+                                      both_strands=True, max_matches=3),
+                    matches[:3],
+                )
+
+    def test_byteslike(self):
+        self.assertEqual(
+            find_near_matches(b'GGATC', b'AAGGATCCA', max_l_dist=0,
+                              both_strands=True),
+            [StrandedMatch(2, 7, 0, b'GGATC', '+'),
+             StrandedMatch(3, 8, 0, b'GATCC', '-')],
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            find_near_matches('PATTERN', '---PATTERN---', max_l_dist=1,
+                              both_strands=True)
+        with self.assertRaises(ValueError):
+            find_near_matches('GATTACA', '---GATTACA---', max_l_dist=1,
+                              both_strands=True, result_format='columns')
+
+
+class TestEquivalences(unittest.TestCase):
+    def test_case_insensitive(self):
+        equivalences = EquivalenceTable.case_insensitive()
+        identity = EquivalenceTable.from_classes(range(256))
+        rng = random.Random(35)
+        for _i in range(20):
+            sequence = ''.join(rng.choice('aAbBcC') for _j in range(60))
+            subsequence = ''.join(rng.choice('aAbBcC') for _j in range(6))
+            for kwargs in [
+                dict(max_l_dist=0),
+                dict(max_l_dist=1),
+                dict(max_substitutions=1, max_insertions=0,
+                     max_deletions=0),
+                dict(max_substitutions=1, max_insertions=1,
+                     max_deletions=0),
+            ]:
+                expected = find_near_matches(
+                    subsequence.lower(), sequence.lower(),
+                    equivalences=identity, **kwargs)
+                for (subseq, seq) in [
+                    (subsequence, sequence),
+                    (subsequence.encode('ascii'), sequence.encode('ascii')),
+                ]:
+                    self.assertEqual(
+                        [(m.start, m.end, m.dist) for m in find_near_matches(
+                            subseq, seq, equivalences=equivalences, **kwargs)],
+                        [(m.start, m.end, m.dist) for m in expected],
+                    )
+
+    def test_dna_iupac(self):
+        equivalences = EquivalenceTable.dna_iupac()
+        sequence = 'GGGTTACGATTTTCGGGG'
+        self.assertEqual(
+            find_near_matches('TTNCGR', sequence, max_l_dist=0,
+                              equivalences=equivalences),
+            [Match(3, 9, 0, 'TTACGA'), Match(10, 16, 0, 'TTTCGG')],
+        )
+        self.assertEqual(
+            find_near_matches('TTNCGR', sequence, max_l_dist=0),
+            [],
+        )
+        self.assertEqual(
+            find_near_matches('TTWCGR', sequence, max_l_dist=1,
+                              equivalences=equivalences),
+            [Match(3, 9, 0, 'TTACGA'), Match(10, 16, 0, 'TTTCGG')],
+        )
+
+    def test_bytes_and_lists_consistent(self):
+        equivalences = EquivalenceTable.dna_iupac()
+        subsequence = b'ACNNTR'
+        sequence = b'TTGACGATGTACCTTAGCCATTTAACGGGTCCA'
+        for kwargs in [
+            dict(max_l_dist=1),
+            dict(max_substitutions=1, max_insertions=1, max_deletions=1),
+            dict(max_substitutions=2, max_insertions=0, max_deletions=0),
+        ]:
+            self.assertEqual(
+                [(m.start, m.end, m.dist) for m in find_near_matches(
+                    subsequence, sequence, equivalences=equivalences,
+                    **kwargs)],
+                [(m.start, m.end, m.dist) for m in find_near_matches(
+                    list(subsequence), list(sequence),
+                    equivalences=equivalences, **kwargs)],
+            )
+
+    def test_has_and_count(self):
+        equivalences = EquivalenceTable.case_insensitive()
+        self.assertTrue(has_near_match('PATTERN', 'xxpatternxx', max_l_dist=0,
+                                       equivalences=equivalences))
+        self.assertFalse(has_near_match('PATTERN', 'xxpatternxx',
+                                        max_l_dist=0))
+        self.assertEqual(
+            count_near_matches('ab', 'AB ab Ab aB', max_l_dist=0,
+                               equivalences=equivalences),
+            4,
+        )
+
+    def test_in_regions(self):
+        equivalences = EquivalenceTable.case_insensitive()
+        self.assertEqual(
+            [m.start for m in find_near_matches_in_regions(
+                'ab', 'AB ab Ab aB', [(0, 5), (9, 11)], max_l_dist=0,
+                equivalences=equivalences)],
+            [0, 3, 9],
+        )
+
+    def test_exact_search_rejects_equivalences(self):
+        from fuzzysearch.search_exact import ExactSearch
+        from fuzzysearch.common import LevenshteinSearchParams
+        with self.assertRaises(ValueError):
+            ExactSearch.has_match(
+                'a', 'abc', LevenshteinSearchParams(0, 0, 0, 0),
+                equivalences=EquivalenceTable.case_insensitive())
+
+
+class TestCircularSearch(unittest.TestCase):
+    def test_no_wrapping_matches(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', '--PATERN--', max_l_dist=1,
+                              circular=True),
+            [Match(2, 8, 1, 'PATERN')],
+        )
+
+    def test_wrapping_match(self):
+        self.assertEqual(
+            find_near_matches('PATTERN', 'TERN----------PAT', max_l_dist=1,
+                              circular=True),
+            [Match(14, 21, 0, 'PATTERN')],
+        )
+        self.assertEqual(
+            find_near_matches('PATTERN', 'TERN----------PAT', max_l_dist=1),
+            [],
+        )
+
+    def test_wrapping_match_with_edits(self):
+        for (max_subs, max_ins, max_dels), sequence, expected_match in [
+            ((1, 0, 0), 'TERN-------PAX', Match(11, 18, 1, 'PAXTERN')),
+            ((0, 1, 0), 'XTERN-------PAT', Match(12, 20, 1, 'PATXTERN')),
+            ((0, 0, 1), 'ERN-------PAT', Match(10, 16, 1, 'PATERN')),
+            ((1, 1, 1), 'XTERN-------PAT', Match(12, 20, 1, 'PATXTERN')),
+        ]:
+            self.assertEqual(
+                find_near_matches('PATTERN', sequence,
+                                  max_subs, max_ins, max_dels, max_l_dist=1,
+                                  circular=True),
+                [expected_match],
+            )
+
+    def test_exact_search(self):
+        self.assertEqual(
+            find_near_matches('AB', 'BxA', max_l_dist=0, circular=True),
+            [Match(2, 4, 0, 'AB')],
+        )
+
+    def test_overlapping_linear_match_is_dropped(self):
+        # 'PATT' at the end of the sequence is a worse match of the same
+        # occurrence which wraps around to 'ERN' at its start
+        self.assertEqual(
+            find_near_matches('PATTERN', 'ERN-------PATT', max_l_dist=3,
+                              circular=True),
+            [Match(10, 17, 0, 'PATTERN')],
+        )
+
+    def test_short_sequence(self):
+        # matches may not go around the sequence more than once
+        for match in find_near_matches('ABCABCA', 'ABC', max_l_dist=4,
+                                       circular=True):
+            self.assertLessEqual(match.end - match.start, 3)
+        self.assertEqual(
+            find_near_matches('ABC', '', max_l_dist=1, circular=True),
+            [],
+        )
+
+    def test_max_matches(self):
+        sequence = 'ERN--PATERN--PATTERN--PATT'
+        all_matches = find_near_matches('PATTERN', sequence, max_l_dist=1,
+                                        circular=True)
+        self.assertEqual(
+            all_matches,
+            [Match(5, 11, 1, 'PATERN'),
+             Match(13, 20, 0, 'PATTERN'),
+             Match(22, 29, 0, 'PATTERN')],
+        )
+        for max_matches in [1, 2, 3, 4]:
+            self.assertEqual(
+                find_near_matches('PATTERN', sequence, max_l_dist=1,
+                                  circular=True, max_matches=max_matches),
+                all_matches[:max_matches],
+            )
+
+    def test_both_strands(self):
+        self.assertEqual(
+            find_near_matches('GGATC', 'TCCAGATTCCAAGGA', max_l_dist=1,
+                              circular=True, both_strands=True),
+            [StrandedMatch(4, 10, 1, 'GATTCC', '-'),
+             StrandedMatch(12, 17, 0, 'GGATC', '+'),
+             StrandedMatch(13, 18, 0, 'GATCC', '-')],
+        )
+
+    def test_bytes_and_lists(self):
+        for sequence in [b'TERN----------PAT', list(b'TERN----------PAT')]:
+            subsequence = b'PATTERN' if isinstance(sequence, bytes) \
+                else list(b'PATTERN')
+            matches = find_near_matches(subsequence, sequence, max_l_dist=1,
+                                        circular=True)
+            self.assertEqual(matches, [Match(14, 21, 0, subsequence)])
+
+    def test_rotated_planted_matches(self):
+        rng = random.Random(36)
+        for _i in range(30):
+            pattern = ''.join(rng.choice('ACGT') for _j in range(8))
+            planted = list(pattern)
+            for _j in range(rng.randint(0, 2)):
+                planted[rng.randrange(len(planted))] = rng.choice('ACGT')
+            sequence = ''.join(rng.choice('xyz') for _j in range(20)) + \
+                ''.join(planted) + \
+                ''.join(rng.choice('xyz') for _j in range(20))
+            [linear_match] = find_near_matches(pattern, sequence,
+                                               max_l_dist=2)
+
+            # rotate the sequence, so that its origin splits the match
+            cut = rng.randint(linear_match.start + 1, linear_match.end - 1)
+            rotated = sequence[cut:] + sequence[:cut]
+            shift = len(sequence) - cut
+            [circular_match] = find_near_matches(pattern, rotated,
+                                                 max_l_dist=2, circular=True)
+            self.assertEqual(
+                (circular_match.start, circular_match.end,
+                 circular_match.dist),
+                (linear_match.start + shift, linear_match.end + shift,
+                 linear_match.dist),
+            )
+
+    def test_invalid_combinations(self):
+        for kwargs in [dict(result_format='columns'), dict(anchor='start'),
+                       dict(start_index=1), dict(end_index=5)]:
+            with self.assertRaises(ValueError):
+                find_near_matches('PATTERN', 'TERN--PAT', max_l_dist=1,
+                                  circular=True, **kwargs)
+
+    def test_reviewed_examples(self):
+        self.assertIn(
+            Match(2, 5, 1, 'TTG'),
+            find_near_matches('TTGC', 'TGT', max_l_dist=1, circular=True),
+        )
+        sequence = 'TTAGTTGTGCCGCAGCGAAGTAGTG'
+        for match in find_near_matches('GA', sequence, max_l_dist=2,
+                                       circular=True):
+            self.assertIn(match.start, range(len(sequence)))
+
+    @staticmethod
+    def levenshtein_distance(subsequence, text):
+        distances = list(range(len(text) + 1))
+        for i, item in enumerate(subsequence):
+            prev_distances, distances = distances, [i + 1]
+            for j, text_item in enumerate(text):
+                distances.append(min(prev_distances[j] + (item != text_item),
+                                     prev_distances[j + 1] + 1,
+                                     distances[j] + 1))
+        return distances[-1]
+
+    def random_cases(self, seed, n_cases):
+        """Random searches, including of sequences no longer than the
+        subsequence, with max. distances smaller than its length."""
+        rng = random.Random(seed)
+        for _i in range(n_cases):
+            subsequence = ''.join(rng.choice('AC')
+                                  for _j in range(rng.randint(1, 7)))
+            sequence = ''.join(rng.choice('AC')
+                               for _j in range(rng.randint(1, 14)))
+            yield subsequence, sequence, rng.randrange(len(subsequence))
+
+    def test_ring_oracle_substitutions_only(self):
+        # exact and substitution-only searches return every match, even
+        # overlapping ones, so these are simple to find by brute force
+        for subsequence, sequence, max_subs in self.random_cases(361, 300):
+            ring = sequence * 2
+            candidates = [
+                (start, start + len(subsequence),
+                 sum(a != b for a, b in zip(
+                     subsequence, ring[start:start + len(subsequence)])))
+                for start in range(len(sequence))
+                if len(subsequence) <= len(sequence)
+            ]
+            for max_dist, kwargs in [
+                (max_subs, dict(max_substitutions=max_subs,
+                                max_insertions=0, max_deletions=0)),
+                (0, dict(max_l_dist=0)),
+            ]:
+                with self.subTest(subsequence=subsequence, sequence=sequence,
+                                  **kwargs):
+                    matches = find_near_matches(subsequence, sequence,
+                                                circular=True, **kwargs)
+                    self.assertEqual(
+                        [(m.start, m.end, m.dist) for m in matches],
+                        [candidate for candidate in candidates
+                         if candidate[2] <= max_dist],
+                    )
+                    for match in matches:
+                        self.assertEqual(match.matched,
+                                         ring[match.start:match.end])
+
+    def test_ring_oracle_levenshtein(self):
+        for subsequence, sequence, max_l_dist in self.random_cases(362, 300):
+            if max_l_dist == 0:
+                continue
+            seq_len = len(sequence)
+            ring = sequence * 2
+            with self.subTest(subsequence=subsequence, sequence=sequence,
+                              max_l_dist=max_l_dist):
+                matches = find_near_matches(subsequence, sequence,
+                                            max_l_dist=max_l_dist,
+                                            circular=True)
+
+                # each match is a part of the ring at most once around it
+                for match in matches:
+                    self.assertIn(match.start, range(seq_len))
+                    self.assertLessEqual(match.end - match.start, seq_len)
+                    self.assertEqual(match.matched,
+                                     ring[match.start:match.end])
+                    self.assertEqual(
+                        match.dist,
+                        self.levenshtein_distance(subsequence, match.matched),
+                    )
+
+                # the matches don't overlap anywhere around the ring
+                covered = [
+                    index % seq_len
+                    for match in matches
+                    for index in range(match.start, match.end)
+                ]
+                self.assertEqual(len(covered), len(set(covered)))
+
+                # the best match is found
+                best_dist = min(
+                    self.levenshtein_distance(subsequence,
+                                              ring[start:start + length])
+                    for start in range(seq_len)
+                    for length in range(1, seq_len + 1)
+                )
+                if best_dist > max_l_dist:
+                    self.assertEqual(matches, [])
+                else:
+                    self.assertEqual(min(m.dist for m in matches), best_dist)
+
+
+class TestFindNearMatchPairs(unittest.TestCase):
+    def test_simple(self):
+        sequence = 'xxAACCGGxxxxxxxxxxxxTTGAxxxxxxxAACGGxxxxTTGAxx'
+        self.assertEqual(
+            find_near_match_pairs('AACCGG', 'TTGA', sequence, 5, 30,
+                                  max_l_dist=1),
+            [(Match(2, 8, 0, 'AACCGG'), Match(20, 24, 0, 'TTGA'))],
+        )
+
+    def test_gap_bounds_are_inclusive(self):
+        sequence = 'LEFT' + '-' * 5 + 'RIGHT'
+        for min_gap, max_gap, expected_n_pairs in [
+            (5, 5, 1), (0, 5, 1), (5, 10, 1), (0, 4, 0), (6, 10, 0),
+        ]:
+            self.assertEqual(
+                len(find_near_match_pairs('LEFT', 'RIGHT', sequence,
+                                          min_gap, max_gap, max_l_dist=0)),
+                expected_n_pairs,
+            )
+
+    def test_multiple_pairs(self):
+        sequence = 'AAAA-CCCC--AAAT-CCCC---GCCC'
+        self.assertEqual(
+            find_near_match_pairs('AAAA', 'CCCC', sequence, 0, 9,
+                                  max_l_dist=1),
+            [(Match(0, 4, 0, 'AAAA'), Match(5, 9, 0, 'CCCC')),
+             (Match(11, 15, 1, 'AAAT'), Match(16, 20, 0, 'CCCC')),
+             (Match(11, 15, 1, 'AAAT'), Match(24, 27, 1, 'CCC'))],
+        )
+
+    def test_right_not_searched_outside_of_gaps(self):
+        # the right subsequence appears only before the left one
+        sequence = 'RIGHT---LEFT---------'
+        self.assertEqual(
+            find_near_match_pairs('LEFT', 'RIGHT', sequence, 0, 20,
+                                  max_l_dist=1),
+            [],
+        )
+
+    def test_no_left_matches(self):
+        self.assertEqual(
+            find_near_match_pairs('LEFT', 'RIGHT', '----RIGHT----', 0, 20,
+                                  max_l_dist=1),
+            [],
+        )
+
+    def test_equivalences(self):
+        self.assertEqual(
+            find_near_match_pairs(
+                'ACGT', 'RYN', 'ttacgttgcataa', 1, 5, max_l_dist=0,
+                equivalences=EquivalenceTable.dna_iupac()),
+            [(Match(2, 6, 0, 'acgt'), Match(7, 10, 0, 'gca')),
+             (Match(2, 6, 0, 'acgt'), Match(9, 12, 0, 'ata'))],
+        )
+
+    def test_search_class_chosen_per_subsequence(self):
+        import fuzzysearch
+        with unittest.mock.patch.object(
+                fuzzysearch, 'choose_search_class',
+                wraps=fuzzysearch.choose_search_class) as mock_choose:
+            find_near_match_pairs('AACCGG', 'TTGA', 'xxAACCGGxxxTTGAxx',
+                                  0, 10, max_substitutions=1,
+                                  max_insertions=1, max_deletions=1,
+                                  max_l_dist=2)
+        self.assertEqual(
+            [call[0][2] for call in mock_choose.call_args_list],
+            ['AACCGG', 'TTGA'],
+        )
+
+    def test_invalid_gaps(self):
+        with self.assertRaises(TypeError):
+            find_near_match_pairs('A', 'B', 'AB', 0, 1.5, max_l_dist=0)
+        with self.assertRaises(ValueError):
+            find_near_match_pairs('A', 'B', 'AB', -1, 1, max_l_dist=0)
+        with self.assertRaises(ValueError):
+            find_near_match_pairs('A', 'B', 'AB', 3, 2, max_l_dist=0)
+
+    def test_planted_pairs(self):
+        rng = random.Random(37)
+        for _i in range(20):
+            left = ''.join(rng.choice('ACGT') for _j in range(10))
+            right = ''.join(rng.choice('ACGT') for _j in range(10))
+            parts = []
+            for _j in range(rng.randint(1, 4)):
+                parts.append(''.join(rng.choice('xyz')
+                                     for _k in range(rng.randint(5, 40))))
+                parts.append(rng.choice([left, right]))
+            parts.append('xyz')
+            sequence = ''.join(parts)
+            min_gap, max_gap = sorted(rng.randint(0, 60) for _j in range(2))
+
+            left_matches = find_near_matches(left, sequence, max_l_dist=1)
+            right_matches = find_near_matches(right, sequence, max_l_dist=1)
+            expected = [
+                (left_match, right_match)
+                for left_match in left_matches
+                for right_match in right_matches
+                if min_gap <= right_match.start - left_match.end <= max_gap
+            ]
+            self.assertEqual(
+                find_near_match_pairs(left, right, sequence,
+                                      min_gap, max_gap, max_l_dist=1),
+                expected,
+            )
+
+
+class TestSeedProfile(unittest.TestCase):
+    def test_same_results(self):
+        rng = random.Random(39)
+        for _i in range(10):
+            # low-complexity sequences, made mostly of runs of 'A'
+            sequence = ''.join(
+                rng.choice(['A' * 8, 'C', 'G', 'T', 'ACGT'])
+                for _j in range(200)
+            )
+            subsequence = 'A' * 10 + ''.join(
+                rng.choice('ACGT') for _j in range(12))
+            self.check_same_results(subsequence, sequence)
+            self.check_same_results(subsequence.encode('ascii'),
+                                    sequence.encode('ascii'))
+
+    def test_same_results_with_many_overlapping_matches(self):
+        self.check_same_results('A' * 9, 'A' * 47)
+        self.check_same_results(b'A' * 9, b'A' * 47)
+        self.check_same_results(b'AAAAAAAAC', b'AAAAAAAAAAAAC' * 5)
+        self.check_same_results(list('AAAAAAAAC'), list('AAAAAAAAAAAAC' * 5))
+
+    def test_same_results_for_all_sequence_types(self):
+        for subsequence, sequence in [
+            ('A' * 9, 'A' * 47),
+            ('AAAAAAAAC', 'AAAAAAAAAAAAC' * 5),
+        ]:
+            for seed_profile in [None, 'sample']:
+                expected = [
+                    (match.start, match.end, match.dist)
+                    for match in find_near_matches(
+                        subsequence, sequence, max_substitutions=2,
+                        max_insertions=0, max_deletions=0,
+                        seed_profile=seed_profile)
+                ]
+                for subseq, seq in [
+                    (subsequence.encode('ascii'), sequence.encode('ascii')),
+                    (list(subsequence), list(sequence)),
+                    (tuple(subsequence), tuple(sequence)),
+                ]:
+                    matches = find_near_matches(
+                        subseq, seq, max_substitutions=2,
+                        max_insertions=0, max_deletions=0,
+                        seed_profile=seed_profile)
+                    self.assertEqual(
+                        [(match.start, match.end, match.dist)
+                         for match in matches],
+                        expected,
+                    )
+
+    def check_same_results(self, subsequence, sequence):
+        profile = SequenceProfile.from_sequence(sequence)
+        for kwargs in [
+            dict(max_l_dist=1),
+            dict(max_l_dist=2),
+            dict(max_substitutions=1, max_insertions=0, max_deletions=0),
+            dict(max_substitutions=2, max_insertions=0, max_deletions=0),
+            dict(max_substitutions=1, max_insertions=1,
+                 max_deletions=1, max_l_dist=2),
+        ]:
+            expected = find_near_matches(subsequence, sequence, **kwargs)
+            for seed_profile in ['sample', profile]:
+                self.assertEqual(
+                    find_near_matches(subsequence, sequence,
+                                      seed_profile=seed_profile, **kwargs),
+                    expected,
+                )
+                self.assertEqual(
+                    has_near_match(subsequence, sequence,
+                                   seed_profile=seed_profile, **kwargs),
+                    bool(expected),
+                )
+
+    def test_with_other_options(self):
+        sequence = 'AAAAAAAAAACGTACGAAAAAAAAAATTGCA'
+        profile = SequenceProfile.from_sequence(sequence)
+        for kwargs in [
+            dict(max_matches=1),
+            dict(start_index=5, end_index=25),
+            dict(both_strands=True),
+            dict(circular=True),
+            dict(result_format='columns'),
+        ]:
+            self.assertEqual(
+                find_near_matches('AAAACGTACG', sequence, max_l_dist=1,
+                                  seed_profile=profile, **kwargs),
+                find_near_matches('AAAACGTACG', sequence, max_l_dist=1,
+                                  **kwargs),
+            )
+
+    def test_invalid_seed_profile(self):
+        for seed_profile in ['auto', 3, object()]:
+            with self.assertRaises(TypeError):
+                find_near_matches('PATTERN', 'PATERN', max_l_dist=1,
+                                  seed_profile=seed_profile)
@@ -151,6 +151,30 @@ class TestSearchFile(unittest.TestCase):
                              for match in expected_matches]
                         )
 
+    def test_max_matches_stops_reading(self):
+        haystack = b('---PATERN---PATTERN---') + bytes(2**16)
+        for max_matches, expected_matches in [
+            (1, [Match(3, 9, 1, b('PATERN'))]),
+            (2, [Match(3, 9, 1, b('PATERN')), Match(12, 19, 0, b('PATTERN'))]),
+        ]:
+            with self.subTest(max_matches=max_matches):
+                f = io.BytesIO(haystack)
+                self.assertEqual(
+                    find_near_matches_in_file(b('PATTERN'), f, max_l_dist=1,
+                                              max_matches=max_matches,
+                                              _chunk_size=2**10),
+                    expected_matches,
+                )
+                self.assertLess(f.tell(), len(haystack))
+
+        f = io.StringIO(haystack.decode('ascii'))
+        self.assertEqual(
+            find_near_matches_in_file('PATTERN', f, max_l_dist=1,
+                                      max_matches=1, _chunk_size=2**10),
+            [Match(3, 9, 1, 'PATERN')],
+        )
+        self.assertLess(f.tell(), len(haystack))
+
 
 # WARNING, DARK MAGIC AHEAD!
 #
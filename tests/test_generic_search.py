@@ -1,15 +1,23 @@
+import random
 import unittest
+import unittest.mock
 
 from tests.compat import b
+from tests.utils import search_in_index_range
 from tests.test_levenshtein import TestFindNearMatchesLevenshteinBase
 from fuzzysearch.common import Match, get_best_match_in_group, group_matches, LevenshteinSearchParams, consolidate_overlapping_matches
 from tests.test_substitutions_only import TestSubstitionsOnlyBase, \
-    TestHasNearMatchSubstitionsOnlyBase
+    TestHasNearMatchSubstitionsOnlyBase, IDENTITY_EQUIVALENCES
 from fuzzysearch.generic_search import \
     _find_near_matches_generic_linear_programming as fnm_generic_lp, \
+    _prune_dominated_candidates, GenericSearchCandidate, \
     find_near_matches_generic_ngrams as fnm_generic_ngrams, \
     has_near_match_generic_ngrams as hnm_generic_ngrams, \
+    has_near_match_generic as hnm_generic, \
+    has_near_match_generic_linear_programming as hnm_generic_lp, \
     find_near_matches_generic
+import fuzzysearch.generic_search
+from fuzzysearch.instrumentation import add_hook, remove_hook
 
 
 class TestGenericSearchLpAsLevenshtein(TestFindNearMatchesLevenshteinBase,
@@ -447,6 +455,24 @@ class TestGenericSearchLp(TestGenericSearchBase, unittest.TestCase):
         )
 
 
+class TestPruneDominatedCandidates(unittest.TestCase):
+    def test_prune(self):
+        # start, subseq_index, l_dist, n_subs, n_ins, n_dels
+        cand1 = GenericSearchCandidate(0, 3, 1, 1, 0, 0)
+        cand2 = GenericSearchCandidate(0, 3, 2, 1, 1, 0)
+        cand3 = GenericSearchCandidate(0, 3, 1, 0, 1, 1)
+        cand4 = GenericSearchCandidate(1, 3, 2, 2, 0, 0)
+        cand5 = GenericSearchCandidate(0, 4, 2, 2, 0, 0)
+        self.assertEqual(
+            _prune_dominated_candidates([cand1, cand2, cand3, cand4, cand5]),
+            [cand1, cand3, cand4, cand5],
+        )
+        self.assertEqual(
+            _prune_dominated_candidates([cand2, cand1, cand1]),
+            [cand1],
+        )
+
+
 class TestGenericSearchNgrams(TestGenericSearchBase,
                               TestNgramsBase,
                               unittest.TestCase):
@@ -468,6 +494,34 @@ class TestGenericSearchNgrams(TestGenericSearchBase,
                                 consolidated_expected_outcomes,
                                 *args, **kwargs)
 
+    def test_exact_match_searched_once(self):
+        search_params = LevenshteinSearchParams(1, 1, 1, 2)
+        sequence = b('xxxxxxxxxxabcdefghixxxxxxxxxx')
+        with unittest.mock.patch(
+                'fuzzysearch.generic_search.'
+                'find_near_matches_generic_linear_programming',
+                wraps=fnm_generic_lp) as mock_lp:
+            matches = list(fnm_generic_ngrams(b('abcdefghi'), sequence,
+                                              search_params))
+        self.assertEqual(mock_lp.call_count, 1)
+        self.assertIn(Match(10, 19, 0, b('abcdefghi')), matches)
+
+    def test_overlapping_windows_searched_together(self):
+        search_params = LevenshteinSearchParams(1, 1, 1, 2)
+        sequence = b('xxxxxxxxxx' + 'abcdefghi' * 3 + 'xxxxxxxxxx')
+        with unittest.mock.patch(
+                'fuzzysearch.generic_search.'
+                'find_near_matches_generic_linear_programming',
+                wraps=fnm_generic_lp) as mock_lp:
+            matches = list(fnm_generic_ngrams(b('abcdefghi'), sequence,
+                                              search_params))
+        self.assertEqual(mock_lp.call_count, 1)
+        self.assertEqual(len(matches), len(set(matches)))
+        self.assertEqual(
+            sorted(matches),
+            sorted(fnm_generic_lp(b('abcdefghi'), sequence, search_params)),
+        )
+
     def test_missing_second_item_complex(self):
         self.assertTrue(
             set(self.search(b('bde'), b('abcdefg'), 1, 1, 1, 1)).issubset([
@@ -503,5 +557,270 @@ class TestHasNearMatchGenericNgrams(TestGenericSearchBase,
         return super(TestHasNearMatchGenericNgrams, self).assertEqual(
             actual_value, bool(expected_value), *args, **kwargs)
 
+    def test_stops_at_first_match(self):
+        search_params = LevenshteinSearchParams(1, 1, 1, 2)
+        sequence = b('xxxxxxxxxx' + 'abcdefghixxxxxxxxxx' * 100)
+        with unittest.mock.patch(
+                'fuzzysearch.generic_search.search_exact',
+                side_effect=AssertionError('searched the entire sequence')), \
+             unittest.mock.patch(
+                'fuzzysearch.generic_search.'
+                'has_near_match_generic_linear_programming',
+                wraps=hnm_generic_lp) as mock_lp:
+            self.assertTrue(hnm_generic_ngrams(b('abcdefghi'), sequence,
+                                               search_params))
+        self.assertEqual(mock_lp.call_count, 1)
+
+    def test_missing_second_item_complex(self):
+        self.assertTrue(self.search(b('bde'), b('abcdefg'), 1, 1, 1, 1))
+
+
+class TestHasNearMatchGenericBase(TestGenericSearchBase):
+    def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+        self.assertEqual(search_results, expected_outcomes, *args, **kwargs)
+
+    def assertEqual(self, actual_value, expected_value, *args, **kwargs):
+        return super(TestHasNearMatchGenericBase, self).assertEqual(
+            actual_value, bool(expected_value), *args, **kwargs)
+
     def test_missing_second_item_complex(self):
         self.assertTrue(self.search(b('bde'), b('abcdefg'), 1, 1, 1, 1))
+
+
+class TestHasNearMatchGeneric(TestHasNearMatchGenericBase, unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return hnm_generic(pattern, sequence, search_params)
+
+
+class TestHasNearMatchGenericLp(TestHasNearMatchGenericBase,
+                                unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return hnm_generic_lp(pattern, sequence, search_params)
+
+
+class TestGenericSearchIndexRange(TestGenericSearch):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return consolidate_overlapping_matches(search_in_index_range(
+            find_near_matches_generic, pattern, sequence, search_params,
+        ))
+
+
+class TestGenericSearchLpIndexRange(TestGenericSearchLp):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return search_in_index_range(
+            fnm_generic_lp, pattern, sequence, search_params,
+        )
+
+
+class TestGenericSearchNgramsIndexRange(TestGenericSearchNgrams):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return consolidate_overlapping_matches(search_in_index_range(
+            fnm_generic_ngrams, pattern, sequence, search_params,
+        ))
+
+
+class TestHasNearMatchGenericIndexRange(TestHasNearMatchGeneric):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return search_in_index_range(
+            hnm_generic, pattern, sequence, search_params,
+        )
+
+
+class TestHasNearMatchGenericLpIndexRange(TestHasNearMatchGenericLp):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return search_in_index_range(
+            hnm_generic_lp, pattern, sequence, search_params,
+        )
+
+
+class TestGenericSearchLpIdentityEquivalences(TestGenericSearchLp):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return list(fnm_generic_lp(pattern, sequence, search_params,
+                                   equivalences=IDENTITY_EQUIVALENCES))
+
+
+class TestHasNearMatchGenericLpIdentityEquivalences(
+        TestHasNearMatchGenericLp):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return hnm_generic_lp(pattern, sequence, search_params,
+                              equivalences=IDENTITY_EQUIVALENCES)
+
+
+class TestGenericSearchLpCandidatesLimit(TestGenericSearchBase,
+                                         unittest.TestCase):
+    # fall back to the bounded search almost immediately
+    max_candidates = 1
+
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return consolidate_overlapping_matches(
+            fuzzysearch.generic_search
+            .find_near_matches_generic_linear_programming(
+                pattern, sequence, search_params,
+                max_candidates=self.max_candidates)
+        )
+
+    def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+        consolidated_expected_outcomes = \
+            consolidate_overlapping_matches(expected_outcomes)
+        return self.assertEqual(search_results, consolidated_expected_outcomes)
+
+    def test_same_as_without_limit(self):
+        rng = random.Random(46)
+        for _i in range(300):
+            alphabet = rng.choice(['AC', 'ACGT'])
+            pattern = ''.join(rng.choice(alphabet)
+                              for _j in range(rng.randint(1, 10)))
+            sequence = ''.join(rng.choice(alphabet)
+                               for _j in range(rng.randint(0, 60)))
+            search_params = LevenshteinSearchParams(
+                *[rng.randint(0, 4) for _j in range(4)])
+            for pattern, sequence in [(pattern, sequence),
+                                      (b(pattern), b(sequence))]:
+                all_matches = list(
+                    fuzzysearch.generic_search
+                    .find_near_matches_generic_linear_programming(
+                        pattern, sequence, search_params))
+                expected = consolidate_overlapping_matches(all_matches)
+                results = self.search(pattern, sequence,
+                                      *search_params.unpacked)
+                # equally good matches in a group may be chosen differently
+                self.assertEqual(
+                    [(match.dist, match.end - match.start)
+                     for match in results],
+                    [(match.dist, match.end - match.start)
+                     for match in expected],
+                    (pattern, sequence, search_params),
+                )
+                self.assertTrue(set(results).issubset(all_matches))
+
+    def test_falls_back_to_bounded_search(self):
+        search_params = LevenshteinSearchParams(2, 2, 2, 2)
+        for sequence in ['xxabcdefxx', b('xxabcdefxx')]:
+            with unittest.mock.patch.object(
+                    fuzzysearch.generic_search,
+                    '_find_near_matches_generic_bounded',
+                    wraps=fuzzysearch.generic_search
+                    ._find_near_matches_generic_bounded) as mock_bounded:
+                self.search(sequence[2:8], sequence, 2, 2, 2, 2)
+            mock_bounded.assert_called_once_with(
+                sequence[2:8], sequence, search_params, 0, len(sequence),
+                None)
+
+    def test_has_match_falls_back_to_bounded_search(self):
+        search_params = LevenshteinSearchParams(2, 2, 2, 2)
+        for sequence in ['xxabcdefxx', b('xxabcdefxx')]:
+            for pattern, expected in [(sequence[2:8], True),
+                                      (sequence[2:8].upper(), False)]:
+                with unittest.mock.patch.object(
+                        fuzzysearch.generic_search,
+                        '_has_near_match_generic_bounded',
+                        wraps=fuzzysearch.generic_search
+                        ._has_near_match_generic_bounded) as mock_bounded:
+                    self.assertEqual(
+                        hnm_generic_lp(pattern, sequence, search_params,
+                                       max_candidates=self.max_candidates),
+                        expected,
+                    )
+                # a match may be found before there are too many candidates
+                self.assertLessEqual(mock_bounded.call_count, 1)
+                if not expected:
+                    self.assertEqual(mock_bounded.call_count, 1)
+
+    def test_reports_event(self):
+        events = []
+
+        def hook(event, details):
+            events.append((event, details))
+        add_hook(hook)
+        self.addCleanup(remove_hook, hook)
+
+        for sequence in ['xxabcdefxx', b('xxabcdefxx')]:
+            del events[:]
+            self.search(sequence[2:8], sequence, 2, 2, 2, 2)
+            self.assertEqual(len(events), 1)
+            event, details = events[0]
+            self.assertEqual(event, 'lp_candidates_limit')
+            self.assertEqual(details['max_candidates'], 1)
+            self.assertGreater(details['n_candidates'], 1)
+            self.assertIn(details['index'], range(len(sequence)))
+
+    def record_events(self):
+        events = []
+
+        def hook(event, details):
+            events.append(event)
+        add_hook(hook)
+        self.addCleanup(remove_hook, hook)
+        return events
+
+    def test_default_limit(self):
+        events = self.record_events()
+        search_params = LevenshteinSearchParams(2, 2, 2, 2)
+        list(fuzzysearch.generic_search
+             .find_near_matches_generic_linear_programming(
+                 'abcdef', 'xxabcdefxx', search_params))
+        self.assertEqual(events, [])
+
+        with unittest.mock.patch.object(fuzzysearch.generic_search,
+                                        'MAX_LP_CANDIDATES', 1):
+            list(fuzzysearch.generic_search
+                 .find_near_matches_generic_linear_programming(
+                     'abcdef', 'xxabcdefxx', search_params))
+        self.assertEqual(events, ['lp_candidates_limit'])
+
+    def test_no_event_within_limit(self):
+        events = []
+        add_hook(events.append)
+        self.addCleanup(remove_hook, events.append)
+        self.max_candidates = 100000
+        self.search('abcdef', 'xxabcdefxx', 2, 2, 2, 2)
+        self.assertEqual(events, [])
+
+    def test_search_classes_pass_limit(self):
+        search_params = LevenshteinSearchParams(2, 2, 2, 2)
+        events = self.record_events()
+        for search_class in [fuzzysearch.generic_search.GenericSearch,
+                             fuzzysearch.generic_search.BitParallelSearch]:
+            # both with the n-gram search and the q-gram filter
+            for subsequence in ['abc', 'abcdefghijkl']:
+                del events[:]
+                limited_search_class = \
+                    fuzzysearch.generic_search.with_max_lp_candidates(
+                        search_class, self.max_candidates)
+                matches = list(limited_search_class.search(
+                    subsequence, 'xx' + subsequence + 'xx', search_params))
+                self.assertEqual(events, ['lp_candidates_limit'])
+                self.assertEqual(
+                    consolidate_overlapping_matches(matches),
+                    [Match(2, 2 + len(subsequence), 0, subsequence)],
+                )
@@ -1,10 +1,13 @@
 import unittest
 
 from tests.compat import b
-from tests.utils import skip_if_arguments_arent_byteslike
+from tests.utils import skip_if_arguments_arent_byteslike, \
+    search_in_index_range
 from tests.test_levenshtein import TestFindNearMatchesLevenshteinBase
 from fuzzysearch.common import Match, get_best_match_in_group, group_matches, LevenshteinSearchParams
-from tests.test_substitutions_only import TestSubstitionsOnlyBase
+from fuzzysearch.common import EquivalenceTable
+from tests.test_substitutions_only import TestSubstitionsOnlyBase, \
+    IDENTITY_EQUIVALENCES
 from tests.test_generic_search import TestGenericSearchBase
 
 
@@ -133,6 +136,47 @@ else:
                 ))
             )
 
+    class TestGenericSearchLpIndexRange(TestGenericSearchLp):
+        @skip_if_arguments_arent_byteslike
+        def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+                   max_l_dist=None):
+            return search_in_index_range(
+                lambda *args: list(c_fnm_generic_lp(*args)),
+                pattern, sequence,
+                LevenshteinSearchParams(max_subs, max_ins,
+                                        max_dels, max_l_dist),
+            )
+
+    class TestGenericSearchLpIdentityEquivalences(TestGenericSearchLp):
+        @skip_if_arguments_arent_byteslike
+        def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+                   max_l_dist=None):
+            return list(c_fnm_generic_lp(
+                pattern, sequence,
+                LevenshteinSearchParams(max_subs, max_ins,
+                                        max_dels, max_l_dist),
+                equivalences=IDENTITY_EQUIVALENCES,
+            ))
+
+    class TestGenericSearchLpEquivalences(unittest.TestCase):
+        def test_case_insensitive(self):
+            self.assertEqual(
+                [match.start for match in c_fnm_generic_lp(
+                    b('PATTERN'), b('xxpaTTerNxx'),
+                    LevenshteinSearchParams(0, 0, 0, 0),
+                    equivalences=EquivalenceTable.case_insensitive(),
+                )],
+                [2],
+            )
+
+        def test_dna_iupac(self):
+            matches = list(c_fnm_generic_lp(
+                b('ACNGT'), b('TTACAGTT'),
+                LevenshteinSearchParams(0, 0, 0, 0),
+                equivalences=EquivalenceTable.dna_iupac(),
+            ))
+            self.assertEqual([(m.start, m.end) for m in matches], [(2, 7)])
+
     class TestGenericSearchNgrams(TestGenericSearchBase, unittest.TestCase):
         @skip_if_arguments_arent_byteslike
         def search(self, pattern, sequence, max_subs, max_ins, max_dels,
@@ -165,3 +209,15 @@ else:
                     Match(start=3, end=5, dist=1, matched=b('de')),
                 ])
             )
+
+        def test_overlapping_windows(self):
+            search_params = LevenshteinSearchParams(1, 1, 1, 2)
+            sequence = b('xxxxxxxxxx' + 'abcdefghi' * 3 + 'xxxxxxxxxx')
+            matches = c_fnm_generic_ngrams(b('abcdefghi'), sequence,
+                                           search_params)
+            self.assertEqual(len(matches), len(set(matches)))
+            self.assertEqual(
+                sorted(matches),
+                sorted(c_fnm_generic_lp(b('abcdefghi'), sequence,
+                                        search_params)),
+            )
@@ -0,0 +1,34 @@
+import unittest
+
+from fuzzysearch.instrumentation import add_hook, remove_hook, report_event
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_hooks(self):
+        events1, events2 = [], []
+
+        def hook1(event, details):
+            events1.append((event, details))
+
+        def hook2(event, details):
+            events2.append((event, details))
+
+        add_hook(hook1)
+        self.addCleanup(remove_hook, hook1)
+        report_event('event1', a=1)
+        add_hook(hook2)
+        report_event('event2')
+        remove_hook(hook2)
+        report_event('event3', b='x')
+
+        self.assertEqual(events1, [('event1', {'a': 1}), ('event2', {}),
+                                   ('event3', {'b': 'x'})])
+        self.assertEqual(events2, [('event2', {})])
+
+    def test_invalid_hook(self):
+        with self.assertRaises(TypeError):
+            add_hook(None)
+
+    def test_remove_unregistered_hook(self):
+        with self.assertRaises(ValueError):
+            remove_hook(lambda event, details: None)
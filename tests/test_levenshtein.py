@@ -1,12 +1,25 @@
+import random
 import re
 import unittest
+import unittest.mock
 
 from fuzzysearch.common import Match, consolidate_overlapping_matches
 from fuzzysearch.levenshtein import find_near_matches_levenshtein, \
-    find_near_matches_levenshtein_linear_programming as fnm_levenshtein_lp
+    find_near_matches_levenshtein_linear_programming as fnm_levenshtein_lp, \
+    has_near_match_levenshtein
+from fuzzysearch.levenshtein_neighborhood import edit_neighborhood, \
+    find_near_matches_levenshtein_neighborhood as \
+    fnm_levenshtein_neighborhood, \
+    find_neighborhood_regions, \
+    has_near_match_levenshtein_neighborhood as hnm_levenshtein_neighborhood
 from fuzzysearch.levenshtein_ngram import \
-    _expand, _py_expand_short, _expand_long, \
-    find_near_matches_levenshtein_ngrams as fnm_levenshtein_ngrams
+    _expand, _py_expand_short, _py_expand_long, _expand_long, \
+    find_near_matches_levenshtein_ngrams as fnm_levenshtein_ngrams, \
+    has_near_match_levenshtein_ngrams as hnm_levenshtein_ngrams, \
+    _expand_ngram_match
+
+from tests.utils import search_in_index_range
+from tests.test_substitutions_only import IDENTITY_EQUIVALENCES
 
 
 def longstr(string):
@@ -179,6 +192,53 @@ class TestExpandLong(TestExpandBase, unittest.TestCase):
     expand = staticmethod(_expand_long)
 
 
+try:
+    from fuzzysearch.levenshtein_ngram import _py_expand_ngram_match, \
+        _c_expand_ngram_match_byteslike
+except ImportError:
+    pass
+else:
+    class TestCExpandNgramMatch(unittest.TestCase):
+        def test_same_as_python(self):
+            rng = random.Random(44)
+            for _i in range(2000):
+                alphabet = rng.choice([b'ab', b'ACGT'])
+                subsequence = bytes(rng.choice(alphabet)
+                                    for _j in range(rng.randint(1, 30)))
+                ngram_start = rng.randint(0, len(subsequence) - 1)
+                ngram_end = rng.randint(ngram_start + 1, len(subsequence))
+                ngram = subsequence[ngram_start:ngram_end]
+                before = bytes(rng.choice(alphabet)
+                               for _j in range(rng.randint(0, 40)))
+                after = bytes(rng.choice(alphabet)
+                              for _j in range(rng.randint(0, 40)))
+                sequence = before + ngram + after
+                index = len(before)
+                range_start = rng.randint(0, index)
+                range_end = rng.randint(index + len(ngram), len(sequence))
+                max_l_dist = rng.randint(0, 12)
+                args = (subsequence, sequence, ngram_start, ngram_end, index,
+                        range_start, range_end, max_l_dist)
+                # compare with the pure Python expanders
+                with unittest.mock.patch.multiple(
+                        'fuzzysearch.levenshtein_ngram',
+                        _expand_short=_py_expand_short,
+                        _expand_long=_py_expand_long):
+                    expected = _py_expand_ngram_match(*args)
+                self.assertEqual(_c_expand_ngram_match_byteslike(*args),
+                                 expected, args)
+
+        def test_unsupported_types(self):
+            with self.assertRaises(TypeError):
+                _c_expand_ngram_match_byteslike('abc', 'xabcx', 0, 3, 1,
+                                                0, 5, 1)
+
+        def test_invalid_ranges(self):
+            with self.assertRaises(ValueError):
+                _c_expand_ngram_match_byteslike(b'abc', b'xabcx', 0, 3, 4,
+                                                0, 5, 1)
+
+
 class TestFindNearMatchesLevenshteinBase(object):
     def search(self, subsequence, sequence, max_l_dist):
         raise NotImplementedError
@@ -337,6 +397,25 @@ class TestFindNearMatchesLevenshteinNgrams(TestFindNearMatchesLevenshteinBase,
             fnm_levenshtein_ngrams(subsequence, sequence, max_l_dist)
         )
 
+    def test_exact_match_expanded_once(self):
+        sequence = 'xxxxxxxxxx' + 'abcdefghijkl' + 'xxxxxxxxxx'
+        with unittest.mock.patch('fuzzysearch.levenshtein_ngram._expand',
+                                 wraps=_expand) as mock_expand:
+            matches = list(fnm_levenshtein_ngrams('abcdefghijkl', sequence, 3))
+        self.assertEqual(matches, [Match(10, 22, 0, 'abcdefghijkl')])
+        # once to the right and once to the left
+        self.assertEqual(mock_expand.call_count, 2)
+
+    def test_near_match_expanded_from_each_side(self):
+        # the difference is in the third n-gram, so the second is skipped
+        sequence = 'xxxxxxxxxx' + 'abcdefgXijkl' + 'xxxxxxxxxx'
+        with unittest.mock.patch('fuzzysearch.levenshtein_ngram._expand',
+                                 wraps=_expand) as mock_expand:
+            matches = consolidate_overlapping_matches(
+                fnm_levenshtein_ngrams('abcdefghijkl', sequence, 3))
+        self.assertEqual(matches, [Match(10, 22, 1, 'abcdefgXijkl')])
+        self.assertEqual(mock_expand.call_count, 4)
+
 
 class TestFindNearMatchesLevenshteinLP(TestFindNearMatchesLevenshteinBase,
                                        unittest.TestCase):
@@ -345,6 +424,15 @@ class TestFindNearMatchesLevenshteinLP(TestFindNearMatchesLevenshteinBase,
             fnm_levenshtein_lp(subsequence, sequence, max_l_dist)
         )
 
+    def test_only_closest_match_for_each_position(self):
+        matches = list(fnm_levenshtein_lp('abcdefgh',
+                                          'xxabcdefghxxabcXefghxx', 3))
+        self.assertEqual(
+            sorted((match.start, match.end, match.dist) for match in matches),
+            [(2, 10, 0), (3, 10, 1), (4, 10, 2), (5, 10, 3),
+             (12, 20, 1), (13, 20, 2), (14, 20, 3)],
+        )
+
 
 class TestFindNearMatchesLevenshtein(TestFindNearMatchesLevenshteinBase,
                                      unittest.TestCase):
@@ -352,3 +440,275 @@ class TestFindNearMatchesLevenshtein(TestFindNearMatchesLevenshteinBase,
         return consolidate_overlapping_matches(
             find_near_matches_levenshtein(subsequence, sequence, max_l_dist)
         )
+
+
+class TestHasNearMatchLevenshtein(TestFindNearMatchesLevenshteinBase,
+                                  unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return has_near_match_levenshtein(subsequence, sequence, max_l_dist)
+
+    def assertEqual(self, actual_value, expected_value, *args, **kwargs):
+        return super(TestHasNearMatchLevenshtein, self).assertEqual(
+            actual_value, bool(expected_value), *args, **kwargs)
+
+    def test_all_different(self):
+        for max_l_dist in [0, 1, 2, 3]:
+            self.assertFalse(self.search('AAAA', 'ZZZZ', max_l_dist))
+        self.assertTrue(self.search('AAAA', 'ZZZZ', max_l_dist=4))
+
+
+class TestHasNearMatchLevenshteinNgrams(TestHasNearMatchLevenshtein):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest(
+                'skipping ngram search with max_l_dist >= len(subsequence)')
+        return hnm_levenshtein_ngrams(subsequence, sequence, max_l_dist)
+
+    def test_all_different(self):
+        for max_l_dist in [0, 1, 2, 3]:
+            self.assertFalse(self.search('AAAA', 'ZZZZ', max_l_dist))
+
+    def test_stops_at_first_match(self):
+        sequence = 'xxxxxxxxxx' + 'abcdefghijklxxxxxxxxxx' * 100
+        with unittest.mock.patch(
+                'fuzzysearch.levenshtein_ngram.search_exact',
+                side_effect=AssertionError('searched the entire sequence')), \
+             unittest.mock.patch(
+                'fuzzysearch.levenshtein_ngram._expand_ngram_match',
+                wraps=_expand_ngram_match) as mock_expand:
+            self.assertTrue(
+                hnm_levenshtein_ngrams('abcdefghijkl', sequence, 3))
+        self.assertEqual(mock_expand.call_count, 1)
+
+
+class TestFindNearMatchesLevenshteinNgramsIndexRange(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest(
+                'skipping ngram search with max_l_dist >= len(subsequence)')
+        return consolidate_overlapping_matches(search_in_index_range(
+            fnm_levenshtein_ngrams, subsequence, sequence, max_l_dist,
+        ))
+
+
+class TestHasNearMatchLevenshteinNgramsIndexRange(
+        TestHasNearMatchLevenshteinNgrams):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest(
+                'skipping ngram search with max_l_dist >= len(subsequence)')
+        return search_in_index_range(hnm_levenshtein_ngrams,
+                                     subsequence, sequence, max_l_dist)
+
+
+class TestFindNearMatchesLevenshteinLPIndexRange(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return consolidate_overlapping_matches(search_in_index_range(
+            fnm_levenshtein_lp, subsequence, sequence, max_l_dist,
+        ))
+
+
+class TestHasNearMatchLevenshteinIndexRange(TestHasNearMatchLevenshtein):
+    def search(self, subsequence, sequence, max_l_dist):
+        return search_in_index_range(has_near_match_levenshtein,
+                                     subsequence, sequence, max_l_dist)
+
+
+class TestFindNearMatchesLevenshteinLPIdentityEquivalences(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return consolidate_overlapping_matches(fnm_levenshtein_lp(
+            subsequence, sequence, max_l_dist,
+            equivalences=IDENTITY_EQUIVALENCES,
+        ))
+
+
+class TestHasNearMatchLevenshteinIdentityEquivalences(
+        TestHasNearMatchLevenshtein):
+    def search(self, subsequence, sequence, max_l_dist):
+        return has_near_match_levenshtein(subsequence, sequence, max_l_dist,
+                                          equivalences=IDENTITY_EQUIVALENCES)
+
+
+def _levenshtein_distance(seq1, seq2):
+    row = list(range(len(seq2) + 1))
+    for index1, item1 in enumerate(seq1, 1):
+        prev_row, row = row, [index1]
+        for index2, item2 in enumerate(seq2, 1):
+            row.append(min(prev_row[index2] + 1, row[index2 - 1] + 1,
+                           prev_row[index2 - 1] + (item1 != item2)))
+    return row[-1]
+
+
+class TestFindNearMatchesLevenshteinNeighborhood(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest('skipping neighborhood search with '
+                          'max_l_dist >= len(subsequence)')
+        matches = fnm_levenshtein_neighborhood(subsequence, sequence,
+                                               max_l_dist)
+        if matches is None:
+            self.skipTest('neighborhood search not applicable')
+        return consolidate_overlapping_matches(matches)
+
+
+class TestHasNearMatchLevenshteinNeighborhood(TestHasNearMatchLevenshtein):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest('skipping neighborhood search with '
+                          'max_l_dist >= len(subsequence)')
+        has_match = hnm_levenshtein_neighborhood(subsequence, sequence,
+                                                 max_l_dist)
+        if has_match is None:
+            self.skipTest('neighborhood search not applicable')
+        return has_match
+
+    def test_all_different(self):
+        for max_l_dist in [0, 1, 2, 3]:
+            self.assertFalse(self.search('AAAA', 'ZZZZ', max_l_dist))
+
+
+class TestFindNearMatchesLevenshteinNeighborhoodIndexRange(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest('skipping neighborhood search with '
+                          'max_l_dist >= len(subsequence)')
+        if fnm_levenshtein_neighborhood(subsequence, sequence,
+                                        max_l_dist) is None:
+            self.skipTest('neighborhood search not applicable')
+        return consolidate_overlapping_matches(search_in_index_range(
+            fnm_levenshtein_neighborhood, subsequence, sequence, max_l_dist,
+        ))
+
+
+class TestEditNeighborhood(unittest.TestCase):
+    def test_zero_distance(self):
+        self.assertEqual(edit_neighborhood('abc', 0, 'abcd'),
+                         {('a', 'b', 'c'): 0})
+
+    def test_distances(self):
+        alphabet = 'ab'
+        neighborhood = edit_neighborhood('ab', 2, alphabet)
+        self.assertEqual(neighborhood[('a', 'b')], 0)
+        self.assertEqual(neighborhood[('b', 'b')], 1)
+        self.assertEqual(neighborhood[('b',)], 1)
+        self.assertEqual(neighborhood[('b', 'a')], 2)
+        self.assertEqual(neighborhood[()], 2)
+        for neighbor, dist in neighborhood.items():
+            self.assertEqual(_levenshtein_distance(neighbor, 'ab'), dist)
+
+        # all sequences over the alphabet within the distance are included
+        for length in range(0, 5):
+            for index in range(len(alphabet) ** length):
+                neighbor = tuple(
+                    alphabet[index // len(alphabet) ** power % len(alphabet)]
+                    for power in range(length)
+                )
+                if _levenshtein_distance(neighbor, 'ab') <= 2:
+                    self.assertIn(neighbor, neighborhood)
+
+    def test_max_size(self):
+        self.assertIsNone(edit_neighborhood('abcdef', 2, 'abcdefgh',
+                                            max_size=100))
+        self.assertIsNotNone(edit_neighborhood('abcdef', 1, 'abcdefgh',
+                                               max_size=100))
+
+    def test_unsupported_sequences(self):
+        self.assertIsNone(fnm_levenshtein_neighborhood('abc', list('abc'), 1))
+        self.assertIsNone(fnm_levenshtein_neighborhood(b'abc', 'abc', 1))
+        self.assertIsNone(hnm_levenshtein_neighborhood('abc', b'abc', 1))
+
+    def test_finds_all_near_matching_parts(self):
+        rng = random.Random(38)
+        for _i in range(15):
+            alphabet = 'ACGT'
+            subsequence = ''.join(rng.choice(alphabet)
+                                  for _j in range(rng.randint(3, 8)))
+            sequence = ''.join(rng.choice(alphabet + 'x')
+                               for _j in range(rng.randint(0, 30)))
+            max_l_dist = rng.randint(1, min(2, len(subsequence) - 1))
+            expected = sorted(
+                (start, end,
+                 _levenshtein_distance(sequence[start:end], subsequence))
+                for start in range(len(sequence))
+                for end in range(start + 1, len(sequence) + 1)
+                if _levenshtein_distance(sequence[start:end],
+                                         subsequence) <= max_l_dist
+            )
+            for seq in [sequence, sequence.encode('ascii'),
+                        bytearray(sequence.encode('ascii'))]:
+                subseq = subsequence if isinstance(seq, str) \
+                    else subsequence.encode('ascii')
+                matches = fnm_levenshtein_neighborhood(subseq, seq,
+                                                       max_l_dist)
+                self.assertEqual(
+                    sorted((m.start, m.end, m.dist) for m in matches),
+                    expected,
+                )
+                for match in matches:
+                    self.assertEqual(match.matched,
+                                     seq[match.start:match.end])
+
+    def test_regions_contain_all_near_matches(self):
+        rng = random.Random(38)
+        for _i in range(15):
+            subsequence = ''.join(rng.choice('ACGT')
+                                  for _j in range(rng.randint(3, 8)))
+            sequence = ''.join(rng.choice('ACGTx')
+                               for _j in range(rng.randint(0, 30)))
+            max_l_dist = rng.randint(1, min(2, len(subsequence) - 1))
+            regions = find_neighborhood_regions(subsequence, sequence,
+                                                max_l_dist)
+            for (_start1, end1), (start2, _end2) in zip(regions,
+                                                        regions[1:]):
+                self.assertLessEqual(end1, start2)
+            for match in fnm_levenshtein_neighborhood(subsequence, sequence,
+                                                      max_l_dist):
+                self.assertTrue(any(
+                    start <= match.start and match.end <= end
+                    for start, end in regions
+                ))
+
+
+class TestFindNearMatchesLevenshteinSequenceTypes(unittest.TestCase):
+    def test_exact_matches_in_dense_sequence(self):
+        sequence = 'BABAABAAABABABBBAAABAABAABBBABBBAAABABBBBBAA'
+        expected = [Match(0, 3, 0, 'BAB'), Match(9, 12, 0, 'BAB'),
+                    Match(27, 30, 0, 'BAB'), Match(35, 38, 0, 'BAB')]
+        self.assertEqual(
+            consolidate_overlapping_matches(
+                find_near_matches_levenshtein('BAB', sequence, 1)),
+            expected,
+        )
+
+    def test_same_results_for_all_sequence_types(self):
+        rng = random.Random(38)
+        for _i in range(100):
+            alphabet = rng.choice(['AB', 'ABC', 'ACGT'])
+            subsequence = ''.join(rng.choice(alphabet)
+                                  for _j in range(rng.randint(2, 8)))
+            sequence = ''.join(rng.choice(alphabet)
+                               for _j in range(rng.randint(0, 50)))
+            max_l_dist = rng.randint(1, min(2, len(subsequence) - 1))
+
+            expected = [
+                (match.start, match.end, match.dist)
+                for match in consolidate_overlapping_matches(
+                    fnm_levenshtein_lp(subsequence, sequence, max_l_dist))
+            ]
+            for subseq, seq in [
+                (subsequence, sequence),
+                (list(subsequence), list(sequence)),
+                (subsequence.encode('ascii'), sequence.encode('ascii')),
+            ]:
+                matches = consolidate_overlapping_matches(
+                    find_near_matches_levenshtein(subseq, seq, max_l_dist))
+                self.assertEqual(
+                    [(match.start, match.end, match.dist)
+                     for match in matches],
+                    expected,
+                )
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from tests.compat import b
@@ -82,3 +83,65 @@ else:
     class TestWordlenMemmem(TestMemmemBase, unittest.TestCase):
         def search(self, subsequence, sequence):
             return wordlen_memmem(b(subsequence), b(sequence))
+
+
+try:
+    from fuzzysearch._common import memmem_byteslike, available_implementations
+except ImportError:
+    pass
+else:
+    class TestMemmemByteslikeBase(TestMemmemBase):
+        implementation = None
+
+        def setUp(self):
+            if (self.implementation is not None and
+                    self.implementation not in available_implementations()):
+                self.skipTest('%s is not supported by the CPU' %
+                              self.implementation)
+
+        def search(self, subsequence, sequence):
+            return memmem_byteslike(b(subsequence), b(sequence),
+                                    self.implementation)
+
+        def test_long_sequences(self):
+            rng = random.Random(40)
+            for _i in range(1000):
+                alphabet = rng.choice([b'ab', b'ACGT', bytes(range(256))])
+                sequence = bytes(rng.choice(alphabet)
+                                 for _j in range(rng.randint(0, 300)))
+                subseq_len = rng.randint(1, 70)
+                if rng.random() < 0.5 and subseq_len <= len(sequence):
+                    start = rng.randint(0, len(sequence) - subseq_len)
+                    subsequence = sequence[start:start + subseq_len]
+                else:
+                    subsequence = bytes(rng.choice(alphabet)
+                                        for _j in range(subseq_len))
+                expected = sequence.find(subsequence)
+                self.assertEqual(
+                    memmem_byteslike(subsequence, sequence,
+                                     self.implementation),
+                    expected if expected != -1 else None,
+                )
+
+    class TestMemmemByteslike(TestMemmemByteslikeBase, unittest.TestCase):
+        pass
+
+    class TestMemmemByteslikeScalar(TestMemmemByteslikeBase,
+                                    unittest.TestCase):
+        implementation = 'scalar'
+
+    class TestMemmemByteslikeSse2(TestMemmemByteslikeBase,
+                                  unittest.TestCase):
+        implementation = 'sse2'
+
+    class TestMemmemByteslikeAvx2(TestMemmemByteslikeBase,
+                                  unittest.TestCase):
+        implementation = 'avx2'
+
+    class TestMemmemImplementations(unittest.TestCase):
+        def test_scalar_is_always_supported(self):
+            self.assertEqual(available_implementations()[-1], 'scalar')
+
+        def test_unsupported_implementation(self):
+            with self.assertRaises(ValueError):
+                memmem_byteslike(b'abc', b'xxabcxx', 'nonexistent')
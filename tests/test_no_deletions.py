@@ -1,9 +1,16 @@
+import random
 import unittest
-
-from fuzzysearch.common import Match, LevenshteinSearchParams
-from fuzzysearch.no_deletions import _expand, \
-    find_near_matches_no_deletions_ngrams
+import unittest.mock
+
+from fuzzysearch.common import Match, LevenshteinSearchParams, \
+    EquivalenceTable
+from fuzzysearch.generic_search import GenericSearch
+from fuzzysearch.no_deletions import _expand, _expand_all, \
+    find_near_matches_no_deletions_ngrams, NoDeletionsSearch
+import fuzzysearch.single_indel_type
+from fuzzysearch.single_indel_type import INSERTIONS
 from tests.test_substitutions_only import TestFindNearMatchesSubstitionsNgrams
+from tests.utils import search_in_index_range
 
 
 def fnm_nodels_ngrams(sequence, subsequence, max_substitutions, max_insertions, max_l_dist=None):
@@ -78,6 +85,25 @@ class TestExpand(unittest.TestCase):
         self.assertEqual(_expand('abc', 'a--bc', 1, 1, 2), [])
 
 
+class TestExpandAll(unittest.TestCase):
+    def test_identical(self):
+        self.assertEqual(_expand_all('abc', 'abc', 0, 0, 0), [(0, 0)])
+
+    def test_extra_items_at_end(self):
+        self.assertEqual(_expand_all('abc', 'abcdef', 0, 2, 2),
+                         [(0, 0), (0, 1), (0, 2)])
+        self.assertEqual(_expand_all('abc', 'abcdef', 0, 2, 1),
+                         [(0, 0), (0, 1)])
+
+    def test_short_sequence(self):
+        self.assertEqual(_expand_all('abc', 'ab', 1, 1, 1), [])
+        self.assertEqual(_expand_all('abc', 'abd', 1, 2, 2), [(1, 0)])
+
+    def test_two_insertions(self):
+        self.assertEqual(_expand_all('abc', 'a--bc', 2, 2, 3),
+                         [(2, 0), (2, 1), (0, 2)])
+
+
 class TestFindNearMatchesNoDeletionsNgramsAsNoSubstituions(
     TestFindNearMatchesSubstitionsNgrams, unittest.TestCase):
     def search(self, subsequence, sequence, max_subs):
@@ -120,3 +146,88 @@ class TestFindNearMatchesNoDeletionsNgrams(unittest.TestCase):
             [Match(start=2, end=7, dist=2, matched=sequence[2:7]),
              Match(start=2, end=9, dist=2, matched=sequence[2:9])],
         )
+
+    def test_extra_items_around_match(self):
+        sequence = 'xPATTERNx'
+        self.assertEqual(
+            fnm_nodels_ngrams('PATTERN', sequence, 0, 1, 1),
+            [Match(start=0, end=8, dist=1, matched='xPATTERN'),
+             Match(start=1, end=8, dist=0, matched='PATTERN'),
+             Match(start=1, end=9, dist=1, matched='PATTERNx')],
+        )
+
+    def test_index_range(self):
+        sequence = 'abcdefghij'
+        pattern = 'bceXghi'
+        self.assertEqual(
+            search_in_index_range(
+                lambda subseq, seq, start_index, end_index:
+                    find_near_matches_no_deletions_ngrams(
+                        subseq, seq,
+                        LevenshteinSearchParams(1, 1, 0, 2),
+                        start_index, end_index),
+                pattern, sequence,
+            ),
+            [Match(start=1, end=9, dist=2, matched=sequence[1:9])],
+        )
+
+    def test_same_with_and_without_c_extension(self):
+        if not hasattr(fuzzysearch.single_indel_type,
+                       '_py_find_alignments'):
+            self.skipTest('the C extension is not available')
+        rng = random.Random(40)
+        for _i in range(300):
+            subsequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(1, 12)))
+            sequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(0, 100)))
+            max_subs, max_ins, max_l_dist = \
+                [rng.randint(0, 3) for _j in range(3)]
+            ngram_len = len(subsequence) // (
+                min(max_subs + max_ins, max_l_dist) + 1)
+            if ngram_len == 0:
+                continue
+            start_index = rng.randint(0, 10)
+            end_index = rng.randint(start_index, 100)
+            args = (subsequence.encode('ascii'), sequence.encode('ascii'),
+                    ngram_len, max_subs, max_ins, max_l_dist,
+                    min(start_index, len(sequence)),
+                    min(end_index, len(sequence)), INSERTIONS)
+            self.assertEqual(
+                fuzzysearch.single_indel_type._find_alignments(*args),
+                fuzzysearch.single_indel_type._py_find_alignments(*args),
+            )
+
+
+class TestNoDeletionsSearch(unittest.TestCase):
+    def test_short_subsequence_uses_generic_search(self):
+        search_params = LevenshteinSearchParams(1, 1, 0, 2)
+        with unittest.mock.patch.object(
+                GenericSearch, 'search',
+                return_value=iter([])) as mock_search:
+            NoDeletionsSearch.search('ab', 'xxabxx', search_params)
+        self.assertEqual(mock_search.call_count, 1)
+
+    def test_short_ngrams_use_generic_search(self):
+        # n-grams of fewer than three items would match almost everywhere
+        search_params = LevenshteinSearchParams(1, 1, 0, 2)
+        for subsequence, expected_call_count in [
+            ('abcdefgh', 1),
+            ('abcdefghi', 0),
+        ]:
+            with unittest.mock.patch.object(
+                    GenericSearch, 'search',
+                    return_value=iter([])) as mock_search:
+                NoDeletionsSearch.search(subsequence, 'xxabcdefghixx',
+                                         search_params)
+            self.assertEqual(mock_search.call_count, expected_call_count)
+
+    def test_equivalences_use_generic_search(self):
+        search_params = LevenshteinSearchParams(1, 1, 0, 2)
+        equivalences = EquivalenceTable.case_insensitive()
+        self.assertEqual(
+            NoDeletionsSearch.consolidate_matches(NoDeletionsSearch.search(
+                'abcdef', 'xxAbcdefxx', search_params,
+                equivalences=equivalences)),
+            [Match(start=2, end=8, dist=0, matched='Abcdef')],
+        )
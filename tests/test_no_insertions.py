@@ -0,0 +1,157 @@
+import random
+import unittest
+import unittest.mock
+
+from fuzzysearch.common import Match, LevenshteinSearchParams, \
+    EquivalenceTable
+from fuzzysearch.generic_search import GenericSearch
+from fuzzysearch.no_insertions import \
+    find_near_matches_no_insertions_ngrams, NoInsertionsSearch
+import fuzzysearch.single_indel_type
+from fuzzysearch.single_indel_type import DELETIONS, \
+    expand_deletions as _expand_all
+from tests.test_substitutions_only import TestFindNearMatchesSubstitionsNgrams
+from tests.utils import search_in_index_range
+
+
+def fnm_noins_ngrams(sequence, subsequence, max_substitutions, max_deletions, max_l_dist=None):
+    return find_near_matches_no_insertions_ngrams(
+        sequence, subsequence, LevenshteinSearchParams(
+            max_substitutions, 0, max_deletions, max_l_dist,
+        )
+    )
+
+
+class TestExpandAll(unittest.TestCase):
+    def test_identical(self):
+        self.assertEqual(_expand_all('abc', 'abc', 0, 0, 0), [(0, 0)])
+        self.assertEqual(_expand_all('abc', 'abcdef', 0, 0, 0), [(0, 0)])
+
+    def test_one_missing(self):
+        self.assertEqual(_expand_all('abcd', 'abd---', 0, 1, 1), [(0, 1)])
+        self.assertEqual(_expand_all('abcd', 'abd---', 1, 0, 1), [])
+        self.assertEqual(_expand_all('abcd', 'bcd---', 0, 1, 1), [(0, 1)])
+
+    def test_short_sequence(self):
+        self.assertEqual(_expand_all('abc', 'ab', 1, 0, 1), [])
+        self.assertEqual(_expand_all('abc', 'ab', 1, 1, 1), [(0, 1)])
+
+    def test_everything_deleted(self):
+        self.assertEqual(_expand_all('ab', '', 0, 2, 2), [(0, 2)])
+        self.assertEqual(_expand_all('ab', 'xy', 0, 2, 2), [(0, 2)])
+
+    def test_items_deleted_at_end(self):
+        self.assertEqual(_expand_all('abc', 'abx', 1, 2, 3),
+                         [(1, 0), (0, 1), (0, 2)])
+        self.assertEqual(_expand_all('abc', 'abx', 1, 2, 1),
+                         [(1, 0), (0, 1)])
+
+
+class TestFindNearMatchesNoInsertionsNgramsAsNoSubstituions(
+    TestFindNearMatchesSubstitionsNgrams, unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        if max_subs >= len(subsequence):
+            self.skipTest("avoiding calling fnm_no_insertions_ngrams() " +
+                          "with max_subs >= len(subsequence)")
+        return fnm_noins_ngrams(subsequence, sequence, max_subs, 0)
+
+
+class TestFindNearMatchesNoInsertionsNgrams(unittest.TestCase):
+    def test_one_sub_one_del(self):
+        sequence = 'abcdefghij'
+        pattern = 'bcdXefZhi'
+        expected_match = Match(start=1, end=9, dist=2, matched=sequence[1:9])
+        self.assertEqual(fnm_noins_ngrams(pattern, sequence, 0, 0, 0), [])
+        self.assertEqual(fnm_noins_ngrams(pattern, sequence, 0, 1, 2), [])
+        self.assertEqual(fnm_noins_ngrams(pattern, sequence, 1, 0, 2), [])
+        self.assertEqual(fnm_noins_ngrams(pattern, sequence, 1, 1, 1), [])
+        self.assertEqual(
+            fnm_noins_ngrams(pattern, sequence, 1, 1, 2),
+            [expected_match],
+        )
+
+    def test_two_missing(self):
+        sequence = '--abde--'
+        pattern = 'abcdef'
+
+        self.assertEqual(
+            fnm_noins_ngrams(pattern, sequence, 0, 2, 2),
+            [Match(start=2, end=6, dist=2, matched='abde')],
+        )
+        self.assertEqual(fnm_noins_ngrams(pattern, sequence, 2, 0, 2), [])
+
+    def test_index_range(self):
+        sequence = 'abcdefghij'
+        pattern = 'bcdXefZhi'
+        self.assertEqual(
+            search_in_index_range(
+                lambda subseq, seq, start_index, end_index:
+                    find_near_matches_no_insertions_ngrams(
+                        subseq, seq,
+                        LevenshteinSearchParams(1, 0, 1, 2),
+                        start_index, end_index),
+                pattern, sequence,
+            ),
+            [Match(start=1, end=9, dist=2, matched=sequence[1:9])],
+        )
+
+    def test_same_with_and_without_c_extension(self):
+        if not hasattr(fuzzysearch.single_indel_type,
+                       '_py_find_alignments'):
+            self.skipTest('the C extension is not available')
+        rng = random.Random(40)
+        for _i in range(300):
+            subsequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(1, 12)))
+            sequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(0, 100)))
+            max_subs, max_dels, max_l_dist = \
+                [rng.randint(0, 3) for _j in range(3)]
+            ngram_len = len(subsequence) // (
+                min(max_subs + max_dels, max_l_dist) + 1)
+            if ngram_len == 0:
+                continue
+            start_index = rng.randint(0, 10)
+            end_index = rng.randint(start_index, 100)
+            args = (subsequence.encode('ascii'), sequence.encode('ascii'),
+                    ngram_len, max_subs, max_dels, max_l_dist,
+                    min(start_index, len(sequence)),
+                    min(end_index, len(sequence)), DELETIONS)
+            self.assertEqual(
+                fuzzysearch.single_indel_type._find_alignments(*args),
+                fuzzysearch.single_indel_type._py_find_alignments(*args),
+            )
+
+
+class TestNoInsertionsSearch(unittest.TestCase):
+    def test_short_subsequence_uses_generic_search(self):
+        search_params = LevenshteinSearchParams(1, 0, 1, 2)
+        with unittest.mock.patch.object(
+                GenericSearch, 'search',
+                return_value=iter([])) as mock_search:
+            NoInsertionsSearch.search('ab', 'xxabxx', search_params)
+        self.assertEqual(mock_search.call_count, 1)
+
+    def test_short_ngrams_use_generic_search(self):
+        # n-grams of fewer than three items would match almost everywhere
+        search_params = LevenshteinSearchParams(1, 0, 1, 2)
+        for subsequence, expected_call_count in [
+            ('abcdefgh', 1),
+            ('abcdefghi', 0),
+        ]:
+            with unittest.mock.patch.object(
+                    GenericSearch, 'search',
+                    return_value=iter([])) as mock_search:
+                NoInsertionsSearch.search(subsequence, 'xxabcdefghixx',
+                                          search_params)
+            self.assertEqual(mock_search.call_count, expected_call_count)
+
+    def test_equivalences_use_generic_search(self):
+        search_params = LevenshteinSearchParams(1, 0, 1, 2)
+        equivalences = EquivalenceTable.case_insensitive()
+        self.assertEqual(
+            NoInsertionsSearch.consolidate_matches(NoInsertionsSearch.search(
+                'abcdef', 'xxAbcdefxx', search_params,
+                equivalences=equivalences)),
+            [Match(start=2, end=8, dist=0, matched='Abcdef')],
+        )
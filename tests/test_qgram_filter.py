@@ -0,0 +1,153 @@
+import random
+import unittest
+
+from fuzzysearch.common import LevenshteinSearchParams, \
+    consolidate_overlapping_matches
+from fuzzysearch.generic_search import \
+    find_near_matches_generic_linear_programming as fnm_generic_lp, \
+    find_near_matches_generic_qgram_filtered as fnm_generic_qgram_filtered, \
+    has_near_match_generic_qgram_filtered as hnm_generic_qgram_filtered
+from fuzzysearch.levenshtein import \
+    find_near_matches_levenshtein_linear_programming as fnm_levenshtein_lp, \
+    find_near_matches_levenshtein_qgram_filtered as \
+    fnm_levenshtein_qgram_filtered
+import fuzzysearch.qgram_filter
+from fuzzysearch.qgram_filter import find_candidate_regions, qgram_threshold
+
+from tests.test_generic_search import TestGenericSearchLp, \
+    TestHasNearMatchGenericBase
+from tests.test_levenshtein import TestFindNearMatchesLevenshteinBase
+from tests.utils import search_in_index_range
+
+
+class TestQgramThreshold(unittest.TestCase):
+    def test_threshold(self):
+        self.assertEqual(qgram_threshold(10, 0, 1), 10)
+        self.assertEqual(qgram_threshold(10, 3, 1), 7)
+        self.assertEqual(qgram_threshold(10, 3, 2), 3)
+        self.assertEqual(qgram_threshold(10, 5, 2), -1)
+
+
+class TestFindCandidateRegions(unittest.TestCase):
+    def test_unusable(self):
+        self.assertIsNone(find_candidate_regions('abc', 'xxabcxx', 3))
+        self.assertIsNone(find_candidate_regions('abc', 'xxabcxx', 5))
+
+    def test_empty_sequence(self):
+        self.assertEqual(find_candidate_regions('abc', '', 1), [])
+
+    def test_no_candidates(self):
+        self.assertEqual(find_candidate_regions('abcd', 'x' * 100, 1), [])
+        self.assertEqual(find_candidate_regions(b'abcd', b'x' * 100, 1), [])
+
+    def test_exact_match(self):
+        sequence = 'x' * 20 + 'abcd' + 'x' * 20
+        for subsequence, max_l_dist in [('abcd', 1), ('abcd', 3)]:
+            regions = find_candidate_regions(subsequence, sequence,
+                                             max_l_dist)
+            self.assertEqual(len(regions), 1)
+            (region_start, region_end), = regions
+            self.assertLessEqual(region_start, 20)
+            self.assertGreaterEqual(region_end, 24)
+
+    def test_index_range(self):
+        sequence = 'abcd' * 10
+        self.assertEqual(
+            find_candidate_regions('abcd', sequence, 1,
+                                   start_index=5, end_index=30),
+            [(5, 30)],
+        )
+
+    def test_contains_all_matches(self):
+        rng = random.Random(40)
+        for _i in range(200):
+            alphabet = rng.choice(['ab', 'ACGT', 'abcdefghijklmnopqrstuvwxyz'])
+            subsequence = ''.join(
+                rng.choice(alphabet) for _j in range(rng.randint(1, 10)))
+            sequence = ''.join(
+                rng.choice(alphabet) for _j in range(rng.randint(0, 100)))
+            max_l_dist = rng.randint(0, len(subsequence) - 1)
+            start_index = rng.randint(0, 10)
+            end_index = rng.randint(start_index, 110)
+
+            regions = find_candidate_regions(subsequence, sequence,
+                                             max_l_dist,
+                                             start_index=start_index,
+                                             end_index=end_index)
+            for (_start1, end1), (start2, _end2) in zip(regions, regions[1:]):
+                self.assertLess(end1, start2)
+            for match in fnm_levenshtein_lp(subsequence, sequence,
+                                            max_l_dist,
+                                            start_index, end_index):
+                self.assertTrue(
+                    any(region_start <= match.start and
+                        match.end <= region_end
+                        for region_start, region_end in regions),
+                    (subsequence, sequence, max_l_dist, match, regions),
+                )
+
+            # the results must be the same with and without the C extension
+            for q in range(1, min(2, len(subsequence)) + 1):
+                threshold = qgram_threshold(len(subsequence), max_l_dist, q)
+                args = (subsequence.encode('ascii'),
+                        sequence.encode('ascii'), q, threshold,
+                        len(subsequence) + max_l_dist,
+                        0, len(sequence))
+                if hasattr(fuzzysearch.qgram_filter,
+                           '_py_find_candidate_regions'):
+                    self.assertEqual(
+                        fuzzysearch.qgram_filter._find_candidate_regions(
+                            *args),
+                        fuzzysearch.qgram_filter._py_find_candidate_regions(
+                            *args),
+                    )
+
+
+class TestFindNearMatchesLevenshteinQgramFiltered(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return consolidate_overlapping_matches(
+            fnm_levenshtein_qgram_filtered(subsequence, sequence, max_l_dist)
+        )
+
+
+class TestFindNearMatchesLevenshteinQgramFilteredIndexRange(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        return consolidate_overlapping_matches(search_in_index_range(
+            fnm_levenshtein_qgram_filtered, subsequence, sequence, max_l_dist,
+        ))
+
+
+class TestGenericSearchQgramFiltered(TestGenericSearchLp):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        return list(
+            fnm_generic_qgram_filtered(pattern, sequence, search_params)
+        )
+
+    def test_same_as_lp(self):
+        rng = random.Random(40)
+        for _i in range(100):
+            subsequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(1, 10)))
+            sequence = ''.join(
+                rng.choice('ACGT') for _j in range(rng.randint(0, 100)))
+            search_params = LevenshteinSearchParams(
+                *[rng.randint(0, len(subsequence) - 1) for _j in range(4)])
+            self.assertEqual(
+                list(fnm_generic_qgram_filtered(subsequence, sequence,
+                                                search_params)),
+                list(fnm_generic_lp(subsequence, sequence, search_params)),
+            )
+
+
+class TestHasNearMatchGenericQgramFiltered(TestHasNearMatchGenericBase,
+                                           unittest.TestCase):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        return hnm_generic_qgram_filtered(
+            pattern, sequence,
+            LevenshteinSearchParams(max_subs, max_ins, max_dels, max_l_dist))
@@ -1,6 +1,7 @@
 import unittest
 
-from fuzzysearch.search_exact import search_exact
+from fuzzysearch.search_exact import search_exact, search_exact_lazily, \
+    has_exact_match
 from tests.compat import b
 
 
@@ -123,6 +124,22 @@ class TestSearchExact(TestSearchExactBase, unittest.TestCase):
         self.assertEqual(self.search('\u03A3\u0393', '\u03A0\u03A3\u0393\u0394'), [1])
 
 
+class TestSearchExactLazily(TestSearchExactBase, unittest.TestCase):
+    def search(self, subsequence, sequence, start_index=0, end_index=None):
+        return list(search_exact_lazily(subsequence, sequence,
+                                        start_index, end_index))
+
+    @classmethod
+    def get_supported_sequence_types(cls):
+        return TestSearchExact.get_supported_sequence_types()
+
+    def test_many_matches(self):
+        for sequence in [b'ab' * 5000, 'ab' * 5000]:
+            with self.subTest(sequence_type=type(sequence)):
+                self.assertEqual(self.search(sequence[:1], sequence, 3),
+                                 list(range(4, 10000, 2)))
+
+
 try:
     from fuzzysearch._common import search_exact_byteslike
 except ImportError:
@@ -170,3 +187,33 @@ else:
 
             with self.assertRaises(Exception):
                 search_exact_byteslike(b'abc', b'abc', 0, start_index=0)
+
+        def test_max_matches(self):
+            self.assertEqual(search_exact_byteslike(b'a', b'aaaa', 0, 4, 0),
+                             [0, 1, 2, 3])
+            self.assertEqual(search_exact_byteslike(b'a', b'aaaa', 0, 4, 1),
+                             [0])
+            self.assertEqual(search_exact_byteslike(b'a', b'aaaa', 1, 4, 2),
+                             [1, 2])
+            self.assertEqual(search_exact_byteslike(b'a', b'aaaa', 0, 4, 5),
+                             [0, 1, 2, 3])
+            self.assertEqual(
+                search_exact_byteslike(b'a', b'aaaa', max_matches=3),
+                [0, 1, 2])
+
+            with self.assertRaises(ValueError):
+                search_exact_byteslike(b'a', b'aaaa', 0, 4, -1)
+
+
+class TestHasExactMatch(TestSearchExactBase, unittest.TestCase):
+    def search(self, subsequence, sequence, start_index=0, end_index=None):
+        return [0] if has_exact_match(subsequence, sequence,
+                                      start_index, end_index) else []
+
+    def assertEqual(self, actual_value, expected_value, *args, **kwargs):
+        return super(TestHasExactMatch, self).assertEqual(
+            actual_value, [0] if expected_value else [], *args, **kwargs)
+
+    @classmethod
+    def get_supported_sequence_types(cls):
+        return TestSearchExact.get_supported_sequence_types()
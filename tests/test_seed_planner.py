@@ -0,0 +1,188 @@
+import unittest
+
+from fuzzysearch.common import LevenshteinSearchParams, \
+    consolidate_overlapping_matches
+from fuzzysearch.generic_search import \
+    find_near_matches_generic_ngrams as fnm_generic_ngrams
+from fuzzysearch.levenshtein_ngram import \
+    find_near_matches_levenshtein_ngrams as fnm_levenshtein_ngrams
+from fuzzysearch.seed_planner import SequenceProfile, plan_seeds, \
+    equal_seeds, choose_seeds, any_seed_matches_at
+from fuzzysearch.substitutions_only import \
+    find_near_matches_substitutions_ngrams as fnm_subs_ngrams, \
+    has_near_match_substitutions_ngrams as hnm_subs_ngrams
+
+from tests.test_generic_search import TestGenericSearchNgrams
+from tests.test_levenshtein import TestFindNearMatchesLevenshteinBase
+from tests.test_substitutions_only import TestSubstitionsOnlyBase, \
+    TestHasNearMatchSubstitionsOnlyBase
+
+
+# a profile under which runs of 'a', 'x' and 'T' and b'a' are very common,
+# so that the planned seeds differ from the default, equal ones
+SKEWED_PROFILE = SequenceProfile.from_sequence(
+    'a' * 100 + 'x' * 100 + 'T' * 100 + 'abcdefghijklmnopqrstuvwxyz',
+)
+SKEWED_BYTES_PROFILE = SequenceProfile.from_sequence(
+    b'a' * 100 + b'x' * 100 + b'T' * 100 + b'abcdefghijklmnopqrstuvwxyz',
+)
+
+
+def get_skewed_profile(subsequence):
+    if isinstance(subsequence, (bytes, bytearray)):
+        return SKEWED_BYTES_PROFILE
+    return SKEWED_PROFILE
+
+
+class TestSequenceProfile(unittest.TestCase):
+    def test_counts(self):
+        profile = SequenceProfile.from_sequence('abcab', q=2)
+        self.assertEqual(profile.q, 2)
+        self.assertEqual(profile.counts[0][()], 5)
+        self.assertEqual(profile.counts[1][('a',)], 2)
+        self.assertEqual(profile.counts[1][('c',)], 1)
+        self.assertEqual(profile.counts[2][('a', 'b')], 2)
+        self.assertEqual(profile.counts[2][('b', 'c')], 1)
+        self.assertEqual(profile.counts[2][('b', 'a')], 0)
+
+    def test_sampling(self):
+        sequence = 'a' * 1000 + 'b' * 1000
+        profile = SequenceProfile.from_sequence(sequence, q=2,
+                                                sample_size=100, n_blocks=4)
+        self.assertEqual(profile.counts[0][()], 100)
+        self.assertGreater(profile.counts[1][('a',)], 0)
+        self.assertGreater(profile.counts[1][('b',)], 0)
+
+    def test_invalid_q(self):
+        for q in [0, -1, 1.5, None]:
+            with self.assertRaises(TypeError):
+                SequenceProfile.from_sequence('abc', q=q)
+
+    def test_probability(self):
+        profile = SequenceProfile.from_sequence('a' * 100 + 'bcd')
+        self.assertGreater(profile.probability('aaaa'),
+                           profile.probability('bcdb'))
+        # unseen items are still possible
+        self.assertGreater(profile.probability('zzz'), 0)
+        self.assertEqual(profile.probability(''), 1.0)
+
+
+class TestPlanSeeds(unittest.TestCase):
+    def assertValidSeeds(self, seeds, subseq_len, n_seeds):
+        self.assertEqual(len(seeds), n_seeds)
+        for seed_start, seed_end in seeds:
+            self.assertTrue(0 <= seed_start < seed_end <= subseq_len)
+        for (_start1, end1), (start2, _end2) in zip(seeds, seeds[1:]):
+            self.assertLessEqual(end1, start2)
+
+    def test_equal_seeds(self):
+        self.assertEqual(equal_seeds(10, 3), [(0, 3), (3, 6), (6, 9)])
+        self.assertEqual(equal_seeds(9, 3), [(0, 3), (3, 6), (6, 9)])
+        self.assertEqual(equal_seeds(2, 3), [])
+
+    def test_uniform_profile(self):
+        profile = SequenceProfile.from_sequence('abcd' * 100, q=1)
+        seeds = plan_seeds('abcdabcdabcd', 3, profile)
+        self.assertValidSeeds(seeds, 12, 3)
+        self.assertEqual(seeds, [(0, 4), (4, 8), (8, 12)])
+
+    def test_avoids_common_items(self):
+        profile = SequenceProfile.from_sequence('A' * 1000 + 'ACGT' * 10)
+        subsequence = 'AAAAAAAAAAAACGTGCATT'
+        seeds = plan_seeds(subsequence, 3, profile)
+        self.assertValidSeeds(seeds, len(subsequence), 3)
+        for seed_start, seed_end in seeds:
+            self.assertNotEqual(subsequence[seed_start:seed_end],
+                                'A' * (seed_end - seed_start))
+
+    def test_various_lengths(self):
+        for subsequence in ['a', 'ab', 'abcdefg', 'aaaaxaaaa', 'Tx' * 20]:
+            for n_seeds in range(1, len(subsequence) + 1):
+                seeds = plan_seeds(subsequence, n_seeds, SKEWED_PROFILE)
+                self.assertValidSeeds(seeds, len(subsequence), n_seeds)
+
+    def test_max_seed_len(self):
+        seeds = plan_seeds('abcdefghij', 2, SKEWED_PROFILE, max_seed_len=2)
+        self.assertValidSeeds(seeds, 10, 2)
+        for seed_start, seed_end in seeds:
+            self.assertLessEqual(seed_end - seed_start, 2)
+
+    def test_invalid_n_seeds(self):
+        for n_seeds in [0, -1, 1.5, None]:
+            with self.assertRaises(TypeError):
+                plan_seeds('abc', n_seeds, SKEWED_PROFILE)
+        with self.assertRaises(ValueError):
+            plan_seeds('abc', 4, SKEWED_PROFILE)
+
+    def test_choose_seeds(self):
+        self.assertIsNone(choose_seeds('abcdef', 1, None))
+        self.assertEqual(choose_seeds('abcdef', 1, SKEWED_PROFILE),
+                         plan_seeds('abcdef', 2, SKEWED_PROFILE))
+
+    def test_any_seed_matches_at(self):
+        seeds = [(0, 2), (2, 4)]
+        self.assertTrue(any_seed_matches_at('abcd', 'xxabXX', seeds, 2))
+        self.assertTrue(any_seed_matches_at('abcd', 'xxXXcd', seeds, 2))
+        self.assertFalse(any_seed_matches_at('abcd', 'xxXXXX', seeds, 2))
+        self.assertFalse(any_seed_matches_at('abcd', 'xxabcd', [], 2))
+        # seeds starting before range_start are ignored
+        self.assertFalse(any_seed_matches_at('abcd', 'abXX', seeds, 0,
+                                             range_start=1))
+
+
+class TestFindNearMatchesLevenshteinPlannedSeeds(
+        TestFindNearMatchesLevenshteinBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_l_dist):
+        if max_l_dist >= len(subsequence):
+            self.skipTest(
+                'skipping ngram search with max_l_dist >= len(subsequence)')
+        seeds = plan_seeds(subsequence, max_l_dist + 1,
+                           get_skewed_profile(subsequence))
+        return consolidate_overlapping_matches(
+            fnm_levenshtein_ngrams(subsequence, sequence, max_l_dist,
+                                   seeds=seeds)
+        )
+
+
+class TestFindNearMatchesSubstitionsPlannedSeeds(TestSubstitionsOnlyBase,
+                                                 unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        if max_subs >= len(subsequence):
+            self.skipTest("avoiding calling fnm_subs_ngrams() " +
+                          "with max_subs >= len(subsequence)")
+        seeds = plan_seeds(subsequence, max_subs + 1,
+                           get_skewed_profile(subsequence))
+        return fnm_subs_ngrams(subsequence, sequence, max_subs, seeds=seeds)
+
+    def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+        return self.assertEqual(
+            consolidate_overlapping_matches(search_results),
+            consolidate_overlapping_matches(expected_outcomes),
+            *args, **kwargs)
+
+
+class TestHasNearMatchSubstitionsPlannedSeeds(
+        TestHasNearMatchSubstitionsOnlyBase, unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        if max_subs >= len(subsequence):
+            self.skipTest("avoiding calling hnm_subs_ngrams() " +
+                          "with max_subs >= len(subsequence)")
+        seeds = plan_seeds(subsequence, max_subs + 1,
+                           get_skewed_profile(subsequence))
+        return hnm_subs_ngrams(subsequence, sequence, max_subs, seeds=seeds)
+
+
+class TestGenericSearchPlannedSeeds(TestGenericSearchNgrams):
+    def search(self, pattern, sequence, max_subs, max_ins, max_dels,
+               max_l_dist=None):
+        search_params = LevenshteinSearchParams(max_subs, max_ins,
+                                                max_dels, max_l_dist)
+        if search_params.max_l_dist >= len(pattern):
+            # let the search raise the appropriate error
+            seeds = None
+        else:
+            seeds = plan_seeds(pattern, search_params.max_l_dist + 1,
+                               get_skewed_profile(pattern))
+        return consolidate_overlapping_matches(
+            fnm_generic_ngrams(pattern, sequence, search_params, seeds=seeds)
+        )
@@ -1,17 +1,25 @@
+import random
 import unittest
 
 from fuzzysearch.common import group_matches, Match, get_best_match_in_group, \
-    count_differences_with_maximum, consolidate_overlapping_matches
+    count_differences_with_maximum, consolidate_overlapping_matches, \
+    EquivalenceTable
 from fuzzysearch.substitutions_only import \
     has_near_match_substitutions as hnm_subs, \
     find_near_matches_substitutions as fnm_subs, \
+    find_near_matches_substitutions_columns as fnm_subs_columns, \
     find_near_matches_substitutions_lp as fnm_subs_lp, \
     has_near_match_substitutions_lp as hnm_subs_lp, \
     find_near_matches_substitutions_ngrams as fnm_subs_ngrams, \
     has_near_match_substitutions_ngrams as hnm_subs_ngrams
 
 from tests.compat import b
-from tests.utils import skip_if_arguments_arent_byteslike
+from tests.utils import skip_if_arguments_arent_byteslike, \
+    search_in_index_range
+
+
+# an equivalence table under which each item only matches itself
+IDENTITY_EQUIVALENCES = EquivalenceTable.from_classes(range(256))
 
 
 class TestSubstitionsOnlyBase(object):
@@ -275,6 +283,19 @@ class TestFindNearMatchesSubstitions(TestSubstitionsOnlyBase,
                                 *args, **kwargs)
 
 
+class TestFindNearMatchesSubstitionsColumns(TestSubstitionsOnlyBase,
+                                            unittest.TestCase):
+    def search(self, subsequence, sequence, max_subs):
+        return fnm_subs_columns(subsequence, sequence,
+                                max_subs).to_matches(sequence)
+
+    def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+        return self.assertEqual(
+            consolidate_overlapping_matches(search_results),
+            consolidate_overlapping_matches(expected_outcomes),
+            *args, **kwargs)
+
+
 class TestFindNearMatchesSubstitionsLinearProgramming(TestSubstitionsOnlyBase,
                                                       unittest.TestCase):
     def search(self, subsequence, sequence, max_subs):
@@ -298,6 +319,15 @@ class TestFindNearMatchesSubstitionsNgrams(TestSubstitionsOnlyBase,
             consolidate_overlapping_matches(expected_outcomes),
             *args, **kwargs)
 
+    def test_no_duplicate_matches(self):
+        # every n-gram matches at each of these, but each is verified once
+        sequence = 'abcdefgh' * 5 + 'abcdXfgh'
+        matches = fnm_subs_ngrams('abcdefgh', sequence, 1)
+        self.assertEqual(len(matches), len(set(matches)))
+        self.assertEqual([match.start for match in matches
+                          if match.dist <= 1],
+                         [0, 8, 16, 24, 32, 40])
+
 
 class TestHasNearMatchSubstitionsOnlyBase(TestSubstitionsOnlyBase):
     def search(self, subsequence, sequence, max_subs):
@@ -330,6 +360,105 @@ class TestHasNearMatchSubstitionsOnlyLp(TestHasNearMatchSubstitionsOnlyBase,
         return hnm_subs_lp(subsequence, sequence, max_subs)
 
 
+class TestFindNearMatchesSubstitionsIndexRange(
+        TestFindNearMatchesSubstitions):
+    def search(self, subsequence, sequence, max_subs):
+        return search_in_index_range(fnm_subs, subsequence, sequence,
+                                     max_subs)
+
+
+class TestFindNearMatchesSubstitionsLpIndexRange(
+        TestFindNearMatchesSubstitionsLinearProgramming):
+    def search(self, subsequence, sequence, max_subs):
+        return search_in_index_range(
+            lambda *args: list(fnm_subs_lp(*args)),
+            subsequence, sequence, max_subs)
+
+
+class TestFindNearMatchesSubstitionsNgramsIndexRange(
+        TestFindNearMatchesSubstitionsNgrams):
+    def search(self, subsequence, sequence, max_subs):
+        if max_subs >= len(subsequence):
+            self.skipTest("avoiding calling fnm_subs_ngrams() " +
+                          "with max_subs >= len(subsequence)")
+        return search_in_index_range(fnm_subs_ngrams, subsequence, sequence,
+                                     max_subs)
+
+
+class TestHasNearMatchSubstitionsOnlyIndexRange(
+        TestHasNearMatchSubstitionsOnly):
+    def search(self, subsequence, sequence, max_subs):
+        return search_in_index_range(hnm_subs, subsequence, sequence,
+                                     max_subs)
+
+
+class TestHasNearMatchSubstitionsOnlyNgramsIndexRange(
+        TestHasNearMatchSubstitionsOnlyNgrams):
+    def search(self, subsequence, sequence, max_subs):
+        if max_subs >= len(subsequence):
+            self.skipTest("avoiding calling hnm_subs_ngrams() " +
+                          "with max_subs >= len(subsequence)")
+        return search_in_index_range(hnm_subs_ngrams, subsequence, sequence,
+                                     max_subs)
+
+
+class TestHasNearMatchSubstitionsOnlyLpIndexRange(
+        TestHasNearMatchSubstitionsOnlyLp):
+    def search(self, subsequence, sequence, max_subs):
+        return search_in_index_range(hnm_subs_lp, subsequence, sequence,
+                                     max_subs)
+
+
+class TestFindNearMatchesSubstitionsIdentityEquivalences(
+        TestFindNearMatchesSubstitions):
+    def search(self, subsequence, sequence, max_subs):
+        return fnm_subs(subsequence, sequence, max_subs,
+                        equivalences=IDENTITY_EQUIVALENCES)
+
+
+class TestFindNearMatchesSubstitionsColumnsIdentityEquivalences(
+        TestFindNearMatchesSubstitionsColumns):
+    def search(self, subsequence, sequence, max_subs):
+        return fnm_subs_columns(
+            subsequence, sequence, max_subs,
+            equivalences=IDENTITY_EQUIVALENCES,
+        ).to_matches(sequence)
+
+
+class TestHasNearMatchSubstitionsOnlyIdentityEquivalences(
+        TestHasNearMatchSubstitionsOnly):
+    def search(self, subsequence, sequence, max_subs):
+        return hnm_subs(subsequence, sequence, max_subs,
+                        equivalences=IDENTITY_EQUIVALENCES)
+
+
+class TestSubstitutionsOnlyEquivalences(unittest.TestCase):
+    def test_case_insensitive(self):
+        equivalences = EquivalenceTable.case_insensitive()
+        for sequence in ['xxaBcDxx', b('xxaBcDxx'), list('xxaBcDxx')]:
+            self.assertEqual(
+                [match.start for match in fnm_subs(
+                    'AbCd' if not isinstance(sequence, bytes) else b('AbCd'),
+                    sequence, 0, equivalences=equivalences,
+                )],
+                [2],
+            )
+
+    def test_dna_iupac(self):
+        equivalences = EquivalenceTable.dna_iupac()
+        self.assertEqual(
+            [match.start for match in fnm_subs(
+                b('ANGR'), b('TTACGATTATGGCCAAGC'), 0,
+                equivalences=equivalences,
+            )],
+            [2, 8],
+        )
+        self.assertTrue(hnm_subs(b('RYN'), b('CCGTA'), 0,
+                                 equivalences=equivalences))
+        self.assertFalse(hnm_subs(b('RRN'), b('CCTTC'), 0,
+                                  equivalences=equivalences))
+
+
 try:
     from fuzzysearch._substitutions_only import \
         substitutions_only_has_near_matches_lp_byteslike as \
@@ -352,6 +481,21 @@ else:
             return hnm_subs_lp_byteslike(subsequence, sequence,
                                          max_subs)
 
+    class TestHasNearMatchesSubstitionsLpByteslikeWithTable(
+            TestHasNearMatchSubstitionsOnlyBase,
+            unittest.TestCase
+    ):
+        @skip_if_arguments_arent_byteslike
+        def search(self, subsequence, sequence, max_subs):
+            return hnm_subs_lp_byteslike(subsequence, sequence, max_subs,
+                                         0, len(sequence),
+                                         IDENTITY_EQUIVALENCES.table)
+
+        def test_invalid_table(self):
+            with self.assertRaises(ValueError):
+                hnm_subs_lp_byteslike(b('abc'), b('abcd'), 0,
+                                      0, 4, b('\x01') * 256)
+
     class TestHasNearMatchesSubstitionsNgramsByteslike(
             TestHasNearMatchSubstitionsOnlyBase,
             unittest.TestCase
@@ -423,3 +567,94 @@ else:
                 consolidate_overlapping_matches(search_results),
                 consolidate_overlapping_matches(expected_outcomes),
                 *args, **kwargs)
+
+    class TestFindNearMatchesSubstitionsNgramsByteslikeNoDuplicates(
+            TestSubstitionsOnlyBase,
+            unittest.TestCase
+    ):
+        @skip_if_arguments_arent_byteslike
+        def search(self, subsequence, sequence, max_subs):
+            results = fnm_subs_ngrams_byteslike(subsequence, sequence,
+                                                max_subs, 0, len(sequence))
+            self.assertEqual(len(results), len(set(results)))
+            return [
+                Match(
+                    index,
+                    index + len(subsequence),
+                    count_differences_with_maximum(
+                        sequence[index:index+len(subsequence)],
+                        subsequence,
+                        max_subs + 1,
+                    ),
+                    matched=sequence[index:index+len(subsequence)]
+                )
+                for index in sorted(results)
+            ]
+
+        def expectedOutcomes(self, search_results, expected_outcomes, *args, **kwargs):
+            return self.assertEqual(
+                consolidate_overlapping_matches(search_results),
+                consolidate_overlapping_matches(expected_outcomes),
+                *args, **kwargs)
+
+        def test_same_as_lp(self):
+            rng = random.Random(41)
+            for _i in range(200):
+                subsequence = bytes(rng.choice(b'ACGT')
+                                    for _j in range(rng.randint(1, 30)))
+                sequence = bytes(rng.choice(b'ACGT')
+                                 for _j in range(rng.randint(0, 300)))
+                # plant some near-matches
+                for _j in range(3):
+                    index = rng.randint(0, len(sequence))
+                    sequence = sequence[:index] + subsequence + \
+                        sequence[index + len(subsequence):]
+                max_subs = rng.randint(0, len(subsequence) // 2)
+                self.assertEqual(
+                    sorted(fnm_subs_ngrams_byteslike(
+                        subsequence, sequence, max_subs, 0, len(sequence))),
+                    fnm_subs_lp_byteslike(subsequence, sequence, max_subs),
+                )
+
+    class TestHasNearMatchesSubstitionsLpByteslikeIndexRange(
+            TestHasNearMatchesSubstitionsLpByteslike):
+        @skip_if_arguments_arent_byteslike
+        def search(self, subsequence, sequence, max_subs):
+            return bool(search_in_index_range(
+                hnm_subs_lp_byteslike, subsequence, sequence, max_subs))
+
+    class TestHasNearMatchesSubstitionsNgramsByteslikeIndexRange(
+            TestHasNearMatchesSubstitionsNgramsByteslike):
+        @skip_if_arguments_arent_byteslike
+        def search(self, subsequence, sequence, max_subs):
+            if max_subs >= len(subsequence):
+                self.skipTest("avoiding calling hnm_subs_ngrams_byteslike() " +
+                              "with max_subs >= len(subsequence)")
+            return bool(search_in_index_range(
+                hnm_subs_ngrams_byteslike, subsequence, sequence, max_subs))
+
+    class TestFindNearMatchesSubstitionsLpByteslikeIndexRange(
+            TestFindNearMatchesSubstitionsLpByteslike):
+        @skip_if_arguments_arent_byteslike
+        def search(self, subsequence, sequence, max_subs):
+            results = search_in_index_range(
+                fnm_subs_lp_byteslike, subsequence, sequence, max_subs)
+            return [
+                Match(
+                    index,
+                    index + len(subsequence),
+                    count_differences_with_maximum(
+                        sequence[index:index+len(subsequence)],
+                        subsequence,
+                        max_subs + 1,
+                    ),
+                    matched=sequence[index:index+len(subsequence)]
+                )
+                for index in results
+            ]
+
+        def test_negative_index_range(self):
+            with self.assertRaises(ValueError):
+                fnm_subs_lp_byteslike(b('abc'), b('abcabc'), 1, -2)
+            with self.assertRaises(ValueError):
+                fnm_subs_lp_byteslike(b('abc'), b('abcabc'), 1, 0, -2)
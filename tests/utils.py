@@ -1,5 +1,7 @@
 from functools import wraps
 
+import attr
+
 
 def skip_if_arguments_arent_byteslike(test_method):
     @wraps(test_method)
@@ -21,3 +23,31 @@ def skip_if_arguments_arent_byteslike(test_method):
         return test_method(self, *args, **kwargs)
 
     return new_method
+
+
+def search_in_index_range(search_func, subsequence, sequence, *args):
+    """Search a padded copy of the sequence, limited to the original part.
+
+    The sequence is surrounded by copies of the subsequence, which would be
+    found if the index range were ignored.  search_func is called as
+    search_func(subsequence, padded_sequence, *args, start_index, end_index).
+    The indexes in the results are shifted back to be relative to the given
+    sequence.
+    """
+    if isinstance(sequence, (list, tuple)):
+        padding = type(sequence)(subsequence) * 2
+    else:
+        padding = subsequence * 2
+    padded_sequence = padding + sequence + padding
+
+    results = search_func(subsequence, padded_sequence, *args,
+                          len(padding), len(padding) + len(sequence))
+    if isinstance(results, bool):
+        return results
+    return [
+        result - len(padding) if isinstance(result, int) else
+        attr.evolve(result,
+                    start=result.start - len(padding),
+                    end=result.end - len(padding))
+        for result in results
+    ]